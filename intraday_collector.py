@@ -3,22 +3,50 @@
 선정된 종목들의 당일 거래 데이터 기록
 """
 
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 import json
 import os
 import requests
 from bs4 import BeautifulSoup
-import time
 import re
 from utils import get_kst_now, format_kst_time, get_random_user_agent
+from naver_http import get_http
+
+# 분봉 공용 저장소 (시뮬레이터/아레나 팀 간 (code, date) 1회 fetch)
+try:
+    from paper_trading.utils.minute_store import get_minute_store
+except ImportError:
+    get_minute_store = None
+
+# 분봉 경로 엔진 (익절/손절 최초 도달 일괄 계산)
+from paper_trading.utils.minute_bars import MinuteBars, tp_sl_path
+
+# 장 마감 후 분봉이 완결되는 시각 (KST) — 이후 당일 분봉도 디스크 저장
+MINUTE_FINAL_TIME = '15:40'
+
+
+def _set_max_pct(result, path, s=0):
+    """TouchPath 최대수익/최대손실 → 결과 dict (미갱신이면 기존처럼 정수 0 유지)"""
+    if path.max_profit_pct[s] > 0:
+        result['max_profit_percent'] = float(path.max_profit_pct[s])
+    if path.max_loss_pct[s] < 0:
+        result['max_loss_percent'] = float(path.max_loss_pct[s])
+
 
 class IntradayCollector:
-    def __init__(self):
+    def __init__(self, minute_store=None, http=None):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': get_random_user_agent(),  # 랜덤 User-Agent 사용
             'Referer': 'https://finance.naver.com/'
         })
+        # 페이지 목록 (sise_time) 은 공용 HTTP 계층으로 병렬 수집
+        self.http = http or get_http()
+        # 분봉 저장소: 미지정 시 프로세스 공용 저장소
+        if minute_store is None and get_minute_store is not None:
+            minute_store = get_minute_store()
+        self.minute_store = minute_store
 
     def _fetch_naver_minute_ohlc(self, stock_code, date_str):
         """
@@ -90,6 +118,59 @@ class IntradayCollector:
             return []
 
     def get_minute_data(self, stock_code, date_str, freq='1'):
+        """
+        분봉 데이터 조회 — 분봉 저장소 경유 (같은 실행 내 (code, date) 당 fetch 1회)
+
+        저장소 miss 시 fetch_minute_data 로 수집하고, 완결된 분봉
+        (지난 날짜 또는 장 마감 후 당일, 09:05~15:19 구간 포함)은 디스크에도 저장.
+
+        Args:
+            stock_code: 종목코드 (6자리)
+            date_str: 날짜 (YYYYMMDD)
+            freq: 분봉 간격 ('1') - 1분봉만 저장소 사용
+
+        Returns:
+            [{'time':'HH:MM:SS', 'open':int, 'high':int, 'low':int, 'close':int, 'volume':int}, ...]
+        """
+        if self.minute_store is None or str(freq) != '1':
+            bars, _ = self._fetch_minute_data(stock_code, date_str, freq)
+            return bars
+
+        return self.minute_store.get_or_load(
+            stock_code, date_str, lambda: self.fetch_minute_data(stock_code, date_str, freq))
+
+    def fetch_minute_data(self, stock_code, date_str, freq='1', gate=None):
+        """
+        분봉 수집 (저장소 미경유) — MinuteBarStore.get_or_load 의 loader 형식
+
+        Args:
+            stock_code: 종목코드 (6자리)
+            date_str: 날짜 (YYYYMMDD)
+            freq: 분봉 간격 ('1')
+            gate: source 이름 → context manager (소스별 동시 실행 제한, MinuteBarPrefetcher)
+
+        Returns:
+            (bars, final) — final: 완결된 하루치라 디스크 저장 가능
+        """
+        bars, source = self._fetch_minute_data(stock_code, date_str, freq, gate=gate)
+        return bars, self._is_final_minute_data(bars, date_str, source)
+
+    def _is_final_minute_data(self, bars, date_str, source):
+        """디스크 저장 가능 여부 — 장 마감 후 완결된 하루치 분봉만"""
+        if not bars:
+            return False
+        now = get_kst_now()
+        today = now.strftime('%Y%m%d')
+        if date_str > today:
+            return False
+        if date_str == today and now.strftime('%H:%M') < MINUTE_FINAL_TIME:
+            return False
+        # sise_time 은 thistime=현재 기준 → 당일 분봉만 유효
+        if source == 'naver_sise' and date_str != today:
+            return False
+        return bars[0]['time'] <= '09:05:00' and bars[-1]['time'] >= '15:19:00'
+
+    def _fetch_minute_data(self, stock_code, date_str, freq='1', gate=None):
         """
         분봉 데이터 수집 (KIS 1차 + 네이버 OHLC 2차 + 네이버 체결가 3차 폴백)
 
@@ -105,19 +186,24 @@ class IntradayCollector:
             stock_code: 종목코드 (6자리)
             date_str: 날짜 (YYYYMMDD) - KIS는 historical, 네이버는 당일/근접일만
             freq: 분봉 간격 ('1') - 1분봉만 지원
+            gate: source 이름 → context manager (소스별 동시 실행 제한, MinuteBarPrefetcher)
 
         Returns:
-            [{'time':'HH:MM:SS', 'open':int, 'high':int, 'low':int, 'close':int, 'volume':int}, ...]
+            (bars, source) — source: 'kis' | 'naver_ohlc' | 'naver_sise'
+            bars = [{'time':'HH:MM:SS', 'open':int, 'high':int, 'low':int, 'close':int, 'volume':int}, ...]
         """
+        gate = gate or (lambda source: nullcontext())
+
         # 1차: KIS API (인스턴스 생성 성공하면 시도, 실패 시 네이버 폴백)
-        # KISClient.__init__ 이 .env 자동 로드. 키 없으면 ValueError 발생.
+        # 프로세스 공용 KIS 클라이언트 (토큰·rate limiter 공유). 키 없으면 ValueError 발생.
         try:
-            from paper_trading.utils.kis_api import KISClient
-            kis = KISClient()
-            bars = kis.get_minute_data(stock_code, date_str, freq=freq)
+            from paper_trading.utils.kis_api import get_kis_client
+            kis = get_kis_client()
+            with gate('kis'):
+                bars = kis.get_minute_data(stock_code, date_str, freq=freq)
             if bars:
                 print(f"  📊 {stock_code} 분봉 {len(bars)}건 (KIS API, date={date_str})")
-                return bars
+                return bars, 'kis'
             print(f"  📊 {stock_code} KIS 분봉 빈 응답 → 네이버 OHLC 폴백")
         except (ValueError, ImportError):
             pass  # KIS 키 없거나 모듈 없음 → 네이버 폴백 조용히
@@ -125,45 +211,42 @@ class IntradayCollector:
             print(f"  ⚠️  KIS 분봉 fetch 실패, 네이버 OHLC 폴백: {e}")
 
         # 2차: 네이버 OHLC API (api.stock.naver.com)
-        bars = self._fetch_naver_minute_ohlc(stock_code, date_str)
+        with gate('naver_ohlc'):
+            bars = self._fetch_naver_minute_ohlc(stock_code, date_str)
         if bars:
             print(f"  📊 {stock_code} 분봉 {len(bars)}건 (Naver OHLC API, date={date_str})")
-            return bars
+            return bars, 'naver_ohlc'
         print(f"  📊 {stock_code} 네이버 OHLC 빈 응답 → 네이버 sise_time 폴백")
 
         # 3차: 네이버 sise_time (당일만, 체결가만 — OHLC 동일)
+        with gate('naver_sise'):
+            return self._fetch_naver_sise_time(stock_code), 'naver_sise'
+
+    def _fetch_naver_sise_time(self, stock_code):
+        """
+        네이버 sise_time 체결가 분봉 (thistime=현재 기준 → 당일만, OHLC=체결가)
+
+        Returns:
+            [{'time':'HH:MM:SS', 'open':int, 'high':int, 'low':int, 'close':int, 'volume':int}, ...]
+        """
         try:
             print(f"  📊 {stock_code} 분봉 데이터 수집 중... (Naver Finance)")
 
-            minute_data = []
-            page = 1
             max_pages = 50  # 최대 50페이지 (약 400개 데이터)
 
             # thistime 파라미터: 한국 시간 기준
             thistime = format_kst_time(format_str='%Y%m%d%H%M%S')
 
-            while page <= max_pages:
-                url = f"https://finance.naver.com/item/sise_time.naver?code={stock_code}&thistime={thistime}&page={page}"
-
-                try:
-                    response = self.session.get(url, timeout=10)
-                    response.raise_for_status()
-                except Exception as e:
-                    print(f"    ⚠️  페이지 {page} 요청 실패: {e}")
-                    break
-
-                soup = BeautifulSoup(response.text, 'html.parser')
+            def parse(html):
+                soup = BeautifulSoup(html, 'html.parser')
 
                 # 데이터 테이블 찾기
                 table = soup.select_one('table.type2')
                 if not table:
-                    print(f"    ⚠️  페이지 {page} 테이블 없음")
-                    break
+                    return []
 
-                rows = table.select('tr')
-                data_found = False
-
-                for row in rows:
+                rows = []
+                for row in table.select('tr'):
                     cols = row.select('td')
                     if len(cols) < 7:
                         continue
@@ -199,7 +282,7 @@ class IntradayCollector:
                         volume = int(volume_text) if volume_text else 0
 
                         # 네이버는 체결가만 제공하므로 OHLC를 체결가로 동일하게 설정
-                        minute_data.append({
+                        rows.append({
                             'time': f"{time_text}:00",
                             'open': close_price,
                             'high': close_price,
@@ -207,17 +290,16 @@ class IntradayCollector:
                             'close': close_price,
                             'volume': volume
                         })
-                        data_found = True
 
                     except (ValueError, IndexError) as e:
                         continue
+                return rows
 
-                if not data_found:
-                    # 데이터 없으면 중단
-                    break
-
-                page += 1
-                time.sleep(0.2)  # 요청 간격
+            # 1페이지의 마지막 페이지 표시로 나머지 페이지 동시 요청 (데이터 없는 페이지에서 중단)
+            pages = self.http.fetch_pages(
+                lambda page: f"https://finance.naver.com/item/sise_time.naver?code={stock_code}&thistime={thistime}&page={page}",
+                parse, max_pages=max_pages, headers=dict(self.session.headers))
+            minute_data = [bar for rows in pages for bar in rows]
 
             if minute_data:
                 # 시간순으로 정렬 (오래된 것부터)
@@ -381,53 +463,23 @@ class IntradayCollector:
             'closing_percent': ((minute_data[-1]['close'] - entry_price) / entry_price * 100) if entry_price > 0 else 0
         }
 
-        profit_hit = False
-        loss_hit = False
-
-        # 매수 시점 이후 분봉만 분석
+        # 매수 시점 이후 분봉만 분석 — 익절/손절 둘 다 도달한 봉까지 최대수익/손실 집계
         entry_time_str = entry_check['entry_time'] or '09:00:00'
-
-        for candle in minute_data:
-            # 매수 시점 이전은 스킵
-            if candle['time'] < entry_time_str:
-                continue
-
-            high = candle['high']
-            low = candle['low']
-            time = candle['time']
-
-            # 수익률 계산
-            high_percent = ((high - entry_price) / entry_price * 100) if entry_price > 0 else 0
-            low_percent = ((low - entry_price) / entry_price * 100) if entry_price > 0 else 0
-
-            # 최대 수익/손실 업데이트
-            if high_percent > virtual_result['max_profit_percent']:
-                virtual_result['max_profit_percent'] = high_percent
-            if low_percent < virtual_result['max_loss_percent']:
-                virtual_result['max_loss_percent'] = low_percent
-
-            # 익절 도달 확인
-            if not profit_hit and high >= profit_price:
-                profit_hit = True
-                virtual_result['profit_hit_time'] = time
-
-                if virtual_result['first_hit'] is None:
-                    virtual_result['first_hit'] = 'profit'
-                    virtual_result['first_hit_time'] = time
-                    virtual_result['first_hit_price'] = int(profit_price)
-
-            # 손절 도달 확인
-            if not loss_hit and low <= loss_price:
-                loss_hit = True
-                virtual_result['loss_hit_time'] = time
-
-                if virtual_result['first_hit'] is None:
-                    virtual_result['first_hit'] = 'loss'
-                    virtual_result['first_hit_time'] = time
-                    virtual_result['first_hit_price'] = int(loss_price)
-
-            if profit_hit and loss_hit:
-                break
+        bars = MinuteBars.from_dicts(minute_data)
+        path = tp_sl_path(bars, entry_price, profit_price, loss_price,
+                          mask=bars.since(entry_time_str), stop_when_both=True)
+        _set_max_pct(virtual_result, path)
+
+        profit_idx, loss_idx = int(path.profit_idx[0]), int(path.loss_idx[0])
+        if profit_idx >= 0:
+            virtual_result['profit_hit_time'] = bars.labels[profit_idx]
+        if loss_idx >= 0:
+            virtual_result['loss_hit_time'] = bars.labels[loss_idx]
+        first_hit, first_idx = path.first_hit()
+        if first_hit is not None:
+            virtual_result['first_hit'] = first_hit
+            virtual_result['first_hit_time'] = bars.labels[first_idx]
+            virtual_result['first_hit_price'] = int(profit_price if first_hit == 'profit' else loss_price)
 
         if virtual_result['first_hit'] is None:
             virtual_result['first_hit'] = 'none'
@@ -500,51 +552,27 @@ class IntradayCollector:
             'scenarios': {}
         }
 
-        for scenario in scenarios:
-            profit_target = scenario['profit']
-            loss_target = scenario['loss']
-            profit_price = entry_price * (1 + profit_target / 100)
-            loss_price = entry_price * (1 + loss_target / 100)
-
-            first_hit = None
-            first_hit_time = None
-            max_profit = 0
-            max_loss = 0
+        # 시나리오 전체를 한 번에 — 같은 봉에서 둘 다 도달하면 익절 우선 (기존 루프 순서)
+        bars = MinuteBars.from_dicts(minute_data)
+        profit_prices = [entry_price * (1 + sc['profit'] / 100) for sc in scenarios]
+        loss_prices = [entry_price * (1 + sc['loss'] / 100) for sc in scenarios]
+        path = tp_sl_path(bars, entry_price, profit_prices, loss_prices,
+                          mask=bars.since(entry_time_str))
 
-            for candle in minute_data:
-                if candle['time'] < entry_time_str:
-                    continue
-
-                high = candle['high']
-                low = candle['low']
-
-                high_pct = ((high - entry_price) / entry_price * 100) if entry_price > 0 else 0
-                low_pct = ((low - entry_price) / entry_price * 100) if entry_price > 0 else 0
-
-                if high_pct > max_profit:
-                    max_profit = high_pct
-                if low_pct < max_loss:
-                    max_loss = low_pct
-
-                if first_hit is None and high >= profit_price:
-                    first_hit = 'profit'
-                    first_hit_time = candle['time']
-                if first_hit is None and low <= loss_price:
-                    first_hit = 'loss'
-                    first_hit_time = candle['time']
-
-            if first_hit is None:
-                first_hit = 'none'
+        for s, scenario in enumerate(scenarios):
+            first_hit, first_idx = path.first_hit(s)
+            max_profit = float(path.max_profit_pct[s]) if path.max_profit_pct[s] > 0 else 0
+            max_loss = float(path.max_loss_pct[s]) if path.max_loss_pct[s] < 0 else 0
 
             results['scenarios'][scenario['name']] = {
                 'label': scenario['label'],
-                'profit_target': profit_target,
-                'loss_target': loss_target,
-                'profit_target_price': int(profit_price),
-                'loss_target_price': int(loss_price),
+                'profit_target': scenario['profit'],
+                'loss_target': scenario['loss'],
+                'profit_target_price': int(profit_prices[s]),
+                'loss_target_price': int(loss_prices[s]),
                 'rr': scenario.get('rr', 0),
-                'result': first_hit,
-                'hit_time': first_hit_time,
+                'result': first_hit or 'none',
+                'hit_time': bars.labels[first_idx] if first_hit else None,
                 'max_profit_percent': round(max_profit, 4),
                 'max_loss_percent': round(max_loss, 4),
             }
@@ -755,6 +783,16 @@ class IntradayCollector:
 
         intraday_data = {}
 
+        # 분봉 선수집 — 전 종목을 소스별 동시 제한 하에 병렬 fetch (이후 분석은 저장소 hit)
+        if self.minute_store is not None and len(candidates) > 1:
+            try:
+                from paper_trading.utils.minute_prefetch import MinuteBarPrefetcher
+                MinuteBarPrefetcher(store=self.minute_store).prefetch(
+                    [(c.get('code', ''), date_str) for c in candidates]
+                )
+            except Exception as e:
+                print(f"  ⚠️  분봉 선수집 실패 (종목별 수집으로 진행): {e}")
+
         for candidate in candidates:
             stock_code = candidate.get('code', '')
             stock_name = candidate.get('name', '')
@@ -765,7 +803,7 @@ class IntradayCollector:
             # 기본 익절/손절 분석 (기존 호환)
             pl_analysis = self.analyze_profit_loss(stock_code, date_str, profit_target, loss_target, avg_volume_20d)
 
-            # 분봉 데이터 (이미 수집됨, 재사용을 위해 다시 수집)
+            # 분봉 데이터 (이미 수집됨 — 저장소 hit)
             minute_data = self.get_minute_data(stock_code, date_str, freq='1')
 
             # 4가지 시나리오 분석
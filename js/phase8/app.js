@@ -3,7 +3,7 @@
  */
 
 import { $, $$, fmtTime, getTodayKST, fmtDate } from './ui.js';
-import { initArena, refreshArena } from './arena.js';
+import { initArena, refreshArena, withFullHistory } from './arena.js';
 import { initTelegram, refreshTelegram } from './telegram.js';
 import { clearCache } from './cache.js';
 
@@ -215,7 +215,7 @@ async function buildStrategyCharts() {
 
   try {
     const { fetchCached } = await import('./cache.js');
-    const lb = await fetchCached('data/arena/leaderboard.json');
+    const lb = await withFullHistory(await fetchCached('data/arena/leaderboard.json'));
     console.log('[Chart] leaderboard:', lb ? `${(lb.daily_history||[]).length}일` : 'null');
     if (!lb || !lb.daily_history || lb.daily_history.length === 0) {
       console.warn('[Chart] daily_history 없음');
@@ -104,21 +104,8 @@ export async function loadArenaData(force = false) {
   const histDates = getRecentDates(7); // 14 → 7일 축소
   const recentHealthDates = [today, ...getRecentDates(7).slice(1)];
 
-  // 1) 모든 fetch 동시 발사 (Promise.all)
-  const [
-    leaderboard,
-    portfolios,
-    healthLogs,
-    candidates,
-    historyRaw,
-    verifiedFacts,
-  ] = await Promise.all([
-    fetchCached(`${DATA_BASE}/leaderboard.json`, force),
-
-    Promise.all(TEAM_IDS.map(tid =>
-      fetchCached(`${DATA_BASE}/${tid}/portfolio.json`, force).then(d => [tid, d])
-    )),
-
+  // 헬스/후보/검증 facts: 다른 워크플로우(check/select/verify_facts)가 수시로 쓰므로 항상 개별 파일
+  const livePromise = Promise.all([
     // 헬스: 8일치 동시 fetch (첫 번째 non-null 사용)
     Promise.all(recentHealthDates.map(d =>
       fetchCached(`${DATA_BASE}/healthcheck/health_${d}.json`, force)
@@ -135,6 +122,32 @@ export async function loadArenaData(force = false) {
       return [sid, found ? { ...found.data, _trade_date: found.date } : null];
     })),
 
+    // verify_facts SoT (Single Source of Truth) — 트리거·게이트 계산용
+    fetchCached(`${DATA_BASE}/_verified_facts.json`, force),
+  ]);
+
+  // 0) 대시보드 번들 (dashboard.build_dashboard_bundles) — 리더보드/포트폴리오/최근 매매를 요청 1회로
+  const overview = await fetchCached(`${DATA_BASE}/bundles/overview.json`, force);
+  if (overview && overview.recent) {
+    applyOverviewBundle(overview, histDates);
+    state.leaderboard = await withFullHistory(state.leaderboard, force);
+    applyLiveData(await livePromise);
+    return state;
+  }
+
+  // 1) 모든 fetch 동시 발사 (Promise.all)
+  const [
+    leaderboard,
+    portfolios,
+    historyRaw,
+    live,
+  ] = await Promise.all([
+    fetchCached(`${DATA_BASE}/leaderboard.json`, force),
+
+    Promise.all(TEAM_IDS.map(tid =>
+      fetchCached(`${DATA_BASE}/${tid}/portfolio.json`, force).then(d => [tid, d])
+    )),
+
     // 매매 이력: 5팀 × 7일 × 2파일 = 70개 동시 fetch
     Promise.all(TEAM_IDS.flatMap(tid =>
       histDates.flatMap(date => [
@@ -143,22 +156,13 @@ export async function loadArenaData(force = false) {
       ])
     )),
 
-    // verify_facts SoT (Single Source of Truth) — 트리거·게이트 계산용
-    fetchCached(`${DATA_BASE}/_verified_facts.json`, force),
+    livePromise,
   ]);
 
   // 2) 결과 정리
-  state.leaderboard = leaderboard;
+  state.leaderboard = await withFullHistory(leaderboard, force);
   state.portfolios = Object.fromEntries(portfolios);
-  state.candidates = Object.fromEntries(candidates);
-  state.facts = verifiedFacts;
-  // 헬스: 배열이면 마지막 항목 사용 (날짜별 누적 구조)
-  const rawHealth = healthLogs.find(h => h !== null) || null;
-  if (Array.isArray(rawHealth) && rawHealth.length > 0) {
-    state.health = rawHealth[rawHealth.length - 1];
-  } else {
-    state.health = rawHealth;
-  }
+  applyLiveData(live);
 
   // 매매 이력 재구성: tid → date 별로 summary + trades 묶기
   const histMap = {};
@@ -179,6 +183,44 @@ export async function loadArenaData(force = false) {
   return state;
 }
 
+// 리더보드 월별 히스토리 (leaderboard_history/YYYYMM.json) → daily_history 전체로 합침
+// leaderboard.json 의 daily_history 는 최근 창만 담는다. 분리 전 형식이면 그대로 사용
+export async function withFullHistory(lb, force = false) {
+  if (!lb || !Array.isArray(lb.history_months)) return lb;
+  const months = await Promise.all(lb.history_months.map(m =>
+    fetchCached(`${DATA_BASE}/leaderboard_history/${m}.json`, force)
+  ));
+  const days = months.flatMap(doc => doc?.days || []);
+  return days.length > 0 ? { ...lb, daily_history: days } : lb;
+}
+
+// 헬스/후보/facts → state
+function applyLiveData([healthLogs, candidates, verifiedFacts]) {
+  state.candidates = Object.fromEntries(candidates);
+  state.facts = verifiedFacts;
+  // 헬스: 배열이면 마지막 항목 사용 (날짜별 누적 구조)
+  const rawHealth = healthLogs.find(h => h !== null) || null;
+  if (Array.isArray(rawHealth) && rawHealth.length > 0) {
+    state.health = rawHealth[rawHealth.length - 1];
+  } else {
+    state.health = rawHealth;
+  }
+}
+
+// 번들 → state (개별 fetch 경로와 같은 모양, 같은 날짜 범위)
+function applyOverviewBundle(overview, histDates) {
+  state.leaderboard = overview.leaderboard;
+  state.portfolios = Object.fromEntries(TEAM_IDS.map(tid => [tid, overview.portfolios?.[tid] ?? null]));
+  // 매매 이력: 최근 창에서 7일 범위만 (최근 → 과거 정렬)
+  state.history = {};
+  for (const tid of TEAM_IDS) {
+    state.history[tid] = (overview.recent[tid] || [])
+      .filter(h => h.summary && histDates.includes(h.date))
+      .map(h => (h.trades ? h : { date: h.date, summary: h.summary }))
+      .sort((a, b) => b.date.localeCompare(a.date));
+  }
+}
+
 // ============ Helper: rows with portfolio + leaderboard combined ============
 function buildTeamRows() {
   const todayHist = state.leaderboard?.daily_history?.slice(-1)[0];
@@ -6,9 +6,11 @@ const TTL_RULES = [
   { match: /strategy_config\.json$/, ttl: 60 * 60 * 1000 },
   { match: /healthcheck\//, ttl: 30 * 60 * 1000 },
   { match: /leaderboard\.json$/, ttl: 5 * 60 * 1000 },
+  { match: /leaderboard_history\//, ttl: 10 * 60 * 1000 },
   { match: /candidates_/, ttl: 30 * 60 * 1000 },
   { match: /summary\.json$/, ttl: 10 * 60 * 1000 },
   { match: /trades\.json$/, ttl: 10 * 60 * 1000 },
+  { match: /bundles\//, ttl: 10 * 60 * 1000 },
 ];
 
 function getTTL(path) {
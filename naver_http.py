@@ -0,0 +1,227 @@
+"""
+네이버 스크래퍼 공용 HTTP 계층
+- keep-alive 연결 풀 (requests.Session + HTTPAdapter, 프로세스 공용)
+- 호스트별 동시 요청 수 제한 + 요청 시작 최소 간격 (기본 3개 / 0.2초 — 기존 순차 루프 간격 유지,
+  더 공격적인 설정은 호출측이 NaverHttp(max_per_host=..., min_interval=...) 로 선택)
+- 적응형 백오프: 429/5xx/연결 오류 시 호스트 간격을 늘려 재시도, 성공하면 점차 복귀
+- 페이지 병렬 수집: 1페이지에서 마지막 페이지(pgRR)를 읽고 나머지를 동시에 요청
+
+naver_market (pykrx 호환 stock), IntradayCollector 의 sise_time, NaverThemeCrawler 가
+고정 time.sleep(0.2) 순차 페이지 루프 대신 이 계층을 쓴다.
+
+사용 예:
+    http = get_http()
+    pages = http.fetch_pages(lambda p: f"{url}&page={p}", parse_rows, max_pages=50)
+    responses = http.get_many([url1, url2])
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+T = TypeVar('T')
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+    'Referer': 'https://finance.naver.com/',
+}
+
+# 재시도 대상 상태 코드 (차단/과부하)
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+_PG_LAST_RE = re.compile(r'class="pgRR"[^>]*>\s*<a[^>]*href="[^"]*[?&;]page=(\d+)', re.S)
+
+
+def last_page(html: str) -> Optional[int]:
+    """네이버 목록 페이지의 '맨뒤' 링크 (td.pgRR) 에서 마지막 페이지 번호. 없으면 None"""
+    match = _PG_LAST_RE.search(html or '')
+    return int(match.group(1)) if match else None
+
+
+class _HostState:
+    """호스트별 동시성 세마포어 + 요청 간격 (백오프 시 늘어남)"""
+
+    def __init__(self, max_concurrency: int, min_interval: float):
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.lock = threading.Lock()
+        self.base_interval = min_interval
+        self.interval = min_interval
+        self.next_slot = 0.0
+
+    def wait_slot(self) -> None:
+        # 다음 호출 슬롯을 lock 안에서 예약하고, 대기는 lock 밖에서
+        with self.lock:
+            now = time.time()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def backoff(self, max_interval: float) -> float:
+        with self.lock:
+            self.interval = min(max(self.interval * 2, 0.25), max_interval)
+            self.next_slot = max(self.next_slot, time.time() + self.interval)
+            return self.interval
+
+    def recover(self) -> None:
+        with self.lock:
+            if self.interval > self.base_interval:
+                self.interval = max(self.base_interval, self.interval * 0.8)
+
+
+class NaverHttp:
+    """연결 풀 + 호스트별 제한 + 백오프 GET, 페이지 병렬 수집"""
+
+    def __init__(self, max_per_host: int = 3, min_interval: float = 0.2,
+                 pool_size: int = 16, retries: int = 2, max_backoff: float = 5.0,
+                 timeout: float = 10, session: Optional[requests.Session] = None):
+        """
+        Args:
+            max_per_host: 호스트당 동시 요청 수
+            min_interval: 호스트당 요청 시작 최소 간격 (초)
+            pool_size: 호스트당 keep-alive 연결 수
+            retries: 429/5xx/연결 오류 재시도 횟수
+            max_backoff: 백오프 간격 상한 (초)
+            timeout: 기본 요청 타임아웃
+            session: 세션 주입 (테스트 등) — 없으면 풀 설정된 새 세션
+        """
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self.retries = retries
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update(DEFAULT_HEADERS)
+        self.session = session
+        self._hosts: Dict[str, _HostState] = {}
+        self._hosts_lock = threading.Lock()
+
+    def _host(self, url: str) -> _HostState:
+        host = urlsplit(url).netloc
+        with self._hosts_lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState(self.max_per_host, self.min_interval)
+            return state
+
+    # ─────────────────────────────────────
+    # 단일 / 다중 요청
+    # ─────────────────────────────────────
+
+    def get(self, url: str, headers: Optional[Dict] = None,
+            timeout: Optional[float] = None) -> requests.Response:
+        """GET (호스트 제한 + 재시도). 재시도 후에도 429/5xx 면 그 응답, 연결 오류면 예외"""
+        state = self._host(url)
+        for attempt in range(self.retries + 1):
+            with state.semaphore:
+                state.wait_slot()
+                try:
+                    response = self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+                except requests.RequestException:
+                    if attempt == self.retries:
+                        raise
+                    response = None
+            if response is not None and response.status_code not in RETRY_STATUS:
+                state.recover()
+                return response
+            if attempt == self.retries:
+                return response
+            time.sleep(state.backoff(self.max_backoff))
+
+    def get_many(self, urls: List[str], headers: Optional[Dict] = None,
+                 timeout: Optional[float] = None) -> List[Optional[requests.Response]]:
+        """여러 URL 동시 요청 — 입력 순서, 실패는 None"""
+        if not urls:
+            return []
+
+        def fetch(url):
+            try:
+                return self.get(url, headers=headers, timeout=timeout)
+            except Exception:
+                return None
+
+        if len(urls) == 1:
+            return [fetch(urls[0])]
+        with ThreadPoolExecutor(max_workers=min(len(urls), self.max_per_host)) as ex:
+            return list(ex.map(fetch, urls))
+
+    # ─────────────────────────────────────
+    # 페이지 병렬 수집
+    # ─────────────────────────────────────
+
+    def fetch_pages(self, url_for_page: Callable[[int], str], parse: Callable[[str], List[T]],
+                    max_pages: int, headers: Optional[Dict] = None, encoding: str = 'euc-kr',
+                    stop: Optional[Callable[[List[T]], bool]] = None,
+                    window: Optional[int] = None) -> List[List[T]]:
+        """1..max_pages 페이지를 병렬로 받아 페이지 순서대로 parse 결과 반환
+
+        순차 루프와 같은 결과: 첫 실패/빈 페이지 앞까지, stop(결과) 가 True 인 페이지까지.
+        1페이지에 마지막 페이지 표시(pgRR)가 있으면 나머지를 한 번에, 없으면 window 단위로 요청.
+        """
+        texts = self._texts([url_for_page(1)], headers, encoding)
+        if texts[0] is None:
+            return []
+        first = parse(texts[0])
+        if not first:
+            return []
+        pages = [first]
+        if (stop and stop(first)) or max_pages <= 1:
+            return pages
+
+        known_last = last_page(texts[0])
+        end = min(known_last, max_pages) if known_last else max_pages
+        step = (end - 1) if known_last else (window or self.max_per_host)
+        page = 2
+        while page <= end:
+            batch = list(range(page, min(page + step, end + 1)))
+            for text in self._texts([url_for_page(p) for p in batch], headers, encoding):
+                parsed = parse(text) if text is not None else []
+                if not parsed:
+                    return pages
+                pages.append(parsed)
+                if stop and stop(parsed):
+                    return pages
+            page = batch[-1] + 1
+        return pages
+
+    def _texts(self, urls: List[str], headers: Optional[Dict], encoding: str) -> List[Optional[str]]:
+        texts = []
+        for response in self.get_many(urls, headers=headers):
+            if response is None or response.status_code != 200:
+                texts.append(None)
+                continue
+            if encoding:
+                response.encoding = encoding
+            texts.append(response.text)
+        return texts
+
+
+# 프로세스 공용 (연결 풀 / 호스트 제한 공유)
+_http: Optional[NaverHttp] = None
+_http_lock = threading.Lock()
+
+
+def get_http() -> NaverHttp:
+    """프로세스 공용 NaverHttp (lazy singleton)"""
+    global _http
+    with _http_lock:
+        if _http is None:
+            _http = NaverHttp()
+        return _http
+
+
+__all__ = [
+    'NaverHttp',
+    'get_http',
+    'last_page',
+]
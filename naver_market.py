@@ -8,27 +8,75 @@ pykrx 함수 대체:
 - get_market_ohlcv_by_ticker() -> get_ohlcv_by_ticker()
 - get_market_cap_by_ticker() -> get_market_cap_by_ticker()
 - get_market_ohlcv_by_date() -> get_ohlcv()
+
+페이지 목록은 naver_http 공용 계층으로 병렬 수집 (연결 풀 + 호스트별 동시성 제한 + 백오프).
 """
 
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
-import time
 import re
 from datetime import datetime, timedelta
 
+from naver_http import NaverHttp, get_http
+
+MARKET_SUM_URL = 'https://finance.naver.com/sise/sise_market_sum.naver?sosok={sosok}&page={page}'
+SISE_DAY_URL = 'https://finance.naver.com/item/sise_day.naver?code={code}&page={page}'
+
+# sise_day 한 페이지 행 수 (거래일)
+SISE_DAY_ROWS = 10
+
 
 class NaverMarketData:
     """네이버 금융 시장 데이터 수집"""
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+    }
+
+    def __init__(self, http: NaverHttp = None):
+        """
+        Args:
+            http: 공용 HTTP 계층 (기본 프로세스 공용 get_http())
+        """
+        self.http = http or get_http()
         # 종목명 캐시
         self._ticker_name_cache = {}
 
+    def _get(self, url):
+        return self.http.get(url, headers=self.HEADERS, timeout=10)
+
+    def _market_sum_pages(self, market, parse, max_pages=50):
+        """시가총액 순위 페이지 (sise_market_sum) 병렬 수집 → 페이지별 parse 결과"""
+        sosok = '0' if market.upper() == 'KOSPI' else '1'
+        return self.http.fetch_pages(
+            lambda page: MARKET_SUM_URL.format(sosok=sosok, page=page),
+            parse, max_pages=max_pages, headers=self.HEADERS)
+
+    @staticmethod
+    def _market_sum_rows(html, min_cols):
+        """sise_market_sum 페이지 → [(code, name, cols), ...]"""
+        soup = BeautifulSoup(html, 'html.parser')
+        table = soup.find('table', class_='type_2')
+        if not table:
+            return []
+
+        rows = []
+        for row in table.find_all('tr'):
+            cols = row.find_all('td')
+            if len(cols) < min_cols:
+                continue
+
+            link = cols[1].find('a')
+            if not link:
+                continue
+
+            match = re.search(r'code=(\d{6})', link.get('href', ''))
+            if not match:
+                continue
+
+            rows.append((match.group(1), link.get_text(strip=True), cols))
+        return rows
+
     def get_ticker_list(self, market='KOSPI'):
         """종목 코드 리스트 조회
 
@@ -38,53 +86,14 @@ class NaverMarketData:
         Returns:
             list: 종목 코드 리스트
         """
-        sosok = '0' if market.upper() == 'KOSPI' else '1'
-        tickers = []
-        page = 1
-        max_pages = 50  # 최대 50페이지
-
-        while page <= max_pages:
-            url = f'https://finance.naver.com/sise/sise_market_sum.naver?sosok={sosok}&page={page}'
-
-            try:
-                response = self.session.get(url, timeout=10)
-                response.encoding = 'euc-kr'
-
-                if response.status_code != 200:
-                    break
-
-                soup = BeautifulSoup(response.text, 'html.parser')
-                table = soup.find('table', class_='type_2')
-
-                if not table:
-                    break
-
-                rows = table.find_all('tr')
-                found = 0
-
-                for row in rows:
-                    cols = row.find_all('td')
-                    if len(cols) < 2:
-                        continue
-
-                    link = cols[1].find('a')
-                    if link and 'href' in link.attrs:
-                        match = re.search(r'code=(\d{6})', link['href'])
-                        if match:
-                            code = match.group(1)
-                            name = link.get_text(strip=True)
-                            tickers.append(code)
-                            self._ticker_name_cache[code] = name
-                            found += 1
-
-                if found == 0:
-                    break
+        def parse(html):
+            return [(code, name) for code, name, _ in self._market_sum_rows(html, min_cols=2)]
 
-                page += 1
-                time.sleep(0.2)
-
-            except Exception as e:
-                break
+        tickers = []
+        for page in self._market_sum_pages(market, parse):
+            for code, name in page:
+                tickers.append(code)
+                self._ticker_name_cache[code] = name
 
         return tickers
 
@@ -105,7 +114,7 @@ class NaverMarketData:
         url = f'https://finance.naver.com/item/main.naver?code={code}'
 
         try:
-            response = self.session.get(url, timeout=10)
+            response = self._get(url)
             response.encoding = 'euc-kr'
 
             if response.status_code == 200:
@@ -133,11 +142,6 @@ class NaverMarketData:
         Returns:
             DataFrame: OHLCV 데이터 (index=날짜)
         """
-        url = f'https://finance.naver.com/item/sise_day.naver?code={code}'
-        all_data = []
-        page = 1
-        max_pages = 20
-
         # 날짜 파싱
         if end_date:
             end_dt = datetime.strptime(end_date, '%Y%m%d')
@@ -149,69 +153,56 @@ class NaverMarketData:
         else:
             start_dt = end_dt - timedelta(days=30)
 
-        while page <= max_pages:
-            try:
-                response = self.session.get(f'{url}&page={page}', timeout=10)
-                response.encoding = 'euc-kr'
-
-                if response.status_code != 200:
-                    break
-
-                soup = BeautifulSoup(response.text, 'html.parser')
-                table = soup.find('table', class_='type2')
-
-                if not table:
-                    break
-
-                rows = table.find_all('tr')
-                found = 0
-
-                for row in rows:
-                    cols = row.find_all('td')
-                    if len(cols) < 7:
-                        continue
-
-                    date_text = cols[0].get_text(strip=True)
-                    if not date_text:
-                        continue
-
-                    try:
-                        # 날짜 파싱 (2024.01.02 형식)
-                        dt = datetime.strptime(date_text, '%Y.%m.%d')
-
-                        # 범위 체크
-                        if dt < start_dt:
-                            return self._to_dataframe(all_data)
-                        if dt > end_dt:
-                            continue
-
-                        close = int(cols[1].get_text(strip=True).replace(',', ''))
-                        open_p = int(cols[3].get_text(strip=True).replace(',', ''))
-                        high = int(cols[4].get_text(strip=True).replace(',', ''))
-                        low = int(cols[5].get_text(strip=True).replace(',', ''))
-                        volume = int(cols[6].get_text(strip=True).replace(',', ''))
-
-                        all_data.append({
-                            '날짜': dt,
-                            '시가': open_p,
-                            '고가': high,
-                            '저가': low,
-                            '종가': close,
-                            '거래량': volume
-                        })
-                        found += 1
-
-                    except (ValueError, IndexError):
-                        continue
-
-                if found == 0:
-                    break
-
-                page += 1
-                time.sleep(0.2)
-
-            except Exception as e:
-                break
+        # 필요한 페이지 수 추정 (오늘 → start_dt 거래일 / 페이지당 10행, 여유 1페이지)
+        span_days = max((datetime.now() - start_dt).days, 0)
+        max_pages = min(20, span_days * 5 // 7 // SISE_DAY_ROWS + 2)
+
+        def parse(html):
+            soup = BeautifulSoup(html, 'html.parser')
+            table = soup.find('table', class_='type2')
+            if not table:
+                return []
+
+            rows = []
+            for row in table.find_all('tr'):
+                cols = row.find_all('td')
+                if len(cols) < 7:
+                    continue
+
+                date_text = cols[0].get_text(strip=True)
+                if not date_text:
+                    continue
+
+                try:
+                    # 날짜 파싱 (2024.01.02 형식)
+                    dt = datetime.strptime(date_text, '%Y.%m.%d')
+                    rows.append({
+                        '날짜': dt,
+                        '시가': int(cols[3].get_text(strip=True).replace(',', '')),
+                        '고가': int(cols[4].get_text(strip=True).replace(',', '')),
+                        '저가': int(cols[5].get_text(strip=True).replace(',', '')),
+                        '종가': int(cols[1].get_text(strip=True).replace(',', '')),
+                        '거래량': int(cols[6].get_text(strip=True).replace(',', '')),
+                    })
+                except (ValueError, IndexError):
+                    continue
+            return rows
+
+        pages = self.http.fetch_pages(
+            lambda page: SISE_DAY_URL.format(code=code, page=page), parse,
+            max_pages=max_pages, headers=self.HEADERS,
+            stop=lambda rows: rows[-1]['날짜'] < start_dt,
+            window=max_pages)
+
+        # 범위 체크 (페이지는 최근 날짜부터 — start_dt 이전 행에서 종료)
+        all_data = []
+        for rows in pages:
+            for row in rows:
+                if row['날짜'] < start_dt:
+                    return self._to_dataframe(all_data)
+                if row['날짜'] > end_dt:
+                    continue
+                all_data.append(row)
 
         return self._to_dataframe(all_data)
 
@@ -235,83 +226,39 @@ class NaverMarketData:
         Returns:
             DataFrame: 종목별 OHLCV (index=종목코드)
         """
-        sosok = '0' if market.upper() == 'KOSPI' else '1'
-        all_data = []
-        page = 1
-        max_pages = 50
-
-        while page <= max_pages:
-            url = f'https://finance.naver.com/sise/sise_market_sum.naver?sosok={sosok}&page={page}'
-
-            try:
-                response = self.session.get(url, timeout=10)
-                response.encoding = 'euc-kr'
-
-                if response.status_code != 200:
-                    break
-
-                soup = BeautifulSoup(response.text, 'html.parser')
-                table = soup.find('table', class_='type_2')
-
-                if not table:
-                    break
-
-                rows = table.find_all('tr')
-                found = 0
-
-                for row in rows:
-                    cols = row.find_all('td')
-                    if len(cols) < 10:
-                        continue
-
-                    link = cols[1].find('a')
-                    if not link:
-                        continue
-
-                    match = re.search(r'code=(\d{6})', link.get('href', ''))
-                    if not match:
-                        continue
-
-                    code = match.group(1)
-                    name = link.get_text(strip=True)
-
-                    try:
-                        price = int(cols[2].get_text(strip=True).replace(',', ''))
-                        change_text = cols[3].get_text(strip=True).replace(',', '')
-
-                        # 등락률
-                        change_pct_text = cols[4].get_text(strip=True).replace('%', '').replace('+', '')
-                        change_pct = float(change_pct_text) if change_pct_text else 0
-
-                        # 거래량
-                        volume = int(cols[5].get_text(strip=True).replace(',', '') or 0)
-
-                        # 거래대금 (백만원 -> 원)
-                        trading_val_text = cols[6].get_text(strip=True).replace(',', '')
-                        trading_value = int(trading_val_text) * 1_000_000 if trading_val_text else 0
-
-                        all_data.append({
-                            '종목코드': code,
-                            '종목명': name,
-                            '종가': price,
-                            '등락률': change_pct,
-                            '거래량': volume,
-                            '거래대금': trading_value
-                        })
-                        self._ticker_name_cache[code] = name
-                        found += 1
-
-                    except (ValueError, IndexError):
-                        continue
-
-                if found == 0:
-                    break
-
-                page += 1
-                time.sleep(0.2)
-
-            except Exception as e:
-                break
+        def parse(html):
+            data = []
+            for code, name, cols in self._market_sum_rows(html, min_cols=10):
+                try:
+                    price = int(cols[2].get_text(strip=True).replace(',', ''))
+
+                    # 등락률
+                    change_pct_text = cols[4].get_text(strip=True).replace('%', '').replace('+', '')
+                    change_pct = float(change_pct_text) if change_pct_text else 0
+
+                    # 거래량
+                    volume = int(cols[5].get_text(strip=True).replace(',', '') or 0)
+
+                    # 거래대금 (백만원 -> 원)
+                    trading_val_text = cols[6].get_text(strip=True).replace(',', '')
+                    trading_value = int(trading_val_text) * 1_000_000 if trading_val_text else 0
+
+                    data.append({
+                        '종목코드': code,
+                        '종목명': name,
+                        '종가': price,
+                        '등락률': change_pct,
+                        '거래량': volume,
+                        '거래대금': trading_value
+                    })
+
+                except (ValueError, IndexError):
+                    continue
+            return data
+
+        all_data = [row for page in self._market_sum_pages(market, parse) for row in page]
+        for row in all_data:
+            self._ticker_name_cache[row['종목코드']] = row['종목명']
 
         if not all_data:
             return pd.DataFrame()
@@ -330,87 +277,43 @@ class NaverMarketData:
         Returns:
             DataFrame: 종목별 시가총액 (index=종목코드)
         """
-        sosok = '0' if market.upper() == 'KOSPI' else '1'
-        all_data = []
-        page = 1
-        max_pages = 50
-
-        while page <= max_pages:
-            # 시가총액 순위 페이지
-            url = f'https://finance.naver.com/sise/sise_market_sum.naver?sosok={sosok}&page={page}'
-
-            try:
-                response = self.session.get(url, timeout=10)
-                response.encoding = 'euc-kr'
-
-                if response.status_code != 200:
-                    break
-
-                soup = BeautifulSoup(response.text, 'html.parser')
-                table = soup.find('table', class_='type_2')
-
-                if not table:
-                    break
-
-                rows = table.find_all('tr')
-                found = 0
-
-                for row in rows:
-                    cols = row.find_all('td')
-                    if len(cols) < 10:
-                        continue
-
-                    link = cols[1].find('a')
-                    if not link:
-                        continue
-
-                    match = re.search(r'code=(\d{6})', link.get('href', ''))
-                    if not match:
-                        continue
-
-                    code = match.group(1)
-                    name = link.get_text(strip=True)
-
-                    try:
-                        price = int(cols[2].get_text(strip=True).replace(',', ''))
-
-                        # 시가총액 (억원)
-                        cap_text = cols[6].get_text(strip=True).replace(',', '')
-                        # 시가총액이 없으면 다음 컬럼 확인
-                        if not cap_text.isdigit():
-                            cap_text = cols[7].get_text(strip=True).replace(',', '')
-
-                        market_cap = int(cap_text) * 100_000_000 if cap_text.isdigit() else 0
-
-                        # 거래량
-                        volume = int(cols[5].get_text(strip=True).replace(',', '') or 0)
-
-                        # 거래대금
-                        trading_text = cols[6].get_text(strip=True).replace(',', '')
-                        trading_value = int(trading_text) * 1_000_000 if trading_text.isdigit() else 0
-
-                        all_data.append({
-                            '종목코드': code,
-                            '종목명': name,
-                            '종가': price,
-                            '시가총액': market_cap,
-                            '거래량': volume,
-                            '거래대금': trading_value
-                        })
-                        self._ticker_name_cache[code] = name
-                        found += 1
-
-                    except (ValueError, IndexError):
-                        continue
-
-                if found == 0:
-                    break
-
-                page += 1
-                time.sleep(0.2)
-
-            except Exception as e:
-                break
+        def parse(html):
+            data = []
+            for code, name, cols in self._market_sum_rows(html, min_cols=10):
+                try:
+                    price = int(cols[2].get_text(strip=True).replace(',', ''))
+
+                    # 시가총액 (억원)
+                    cap_text = cols[6].get_text(strip=True).replace(',', '')
+                    # 시가총액이 없으면 다음 컬럼 확인
+                    if not cap_text.isdigit():
+                        cap_text = cols[7].get_text(strip=True).replace(',', '')
+
+                    market_cap = int(cap_text) * 100_000_000 if cap_text.isdigit() else 0
+
+                    # 거래량
+                    volume = int(cols[5].get_text(strip=True).replace(',', '') or 0)
+
+                    # 거래대금
+                    trading_text = cols[6].get_text(strip=True).replace(',', '')
+                    trading_value = int(trading_text) * 1_000_000 if trading_text.isdigit() else 0
+
+                    data.append({
+                        '종목코드': code,
+                        '종목명': name,
+                        '종가': price,
+                        '시가총액': market_cap,
+                        '거래량': volume,
+                        '거래대금': trading_value
+                    })
+
+                except (ValueError, IndexError):
+                    continue
+            return data
+
+        all_data = [row for page in self._market_sum_pages(market, parse) for row in page]
+        for row in all_data:
+            self._ticker_name_cache[row['종목코드']] = row['종목명']
 
         if not all_data:
             return pd.DataFrame()
@@ -431,7 +334,7 @@ class NaverMarketData:
         url = f'https://finance.naver.com/item/main.naver?code={code}'
 
         try:
-            response = self.session.get(url, timeout=10)
+            response = self._get(url)
             response.encoding = 'euc-kr'
 
             if response.status_code != 200:
@@ -4,7 +4,8 @@ Arena - 4팀 경쟁 트레이딩 시스템
 
 from .team import Team, TeamPortfolio
 from .leaderboard import Leaderboard
+from .ledger import ArenaLedger
 from .arena_manager import ArenaManager
 from .healthcheck import HealthChecker
 
-__all__ = ['Team', 'TeamPortfolio', 'Leaderboard', 'ArenaManager', 'HealthChecker']
+__all__ = ['Team', 'TeamPortfolio', 'Leaderboard', 'ArenaLedger', 'ArenaManager', 'HealthChecker']
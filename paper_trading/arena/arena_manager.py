@@ -13,24 +13,20 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from .team import Team, TeamPortfolio, TEAM_CONFIGS, ARENA_DIR, load_teams_from_config
 from .leaderboard import Leaderboard
+from .ledger import ArenaLedger
 
 KST = timezone(timedelta(hours=9))
 
 
 def _prev_business_day(date_str: str) -> str:
-    """date_str 의 직전 영업일 (월~금 + 한국 공휴일 제외).
+    """date_str 의 직전 영업일 (월~금 + 한국 공휴일 + KRX 휴장일 제외).
 
     ISSUE-015 fix (2026-05-09): run_daily(date=today) 호출 시 fetch_date 가
-    매매일 종가를 가져오는 결함 차단용. utils.is_market_day 재사용해
-    한국 공휴일까지 정확히 반영.
+    매매일 종가를 가져오는 결함 차단용. 거래일 캘린더 인덱스 (공휴일 규칙 +
+    KRX 캐시 확정) 로 한 번에 조회.
     """
-    from utils import is_market_day
-    d = datetime.strptime(date_str, "%Y%m%d")
-    for _ in range(10):
-        d -= timedelta(days=1)
-        if d.weekday() < 5 and is_market_day(d):
-            return d.strftime("%Y%m%d")
-    return date_str  # 폴백: 10일 거슬러도 못 찾으면 원본 반환
+    from paper_trading.utils.trading_calendar import get_trading_calendar
+    return get_trading_calendar().prev_trading_day(date_str) or date_str  # 폴백: 원본 반환
 
 
 class ArenaManager:
@@ -60,6 +56,12 @@ class ArenaManager:
         for team_id in TEAM_CONFIGS:
             self.teams[team_id] = Team(team_id, self.initial_capital)
 
+        # 일일 결과 원장 (없으면 기존 daily 기록으로 1회 구성)
+        self.ledger = ArenaLedger(ARENA_DIR / "ledger.jsonl")
+        if not self.ledger.exists():
+            n = self.ledger.bootstrap(ARENA_DIR)
+            print(f"[Arena] 원장 구성: 기존 기록 {n}행 → {self.ledger.path}")
+
         # 리더보드
         self.leaderboard = Leaderboard()
         for team_id, team in self.teams.items():
@@ -117,8 +119,7 @@ class ArenaManager:
                 "report_path": str(daily_report_path),
             }
         if daily_report_path.exists() and force:
-            print(f"[Arena] ⚠ --force 재실행: {date} 의 portfolio/leaderboard 누적값이 이중 계산될 수 있음")
-            print(f"        클린 재실행이 필요하면 scripts/dedupe_arena_data.py 먼저 실행")
+            print(f"[Arena] --force 재실행: {date} 결과는 원장에서 교체 (바뀐 날짜부터 재반영, 이중 누적 없음)")
 
         # 장 종료 확인
         if not force and not self._is_market_closed():
@@ -160,6 +161,12 @@ class ArenaManager:
             print("\n[Phase 2] 4팀 독립 시뮬레이션")
             team_sim_results = {}
 
+            # 분봉 저장소 — 실행 단위로 비우고 팀 간 공유 (같은 종목·날짜 fetch 1회)
+            from paper_trading.utils.minute_store import get_minute_store
+            minute_store = get_minute_store()
+            minute_store.clear()
+            self._prefetch_minute_bars(strategy_results, date)
+
             for team_id, team in self.teams.items():
                 strategy_id = team.strategy_id
                 strat_result = strategy_results.get(strategy_id)
@@ -216,8 +223,35 @@ class ArenaManager:
                     "simulation": sim_summary,
                 }
 
+            ms = minute_store.stats()
+            if ms['hits'] or ms['disk_hits'] or ms['misses']:
+                print(f"\n  [분봉 저장소] fetch {ms['misses']}회 / "
+                      f"메모리 hit {ms['hits']}회 / 디스크 hit {ms['disk_hits']}회")
+
+            # 리더보드 입력 — 체크포인트 이전 날짜 수정이면 원장/포트폴리오를 건드리기 전에 중단
+            lb_results = {}
+            for team_id, team_data in result["teams"].items():
+                sim = team_data.get("simulation", {})
+                lb_results[team_id] = {
+                    "total_return": sim.get("total_return", 0) if sim else 0,
+                    "win_rate": sim.get("win_rate", 0) if sim else 0,
+                    "total_trades": sim.get("total_trades", 0) if sim else 0,
+                }
+            self.leaderboard.check_update(date, lb_results)
+
             # 3. 팀별 기록 저장 + 포트폴리오 업데이트
             print("\n[Phase 3] 팀별 기록 저장 + 포트폴리오 업데이트")
+            # 원장 기록: 새 날짜는 그날만 반영, 같은 결과 재실행은 건너뜀, 바뀐 결과는 원장 재생
+            ledger_status = self.ledger.record_day(date, {
+                team_id: {"status": team_data.get("status"), **(team_data.get("simulation") or {})}
+                for team_id, team_data in result["teams"].items()
+            })
+            for team_id, team in self.teams.items():
+                if ledger_status.get(team_id) == "revised":
+                    team.portfolio = self.ledger.replay_portfolio(
+                        team_id, team.portfolio.initial_capital)
+                    team.save_portfolio()
+
             for team_id, team in self.teams.items():
                 team_data = result["teams"].get(team_id, {})
                 sim = team_data.get("simulation")
@@ -225,13 +259,14 @@ class ArenaManager:
 
                 if sim and team_data.get("status") == "success":
                     # 포트폴리오 업데이트
-                    team.portfolio.update_after_day(
-                        daily_return_pct=sim.get("total_return", 0),
-                        daily_return_amount=sim.get("total_return_amount", 0),
-                        trades=sim.get("total_trades", 0),
-                        wins=sim.get("wins", 0),
-                    )
-                    team.save_portfolio()
+                    if ledger_status.get(team_id) == "new":
+                        team.portfolio.update_after_day(
+                            daily_return_pct=sim.get("total_return", 0),
+                            daily_return_amount=sim.get("total_return_amount", 0),
+                            trades=sim.get("total_trades", 0),
+                            wins=sim.get("wins", 0),
+                        )
+                        team.save_portfolio()
 
                     # 일일 기록 저장
                     team.save_daily_record(date, selection, sim)
@@ -243,14 +278,6 @@ class ArenaManager:
 
             # 4. 리더보드 업데이트
             print("\n[Phase 4] 리더보드 업데이트")
-            lb_results = {}
-            for team_id, team_data in result["teams"].items():
-                sim = team_data.get("simulation", {})
-                lb_results[team_id] = {
-                    "total_return": sim.get("total_return", 0) if sim else 0,
-                    "win_rate": sim.get("win_rate", 0) if sim else 0,
-                    "total_trades": sim.get("total_trades", 0) if sim else 0,
-                }
             self.leaderboard.update_daily(date, lb_results)
 
             result["leaderboard"] = self.leaderboard.get_summary()
@@ -259,6 +286,9 @@ class ArenaManager:
             print("\n[Phase 5] 아레나 리포트 저장")
             self._save_daily_report(date, result)
 
+            # 6. 대시보드 번들 갱신 (바뀐 월만)
+            self._update_dashboard_bundles()
+
             # 결과 출력
             self._print_result(date, result)
 
@@ -281,6 +311,15 @@ class ArenaManager:
             json.dump(result, f, ensure_ascii=False, indent=2, default=str)
         print(f"  저장: {report_path}")
 
+    def _update_dashboard_bundles(self):
+        """대시보드 번들 갱신 — 실패해도 아레나 결과에는 영향 없음"""
+        try:
+            from .dashboard import build_dashboard_bundles
+            stats = build_dashboard_bundles(ARENA_DIR)
+            print(f"  번들: {stats['teams']}팀 최근 매매 (최근 {stats['latest_date']})")
+        except Exception as e:
+            print(f"  [WARN] 대시보드 번들 생성 실패: {e}")
+
     def _print_result(self, date: str, result: dict):
         """결과 출력"""
         print(f"\n{'='*60}")
@@ -316,6 +355,24 @@ class ArenaManager:
 
         print(f"{'='*60}")
 
+    def _prefetch_minute_bars(self, strategy_results: dict, date: str) -> None:
+        """전 팀 후보 합집합의 분봉을 시뮬레이션 전에 병렬 선수집 (분봉 모드 = 당일만)"""
+        from paper_trading.simulator import TradingSimulator, INTRADAY_AVAILABLE
+        if not INTRADAY_AVAILABLE or date != datetime.now().strftime("%Y%m%d"):
+            return
+        codes = []
+        for team in self.teams.values():
+            strat_result = strategy_results.get(team.strategy_id)
+            if strat_result and strat_result.candidates:
+                codes.extend(c.code for c in strat_result.candidates[:TradingSimulator.MAX_STOCKS])
+        if not codes:
+            return
+        try:
+            from paper_trading.utils.minute_prefetch import MinuteBarPrefetcher
+            MinuteBarPrefetcher().prefetch([(code, date) for code in codes])
+        except Exception as e:
+            print(f"  [분봉 선수집] 실패 — 시뮬레이션 중 종목별 수집: {e}")
+
     def _is_market_closed(self) -> bool:
         now = datetime.now(KST)
         if now.weekday() >= 5:
@@ -426,8 +483,8 @@ class ArenaManager:
             if elo >= 900: return "약체"
             return "부진"
 
-        # Day N 계산 (운영 일수 = leaderboard daily_history 길이)
-        day_n = len(self.leaderboard.data.get('daily_history', []))
+        # Day N 계산 (운영 일수 = leaderboard 누적 기록 일수)
+        day_n = self.leaderboard.data.get('total_days', 0)
 
         # 팀 데이터 수집
         team_rows = []
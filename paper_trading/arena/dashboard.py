@@ -2,17 +2,30 @@
 Arena 대시보드 - JSON 데이터 기반
 index.html이 JS로 직접 JSON을 읽어 렌더링함
 이 모듈은 GitHub Actions에서 데이터 검증/보조용
+
+대시보드 번들 (data/arena/bundles/overview.json):
+- 리더보드 + 포트폴리오 + 팀별 최근 매매 창 — 모두 run_daily 가 쓰는 파일이라 그때 다시 만든다
+- 팀 × 날짜 × summary/trades 개별 요청 대신 arena.js 가 번들을 읽는다 (없으면 기존 경로)
+- 헬스체크/후보/검증 facts 는 다른 워크플로우가 수시로 쓰므로 번들에 넣지 않고 JS 가 직접 읽는다
 """
 
-import json
+import logging
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional
+
+from ..utils.atomic_io import read_json as _read_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
 
 KST = timezone(timedelta(hours=9))
 
 ARENA_DIR = Path(__file__).parent.parent.parent / "data" / "arena"
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
 
+BUNDLE_DIRNAME = "bundles"
+RECENT_DAYS = 7            # overview 최근 매매 창 (팀별 거래일 수)
+
 
 def generate_arena_dashboard() -> str:
     """
@@ -39,8 +52,84 @@ def generate_arena_dashboard() -> str:
         else:
             print(f"  ✗ {tid} 포트폴리오 없음")
 
+    try:
+        stats = build_dashboard_bundles()
+        print(f"  ✓ 번들 {stats['teams']}팀 (최근 {stats['latest_date']}) → {stats['dir']}")
+    except Exception as e:
+        print(f"  ✗ 번들 생성 실패: {e}")
+
     return "index.html"
 
 
+# ─────────────────────────────────────
+# 대시보드 번들
+# ─────────────────────────────────────
+
+def _team_dirs(arena_dir: Path) -> List[Path]:
+    return sorted(p for p in arena_dir.glob("team_*") if (p / "daily").is_dir())
+
+
+def _recent_rows(team_dir: Path, recent_days: int) -> List[Dict]:
+    """팀 최근 recent_days 거래일 [{date, summary, trades}] (최근 → 과거) — summary 있는 날만"""
+    rows = []
+    days = sorted((p for p in (team_dir / "daily").iterdir()
+                   if len(p.name) == 8 and p.name.isdigit()), reverse=True)
+    for day_dir in days:
+        summary = _read_json(day_dir / "summary.json")
+        if summary is None:
+            continue
+        rows.append({
+            "date": day_dir.name,
+            "summary": summary,
+            "trades": _read_json(day_dir / "trades.json"),
+        })
+        if len(rows) >= recent_days:
+            break
+    return rows
+
+
+def build_dashboard_bundles(arena_dir: Optional[Path] = None, out_dir: Optional[Path] = None,
+                            recent_days: int = RECENT_DAYS) -> Dict:
+    """대시보드 번들 생성 (overview.json)
+
+    팀별로 최근 날짜 폴더부터 recent_days 개만 읽는다 (전체 이력 스캔 없음).
+
+    Args:
+        arena_dir: 아레나 데이터 폴더 (기본 data/arena)
+        out_dir: 번들 폴더 (기본 <arena_dir>/bundles)
+        recent_days: 최근 매매 창 (팀별 거래일 수)
+
+    Returns:
+        {'dir', 'teams', 'latest_date'}
+    """
+    arena_dir = Path(arena_dir or ARENA_DIR)
+    out_dir = Path(out_dir or arena_dir / BUNDLE_DIRNAME)
+
+    recent: Dict[str, List] = {}
+    portfolios = {}
+    for team_dir in _team_dirs(arena_dir):
+        rows = _recent_rows(team_dir, recent_days)
+        if rows:
+            recent[team_dir.name] = rows
+        pf = _read_json(team_dir / "portfolio.json")
+        if pf is not None:
+            portfolios[team_dir.name] = pf
+    latest_date = max((rows[0]["date"] for rows in recent.values()), default=None)
+
+    write_json_atomic(out_dir / "overview.json", {
+        "generated_at": datetime.now(KST).isoformat(timespec="seconds"),
+        "latest_date": latest_date,
+        "leaderboard": _read_json(arena_dir / "leaderboard.json"),
+        "portfolios": portfolios,
+        "recent": recent,
+    }, separators=(",", ":"), default=str)
+
+    return {
+        "dir": str(out_dir),
+        "teams": len(recent),
+        "latest_date": latest_date,
+    }
+
+
 if __name__ == "__main__":
     generate_arena_dashboard()
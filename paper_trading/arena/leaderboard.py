@@ -1,142 +1,364 @@
 """
 리더보드 - ELO 레이팅, 누적 랭킹, 일일/주간/월간 성과 추적
+
+팀 집계 (ELO/순위 카운트/베스트·워스트) 는 apply_day 로 하루씩 반영한다.
+일일 히스토리는 월별 파일 leaderboard_history/YYYYMM.json 에 나눠 저장하고,
+leaderboard.json 에는 팀 집계와 최근 HISTORY_WINDOW 일만 둔다 — 새 날짜는
+그달 파일과 leaderboard.json 만 다시 쓴다.
+
+월 파일의 base 는 그달 첫 반영 전 팀 집계 (체크포인트) 다. 이미 기록된 날짜의
+결과가 바뀌면 그 달 base 부터 이후 날짜를 다시 반영한다. 월별 분리 이전 기록
+(은퇴 팀 대결, 수동 보정이 섞여 재생으로 재현되지 않음) 은 base 가 없으므로
+수정하면 LeaderboardRevisionError 를 낸다.
 """
 
+import copy
 import json
+import logging
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional
 
+from ..utils.atomic_io import read_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
 KST = timezone(timedelta(hours=9))
 
 ARENA_DIR = Path(__file__).parent.parent.parent / "data" / "arena"
+HISTORY_DIRNAME = "leaderboard_history"
+HISTORY_WINDOW = 30      # leaderboard.json 에 두는 최근 일수
+
+INITIAL_ELO = 1000
+K_FACTOR_ADJACENT = 16   # 인접 순위 대결
+K_FACTOR_EXTREME = 32    # 1위 vs 4위 대결
+
+
+class LeaderboardRevisionError(ValueError):
+    """체크포인트 이전 (재생할 수 없는) 날짜의 결과 수정"""
+
+
+def new_team_stats(team_id: str, team_name: str, emoji: str) -> dict:
+    """팀 집계 초기값"""
+    return {
+        "team_id": team_id,
+        "team_name": team_name,
+        "emoji": emoji,
+        "elo": INITIAL_ELO,
+        "rank": 0,
+        "total_1st": 0,
+        "total_2nd": 0,
+        "total_3rd": 0,
+        "total_4th": 0,
+        "best_day_return": 0,
+        "worst_day_return": 0,
+    }
+
+
+def entry_results(entry: dict) -> Dict[str, dict]:
+    """daily_history 항목 → update_daily 입력 형식 ({team_id: result})"""
+    return {
+        r["team_id"]: {
+            "total_return": r.get("total_return", 0),
+            "win_rate": r.get("win_rate", 0),
+            "total_trades": r.get("trades", 0),
+        }
+        for r in entry.get("ranking", [])
+    }
+
+
+def load_history(data_path: Path) -> List[dict]:
+    """leaderboard.json 경로 → 전체 daily_history (월별 파일, 분리 전 형식이면 그대로)"""
+    data_path = Path(data_path)
+    data = read_json(data_path) or {}
+    if "history_months" not in data:
+        return data.get("daily_history", [])
+    history = []
+    for month in data["history_months"]:
+        doc = read_json(data_path.parent / HISTORY_DIRNAME / f"{month}.json") or {}
+        history.extend(doc.get("days", []))
+    return history
+
+
+def _rank_key(rank: int) -> str:
+    return f"total_{rank}{'st' if rank == 1 else 'nd' if rank == 2 else 'rd' if rank == 3 else 'th'}"
+
+
+def _normalize(team_results: Dict[str, dict]) -> Dict[str, dict]:
+    """update_daily 입력 → entry_results 와 같은 형식 (비교용)"""
+    return {
+        tid: {
+            "total_return": r.get("total_return", 0),
+            "win_rate": r.get("win_rate", 0),
+            "total_trades": r.get("total_trades", 0),
+        }
+        for tid, r in team_results.items()
+    }
+
+
+def apply_day(teams: Dict[str, dict], date: str, team_results: Dict[str, dict]) -> dict:
+    """하루 결과를 팀 집계에 반영하고 daily_history 항목 반환
+
+    Args:
+        teams: {team_id: 팀 집계} — 제자리 갱신
+        date: 날짜 (YYYYMMDD)
+        team_results: {team_id: {"total_return": float, "win_rate": float, ...}}
+
+    Returns:
+        {"date", "ranking"}
+    """
+    # 수익률 기준 일일 랭킹
+    ranked = sorted(
+        team_results.items(),
+        key=lambda x: x[1].get("total_return", -999),
+        reverse=True
+    )
+
+    daily_entry = {
+        "date": date,
+        "ranking": [],
+    }
+
+    # 순위 기록 + 베스트/워스트 갱신
+    for rank_idx, (tid, result) in enumerate(ranked):
+        rank = rank_idx + 1
+        ret = result.get("total_return", 0)
+
+        daily_entry["ranking"].append({
+            "rank": rank,
+            "team_id": tid,
+            "total_return": ret,
+            "win_rate": result.get("win_rate", 0),
+            "trades": result.get("total_trades", 0),
+        })
+
+        if tid in teams:
+            team = teams[tid]
+            # 순위 카운트
+            rank_key = _rank_key(rank)
+            team[rank_key] = team.get(rank_key, 0) + 1
+            team["rank"] = rank
+
+            # 베스트/워스트
+            if ret > team.get("best_day_return", 0):
+                team["best_day_return"] = round(ret, 2)
+            if ret < team.get("worst_day_return", 0):
+                team["worst_day_return"] = round(ret, 2)
+
+    # ELO 업데이트 (라운드로빈)
+    _update_elo(teams, ranked)
+
+    return daily_entry
+
+
+def _update_elo(teams: Dict[str, dict], ranked: list):
+    """ELO 레이팅 업데이트 (라운드 로빈 방식)"""
+    n = len(ranked)
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            tid_a = ranked[i][0]
+            tid_b = ranked[j][0]
+
+            if tid_a not in teams or tid_b not in teams:
+                continue
+
+            elo_a = teams[tid_a]["elo"]
+            elo_b = teams[tid_b]["elo"]
+
+            # 기대 승률
+            exp_a = 1 / (1 + 10 ** ((elo_b - elo_a) / 400))
+            exp_b = 1 - exp_a
+
+            # K 팩터 (1위 vs 4위는 크게, 인접 순위는 작게)
+            gap = j - i
+            k = K_FACTOR_EXTREME if gap >= 3 else K_FACTOR_ADJACENT
+
+            # i가 j보다 높은 순위 (승리)
+            teams[tid_a]["elo"] = round(elo_a + k * (1 - exp_a))
+            teams[tid_b]["elo"] = round(elo_b + k * (0 - exp_b))
 
 
 class Leaderboard:
     """리더보드 시스템"""
 
-    INITIAL_ELO = 1000
-    K_FACTOR_ADJACENT = 16   # 인접 순위 대결
-    K_FACTOR_EXTREME = 32    # 1위 vs 4위 대결
+    INITIAL_ELO = INITIAL_ELO
+    K_FACTOR_ADJACENT = K_FACTOR_ADJACENT
+    K_FACTOR_EXTREME = K_FACTOR_EXTREME
 
-    def __init__(self):
-        self.data_path = ARENA_DIR / "leaderboard.json"
-        ARENA_DIR.mkdir(parents=True, exist_ok=True)
+    def __init__(self, data_path: Optional[Path] = None):
+        self.data_path = Path(data_path) if data_path else ARENA_DIR / "leaderboard.json"
+        self.history_dir = self.data_path.parent / HISTORY_DIRNAME
+        self.data_path.parent.mkdir(parents=True, exist_ok=True)
         self.data = self._load()
 
     def _load(self) -> dict:
         if self.data_path.exists():
             with open(self.data_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                data = json.load(f)
+            if "history_months" not in data:
+                data = self._split_history(data)
+            return data
         return {
             "teams": {},
             "daily_history": [],
+            "total_days": 0,
+            "history_months": [],
             "last_updated": "",
         }
 
+    def _split_history(self, data: dict) -> dict:
+        """월별 분리 전 leaderboard.json → 월 파일 + 최근 창 (1회)
+
+        기존 집계는 처음부터 재생해도 재현되지 않으므로 체크포인트는 마지막 달에만
+        (마지막 기록 직후 집계) 둔다 — 그 이전 날짜는 수정할 수 없다.
+        """
+        history = [{k: v for k, v in e.items() if k != "deltas"}
+                   for e in data.get("daily_history", [])]
+        months: Dict[str, List[dict]] = {}
+        for entry in history:
+            months.setdefault(entry["date"][:6], []).append(entry)
+        for month, days in months.items():
+            base = None
+            if month == history[-1]["date"][:6]:
+                base = {"through": history[-1]["date"], "teams": copy.deepcopy(data.get("teams", {}))}
+            self._write_month({"month": month, "base": base, "days": days})
+
+        data["daily_history"] = history[-HISTORY_WINDOW:]
+        data["total_days"] = len(history)
+        data["history_months"] = sorted(months)
+        write_json_atomic(self.data_path, data, separators=(',', ':'))
+        logger.info(f"리더보드 히스토리 월별 분리: {len(history)}일 → {len(months)}개월")
+        return data
+
+    def _month_path(self, month: str) -> Path:
+        return self.history_dir / f"{month}.json"
+
+    def _read_month(self, month: str) -> dict:
+        return read_json(self._month_path(month)) or {"month": month, "base": None, "days": []}
+
+    def _write_month(self, doc: dict):
+        write_json_atomic(self._month_path(doc["month"]), doc, separators=(',', ':'))
+
     def save(self):
+        """압축 JSON 원자 저장"""
         self.data["last_updated"] = datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S")
-        with open(self.data_path, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        write_json_atomic(self.data_path, self.data, separators=(',', ':'))
 
     def init_team(self, team_id: str, team_name: str, emoji: str):
         """팀 초기 등록"""
         if team_id not in self.data["teams"]:
-            self.data["teams"][team_id] = {
-                "team_id": team_id,
-                "team_name": team_name,
-                "emoji": emoji,
-                "elo": self.INITIAL_ELO,
-                "rank": 0,
-                "total_1st": 0,
-                "total_2nd": 0,
-                "total_3rd": 0,
-                "total_4th": 0,
-                "best_day_return": 0,
-                "worst_day_return": 0,
-            }
+            self.data["teams"][team_id] = new_team_stats(team_id, team_name, emoji)
 
     def update_daily(self, date: str, team_results: Dict[str, dict]):
         """
         일일 결과로 리더보드 업데이트
 
+        마지막 기록 이후 날짜는 그날 결과만 반영 (그달 파일 + leaderboard.json 저장).
+        이미 기록된 날짜를 같은 결과로 다시 기록하면 변경 없음 (force 재실행).
+        결과가 바뀐/과거 날짜는 그 달 체크포인트부터 다시 반영한다.
+
         Args:
             date: 날짜 (YYYYMMDD)
             team_results: {team_id: {"total_return": float, "win_rate": float, ...}}
-        """
-        # 수익률 기준 일일 랭킹
-        ranked = sorted(
-            team_results.items(),
-            key=lambda x: x[1].get("total_return", -999),
-            reverse=True
-        )
-
-        daily_entry = {
-            "date": date,
-            "ranking": [],
-        }
-
-        # 순위 기록 + 베스트/워스트 갱신
-        for rank_idx, (tid, result) in enumerate(ranked):
-            rank = rank_idx + 1
-            ret = result.get("total_return", 0)
-
-            daily_entry["ranking"].append({
-                "rank": rank,
-                "team_id": tid,
-                "total_return": ret,
-                "win_rate": result.get("win_rate", 0),
-                "trades": result.get("total_trades", 0),
-            })
-
-            if tid in self.data["teams"]:
-                team = self.data["teams"][tid]
-                # 순위 카운트
-                rank_key = f"total_{rank}{'st' if rank == 1 else 'nd' if rank == 2 else 'rd' if rank == 3 else 'th'}"
-                team[rank_key] = team.get(rank_key, 0) + 1
-                team["rank"] = rank
-
-                # 베스트/워스트
-                if ret > team.get("best_day_return", 0):
-                    team["best_day_return"] = round(ret, 2)
-                if ret < team.get("worst_day_return", 0):
-                    team["worst_day_return"] = round(ret, 2)
-
-        # ELO 업데이트 (라운드로빈)
-        self._update_elo(ranked)
-
-        # 히스토리에 추가
-        self.data["daily_history"].append(daily_entry)
 
+        Raises:
+            LeaderboardRevisionError: 체크포인트 이전 날짜의 결과가 바뀜
+        """
+        window = self.data["daily_history"]
+        if window and date <= window[-1]["date"]:
+            doc = self.check_update(date, team_results)
+            if doc is None:
+                return
+            self._revise(doc, date, team_results)
+        else:
+            self._append(date, team_results)
         self.save()
 
-    def _update_elo(self, ranked: list):
-        """ELO 레이팅 업데이트 (라운드 로빈 방식)"""
-        teams = self.data["teams"]
-        n = len(ranked)
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                tid_a = ranked[i][0]
-                tid_b = ranked[j][0]
+    def check_update(self, date: str, team_results: Dict[str, dict]) -> Optional[dict]:
+        """update_daily 로 반영할 수 있는지 확인 (원장/포트폴리오 갱신 전 호출)
 
-                if tid_a not in teams or tid_b not in teams:
-                    continue
+        Returns:
+            다시 반영할 달의 월 파일 (새 날짜, 같은 결과 재실행이면 None)
 
-                elo_a = teams[tid_a]["elo"]
-                elo_b = teams[tid_b]["elo"]
-
-                # 기대 승률
-                exp_a = 1 / (1 + 10 ** ((elo_b - elo_a) / 400))
-                exp_b = 1 - exp_a
-
-                # K 팩터 (1위 vs 4위는 크게, 인접 순위는 작게)
-                gap = j - i
-                k = self.K_FACTOR_EXTREME if gap >= 3 else self.K_FACTOR_ADJACENT
-
-                # i가 j보다 높은 순위 (승리)
-                teams[tid_a]["elo"] = round(elo_a + k * (1 - exp_a))
-                teams[tid_b]["elo"] = round(elo_b + k * (0 - exp_b))
+        Raises:
+            LeaderboardRevisionError: 체크포인트 이전 날짜의 결과가 바뀜
+        """
+        window = self.data["daily_history"]
+        if not window or date > window[-1]["date"]:
+            return None
+        doc = self._read_month(date[:6])
+        entry = next((e for e in doc["days"] if e["date"] == date), None)
+        if entry is not None and entry_results(entry) == _normalize(team_results):
+            return None
+        base = doc["base"]
+        if base is None or date <= base["through"]:
+            since = "월별 분리 전 기록" if base is None else f"{base['through']} 까지는 체크포인트 이전"
+            raise LeaderboardRevisionError(f"리더보드 {date} 결과 수정 불가 — {since}")
+        return doc
+
+    def _append(self, date: str, team_results: Dict[str, dict]):
+        """마지막 기록 이후 날짜 — 그달 파일에 덧붙임 (새 달이면 현재 집계를 base 로)"""
+        months = self.data["history_months"]
+        window = self.data["daily_history"]
+        month = date[:6]
+        if months and months[-1] == month:
+            doc = self._read_month(month)
+        else:
+            doc = {
+                "month": month,
+                "base": {"through": window[-1]["date"] if window else "",
+                         "teams": copy.deepcopy(self.data["teams"])},
+                "days": [],
+            }
+            months.append(month)
+
+        entry = apply_day(self.data["teams"], date, team_results)
+        doc["days"].append(entry)
+        self._write_month(doc)
+        self.data["daily_history"] = (window + [entry])[-HISTORY_WINDOW:]
+        self.data["total_days"] = self.data.get("total_days", 0) + 1
+
+    def _revise(self, doc: dict, date: str, team_results: Dict[str, dict]):
+        """date 가 속한 달의 base 부터 이후 기록을 다시 반영 (이후 달 base 도 갱신)"""
+        current = self.data["teams"]
+        through = doc["base"]["through"]
+        teams = copy.deepcopy(doc["base"]["teams"])
+        for tid, team in current.items():
+            if tid not in teams:      # 체크포인트 이후 합류한 팀
+                teams[tid] = new_team_stats(tid, team.get("team_name", tid), team.get("emoji", ""))
+
+        inserted = all(e["date"] != date for e in doc["days"])
+        redo = [(e["date"], entry_results(e)) for e in doc["days"] if through < e["date"] != date]
+        redo.append((date, team_results))
+        redo.sort(key=lambda d: d[0])
+        doc["days"] = ([e for e in doc["days"] if e["date"] <= through]
+                       + [apply_day(teams, d, r) for d, r in redo])
+        self._write_month(doc)
+
+        months = self.data["history_months"]
+        replayed = list(doc["days"])
+        for month in months[months.index(doc["month"]) + 1:]:
+            later = self._read_month(month)
+            later["base"] = {"through": replayed[-1]["date"], "teams": copy.deepcopy(teams)}
+            later["days"] = [apply_day(teams, e["date"], entry_results(e)) for e in later["days"]]
+            self._write_month(later)
+            replayed.extend(later["days"])
+
+        for tid, team in current.items():
+            teams[tid]["team_name"] = team.get("team_name", tid)
+            teams[tid]["emoji"] = team.get("emoji", "")
+        self.data["teams"] = {**{tid: teams[tid] for tid in current}, **teams}
+        older = [e for e in self.data["daily_history"] if e["date"][:6] < doc["month"]]
+        self.data["daily_history"] = (older + replayed)[-HISTORY_WINDOW:]
+        self.data["total_days"] = self.data.get("total_days", 0) + int(inserted)
+
+    def history(self) -> List[dict]:
+        """전체 daily_history (월 파일 순서대로)"""
+        out = []
+        for month in self.data["history_months"]:
+            out.extend(self._read_month(month)["days"])
+        return out
 
     def get_ranking(self) -> List[dict]:
         """현재 ELO 기준 랭킹"""
@@ -147,8 +369,11 @@ class Leaderboard:
         return teams
 
     def get_daily_history(self, last_n: int = 30) -> List[dict]:
-        """최근 N일 히스토리"""
-        return self.data["daily_history"][-last_n:]
+        """최근 N일 히스토리 (leaderboard.json 창보다 길면 월 파일에서)"""
+        window = self.data["daily_history"]
+        if last_n <= len(window) or len(window) >= self.data.get("total_days", 0):
+            return window[-last_n:]
+        return self.history()[-last_n:]
 
     def get_team_stats(self, team_id: str) -> Optional[dict]:
         """팀별 통계"""
@@ -162,7 +387,7 @@ class Leaderboard:
         return {
             "ranking": ranking,
             "recent_history": history,
-            "total_days": len(self.data["daily_history"]),
+            "total_days": self.data.get("total_days", len(self.data["daily_history"])),
             "last_updated": self.data.get("last_updated", ""),
         }
 
@@ -0,0 +1,256 @@
+"""
+아레나 원장 (append-only JSONL)
+- data/arena/ledger.jsonl: 팀 × 날짜 일일 결과 1행, (team_id, date) 고유 키 — 뒤 행이 앞 행을 대체
+- 같은 결과 재기록은 쓰지 않고 'unchanged', 바뀐 결과/과거 날짜는 'revised' 로 알려 재생하게 한다
+- 한 번 스캔으로 임의 구간의 포트폴리오 (연승/연패/낙폭) 와 리더보드 집계 (ELO/순위) 재계산
+
+leaderboard.json / team_*/portfolio.json 은 이 원장에서 증분 갱신되는 스냅샷이다.
+원장이 없으면 기존 daily/<date>/trades.json + 리더보드 히스토리로 1회 구성 (bootstrap).
+
+사용 예:
+    ledger = ArenaLedger()
+    status = ledger.record_day('20260821', {'team_a': {'status': 'success', **sim}})
+    snapshot = ledger.replay(start='20260701', end='20260731')
+"""
+
+import json
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.atomic_io import atomic_open, read_json as _read_json
+from .leaderboard import apply_day, load_history, new_team_stats
+from .team import TeamPortfolio
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+ARENA_DIR = Path(__file__).parent.parent.parent / "data" / "arena"
+
+# 행 비교에 쓰는 값 필드 (recorded_at 제외)
+VALUE_FIELDS = ("status", "total_return", "total_return_amount", "total_trades", "wins", "win_rate")
+
+
+def _row(date: str, team_id: str, result: Optional[dict]) -> dict:
+    """일일 결과 → 원장 행 (시뮬레이션 없으면 0)"""
+    result = result or {}
+    return {
+        "date": date,
+        "team_id": team_id,
+        "status": result.get("status", "success"),
+        "total_return": float(result.get("total_return", 0) or 0),
+        "total_return_amount": int(result.get("total_return_amount", 0) or 0),
+        "total_trades": int(result.get("total_trades", 0) or 0),
+        "wins": int(result.get("wins", 0) or 0),
+        "win_rate": float(result.get("win_rate", 0) or 0),
+        "recorded_at": datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def _same(a: dict, b: dict) -> bool:
+    return all(a.get(k) == b.get(k) for k in VALUE_FIELDS)
+
+
+class ArenaLedger:
+    """팀 × 날짜 일일 결과 append-only 원장"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else ARENA_DIR / "ledger.jsonl"
+        self._rows: Dict[Tuple[str, str], dict] = {}
+        self._last: Dict[str, str] = {}          # team_id → 마지막 날짜
+        self._load()
+
+    def _load(self):
+        self._rows.clear()
+        self._last.clear()
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                    key = (row["team_id"], row["date"])
+                except Exception as e:
+                    logger.debug(f"원장 행 무시 {self.path}:{line_no}: {e}")
+                    continue
+                self._rows[key] = row
+                if row["date"] > self._last.get(key[0], ""):
+                    self._last[key[0]] = row["date"]
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, team_id: str, date: str) -> Optional[dict]:
+        return self._rows.get((team_id, date))
+
+    def last_date(self, team_id: Optional[str] = None) -> Optional[str]:
+        if team_id is not None:
+            return self._last.get(team_id)
+        return max(self._last.values(), default=None)
+
+    # ─────────────────────────────────────
+    # 기록
+    # ─────────────────────────────────────
+
+    def record_day(self, date: str, results: Dict[str, Optional[dict]]) -> Dict[str, str]:
+        """하루 결과 기록 — 바뀐 행만 덧붙임
+
+        Args:
+            date: 날짜 (YYYYMMDD)
+            results: {team_id: {"status", "total_return", "total_return_amount",
+                                "total_trades", "wins", "win_rate"}}
+
+        Returns:
+            {team_id: 'new' | 'unchanged' | 'revised'}
+            new = 그 팀 마지막 날짜 이후 첫 기록 (스냅샷에 그날만 반영하면 됨)
+            revised = 기존 날짜 결과 변경 또는 과거 날짜 삽입 (원장 재생 필요)
+        """
+        status, lines = {}, []
+        for tid, result in results.items():
+            row = _row(date, tid, result)
+            old = self._rows.get((tid, date))
+            if old is not None and _same(old, row):
+                status[tid] = "unchanged"
+                continue
+            last = self._last.get(tid)
+            status[tid] = "new" if old is None and (last is None or date > last) else "revised"
+            self._rows[(tid, date)] = row
+            if last is None or date > last:
+                self._last[tid] = date
+            lines.append(json.dumps(row, ensure_ascii=False, separators=(',', ':')))
+
+        if lines:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # 직전 쓰기가 줄바꿈 없이 끊겼으면 새 줄에서 시작
+            prefix = ""
+            if self.path.exists() and self.path.stat().st_size > 0:
+                with open(self.path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        prefix = "\n"
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(prefix + "\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        return status
+
+    def bootstrap(self, arena_dir: Optional[Path] = None) -> int:
+        """기존 daily/<date>/trades.json + 리더보드 히스토리 (월 파일) 로 원장 구성 (원장 없을 때 1회)
+
+        trades.json 이 있는 날은 매매 결과 (success), 리더보드 순위에만 있는 날은 no_candidates.
+
+        Returns:
+            기록한 행 수
+        """
+        arena_dir = Path(arena_dir or self.path.parent)
+        rows: Dict[Tuple[str, str], dict] = {}
+        for team_dir in sorted(arena_dir.glob("team_*")):
+            daily_dir = team_dir / "daily"
+            if not daily_dir.is_dir():
+                continue
+            for day_dir in sorted(daily_dir.glob("[0-9]" * 8)):
+                sim = _read_json(day_dir / "trades.json")
+                if isinstance(sim, dict):
+                    rows[(team_dir.name, day_dir.name)] = _row(
+                        day_dir.name, team_dir.name, {**sim, "status": "success"})
+
+        for entry in load_history(arena_dir / "leaderboard.json"):
+            date = entry.get("date", "")
+            for r in entry.get("ranking", []):
+                key = (r.get("team_id"), date)
+                if key[0] and date and key not in rows:
+                    rows[key] = _row(date, key[0], {
+                        "status": "no_candidates",
+                        "total_return": r.get("total_return", 0),
+                        "win_rate": r.get("win_rate", 0),
+                        "total_trades": r.get("trades", 0),
+                    })
+
+        with atomic_open(self.path) as f:
+            for key in sorted(rows, key=lambda k: (k[1], k[0])):
+                f.write(json.dumps(rows[key], ensure_ascii=False, separators=(',', ':')) + "\n")
+        self._load()
+        return len(rows)
+
+    # ─────────────────────────────────────
+    # 조회 / 재생
+    # ─────────────────────────────────────
+
+    def rows(self, start: Optional[str] = None, end: Optional[str] = None,
+             team_id: Optional[str] = None) -> List[dict]:
+        """유효 행 (키별 최신) — 날짜, 팀 순"""
+        out = [
+            row for (tid, date), row in self._rows.items()
+            if (team_id is None or tid == team_id)
+            and (start is None or date >= start) and (end is None or date <= end)
+        ]
+        out.sort(key=lambda r: (r["date"], r["team_id"]))
+        return out
+
+    def daily_results(self, start: Optional[str] = None,
+                      end: Optional[str] = None) -> List[Tuple[str, Dict[str, dict]]]:
+        """[(날짜, {team_id: 행})] — 날짜순 (replay 입력)"""
+        by_date: Dict[str, Dict[str, dict]] = defaultdict(dict)
+        for row in self.rows(start, end):
+            by_date[row["date"]][row["team_id"]] = row
+        return sorted(by_date.items())
+
+    def replay_portfolio(self, team_id: str, initial_capital: int = 10_000_000,
+                         start: Optional[str] = None, end: Optional[str] = None) -> TeamPortfolio:
+        """원장으로 팀 포트폴리오 재구성 (매매일만 반영)"""
+        pf = TeamPortfolio(team_id=team_id, initial_capital=initial_capital,
+                           current_capital=initial_capital, peak_capital=initial_capital)
+        for row in self.rows(start, end, team_id):
+            if row["status"] == "success":
+                pf.update_after_day(
+                    daily_return_pct=row["total_return"],
+                    daily_return_amount=row["total_return_amount"],
+                    trades=row["total_trades"],
+                    wins=row["wins"],
+                )
+        return pf
+
+    def replay(self, start: Optional[str] = None, end: Optional[str] = None,
+               team_meta: Optional[Dict[str, dict]] = None,
+               initial_capital: Optional[Dict[str, int]] = None) -> dict:
+        """한 번 스캔으로 구간 포트폴리오 + 리더보드 집계 재계산
+
+        Args:
+            start, end: 날짜 구간 (YYYYMMDD, 포함)
+            team_meta: {team_id: {"team_name", "emoji"}} — 없으면 원장에 있는 팀, 이름 = team_id
+            initial_capital: {team_id: 초기자금} — 없으면 1000만원
+
+        Returns:
+            {"portfolios": {team_id: TeamPortfolio}, "teams": {team_id: 집계}, "daily_history": [...]}
+        """
+        team_meta = team_meta or {}
+        initial_capital = initial_capital or {}
+        teams = {tid: new_team_stats(tid, meta.get("team_name", tid), meta.get("emoji", ""))
+                 for tid, meta in team_meta.items()}
+        portfolios: Dict[str, TeamPortfolio] = {}
+        history = []
+        for date, results in self.daily_results(start, end):
+            for tid, row in results.items():
+                if not team_meta and tid not in teams:
+                    teams[tid] = new_team_stats(tid, tid, "")
+                if row["status"] != "success":
+                    continue
+                pf = portfolios.get(tid)
+                if pf is None:
+                    cap = initial_capital.get(tid, 10_000_000)
+                    pf = portfolios[tid] = TeamPortfolio(team_id=tid, initial_capital=cap,
+                                                         current_capital=cap, peak_capital=cap)
+                pf.update_after_day(row["total_return"], row["total_return_amount"],
+                                    row["total_trades"], row["wins"])
+            history.append(apply_day(teams, date, results))
+        return {"portfolios": portfolios, "teams": teams, "daily_history": history}
@@ -408,9 +408,14 @@ def _verify_bollinger_system(warnings: list[FactsWarning]) -> dict:
 
 
 def _check_duplicate_runs(warnings: list[FactsWarning]) -> dict:
-    """leaderboard.daily_history 에서 동일 일자 중복 감지."""
+    """leaderboard 히스토리 (월 파일, 분리 전이면 daily_history) 에서 동일 일자 중복 감지."""
     lb = _read_json(ARENA_DIR / "leaderboard.json") or {}
     history = lb.get("daily_history") or []
+    if isinstance(lb.get("history_months"), list):
+        history = []
+        for month in lb["history_months"]:
+            doc = _read_json(ARENA_DIR / "leaderboard_history" / f"{month}.json") or {}
+            history.extend(doc.get("days") or [])
     if not isinstance(history, list):
         return {"checked": False}
     dates = [h.get("date") for h in history if isinstance(h, dict)]
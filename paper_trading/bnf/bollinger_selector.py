@@ -45,6 +45,11 @@ except ImportError:
     PYKRX_AVAILABLE = False
     logger.warning("pykrx not available")
 
+from paper_trading.utils.indicator_engine import (
+    compute_universe, fill_column, n_observations, right_align,
+)
+from paper_trading.utils.trading_calendar import get_trading_calendar
+
 # KRX OpenAPI import
 try:
     from paper_trading.utils.krx_api import KRXClient
@@ -83,78 +88,75 @@ EXCLUDE_KEYWORDS = ["우", "스팩", "SPAC", "리츠", "REIT", "ETF", "ETN",
 def calculate_bollinger_bands(closes: np.ndarray, period: int = BB_PERIOD,
                               std_mult: int = BB_STD_MULT) -> Tuple[float, float, float, float]:
     """
-    볼린저밴드 계산
+    볼린저밴드 계산 (단일 종목 — 유니버스 지표 엔진 1열 조회)
 
     Returns:
         (bb_upper, bb_middle, bb_lower, percent_b) - 마지막 값 기준
     """
     if len(closes) < period:
         return 0, 0, 0, 0.5
-
-    # 최근 period일 기준
-    recent = closes[-period:]
-    bb_middle = float(np.mean(recent))
-    bb_std = float(np.std(recent, ddof=1))  # 표본 표준편차
-
-    bb_upper = bb_middle + std_mult * bb_std
-    bb_lower = bb_middle - std_mult * bb_std
-
-    # %B 계산: (현재가 - 하한) / (상한 - 하한)
-    current = float(closes[-1])
-    band_width = bb_upper - bb_lower
-    if band_width == 0:
-        percent_b = 0.5
-    else:
-        percent_b = (current - bb_lower) / band_width
-
-    return bb_upper, bb_middle, bb_lower, percent_b
+    ind = compute_universe(np.asarray(closes, dtype=float)[:, None],
+                           bb_period=period, bb_std_mult=std_mult,
+                           rsi_period=None, ma_periods=())
+    return _bb_from_indicators(ind, 0)
 
 
 def calculate_rsi(closes: np.ndarray, period: int = RSI_PERIOD) -> float:
     """
-    RSI(Relative Strength Index) 계산
+    RSI(Relative Strength Index) 계산 — Wilder 평활 (단일 종목 — 지표 엔진 1열 조회)
 
     Returns:
         RSI 값 (0~100)
     """
     if len(closes) < period + 1:
         return 50.0  # 데이터 부족 시 중립값
+    ind = compute_universe(np.asarray(closes, dtype=float)[:, None],
+                           bb_period=0, rsi_period=period, ma_periods=())
+    return _rsi_from_indicators(ind, 0)
 
-    deltas = np.diff(closes)
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
 
-    # Wilder 평활 방식 (EMA)
-    avg_gain = np.mean(gains[:period])
-    avg_loss = np.mean(losses[:period])
-
-    for i in range(period, len(gains)):
-        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+def _bb_from_indicators(ind, j: int) -> Tuple[float, float, float, float]:
+    """UniverseIndicators 열 j → (bb_upper, bb_middle, bb_lower, percent_b)"""
+    upper = ind.value("bb_upper", j)
+    middle = ind.value("bb_middle", j)
+    lower = ind.value("bb_lower", j)
+    if middle is None:
+        return 0, 0, 0, 0.5
+    percent_b = ind.value("percent_b", j)
+    if percent_b is None:  # 밴드 폭 0
+        percent_b = 0.5
+    return upper, middle, lower, percent_b
 
-    if avg_loss == 0:
-        return 100.0
 
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    return round(float(rsi), 2)
+def _rsi_from_indicators(ind, j: int) -> float:
+    rsi = ind.value("rsi", j)
+    if rsi is None:
+        return 50.0
+    return round(rsi, 2)
 
 
 def resolve_trading_date(date_str: str) -> str:
-    """주어진 날짜가 비거래일이면 가장 최근 거래일로 거슬러 올라감"""
+    """주어진 날짜가 비거래일이면 가장 최근 거래일로 거슬러 올라감
+
+    후보는 거래일 캘린더 인덱스에서 고르고, KRX 개장 확정 날짜는 pykrx 조회 생략.
+    """
+    cal = get_trading_calendar()
     if not PYKRX_AVAILABLE:
-        return date_str
+        return cal.last_trading_day(date_str) or date_str
 
-    dt = datetime.strptime(date_str, "%Y%m%d")
-    for _ in range(10):
-        d = dt.strftime("%Y%m%d")
+    floor = (datetime.strptime(date_str, "%Y%m%d") - timedelta(days=9)).strftime("%Y%m%d")
+    d = cal.last_trading_day(date_str)
+    while d and d >= floor:
+        if cal.is_confirmed(d):
+            return d
         try:
             df = pykrx_stock.get_market_ohlcv_by_date(d, d, "005930")
             if not df.empty and float(df.iloc[0]["종가"]) > 0:
+                cal.observe(d, True)
                 return d
         except Exception:
             pass
-        dt -= timedelta(days=1)
+        d = cal.prev_trading_day(d)
     return date_str
 
 
@@ -172,7 +174,7 @@ class BollingerSelector:
     볼린저밴드 스윙 전략 종목 선정기
 
     KRX OpenAPI로 전종목 OHLCV 1회 fetch (시총/거래대금 필터)
-    pykrx로 필터 통과 종목 히스토리 fetch (BB/RSI 계산)
+    필터 통과 종목 히스토리는 KRX 일봉 패널 행렬 1회 (pykrx 폴백) → 지표 엔진 일괄 계산
     """
 
     def __init__(self, data_dir: str = "data/bnf"):
@@ -400,11 +402,11 @@ class BollingerSelector:
 
     def _calculate_indicators(self, stocks: List[Dict], date_str: str) -> List[Dict]:
         """
-        필터 통과 종목에 대해 pykrx로 히스토리 fetch 후
-        볼린저밴드 + RSI + 거래량 비율 계산
+        필터 통과 종목 전체의 히스토리를 (날짜 × 종목) 행렬로 받아
+        볼린저밴드 + RSI + 거래량 비율을 지표 엔진으로 일괄 계산
         """
-        if not PYKRX_AVAILABLE:
-            logger.error("pykrx 미설치 - 지표 계산 불가")
+        if not PYKRX_AVAILABLE and not KRX_AVAILABLE:
+            logger.error("pykrx/KRX 모두 사용 불가 - 지표 계산 불가")
             return []
 
         candidates = []
@@ -420,54 +422,39 @@ class BollingerSelector:
         skip_volume = 0
 
         total = len(stocks)
-        for idx, s in enumerate(stocks, 1):
-            if idx % 50 == 0:
-                logger.info(f"  진행: {idx}/{total} - 후보: {len(candidates)}개")
+        codes = [s["code"] for s in stocks]
+        aligned = self._fetch_history_matrix(codes, start_str, end_str)
+        ind = compute_universe(
+            aligned["종가"], aligned["거래량"], codes,
+            bb_period=BB_PERIOD, bb_std_mult=BB_STD_MULT,
+            rsi_period=RSI_PERIOD, ma_periods=(), vol_period=5,
+        )
+        n_obs = ind["n_obs"]
 
+        for j, s in enumerate(stocks):
             try:
-                # KRX API history 우선, pykrx 폴백
-                df = None
-                if KRX_AVAILABLE:
-                    try:
-                        krx = KRXClient()
-                        df = krx.get_history(s["code"], start_str, end_str, market=s.get("market", "KOSPI"))
-                    except Exception:
-                        pass
-                if df is None or df.empty:
-                    df = pykrx_stock.get_market_ohlcv_by_date(start_str, end_str, s["code"])
-                if df.empty or len(df) < BB_PERIOD + 1:
+                if n_obs[j] < BB_PERIOD + 1:
                     skip_insufficient_data += 1
                     continue
 
-                closes = df["종가"].astype(float).values
-                volumes = df["거래량"].astype(float).values
-
-                # 볼린저밴드 계산
-                bb_upper, bb_middle, bb_lower, percent_b = calculate_bollinger_bands(closes)
+                # 볼린저밴드
+                bb_upper, bb_middle, bb_lower, percent_b = _bb_from_indicators(ind, j)
 
                 # %B 필터
                 if percent_b >= PERCENT_B_THRESHOLD:
                     skip_percent_b += 1
                     continue
 
-                # RSI 계산
-                rsi = calculate_rsi(closes)
+                # RSI
+                rsi = _rsi_from_indicators(ind, j)
 
                 # RSI 필터
                 if rsi > RSI_THRESHOLD:
                     skip_rsi += 1
                     continue
 
-                # 거래량 5일 평균 대비 비율
-                if len(volumes) >= 6:
-                    avg_vol_5d = float(np.mean(volumes[-6:-1]))  # 당일 제외 5일
-                    current_vol = float(volumes[-1])
-                    if avg_vol_5d > 0:
-                        vol_ratio = current_vol / avg_vol_5d
-                    else:
-                        vol_ratio = 0
-                else:
-                    vol_ratio = 0
+                # 거래량 5일 평균(당일 제외) 대비 비율 — 데이터 부족/평균 0 이면 0
+                vol_ratio = ind.value("vol_ratio", j) or 0
 
                 # 거래량 필터
                 if vol_ratio < VOLUME_RATIO_THRESHOLD:
@@ -475,7 +462,7 @@ class BollingerSelector:
                     continue
 
                 # 후보 추가
-                current_price = int(closes[-1])
+                current_price = int(aligned["종가"][-1, j])
                 candidates.append({
                     "code": s["code"],
                     "name": s["name"],
@@ -514,6 +501,41 @@ class BollingerSelector:
 
         return candidates
 
+    def _fetch_history_matrix(self, codes: List[str], start_str: str,
+                              end_str: str) -> Dict[str, np.ndarray]:
+        """종가/거래량 (날짜 × 종목) 행렬 — KRX 일봉 패널 1차, 없는 종목만 pykrx 폴백
+
+        Returns:
+            right_align 된 {종가, 거래량: (T × C)} 행렬
+        """
+        fields = ("종가", "거래량")
+        mats = None
+        if KRX_AVAILABLE:
+            try:
+                dates, mats = KRXClient().get_history_matrix(codes, start_str, end_str, fields=fields)
+                if not dates:
+                    mats = None
+            except Exception as e:
+                logger.debug(f"KRX get_history_matrix 실패: {e}")
+        if mats is None:
+            rows = LOOKBACK_DAYS + 15
+            mats = {f: np.full((rows, len(codes)), np.nan) for f in fields}
+
+        aligned = right_align(mats)
+        if PYKRX_AVAILABLE:
+            n_obs = n_observations(aligned["종가"])
+            for j, code in enumerate(codes):
+                if n_obs[j] > 0:
+                    continue
+                try:
+                    df = pykrx_stock.get_market_ohlcv_by_date(start_str, end_str, code)
+                except Exception:
+                    continue
+                if df is not None and not df.empty:
+                    fill_column(aligned, j, {f: df[f].astype(float).values
+                                             for f in fields if f in df.columns})
+        return aligned
+
     def _save_result(self, date_str: str, iso_date: str,
                      now: datetime, candidates: List[Dict]) -> None:
         """결과 저장 (latest + daily)"""
@@ -10,6 +10,11 @@ BNF (Buy iN Fall) 전략 - 낙폭과대 종목 선정 모듈
 2. 필터 조건 (AND 조건):
    - 시가총액 > 1조원 (대형주)
    - 일평균 거래대금 > 100억원 (유동성)
+
+데이터 경로:
+   - 일괄 스캔 (기본): KRX 전종목 일봉 1회 → 시총/거래대금 필터 →
+     통과 종목 히스토리를 KRX 일봉 패널 (날짜 × 종목) 행렬 1회로 받아 낙폭 일괄 계산
+   - 종목별 폴백 (KRX 불가 시): 종목당 OHLCV 1회 조회 후 같은 계산
 """
 
 import sys
@@ -20,6 +25,8 @@ from dataclasses import dataclass, field
 import logging
 import json
 
+import numpy as np
+
 # 상위 디렉토리 import 설정
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
@@ -37,6 +44,22 @@ except ImportError:
         PYKRX_AVAILABLE = False
         print("[BNFSelector] Warning: naver_market/pykrx not available")
 
+# 전종목 일봉 + 히스토리 행렬: KRX OpenAPI (일괄 스캔)
+try:
+    from paper_trading.utils.krx_api import KRXClient
+    _krx_client = None
+    def _get_krx() -> "KRXClient | None":
+        global _krx_client
+        if _krx_client is None:
+            try:
+                _krx_client = KRXClient()
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"KRX OpenAPI 초기화 실패: {e}")
+                _krx_client = False
+        return _krx_client if _krx_client else None
+except ImportError:
+    _get_krx = lambda: None
+
 # 경고 무시
 import warnings
 warnings.filterwarnings('ignore')
@@ -49,6 +72,81 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# ============================================================
+# 낙폭 지표 일괄 계산
+# ============================================================
+
+def _window_edges(mat: np.ndarray, rows: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """마지막 rows 행 창에서 종목별 (첫 유효값, 마지막 유효값, 유효 개수)"""
+    window = mat[-rows:]
+    valid = ~np.isnan(window)
+    count = valid.sum(axis=0)
+    cols = np.arange(window.shape[1])
+    first = window[valid.argmax(axis=0), cols]
+    last = window[window.shape[0] - 1 - valid[::-1].argmax(axis=0), cols]
+    empty = count == 0
+    first[empty] = np.nan
+    last[empty] = np.nan
+    return first, last, count
+
+
+def compute_oversold_metrics(closes: np.ndarray, highs: np.ndarray, volumes: np.ndarray,
+                             drop_periods=(5, 10), high_lookback: int = 20,
+                             volume_lookback: int = 20) -> Dict[str, np.ndarray]:
+    """(날짜 × 종목) 행렬에서 낙폭/고점/거래량 지표를 종목 축으로 한 번에 계산
+
+    마지막 행 = 기준일. N일 창 = 마지막 N+1 행 (기존 get_trading_date(date, N) ~ date 조회와 동일),
+    창 안에서 종목별 첫/마지막 유효 관측치를 비교한다 (거래정지일은 건너뜀).
+
+    Returns:
+        {'drop_{N}d', 'drop_from_high', 'high', 'price', 'volume', 'avg_volume'} — (C,) 배열
+        (낙폭은 반올림 전 값). price 는 최근 2행에 관측치가 없으면 NaN, 나머지는 기존 함수의 실패값(0)으로 채움.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    highs = np.asarray(highs, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+    C = closes.shape[1]
+    out: Dict[str, np.ndarray] = {}
+
+    if closes.shape[0] == 0:
+        for n in drop_periods:
+            out[f'drop_{n}d'] = np.zeros(C)
+        out.update({k: np.zeros(C) for k in ('drop_from_high', 'high', 'volume', 'avg_volume')})
+        out['price'] = np.full(C, np.nan)
+        return out
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # N일 낙폭: 창 첫 종가 대비 마지막 종가
+        for n in drop_periods:
+            past, current, count = _window_edges(closes, n + 1)
+            drop = (past - current) / past * 100
+            ok = (count >= 2) & (past != 0)
+            out[f'drop_{n}d'] = np.where(ok, drop, 0.0)
+
+        # 최근 고점 대비 낙폭
+        rows = high_lookback + 1
+        high_win = highs[-rows:]
+        has_high = ~np.isnan(high_win).all(axis=0)
+        high = np.where(has_high, np.max(np.where(np.isnan(high_win), -np.inf, high_win), axis=0), np.nan)
+        _, current, count = _window_edges(closes, rows)
+        drop_high = (high - current) / high * 100
+        ok = has_high & (count > 0) & (high != 0)
+        out['drop_from_high'] = np.where(ok, drop_high, 0.0)
+        out['high'] = np.where(ok, high, 0.0)
+
+        # 현재 거래량 / 창 평균 거래량
+        rows = volume_lookback + 1
+        _, vol_last, count = _window_edges(volumes, rows)
+        vol_sum = np.nansum(volumes[-rows:], axis=0)
+        out['volume'] = np.where(count > 0, vol_last, 0.0)
+        out['avg_volume'] = np.where(count > 0, vol_sum / np.maximum(count, 1), 0.0)
+
+    # 현재가: 전 거래일 ~ 기준일 창의 마지막 종가
+    _, price, _ = _window_edges(closes, 2)
+    out['price'] = price
+    return out
+
+
 @dataclass
 class BNFCandidate:
     """낙폭과대 종목 후보 데이터 클래스"""
@@ -366,9 +464,53 @@ class BNFSelector:
             logger.debug(f"거래량 조회 실패 ({code}): {e}")
             return 0, 0
 
+    def _build_candidate(self, code: str, name: str, market_cap: int, trading_value: int,
+                         metrics: Dict[str, np.ndarray], j: int) -> Optional[BNFCandidate]:
+        """compute_oversold_metrics 결과의 열 j → 낙폭과대 조건 충족 시 BNFCandidate"""
+        drop_5d = round(float(metrics['drop_5d'][j]), 2)
+        drop_10d = round(float(metrics['drop_10d'][j]), 2)
+        drop_from_high = round(float(metrics['drop_from_high'][j]), 2)
+
+        # 낙폭과대 조건 체크 (OR 조건)
+        reasons = []
+        if drop_5d >= self.DROP_5D_THRESHOLD:
+            reasons.append(f"5일 낙폭 {drop_5d:.1f}%")
+
+        if drop_10d >= self.DROP_10D_THRESHOLD:
+            reasons.append(f"10일 낙폭 {drop_10d:.1f}%")
+
+        if drop_from_high >= self.DROP_HIGH_THRESHOLD:
+            reasons.append(f"고점 대비 {drop_from_high:.1f}%")
+
+        if not reasons:
+            return None
+
+        price = metrics['price'][j]
+        if np.isnan(price):
+            return None
+
+        return BNFCandidate(
+            code=code,
+            name=name,
+            current_price=int(price),
+            market_cap=market_cap,
+            trading_value=trading_value,
+            drop_5d=drop_5d,
+            drop_10d=drop_10d,
+            drop_from_high=drop_from_high,
+            max_drop=max(drop_5d, drop_10d, drop_from_high),
+            high_20d=int(metrics['high'][j]),
+            volume=int(metrics['volume'][j]),
+            avg_volume_20d=int(metrics['avg_volume'][j]),
+            selection_reason=" | ".join(reasons)
+        )
+
     def check_oversold_condition(self, code: str, date_str: str) -> Optional[BNFCandidate]:
         """
-        낙폭과대 조건 체크
+        낙폭과대 조건 체크 (종목별 폴백 경로)
+
+        OHLCV는 종목당 1회(고점/거래량 창 기준 최장 기간)만 조회하고,
+        5일/10일/고점 대비 낙폭과 거래량은 그 한 프레임에서 계산한다.
 
         Args:
             code: 종목 코드
@@ -387,59 +529,29 @@ class BNFSelector:
             if trading_value < self.MIN_TRADING_VALUE:
                 return None
 
-            # 2. 낙폭 계산
-            drop_5d = self.calculate_drop_percentage(code, date_str, 5)
-            drop_10d = self.calculate_drop_percentage(code, date_str, 10)
-            drop_from_high, high_20d = self.get_high_to_current_drop(code, date_str, self.HIGH_LOOKBACK)
-
-            # 3. 낙폭과대 조건 체크 (OR 조건)
-            reasons = []
-            if drop_5d >= self.DROP_5D_THRESHOLD:
-                reasons.append(f"5일 낙폭 {drop_5d:.1f}%")
-
-            if drop_10d >= self.DROP_10D_THRESHOLD:
-                reasons.append(f"10일 낙폭 {drop_10d:.1f}%")
-
-            if drop_from_high >= self.DROP_HIGH_THRESHOLD:
-                reasons.append(f"고점 대비 {drop_from_high:.1f}%")
-
-            if not reasons:
-                return None
-
-            # 4. 현재가 및 거래량 정보
-            start_date = self.get_trading_date(date_str, 1)
+            # 2. 히스토리 1회 조회 → 낙폭/거래량 계산
+            start_date = self.get_trading_date(date_str, max(self.HIGH_LOOKBACK, 20))
             df = self.get_stock_ohlcv(code, start_date, date_str)
 
             if df.empty:
                 return None
 
-            current_price = int(df.iloc[-1]['종가'])
-            volume, avg_volume = self.get_volume_info(code, date_str)
+            metrics = compute_oversold_metrics(
+                df['종가'].to_numpy(dtype=float)[:, None],
+                df['고가'].to_numpy(dtype=float)[:, None],
+                df['거래량'].to_numpy(dtype=float)[:, None],
+                high_lookback=self.HIGH_LOOKBACK,
+            )
 
-            # 5. 종목명 조회
+            candidate = self._build_candidate(code, code, market_cap, trading_value, metrics, 0)
+            if candidate is None:
+                return None
+
+            # 3. 종목명 조회 (조건 충족 종목만)
             try:
-                name = stock.get_market_ticker_name(code) if PYKRX_AVAILABLE else code
+                candidate.name = stock.get_market_ticker_name(code) if PYKRX_AVAILABLE else code
             except:
-                name = code
-
-            # 6. 후보 생성
-            max_drop = max(drop_5d, drop_10d, drop_from_high)
-
-            candidate = BNFCandidate(
-                code=code,
-                name=name,
-                current_price=current_price,
-                market_cap=market_cap,
-                trading_value=trading_value,
-                drop_5d=drop_5d,
-                drop_10d=drop_10d,
-                drop_from_high=drop_from_high,
-                max_drop=max_drop,
-                high_20d=high_20d,
-                volume=volume,
-                avg_volume_20d=avg_volume,
-                selection_reason=" | ".join(reasons)
-            )
+                candidate.name = code
 
             return candidate
 
@@ -447,44 +559,84 @@ class BNFSelector:
             logger.debug(f"낙폭과대 체크 실패 ({code}): {e}")
             return None
 
-    def select_oversold_stocks(self, date_str: str = None, top_n: int = 20) -> List[BNFCandidate]:
+    def _scan_batch(self, date_str: str) -> Optional[List[BNFCandidate]]:
         """
-        낙폭과대 종목 선정
+        KRX 일괄 스캔
 
-        Args:
-            date_str: 기준 날짜 (YYYYMMDD), None이면 최근 거래일
-            top_n: 상위 N개 선정
+        1) 전종목 일봉 (시장별 1회) → 시총/거래대금 필터
+        2) 통과 종목 히스토리를 (날짜 × 종목) 행렬 1회로 조회 (KRX 일봉 패널)
+        3) compute_oversold_metrics 로 낙폭 일괄 계산
 
         Returns:
-            선정된 종목 리스트 (낙폭 큰 순)
+            후보 리스트, KRX 사용 불가/전종목 데이터 없음이면 None (종목별 폴백)
         """
-        # 날짜 설정
-        if date_str is None:
-            date_str = datetime.now().strftime("%Y%m%d")
+        krx = _get_krx()
+        if not krx:
+            return None
 
-        self.selection_date = date_str
+        frames = []
+        for market in ('KOSPI', 'KOSDAQ'):
+            try:
+                df = krx.get_stock_ohlcv(date_str, market=market)
+            except Exception as e:
+                logger.warning(f"KRX 전종목 조회 실패 ({market}, {date_str}): {e}")
+                continue
+            if not df.empty:
+                frames.append(df)
 
-        logger.info(f"\n{'='*60}")
-        logger.info(f"BNF 낙폭과대 종목 선정 시작 ({date_str})")
-        logger.info(f"{'='*60}")
-        logger.info(f"선정 기준:")
-        logger.info(f"  - 5일 낙폭 >= {self.DROP_5D_THRESHOLD}% OR")
-        logger.info(f"  - 10일 낙폭 >= {self.DROP_10D_THRESHOLD}% OR")
-        logger.info(f"  - 고점 대비 >= {self.DROP_HIGH_THRESHOLD}%")
-        logger.info(f"  - 시가총액 >= {self.MIN_MARKET_CAP/1e12:.1f}조원")
-        logger.info(f"  - 거래대금 >= {self.MIN_TRADING_VALUE/1e9:.0f}억원")
-        logger.info(f"{'='*60}\n")
+        if not frames:
+            return None
+
+        universe = pd.concat(frames)
+        universe = universe[~universe.index.duplicated()]
+        logger.info(f"전체 종목: {len(universe)}개 (KRX 일봉)")
+
+        passed = universe[(universe['시가총액'] >= self.MIN_MARKET_CAP) &
+                          (universe['거래대금'] >= self.MIN_TRADING_VALUE)]
+        logger.info(f"시총/거래대금 필터 통과: {len(passed)}개")
+        if passed.empty:
+            return []
+
+        codes = list(passed.index)
+        start_date = (datetime.strptime(date_str, "%Y%m%d")
+                      - timedelta(days=self.LOOKBACK_DAYS + 15)).strftime("%Y%m%d")
+        try:
+            _, mats = krx.get_history_matrix(codes, start_date, date_str,
+                                             fields=("종가", "고가", "거래량"))
+        except Exception as e:
+            logger.warning(f"KRX 히스토리 행렬 조회 실패: {e}")
+            return None
+
+        metrics = compute_oversold_metrics(
+            mats["종가"], mats["고가"], mats["거래량"],
+            high_lookback=self.HIGH_LOOKBACK,
+        )
+
+        candidates = []
+        names = passed['종목명'] if '종목명' in passed.columns else pd.Series(codes, index=codes)
+        for j, code in enumerate(codes):
+            candidate = self._build_candidate(
+                code, str(names.iloc[j]),
+                int(passed['시가총액'].iloc[j]), int(passed['거래대금'].iloc[j]),
+                metrics, j,
+            )
+            if candidate:
+                candidates.append(candidate)
+                logger.info(f"  ✓ {candidate.name} ({candidate.code}): {candidate.selection_reason}")
 
-        # 전체 종목 조회
+        logger.info(f"\n분석 완료: {len(codes)}개 종목 체크, {len(candidates)}개 후보 발견")
+        return candidates
+
+    def _scan_per_code(self, date_str: str) -> Optional[List[BNFCandidate]]:
+        """종목별 스캔 (KRX 불가 시 폴백) — 종목 목록 조회 실패 시 None"""
         all_stocks = self.get_all_stocks(date_str)
 
         if not all_stocks:
             logger.error("종목 목록 조회 실패")
-            return []
+            return None
 
         logger.info(f"총 {len(all_stocks)}개 종목 분석 시작...")
 
-        # 종목별 체크
         candidates = []
         checked = 0
 
@@ -507,6 +659,42 @@ class BNFSelector:
                 continue
 
         logger.info(f"\n분석 완료: {checked}개 종목 체크, {len(candidates)}개 후보 발견")
+        return candidates
+
+    def select_oversold_stocks(self, date_str: str = None, top_n: int = 20) -> List[BNFCandidate]:
+        """
+        낙폭과대 종목 선정
+
+        Args:
+            date_str: 기준 날짜 (YYYYMMDD), None이면 최근 거래일
+            top_n: 상위 N개 선정
+
+        Returns:
+            선정된 종목 리스트 (낙폭 큰 순)
+        """
+        # 날짜 설정
+        if date_str is None:
+            date_str = datetime.now().strftime("%Y%m%d")
+
+        self.selection_date = date_str
+
+        logger.info(f"\n{'='*60}")
+        logger.info(f"BNF 낙폭과대 종목 선정 시작 ({date_str})")
+        logger.info(f"{'='*60}")
+        logger.info(f"선정 기준:")
+        logger.info(f"  - 5일 낙폭 >= {self.DROP_5D_THRESHOLD}% OR")
+        logger.info(f"  - 10일 낙폭 >= {self.DROP_10D_THRESHOLD}% OR")
+        logger.info(f"  - 고점 대비 >= {self.DROP_HIGH_THRESHOLD}%")
+        logger.info(f"  - 시가총액 >= {self.MIN_MARKET_CAP/1e12:.1f}조원")
+        logger.info(f"  - 거래대금 >= {self.MIN_TRADING_VALUE/1e9:.0f}억원")
+        logger.info(f"{'='*60}\n")
+
+        # KRX 일괄 스캔 → 불가 시 종목별 폴백
+        candidates = self._scan_batch(date_str)
+        if candidates is None:
+            candidates = self._scan_per_code(date_str)
+            if candidates is None:
+                return []
 
         # 낙폭 큰 순으로 정렬
         candidates.sort(key=lambda x: x.max_drop, reverse=True)
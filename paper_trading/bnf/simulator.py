@@ -11,9 +11,13 @@ from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 
+import numpy as np
+
 # 상위 디렉토리 모듈 import
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from paper_trading.utils.minute_bars import as_minute_bars, first_index, parse_minute, tp_sl_path
+
 try:
     from intraday_collector import IntradayCollector
     INTRADAY_AVAILABLE = True
@@ -198,121 +202,93 @@ class BNFSimulator:
         if not minute_data or len(minute_data) < 5:
             return entries
 
-        # 1차 진입: 하락 후 첫 양봉 찾기 (09:00 이후)
-        first_entry_found = False
-        first_entry_price = 0
-
-        for i in range(1, len(minute_data)):
-            candle = minute_data[i]
-            prev_candle = minute_data[i-1]
-
-            # 09:00 이전은 스킵
-            if candle['time'] < '09:00:00':
-                continue
-
-            # 양봉 확인 (종가 > 시가)
-            is_green = candle['close'] > candle['open']
-
-            # 이전 캔들이 음봉이고 현재가 양봉 -> 반등 신호
-            prev_is_red = prev_candle['close'] < prev_candle['open']
-
-            if is_green and prev_is_red and not first_entry_found:
-                amount_1 = int(entry_amount * self.ENTRY_WEIGHTS[0])
-                price_1 = candle['close']
-                qty_1 = amount_1 // price_1
-
-                if qty_1 > 0:
-                    entries.append(EntryPoint(
-                        entry_num=1,
-                        time=candle['time'],
-                        price=price_1,
-                        weight=self.ENTRY_WEIGHTS[0],
-                        amount=amount_1,
-                        quantity=qty_1,
-                        reason="첫 반등 신호 (양봉 전환)"
-                    ))
-                    first_entry_found = True
-                    first_entry_price = price_1
-                    break
-
-        if not first_entry_found:
+        bars = as_minute_bars(minute_data)
+        n = len(bars)
+        idx = np.arange(n)
+        opens, highs, closes = bars.open, bars.high, bars.close
+
+        # 1차 진입: 하락 후 첫 양봉 (09:00 이후, 이전 캔들 음봉 → 현재 양봉 = 반등 신호)
+        amount_1 = int(entry_amount * self.ENTRY_WEIGHTS[0])
+        is_green = closes > opens
+        prev_is_red = np.zeros(n, dtype=bool)
+        prev_is_red[1:] = (closes < opens)[:-1]
+        # 매수 수량 (금액 // 가격) 이 0 이면 다음 신호를 찾는다
+        i = first_index((idx >= 1) & bars.since('09:00:00') & is_green & prev_is_red
+                        & (closes <= amount_1))
+        if i < 0:
             return entries
 
+        first_entry_price = int(closes[i])
+        entries.append(EntryPoint(
+            entry_num=1,
+            time=bars.labels[i],
+            price=first_entry_price,
+            weight=self.ENTRY_WEIGHTS[0],
+            amount=amount_1,
+            quantity=amount_1 // first_entry_price,
+            reason="첫 반등 신호 (양봉 전환)"
+        ))
+
         # 2차 진입: 1차 진입 후 +1% 이상 상승 확인
-        second_entry_found = False
-        second_entry_high = first_entry_price
-
-        first_idx = next(i for i, c in enumerate(minute_data) if c['time'] == entries[0].time)
-
-        for i in range(first_idx + 1, len(minute_data)):
-            candle = minute_data[i]
-            current_price = candle['close']
-
-            # 고점 업데이트
-            if candle['high'] > second_entry_high:
-                second_entry_high = candle['high']
-
-            # 1차 진입가 대비 +1% 이상 상승 확인
-            gain_pct = (current_price - first_entry_price) / first_entry_price * 100
-
-            if gain_pct >= self.CONTINUATION_PCT and not second_entry_found:
-                amount_2 = int(entry_amount * self.ENTRY_WEIGHTS[1])
-                price_2 = current_price
-                qty_2 = amount_2 // price_2
-
-                if qty_2 > 0:
-                    entries.append(EntryPoint(
-                        entry_num=2,
-                        time=candle['time'],
-                        price=price_2,
-                        weight=self.ENTRY_WEIGHTS[1],
-                        amount=amount_2,
-                        quantity=qty_2,
-                        reason=f"상승 확인 (+{gain_pct:.2f}%)"
-                    ))
-                    second_entry_found = True
-                    break
-
-        if not second_entry_found:
+        first_idx = bars.labels.index(entries[0].time)
+        amount_2 = int(entry_amount * self.ENTRY_WEIGHTS[1])
+        gain = (closes - first_entry_price) / first_entry_price * 100
+        i = first_index((idx > first_idx) & (gain >= self.CONTINUATION_PCT) & (closes <= amount_2))
+        if i < 0:
             return entries
 
+        price_2 = int(closes[i])
+        gain_pct = (price_2 - first_entry_price) / first_entry_price * 100
+        entries.append(EntryPoint(
+            entry_num=2,
+            time=bars.labels[i],
+            price=price_2,
+            weight=self.ENTRY_WEIGHTS[1],
+            amount=amount_2,
+            quantity=amount_2 // price_2,
+            reason=f"상승 확인 (+{gain_pct:.2f}%)"
+        ))
+        # 1차 진입가 ~ 2차 진입 봉까지의 고점
+        second_entry_high = max(first_entry_price, int(highs[first_idx + 1:i + 1].max()))
+
         # 3차 진입: 2차 진입 후 고점에서 -1% 풀백
-        third_entry_found = False
-        recent_high = second_entry_high
-
-        second_idx = next(i for i, c in enumerate(minute_data) if c['time'] == entries[1].time)
-
-        for i in range(second_idx + 1, len(minute_data)):
-            candle = minute_data[i]
-            current_price = candle['close']
-
-            # 고점 업데이트
-            if candle['high'] > recent_high:
-                recent_high = candle['high']
-
-            # 고점 대비 -1% 풀백 확인
-            pullback_pct = (current_price - recent_high) / recent_high * 100
-
-            if pullback_pct <= self.PULLBACK_PCT and not third_entry_found:
-                amount_3 = int(entry_amount * self.ENTRY_WEIGHTS[2])
-                price_3 = current_price
-                qty_3 = amount_3 // price_3
-
-                if qty_3 > 0:
-                    entries.append(EntryPoint(
-                        entry_num=3,
-                        time=candle['time'],
-                        price=price_3,
-                        weight=self.ENTRY_WEIGHTS[2],
-                        amount=amount_3,
-                        quantity=qty_3,
-                        reason=f"풀백 진입 ({pullback_pct:.2f}% from high)"
-                    ))
-                    third_entry_found = True
-                    break
+        second_idx = bars.labels.index(entries[1].time)
+        amount_3 = int(entry_amount * self.ENTRY_WEIGHTS[2])
+        after = slice(second_idx + 1, n)
+        recent_high = np.maximum(np.maximum.accumulate(highs[after]), second_entry_high) \
+            if second_idx + 1 < n else np.zeros(0, dtype=np.int64)
+        pullback = (closes[after] - recent_high) / np.where(recent_high > 0, recent_high, 1) * 100
+        k = first_index((pullback <= self.PULLBACK_PCT) & (closes[after] > 0)
+                        & (closes[after] <= amount_3))
+        if k < 0:
+            return entries
+
+        i = second_idx + 1 + k
+        price_3 = int(closes[i])
+        entries.append(EntryPoint(
+            entry_num=3,
+            time=bars.labels[i],
+            price=price_3,
+            weight=self.ENTRY_WEIGHTS[2],
+            amount=amount_3,
+            quantity=amount_3 // price_3,
+            reason=f"풀백 진입 ({float(pullback[k]):.2f}% from high)"
+        ))
 
         return entries
 
+    def _trailing_stops(self, entry_price: int, current_high: np.ndarray,
+                        profit_pct: np.ndarray) -> np.ndarray:
+        """calculate_trailing_stop 의 배열판 (봉별 트레일링 스탑 가격)"""
+        return np.select(
+            [profit_pct < self.BREAKEVEN_THRESHOLD,
+             profit_pct < self.TRAIL_START,
+             profit_pct < self.TRAIL_THRESHOLD_2],
+            [np.floor(entry_price * (1 + self.INITIAL_STOP / 100)) + np.zeros(len(profit_pct)),
+             np.full(len(profit_pct), float(entry_price)),
+             np.floor(current_high * (1 - self.TRAIL_PERCENT_1 / 100))],
+            np.floor(current_high * (1 - self.TRAIL_PERCENT_2 / 100)))
+
     def find_exit_points(self,
                         entries: List[EntryPoint],
                         minute_data: List[Dict]) -> List[ExitPoint]:
@@ -344,151 +320,87 @@ class BNFSimulator:
         total_cost = sum(e.price * e.quantity for e in entries)
         avg_entry_price = total_cost / total_quantity
 
-        # 마지막 진입 시점부터 분석
-        last_entry_time = entries[-1].time
-        last_entry_idx = next(i for i, c in enumerate(minute_data) if c['time'] == last_entry_time)
-
-        # 청산 추적 변수
-        exit_1_done = False
-        exit_2_done = False
-        exit_3_done = False
-
-        current_high = avg_entry_price
-        remaining_quantity = total_quantity
-
-        for i in range(last_entry_idx, len(minute_data)):
-            candle = minute_data[i]
-
-            # 현재 고점 업데이트
-            if candle['high'] > current_high:
-                current_high = candle['high']
-
-            current_price = candle['close']
-            current_profit_pct = (current_price - avg_entry_price) / avg_entry_price * 100
+        # 마지막 진입 시점부터 분석 — 봉별 고점/수익률/트레일링 스탑을 배열로 계산해
+        # 1차 → 2차 → 3차 청산 조건의 최초 도달 봉을 차례로 찾는다 (봉당 청산 1건)
+        bars = as_minute_bars(minute_data)
+        start = bars.labels.index(entries[-1].time)
+        highs = bars.high[start:]
+        lows = bars.low[start:]
+        closes = bars.close[start:]
+        idx = np.arange(len(closes))
+
+        current_high = np.maximum(np.maximum.accumulate(highs), avg_entry_price)
+        profit_pct = (closes - avg_entry_price) / avg_entry_price * 100
+        stop_hit = lows <= self._trailing_stops(int(avg_entry_price), current_high, profit_pct)
+
+        def exit_point(exit_num, k, price, quantity, pct, reason):
+            return ExitPoint(
+                exit_num=exit_num,
+                time=bars.labels[start + k],
+                price=price,
+                weight=self.EXIT_WEIGHTS[exit_num - 1],
+                quantity=quantity,
+                profit_pct=pct,
+                profit_amount=int((price - avg_entry_price) * quantity),
+                reason=reason
+            )
 
-            # 트레일링 스탑 가격 계산
-            trailing_stop = self.calculate_trailing_stop(
+        def stop_price(k):
+            return self.calculate_trailing_stop(
                 int(avg_entry_price),
-                current_high,
-                current_profit_pct
+                max(avg_entry_price, int(highs[:k + 1].max())),
+                float(profit_pct[k])
             )
 
-            # 1차 청산: +5% 목표
-            if not exit_1_done and current_profit_pct >= self.EXIT_TARGETS[0]:
-                qty_1 = int(total_quantity * self.EXIT_WEIGHTS[0])
-                price_1 = int(avg_entry_price * (1 + self.EXIT_TARGETS[0] / 100))
-
-                exits.append(ExitPoint(
-                    exit_num=1,
-                    time=candle['time'],
-                    price=price_1,
-                    weight=self.EXIT_WEIGHTS[0],
-                    quantity=qty_1,
-                    profit_pct=self.EXIT_TARGETS[0],
-                    profit_amount=int((price_1 - avg_entry_price) * qty_1),
-                    reason=f"+{self.EXIT_TARGETS[0]}% 목표 도달"
-                ))
-                exit_1_done = True
-                remaining_quantity -= qty_1
-                continue
+        exit_3_done = False
+        remaining_quantity = total_quantity
+
+        # 1차 청산: +5% 목표
+        k1 = first_index(profit_pct >= self.EXIT_TARGETS[0])
+        if k1 >= 0:
+            qty_1 = int(total_quantity * self.EXIT_WEIGHTS[0])
+            price_1 = int(avg_entry_price * (1 + self.EXIT_TARGETS[0] / 100))
+            exits.append(exit_point(1, k1, price_1, qty_1, self.EXIT_TARGETS[0],
+                                    f"+{self.EXIT_TARGETS[0]}% 목표 도달"))
+            remaining_quantity -= qty_1
 
             # 2차 청산: +10% 목표 또는 트레일링 스탑
-            if exit_1_done and not exit_2_done:
-                # +10% 목표 도달
-                if current_profit_pct >= self.EXIT_TARGETS[1]:
-                    qty_2 = int(total_quantity * self.EXIT_WEIGHTS[1])
+            target_2 = profit_pct >= self.EXIT_TARGETS[1]
+            k2 = first_index((idx > k1) & (target_2 | stop_hit))
+            if k2 >= 0:
+                qty_2 = int(total_quantity * self.EXIT_WEIGHTS[1])
+                if target_2[k2]:
                     price_2 = int(avg_entry_price * (1 + self.EXIT_TARGETS[1] / 100))
-
-                    exits.append(ExitPoint(
-                        exit_num=2,
-                        time=candle['time'],
-                        price=price_2,
-                        weight=self.EXIT_WEIGHTS[1],
-                        quantity=qty_2,
-                        profit_pct=self.EXIT_TARGETS[1],
-                        profit_amount=int((price_2 - avg_entry_price) * qty_2),
-                        reason=f"+{self.EXIT_TARGETS[1]}% 목표 도달"
-                    ))
-                    exit_2_done = True
-                    remaining_quantity -= qty_2
-                    continue
-
-                # 트레일링 스탑 히트
-                if candle['low'] <= trailing_stop:
-                    qty_2 = int(total_quantity * self.EXIT_WEIGHTS[1])
-                    price_2 = trailing_stop
+                    exits.append(exit_point(2, k2, price_2, qty_2, self.EXIT_TARGETS[1],
+                                            f"+{self.EXIT_TARGETS[1]}% 목표 도달"))
+                else:
+                    price_2 = stop_price(k2)
                     exit_pct = (price_2 - avg_entry_price) / avg_entry_price * 100
-
-                    exits.append(ExitPoint(
-                        exit_num=2,
-                        time=candle['time'],
-                        price=price_2,
-                        weight=self.EXIT_WEIGHTS[1],
-                        quantity=qty_2,
-                        profit_pct=exit_pct,
-                        profit_amount=int((price_2 - avg_entry_price) * qty_2),
-                        reason=f"트레일링 스탑 ({exit_pct:+.2f}%)"
-                    ))
-                    exit_2_done = True
-                    remaining_quantity -= qty_2
-                    continue
-
-            # 3차 청산: 트레일링 스탑 또는 15:20 강제 청산
-            if exit_1_done and exit_2_done and not exit_3_done:
-                # 트레일링 스탑 히트
-                if candle['low'] <= trailing_stop:
-                    qty_3 = remaining_quantity
-                    price_3 = trailing_stop
-                    exit_pct = (price_3 - avg_entry_price) / avg_entry_price * 100
-
-                    exits.append(ExitPoint(
-                        exit_num=3,
-                        time=candle['time'],
-                        price=price_3,
-                        weight=self.EXIT_WEIGHTS[2],
-                        quantity=qty_3,
-                        profit_pct=exit_pct,
-                        profit_amount=int((price_3 - avg_entry_price) * qty_3),
-                        reason=f"트레일링 스탑 ({exit_pct:+.2f}%)"
-                    ))
-                    exit_3_done = True
-                    break
-
-                # 15:20 강제 청산
-                if candle['time'][:5] >= self.EXIT_DEADLINE:
-                    qty_3 = remaining_quantity
-                    price_3 = candle['close']
-                    exit_pct = (price_3 - avg_entry_price) / avg_entry_price * 100
-
-                    exits.append(ExitPoint(
-                        exit_num=3,
-                        time=candle['time'],
-                        price=price_3,
-                        weight=self.EXIT_WEIGHTS[2],
-                        quantity=qty_3,
-                        profit_pct=exit_pct,
-                        profit_amount=int((price_3 - avg_entry_price) * qty_3),
-                        reason=f"장 마감 청산 ({exit_pct:+.2f}%)"
-                    ))
+                    exits.append(exit_point(2, k2, price_2, qty_2, exit_pct,
+                                            f"트레일링 스탑 ({exit_pct:+.2f}%)"))
+                remaining_quantity -= qty_2
+
+                # 3차 청산: 트레일링 스탑 또는 15:20 강제 청산
+                deadline = bars.minute[start:] >= parse_minute(self.EXIT_DEADLINE)
+                k3 = first_index((idx > k2) & (stop_hit | deadline))
+                if k3 >= 0:
+                    if stop_hit[k3]:
+                        price_3 = stop_price(k3)
+                        exit_pct = (price_3 - avg_entry_price) / avg_entry_price * 100
+                        reason = f"트레일링 스탑 ({exit_pct:+.2f}%)"
+                    else:
+                        price_3 = int(closes[k3])
+                        exit_pct = (price_3 - avg_entry_price) / avg_entry_price * 100
+                        reason = f"장 마감 청산 ({exit_pct:+.2f}%)"
+                    exits.append(exit_point(3, k3, price_3, remaining_quantity, exit_pct, reason))
                     exit_3_done = True
-                    break
 
         # 장 마감까지 청산 안된 경우 마지막 가격으로 강제 청산
-        if not exit_3_done and minute_data and remaining_quantity > 0:
-            last_candle = minute_data[-1]
-            price_final = last_candle['close']
+        if not exit_3_done and len(bars) and remaining_quantity > 0:
+            price_final = int(bars.close[-1])
             exit_pct = (price_final - avg_entry_price) / avg_entry_price * 100
-
-            exits.append(ExitPoint(
-                exit_num=3,
-                time=last_candle['time'],
-                price=price_final,
-                weight=self.EXIT_WEIGHTS[2],
-                quantity=remaining_quantity,
-                profit_pct=exit_pct,
-                profit_amount=int((price_final - avg_entry_price) * remaining_quantity),
-                reason=f"장 종료 강제 청산 ({exit_pct:+.2f}%)"
-            ))
+            exits.append(exit_point(3, len(closes) - 1, price_final, remaining_quantity, exit_pct,
+                                    f"장 종료 강제 청산 ({exit_pct:+.2f}%)"))
 
         return exits
 
@@ -515,8 +427,11 @@ class BNFSimulator:
             print(f"  [{name}] 분봉 데이터 부족 - 스킵")
             return None
 
+        # 분봉 배열 변환 1회 — 진입/청산 탐색과 최대수익 계산이 공유
+        bars = as_minute_bars(minute_data)
+
         # 1. 진입점 탐색
-        entries = self.find_entry_points(minute_data, entry_amount)
+        entries = self.find_entry_points(bars, entry_amount)
 
         if not entries:
             print(f"  [{name}] 진입 신호 없음 - 스킵")
@@ -528,7 +443,7 @@ class BNFSimulator:
         avg_entry_price = total_cost / total_quantity if total_quantity > 0 else 0
 
         # 3. 청산점 탐색
-        exits = self.find_exit_points(entries, minute_data)
+        exits = self.find_exit_points(entries, bars)
 
         # 4. 손익 계산
         total_exit_amount = sum(e.price * e.quantity for e in exits)
@@ -541,22 +456,16 @@ class BNFSimulator:
         current_high = avg_entry_price
 
         if entries:
-            last_entry_time = entries[-1].time
-            last_entry_idx = next(i for i, c in enumerate(minute_data) if c['time'] == last_entry_time)
-
-            for i in range(last_entry_idx, len(minute_data)):
-                candle = minute_data[i]
-
-                if candle['high'] > current_high:
-                    current_high = candle['high']
-
-                high_pct = (candle['high'] - avg_entry_price) / avg_entry_price * 100
-                low_pct = (candle['low'] - avg_entry_price) / avg_entry_price * 100
-
-                if high_pct > max_profit_pct:
-                    max_profit_pct = high_pct
-                if low_pct < max_loss_pct:
-                    max_loss_pct = low_pct
+            start = bars.labels.index(entries[-1].time)
+            path = tp_sl_path(bars, avg_entry_price, np.inf, -np.inf,
+                              mask=np.arange(len(bars)) >= start)
+            if path.max_profit_pct[0] > 0:
+                max_profit_pct = float(path.max_profit_pct[0])
+            if path.max_loss_pct[0] < 0:
+                max_loss_pct = float(path.max_loss_pct[0])
+            session_high = int(bars.high[start:].max())
+            if session_high > current_high:
+                current_high = session_high
 
         # 6. 트레일링 스탑 히스토리 생성
         trailing_stop_history = []
@@ -0,0 +1,223 @@
+"""
+BNFSelector 일괄 스캔 단위 테스트.
+
+검증 항목:
+1. compute_oversold_metrics — 종목별 기존 계산(날짜 창별 OHLCV 재조회)과 동일
+2. select_oversold_stocks (KRX 일괄) — 전종목 1회 + 히스토리 행렬 1회, 종목별 스크래핑 없음
+3. 종목별 폴백 — KRX 불가 시 종목당 OHLCV 1회만 조회
+
+실행:
+    python -m paper_trading.bnf.test_selector
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from paper_trading.bnf import selector as selector_mod
+from paper_trading.bnf.selector import BNFSelector, compute_oversold_metrics
+
+
+def _random_panel(T=25, C=30, seed=11):
+    rng = np.random.default_rng(seed)
+    closes = np.round(10000 * np.exp(np.cumsum(rng.normal(-0.01, 0.05, size=(T, C)), axis=0)))
+    highs = closes * (1 + rng.uniform(0, 0.05, size=(T, C)))
+    volumes = rng.integers(1_000, 100_000, size=(T, C)).astype(float)
+    gaps = rng.random((T, C)) < 0.1    # 거래정지
+    gaps[:, 0] = False
+    gaps[-2:, 1] = True                # 최근 2일 미거래 → 현재가 없음
+    for m in (closes, highs, volumes):
+        m[gaps] = np.nan
+    return closes, highs, volumes
+
+
+def _legacy(closes, highs, volumes, j):
+    """기존 calculate_drop_percentage / get_high_to_current_drop / get_volume_info 원본 공식."""
+    def frame(rows):
+        df = pd.DataFrame({"종가": closes[-rows:, j], "고가": highs[-rows:, j],
+                           "거래량": volumes[-rows:, j]})
+        return df.dropna()
+
+    def drop(n):
+        df = frame(n + 1)
+        if df.empty or len(df) < 2 or df.iloc[0]["종가"] == 0:
+            return 0.0
+        past, cur = df.iloc[0]["종가"], df.iloc[-1]["종가"]
+        return round((past - cur) / past * 100, 2)
+
+    df = frame(21)
+    high = df["고가"].max() if not df.empty else 0
+    drop_high = round((high - df.iloc[-1]["종가"]) / high * 100, 2) if high else 0.0
+    volume = int(df.iloc[-1]["거래량"]) if not df.empty else 0
+    avg_volume = int(df["거래량"].mean()) if not df.empty else 0
+    price = frame(2)
+    return {
+        "drop_5d": drop(5), "drop_10d": drop(10),
+        "drop_from_high": drop_high, "high": int(high),
+        "volume": volume, "avg_volume": avg_volume,
+        "price": None if price.empty else int(price.iloc[-1]["종가"]),
+    }
+
+
+def test_metrics_match_legacy():
+    """일괄 계산 == 종목별 기존 계산 (거래정지 결측 포함)."""
+    closes, highs, volumes = _random_panel()
+    m = compute_oversold_metrics(closes, highs, volumes)
+    for j in range(closes.shape[1]):
+        ref = _legacy(closes, highs, volumes, j)
+        assert round(float(m["drop_5d"][j]), 2) == ref["drop_5d"], j
+        assert round(float(m["drop_10d"][j]), 2) == ref["drop_10d"], j
+        assert round(float(m["drop_from_high"][j]), 2) == ref["drop_from_high"], j
+        assert int(m["high"][j]) == ref["high"], j
+        assert int(m["volume"][j]) == ref["volume"], j
+        assert int(m["avg_volume"][j]) == ref["avg_volume"], j
+        price = None if np.isnan(m["price"][j]) else int(m["price"][j])
+        assert price == ref["price"], j
+    print(f"  [OK] {closes.shape[1]}종목 낙폭/고점/거래량 == 종목별 계산")
+
+
+class _FakeKRX:
+    def __init__(self, universe, mats):
+        self.universe = universe
+        self.mats = mats
+        self.calls = []
+
+    def get_stock_ohlcv(self, date, market="KOSPI"):
+        self.calls.append(("ohlcv", market))
+        return self.universe if market == "KOSPI" else pd.DataFrame()
+
+    def get_history_matrix(self, codes, start, end, markets=("KOSPI", "KOSDAQ"), fields=None):
+        self.calls.append(("matrix", tuple(codes)))
+        cols = [list(self.universe.index).index(c) for c in codes]
+        return ["d"] * 21, {f: self.mats[f][:, cols] for f in fields}
+
+
+class _NoScrape:
+    def __getattr__(self, name):
+        raise AssertionError(f"종목별 조회 발생: {name}")
+
+
+def test_batch_scan():
+    """KRX 일괄 경로 — 시총/거래대금 필터 후 통과 종목만 행렬 조회, 낙폭 순 정렬."""
+    T = 21
+    base = np.full(T, 10000.0)
+    crash = np.concatenate([np.full(T - 5, 10000.0), [9000, 8500, 8000, 7800, 7500]])
+    slide = np.linspace(10000, 7400, T)
+    closes = np.column_stack([base, crash, slide, crash])
+    mats = {"종가": closes, "고가": closes * 1.01, "거래량": np.full((T, 4), 5000.0)}
+    universe = pd.DataFrame({
+        "종목명": ["보합", "급락", "하락", "소형"],
+        "종가": closes[-1],
+        "시가총액": [2e12, 3e12, 2e12, 1e11],
+        "거래대금": [2e10, 5e10, 3e10, 5e10],
+    }, index=["000010", "000020", "000030", "000040"])
+
+    fake = _FakeKRX(universe, mats)
+    orig_get_krx, orig_stock = selector_mod._get_krx, selector_mod.stock
+    selector_mod._get_krx = lambda: fake
+    selector_mod.stock = _NoScrape()
+    try:
+        sel = BNFSelector()
+        sel.MAX_PER_THEME = None
+        picks = sel.select_oversold_stocks("20260410", top_n=5)
+    finally:
+        selector_mod._get_krx, selector_mod.stock = orig_get_krx, orig_stock
+
+    # 낙폭 큰 순: 하락(고점 대비 26.7%) > 급락(고점 대비 25.7%)
+    assert [c.code for c in picks] == ["000030", "000020"], [c.code for c in picks]
+    crash_pick = picks[1]
+    assert crash_pick.name == "급락" and crash_pick.current_price == 7500
+    assert crash_pick.drop_5d == 25.0 and crash_pick.rank == 2
+    assert crash_pick.high_20d == 10100 and crash_pick.volume == 5000
+    # 소형주(시총 미달)는 히스토리 조회 대상에서 제외
+    matrix_calls = [c for c in fake.calls if c[0] == "matrix"]
+    assert matrix_calls == [("matrix", ("000010", "000020", "000030"))]
+    print(f"  [OK] 일괄 스캔: {len(picks)}개 선정, 히스토리 행렬 1회")
+
+
+class _FakeStock:
+    def __init__(self, frames):
+        self.frames = frames
+        self.ohlcv_calls = []
+
+    def get_index_ohlcv(self, start, end, code):
+        return pd.DataFrame()
+
+    def get_market_ticker_list(self, date, market="KOSPI"):
+        return list(self.frames) if market == "KOSPI" else []
+
+    def get_market_cap(self, start, end, code):
+        return pd.DataFrame([{"시가총액": 5e12, "거래대금": 5e10}])
+
+    def get_market_ohlcv(self, start, end, code):
+        self.ohlcv_calls.append(code)
+        return self.frames[code]
+
+    def get_market_ticker_name(self, code):
+        return f"종목{code}"
+
+
+def test_per_code_fallback_fetches_once():
+    """KRX 불가 → 종목별 경로, 종목당 OHLCV 1회."""
+    closes = np.concatenate([np.full(16, 10000.0), [9000, 8500, 8000, 7800, 7500]])
+    frames = {
+        "000020": pd.DataFrame({"종가": closes, "고가": closes, "거래량": 1000.0}),
+        "000010": pd.DataFrame({"종가": np.full(21, 10000.0), "고가": 10000.0, "거래량": 1000.0}),
+    }
+    fake = _FakeStock(frames)
+    orig_get_krx, orig_stock = selector_mod._get_krx, selector_mod.stock
+    selector_mod._get_krx = lambda: None
+    selector_mod.stock = fake
+    try:
+        sel = BNFSelector()
+        sel.MAX_PER_THEME = None
+        picks = sel.select_oversold_stocks("20260410", top_n=5)
+    finally:
+        selector_mod._get_krx, selector_mod.stock = orig_get_krx, orig_stock
+
+    assert [c.code for c in picks] == ["000020"]
+    assert picks[0].name == "종목000020" and picks[0].drop_5d == 25.0
+    assert sorted(fake.ohlcv_calls) == ["000010", "000020"], fake.ohlcv_calls
+    print("  [OK] 폴백 경로: 종목당 OHLCV 1회")
+
+
+def main():
+    print("=" * 60)
+    print("BNFSelector 일괄 스캔 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_metrics_match_legacy,
+        test_batch_scan,
+        test_per_code_fallback_fetches_once,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from paper_trading.strategies import StrategyRegistry
 from paper_trading.simulator import TradingSimulator
 from paper_trading.selector import StockCandidate
-from utils import format_kst_time, is_market_day
+from paper_trading.utils.trading_calendar import get_trading_calendar
+from utils import format_kst_time
 
 DATA_DIR = Path(__file__).parent.parent / "data" / "paper_trading"
 
@@ -26,7 +27,7 @@ def _resolve_fetch_date(date_str: str) -> str:
     """주어진 날짜가 비거래일이거나 KRX에 아직 데이터가 없으면 가장 가까운 과거 거래일로 거슬러 올라감.
 
     평일이라도 KRX OpenAPI가 해당 일자 데이터를 업로드하기 전이면 빈 응답이 온다
-    (관측 사례: 20260422). 이 경우 is_market_day만으로는 폴백이 안 되어 전략이 0건으로 죽는다.
+    (관측 사례: 20260422). 이 경우 거래일 판정만으로는 폴백이 안 되어 전략이 0건으로 죽는다.
     KRXClient.get_stock_ohlcv로 실제 데이터 유무까지 확인한다.
 
     Args:
@@ -35,27 +36,30 @@ def _resolve_fetch_date(date_str: str) -> str:
     Returns:
         가장 최근 거래일 (YYYYMMDD)
     """
-    # KRX 클라이언트는 선택적 — 키 없거나 예외 시 평일 체크로만 폴백 (기존 동작)
+    # KRX 클라이언트는 선택적 — 키 없거나 예외 시 거래일 캘린더로만 판정
     try:
         from paper_trading.utils.krx_api import KRXClient
         _krx = KRXClient()
     except Exception:
         _krx = None
 
-    dt = datetime.strptime(date_str, '%Y%m%d')
-    for _ in range(10):  # 최대 10일 거슬러 올라가기
-        candidate = dt.strftime('%Y%m%d')
-        if is_market_day(dt):
-            if _krx is None:
+    # 후보는 거래일 캘린더 인덱스에서 (주말/공휴일 조회 없음), KRX 개장 확정 날짜는 조회 생략
+    cal = get_trading_calendar()
+    floor = (datetime.strptime(date_str, '%Y%m%d') - timedelta(days=9)).strftime('%Y%m%d')
+    candidate = cal.last_trading_day(date_str)
+    while candidate and candidate >= floor:  # 최대 10일 거슬러 올라가기
+        if _krx is None or cal.is_confirmed(candidate):
+            return candidate
+        try:
+            has_data = _krx.has_trading_data(candidate, market='KOSPI', kind='stock')
+            if has_data is not None:              # 조회 실패 (None) 는 휴장으로 기록하지 않음
+                cal.observe(candidate, has_data)
+            if has_data:
                 return candidate
-            try:
-                df = _krx.get_stock_ohlcv(candidate, market='KOSPI')
-                if df is not None and len(df) > 0:
-                    return candidate
-            except Exception:
-                # KRX 호출 실패 시에도 평일 날짜는 유효로 간주 (기존 동작 유지)
-                return candidate
-        dt -= timedelta(days=1)
+        except Exception:
+            # KRX 호출 실패 시에도 거래일 날짜는 유효로 간주 (기존 동작 유지)
+            return candidate
+        candidate = cal.prev_trading_day(candidate)
     return date_str
 
 
@@ -6,20 +6,25 @@ ShadowLogger — paper trading shadow 4주 운영의 일일 데이터 기록.
 - shadow_positions.json (overwrite, 현재 보유 상태 스냅샷)
 - shadow_intraday.jsonl (append-only, 선택적)
 - shadow_trades.jsonl   (append-only, 멱등 키 = position_id)
+- shadow_index.json     (멱등 키 인덱스 사이드카 — 재생성 가능한 캐시)
 
 격리: data/paper_trading_shadow/<variant_id>/ — 변형별 디렉토리 분리.
 원자성: positions.json 은 tempfile + rename 으로 갱신 (크래시 방어).
+멱등 검사: 메모리 키 인덱스 (O(1)) — 파일 크기(offset) 까지 반영, 늘어난 꼬리만 증분 파싱.
+append: 배치 단위 1회 write + fsync.
 """
 
 from __future__ import annotations
 
 import json
 import os
-import tempfile
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from ..utils.atomic_io import write_json_atomic
 
 # ============================================================
 # 상수 / 화이트리스트
@@ -36,6 +41,9 @@ VARIANT_WHITELIST: Set[str] = {
 # 데이터 위치 — plan §6 "프로젝트 내 격리"
 DEFAULT_LOG_ROOT = Path(__file__).parent.parent.parent / "data" / "paper_trading_shadow"
 
+# 사이드카 인덱스 저장 주기 — 마지막 저장 이후 이만큼(bytes) JSONL 이 늘면 재저장
+INDEX_FLUSH_BYTES: int = 64 * 1024
+
 
 # ============================================================
 # 예외
@@ -127,32 +135,102 @@ def _validate_trade(trade: Dict) -> None:
 # 파일 I/O 유틸
 # ============================================================
 
-def _atomic_write_json(path: Path, data: Dict) -> None:
-    """tempfile + rename 으로 원자적 덮어쓰기."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=path.name + ".tmp.")
-    try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        os.replace(tmp, path)
-    except Exception:
-        try:
-            os.unlink(tmp)
-        except FileNotFoundError:
-            pass
-        raise
+def _jsonl_line(record: Dict) -> str:
+    line = json.dumps(record, ensure_ascii=False, sort_keys=False)
+    if "\n" in line:
+        raise ShadowLogError("JSONL 레코드에 개행 포함 — 멀티라인 금지")
+    return line
 
 
 def _append_jsonl(path: Path, record: Dict) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    line = json.dumps(record, ensure_ascii=False, sort_keys=False)
-    if "\n" in line:
-        raise ShadowLogError("JSONL 레코드에 개행 포함 — 멀티라인 금지")
+    line = _jsonl_line(record)
     with open(path, "a", encoding="utf-8") as f:
         f.write(line)
         f.write("\n")
 
 
+def _append_jsonl_batch(path: Path, records: List[Dict]) -> Tuple[int, int]:
+    """레코드 묶음을 1회 write + fsync. 반환: (append 전 offset, append 후 offset)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = "".join(_jsonl_line(r) + "\n" for r in records).encode("utf-8")
+    with open(path, "ab") as f:
+        start = f.tell()
+        # 직전 쓰기가 줄바꿈 없이 끊겼으면 새 줄에서 시작 (끊긴 조각은 파싱 시 skip)
+        if not _ends_with_newline(path, start):
+            payload = b"\n" + payload
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+        return start, f.tell()
+
+
+def _read_jsonl_from(path: Path, offset: int) -> Tuple[List[Dict], int]:
+    """offset 부터 완결된(개행으로 끝나는) 라인만 파싱. 반환: (레코드, 새 offset)."""
+    if not path.exists():
+        return [], 0
+    with open(path, "rb") as f:
+        f.seek(offset)
+        chunk = f.read()
+    end = chunk.rfind(b"\n") + 1   # 마지막 라인이 쓰는 중이면 다음 sync 로 미룸
+    out: List[Dict] = []
+    for ln in chunk[:end].splitlines():
+        ln = ln.strip()
+        if not ln:
+            continue
+        try:
+            out.append(json.loads(ln))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+    return out, offset + end
+
+
+class _KeyIndex:
+    """JSONL 파일 1개의 멱등 키 집합 — offset 까지의 라인이 반영됨.
+
+    sync() 는 stat 1회로 파일 증가분만 증분 파싱 (다른 인스턴스/프로세스의 append 포함).
+    파일이 줄었거나(truncate) 사이드카가 어긋나면 처음부터 재구축.
+    """
+
+    def __init__(self, path: Path, key_fn: Callable[[Dict], Hashable]):
+        self.path = path
+        self.key_fn = key_fn
+        self.keys: Set[Hashable] = set()
+        self.offset = 0
+        self.loaded = False
+
+    def restore(self, keys: Iterable[Hashable], offset: int) -> None:
+        self.keys = set(keys)
+        self.offset = offset
+        self.loaded = True
+
+    def sync(self) -> None:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size < self.offset:
+            self.keys, self.offset = set(), 0
+        if size > self.offset:
+            records, self.offset = _read_jsonl_from(self.path, self.offset)
+            self.keys.update(self.key_fn(r) for r in records)
+        self.loaded = True
+
+    def advance(self, start: int, end: int, keys: Iterable[Hashable]) -> None:
+        """자기 append 반영 — 사이에 남의 append 가 끼었으면 offset 은 두고 다음 sync 에 맡김."""
+        self.keys.update(keys)
+        if start == self.offset:
+            self.offset = end
+
+
+def _signal_key(r: Dict) -> Tuple[str, str]:
+    return (r.get("signal_date", ""), r.get("code", ""))
+
+
+def _trade_key(r: Dict) -> str:
+    return r.get("position_id", "")
+
+
 def _read_jsonl(path: Path) -> List[Dict]:
     if not path.exists():
         return []
@@ -184,6 +262,7 @@ class ShadowLogger:
         logger.append_signal({...})
         logger.update_positions([{...}, {...}])
         logger.append_trade({...})
+        logger.append_signals([{...}, {...}])   # 일괄 — write/fsync 1회
 
     멱등:
     - signal: (signal_date, variant_id, code) 중복 ignore
@@ -192,6 +271,9 @@ class ShadowLogger:
     """
     variant_id: str
     log_root: Path = None  # type: ignore[assignment]
+    _lock: threading.RLock = field(default_factory=threading.RLock,
+                                   init=False, repr=False, compare=False)
+    _index_loaded: bool = field(default=False, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         _validate_variant_id(self.variant_id)
@@ -201,6 +283,9 @@ class ShadowLogger:
             self.log_root = Path(self.log_root)
         self.variant_dir = self.log_root / self.variant_id
         self.variant_dir.mkdir(parents=True, exist_ok=True)
+        self._signal_index = _KeyIndex(self.signals_path, _signal_key)
+        self._trade_index = _KeyIndex(self.trades_path, _trade_key)
+        self._saved_offsets = (0, 0)
 
     # ── 파일 경로 ──
     @property
@@ -219,25 +304,34 @@ class ShadowLogger:
     def trades_path(self) -> Path:
         return self.variant_dir / "shadow_trades.jsonl"
 
+    @property
+    def index_path(self) -> Path:
+        return self.variant_dir / "shadow_index.json"
+
     # ── Write API ──
     def append_signal(self, signal: Dict) -> bool:
         """시그널 1건 append. 멱등. 신규 추가 시 True."""
-        signal = {**signal}
-        signal.setdefault("schema_version", SCHEMA_VERSION)
-        signal.setdefault("timestamp", _now_kst_iso())
-        if signal.get("variant_id") != self.variant_id:
-            raise ShadowLogError(
-                f"signal.variant_id={signal.get('variant_id')!r} != logger.variant_id={self.variant_id!r}"
-            )
-        _validate_signal(signal)
+        return self.append_signals([signal]) == 1
+
+    def append_signals(self, signals: Iterable[Dict]) -> int:
+        """시그널 일괄 append. 멱등 (배치 내 중복 포함). 반환: 신규 추가 건수.
+
+        전 건 검증 후 기록 — 1건이라도 위반이면 아무것도 쓰지 않고 ShadowLogError.
+        """
+        prepared = []
+        for signal in signals:
+            signal = {**signal}
+            signal.setdefault("schema_version", SCHEMA_VERSION)
+            signal.setdefault("timestamp", _now_kst_iso())
+            if signal.get("variant_id") != self.variant_id:
+                raise ShadowLogError(
+                    f"signal.variant_id={signal.get('variant_id')!r} != logger.variant_id={self.variant_id!r}"
+                )
+            _validate_signal(signal)
+            prepared.append(signal)
 
         # 멱등 검사 (signal_date + code)
-        existing = self._existing_signal_keys()
-        key = (signal["signal_date"], signal["code"])
-        if key in existing:
-            return False
-        _append_jsonl(self.signals_path, signal)
-        return True
+        return self._append_new(self._signal_index, prepared)
 
     def update_positions(self, positions: Iterable[Dict]) -> int:
         """현재 보유 상태 전체 덮어쓰기. 반환: 기록된 포지션 수."""
@@ -255,7 +349,7 @@ class ShadowLogger:
             "variant_id": self.variant_id,
             "open_positions": positions,
         }
-        _atomic_write_json(self.positions_path, snapshot)
+        write_json_atomic(self.positions_path, snapshot, indent=2)
         return len(positions)
 
     def append_intraday_snapshot(self, snapshot: Dict) -> None:
@@ -271,21 +365,27 @@ class ShadowLogger:
 
     def append_trade(self, trade: Dict) -> bool:
         """청산 결과 1건 append. 멱등. 신규 추가 시 True."""
-        trade = {**trade}
-        trade.setdefault("schema_version", SCHEMA_VERSION)
-        trade.setdefault("timestamp", _now_kst_iso())
-        if trade.get("variant_id") != self.variant_id:
-            raise ShadowLogError(
-                f"trade.variant_id={trade.get('variant_id')!r} != "
-                f"logger.variant_id={self.variant_id!r}"
-            )
-        _validate_trade(trade)
-
-        existing = self._existing_trade_ids()
-        if trade["position_id"] in existing:
-            return False
-        _append_jsonl(self.trades_path, trade)
-        return True
+        return self.append_trades([trade]) == 1
+
+    def append_trades(self, trades: Iterable[Dict]) -> int:
+        """청산 결과 일괄 append. 멱등 (position_id). 반환: 신규 추가 건수.
+
+        전 건 검증 후 기록 — 1건이라도 위반이면 아무것도 쓰지 않고 ShadowLogError.
+        """
+        prepared = []
+        for trade in trades:
+            trade = {**trade}
+            trade.setdefault("schema_version", SCHEMA_VERSION)
+            trade.setdefault("timestamp", _now_kst_iso())
+            if trade.get("variant_id") != self.variant_id:
+                raise ShadowLogError(
+                    f"trade.variant_id={trade.get('variant_id')!r} != "
+                    f"logger.variant_id={self.variant_id!r}"
+                )
+            _validate_trade(trade)
+            prepared.append(trade)
+
+        return self._append_new(self._trade_index, prepared)
 
     # ── Read API ──
     def list_signals(self, since_date: Optional[str] = None) -> List[Dict]:
@@ -308,15 +408,93 @@ class ShadowLogger:
             records = [r for r in records if r.get("entry_date", "") >= since_date]
         return records
 
+    def flush_index(self) -> None:
+        """사이드카 인덱스 즉시 저장 (종료 직전 등). 인덱스는 캐시라 생략해도 무결성 무관."""
+        with self._lock:
+            self._ensure_index()
+            self._save_index()
+
     # ── 내부 ──
     def _existing_signal_keys(self) -> Set[tuple]:
-        return {
-            (r.get("signal_date", ""), r.get("code", ""))
-            for r in _read_jsonl(self.signals_path)
-        }
+        with self._lock:
+            self._ensure_index()
+            self._signal_index.sync()
+            return set(self._signal_index.keys)
 
     def _existing_trade_ids(self) -> Set[str]:
-        return {
-            r.get("position_id", "")
-            for r in _read_jsonl(self.trades_path)
+        with self._lock:
+            self._ensure_index()
+            self._trade_index.sync()
+            return set(self._trade_index.keys)
+
+    def _append_new(self, index: _KeyIndex, records: List[Dict]) -> int:
+        """인덱스에 없는 레코드만 1회 write + fsync 로 append."""
+        with self._lock:
+            self._ensure_index()
+            index.sync()
+            new_records, new_keys = [], []
+            seen = set()
+            for r in records:
+                key = index.key_fn(r)
+                if key in index.keys or key in seen:
+                    continue
+                seen.add(key)
+                new_records.append(r)
+                new_keys.append(key)
+            if not new_records:
+                return 0
+            start, end = _append_jsonl_batch(index.path, new_records)
+            index.advance(start, end, new_keys)
+            if len(new_records) > 1 or self._index_lag() >= INDEX_FLUSH_BYTES:
+                self._save_index()
+            return len(new_records)
+
+    def _ensure_index(self) -> None:
+        """최초 1회 — 사이드카 복원 후 꼬리만 증분 파싱 (없거나 어긋나면 전체 파싱)."""
+        if self._index_loaded:
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("schema_version") == SCHEMA_VERSION:
+                for name, index, to_key in (("signals", self._signal_index, tuple),
+                                            ("trades", self._trade_index, str)):
+                    sec = data.get(name) or {}
+                    offset = int(sec.get("offset", 0))
+                    if _ends_with_newline(index.path, offset):
+                        index.restore((to_key(k) for k in sec.get("keys", [])), offset)
+        except (FileNotFoundError, json.JSONDecodeError, TypeError, ValueError):
+            pass
+        self._saved_offsets = (self._signal_index.offset, self._trade_index.offset)
+        self._signal_index.sync()
+        self._trade_index.sync()
+        self._index_loaded = True
+        if self._index_lag() > 0:
+            self._save_index()
+
+    def _index_lag(self) -> int:
+        return (self._signal_index.offset - self._saved_offsets[0]
+                + self._trade_index.offset - self._saved_offsets[1])
+
+    def _save_index(self) -> None:
+        data = {
+            "schema_version": SCHEMA_VERSION,
+            "signals": {"offset": self._signal_index.offset,
+                        "keys": sorted(list(k) for k in self._signal_index.keys)},
+            "trades": {"offset": self._trade_index.offset,
+                       "keys": sorted(self._trade_index.keys)},
         }
+        write_json_atomic(self.index_path, data, indent=2)
+        self._saved_offsets = (self._signal_index.offset, self._trade_index.offset)
+
+
+def _ends_with_newline(path: Path, offset: int) -> bool:
+    """사이드카 offset 이 현재 파일의 라인 경계인지 (파일 교체/절단 감지)."""
+    if offset == 0:
+        return True
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset - 1)
+            return f.read(1) == b"\n"
+    except OSError:
+        return False
@@ -21,6 +21,8 @@ except ImportError:
 import pandas as pd
 
 from .selector import StockCandidate
+from .utils.exit_engine import daily_exits
+from .utils.minute_bars import as_minute_bars, trailing_path
 
 # 에러 로거
 from error_logger import get_logger, log_warning, log_error
@@ -138,7 +140,8 @@ class TradingSimulator:
             log_warning(_logger, f"holding_days={holding_days} > 1 → TRAILING_ENABLED 자동 OFF")
             self.TRAILING_ENABLED = False
 
-        # 분봉 수집기 초기화
+        # 분봉 수집기 초기화 — 프로세스 공용 분봉 저장소 사용
+        # (analyze_profit_loss / 09:30 추세 확인 / 트레일링 재스캔이 같은 분봉을 공유)
         if INTRADAY_AVAILABLE:
             self.intraday = IntradayCollector()
         else:
@@ -208,9 +211,10 @@ class TradingSimulator:
         """
         분봉 시계열에서 트레일링 매도 시점/가격을 정확히 추출.
 
-        진입 시각 이후 분봉을 순회하며 running_max_pct를 갱신하고,
-        TRAILING_LEVELS 기준 매도선(running_max - drawback)에 도달한
-        최초 분봉을 매도 시점으로 반환.
+        진입 시각 이후 분봉의 누적 최대수익(running max)을 배열로 계산하고,
+        TRAILING_LEVELS 기준 매도선(running_max - drawback)에 저가가 도달한
+        최초 분봉을 매도 시점으로 반환 (minute_bars.trailing_path).
+        매도선은 봉마다 직전 max 기준 → 이번 봉 high 로 갱신한 max 기준 순으로 검사.
 
         Returns:
             {'exit_time': 'HH:MM:SS', 'exit_price': int, 'final_max_pct': float}
@@ -219,52 +223,19 @@ class TradingSimulator:
         if not self.TRAILING_ENABLED or not minute_data or entry_price <= 0:
             return None
 
-        running_max_pct = 0.0
+        bars = as_minute_bars(minute_data)
+        # 고가/저가/종가 중 0 인 봉은 제외
+        usable = bars.since(entry_time_str) & (bars.high != 0) & (bars.low != 0) & (bars.close != 0)
         # 부동소수점 엣지 케이스 방지를 위해 가격(원 단위)으로 비교
-        EPS = 1e-9
-
-        for candle in minute_data:
-            t = candle.get('time', '')
-            if t < entry_time_str:
-                continue
-
-            high = candle.get('high', 0)
-            low = candle.get('low', 0)
-            close = candle.get('close', 0)
-            if not (high and low and close):
-                continue
-
-            high_pct = (high - entry_price) / entry_price * 100
-
-            # 매도선 산정은 직전 max 기준 (이번 봉의 high로 갱신하기 전)
-            exit_threshold_pct = self._calc_trailing_exit_pct(running_max_pct)
-
-            # 직전 max 기준 매도선이 활성화된 상태에서 이번 봉 low가 매도선 이하면 체결
-            if exit_threshold_pct is not None:
-                threshold_price = entry_price * (1 + exit_threshold_pct / 100)
-                if low <= threshold_price + EPS:
-                    return {
-                        'exit_time': t,
-                        'exit_price': int(threshold_price),
-                        'final_max_pct': running_max_pct,
-                    }
-
-            # 이번 봉 high로 max 갱신
-            if high_pct > running_max_pct:
-                running_max_pct = high_pct
-
-            # 갱신 후 동일 봉의 low가 새 매도선을 깨는 경우(드물지만 가능)
-            exit_threshold_pct = self._calc_trailing_exit_pct(running_max_pct)
-            if exit_threshold_pct is not None:
-                threshold_price = entry_price * (1 + exit_threshold_pct / 100)
-                if low <= threshold_price + EPS:
-                    return {
-                        'exit_time': t,
-                        'exit_price': int(threshold_price),
-                        'final_max_pct': running_max_pct,
-                    }
-
-        return None
+        hit = trailing_path(bars, entry_price, self.TRAILING_LEVELS, mask=usable, eps=1e-9)
+        if hit is None:
+            return None
+        idx, threshold_price, max_pct = hit
+        return {
+            'exit_time': bars.labels[idx],
+            'exit_price': int(threshold_price),
+            'final_max_pct': max_pct,
+        }
 
     def simulate_day(self,
                      candidates: List[StockCandidate],
@@ -529,19 +500,13 @@ class TradingSimulator:
                 print(f"  [{name}] 매수 불가 (금액 부족)")
                 return None
 
-            # 목표가/손절가 계산
-            profit_price = open_price * (1 + self.PROFIT_TARGET / 100)
-            loss_price = open_price * (1 + self.LOSS_TARGET / 100)
-
-            # 장중 최대 수익/손실 (트레일링 판정용 + 결과 저장용)
+            # 장중 최대 수익/손실 (결과 저장용)
             max_profit_pct = (high_price - open_price) / open_price * 100 if open_price > 0 else 0
             max_loss_pct = (low_price - open_price) / open_price * 100 if open_price > 0 else 0
 
             # 청산 시뮬레이션 (트레일링 발동 여부 판정 후 분기)
             exit_price, exit_type, exit_time = self._determine_exit_daily(
-                open_price, high_price, low_price, close_price,
-                profit_price, loss_price,
-                max_profit_pct, max_loss_pct
+                open_price, high_price, low_price, close_price
             )
 
             # 수익률 계산
@@ -676,17 +641,12 @@ class TradingSimulator:
             print(f"  [{name}] 다일 보유 시뮬레이션 오류: {e}")
             return None
 
-    def _determine_exit_daily(self,
-                               open_p: int,
-                               high_p: int,
-                               low_p: int,
-                               close_p: int,
-                               profit_p: float,
-                               loss_p: float,
-                               max_profit_pct: float = 0.0,
-                               max_loss_pct: float = 0.0) -> tuple:
+    # 일봉 청산 유형별 추정 시간
+    DAILY_EXIT_TIMES = {'trailing': '11:00', 'loss': '09:30', 'profit': '10:00'}
+
+    def _determine_exit_daily(self, open_p: int, high_p: int, low_p: int, close_p: int) -> tuple:
         """
-        일봉 기반 청산 유형 결정 (추정 시간)
+        일봉 기반 청산 유형 결정 (추정 시간) — 공용 exit_engine.daily_exits 사용
 
         TRAILING_ENABLED=True 시 (v3 룰):
         1. max_profit이 트레일링 트리거(3/5/10%) 도달 → 트레일링 매도 (max - 1/2/3%)
@@ -699,30 +659,21 @@ class TradingSimulator:
         2. 저가 손절가 이하 → 손절
         3. 둘 다 → 손절 우선 (보수적)
 
+        슬리피지: 룰 기반 청산은 매도 호가 한 단계 아래 (-SLIPPAGE_PCT). 종가는 그대로.
+
         Returns:
             (청산가, 청산유형, 청산시간)
         """
-        # 슬리피지: 룰 기반 청산은 매도 호가 한 단계 아래 (-SLIPPAGE_PCT). 종가는 그대로.
-        slip_factor = 1 - self.SLIPPAGE_PCT / 100
-
-        # 트레일링 모드 — max_profit 기반 매도가 우선 계산
-        trailing_pct = self._calc_trailing_exit_pct(max_profit_pct)
-        if trailing_pct is not None:
-            # 트레일링 발동 (max 도달 후 매도선까지 빠짐 가정)
-            return int(open_p * (1 + trailing_pct / 100) * slip_factor), 'trailing', '11:00'
-
-        hit_profit = high_p >= profit_p
-        hit_loss = low_p <= loss_p
-
-        if hit_profit and hit_loss:
-            # 둘 다 도달한 경우 → 손절 우선 (보수적 접근)
-            return int(loss_p * slip_factor), 'loss', '09:30'
-        elif hit_profit:
-            return int(profit_p * slip_factor), 'profit', '10:00'
-        elif hit_loss:
-            return int(loss_p * slip_factor), 'loss', '09:30'
-        else:
+        ex = daily_exits(
+            [open_p], [high_p], [low_p], [close_p],
+            self.PROFIT_TARGET, self.LOSS_TARGET,
+            trailing_levels=self.TRAILING_LEVELS if self.TRAILING_ENABLED else None,
+            slippage_pct=self.SLIPPAGE_PCT,
+        )
+        exit_type = ex.exit_type(0)
+        if exit_type == 'close':
             return close_p, 'close', self.EXIT_DEADLINE
+        return int(ex.exit_price[0]), exit_type, self.DAILY_EXIT_TIMES[exit_type]
 
     def _print_summary(self):
         """결과 요약 출력"""
@@ -23,6 +23,8 @@ from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
+from paper_trading.utils.indicator_engine import compute_universe
+
 
 # ============================================================
 # Universe — 4주 shadow 동안 고정 (DEC-005 결정 #3)
@@ -85,6 +87,8 @@ MA200_PERIOD = 200
 def compute_indicators(closes: np.ndarray, current_close: float) -> Dict:
     """BB(20,2σ), MA200, 5일전 MA200, 20MA·200MA spread% 계산.
 
+    단일 종목용 — 유니버스 지표 엔진을 1열 행렬로 호출한 결과 조회.
+
     Args:
         closes: 종가 시계열 (오래된 → 최신 순), current_close 포함
         current_close: 시그널 일자 종가
@@ -92,25 +96,46 @@ def compute_indicators(closes: np.ndarray, current_close: float) -> Dict:
     Returns:
         dict with valid:bool, percent_b, bb_middle, [ma200, ma200_rising, spread_pct]
     """
+    closes = np.asarray(closes, dtype=float)
     if len(closes) < BB_PERIOD:
         return {"valid": False}
-    ma = float(np.mean(closes[-BB_PERIOD:]))
-    std = float(np.std(closes[-BB_PERIOD:], ddof=1))
-    upper = ma + BB_STD_MULT * std
-    lower = ma - BB_STD_MULT * std
+    return indicators_to_cache(compute_squeeze_universe(closes[:, None]), 0, current_close)
+
+
+def compute_squeeze_universe(closes: np.ndarray, codes: Optional[List[str]] = None):
+    """스퀴즈 지표 (BB20 + MA200 + 5일전 MA200) 유니버스 일괄 계산.
+
+    Args:
+        closes: right_align 된 (T × C) 종가 행렬
+    """
+    return compute_universe(
+        closes, codes=codes,
+        bb_period=BB_PERIOD, bb_std_mult=BB_STD_MULT, rsi_period=None,
+        ma_periods=(MA200_PERIOD,), trend_shift=5,
+    )
+
+
+def indicators_to_cache(ind, j: int, current_close: float) -> Dict:
+    """UniverseIndicators 열 j → compute_indicators 형태 dict."""
+    middle = ind.value("bb_middle", j)
+    std = ind.value("bb_std", j)
+    if middle is None or std is None:
+        return {"valid": False}
+    upper = middle + BB_STD_MULT * std
+    lower = middle - BB_STD_MULT * std
     if upper == lower:
         return {"valid": False}
     cache: Dict = {
         "valid": True,
         "percent_b": (current_close - lower) / (upper - lower),
-        "bb_middle": ma,
+        "bb_middle": middle,
     }
-    if len(closes) >= MA200_PERIOD + 5:
-        ma200 = float(np.mean(closes[-MA200_PERIOD:]))
-        ma200_5d = float(np.mean(closes[-(MA200_PERIOD + 5):-5]))
+    ma200 = ind.value(f"ma{MA200_PERIOD}", j)
+    ma200_5d = ind.value(f"ma{MA200_PERIOD}_lag", j)
+    if ma200 is not None and ma200_5d is not None:
         cache["ma200"] = ma200
         cache["ma200_rising"] = ma200 > ma200_5d
-        cache["spread_pct"] = abs(ma - ma200) / ma200 * 100 if ma200 > 0 else None
+        cache["spread_pct"] = abs(middle - ma200) / ma200 * 100 if ma200 > 0 else None
     return cache
 
 
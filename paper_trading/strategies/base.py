@@ -2,6 +2,7 @@
 전략 베이스 클래스
 """
 
+import inspect
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field, asdict
 from typing import List, Dict, Optional
@@ -67,13 +68,15 @@ class BaseStrategy(ABC):
         self.selection_date: str = ""
 
     @abstractmethod
-    def select_stocks(self, date: str = None, top_n: int = 5) -> List[Candidate]:
+    def select_stocks(self, date: str = None, top_n: int = 5, context=None) -> List[Candidate]:
         """
         종목 선정 (각 전략에서 구현)
 
         Args:
             date: 선정 날짜 (YYYYMMDD)
             top_n: 상위 N개 선정
+            context: 공용 MarketSnapshot (run_all 이 날짜별 1회 구성, 없으면 None)
+                     — 받지 않는 전략은 인자에서 생략 가능 (accepts_context 로 판별)
 
         Returns:
             선정된 종목 리스트
@@ -95,5 +98,39 @@ class BaseStrategy(ABC):
         """전략 파라미터 (각 전략에서 오버라이드)"""
         return {}
 
+    @classmethod
+    def dependencies(cls) -> Dict[str, int]:
+        """서브 전략 의존성 {strategy_id: 필요한 후보 풀 크기} (조합 전략에서 오버라이드)
+
+        run_all 은 서브 전략을 먼저 1회만 (소비자 중 가장 넓은 top_n 으로) 실행하고,
+        select_stocks(sub_results={strategy_id: 후보 앞 N개 사본}) 으로 넘겨준다.
+        서브 전략은 select_stocks(top_n=N)[:k] == select_stocks(top_n=k) 여야 한다
+        (정렬 후 앞에서부터 자르는 전략).
+        """
+        return {}
+
     def __repr__(self):
         return f"<{self.STRATEGY_NAME} ({self.STRATEGY_ID})>"
+
+
+_ACCEPTS_KWARG: Dict[tuple, bool] = {}
+
+
+def accepts_kwarg(strategy, name: str) -> bool:
+    """select_stocks 가 name 키워드 인자를 받는지 (클래스별 캐시)"""
+    key = (type(strategy), name)
+    ok = _ACCEPTS_KWARG.get(key)
+    if ok is None:
+        try:
+            params = inspect.signature(type(strategy).select_stocks).parameters
+            ok = name in params or any(
+                p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values())
+        except (TypeError, ValueError):
+            ok = False
+        _ACCEPTS_KWARG[key] = ok
+    return ok
+
+
+def accepts_context(strategy) -> bool:
+    """select_stocks 가 context 인자를 받는지"""
+    return accepts_kwarg(strategy, 'context')
@@ -17,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from .base import BaseStrategy, Candidate
 from .registry import StrategyRegistry
 from paper_trading.utils.dart_utils import DartFilter, get_dart_filter
+from paper_trading.utils.market_snapshot import MarketSnapshot, get_market_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -73,8 +74,18 @@ class DartDisclosureStrategy(BaseStrategy):
         super().__init__()
         self.dart_filter = get_dart_filter()
 
-    def select_stocks(self, date: str = None, top_n: int = 5) -> List[Candidate]:
-        """종목 선정"""
+    def prepare_period(self, start_date: str, end_date: str) -> None:
+        """백테스트 기간 공시 증분 동기화 (전일 공시 포함) — 이후 select_stocks 는 로컬 조회"""
+        if not self.dart_filter.is_available():
+            return
+        prev = (datetime.strptime(start_date, '%Y%m%d') - timedelta(days=1)).strftime('%Y%m%d')
+        synced = self.dart_filter.sync_disclosures(prev, end_date)
+        if synced:
+            logger.info(f"DART 공시 {synced}일 동기화 ({prev}~{end_date})")
+
+    def select_stocks(self, date: str = None, top_n: int = 5,
+                      context: MarketSnapshot = None) -> List[Candidate]:
+        """종목 선정 (context: run_all 공용 MarketSnapshot)"""
         if date is None:
             date = datetime.now().strftime('%Y%m%d')
 
@@ -99,7 +110,7 @@ class DartDisclosureStrategy(BaseStrategy):
 
         # 2. 시장 데이터 가져오기
         print("  2. 시장 데이터 수집 중...")
-        stocks_with_data = self._fetch_market_data(positive_stocks, date)
+        stocks_with_data = self._fetch_market_data(positive_stocks, date, context)
         print(f"     → {len(stocks_with_data)}개 종목 데이터 확보")
 
         # 3. 필터링 (시총, 거래대금)
@@ -124,7 +135,8 @@ class DartDisclosureStrategy(BaseStrategy):
 
         return self.candidates
 
-    def _fetch_market_data(self, positive_stocks: List, date: str) -> List[Dict]:
+    def _fetch_market_data(self, positive_stocks: List, date: str,
+                           snapshot: MarketSnapshot = None) -> List[Dict]:
         """시장 데이터 수집 (Phase 7G: KRX OpenAPI 우선 - backtest 지원)
 
         - KRX historical 지원으로 과거 날짜 backtest 가능
@@ -141,53 +153,36 @@ class DartDisclosureStrategy(BaseStrategy):
         if not valid_codes:
             return stocks
 
-        # 1차: KRX OpenAPI (당일 + 과거)
-        krx = _get_krx() if callable(_get_krx) else None
-        if krx:
-            try:
-                market_data = {}
-                for market in ['KOSPI', 'KOSDAQ']:
-                    df = krx.get_stock_ohlcv(date, market=market)
-                    if df.empty:
-                        continue
-                    for code in df.index:
-                        if code in valid_codes:
-                            market_data[code] = (df.loc[code], market)
-
-                for code in valid_codes:
-                    item = market_data.get(code)
-                    if item is None:
-                        continue
-                    row, mkt = item
-                    try:
-                        close = int(row.get('종가', 0))
-                        if close == 0:
-                            continue
-                        dart_score = score_map[code]
-                        disc_summary = [{
-                            'category': d.category,
-                            'report_nm': d.report_nm[:50],
-                            'amount': d.amount,
-                        } for d in dart_score.disclosures]
-                        stocks.append({
-                            'code': code,
-                            'name': str(row.get('종목명', code)),
-                            'price': close,
-                            'change_pct': float(row.get('등락률', 0)),
-                            'volume': int(row.get('거래량', 0)),
-                            'trading_value': int(row.get('거래대금', 0)),
-                            'market_cap': int(row.get('시가총액', 0)),
-                            'dart_score': dart_score.disclosure_score,
-                            'disclosures': disc_summary,
-                        })
-                    except Exception as e:
-                        logger.debug(f"  KRX 매핑 실패 {code}: {e}")
-                        continue
+        # 1차: 공용 스냅샷 / KRX OpenAPI (당일 + 과거)
+        if snapshot is None:
+            krx = _get_krx() if callable(_get_krx) else None
+            if krx:
+                try:
+                    snapshot = get_market_snapshot(date, krx)
+                except Exception as e:
+                    logger.warning(f"  KRX fetch 실패, pykrx/naver 폴백: {e}")
+        if snapshot is not None:
+            for row in snapshot.rows(valid_codes):
+                dart_score = score_map[row['code']]
+                disc_summary = [{
+                    'category': d.category,
+                    'report_nm': d.report_nm[:50],
+                    'amount': d.amount,
+                } for d in dart_score.disclosures]
+                stocks.append({
+                    'code': row['code'],
+                    'name': row['name'],
+                    'price': row['close'],
+                    'change_pct': row['change_pct'],
+                    'volume': row['volume'],
+                    'trading_value': row['trading_value'],
+                    'market_cap': row['market_cap'],
+                    'dart_score': dart_score.disclosure_score,
+                    'disclosures': disc_summary,
+                })
 
-                if stocks:
-                    return stocks
-            except Exception as e:
-                logger.warning(f"  KRX fetch 실패, pykrx/naver 폴백: {e}")
+            if stocks:
+                return stocks
 
         # 2차: pykrx/naver 폴백 - 시장 단위 1회 fetch + 매핑
         #   기존: 종목별 get_market_ohlcv_by_date() → 당일 미장 시 빈 결과,
@@ -23,6 +23,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from .base import BaseStrategy, Candidate
 from .registry import StrategyRegistry
 from utils import format_kst_time
+from paper_trading.utils.market_snapshot import MarketSnapshot, get_market_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -70,8 +71,9 @@ class FrontierGapStrategy(BaseStrategy):
     def __init__(self):
         super().__init__()
 
-    def select_stocks(self, date: str = None, top_n: int = 5) -> List[Candidate]:
-        """종목 선정 - KRX OpenAPI 직접 fetch"""
+    def select_stocks(self, date: str = None, top_n: int = 5,
+                      context: MarketSnapshot = None) -> List[Candidate]:
+        """종목 선정 - KRX OpenAPI 직접 fetch (context: run_all 공용 MarketSnapshot)"""
         if date is None:
             date = format_kst_time(format_str='%Y%m%d')
 
@@ -84,7 +86,7 @@ class FrontierGapStrategy(BaseStrategy):
             return []
 
         # 1. 당일 KOSPI + KOSDAQ 전종목 OHLCV (KRX OpenAPI → pykrx 폴백)
-        all_stocks = self._fetch_all_stocks(date, krx)
+        all_stocks = self._fetch_all_stocks(date, krx, context)
 
         if not all_stocks:
             print("  데이터 없음")
@@ -112,8 +114,8 @@ class FrontierGapStrategy(BaseStrategy):
         print(f"  선정 완료: {len(self.candidates)}개")
         return self.candidates
 
-    def _fetch_all_stocks(self, date: str, krx) -> List[Dict]:
-        """KRX OpenAPI로 fetch, 빈 결과면 pykrx 폴백 (momentum과 동일 방식)"""
+    def _fetch_all_stocks(self, date: str, krx, snapshot: MarketSnapshot = None) -> List[Dict]:
+        """공용 스냅샷(KRX OpenAPI)으로 구성, 빈 결과면 pykrx 폴백 (momentum과 동일 방식)"""
         all_stocks = []
 
         # 진단 카운터
@@ -122,52 +124,42 @@ class FrontierGapStrategy(BaseStrategy):
         skip_close_zero = 0
         skip_prev_invalid = 0
 
-        # 1차: KRX OpenAPI
-        try:
-            kospi_df = krx.get_stock_ohlcv(date, market='KOSPI')
-            kosdaq_df = krx.get_stock_ohlcv(date, market='KOSDAQ')
-        except Exception as e:
-            print(f"  KRX OpenAPI fetch 오류: {e}")
-            kospi_df = kosdaq_df = None
-
-        # KRX OpenAPI 성공 시 파싱
-        if kospi_df is not None and kosdaq_df is not None and (not kospi_df.empty or not kosdaq_df.empty):
-            for df, mkt in [(kospi_df, 'KOSPI'), (kosdaq_df, 'KOSDAQ')]:
-                if df is None or df.empty:
+        # 1차: 공용 스냅샷 (run_all 컨텍스트) → 없으면 KRX OpenAPI 로 구성
+        if snapshot is None:
+            try:
+                snapshot = get_market_snapshot(date, krx)
+            except Exception as e:
+                print(f"  KRX OpenAPI fetch 오류: {e}")
+
+        # 스냅샷은 종가 0 종목을 이미 제외 → skip_close0 는 0
+        if snapshot is not None and not snapshot.is_empty:
+            for row in snapshot.rows():
+                raw_rows += 1
+                open_p = float(row['open'])
+                close_p = float(row['close'])
+                # 시가 누락 시 이 종목만 skip (정확한 gap 불가)
+                if open_p == 0:
+                    skip_open_zero += 1
                     continue
-                for code, row in df.iterrows():
-                    raw_rows += 1
-                    try:
-                        open_p = float(row.get('시가', 0))
-                        close_p = float(row.get('종가', 0))
-                        if close_p == 0:
-                            skip_close_zero += 1
-                            continue
-                        # 시가 누락 시 등락률로 prev_close 역산 후 이 종목만 skip (정확한 gap 불가)
-                        if open_p == 0:
-                            skip_open_zero += 1
-                            continue
-                        prev_close = close_p - float(row.get('전일대비', 0))
-                        if prev_close <= 0:
-                            # 전일대비 없으면 등락률로 역산 시도
-                            chg_pct = float(row.get('등락률', 0))
-                            prev_close = close_p / (1 + chg_pct / 100) if chg_pct != 0 else close_p
-                        if prev_close <= 0:
-                            skip_prev_invalid += 1
-                            continue
-                        gap_pct = (open_p - prev_close) / prev_close * 100
-                        all_stocks.append({
-                            'code': code, 'name': row.get('종목명', ''),
-                            'open': int(open_p), 'close': int(close_p),
-                            'prev_close': int(prev_close), 'gap_pct': gap_pct,
-                            'change_pct': float(row.get('등락률', 0)),
-                            'volume': int(row.get('거래량', 0)),
-                            'trading_value': int(row.get('거래대금', 0)),
-                            'market_cap': int(row.get('시가총액', 0)),
-                            'market': mkt,
-                        })
-                    except Exception:
-                        continue
+                prev_close = close_p - row['prev_change']
+                if prev_close <= 0:
+                    # 전일대비 없으면 등락률로 역산 시도
+                    chg_pct = row['change_pct']
+                    prev_close = close_p / (1 + chg_pct / 100) if chg_pct != 0 else close_p
+                if prev_close <= 0:
+                    skip_prev_invalid += 1
+                    continue
+                gap_pct = (open_p - prev_close) / prev_close * 100
+                all_stocks.append({
+                    'code': row['code'], 'name': row['name'],
+                    'open': int(open_p), 'close': int(close_p),
+                    'prev_close': int(prev_close), 'gap_pct': gap_pct,
+                    'change_pct': row['change_pct'],
+                    'volume': row['volume'],
+                    'trading_value': row['trading_value'],
+                    'market_cap': row['market_cap'],
+                    'market': row['market'],
+                })
 
         # 진단 로그: KRX에서 행은 받았지만 전부 skip 되었을 때 원인 파악
         if raw_rows > 0 and not all_stocks:
@@ -7,7 +7,7 @@ Alpha-Delta 하이브리드 전략
 import logging
 from typing import List, Dict
 
-from .base import BaseStrategy, Candidate
+from .base import BaseStrategy, Candidate, accepts_context
 from .registry import StrategyRegistry
 
 logger = logging.getLogger(__name__)
@@ -29,6 +29,10 @@ class HybridAlphaDeltaStrategy(BaseStrategy):
     # 양쪽 모두 선택된 종목 보너스
     OVERLAP_BONUS = 10.0
 
+    # 서브 전략 (registry 의존성 선언 — run_all 이 1회 실행한 풀을 공유)
+    ALPHA_STRATEGY_ID = "momentum"
+    DELTA_STRATEGY_ID = "theme_policy"
+
     # 서브 전략 후보 풀 크기
     SUB_TOP_N = 10
 
@@ -56,8 +60,17 @@ class HybridAlphaDeltaStrategy(BaseStrategy):
             self._delta_strategy = ThemePolicyStrategy()
         return self._delta_strategy
 
-    def select_stocks(self, date: str = None, top_n: int = 5) -> List[Candidate]:
-        """종목 선정: Alpha + Delta 가중평균"""
+    @classmethod
+    def dependencies(cls) -> Dict[str, int]:
+        return {cls.ALPHA_STRATEGY_ID: cls.SUB_TOP_N, cls.DELTA_STRATEGY_ID: cls.SUB_TOP_N}
+
+    def select_stocks(self, date: str = None, top_n: int = 5, context=None,
+                      sub_results: Dict[str, List[Candidate]] = None) -> List[Candidate]:
+        """종목 선정: Alpha + Delta 가중평균
+
+        context: 서브 전략에 그대로 전달
+        sub_results: run_all 이 먼저 실행한 서브 전략 후보 풀 (있으면 재실행 생략)
+        """
         from utils import format_kst_time
 
         if date is None:
@@ -66,13 +79,20 @@ class HybridAlphaDeltaStrategy(BaseStrategy):
         self.selection_date = date
         print(f"\n[{self.STRATEGY_NAME}] 종목 선정 시작 ({date})")
 
-        # 1. 두 전략을 각각 실행 (넓은 후보 풀)
-        alpha_candidates = self._run_sub_strategy(
-            self._get_alpha_strategy(), date, self.SUB_TOP_N, "Alpha"
-        )
-        delta_candidates = self._run_sub_strategy(
-            self._get_delta_strategy(), date, self.SUB_TOP_N, "Delta"
-        )
+        # 1. 두 전략 후보 풀 (넓은 풀) — registry 공유 풀 우선, 없으면 직접 실행
+        sub_results = sub_results or {}
+        if self.ALPHA_STRATEGY_ID in sub_results:
+            alpha_candidates = sub_results[self.ALPHA_STRATEGY_ID][:self.SUB_TOP_N]
+        else:
+            alpha_candidates = self._run_sub_strategy(
+                self._get_alpha_strategy(), date, self.SUB_TOP_N, "Alpha", context
+            )
+        if self.DELTA_STRATEGY_ID in sub_results:
+            delta_candidates = sub_results[self.DELTA_STRATEGY_ID][:self.SUB_TOP_N]
+        else:
+            delta_candidates = self._run_sub_strategy(
+                self._get_delta_strategy(), date, self.SUB_TOP_N, "Delta", context
+            )
 
         print(f"  Alpha 후보: {len(alpha_candidates)}개, Delta 후보: {len(delta_candidates)}개")
 
@@ -177,10 +197,12 @@ class HybridAlphaDeltaStrategy(BaseStrategy):
         return self.candidates
 
     def _run_sub_strategy(
-        self, strategy: BaseStrategy, date: str, top_n: int, label: str
+        self, strategy: BaseStrategy, date: str, top_n: int, label: str, context=None
     ) -> List[Candidate]:
         """서브 전략 실행 (에러 시 빈 리스트 반환)"""
         try:
+            if context is not None and accepts_context(strategy):
+                return strategy.select_stocks(date=date, top_n=top_n, context=context)
             return strategy.select_stocks(date=date, top_n=top_n)
         except Exception as e:
             logger.warning(f"[{self.STRATEGY_NAME}] {label} 전략 실행 실패: {e}")
@@ -196,6 +218,6 @@ class HybridAlphaDeltaStrategy(BaseStrategy):
             'alpha_slot': self.ALPHA_SLOT,
             'delta_slot': self.DELTA_SLOT,
             'score_normalization': 'min-max per-strategy (0~100)',
-            'alpha_strategy': 'momentum',
-            'delta_strategy': 'theme_policy',
+            'alpha_strategy': self.ALPHA_STRATEGY_ID,
+            'delta_strategy': self.DELTA_STRATEGY_ID,
         }
@@ -15,6 +15,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from .base import BaseStrategy, Candidate
 from .registry import StrategyRegistry
 from utils import format_kst_time
+from paper_trading.utils.market_snapshot import MarketSnapshot, get_market_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -83,8 +84,9 @@ class LargecapContrarianStrategy(BaseStrategy):
     def __init__(self):
         super().__init__()
 
-    def select_stocks(self, date: str = None, top_n: int = 5) -> List[Candidate]:
-        """종목 선정"""
+    def select_stocks(self, date: str = None, top_n: int = 5,
+                      context: MarketSnapshot = None) -> List[Candidate]:
+        """종목 선정 (context: run_all 공용 MarketSnapshot)"""
         if date is None:
             date = format_kst_time(format_str='%Y%m%d')
 
@@ -92,7 +94,7 @@ class LargecapContrarianStrategy(BaseStrategy):
         print(f"\n[{self.STRATEGY_NAME}] 종목 선정 시작 ({date})")
 
         # 0. KOSPI 시장 상태 확인 (위험 차단)
-        kospi_change = self._get_kospi_change(date)
+        kospi_change = self._get_kospi_change(date, context)
         if kospi_change is not None and kospi_change <= self.KOSPI_DROP_THRESHOLD:
             logger.warning(
                 f"[{self.STRATEGY_NAME}] KOSPI 급락 ({kospi_change:+.2f}%) "
@@ -105,7 +107,7 @@ class LargecapContrarianStrategy(BaseStrategy):
             print(f"  KOSPI: {kospi_change:+.2f}% (정상)")
 
         # 1. 전체 종목 데이터 수집
-        all_stocks = self._fetch_market_data(date)
+        all_stocks = self._fetch_market_data(date, context)
         if not all_stocks:
             print(f"  데이터 없음")
             return []
@@ -133,44 +135,23 @@ class LargecapContrarianStrategy(BaseStrategy):
         print(f"  선정 완료: {len(self.candidates)}개")
         return self.candidates
 
-    def _fetch_market_data(self, date: str) -> List[Dict]:
+    def _fetch_market_data(self, date: str, snapshot: MarketSnapshot = None) -> List[Dict]:
         """시장 데이터 수집 (Phase 7D: KRX OpenAPI 우선)
 
         - KRX는 OHLCV + 시가총액(MKTCAP)을 1번 호출에 모두 포함 → 효율
         - Historical 지원으로 backtest 가능
         - Naver 폴백 (당일만)
         """
-        # 1차: KRX OpenAPI
-        krx = _get_krx() if callable(_get_krx) else None
-        if krx:
-            stocks = []
-            try:
-                for market in ['KOSPI', 'KOSDAQ']:
-                    df = krx.get_stock_ohlcv(date, market=market)
-                    if df.empty:
-                        continue
-                    for code in df.index:
-                        try:
-                            row = df.loc[code]
-                            close = int(row['종가'])
-                            if close == 0:
-                                continue
-                            stocks.append({
-                                'code': code,
-                                'name': str(row.get('종목명', code)),
-                                'price': close,
-                                'change_pct': float(row.get('등락률', 0)),
-                                'volume': int(row.get('거래량', 0)),
-                                'trading_value': int(row.get('거래대금', 0)),
-                                'market_cap': int(row.get('시가총액', 0)),
-                                'market': market,
-                            })
-                        except Exception:
-                            continue
-                if stocks:
-                    return stocks
-            except Exception as e:
-                logger.warning(f"  KRX OpenAPI fetch 실패, naver 폴백: {e}")
+        # 1차: 공용 스냅샷 (run_all 컨텍스트) → 없으면 KRX OpenAPI 로 구성 (당일 + 과거 모두 지원)
+        if snapshot is None:
+            krx = _get_krx() if callable(_get_krx) else None
+            if krx:
+                try:
+                    snapshot = get_market_snapshot(date, krx)
+                except Exception as e:
+                    logger.warning(f"  KRX OpenAPI fetch 실패, naver 폴백: {e}")
+        if snapshot is not None and not snapshot.is_empty:
+            return snapshot.stock_dicts()
 
         # 2차: Naver 폴백
         if pykrx_stock is None:
@@ -215,16 +196,22 @@ class LargecapContrarianStrategy(BaseStrategy):
 
         return stocks
 
-    def _get_kospi_change(self, date: str) -> Optional[float]:
+    def _get_kospi_change(self, date: str, snapshot: MarketSnapshot = None) -> Optional[float]:
         """KOSPI 종합지수 일일 등락률 (KRX OpenAPI 우선, pykrx 폴백)"""
-        # 1차: KRX OpenAPI (안정적)
+        # 1차: 공용 스냅샷 (전략 간 지수 조회 공유)
+        if snapshot is not None:
+            chg = snapshot.kospi_change()
+            if chg is not None:
+                return chg
+
+        # 2차: KRX OpenAPI (안정적)
         krx = _get_krx() if callable(_get_krx) else None
         if krx:
             chg = krx.get_kospi_change(date)
             if chg is not None:
                 return chg
 
-        # 2차: pykrx 폴백
+        # 3차: pykrx 폴백
         if _pykrx_raw is None:
             logger.debug("pykrx 미설치 - KOSPI 지수 조회 불가")
             return None
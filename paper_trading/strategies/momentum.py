@@ -17,6 +17,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from .base import BaseStrategy, Candidate
 from .registry import StrategyRegistry
 from utils import format_kst_time
+from paper_trading.utils.indicator_engine import compute_universe, right_align
+from paper_trading.utils.market_snapshot import MarketSnapshot, get_market_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -75,8 +77,9 @@ class MomentumStrategy(BaseStrategy):
     def __init__(self):
         super().__init__()
 
-    def select_stocks(self, date: str = None, top_n: int = 5) -> List[Candidate]:
-        """종목 선정"""
+    def select_stocks(self, date: str = None, top_n: int = 5,
+                      context: MarketSnapshot = None) -> List[Candidate]:
+        """종목 선정 (context: run_all 공용 MarketSnapshot)"""
         if date is None:
             date = format_kst_time(format_str='%Y%m%d')
 
@@ -84,7 +87,7 @@ class MomentumStrategy(BaseStrategy):
         print(f"\n[{self.STRATEGY_NAME}] 종목 선정 시작 ({date})")
 
         # 1. 데이터 수집
-        all_stocks = self._fetch_market_data(date)
+        all_stocks = self._fetch_market_data(date, context)
         if not all_stocks:
             print(f"  데이터 없음")
             return []
@@ -119,85 +122,71 @@ class MomentumStrategy(BaseStrategy):
             logger.warning(f"[{self.STRATEGY_NAME}] KRX OpenAPI 사용 불가 - MA/거래량 필터 skip")
             return stocks
 
-        passed = []
         end_dt = datetime.strptime(date, "%Y%m%d")
         start_dt = end_dt - timedelta(days=self.MA_LOOKBACK_DAYS)
 
-        for s in stocks:
-            try:
-                df = krx.get_history(
-                    s['code'],
-                    start_dt.strftime("%Y%m%d"),
-                    end_dt.strftime("%Y%m%d"),
-                    market=s.get('market', 'KOSPI')
-                )
-                if df.empty or len(df) < self.MA_PERIOD + 1:
-                    # 데이터 부족 시 보수적 통과
-                    passed.append(s)
-                    continue
+        # 1차 통과 종목 전체를 (날짜 × 종목) 행렬 1회로 받아 지표 일괄 계산
+        codes = [s['code'] for s in stocks]
+        markets = tuple(dict.fromkeys(s.get('market', 'KOSPI') for s in stocks)) or ('KOSPI',)
+        try:
+            _, mats = krx.get_history_matrix(
+                codes, start_dt.strftime("%Y%m%d"), end_dt.strftime("%Y%m%d"),
+                markets=markets, fields=("종가", "거래량"),
+            )
+            aligned = right_align(mats)
+            ind = compute_universe(
+                aligned["종가"], aligned["거래량"], codes,
+                bb_period=0, rsi_period=None,
+                ma_periods=(self.MA_PERIOD,), vol_period=self.MA_PERIOD,
+            )
+        except Exception as e:
+            logger.debug(f"MA/거래량 행렬 계산 실패: {e}")
+            return stocks  # 보수적 통과
 
-                closes = df['종가'].astype(float).values
-                volumes = df['거래량'].astype(float).values
+        n_obs = ind["n_obs"]
+        ma_prev = ind[f"ma{self.MA_PERIOD}_prev"]
+        passed = []
+        for j, s in enumerate(stocks):
+            if n_obs[j] < self.MA_PERIOD + 1:
+                # 데이터 부족 시 보수적 통과
+                passed.append(s)
+                continue
 
-                # MA5 = 직전 5일 평균 (오늘 제외)
-                ma5_prev = sum(closes[-(self.MA_PERIOD + 1):-1]) / self.MA_PERIOD
-                today_close = closes[-1]
-                if today_close <= ma5_prev:
-                    continue  # MA5 아래
+            # MA5 = 직전 5일 평균 (오늘 제외)
+            ma5_prev = float(ma_prev[j])
+            today_close = float(ind["close"][j])
+            if today_close <= ma5_prev:
+                continue  # MA5 아래
 
-                # 거래량 5일 평균 (오늘 제외) 대비 오늘 거래량
-                vol_avg = sum(volumes[-(self.MA_PERIOD + 1):-1]) / self.MA_PERIOD
-                today_vol = volumes[-1]
-                if vol_avg == 0 or today_vol < vol_avg * self.VOLUME_SURGE_MULT:
-                    continue  # 거래량 surge 부족
+            # 거래량 5일 평균 (오늘 제외) 대비 오늘 거래량
+            vol_avg = float(ind["vol_avg_prev"][j])
+            today_vol = float(ind["volume"][j])
+            if vol_avg == 0 or today_vol < vol_avg * self.VOLUME_SURGE_MULT:
+                continue  # 거래량 surge 부족
 
-                s['ma5'] = round(ma5_prev, 1)
-                s['vol_ratio'] = round(today_vol / vol_avg, 2) if vol_avg > 0 else 0
-                passed.append(s)
-            except Exception as e:
-                logger.debug(f"MA/거래량 계산 실패 {s['code']}: {e}")
-                passed.append(s)  # 보수적 통과
+            s['ma5'] = round(ma5_prev, 1)
+            s['vol_ratio'] = round(today_vol / vol_avg, 2) if vol_avg > 0 else 0
+            passed.append(s)
 
         return passed
 
-    def _fetch_market_data(self, date: str) -> List[Dict]:
+    def _fetch_market_data(self, date: str, snapshot: MarketSnapshot = None) -> List[Dict]:
         """시장 데이터 수집 (Phase 7D: KRX OpenAPI 우선, naver 폴백)
 
         - KRX historical 지원 → 과거 날짜 backtest 가능
         - Naver보다 9~700배 빠름
         - KRX 실패 시 naver 폴백 (당일만)
         """
-        # 1차: KRX OpenAPI (당일 + 과거 모두 지원)
-        krx = _get_krx() if callable(_get_krx) else None
-        if krx:
-            stocks = []
-            try:
-                for market in ['KOSPI', 'KOSDAQ']:
-                    df = krx.get_stock_ohlcv(date, market=market)
-                    if df.empty:
-                        continue
-                    for code in df.index:
-                        try:
-                            row = df.loc[code]
-                            close = int(row['종가'])
-                            if close == 0:
-                                continue
-                            stocks.append({
-                                'code': code,
-                                'name': str(row.get('종목명', code)),
-                                'price': close,
-                                'change_pct': float(row.get('등락률', 0)),
-                                'volume': int(row.get('거래량', 0)),
-                                'trading_value': int(row.get('거래대금', 0)),
-                                'market_cap': int(row.get('시가총액', 0)),
-                                'market': market,
-                            })
-                        except Exception:
-                            continue
-                if stocks:
-                    return stocks
-            except Exception as e:
-                logger.warning(f"  KRX OpenAPI fetch 실패, naver 폴백: {e}")
+        # 1차: 공용 스냅샷 (run_all 컨텍스트) → 없으면 KRX OpenAPI 로 구성 (당일 + 과거 모두 지원)
+        if snapshot is None:
+            krx = _get_krx() if callable(_get_krx) else None
+            if krx:
+                try:
+                    snapshot = get_market_snapshot(date, krx)
+                except Exception as e:
+                    logger.warning(f"  KRX OpenAPI fetch 실패, naver 폴백: {e}")
+        if snapshot is not None and not snapshot.is_empty:
+            return snapshot.stock_dicts()
 
         # 2차: Naver 폴백 (당일만, 과거 시 빈 결과)
         if pykrx_stock is None:
@@ -2,38 +2,28 @@
 전략 레지스트리 - 모든 전략 관리
 """
 
+import copy
 import json
+import logging
 from pathlib import Path
-from typing import Dict, List, Type, Optional
+from typing import Dict, List, Tuple, Type, Optional
 from datetime import datetime
-from .base import BaseStrategy, StrategyResult
-
-DATA_DIR = Path(__file__).parent.parent.parent / "data" / "paper_trading"
-THEME_INDEX_PATH = Path(__file__).parent.parent.parent / "data" / "theme_cache" / "_stock_to_themes.json"
-
-_STOCK_THEME_INDEX: Optional[Dict] = None
+from .base import BaseStrategy, StrategyResult, accepts_context, accepts_kwarg
+from paper_trading.utils.theme_index import load_theme_index
 
+logger = logging.getLogger(__name__)
 
-def _theme_index() -> Dict:
-    """{code: {name, themes:[{code,name},...]}} raw 인덱스 (lazy load)."""
-    global _STOCK_THEME_INDEX
-    if _STOCK_THEME_INDEX is None:
-        try:
-            with open(THEME_INDEX_PATH, 'r', encoding='utf-8') as f:
-                raw = json.load(f)
-            _STOCK_THEME_INDEX = {k: v for k, v in raw.items() if k != '_meta'}
-        except Exception:
-            _STOCK_THEME_INDEX = {}
-    return _STOCK_THEME_INDEX
+DATA_DIR = Path(__file__).parent.parent.parent / "data" / "paper_trading"
+THEME_INDEX_PATH = Path(__file__).parent.parent.parent / "data" / "theme_cache" / "_stock_to_themes.npz"
 
 
 def _enrich_themes(candidate_dict: Dict) -> None:
     """candidate dict 에 themes 주입 (in-place). 이미 있으면 보존."""
     if candidate_dict.get('themes'):
         return
-    entry = _theme_index().get(candidate_dict.get('code'))
-    if entry and entry.get('themes'):
-        candidate_dict['themes'] = entry['themes']
+    themes = load_theme_index(THEME_INDEX_PATH).entries(candidate_dict.get('code') or '')
+    if themes:
+        candidate_dict['themes'] = themes
 
 
 class StrategyRegistry:
@@ -69,22 +59,91 @@ class StrategyRegistry:
             for s in cls._strategies.values()
         ]
 
+    @classmethod
+    def execution_plan(cls, top_n: int = 5) -> List[Tuple[str, int]]:
+        """[(strategy_id, 실행 top_n), ...] — 서브 전략이 소비자보다 먼저, 전략당 1회
+
+        실행 top_n = max(요청 top_n, 의존하는 조합 전략들이 선언한 풀 크기).
+        등록되지 않은 서브 전략은 계획에서 제외 (조합 전략이 직접 실행).
+        """
+        order: List[str] = []
+        visiting = set()
+
+        def visit(sid: str):
+            if sid in order or sid in visiting:
+                if sid in visiting:
+                    logger.warning(f"전략 의존성 순환: {sid}")
+                return
+            visiting.add(sid)
+            for dep in cls._strategies[sid].dependencies():
+                if dep in cls._strategies:
+                    visit(dep)
+            visiting.discard(sid)
+            order.append(sid)
+
+        for sid in cls._strategies:
+            visit(sid)
+
+        width = {sid: top_n for sid in order}
+        for sid in order:
+            for dep, pool_n in cls._strategies[sid].dependencies().items():
+                if dep in width:
+                    width[dep] = max(width[dep], pool_n)
+        return [(sid, width[sid]) for sid in order]
+
     @classmethod
     def run_all(cls, date: str = None, top_n: int = 5) -> Dict[str, StrategyResult]:
-        """모든 전략 실행"""
+        """모든 전략 실행
+
+        날짜별 전종목 시세는 MarketSnapshot 으로 1회만 구성해
+        context 를 받는 전략에 공유한다 (전략마다 get_stock_ohlcv 반복 방지).
+        execution_plan 순서로 각 전략을 1회만 실행하고, 조합 전략에는
+        서브 전략 후보 풀의 앞 N개 사본을 sub_results 로 넘긴다.
+        """
         results = {}
+        if date is None:
+            from utils import format_kst_time
+            date = format_kst_time(format_str='%Y%m%d')
+        context = cls._market_context(date)
 
-        for strategy_id, strategy_class in cls._strategies.items():
+        pools: Dict[str, List] = {}
+        for strategy_id, run_n in cls.execution_plan(top_n):
+            strategy_class = cls._strategies[strategy_id]
             print(f"\n[Registry] 전략 실행: {strategy_class.STRATEGY_NAME}")
             try:
                 strategy = strategy_class()
-                candidates = strategy.select_stocks(date=date, top_n=top_n)
+                kwargs = {}
+                if context is not None and accepts_context(strategy):
+                    kwargs['context'] = context
+                sub_results = {dep: [copy.deepcopy(c) for c in pools[dep][:pool_n]]
+                               for dep, pool_n in strategy_class.dependencies().items()
+                               if dep in pools}
+                if sub_results and accepts_kwarg(strategy, 'sub_results'):
+                    kwargs['sub_results'] = sub_results
+                candidates = strategy.select_stocks(date=date, top_n=run_n, **kwargs)
+                pools[strategy_id] = list(candidates)
+                # 자기 결과는 요청 top_n 으로 잘라 기록 (넓은 풀은 소비자 전용)
+                strategy.candidates = list(candidates)[:top_n]
                 results[strategy_id] = strategy.get_result()
-                print(f"  → {len(candidates)}개 종목 선정")
+                shared = f" (풀 {len(candidates)}개 공유)" if run_n > top_n else ""
+                print(f"  → {len(strategy.candidates)}개 종목 선정{shared}")
             except Exception as e:
+                pools[strategy_id] = []  # 소비자는 빈 풀로 진행 (재실행 안 함)
                 print(f"  → 오류: {e}")
 
-        return results
+        # 결과 순서는 등록 순서 유지
+        return {sid: results[sid] for sid in cls._strategies if sid in results}
+
+    @staticmethod
+    def _market_context(date: str):
+        """run_all 공용 MarketSnapshot (구성 실패/빈 스냅샷이면 None → 전략별 자체 fetch)"""
+        try:
+            from paper_trading.utils.market_snapshot import get_market_snapshot
+            snapshot = get_market_snapshot(date)
+        except Exception as e:
+            logger.debug(f"MarketSnapshot 구성 실패 {date}: {e}")
+            return None
+        return None if snapshot.is_empty else snapshot
 
     @classmethod
     def run_strategy(cls, strategy_id: str, date: str = None, top_n: int = 5) -> Optional[StrategyResult]:
@@ -5,8 +5,10 @@ KOSPI v6 / KOSDAQ v5 변형이 공유하는 데이터 fetch + 필터 + 점수 
 실제 변형은 squeeze_play_kospi_v6.py / squeeze_play_kosdaq_v5.py 에서 상수 오버라이드.
 
 데이터 소스 우선순위:
-1. KRX OpenAPI (paper_trading.utils.krx_api.KRXClient) — 과거 + 당일
-2. pykrx 폴백
+1. KRX OpenAPI 일봉 패널 (KRXClient.get_history_matrix) — 유니버스 전체 (날짜 × 종목) 행렬 1회
+2. pykrx 폴백 (패널에 없는 종목만)
+
+지표는 paper_trading.utils.indicator_engine 으로 유니버스 일괄 계산.
 """
 
 from __future__ import annotations
@@ -28,13 +30,18 @@ from ._squeeze_common import (
     BB_PERIOD,
     PERCENT_B_MAX,
     MA200_PERIOD,
-    compute_indicators,
+    compute_squeeze_universe,
+    indicators_to_cache,
     passes_variant,
     score_candidate,
 )
+from paper_trading.utils.indicator_engine import fill_column, n_observations, right_align
 
 logger = logging.getLogger(__name__)
 
+# 유니버스 행렬로 받는 필드 (지표 + 시그널 일자 OHLC/거래 정보)
+UNIVERSE_FIELDS = ("시가", "종가", "거래량", "거래대금")
+
 # 데이터 소스 (momentum.py 와 동일 폴백 패턴)
 try:
     from paper_trading.utils.krx_api import KRXClient
@@ -100,28 +107,25 @@ class SqueezePlayBaseStrategy(BaseStrategy):
         start_dt = end_dt - timedelta(days=int(self.LOOKBACK_DAYS * 1.6))  # 주말/휴일 buffer
 
         krx = _get_krx()
+        codes = [code for code, _ in self.UNIVERSE]
+        aligned = self._fetch_universe(krx, codes, start_dt.strftime("%Y%m%d"), date)
+        ind = compute_squeeze_universe(aligned["종가"], codes)
+        n_obs = ind["n_obs"]
+
         candidates: List[Candidate] = []
         skipped_no_data = 0
-        for code, name in self.UNIVERSE:
-            df = self._fetch_history(krx, code, start_dt.strftime("%Y%m%d"), date)
-            if df is None or df.empty or len(df) < BB_PERIOD:
+        for j, (code, name) in enumerate(self.UNIVERSE):
+            if n_obs[j] < BB_PERIOD:
                 skipped_no_data += 1
                 continue
 
-            # 시그널 일자 OHLC
-            try:
-                last_row = df.iloc[-1]
-                open_price = float(last_row.get("시가") or last_row.get("Open") or 0)
-                close_price = float(last_row.get("종가") or last_row.get("Close") or 0)
-            except Exception:
-                continue
+            # 시그널 일자 OHLC (종목별 최근 관측치)
+            open_price = float(np.nan_to_num(aligned["시가"][-1, j]))
+            close_price = float(np.nan_to_num(aligned["종가"][-1, j]))
             if close_price <= 0:
                 continue
 
-            closes = df["종가"].astype(float).values if "종가" in df.columns \
-                     else df["Close"].astype(float).values
-
-            cache = compute_indicators(closes, close_price)
+            cache = indicators_to_cache(ind, j, close_price)
             is_positive = close_price > open_price
             if not passes_variant(
                 cache, close_price, is_positive,
@@ -137,15 +141,9 @@ class SqueezePlayBaseStrategy(BaseStrategy):
             )
             change_pct = (close_price - open_price) / open_price * 100 if open_price > 0 else 0.0
 
-            # 거래대금 / 시총 / 거래량 (KRX API 응답에 있으면)
-            try:
-                trading_value = int(last_row.get("거래대금", 0) or 0)
-            except Exception:
-                trading_value = 0
-            try:
-                volume = int(last_row.get("거래량", 0) or 0)
-            except Exception:
-                volume = 0
+            # 거래대금 / 거래량 (KRX API 응답에 있으면)
+            trading_value = int(np.nan_to_num(aligned["거래대금"][-1, j]))
+            volume = int(np.nan_to_num(aligned["거래량"][-1, j]))
 
             cand = Candidate(
                 code=code,
@@ -189,20 +187,46 @@ class SqueezePlayBaseStrategy(BaseStrategy):
             "recommended_holding_days": self.RECOMMENDED_HOLDING_DAYS,
         }
 
-    def _fetch_history(self, krx, code: str, start: str, end: str):
-        """KRX OpenAPI 1차, pykrx 폴백."""
+    def _fetch_universe(self, krx, codes: List[str], start: str, end: str) -> Dict[str, np.ndarray]:
+        """유니버스 (날짜 × 종목) 행렬 — KRX 일봉 패널 1차, 없는 종목만 pykrx 폴백.
+
+        Returns:
+            right_align 된 {시가/종가/거래량/거래대금: (T × C)} 행렬
+        """
+        mats = None
         if krx is not None:
             try:
-                df = krx.get_history(code, start, end, market=self.UNIVERSE_MARKET)
-                if df is not None and not df.empty:
-                    return df
+                dates, mats = krx.get_history_matrix(
+                    codes, start, end, markets=(self.UNIVERSE_MARKET,), fields=UNIVERSE_FIELDS,
+                )
+                if not dates:
+                    mats = None
             except Exception as e:
-                logger.debug(f"KRX get_history 실패 {code}: {e}")
-        if pykrx_stock is not None:
-            try:
-                df = pykrx_stock.get_market_ohlcv_by_date(start, end, code)
-                if df is not None and not df.empty:
-                    return df
-            except Exception as e:
-                logger.debug(f"pykrx 폴백 실패 {code}: {e}")
+                logger.debug(f"KRX get_history_matrix 실패: {e}")
+        if mats is None:
+            # 패널 없음 — pykrx 폴백 시계열을 담을 빈 행렬
+            rows = int(self.LOOKBACK_DAYS * 1.6)
+            mats = {f: np.full((rows, len(codes)), np.nan) for f in UNIVERSE_FIELDS}
+
+        aligned = right_align(mats)
+        n_obs = n_observations(aligned["종가"])
+        for j, code in enumerate(codes):
+            if n_obs[j] > 0 or pykrx_stock is None:
+                continue
+            df = self._fetch_history_pykrx(code, start, end)
+            if df is not None and not df.empty:
+                df = df.rename(columns={"Open": "시가", "Close": "종가", "Volume": "거래량"})
+                fill_column(aligned, j, {
+                    f: df[f].astype(float).values for f in UNIVERSE_FIELDS if f in df.columns
+                })
+        return aligned
+
+    def _fetch_history_pykrx(self, code: str, start: str, end: str):
+        """pykrx 종목별 폴백 (KRX 패널에 없는 종목)."""
+        try:
+            df = pykrx_stock.get_market_ohlcv_by_date(start, end, code)
+            if df is not None and not df.empty:
+                return df
+        except Exception as e:
+            logger.debug(f"pykrx 폴백 실패 {code}: {e}")
         return None
@@ -9,6 +9,7 @@ import logging
 from pathlib import Path
 from typing import List, Dict
 from datetime import datetime
+import numpy as np
 import requests
 from bs4 import BeautifulSoup
 
@@ -17,6 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from .base import BaseStrategy, Candidate
 from .registry import StrategyRegistry
 from utils import format_kst_time, get_headers
+from paper_trading.utils.market_snapshot import MarketSnapshot, get_market_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -103,8 +105,9 @@ class ThemePolicyStrategy(BaseStrategy):
         self.stock_mcap = {}     # {code: 시가총액(원)}
         self.code_to_sector = {} # {code: 첫 번째로 매칭된 sector명 (대표 업종)}
 
-    def select_stocks(self, date: str = None, top_n: int = 5) -> List[Candidate]:
-        """종목 선정"""
+    def select_stocks(self, date: str = None, top_n: int = 5,
+                      context: MarketSnapshot = None) -> List[Candidate]:
+        """종목 선정 (context: run_all 공용 MarketSnapshot)"""
         if date is None:
             date = format_kst_time(format_str='%Y%m%d')
 
@@ -112,7 +115,7 @@ class ThemePolicyStrategy(BaseStrategy):
         print(f"\n[{self.STRATEGY_NAME}] 종목 선정 시작 ({date})")
 
         # 1. 활성 테마 감지 (date-aware: 당일=naver, 과거=KRX 업종)
-        self.active_themes = self._detect_active_themes(date=date)
+        self.active_themes = self._detect_active_themes(date=date, snapshot=context)
 
         if not self.active_themes:
             print(f"  테마 감지 실패 - 폴백 테마 사용")
@@ -140,7 +143,7 @@ class ThemePolicyStrategy(BaseStrategy):
         print(f"  관련 종목: {len(all_codes)}개")
 
         # 3. 시장 데이터 가져오기
-        stocks = self._fetch_stock_data(list(all_codes), date, code_to_themes)
+        stocks = self._fetch_stock_data(list(all_codes), date, code_to_themes, snapshot=context)
 
         # 4. 점수 계산
         scored = self._calculate_scores(stocks)
@@ -209,7 +212,7 @@ class ThemePolicyStrategy(BaseStrategy):
         return selected
 
     def _detect_active_themes(self, top_n: int = 10, min_change: float = 0.5,
-                                date: str = None) -> List[Dict]:
+                                date: str = None, snapshot: MarketSnapshot = None) -> List[Dict]:
         """활성 테마 감지 (date-aware dual mode)
 
         - date == today (또는 None): Naver 테마 크롤링 (세분화 테마)
@@ -219,7 +222,7 @@ class ThemePolicyStrategy(BaseStrategy):
         is_backtest = date is not None and date != today
 
         if is_backtest:
-            return self._detect_themes_krx(date, top_n=top_n)
+            return self._detect_themes_krx(date, top_n=top_n, snapshot=snapshot)
 
         # 당일: Naver 테마
         if not self.theme_crawler:
@@ -236,10 +239,11 @@ class ThemePolicyStrategy(BaseStrategy):
             # 각 테마의 종목 수집
             self.theme_stocks = {}
             for theme in hot_themes[:top_n]:
-                stocks = self.theme_crawler.get_theme_stocks(theme['code'], theme['name'])
-                if stocks:
-                    self.theme_stocks[theme['name']] = [s['code'] for s in stocks]
-                    print(f"    {theme['name']}: {theme['change_pct']:+.2f}% ({len(stocks)}종목)")
+                # 구성 변동 없는 테마는 종목↔테마 인덱스에서 (페이지 요청 없음)
+                codes = self.theme_crawler.get_theme_members(theme)
+                if codes:
+                    self.theme_stocks[theme['name']] = codes
+                    print(f"    {theme['name']}: {theme['change_pct']:+.2f}% ({len(codes)}종목)")
 
             return hot_themes[:top_n]
 
@@ -247,7 +251,8 @@ class ThemePolicyStrategy(BaseStrategy):
             print(f"  테마 감지 오류: {e}")
             return []
 
-    def _detect_themes_krx(self, date: str, top_n: int = 10) -> List[Dict]:
+    def _detect_themes_krx(self, date: str, top_n: int = 10,
+                           snapshot: MarketSnapshot = None) -> List[Dict]:
         """KRX 업종 지수 기반 테마 감지 (backtest 모드)
 
         - 51개 KOSPI 지수 + 40개 KOSDAQ 지수 중 업종 지수 추출
@@ -262,9 +267,12 @@ class ThemePolicyStrategy(BaseStrategy):
         print(f"  [Backtest mode] KRX 업종 지수 fetch ({date})")
 
         try:
+            if snapshot is None:
+                snapshot = get_market_snapshot(date, krx)
+
             # KOSPI + KOSDAQ 지수
-            idx_kospi = krx.get_index_ohlcv(date, 'KOSPI')
-            idx_kosdaq = krx.get_index_ohlcv(date, 'KOSDAQ')
+            idx_kospi = snapshot.index_ohlcv('KOSPI')
+            idx_kosdaq = snapshot.index_ohlcv('KOSDAQ')
 
             # 업종 지수만 필터: '코스피 200', '코스피 (외국주포함)' 등 종합 지수 제외
             sector_indices = []
@@ -292,9 +300,9 @@ class ThemePolicyStrategy(BaseStrategy):
             sector_indices.sort(key=lambda x: x['change_pct'], reverse=True)
             top_sectors = sector_indices[:top_n]
 
-            # 종목 데이터 fetch (시총 상위 매핑용)
-            kospi_df = krx.get_stock_ohlcv(date, 'KOSPI')
-            kosdaq_df = krx.get_stock_ohlcv(date, 'KOSDAQ')
+            # 종목 데이터 (시총 상위 매핑용) — 스냅샷 컬럼 배열로 섹터별 일괄 마스크
+            chg_arr = snapshot.column('change_pct')
+            mcap_arr = snapshot.column('market_cap')
 
             # 섹터 이름 → 종목 매핑 (간단한 키워드 매칭, naver theme 부재 시 fallback)
             # KRX 종목정보에는 SECT_TP_NM이 빈값이라 정확한 매핑 불가
@@ -316,26 +324,13 @@ class ThemePolicyStrategy(BaseStrategy):
             for sector in top_sectors:
                 # 섹터 등락률과 비슷한 (±tolerance) 종목 중 시총 1000억~30조 종목을 "섹터 멤버"로 근사
                 target_chg = sector['change_pct']
-                candidates = []
-                for df in [kospi_df, kosdaq_df]:
-                    if df.empty:
-                        continue
-                    for code in df.index:
-                        try:
-                            row = df.loc[code]
-                            chg = float(row.get('등락률', 0))
-                            if abs(chg - target_chg) > tolerance:
-                                continue
-                            mcap = int(row.get('시가총액', 0))
-                            if mcap < 100_000_000_000:  # 하한 1000억
-                                continue
-                            if mcap > mcap_cap:  # 2순위 상한 30조 (시총 톱 수렴 차단)
-                                continue
-                            candidates.append((code, mcap))
-                        except Exception:
-                            continue
-                # 시총 상위 N개
-                candidates.sort(key=lambda x: x[1], reverse=True)
+                mask = ((np.abs(chg_arr - target_chg) <= tolerance)
+                        & (mcap_arr >= 100_000_000_000)   # 하한 1000억
+                        & (mcap_arr <= mcap_cap))         # 2순위 상한 30조 (시총 톱 수렴 차단)
+                idx = np.flatnonzero(mask)
+                # 시총 상위 N개 (동률은 KOSPI→KOSDAQ 원래 순서 유지)
+                idx = idx[np.argsort(-mcap_arr[idx], kind='stable')]
+                candidates = [(snapshot.codes[i], int(mcap_arr[i])) for i in idx]
                 if candidates:
                     members = candidates[:members_per_sector]
                     self.theme_stocks[sector['name']] = [c[0] for c in members]
@@ -351,7 +346,8 @@ class ThemePolicyStrategy(BaseStrategy):
             logger.warning(f"KRX 업종 지수 fetch 실패: {e}")
             return []
 
-    def _fetch_stock_data(self, codes: List[str], date: str, code_to_themes: Dict = None) -> List[Dict]:
+    def _fetch_stock_data(self, codes: List[str], date: str, code_to_themes: Dict = None,
+                          snapshot: MarketSnapshot = None) -> List[Dict]:
         """종목 데이터 수집 (KRX OpenAPI 1차, naver 폴백)
 
         ISSUE-015 fix (2026-05-09): naver `get_market_ohlcv_by_ticker` 가
@@ -370,49 +366,32 @@ class ThemePolicyStrategy(BaseStrategy):
             return stocks
         codes_set = set(codes)
 
-        # 1차: KRX OpenAPI (당일 + historical)
-        krx = _get_krx() if callable(_get_krx) else None
-        if krx:
-            try:
-                market_data = {}
-                for market in ['KOSPI', 'KOSDAQ']:
-                    df = krx.get_stock_ohlcv(date, market=market)
-                    if df is None or df.empty:
-                        continue
-                    for code in df.index:
-                        if code in codes_set:
-                            market_data[code] = (df.loc[code], market)
-
-                for code in codes:
-                    item = market_data.get(code)
-                    if item is None:
-                        continue
-                    row, mkt = item
-                    try:
-                        close = int(row.get('종가', 0))
-                        if close == 0:
-                            continue
-                        themes_info = code_to_themes.get(code, [])
-                        theme_names = [t['name'] for t in themes_info] if themes_info else []
-                        max_theme_change = max([t['change_pct'] for t in themes_info], default=0) if themes_info else 0
-                        stocks.append({
-                            'code': code,
-                            'name': str(row.get('종목명', code)),
-                            'price': close,
-                            'change_pct': float(row.get('등락률', 0)),
-                            'volume': int(row.get('거래량', 0)),
-                            'trading_value': int(row.get('거래대금', 0)),
-                            'themes': theme_names,
-                            'theme_strength': max_theme_change,
-                        })
-                    except Exception as e:
-                        logger.debug(f"KRX 매핑 실패 {code}: {e}")
-                        continue
+        # 1차: 공용 스냅샷 / KRX OpenAPI (당일 + historical)
+        if snapshot is None:
+            krx = _get_krx() if callable(_get_krx) else None
+            if krx:
+                try:
+                    snapshot = get_market_snapshot(date, krx)
+                except Exception as e:
+                    logger.warning(f"KRX fetch 실패, naver 폴백: {e}")
+        if snapshot is not None:
+            for row in snapshot.rows(codes):
+                themes_info = code_to_themes.get(row['code'], [])
+                theme_names = [t['name'] for t in themes_info] if themes_info else []
+                max_theme_change = max([t['change_pct'] for t in themes_info], default=0) if themes_info else 0
+                stocks.append({
+                    'code': row['code'],
+                    'name': row['name'],
+                    'price': row['close'],
+                    'change_pct': row['change_pct'],
+                    'volume': row['volume'],
+                    'trading_value': row['trading_value'],
+                    'themes': theme_names,
+                    'theme_strength': max_theme_change,
+                })
 
-                if stocks:
-                    return stocks
-            except Exception as e:
-                logger.warning(f"KRX fetch 실패, naver 폴백: {e}")
+            if stocks:
+                return stocks
 
         # 2차: naver 폴백 (당일만 동작 — date 인자 무시 결함, 폴백 시 leakage 가능)
         if pykrx_stock is None:
@@ -0,0 +1,338 @@
+"""
+아레나 원장 (ledger) + 리더보드 재실행 안전성 단위 테스트.
+
+검증 항목:
+1. record_day — 같은 결과 재기록은 쓰지 않음, 바뀐 결과만 덧붙임 (뒤 행 우선), 끊긴 마지막 줄 복구
+2. replay — 원장 한 번 스캔 결과가 날짜별 순차 update_after_day / update_daily 와 동일, 구간 재생
+3. Leaderboard.update_daily — 같은 날짜 재실행/수정이 이중 누적되지 않음
+   월별 파일 + 최근 창: 새 날짜는 그달 파일만, 이전 달 수정은 체크포인트부터 재반영
+   실제 leaderboard.json (은퇴 팀 대결/보정 포함) 은 월별 분리·재실행에도 그대로,
+   체크포인트 이전 날짜 수정은 LeaderboardRevisionError
+4. bootstrap — 기존 daily trades.json + 리더보드 순위 (월 파일) 로 원장 구성, 포트폴리오 재구성 동일
+
+격리: 원장/리더보드/아레나 폴더는 임시 폴더 (실제 leaderboard.json 은 복사본만 사용).
+
+실행:
+    python -m paper_trading.test_arena_ledger
+"""
+
+import json
+import random
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.arena.leaderboard import (
+    ARENA_DIR, HISTORY_WINDOW, Leaderboard, LeaderboardRevisionError,
+)
+from paper_trading.arena.ledger import ArenaLedger
+from paper_trading.arena.team import TeamPortfolio
+
+TEAMS = ['team_a', 'team_b', 'team_c', 'team_d', 'team_e']
+
+
+def _dates(n, start='20260105'):
+    cur = datetime.strptime(start, '%Y%m%d')
+    out = []
+    while len(out) < n:
+        if cur.weekday() < 5:
+            out.append(cur.strftime('%Y%m%d'))
+        cur += timedelta(days=1)
+    return out
+
+
+def _day_results(rnd, capital=10_000_000):
+    """팀별 일일 결과 — 일부 팀은 후보 없음"""
+    out = {}
+    for tid in TEAMS:
+        if rnd.random() < 0.15:
+            out[tid] = {'status': 'no_candidates'}
+            continue
+        trades = rnd.randint(1, 5)
+        wins = rnd.randint(0, trades)
+        ret = round(rnd.uniform(-3, 4), 2)
+        out[tid] = {'status': 'success', 'total_return': ret,
+                    'total_return_amount': int(capital * ret / 100 / 5),
+                    'total_trades': trades, 'wins': wins,
+                    'win_rate': round(wins / trades * 100, 1)}
+    return out
+
+
+def _lb_results(results):
+    """arena_manager Phase 4 와 같은 리더보드 입력"""
+    return {tid: {'total_return': r.get('total_return', 0), 'win_rate': r.get('win_rate', 0),
+                  'total_trades': r.get('total_trades', 0)} for tid, r in results.items()}
+
+
+def _pf(pf):
+    d = pf.to_dict()
+    d.pop('last_updated')
+    return d
+
+
+def _sequential(days):
+    """기존 경로: 날짜별 update_after_day + Leaderboard.update_daily"""
+    portfolios = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        lb = Leaderboard(data_path=Path(tmp) / 'leaderboard.json')
+        for tid in TEAMS:
+            lb.init_team(tid, tid, '')
+        for date, results in days:
+            for tid, r in results.items():
+                if r['status'] != 'success':
+                    continue
+                pf = portfolios.setdefault(tid, TeamPortfolio(team_id=tid))
+                pf.update_after_day(r['total_return'], r['total_return_amount'], r['total_trades'], r['wins'])
+            lb.update_daily(date, _lb_results(results))
+        return portfolios, {'teams': lb.data['teams'], 'daily_history': lb.history()}
+
+
+def test_record_idempotent():
+    """같은 결과는 'unchanged' (쓰기 없음), 수정은 'revised' 로 덧붙이고 재로드 시 뒤 행 우선."""
+    rnd = random.Random(1)
+    d1, d2 = _dates(2)
+    day1 = _day_results(rnd)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'ledger.jsonl'
+        ledger = ArenaLedger(path)
+        assert not ledger.exists()
+        assert set(ledger.record_day(d1, day1).values()) == {'new'}
+        lines = path.read_text(encoding='utf-8').count('\n')
+        assert lines == len(TEAMS)
+
+        assert set(ledger.record_day(d1, day1).values()) == {'unchanged'}
+        assert path.read_text(encoding='utf-8').count('\n') == lines
+
+        assert set(ledger.record_day(d2, _day_results(rnd)).values()) == {'new'}
+        revised = dict(day1, team_a={**day1['team_a'], 'status': 'success', 'total_return': 9.9,
+                                     'total_return_amount': 1000, 'total_trades': 1, 'wins': 1})
+        status = ledger.record_day(d1, revised)
+        assert status['team_a'] == 'revised' and status['team_b'] == 'unchanged'
+        assert path.read_text(encoding='utf-8').count('\n') == 2 * len(TEAMS) + 1
+
+        # 끊긴 마지막 줄 (쓰기 중단) → 무시, 다음 기록은 새 줄
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"date": "2026')
+        reloaded = ArenaLedger(path)
+        assert len(reloaded) == 2 * len(TEAMS)
+        assert reloaded.get('team_a', d1)['total_return'] == 9.9
+        assert reloaded.last_date('team_a') == d2 and reloaded.last_date() == d2
+        d0 = '20260102'
+        assert reloaded.record_day(d0, {'team_c': {'status': 'no_candidates'}}) == {'team_c': 'revised'}
+        assert len(ArenaLedger(path)) == 2 * len(TEAMS) + 1
+    print("  [OK] 재기록 0줄, 수정 1줄 추가, 끊긴 줄 복구")
+
+
+def test_replay_matches_sequential():
+    """원장 재생 = 순차 갱신 (포트폴리오/ELO/순위/히스토리), 구간 재생 = 구간만 순차."""
+    rnd = random.Random(7)
+    days = [(d, _day_results(rnd)) for d in _dates(80)]
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = ArenaLedger(Path(tmp) / 'ledger.jsonl')
+        for date, results in days:
+            ledger.record_day(date, results)
+        ledger = ArenaLedger(ledger.path)
+
+        portfolios, lb_data = _sequential(days)
+        snap = ledger.replay(team_meta={tid: {'team_name': tid, 'emoji': ''} for tid in TEAMS})
+        assert {t: _pf(p) for t, p in snap['portfolios'].items()} == {t: _pf(p) for t, p in portfolios.items()}
+        assert snap['teams'] == lb_data['teams']
+        assert snap['daily_history'] == lb_data['daily_history']
+        assert _pf(ledger.replay_portfolio('team_b')) == _pf(portfolios['team_b'])
+
+        start, end = days[20][0], days[49][0]
+        part_pf, part_lb = _sequential(days[20:50])
+        part = ledger.replay(start, end)
+        assert {t: _pf(p) for t, p in part['portfolios'].items()} == {t: _pf(p) for t, p in part_pf.items()}
+        assert {t: v['elo'] for t, v in part['teams'].items()} == {t: v['elo'] for t, v in part_lb['teams'].items()}
+        assert _pf(ledger.replay_portfolio('team_c', start=start, end=end)) == _pf(part_pf['team_c'])
+    elo = {t: v['elo'] for t, v in snap['teams'].items()}
+    print(f"  [OK] {len(days)}일 × {len(TEAMS)}팀 재생 일치, ELO {elo}")
+
+
+def _fresh_leaderboard(path, days):
+    lb = Leaderboard(data_path=path)
+    for tid in TEAMS:
+        lb.init_team(tid, tid, '')
+    for date, results in days:
+        lb.update_daily(date, results)
+    return lb
+
+
+def test_leaderboard_rerun():
+    """같은 날짜 재실행은 집계 그대로, 수정 결과는 교체 후 재생 (누적 이중 계산 없음)."""
+    rnd = random.Random(11)
+    days = [(d, _lb_results(_day_results(rnd))) for d in _dates(12)]
+    with tempfile.TemporaryDirectory() as tmp:
+        lb = _fresh_leaderboard(Path(tmp) / 'leaderboard.json', days)
+        once = json.loads(json.dumps(lb.data['teams']))
+
+        lb.update_daily(*days[-1])                       # 같은 날짜 재실행
+        assert lb.data['teams'] == once and len(lb.data['daily_history']) == len(days)
+
+        revised = dict(days[5][1], team_d={'total_return': 30.0, 'win_rate': 100, 'total_trades': 1})
+        lb.update_daily(days[5][0], revised)             # 과거 날짜 수정
+        expected = _fresh_leaderboard(Path(tmp) / 'expected' / 'leaderboard.json',
+                                      [(d, revised if i == 5 else r) for i, (d, r) in enumerate(days)])
+        assert lb.data['teams'] == expected.data['teams']
+        assert lb.data['daily_history'] == expected.data['daily_history']
+        assert lb.data['teams']['team_d']['best_day_return'] == 30.0
+
+        reloaded = Leaderboard(data_path=Path(tmp) / 'leaderboard.json')
+        assert reloaded.data == lb.data
+        assert '\n' not in (Path(tmp) / 'leaderboard.json').read_text(encoding='utf-8')
+    print("  [OK] 재실행 → 집계 불변, 과거 날짜 수정 → 재생 결과와 동일")
+
+
+def test_leaderboard_month_split():
+    """월별 파일 + 최근 창: 새 날짜는 그달 파일만 쓰고, 이전 달 수정은 이후 달까지 재반영."""
+    rnd = random.Random(13)
+    days = [(d, _lb_results(_day_results(rnd))) for d in _dates(70)]
+    with tempfile.TemporaryDirectory() as tmp:
+        lb = _fresh_leaderboard(Path(tmp) / 'leaderboard.json', days[:-1])
+        months = sorted({d[:6] for d, _ in days})
+        assert lb.data['history_months'] == months and len(months) >= 3
+        files = {m: (lb.history_dir / f"{m}.json").read_bytes() for m in months}
+
+        lb.update_daily(*days[-1])                       # 새 날짜 → 마지막 달 파일만
+        for m in months[:-1]:
+            assert (lb.history_dir / f"{m}.json").read_bytes() == files[m], m
+        assert len(lb.data['daily_history']) == HISTORY_WINDOW and lb.data['total_days'] == len(days)
+        assert [e['date'] for e in lb.history()] == [d for d, _ in days]
+        assert lb.get_daily_history(50) == lb.history()[-50:]
+        assert lb.get_summary()['total_days'] == len(days)
+
+        i = 3                                            # 첫 달 수정 → 이후 달 base 까지 다시 반영
+        revised = dict(days[i][1], team_a={'total_return': -25.0, 'win_rate': 0, 'total_trades': 3})
+        assert lb.check_update(days[i][0], revised) is not None
+        lb.update_daily(days[i][0], revised)
+        expected = _fresh_leaderboard(Path(tmp) / 'expected' / 'leaderboard.json',
+                                      [(d, revised if k == i else r) for k, (d, r) in enumerate(days)])
+        assert lb.data['teams'] == expected.data['teams']
+        assert lb.data['daily_history'] == expected.data['daily_history']
+        assert lb.history() == expected.history()
+        for m in months:
+            assert lb._read_month(m) == expected._read_month(m), m
+        assert Leaderboard(data_path=lb.data_path).data == lb.data
+    print(f"  [OK] {len(days)}일 → {len(months)}개월 파일, 창 {HISTORY_WINDOW}일, 첫 달 수정 재반영 일치")
+
+
+def test_committed_leaderboard_stable():
+    """실제 leaderboard.json: 월별 분리 = 그대로, 마지막 날 재실행 = 그대로, 분리 이전 날짜 수정은 오류."""
+    with tempfile.TemporaryDirectory() as tmp:
+        committed = json.loads((ARENA_DIR / 'leaderboard.json').read_text(encoding='utf-8'))
+        for sub in ('lb', 'expected'):
+            (Path(tmp) / sub).mkdir()
+            shutil.copy(ARENA_DIR / 'leaderboard.json', Path(tmp) / sub / 'leaderboard.json')
+        lb = Leaderboard(data_path=Path(tmp) / 'lb' / 'leaderboard.json')
+        history = committed['daily_history']
+
+        assert lb.history() == history and lb.data['teams'] == committed['teams']
+        assert lb.data['daily_history'] == history[-HISTORY_WINDOW:]
+        assert lb.data['total_days'] == len(history)
+        assert Leaderboard(data_path=lb.data_path).data == lb.data
+        last_date = history[-1]['date']
+        last = {r['team_id']: {'total_return': r['total_return'], 'win_rate': r['win_rate'],
+                               'total_trades': r['trades']} for r in history[-1]['ranking']}
+        lb.update_daily(last_date, last)                 # workflow force=True 재실행
+        assert lb.data['teams'] == committed['teams'] and lb.history() == history
+
+        # 새 날짜 반영 → 같은 날짜 다른 결과로 재실행 → 그날만 교체 (이전 집계 기준)
+        rnd = random.Random(3)
+        active = list(committed['teams'])
+        new_date = _dates(2, start=last_date)[-1]
+        first = {t: {'total_return': round(rnd.uniform(-3, 3), 2), 'win_rate': 50, 'total_trades': 2}
+                 for t in active}
+        second = {t: dict(r, total_return=-r['total_return']) for t, r in first.items()}
+        lb.update_daily(new_date, first)
+        lb.update_daily(new_date, second)
+        expected = Leaderboard(data_path=Path(tmp) / 'expected' / 'leaderboard.json')
+        expected.update_daily(new_date, second)
+        assert lb.data['teams'] == expected.data['teams']
+        assert lb.history() == expected.history()
+
+        # 분리 이전 (체크포인트 이전) 날짜 수정 → 오류, 집계/파일 그대로
+        before = json.loads(json.dumps(lb.data))
+        changed = {t: {'total_return': 9.9} for t in active}
+        for call in (lb.check_update, lb.update_daily):
+            try:
+                call(last_date, changed)
+            except LeaderboardRevisionError:
+                pass
+            else:
+                raise AssertionError(f"{call.__name__}: 수정 오류 없음")
+        assert lb.data == before and lb.history() == expected.history()
+    elo = {t: v['elo'] for t, v in committed['teams'].items()}
+    print(f"  [OK] {len(history)}일 히스토리 월별 분리/재실행 ELO 불변 {elo}")
+
+
+def test_bootstrap():
+    """daily trades.json (매매일) + 리더보드 순위 (후보 없는 날) → 원장, 포트폴리오 재구성 동일."""
+    rnd = random.Random(5)
+    days = [(d, _day_results(rnd)) for d in _dates(30)]
+    portfolios, lb_data = _sequential(days)
+    with tempfile.TemporaryDirectory() as tmp:
+        arena = Path(tmp) / 'arena'
+        for date, results in days:
+            for tid, r in results.items():
+                if r['status'] == 'success':
+                    day_dir = arena / tid / 'daily' / date
+                    day_dir.mkdir(parents=True)
+                    (day_dir / 'trades.json').write_text(json.dumps({**r, 'results': []}), encoding='utf-8')
+        _fresh_leaderboard(arena / 'leaderboard.json', [(d, _lb_results(r)) for d, r in days])
+
+        ledger = ArenaLedger(arena / 'ledger.jsonl')
+        n = ledger.bootstrap(arena)
+        assert n == len(days) * len(TEAMS) and ArenaLedger(ledger.path).rows() == ledger.rows()
+        for tid in TEAMS:
+            assert _pf(ledger.replay_portfolio(tid)) == _pf(portfolios[tid]), tid
+        snap = ledger.replay(team_meta={tid: {'team_name': tid, 'emoji': ''} for tid in TEAMS})
+        assert snap['teams'] == lb_data['teams']
+        skipped = sum(1 for _, r in days for v in r.values() if v['status'] != 'success')
+        assert sum(1 for r in ledger.rows() if r['status'] == 'no_candidates') == skipped
+    print(f"  [OK] {n}행 구성 (후보 없음 {skipped}행), 포트폴리오/ELO 일치")
+
+
+def main():
+    print("=" * 60)
+    print("아레나 원장 / 리더보드 재실행 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_record_idempotent,
+        test_replay_matches_sequential,
+        test_leaderboard_rerun,
+        test_leaderboard_month_split,
+        test_committed_leaderboard_stable,
+        test_bootstrap,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+원자적 파일 저장 공용 유틸 (utils.atomic_io) 단위 테스트.
+
+검증 항목:
+1. write_json_atomic / atomic_open — 저장 내용, 폴더 자동 생성, 바이너리 (npz) 저장
+2. 쓰는 도중 예외 — 기존 파일 그대로, 임시 파일 남지 않음
+3. read_json — 없는 파일 / 깨진 파일은 default
+
+격리: 임시 폴더만 사용.
+
+실행:
+    python -m paper_trading.test_atomic_io
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.utils.atomic_io import atomic_open, read_json, write_json_atomic
+
+
+def test_write_and_read():
+    """JSON/npz 저장 후 읽기, 하위 폴더 자동 생성, 없는/깨진 파일은 default."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "a" / "b" / "data.json"
+        write_json_atomic(path, {"종목": "005930", "n": [1, 2]}, separators=(',', ':'))
+        assert path.read_text(encoding='utf-8') == '{"종목":"005930","n":[1,2]}'
+        assert read_json(path) == {"종목": "005930", "n": [1, 2]}
+
+        npz = Path(tmp) / "rows.npz"
+        with atomic_open(npz, 'wb') as f:
+            np.savez(f, rows=np.arange(5))
+        with np.load(npz) as data:
+            assert data['rows'].tolist() == [0, 1, 2, 3, 4]
+
+        broken = Path(tmp) / "broken.json"
+        broken.write_text("{broken", encoding='utf-8')
+        assert read_json(broken) is None and read_json(broken, default={}) == {}
+        assert read_json(Path(tmp) / "missing.json", default=[]) == []
+    print("  [OK] JSON/npz 저장·읽기, 없는/깨진 파일 default")
+
+
+def test_failure_keeps_original():
+    """쓰는 도중 예외 → 기존 파일 유지, 임시 파일 정리."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "leaderboard.json"
+        write_json_atomic(path, {"v": 1})
+        try:
+            write_json_atomic(path, {"v": object()})       # 직렬화 실패
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("직렬화 실패가 전파되지 않음")
+        try:
+            with atomic_open(path) as f:
+                f.write('{"v": 2')
+                raise KeyboardInterrupt
+        except KeyboardInterrupt:
+            pass
+        assert json.loads(path.read_text(encoding='utf-8')) == {"v": 1}
+        assert [p.name for p in Path(tmp).iterdir()] == ["leaderboard.json"]
+    print("  [OK] 실패 시 기존 파일 유지, 임시 파일 없음")
+
+
+def main():
+    print("=" * 60)
+    print("원자적 파일 저장 유틸 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_write_and_read,
+        test_failure_keeps_original,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
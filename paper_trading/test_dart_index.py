@@ -0,0 +1,251 @@
+"""
+DART 고유번호 인덱스 + 공시 일괄 수집 단위 테스트.
+
+검증 항목:
+1. parse_corp_codes — zip/XML 원문 모두, 비상장 법인 제외, 저장/재로드·보관 기간
+2. _fetch_disclosures — 100건 넘는 날도 전체 페이지 수집
+3. check_negative_disclosures — 후보 50종목 체크에 기간 목록 페이지 요청만 (회사별 요청 0),
+   결과는 회사별 조회(corp_code) 경로와 동일
+4. 일괄 수집 후 get_recent_disclosures / check_negative_disclosure 추가 요청 없음
+
+격리: dart_utils / dart_corp_index 의 requests 를 가짜 DART 로 교체 (네트워크 미사용).
+
+실행:
+    python -m paper_trading.test_dart_index
+"""
+
+import io
+import sys
+import tempfile
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.utils import dart_corp_index, dart_utils, disclosure_store
+from paper_trading.utils.dart_corp_index import DartCorpIndex, parse_corp_codes
+from paper_trading.utils.disclosure_store import DisclosureStore
+from paper_trading.utils.dart_utils import DartFilter
+
+TARGET = "20260410"
+CODES = [f"{i:06d}" for i in range(1, 51)]
+
+
+def _corp_xml(codes):
+    rows = "".join(
+        f"<list><corp_code>{9000 + i:08d}</corp_code><corp_name>회사{i}</corp_name>"
+        f"<stock_code>{code}</stock_code><modify_date>20260101</modify_date></list>"
+        for i, code in enumerate(codes))
+    rows += ("<list><corp_code>00000001</corp_code><corp_name>비상장</corp_name>"
+             "<stock_code> </stock_code><modify_date>20260101</modify_date></list>")
+    return f'<?xml version="1.0" encoding="UTF-8"?><result>{rows}</result>'.encode('utf-8')
+
+
+def _corp_zip(codes):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        zf.writestr('CORPCODE.xml', _corp_xml(codes))
+    return buf.getvalue()
+
+
+def _disclosures():
+    """7일 × 하루 40건 — 3의 배수 종목은 부정 공시 1건 섞임"""
+    items = []
+    end = datetime.strptime(TARGET, '%Y%m%d')
+    for d in range(8):
+        date = (end - timedelta(days=d)).strftime('%Y%m%d')
+        for k in range(40):
+            code = CODES[(d * 40 + k) % len(CODES)]
+            negative = int(code) % 3 == 0 and k % 5 == 0
+            items.append({
+                'corp_code': f"{9000 + CODES.index(code):08d}", 'corp_name': f"회사{code}",
+                'stock_code': code, 'corp_cls': 'Y', 'rcept_dt': date,
+                'rcept_no': f"{date}{k:06d}",
+                'report_nm': '횡령ㆍ배임혐의발생' if negative else '단일판매ㆍ공급계약체결',
+            })
+    return items
+
+
+class _FakeResponse:
+    def __init__(self, data=None, content=b''):
+        self._data = data
+        self.content = content
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeDart:
+    """list.json (기간/회사 필터 + 페이지) / corpCode.xml 응답, 호출 기록"""
+
+    def __init__(self, items):
+        self.items = items
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        params = dict(params or {})
+        self.calls.append((url.rsplit('/', 1)[-1], params))
+        if url.endswith('corpCode.xml'):
+            return _FakeResponse(content=_corp_zip(CODES))
+        rows = [x for x in self.items
+                if params['bgn_de'] <= x['rcept_dt'] <= params['end_de']
+                and ('corp_code' not in params or x['corp_code'] == params['corp_code'])]
+        if not rows:
+            return _FakeResponse({'status': '013', 'message': '조회된 데이타가 없습니다.'})
+        size = params['page_count']
+        total_page = (len(rows) + size - 1) // size
+        page = rows[(params['page_no'] - 1) * size:params['page_no'] * size]
+        return _FakeResponse({'status': '000', 'page_no': params['page_no'],
+                              'total_page': total_page, 'list': page})
+
+    def count(self, kind, **match):
+        return sum(1 for k, p in self.calls
+                   if k == kind and all(p.get(a) == b for a, b in match.items()))
+
+
+def _with_fake(fake, tmp):
+    """requests 교체 + 인덱스/공시 저장소 경로 격리. 복원 함수 반환"""
+    saved = (dart_utils.requests, dart_corp_index.requests, dart_corp_index._corp_index,
+             disclosure_store._store)
+    dart_utils.requests = fake
+    dart_corp_index.requests = fake
+    dart_corp_index._corp_index = DartCorpIndex(path=Path(tmp) / 'corp_codes.json')
+    disclosure_store._store = DisclosureStore(Path(tmp) / 'disclosures')
+
+    def restore():
+        (dart_utils.requests, dart_corp_index.requests, dart_corp_index._corp_index,
+         disclosure_store._store) = saved
+    return restore
+
+
+def test_corp_index_parse_and_persist():
+    """zip/XML 파싱 → 상장사만, 저장 후 재로드, 보관 기간 경과 시 stale."""
+    assert parse_corp_codes(_corp_xml(CODES[:3])) == parse_corp_codes(_corp_zip(CODES[:3]))
+    codes = parse_corp_codes(_corp_zip(CODES))
+    assert len(codes) == 50 and codes['000002'] == ('00009001', '회사1')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'corp_codes.json'
+        index = DartCorpIndex(path=path)
+        assert index.is_stale() and index.corp_code('005930') is None
+        index.update(codes, updated='20260401')
+        reloaded = DartCorpIndex(path=path)
+        assert len(reloaded) == 50 and reloaded.corp_code('A000003') == '00009002'
+        assert reloaded.stock_code('00009002') == '000003' and reloaded.corp_name('000001') == '회사0'
+        assert not reloaded.is_stale('20260420') and reloaded.is_stale('20260520')
+
+        fake = _FakeDart([])
+        restore = _with_fake(fake, tmp)
+        try:
+            fresh = DartCorpIndex(path=Path(tmp) / 'other.json')
+            assert fresh.ensure('KEY') and fresh.ensure('KEY')
+            assert fake.count('corpCode.xml') == 1 and len(fresh) == 50
+        finally:
+            restore()
+    print("  [OK] 상장사 50건 인덱스 — 저장/재로드, 보관 기간, 1회 다운로드")
+
+
+def test_fetch_all_pages():
+    """하루 250건 → 3페이지 전체 수집 (기존 100건 절단 제거)."""
+    items = [{'stock_code': f"{k % 50 + 1:06d}", 'rcept_dt': TARGET, 'report_nm': 'x',
+              'corp_code': '0'} for k in range(250)]
+    fake = _FakeDart(items)
+    with tempfile.TemporaryDirectory() as tmp:
+        restore = _with_fake(fake, tmp)
+        try:
+            dart = DartFilter(api_key='KEY')
+            assert len(dart._fetch_disclosures(TARGET)) == 250
+            assert len(dart._fetch_disclosures(TARGET)) == 250      # 캐시
+            assert dart._fetch_disclosures("20260411") == []
+        finally:
+            restore()
+    assert fake.count('list.json') == 4, fake.calls
+    print("  [OK] 250건 3페이지 수집, 재조회 캐시")
+
+
+def test_bulk_negative_matches_per_company():
+    """50종목 부정 공시 일괄 체크 == 회사별 조회, 요청은 기간 목록 페이지뿐."""
+    fake = _FakeDart(_disclosures())
+    with tempfile.TemporaryDirectory() as tmp:
+        restore = _with_fake(fake, tmp)
+        try:
+            per_company = DartFilter(api_key='KEY')
+            expected = {c for c in CODES
+                        if per_company.check_negative_disclosure(c, target_date=TARGET)}
+            company_calls = fake.count('list.json')
+
+            fake.calls.clear()
+            bulk = DartFilter(api_key='KEY')
+            negative = bulk.check_negative_disclosures(CODES, target_date=TARGET)
+        finally:
+            restore()
+    assert company_calls >= len(CODES)
+    assert negative == expected and len(negative) > 0
+    assert fake.count('corpCode.xml') == 0
+    assert all('corp_code' not in p for _, p in fake.calls)
+    assert fake.count('list.json') == 4, fake.calls     # 320건 = 4페이지, 1회 수집
+    print(f"  [OK] 부정 공시 {len(negative)}종목 일치 — 회사별 {company_calls}회 → 일괄 {len(fake.calls)}회")
+
+
+def test_bulk_cache_shared():
+    """일괄 수집 후 단일 종목 체크 / get_recent_disclosures 는 추가 요청 없음."""
+    fake = _FakeDart(_disclosures())
+    with tempfile.TemporaryDirectory() as tmp:
+        restore = _with_fake(fake, tmp)
+        try:
+            dart = DartFilter(api_key='KEY')
+            negative = dart.check_negative_disclosures(CODES, target_date=TARGET)
+            n = len(fake.calls)
+            assert dart.check_negative_disclosure('000003', target_date=TARGET) is ('000003' in negative)
+            assert dart.check_negative_disclosure('000001', target_date=TARGET) is False
+            positive = dart.get_recent_disclosures(target_date=TARGET)
+            index = dart.disclosures_by_stock("20260409", TARGET)
+        finally:
+            restore()
+    assert len(fake.calls) == n, fake.calls[n:]
+    assert positive and all(p.category == '계약' for p in positive)
+    assert sum(len(v) for v in index.values()) == 80
+    print(f"  [OK] 추가 요청 없음 (호재 공시 {len(positive)}건, 2일 인덱스 80건)")
+
+
+def main():
+    print("=" * 60)
+    print("DART 고유번호 인덱스 / 공시 일괄 수집 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_corp_index_parse_and_persist,
+        test_fetch_all_pages,
+        test_bulk_negative_matches_per_company,
+        test_bulk_cache_shared,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
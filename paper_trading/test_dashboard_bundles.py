@@ -0,0 +1,180 @@
+"""
+아레나 대시보드 번들 (dashboard.build_dashboard_bundles) 단위 테스트.
+
+검증 항목:
+1. 번들 내용 — 최근 창이 팀 × 날짜 summary/trades 개별 파일 (arena.js 기존 경로) 과 동일
+2. 재생성 — 새 거래일/수정 파일 반영, 오래된 날짜는 읽지 않음
+3. overview 항목 — 리더보드/포트폴리오 그대로, 헬스/후보/facts 는 넣지 않음 (JS 가 직접 읽음)
+
+격리: 아레나 폴더는 임시 폴더 (실제 data/arena 미사용).
+
+실행:
+    python -m paper_trading.test_dashboard_bundles
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.arena.dashboard import build_dashboard_bundles
+
+TEAMS = {'team_a': 'momentum', 'team_b': 'largecap_contrarian', 'team_c': 'dart_disclosure'}
+
+
+def _write(path, payload):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding='utf-8')
+
+
+def _dates(start, n):
+    cur = datetime.strptime(start, '%Y%m%d')
+    out = []
+    while len(out) < n:
+        if cur.weekday() < 5:
+            out.append(cur.strftime('%Y%m%d'))
+        cur += timedelta(days=1)
+    return out
+
+
+def _make_arena(root, dates):
+    """팀 3개 × 날짜별 summary/trades (team_c 는 일부 날짜 trades 없음)"""
+    arena = Path(root) / 'arena'
+    for t, (tid, sid) in enumerate(TEAMS.items()):
+        capital = 10_000_000
+        for i, date in enumerate(dates):
+            ret = ((i * 7 + t * 3) % 9 - 4) * 0.31
+            capital = round(capital * (1 + ret / 100))
+            day = arena / tid / 'daily' / date
+            _write(day / 'summary.json', {
+                'team_id': tid, 'strategy_id': sid, 'date': date,
+                'simulation': {'total_trades': 1 + i % 3, 'wins': i % 2, 'total_return': ret},
+                'portfolio_after': {'current_capital': capital, 'total_return_pct': (capital / 1e5) - 100,
+                                    'trading_days': i + 1},
+            })
+            if not (tid == 'team_c' and i % 4 == 0):
+                _write(day / 'trades.json', {'results': [{'code': f"{i:06d}", 'return_pct': ret}]})
+            _write(day / 'selection.json', {'count': 1})
+        _write(arena / tid / 'portfolio.json', {'team_id': tid, 'current_capital': capital})
+    _write(arena / 'leaderboard.json', {'daily_history': [{'date': d, 'ranking': []} for d in dates]})
+    _write(arena / '_verified_facts.json', {'ok': True})
+    _write(arena / 'strategy_config.json', {'strategies': {
+        sid: {'enabled': True, 'team_id': tid} for tid, sid in TEAMS.items()}})
+    return arena
+
+
+def _legacy_history(arena, tid):
+    """arena.js 개별 fetch 경로 — summary 있는 날만, trades 는 있으면"""
+    rows = []
+    for day in sorted((arena / tid / 'daily').iterdir()):
+        summary = day / 'summary.json'
+        if not summary.exists():
+            continue
+        row = {'date': day.name, 'summary': json.loads(summary.read_text(encoding='utf-8')),
+               'trades': None}
+        if (day / 'trades.json').exists():
+            row['trades'] = json.loads((day / 'trades.json').read_text(encoding='utf-8'))
+        rows.append(row)
+    return rows
+
+
+def _load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_bundle_parity():
+    """최근 창 = 개별 파일 경로의 최근 7거래일, latest_date = 마지막 거래일."""
+    dates = _dates('20260302', 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        arena = _make_arena(tmp, dates)
+        stats = build_dashboard_bundles(arena)
+        assert stats['latest_date'] == dates[-1] and stats['teams'] == len(TEAMS)
+
+        overview = _load(arena / 'bundles' / 'overview.json')
+        for tid in TEAMS:
+            legacy = _legacy_history(arena, tid)
+            assert overview['recent'][tid] == legacy[::-1][:7], tid
+        assert sorted(p.name for p in (arena / 'bundles').iterdir()) == ['overview.json']
+        files = sum(1 for _ in arena.glob('team_*/daily/*/*.json') if _.name != 'selection.json')
+    print(f"  [OK] {len(TEAMS)}팀 × {len(dates)}일 (개별 파일 {files}개) → overview 1개")
+
+
+def test_rebuild():
+    """파일 수정/새 거래일 반영, 최근 창 밖 깨진 파일은 결과에 영향 없음."""
+    dates = _dates('20260302', 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        arena = _make_arena(tmp, dates)
+        out = arena / 'bundles'
+        (arena / 'team_a' / 'daily' / dates[0] / 'summary.json').write_text('{broken', encoding='utf-8')
+        build_dashboard_bundles(arena)
+
+        _write(arena / 'team_b' / 'daily' / dates[-2] / 'trades.json',
+               {'results': [{'code': '999999', 'return_pct': 9.9}]})
+        build_dashboard_bundles(arena)
+        row = next(r for r in _load(out / 'overview.json')['recent']['team_b'] if r['date'] == dates[-2])
+        assert row['trades']['results'][0]['code'] == '999999'
+
+        new_day = _dates(dates[-1], 2)[-1]
+        for tid in TEAMS:
+            shutil.copytree(arena / tid / 'daily' / dates[-1], arena / tid / 'daily' / new_day)
+        stats = build_dashboard_bundles(arena)
+        recent = _load(out / 'overview.json')['recent']['team_a']
+        assert stats['latest_date'] == new_day and recent[0]['date'] == new_day and len(recent) == 7
+    print("  [OK] 수정 → 반영, 새 거래일 → 창 이동 (창 밖 깨진 파일 무관)")
+
+
+def test_overview_items():
+    """리더보드/포트폴리오는 원본 그대로, 다른 워크플로우가 쓰는 헬스/후보/facts 는 제외."""
+    dates = _dates('20260302', 10)
+    with tempfile.TemporaryDirectory() as tmp:
+        arena = _make_arena(tmp, dates)
+        _write(arena / 'healthcheck' / f"health_{dates[-1]}.json", [{'status': 'ok'}])
+        build_dashboard_bundles(arena)
+        overview = _load(arena / 'bundles' / 'overview.json')
+        assert overview['leaderboard'] == _load(arena / 'leaderboard.json')
+        assert overview['portfolios'] == {tid: _load(arena / tid / 'portfolio.json') for tid in TEAMS}
+        assert not {'health', 'candidates', 'facts'} & set(overview)
+    print("  [OK] leaderboard/portfolios 원본 동일, health/candidates/facts 없음")
+
+
+def main():
+    print("=" * 60)
+    print("아레나 대시보드 번들 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_bundle_parity,
+        test_rebuild,
+        test_overview_items,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+DART 공시 이력 저장소 (disclosure_store) 단위 테스트.
+
+검증 항목:
+1. DisclosureStore — 접수일 파티션 기록/재로드, (접수일, 종목코드) 조회, append-only,
+   당일 미저장, 깨진 파티션은 미동기화 취급, clear 와 동시 조회해도 공시/인덱스 짝 유지
+2. sync_disclosures — 30일 기간 1회 일괄 수집, 새 프로세스(새 인스턴스)는 요청 0회,
+   기간 확장 시 빠진 구간만 수집
+3. 동기화 후 get_positive_stocks 매일 호출 — list.json 요청 없음, 결과는 저장소 없이 받은 것과 동일
+4. DartDisclosureStrategy.prepare_period — 시작 전일부터 동기화
+
+격리: test_dart_index 의 가짜 DART (네트워크 미사용), 저장소는 임시 폴더.
+
+실행:
+    python -m paper_trading.test_disclosure_store
+"""
+
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.utils.dart_utils import DartFilter
+from paper_trading.utils.disclosure_store import DisclosureStore
+from paper_trading.test_dart_index import CODES, _FakeDart, _with_fake
+
+START, END = "20260301", "20260330"
+DAY = "20260302"
+
+
+def _month_items(start=START, days=40):
+    """하루 30건 (주말 공시 없음), 계약/실적/횡령 공시 혼합"""
+    items = []
+    base = datetime.strptime(start, '%Y%m%d')
+    for d in range(days):
+        dt = base + timedelta(days=d)
+        if dt.weekday() >= 5:
+            continue
+        date = dt.strftime('%Y%m%d')
+        for k in range(30):
+            code = CODES[(d * 7 + k) % len(CODES)]
+            report = ('단일판매ㆍ공급계약체결', '영업(잠정)실적(공정공시)', '횡령ㆍ배임혐의발생')[k % 3]
+            items.append({'corp_code': f"{9000 + CODES.index(code):08d}", 'corp_name': f"회사{code}",
+                          'stock_code': code, 'corp_cls': 'K', 'rcept_dt': date,
+                          'rcept_no': f"{date}{k:06d}", 'report_nm': report})
+    return items
+
+
+class _PreemptingLock:
+    """lock 해제 직후 다른 스레드의 작업 (on_release) 이 끼어드는 상황 재현"""
+
+    def __init__(self, on_release):
+        self._lock = threading.Lock()
+        self._on_release = on_release
+        self._busy = False
+        self.preempted = 0
+
+    def __enter__(self):
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self._lock.release()
+        if not self._busy:
+            self._busy = True
+            try:
+                self._on_release()
+                self.preempted += 1
+            finally:
+                self._busy = False
+
+
+def test_store_partitions():
+    """파티션 기록/재로드/조회, append-only, 당일 미저장, 깨진 파티션 복구."""
+    day = [x for x in _month_items(days=3) if x['rcept_dt'] == DAY]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DisclosureStore(Path(tmp))
+        assert store.get(DAY) is None and store.missing_dates([DAY]) == [DAY]
+        assert store.put(DAY, day, today="20260410")
+        assert not store.put(DAY, [], today="20260410")              # append-only
+        assert not store.put("20260410", day, today="20260410")        # 당일은 미완결
+        assert store.put("20260308", [], today="20260410")             # 공시 없는 날도 기록
+
+        reloaded = DisclosureStore(Path(tmp))
+        assert reloaded.dates() == [DAY, "20260308"]
+        assert reloaded.get(DAY) == day and reloaded.get("20260308") == []
+        code = day[0]['stock_code']
+        assert reloaded.lookup(DAY, code) == [x for x in day if x['stock_code'] == code]
+        assert reloaded.lookup(DAY, 'A' + code) == reloaded.lookup(DAY, code)
+        by_stock = reloaded.by_stock(DAY)
+        assert sum(len(v) for v in by_stock.values()) == len(day)
+
+        # lock 을 놓자마자 다른 스레드가 clear 하는 최악의 끼어들기 → 조회 결과 그대로 (KeyError 없음)
+        reloaded._lock = _PreemptingLock(reloaded.clear)
+        assert reloaded.by_stock(DAY) == by_stock
+        assert reloaded.lookup(DAY, code) == by_stock[code]
+        assert reloaded._lock.preempted >= 2
+
+        (Path(tmp) / DAY[:4] / f"{DAY}.json").write_text("{broken", encoding='utf-8')
+        broken = DisclosureStore(Path(tmp))
+        assert broken.get(DAY) is None and broken.missing_dates([DAY]) == [DAY]
+    print(f"  [OK] 파티션 {len(day)}건 — 재로드·인덱스 조회·append-only·복구")
+
+
+def test_incremental_sync():
+    """30일 1회 수집 → 새 인스턴스 요청 0회 → 기간 확장 시 빠진 구간만."""
+    fake = _FakeDart(_month_items())
+    with tempfile.TemporaryDirectory() as tmp:
+        restore = _with_fake(fake, tmp)
+        try:
+            assert DartFilter(api_key='KEY').sync_disclosures(START, END) == 30
+            first = list(fake.calls)
+
+            fake.calls.clear()
+            fresh = DartFilter(api_key='KEY', store=DisclosureStore(Path(tmp) / 'disclosures'))
+            assert fresh.sync_disclosures(START, END) == 0
+            assert fake.calls == []
+
+            assert fresh.sync_disclosures("20260325", "20260405") == 6
+        finally:
+            restore()
+    assert {(p['bgn_de'], p['end_de']) for _, p in first} == {(START, END)}
+    assert {(p['bgn_de'], p['end_de']) for _, p in fake.calls} == {("20260331", "20260405")}
+    print(f"  [OK] 30일 {len(first)}페이지 수집, 재실행 0회, 확장 6일만 수집")
+
+
+def test_backtest_days_read_locally():
+    """동기화 후 매일 get_positive_stocks — 요청 없음, 결과는 저장소 없는 조회와 동일."""
+    fake = _FakeDart(_month_items())
+    days = [(datetime.strptime(START, '%Y%m%d') + timedelta(days=d)).strftime('%Y%m%d')
+            for d in range(1, 30)]
+    with tempfile.TemporaryDirectory() as tmp:
+        restore = _with_fake(fake, tmp)
+        try:
+            DartFilter(api_key='KEY').sync_disclosures(START, END)
+            fake.calls.clear()
+            local = DartFilter(api_key='KEY', store=DisclosureStore(Path(tmp) / 'disclosures'))
+            got = {d: local.get_positive_stocks(target_date=d) for d in days}
+            local_calls = len(fake.calls)
+
+            remote = DartFilter(api_key='KEY', store=DisclosureStore(Path(tmp) / 'empty'))
+            remote._store.put = lambda *a, **k: False
+            expected = {d: remote.get_positive_stocks(target_date=d) for d in days}
+        finally:
+            restore()
+    assert local_calls == 0
+    assert got == expected and sum(len(v) for v in got.values()) > 0
+    print(f"  [OK] {len(days)}일 선정 요청 0회 (저장소 없이 {len(fake.calls)}회)")
+
+
+def test_strategy_prepare_period():
+    """DartDisclosureStrategy.prepare_period — 시작 전일부터 기간 동기화."""
+    from paper_trading.strategies.dart_disclosure import DartDisclosureStrategy
+
+    fake = _FakeDart(_month_items())
+    with tempfile.TemporaryDirectory() as tmp:
+        restore = _with_fake(fake, tmp)
+        try:
+            strategy = DartDisclosureStrategy()
+            strategy.dart_filter = DartFilter(api_key='KEY')
+            strategy.prepare_period("20260302", "20260313")
+            store = strategy.dart_filter._store
+            assert store.dates()[0] == START and store.dates()[-1] == "20260313"
+            assert len(store.dates()) == 13
+        finally:
+            restore()
+    print("  [OK] 전일 포함 13일 동기화")
+
+
+def main():
+    print("=" * 60)
+    print("DART 공시 이력 저장소 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_store_partitions,
+        test_incremental_sync,
+        test_backtest_days_read_locally,
+        test_strategy_prepare_period,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
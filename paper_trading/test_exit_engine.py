@@ -0,0 +1,199 @@
+"""
+일봉 청산 엔진 (exit_engine) 단위 테스트.
+
+검증 항목:
+1. 고정 익절/손절 (손절 우선) — 기존 simulate_day 종목별 판정과 동일 (경계값·시가 0 포함)
+2. 트레일링 + 슬리피지 — 기존 TradingSimulator._determine_exit_daily 와 동일
+3. probabilistic 모드 — 기존 probabilistic_exit 시나리오/확률/총수익률과 동일
+4. 파라미터 그리드 브로드캐스트 — (G, 1) 목표 × (N,) 가격 == 목표별 개별 호출
+5. 성능 — 100,000행 × 익절 그리드 9개 일괄 판정 1초 미만 (환경 여유 감안 상한 5초)
+
+실행:
+    python -m paper_trading.test_exit_engine
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.utils.exit_engine import daily_exits, high_first_probability
+from paper_trading.simulator import TradingSimulator
+
+
+def _random_bars(n=5000, seed=11):
+    """정수 OHLC — 익절/손절 경계값과 시가 0 행 포함"""
+    rng = np.random.default_rng(seed)
+    o = rng.integers(1_000, 300_000, size=n).astype(float)
+    h = np.floor(o * (1 + rng.uniform(0, 0.15, n)))
+    l = np.floor(o * (1 - rng.uniform(0, 0.10, n)))
+    c = np.floor(l + (h - l) * rng.uniform(0, 1, n))
+    o[:10] = 0
+    o[10:20] = 10_000
+    h[10:15], l[10:15] = 10_500, 9_700    # 정확히 익절가/손절가
+    h[15:20], l[15:20] = 10_499, 9_701    # 경계 바로 안쪽
+    h[20:25] = l[20:25] = o[20:25]        # 변동 없음
+    return o, h, l, c
+
+
+def _ref_fixed(o, h, l, c, profit, loss):
+    """기존 backtest_wrapper/run_backtest simulate_day 판정"""
+    profit_px = o * (1 + profit / 100)
+    loss_px = o * (1 + loss / 100)
+    if l <= loss_px:
+        return int(loss_px), "loss"
+    if h >= profit_px:
+        return int(profit_px), "profit"
+    return int(c), "close"
+
+
+def _ref_probabilistic(o, h, l, c, profit, loss, k=0.8):
+    """기존 probabilistic_exit (시나리오, 총수익률, 익절 확률)"""
+    profit_px = o * (1 + profit / 100)
+    loss_px = o * (1 + loss / 100)
+    hi, lo = h >= profit_px, l <= loss_px
+    if hi and not lo:
+        return "profit", profit, 1.0
+    if lo and not hi:
+        return "loss", loss, 0.0
+    if not hi and not lo:
+        return "close", (c - o) / o * 100, None
+    if h == l or (h - l) / o < 1e-6:
+        p = 0.5
+    else:
+        p = max(0.05, min(0.95, 0.5 + k * (((c - o) / o) / ((h - l) / o))))
+    return "probabilistic", p * profit + (1 - p) * loss, p
+
+
+def test_fixed_matches_reference():
+    """손절 우선 고정 룰 — 청산가/유형/수익률 행별 동일, 시가 0 은 invalid."""
+    o, h, l, c = _random_bars()
+    ex = daily_exits(o, h, l, c, 5.0, -3.0)
+    counts = {}
+    for i in range(len(o)):
+        if o[i] == 0:
+            assert ex.exit_type(i) == "invalid" and not ex.valid[i]
+            continue
+        px, kind = _ref_fixed(o[i], h[i], l[i], c[i], 5.0, -3.0)
+        assert (int(ex.exit_price[i]), ex.exit_type(i)) == (px, kind), i
+        assert round(float(ex.return_pct[i]), 2) == round((px - o[i]) / o[i] * 100, 2)
+        counts[kind] = counts.get(kind, 0) + 1
+    assert ex.exit_type(10) == "loss" and ex.exit_type(15) == "close"
+    print(f"  [OK] {len(o)}행 고정 룰 일치 {counts}")
+
+
+def test_simulator_trailing_matches_reference():
+    """트레일링 + 슬리피지 — TradingSimulator 기존 판정 (트레일링 > 손절 > 익절 > 종가)."""
+    o, h, l, c = _random_bars(n=2000, seed=5)
+    sim = TradingSimulator(capital=1_000_000)
+    slip = 1 - sim.SLIPPAGE_PCT / 100
+    for trailing in (True, False):
+        sim.TRAILING_ENABLED = trailing
+        for i in range(10, len(o)):
+            op, hp, lp, cp = int(o[i]), int(h[i]), int(l[i]), int(c[i])
+            profit_p = op * (1 + sim.PROFIT_TARGET / 100)
+            loss_p = op * (1 + sim.LOSS_TARGET / 100)
+            tp = sim._calc_trailing_exit_pct((hp - op) / op * 100)
+            if tp is not None:
+                ref = (int(op * (1 + tp / 100) * slip), "trailing")
+            elif lp <= loss_p:
+                ref = (int(loss_p * slip), "loss")
+            elif hp >= profit_p:
+                ref = (int(profit_p * slip), "profit")
+            else:
+                ref = (cp, "close")
+            got = sim._determine_exit_daily(op, hp, lp, cp)
+            assert got[:2] == ref, (i, trailing, got, ref)
+    print("  [OK] 시뮬레이터 일봉 판정 일치 (트레일링 on/off, 슬리피지)")
+
+
+def test_probabilistic_matches_reference():
+    """probabilistic 모드 — 시나리오·확률·총수익률 기존 식과 동일."""
+    o, h, l, c = _random_bars(n=3000, seed=2)
+    ex = daily_exits(o, h, l, c, 5.0, -3.0, probabilistic=True)
+    kinds = set()
+    for i in range(10, len(o)):
+        kind, gross, p = _ref_probabilistic(o[i], h[i], l[i], c[i], 5.0, -3.0)
+        assert ex.exit_type(i) == kind, i
+        assert abs(float(ex.return_pct[i]) - gross) < 1e-12
+        if kind == "probabilistic":
+            assert abs(float(ex.profit_probability[i]) - p) < 1e-12
+        else:
+            assert np.isnan(ex.profit_probability[i])
+        kinds.add(kind)
+    assert kinds == {"profit", "loss", "close", "probabilistic"}
+    assert float(high_first_probability(0, 1, 1, 1)) == 0.5
+    print(f"  [OK] probabilistic 모드 일치 ({sorted(kinds)})")
+
+
+def test_grid_broadcast():
+    """(G, 1) 익절/손절 그리드 × (N,) 가격 == 목표별 개별 호출."""
+    o, h, l, c = _random_bars(n=500, seed=9)
+    profits = np.array([[2.0], [5.0], [8.0]])
+    losses = np.array([[-1.5], [-3.0], [-5.0]])
+    grid = daily_exits(o, h, l, c, profits, losses)
+    assert grid.exit_code.shape == (3, 500)
+    for g in range(3):
+        one = daily_exits(o, h, l, c, float(profits[g, 0]), float(losses[g, 0]))
+        assert np.array_equal(grid.exit_code[g], one.exit_code)
+        assert np.array_equal(grid.exit_price[g], one.exit_price)
+    # 행별 파라미터 (종목마다 다른 손절)
+    per_row = daily_exits(o, h, l, c, 5.0, np.where(np.arange(500) % 2, -2.0, -4.0))
+    assert per_row.exit_code.shape == (500,)
+    print("  [OK] 그리드/행별 파라미터 브로드캐스트 일치")
+
+
+def test_performance():
+    """100,000행 × 익절 9개 그리드 일괄 판정."""
+    o, h, l, c = _random_bars(n=100_000, seed=1)
+    grid = np.arange(2.0, 11.0).reshape(-1, 1)
+    t0 = time.perf_counter()
+    ex = daily_exits(o, h, l, c, grid, -3.0, trailing_levels=[(10, 3), (5, 2), (3, 1)],
+                     slippage_pct=0.2)
+    elapsed = time.perf_counter() - t0
+    assert ex.exit_code.shape == (9, 100_000)
+    assert elapsed < 5.0, f"{elapsed:.2f}s"
+    print(f"  [OK] 900,000건 판정 {elapsed:.3f}s")
+
+
+def main():
+    print("=" * 60)
+    print("일봉 청산 엔진 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_fixed_matches_reference,
+        test_simulator_trailing_matches_reference,
+        test_probabilistic_matches_reference,
+        test_grid_broadcast,
+        test_performance,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
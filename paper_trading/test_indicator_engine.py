@@ -0,0 +1,169 @@
+"""
+유니버스 지표 엔진 (indicator_engine) 단위 테스트.
+
+검증 항목:
+1. right_align — 종목별 결측(거래정지) 제거 후 최신 관측치가 마지막 행
+2. compute_universe — 종목별 기존 계산(np.mean/np.std 창, Wilder RSI 루프)과 동일
+3. 단일 종목 래퍼 — compute_indicators / calculate_bollinger_bands / calculate_rsi 결과 불변
+4. 성능 — 2,500종목 × 260일 일괄 계산 1초 미만 (환경 여유 감안 상한 5초)
+
+실행:
+    python -m paper_trading.test_indicator_engine
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.utils.indicator_engine import compute_universe, right_align
+from paper_trading.strategies._squeeze_common import compute_indicators
+from paper_trading.bnf.bollinger_selector import calculate_bollinger_bands, calculate_rsi
+
+
+def _random_universe(T=230, C=40, seed=7):
+    rng = np.random.default_rng(seed)
+    closes = 10000 * np.exp(np.cumsum(rng.normal(0, 0.02, size=(T, C)), axis=0))
+    volumes = rng.integers(1_000, 100_000, size=(T, C)).astype(float)
+    # 거래정지/신규상장 결측
+    closes[rng.random((T, C)) < 0.03] = np.nan
+    closes[:150, 0] = np.nan          # 신규 상장 (짧은 히스토리)
+    closes[:, 1] = np.nan             # 데이터 없음
+    volumes[np.isnan(closes)] = np.nan
+    return closes, volumes
+
+
+def _ref_rsi(closes, period=14):
+    """기존 calculate_rsi (Wilder 루프) 원본."""
+    if len(closes) < period + 1:
+        return None
+    deltas = np.diff(closes)
+    gains = np.where(deltas > 0, deltas, 0)
+    losses = np.where(deltas < 0, -deltas, 0)
+    avg_gain = np.mean(gains[:period])
+    avg_loss = np.mean(losses[:period])
+    for i in range(period, len(gains)):
+        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+    if avg_loss == 0:
+        return 100.0
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def test_right_align():
+    """결측 제거 + 시간 순서 유지 + 다른 필드도 같은 행으로 이동."""
+    closes = np.array([[1.0, np.nan], [np.nan, 5.0], [3.0, 6.0]])
+    volumes = np.array([[10.0, np.nan], [np.nan, 50.0], [30.0, 60.0]])
+    al = right_align({"종가": closes, "거래량": volumes})
+    assert np.isnan(al["종가"][0, 0]) and list(al["종가"][1:, 0]) == [1.0, 3.0]
+    assert list(al["거래량"][1:, 0]) == [10.0, 30.0]
+    assert np.isnan(al["종가"][0, 1]) and list(al["종가"][1:, 1]) == [5.0, 6.0]
+    print("  [OK] right_align: 결측 제거, 시간순 유지, 필드 동기화")
+
+
+def test_universe_matches_per_code():
+    """유니버스 일괄 계산 == 종목별 기존 계산."""
+    closes, volumes = _random_universe()
+    al = right_align({"종가": closes, "거래량": volumes})
+    ind = compute_universe(al["종가"], al["거래량"], bb_period=20,
+                           rsi_period=14, ma_periods=(5, 200))
+
+    checked = 0
+    for j in range(closes.shape[1]):
+        mask = ~np.isnan(closes[:, j])
+        c = closes[mask, j]
+        v = volumes[mask, j]
+        assert ind["n_obs"][j] == len(c)
+        if len(c) < 20:
+            assert np.isnan(ind["percent_b"][j])
+            continue
+        ma = np.mean(c[-20:])
+        std = np.std(c[-20:], ddof=1)
+        pb = (c[-1] - (ma - 2 * std)) / (4 * std)
+        assert abs(ind["bb_middle"][j] - ma) < 1e-6
+        assert abs(ind["percent_b"][j] - pb) < 1e-9
+        assert abs(ind["rsi"][j] - _ref_rsi(c)) < 1e-9
+        assert abs(ind["ma5_prev"][j] - np.mean(c[-6:-1])) < 1e-6
+        assert abs(ind["vol_ratio"][j] - v[-1] / np.mean(v[-6:-1])) < 1e-9
+        if len(c) >= 205:
+            assert abs(ind["ma200"][j] - np.mean(c[-200:])) < 1e-6
+            assert abs(ind["ma200_lag"][j] - np.mean(c[-205:-5])) < 1e-6
+        else:
+            assert np.isnan(ind["ma200_lag"][j])
+        checked += 1
+    assert checked >= 30
+    print(f"  [OK] {checked}종목 일괄 계산 == 종목별 계산 (BB/RSI/MA/거래량)")
+
+
+def test_single_code_wrappers_unchanged():
+    """기존 단일 종목 함수 결과가 원래 공식과 동일."""
+    closes = np.concatenate([np.full(100, 100.0), np.full(100, 110.0), np.full(5, 120.0)])
+    cache = compute_indicators(closes, current_close=120.0)
+    assert abs(cache["ma200"] - 105.5) < 1e-9
+    assert cache["ma200_rising"] is True
+    assert compute_indicators(closes[:10], 120.0) == {"valid": False}
+    assert compute_indicators(np.full(30, 100.0), 100.0) == {"valid": False}  # 밴드 폭 0
+
+    rng = np.random.default_rng(1)
+    series = 1000 + np.cumsum(rng.normal(0, 5, 40))
+    upper, middle, lower, pb = calculate_bollinger_bands(series)
+    assert abs(middle - np.mean(series[-15:])) < 1e-9
+    assert abs(pb - (series[-1] - lower) / (upper - lower)) < 1e-12
+    assert calculate_bollinger_bands(series[:5]) == (0, 0, 0, 0.5)
+    assert calculate_rsi(series) == round(_ref_rsi(series), 2)
+    assert calculate_rsi(series[:10]) == 50.0
+    assert calculate_rsi(np.arange(20, dtype=float)) == 100.0
+    print("  [OK] compute_indicators / calculate_bollinger_bands / calculate_rsi 불변")
+
+
+def test_universe_speed():
+    """2,500종목 × 260일 — 일괄 계산 시간."""
+    closes, volumes = _random_universe(T=260, C=2500, seed=3)
+    t0 = time.perf_counter()
+    al = right_align({"종가": closes, "거래량": volumes})
+    compute_universe(al["종가"], al["거래량"], bb_period=20, rsi_period=14)
+    elapsed = time.perf_counter() - t0
+    assert elapsed < 5.0, f"{elapsed:.2f}s"
+    print(f"  [OK] 2,500종목 × 260일: {elapsed * 1000:.0f}ms")
+
+
+def main():
+    print("=" * 60)
+    print("유니버스 지표 엔진 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_right_align,
+        test_universe_matches_per_code,
+        test_single_code_wrappers_unchanged,
+        test_universe_speed,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+네이버 수급 병렬 수집 + 이력 저장소 (investor_flow_store) 단위 테스트.
+
+검증 항목:
+1. parse_flow_rows / get_cumulative_net / rank_by_inflow — 기존 순차 로직(페이지 행 합산)과 동일
+2. 증분 갱신 — 같은 날 재호출은 요청 0회, 다음 날은 저장 이력과 겹치는 1페이지만
+3. 새 인스턴스(새 프로세스)는 디스크 이력 재사용, as_of 이후 날짜 제외
+4. get_multi_investor_flow — 스레드 풀 동시 실행, 요청 시작 간격은 전역 rate limit 유지, 입력 순서 보존
+
+격리: 클라이언트 session 을 가짜 frgn.naver 로 교체 (네트워크 미사용), 저장소는 임시 폴더.
+
+실행:
+    python -m paper_trading.test_investor_flow
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.utils.investor_flow_store import InvestorFlowStore
+from paper_trading.utils.naver_investor import NaverInvestorClient, parse_flow_rows
+
+CODES = [f"{i:06d}" for i in range(1, 13)]
+PAGE_SIZE = 20
+
+
+def _history(code, start="20260101", days=90):
+    """영업일 수급 (오름차순) — 종목별로 부호가 섞이도록"""
+    rows = []
+    dt = datetime.strptime(start, '%Y%m%d')
+    seed = int(code)
+    k = 0
+    while len(rows) < days:
+        if dt.weekday() < 5:
+            rows.append({
+                'date': dt.strftime('%Y%m%d'),
+                'close': 10000 + seed * 100 + k * 10,
+                'change_pct': round(((k * 7 + seed) % 11 - 5) * 0.37, 2),
+                'volume': 100000 + k * seed,
+                'inst_net': ((k * 13 + seed * 5) % 17 - 7) * 1000,
+                'foreign_net': ((k * 11 + seed * 3) % 19 - 8) * 1000,
+            })
+            k += 1
+        dt += timedelta(days=1)
+    return rows
+
+
+def _page_html(rows):
+    """frgn.naver 형식 — 첫 type2 는 다른 표, 두 번째가 날짜별 수급 (최근 날짜부터)"""
+    body = "".join(
+        f"<tr><td>{r['date'][:4]}.{r['date'][4:6]}.{r['date'][6:]}</td>"
+        f"<td>{r['close']:,}</td><td>0</td><td>{r['change_pct']:+.2f}%</td>"
+        f"<td>{r['volume']:,}</td><td>{r['inst_net']:+,}</td><td>{r['foreign_net']:+,}</td>"
+        f"<td>0</td><td>0.00%</td></tr>"
+        for r in rows)
+    return ("<html><table class='type2'><tr><th>종목</th></tr><tr><td>x</td></tr></table>"
+            "<table class='type2'><tr><th>날짜</th><th>종가</th></tr>"
+            f"<tr><td colspan='9'></td></tr>{body}</table></html>")
+
+
+class _FakeResponse:
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+        self.encoding = None
+
+
+class _FakeNaver:
+    """종목별 이력 (오름차순) 을 페이지로 응답, 호출 기록"""
+
+    def __init__(self, histories, latency=0.0):
+        self.histories = histories
+        self.latency = latency
+        self.calls = []
+        self.starts = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=None):
+        with self._lock:
+            self.starts.append(time.time())
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            params = dict(p.split('=') for p in url.split('?', 1)[1].split('&'))
+            code, page = params['code'], int(params.get('page', 1))
+            with self._lock:
+                self.calls.append((code, page))
+            newest = self.histories[code][::-1]
+            return _FakeResponse(_page_html(newest[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]))
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _client(fake, store, cls=NaverInvestorClient):
+    client = cls(store=store)
+    client.session = fake
+    return client
+
+
+def _legacy_cumulative(newest, days):
+    """기존 get_cumulative_net — 1페이지 상위 days 행 합산"""
+    data = newest[:days]
+    f = sum(d['foreign_net'] for d in data)
+    i = sum(d['inst_net'] for d in data)
+    return {'foreign': f, 'institution': i, 'combined': f + i, 'days_used': len(data)}
+
+
+def test_parity_with_sequential():
+    """파싱·누적·랭킹 결과가 기존 순차 로직과 동일."""
+    histories = {c: _history(c) for c in CODES}
+    newest = {c: h[::-1] for c, h in histories.items()}
+    assert parse_flow_rows(_page_html(newest['000001'][:PAGE_SIZE])) == newest['000001'][:PAGE_SIZE]
+    assert parse_flow_rows("<html></html>") == []
+
+    fake = _FakeNaver(histories)
+    with tempfile.TemporaryDirectory() as tmp:
+        client = _client(fake, InvestorFlowStore(Path(tmp)))
+        assert client.get_investor_flow('000003', limit=30) == newest['000003'][:30]
+        for days in (1, 5, 20):
+            for code in CODES[:4]:
+                assert client.get_cumulative_net(code, days=days) == _legacy_cumulative(newest[code], days)
+
+        for both in (True, False):
+            expected = []
+            for code in CODES:
+                flow = _legacy_cumulative(newest[code], 5)
+                if both and (flow['foreign'] <= 0 or flow['institution'] <= 0):
+                    continue
+                flow['code'] = code
+                expected.append(flow)
+            expected.sort(key=lambda x: x['combined'], reverse=True)
+            assert client.rank_by_inflow(CODES, days=5, require_both_positive=both) == expected
+    assert client.get_cumulative_net('bad') == {'foreign': 0, 'institution': 0, 'combined': 0, 'days_used': 0}
+    print(f"  [OK] 누적/랭킹 일치 ({len(CODES)}종목, 요청 {len(fake.calls)}회)")
+
+
+def test_incremental_refresh():
+    """같은 날 재호출 0회, 다음 날은 새 행이 있는 1페이지만, 새 인스턴스는 디스크 재사용."""
+    histories = {'005930': _history('005930', days=90)}
+    fake = _FakeNaver(histories)
+    with tempfile.TemporaryDirectory() as tmp:
+        client = _client(fake, InvestorFlowStore(Path(tmp)))
+        first = client.get_investor_flow('005930', limit=30)
+        assert fake.calls == [('005930', 1), ('005930', 2)]
+        assert len(first) == 30
+
+        fake.calls.clear()
+        assert client.get_investor_flow('005930', limit=30) == first
+        assert fake.calls == []
+
+        # 다음 날: 3 거래일 추가 + 마지막 조회일을 과거로
+        histories['005930'] = _history('005930', days=93)
+        client.store.merge('005930', [], checked='20000101')
+        assert client.refresh('005930', min_rows=30) == 3
+        assert fake.calls == [('005930', 1)]
+        newest = histories['005930'][::-1]
+        assert client.get_investor_flow('005930', limit=33) == newest[:33]
+
+        fake.calls.clear()
+        reloaded = _client(fake, InvestorFlowStore(Path(tmp)))
+        assert reloaded.get_investor_flow('005930', limit=33) == newest[:33]
+        as_of = newest[5]['date']
+        assert reloaded.get_investor_flow('005930', limit=5, as_of=as_of) == newest[5:10]
+        assert reloaded.get_cumulative_net('005930', days=5, as_of=as_of) == _legacy_cumulative(newest[5:], 5)
+        assert fake.calls == []
+    print("  [OK] 첫 조회 2페이지 → 당일 0회 → 다음 날 1페이지 (+3행), 재시작 0회")
+
+
+class _FastClient(NaverInvestorClient):
+    RATE_LIMIT_SLEEP = 0.02
+    _rate_lock = threading.Lock()
+    _last_call_at = 0.0
+
+
+def test_parallel_rate_limited():
+    """스레드 풀 동시 실행 + 요청 시작 간격 ≥ RATE_LIMIT_SLEEP, 결과는 입력 순서."""
+    histories = {c: _history(c, days=15) for c in CODES}
+    fake = _FakeNaver(histories, latency=0.1)
+    with tempfile.TemporaryDirectory() as tmp:
+        client = _client(fake, InvestorFlowStore(Path(tmp)), cls=_FastClient)
+        flows = client.get_multi_investor_flow(CODES, limit=10, max_workers=6)
+    assert list(flows) == CODES
+    assert all(flows[c] == histories[c][::-1][:10] for c in CODES)
+    assert sorted(fake.calls) == [(c, 1) for c in CODES]        # 종목당 1회
+    gaps = [b - a for a, b in zip(sorted(fake.starts), sorted(fake.starts)[1:])]
+    assert min(gaps) >= _FastClient.RATE_LIMIT_SLEEP * 0.5, min(gaps)
+    assert 1 < fake.peak <= 6, fake.peak                        # 동시 실행, 풀 크기 이내
+    print(f"  [OK] {len(CODES)}종목 요청 {len(fake.calls)}회, 동시 {fake.peak}, "
+          f"최소 간격 {min(gaps) * 1000:.0f}ms")
+
+
+def main():
+    print("=" * 60)
+    print("네이버 수급 병렬 수집 / 이력 저장소 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_parity_with_sequential,
+        test_incremental_refresh,
+        test_parallel_rate_limited,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
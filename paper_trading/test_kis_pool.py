@@ -0,0 +1,257 @@
+"""
+KIS 클라이언트 풀 / 공용 토큰 버킷 단위 테스트.
+
+검증 항목:
+1. TokenBucket — 여러 스레드 합산 호출률이 rate 이하, penalize 시 전원 정지
+2. get_kis_client — 같은 키·모드는 인스턴스 1개, 키 없음(ValueError)도 기억, 토큰 발급 실패는 다음 호출 재시도
+3. 토큰 — 만료 상태에서 동시 요청해도 발급 1회, 401 동시 발생 시 재발급 1회
+4. _request — 모든 HTTP 호출이 공용 limiter 를 거침 (인스턴스가 달라도)
+
+격리: 실제 네트워크/토큰 파일 미사용 (requests.Session / TOKEN_CACHE_PATH 교체).
+
+실행:
+    python -m paper_trading.test_kis_pool
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.utils import kis_api
+from paper_trading.utils.kis_api import KISClient, TokenBucket, get_kis_client, reset_kis_pool
+
+
+class _Resp:
+    def __init__(self, status, payload=None, text=""):
+        self.status_code = status
+        self._payload = payload or {}
+        self.text = text
+
+    def json(self):
+        return self._payload
+
+
+class _FakeSession:
+    """토큰 발급/시세 조회 흉내 — 요청 시각과 Authorization 기록"""
+    log = []
+    lock = threading.Lock()
+    issued = 0
+    reject_tokens = set()
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        with _FakeSession.lock:
+            _FakeSession.issued += 1
+            token = f"tok{_FakeSession.issued}"
+        time.sleep(0.02)
+        return _Resp(200, {"access_token": token, "expires_in": 86400})
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        auth = headers["Authorization"].split()[-1]
+        with _FakeSession.lock:
+            _FakeSession.log.append((time.monotonic(), auth))
+        if auth in _FakeSession.reject_tokens:
+            return _Resp(401, text="expired")
+        return _Resp(200, {"output2": []})
+
+
+class _Env:
+    """KIS 관련 전역 상태 교체/복원"""
+
+    def __enter__(self):
+        self.td = tempfile.TemporaryDirectory()
+        self.saved = {
+            "token": dict(KISClient._token_cache),
+            "path": KISClient.TOKEN_CACHE_PATH,
+            "session": kis_api.requests.Session,
+            "env": {k: os.environ.get(k) for k in ("KIS_APP_KEY", "KIS_APP_SECRET", "KIS_MOCK")},
+            "limiters": dict(kis_api._limiters),
+        }
+        KISClient._token_cache.update({"access_token": None, "expires_at": 0.0})
+        KISClient.TOKEN_CACHE_PATH = Path(self.td.name) / "token.json"
+        kis_api.requests.Session = _FakeSession
+        os.environ.update({"KIS_APP_KEY": "k", "KIS_APP_SECRET": "s", "KIS_MOCK": "false"})
+        kis_api._limiters.clear()
+        _FakeSession.log, _FakeSession.issued, _FakeSession.reject_tokens = [], 0, set()
+        reset_kis_pool()
+        return self
+
+    def __exit__(self, *exc):
+        KISClient._token_cache.clear()
+        KISClient._token_cache.update(self.saved["token"])
+        KISClient.TOKEN_CACHE_PATH = self.saved["path"]
+        kis_api.requests.Session = self.saved["session"]
+        for k, v in self.saved["env"].items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+        kis_api._limiters.clear()
+        kis_api._limiters.update(self.saved["limiters"])
+        reset_kis_pool()
+        self.td.cleanup()
+
+
+def test_token_bucket_rate():
+    """4스레드 × 10회 = 40회 → rate=200/s 면 최소 ~0.195s, penalize 정지."""
+    bucket = TokenBucket(rate=200.0, capacity=1.0)
+    stamps = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(10):
+            bucket.acquire()
+            with lock:
+                stamps.append(time.monotonic())
+
+    t0 = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - t0
+    assert len(stamps) == 40
+    assert elapsed >= 39 / 200 * 0.95, f"{elapsed:.3f}s"
+
+    bucket.penalize(0.1)
+    t1 = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - t1 >= 0.09
+    print(f"  [OK] 40회 {elapsed * 1000:.0f}ms (≥195ms), penalize 0.1s 정지")
+
+
+def test_pool_shares_instance():
+    """같은 키·모드 → 동일 인스턴스, 키 없음 → ValueError 반복 (재생성 없음)."""
+    with _Env():
+        a = get_kis_client()
+        b = get_kis_client()
+        assert a is b
+        assert a._limiter is get_kis_client(mock=False)._limiter
+        assert _FakeSession.issued == 1
+
+        reset_kis_pool()
+        os.environ["KIS_APP_KEY"] = ""
+        for _ in range(2):
+            try:
+                get_kis_client()
+                raise AssertionError("ValueError 미발생")
+            except ValueError:
+                pass
+
+        # 토큰 발급 일시 실패 (RuntimeError) → 풀에 남지 않고 다음 호출에서 재시도
+        reset_kis_pool()
+        os.environ["KIS_APP_KEY"] = "k"
+        KISClient._token_cache.update({"access_token": None, "expires_at": 0.0})
+        KISClient.TOKEN_CACHE_PATH.unlink(missing_ok=True)
+        ok_post = _FakeSession.post
+        _FakeSession.post = lambda self, url, json=None, headers=None, timeout=None: _Resp(500, text="busy")
+        try:
+            get_kis_client()
+            raise AssertionError("RuntimeError 미발생")
+        except RuntimeError:
+            pass
+        finally:
+            _FakeSession.post = ok_post
+        assert get_kis_client() is get_kis_client()
+        print("  [OK] 풀: 인스턴스 1개 공유, 키 없음 ValueError 기억, 토큰 실패 후 재시도 성공")
+
+
+def test_token_refresh_once():
+    """만료 상태 8스레드 동시 요청 → 발급 1회, 401 동시 → 재발급 1회."""
+    with _Env():
+        client = get_kis_client()
+        assert _FakeSession.issued == 1
+        KISClient._token_cache.update({"access_token": None, "expires_at": 0.0})
+        KISClient.TOKEN_CACHE_PATH.unlink()
+
+        threads = [threading.Thread(target=client._refresh_token_if_needed) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert _FakeSession.issued == 2, _FakeSession.issued
+
+        stale = KISClient._token_cache["access_token"]
+        _FakeSession.reject_tokens.add(stale)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            client._request("/x", "TR", {}))) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert _FakeSession.issued == 3, _FakeSession.issued
+        assert results == [{"output2": []}] * 6
+        print("  [OK] 동시 만료 발급 1회, 동시 401 재발급 1회")
+
+
+def test_requests_share_limiter():
+    """다른 인스턴스라도 같은 모드면 공용 limiter — 합산 호출 간격 준수."""
+    with _Env():
+        os.environ["KIS_RATE_PER_SEC"] = "100"
+        try:
+            kis_api._limiters.clear()
+            c1 = KISClient()
+            c2 = KISClient()
+            assert c1._limiter is c2._limiter
+
+            def worker(c):
+                for _ in range(10):
+                    c._request("/x", "TR", {})
+
+            t0 = time.monotonic()
+            threads = [threading.Thread(target=worker, args=(c,)) for c in (c1, c2, c1, c2)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.monotonic() - t0
+        finally:
+            os.environ.pop("KIS_RATE_PER_SEC", None)
+        assert len(_FakeSession.log) == 40
+        assert elapsed >= 39 / 100 * 0.95, f"{elapsed:.3f}s"
+        print(f"  [OK] 2인스턴스 4스레드 40회 {elapsed * 1000:.0f}ms (100/s 공용 한도)")
+
+
+def main():
+    print("=" * 60)
+    print("KIS 클라이언트 풀 / 토큰 버킷 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_token_bucket_rate,
+        test_pool_shares_instance,
+        test_token_refresh_once,
+        test_requests_share_limiter,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
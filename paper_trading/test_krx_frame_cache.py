@@ -0,0 +1,148 @@
+"""
+KRXClient 메모리 캐시 (FrameCache) 단위 테스트.
+
+검증 항목:
+1. LRU — maxsize 초과 시 가장 오래 안 쓴 키 제거, hits/misses 카운트
+2. 빈 DataFrame 은 캐시 안 함 (당일 미발표 데이터 재조회 허용)
+3. 동시 miss — ThreadPoolExecutor 8 스레드가 같은 키 요청 시 loader 1회
+4. KRXClient.get_stock_ohlcv — 같은 (date, market) 재호출 시 _fetch 1회, 반환값 수정이 캐시 오염 안 함
+
+실행:
+    python -m paper_trading.test_krx_frame_cache
+"""
+
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.utils import krx_api
+from paper_trading.utils.krx_api import FrameCache, KRXClient
+
+
+def _df(n=1):
+    return pd.DataFrame({"종가": list(range(n))})
+
+
+def test_lru_eviction_and_counters():
+    """maxsize=2 — 세 번째 키 추가 시 LRU 제거."""
+    cache = FrameCache(maxsize=2)
+    cache.get_or_load(("stock", "KOSPI", "20260406"), _df)
+    cache.get_or_load(("stock", "KOSPI", "20260407"), _df)
+    # 06 을 최근 사용으로 갱신 → 07 이 제거 대상
+    cache.get_or_load(("stock", "KOSPI", "20260406"), _df)
+    cache.get_or_load(("stock", "KOSPI", "20260408"), _df)
+
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["hits"] == 1 and stats["misses"] == 3, stats
+
+    loads = []
+    cache.get_or_load(("stock", "KOSPI", "20260407"), lambda: loads.append(1) or _df())
+    assert loads == [1], "제거된 키는 다시 로드돼야 함"
+    cache.get_or_load(("stock", "KOSPI", "20260408"), lambda: loads.append(2) or _df())
+    assert loads == [1], "남아 있는 키는 hit"
+    print(f"  [OK] LRU 제거 + 카운터: {cache.stats()}")
+
+
+def test_empty_frame_not_cached():
+    """빈 DataFrame 은 저장하지 않음."""
+    cache = FrameCache(maxsize=4)
+    calls = []
+    for _ in range(3):
+        cache.get_or_load(("index", "KOSPI", "20260410"),
+                          lambda: calls.append(1) or pd.DataFrame())
+    assert len(calls) == 3
+    assert cache.stats()["size"] == 0
+    print("  [OK] 빈 결과 미캐시 (매번 재조회)")
+
+
+def test_concurrent_miss_loads_once():
+    """동일 키 동시 요청 — loader 1회, 모두 같은 결과."""
+    cache = FrameCache(maxsize=4)
+    calls = []
+    lock = threading.Lock()
+
+    def slow_loader():
+        with lock:
+            calls.append(1)
+        time.sleep(0.05)
+        return _df(3)
+
+    key = ("stock", "KOSDAQ", "20260409")
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        results = list(ex.map(lambda _: cache.get_or_load(key, slow_loader), range(8)))
+
+    assert len(calls) == 1, f"loader {len(calls)}회 호출"
+    assert all(r is results[0] for r in results)
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["hits"] == 7, stats
+    print(f"  [OK] 8 스레드 동시 miss → loader 1회 ({stats})")
+
+
+def test_client_get_stock_ohlcv_cached():
+    """get_stock_ohlcv 재호출 시 _fetch 1회 + 반환 DataFrame 수정은 캐시와 분리."""
+    krx_api.clear_frame_cache()
+    client = KRXClient(api_key="test")
+    fetches = []
+
+    def fake_fetch(kind, market, date):
+        fetches.append((kind, market, date))
+        return [{"ISU_CD": "005930", "ISU_NM": "삼성전자", "TDD_CLSPRC": "70000"}]
+
+    client._fetch = fake_fetch
+    try:
+        df1 = client.get_stock_ohlcv("20260406", "KOSPI")
+        df1["신규컬럼"] = 1
+        df2 = KRXClient(api_key="test").get_stock_ohlcv("20260406", "KOSPI")
+        assert len(fetches) == 1, "다른 인스턴스도 같은 프로세스 캐시 공유"
+        assert "신규컬럼" not in df2.columns
+        assert df2.loc["005930", "종가"] == 70000
+        assert krx_api.get_frame_cache_stats()["hits"] == 1
+        print("  [OK] get_stock_ohlcv: fetch 1회, 인스턴스 간 공유, 컬럼 추가 격리")
+    finally:
+        krx_api.clear_frame_cache()
+
+
+def main():
+    print("=" * 60)
+    print("KRX FrameCache 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_lru_eviction_and_counters,
+        test_empty_frame_not_cached,
+        test_concurrent_miss_loads_once,
+        test_client_get_stock_ohlcv_cached,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
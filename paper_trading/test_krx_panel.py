@@ -0,0 +1,288 @@
+"""
+KRXPanel (일봉 패널) 단위 테스트.
+
+검증 항목:
+1. sync — 캐시 폴더의 일자별 JSON → 패널, history 결과가 일자 루프 방식과 동일
+2. 디스크 재로드 (memmap) 후 동일 결과
+3. 증분 add/flush — 신규 날짜·신규 종목 병합, 과거 날짜 backfill 정렬
+4. KRXClient.get_history / get_history_batch — 패널 경유, 휴장일 재조회 없음
+5. 월 청크 — 신규 날짜 flush 는 해당 월 파일만 다시 씀, 이전 형식(전체 배열) 자동 변환
+6. 종가 외 필드 결측 — NaN 을 int 로 캐스팅하지 않고 float 유지
+
+격리: tempfile.TemporaryDirectory (실제 data/krx_cache, data/krx_panel 미사용).
+
+실행:
+    python -m paper_trading.test_krx_panel
+"""
+
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.utils import krx_api, krx_panel
+from paper_trading.utils.krx_api import KRXClient, parse_stock_rows
+from paper_trading.utils.krx_panel import PANEL_FIELDS, KRXPanel
+
+
+def _row(code, name, close, open_=None, volume=1000):
+    open_ = open_ or close
+    return {
+        "ISU_CD": code, "ISU_NM": name,
+        "TDD_OPNPRC": str(open_), "TDD_HGPRC": str(max(open_, close) + 10),
+        "TDD_LWPRC": str(min(open_, close) - 10), "TDD_CLSPRC": str(close),
+        "CMPPREVDD_PRC": "0", "FLUC_RT": "1.25",
+        "ACC_TRDVOL": str(volume), "ACC_TRDVAL": str(volume * close),
+        "MKTCAP": "123456789012345", "LIST_SHRS": "1000",
+    }
+
+
+def _write_cache(cache_dir: Path, date: str, rows, market="KOSPI"):
+    with open(cache_dir / f"stock_{market}_{date}.json", "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False)
+
+
+def _seed(cache_dir: Path):
+    _write_cache(cache_dir, "20260406", [_row("005930", "삼성전자", 70000),
+                                         _row("000660", "SK하이닉스", 180000)])
+    _write_cache(cache_dir, "20260407", [_row("005930", "삼성전자", 71000)])
+    _write_cache(cache_dir, "20260408", [_row("005930", "삼성전자", 72000),
+                                         _row("000660", "SK하이닉스", 181000)])
+
+
+def test_sync_and_history():
+    """sync 후 history 가 일자별 파싱 결과와 동일."""
+    with tempfile.TemporaryDirectory() as td:
+        cache, pdir = Path(td) / "cache", Path(td) / "panel"
+        cache.mkdir()
+        _seed(cache)
+
+        panel = KRXPanel("KOSPI", panel_dir=pdir)
+        assert panel.sync(cache_dir=cache) == 3
+        assert panel.dates == ["20260406", "20260407", "20260408"]
+
+        df = panel.history("005930", "20260401", "20260410")
+        assert list(df.index) == ["20260406", "20260407", "20260408"]
+        assert list(df["종가"]) == [70000, 71000, 72000]
+        assert df["거래대금"].iloc[-1] == 1000 * 72000
+        assert df["시가총액"].iloc[0] == 123456789012345  # float64 정밀도 유지
+        assert abs(df["등락률"].iloc[0] - 1.25) < 1e-9
+
+        # 결측일(20260407) 은 행이 빠짐
+        hynix = panel.history("000660", "20260401", "20260410")
+        assert list(hynix.index) == ["20260406", "20260408"]
+
+        # 일자 루프 결과와 값 비교
+        day = parse_stock_rows(json.load(open(cache / "stock_KOSPI_20260408.json")))
+        for col in ("시가", "고가", "저가", "종가", "거래량"):
+            assert df[col].iloc[-1] == day.loc["005930", col]
+
+        # 범위 밖/미상장 종목
+        assert panel.history("005930", "20260501", "20260510").empty
+        assert panel.history("999999", "20260401", "20260410").empty
+        print("  [OK] sync 3일, history == 일자별 파싱, 결측일 행 제외")
+
+
+def test_reload_from_disk():
+    """meta.json + .npy 재로드 (memmap) 후 동일."""
+    with tempfile.TemporaryDirectory() as td:
+        cache, pdir = Path(td) / "cache", Path(td) / "panel"
+        cache.mkdir()
+        _seed(cache)
+        KRXPanel("KOSPI", panel_dir=pdir).sync(cache_dir=cache)
+
+        reloaded = KRXPanel("KOSPI", panel_dir=pdir)
+        assert reloaded.dates == ["20260406", "20260407", "20260408"]
+        df = reloaded.history("005930", "20260406", "20260408")
+        assert list(df["종가"]) == [70000, 71000, 72000]
+        # 재 sync 시 추가 없음
+        assert reloaded.sync(cache_dir=cache) == 0
+        leftovers = [p for p in (pdir / "KOSPI").iterdir() if ".tmp." in p.name]
+        assert leftovers == [], f"임시 파일 잔존: {leftovers}"
+        print("  [OK] 디스크 재로드 동일, 재 sync 0건")
+
+
+def test_incremental_add_and_backfill():
+    """신규 날짜·신규 종목 추가 + 과거 날짜 backfill 시 정렬 유지."""
+    with tempfile.TemporaryDirectory() as td:
+        cache, pdir = Path(td) / "cache", Path(td) / "panel"
+        cache.mkdir()
+        _seed(cache)
+        panel = KRXPanel("KOSPI", panel_dir=pdir)
+        panel.sync(cache_dir=cache)
+
+        panel.add("20260409", parse_stock_rows([_row("005930", "삼성전자", 73000),
+                                                _row("035420", "NAVER", 200000)]))
+        panel.add("20260403", parse_stock_rows([_row("005930", "삼성전자", 69000)]))
+        panel.flush()
+
+        assert panel.dates == ["20260403", "20260406", "20260407", "20260408", "20260409"]
+        df = panel.history("005930", "20260401", "20260410")
+        assert list(df["종가"]) == [69000, 70000, 71000, 72000, 73000]
+        naver = panel.history("035420", "20260401", "20260410")
+        assert list(naver.index) == ["20260409"]
+
+        batch = panel.history_batch(["005930", "000660", "035420", "999999"],
+                                    "20260406", "20260408")
+        assert set(batch) == {"005930", "000660"}
+        print("  [OK] 증분 추가 + backfill 정렬, 신규 종목 열 추가")
+
+
+def test_client_get_history_uses_panel():
+    """KRXClient.get_history/get_history_batch — 패널 경유, 휴장일 1회만 조회."""
+    with tempfile.TemporaryDirectory() as td:
+        cache, pdir = Path(td) / "cache", Path(td) / "panel"
+        cache.mkdir()
+        _seed(cache)
+
+        orig_cache_dir = krx_api.CACHE_DIR
+        orig_panels = dict(krx_panel._panels)
+        krx_api.CACHE_DIR = cache
+        krx_panel._panels.clear()
+        krx_panel._panels["KOSPI"] = KRXPanel("KOSPI", panel_dir=pdir)
+        krx_panel._panels["KOSDAQ"] = KRXPanel("KOSDAQ", panel_dir=pdir)
+        krx_api.clear_frame_cache()
+        try:
+            client = KRXClient(api_key="test")
+            calls = []
+
+            def fake_fetch(kind, market, date):
+                calls.append((market, date))
+                path = cache / f"{kind}_{market}_{date}.json"
+                return json.load(open(path)) if path.exists() else []
+
+            client._fetch = fake_fetch
+
+            df = client.get_history("005930", "20260406", "20260410", market="KOSPI")
+            assert list(df["종가"]) == [70000, 71000, 72000]
+            first_calls = len(calls)
+            assert first_calls == 5  # 평일 5일 (06~10) 최초 1회씩
+
+            # 두 번째 호출: 패널 hit + 빈 날짜 기억 → fetch 0회
+            client.get_history("005930", "20260406", "20260410", market="KOSPI")
+            assert len(calls) == first_calls, calls[first_calls:]
+
+            batch = client.get_history_batch(["005930", "000660", "777777"],
+                                             "20260406", "20260408")
+            assert list(batch["000660"]["종가"]) == [180000, 181000]
+            assert batch["777777"].empty
+            print(f"  [OK] get_history 패널 경유: 최초 fetch {first_calls}회, 재호출 0회")
+        finally:
+            krx_api.CACHE_DIR = orig_cache_dir
+            krx_panel._panels.clear()
+            krx_panel._panels.update(orig_panels)
+            krx_api._EMPTY_DATES.clear()
+            krx_api.clear_frame_cache()
+
+
+def test_month_chunks():
+    """flush 는 pending 날짜가 속한 월 청크만 다시 씀."""
+    with tempfile.TemporaryDirectory() as td:
+        cache, pdir = Path(td) / "cache", Path(td) / "panel"
+        cache.mkdir()
+        _seed(cache)
+        _write_cache(cache, "20260331", [_row("005930", "삼성전자", 68000)])
+        panel = KRXPanel("KOSPI", panel_dir=pdir)
+        panel.sync(cache_dir=cache)
+        root = pdir / "KOSPI"
+        assert sorted(p.name for p in root.iterdir() if p.is_dir()) == ["202603", "202604"]
+
+        march = root / "202603" / "close.npy"
+        before = march.stat().st_mtime_ns, march.stat().st_ino
+        panel.add("20260409", parse_stock_rows([_row("005930", "삼성전자", 73000),
+                                                _row("035420", "NAVER", 200000)]))
+        panel.flush()
+        assert (march.stat().st_mtime_ns, march.stat().st_ino) == before, "3월 청크 재기록됨"
+        assert np.load(march).shape == (1, 2)               # 신규 종목 열은 4월 청크에만
+        assert np.load(root / "202604" / "close.npy").shape == (4, 3)
+
+        reloaded = KRXPanel("KOSPI", panel_dir=pdir)
+        df = reloaded.history("005930", "20260301", "20260430")
+        assert list(df["종가"]) == [68000, 70000, 71000, 72000, 73000]
+        dates, mat = reloaded.matrix(["035420", "005930"], "20260331", "20260409", ["종가"])
+        assert dates == ["20260331", "20260406", "20260407", "20260408", "20260409"]
+        assert np.isnan(mat["종가"][0, 0]) and mat["종가"][0, 1] == 68000
+        assert mat["종가"][-1, 0] == 200000
+        print("  [OK] 신규 날짜 flush 시 다른 월 청크 미변경, 월 걸친 조회 동일")
+
+
+def test_legacy_layout_migrates():
+    """전체 기간 필드.npy + meta(dates, codes) 이전 형식 → 월 청크로 변환."""
+    with tempfile.TemporaryDirectory() as td:
+        root = Path(td) / "panel" / "KOSPI"
+        root.mkdir(parents=True)
+        dates, codes = ["20260331", "20260401"], ["005930", "000660"]
+        for field, name in PANEL_FIELDS.items():
+            arr = np.array([[68000.0, np.nan], [69000.0, 180000.0]])
+            np.save(root / f"{name}.npy", arr)
+        json.dump({"dates": dates, "codes": codes}, open(root / "meta.json", "w"))
+
+        panel = KRXPanel("KOSPI", panel_dir=root.parent)
+        assert list(panel.history("005930", "20260301", "20260430")["종가"]) == [68000, 69000]
+        assert list(panel.history("000660", "20260301", "20260430").index) == ["20260401"]
+        assert not list(root.glob("*.npy")), "이전 형식 파일 잔존"
+        meta = json.load(open(root / "meta.json"))
+        assert meta["chunks"] == {"202603": 2, "202604": 2} and meta["dates"] == dates
+        print("  [OK] 이전 형식 패널 → 월 청크 변환, 조회 동일")
+
+
+def test_missing_field_stays_float():
+    """종가는 있고 거래대금이 빠진 날 — 해당 필드만 float + NaN."""
+    with tempfile.TemporaryDirectory() as td:
+        panel = KRXPanel("KOSPI", panel_dir=Path(td))
+        for date, close in (("20260406", 70000), ("20260407", 71000)):
+            df = parse_stock_rows([_row("005930", "삼성전자", close)])
+            if date == "20260407":
+                df = df.drop(columns=["거래대금"])
+            panel.add(date, df)
+        df = panel.history("005930", "20260401", "20260410")
+        assert df["종가"].dtype == np.int64 and list(df["종가"]) == [70000, 71000]
+        assert df["거래대금"].dtype == np.float64
+        assert df["거래대금"].iloc[0] == 70000 * 1000 and np.isnan(df["거래대금"].iloc[1])
+        print("  [OK] 결측 필드 float 유지 (INT64_MIN 캐스팅 없음), 나머지 int")
+
+
+def main():
+    print("=" * 60)
+    print("KRXPanel 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_sync_and_history,
+        test_reload_from_disk,
+        test_incremental_add_and_backfill,
+        test_client_get_history_uses_panel,
+        test_month_chunks,
+        test_legacy_layout_migrates,
+        test_missing_field_stays_float,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""
+일자별 시장 스냅샷 (MarketSnapshot) 단위 테스트.
+
+검증 항목:
+1. stock_dicts / rows — 기존 df.loc 루프(momentum/lab.common)와 동일한 키·값·순서 (종가 0 제외)
+2. 불변 — 컬럼 배열 쓰기 불가, 속성 재할당 불가, 반환 dict 수정이 스냅샷에 영향 없음
+3. theme_policy 섹터 멤버 — 컬럼 마스크 결과 == 기존 종목별 루프 결과
+4. StrategyRegistry.run_all — 여러 전략 + 하이브리드 서브 전략이 전종목 fetch 를 시장당 1회 공유,
+   선정 결과는 전략 단독 실행과 동일
+
+격리: 가짜 KRX 클라이언트 (네트워크 미사용), 전략 모듈의 _get_krx 교체 후 원복.
+
+실행:
+    python -m paper_trading.test_market_snapshot
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.utils import market_snapshot as ms
+from paper_trading.utils.market_snapshot import MarketSnapshot, get_market_snapshot
+from paper_trading.strategies import StrategyRegistry
+from paper_trading.strategies import (
+    momentum, largecap_contrarian, frontier_gap, theme_policy, hybrid_alpha_delta,
+)
+
+DATE = "20260410"
+
+
+class _FakeKRX:
+    """결정적 전종목 시세 + get_stock_ohlcv 호출 횟수 기록"""
+
+    def __init__(self, n=60, seed=3):
+        self.calls = []
+        rng = np.random.default_rng(seed)
+        self.frames = {}
+        for k, market in enumerate(("KOSPI", "KOSDAQ")):
+            rows = {}
+            for i in range(n):
+                code = f"{k}{i:05d}"
+                close = int(rng.integers(3_000, 200_000))
+                chg = round(float(rng.uniform(-6, 14)), 2)
+                prev = int(round(close / (1 + chg / 100)))
+                rows[code] = {
+                    "종목명": f"{market}{i}" + ("우" if i % 17 == 0 else ""),
+                    "시가": int(prev * (1 + rng.uniform(-0.01, 0.05))),
+                    "고가": close + 100, "저가": max(close - 100, 1), "종가": close,
+                    "전일대비": close - prev, "등락률": chg,
+                    "거래량": int(rng.integers(10_000, 5_000_000)),
+                    "거래대금": int(rng.integers(1, 500)) * 100_000_000,
+                    "시가총액": int(rng.integers(1, 400)) * 100_000_000_000,
+                    "상장주식수": 1_000_000,
+                }
+            rows[f"{k}99999"] = dict(rows[f"{k}00001"], 종가=0)  # 거래정지 (제외 대상)
+            self.frames[market] = pd.DataFrame.from_dict(rows, orient="index")
+
+    def get_stock_ohlcv(self, date, market="KOSPI"):
+        self.calls.append((date, market))
+        return self.frames[market].copy()
+
+    def get_index_ohlcv(self, date, market="KOSPI"):
+        if market != "KOSPI":
+            return pd.DataFrame()
+        return pd.DataFrame([{"지수명": "전기전자", "등락률": 2.0},
+                             {"지수명": "화학", "등락률": -3.5},
+                             {"지수명": "코스피 200", "등락률": 1.0}])
+
+    def get_kospi_change(self, date):
+        return 0.4
+
+    def get_history(self, code, start, end, market="KOSPI"):
+        return pd.DataFrame()
+
+    def get_history_matrix(self, codes, start, end, markets=("KOSPI",), fields=("종가",)):
+        raise RuntimeError("과거 행렬 없음 (테스트)")
+
+
+def _legacy_rows(krx):
+    """기존 momentum._fetch_market_data KRX 루프 (df.loc 행별 dict)"""
+    stocks = []
+    for market in ["KOSPI", "KOSDAQ"]:
+        df = krx.frames[market]
+        for code in df.index:
+            row = df.loc[code]
+            close = int(row["종가"])
+            if close == 0:
+                continue
+            stocks.append({
+                "code": code,
+                "name": str(row.get("종목명", code)),
+                "price": close,
+                "change_pct": float(row.get("등락률", 0)),
+                "volume": int(row.get("거래량", 0)),
+                "trading_value": int(row.get("거래대금", 0)),
+                "market_cap": int(row.get("시가총액", 0)),
+                "market": market,
+            })
+    return stocks
+
+
+def _patched_env(krx):
+    """전략 모듈 _get_krx + 스냅샷 기본 클라이언트 교체 → 원복 함수 반환"""
+    mods = [momentum, largecap_contrarian, frontier_gap, theme_policy]
+    saved = [(m, m._get_krx) for m in mods] + [(ms, ms._default_client)]
+    for m in mods:
+        m._get_krx = lambda: krx
+    ms._default_client = krx
+    ms.clear_market_snapshots()
+
+    def restore():
+        for m, v in saved:
+            if m is ms:
+                ms._default_client = v
+            else:
+                m._get_krx = v
+        ms.clear_market_snapshots()
+    return restore
+
+
+def test_rows_match_legacy():
+    """stock_dicts == 기존 df.loc 루프, rows 는 코드 순서 지정/누락 코드 생략."""
+    krx = _FakeKRX()
+    snap = MarketSnapshot.load(DATE, krx=krx)
+    assert snap.stock_dicts() == _legacy_rows(krx)
+    assert len(snap) == 120 and "099999" not in snap and "000001" in snap
+
+    df = krx.frames["KOSDAQ"]
+    r = snap.row("100003")
+    assert r["open"] == int(df.loc["100003", "시가"]) and r["prev_change"] == int(df.loc["100003", "전일대비"])
+    assert r["market"] == "KOSDAQ" and isinstance(r["change_pct"], float)
+
+    picked = snap.rows(["100002", "없는코드", "000005"])
+    assert [p["code"] for p in picked] == ["100002", "000005"]
+    print(f"  [OK] {len(snap)}종목 dict == 기존 루프 (종가 0 제외, 순서 유지)")
+
+
+def test_immutable():
+    """컬럼 쓰기/속성 재할당 불가, 반환 dict 는 사본."""
+    snap = MarketSnapshot.load(DATE, krx=_FakeKRX())
+    try:
+        snap.column("close")[0] = 1
+        raise AssertionError("컬럼 쓰기 허용됨")
+    except ValueError:
+        pass
+    try:
+        snap.codes = ()
+        raise AssertionError("속성 재할당 허용됨")
+    except AttributeError:
+        pass
+    before = snap.row("000003")
+    rows = snap.rows()
+    rows[3]["close"] = -1
+    rows[3]["ma5"] = 1.0  # 전략이 필드를 추가하는 패턴
+    assert snap.row("000003") == before and "ma5" not in snap.rows()[3]
+    print("  [OK] 스냅샷 불변 (read-only 배열, setattr 차단, dict 사본)")
+
+
+def test_theme_sector_members_match_loop():
+    """_detect_themes_krx 섹터 멤버 == 기존 종목별 루프 (tolerance/시총 하한·상한, 시총 내림차순)."""
+    krx = _FakeKRX()
+    restore = _patched_env(krx)
+    try:
+        strat = theme_policy.ThemePolicyStrategy()
+        sectors = strat._detect_themes_krx(DATE, top_n=10)
+    finally:
+        restore()
+
+    assert [s["name"] for s in sectors] == ["전기전자", "화학"]
+    for sector in sectors:
+        ref = []
+        for market in ("KOSPI", "KOSDAQ"):
+            df = krx.frames[market]
+            for code in df.index:
+                row = df.loc[code]
+                if int(row["종가"]) == 0:
+                    continue
+                mcap = int(row["시가총액"])
+                if (abs(float(row["등락률"]) - sector["change_pct"]) <= strat.KRX_BACKTEST_TOLERANCE
+                        and 100_000_000_000 <= mcap <= strat.KRX_BACKTEST_MCAP_CAP):
+                    ref.append((code, mcap))
+        ref.sort(key=lambda x: x[1], reverse=True)
+        expected = [c for c, _ in ref[:strat.KRX_BACKTEST_MEMBERS_PER_SECTOR]]
+        assert strat.theme_stocks.get(sector["name"], []) == expected, sector["name"]
+    print(f"  [OK] 섹터 멤버 마스크 == 기존 루프 ({len(sectors)}개 섹터)")
+
+
+def test_run_all_shares_snapshot():
+    """run_all — 전종목 fetch 는 시장당 1회, 결과는 전략 단독 실행과 동일."""
+    krx = _FakeKRX()
+    restore = _patched_env(krx)
+    saved_strategies = StrategyRegistry._strategies
+    subset = [momentum.MomentumStrategy, largecap_contrarian.LargecapContrarianStrategy,
+              frontier_gap.FrontierGapStrategy, hybrid_alpha_delta.HybridAlphaDeltaStrategy]
+    try:
+        StrategyRegistry._strategies = {c.STRATEGY_ID: c for c in subset}
+        results = StrategyRegistry.run_all(date=DATE, top_n=3)
+        shared_calls = list(krx.calls)
+
+        solo = {}
+        for cls in subset:
+            ms.clear_market_snapshots()
+            strat = cls()
+            strat.select_stocks(date=DATE, top_n=3)
+            solo[cls.STRATEGY_ID] = strat.get_result()
+    finally:
+        StrategyRegistry._strategies = saved_strategies
+        restore()
+
+    assert sorted(shared_calls) == [(DATE, "KOSDAQ"), (DATE, "KOSPI")], shared_calls
+    assert set(results) == set(solo)
+    picked = 0
+    for sid, res in results.items():
+        got = [(c.code, c.score) for c in res.candidates]
+        assert got == [(c.code, c.score) for c in solo[sid].candidates], sid
+        picked += len(got)
+    assert picked > 0
+    print(f"  [OK] {len(subset)}전략(+하이브리드 서브) 전종목 fetch {len(shared_calls)}회, "
+          f"선정 {picked}건 단독 실행과 동일")
+
+
+def test_snapshot_lru_per_client():
+    """같은 날짜·같은 클라이언트는 메모, 다른 클라이언트/빈 스냅샷은 재구성."""
+    ms.clear_market_snapshots()
+    a, b = _FakeKRX(), _FakeKRX()
+    s1 = get_market_snapshot(DATE, a)
+    assert get_market_snapshot(DATE, a) is s1 and len(a.calls) == 2
+    s2 = get_market_snapshot(DATE, b)
+    assert s2 is not s1 and len(b.calls) == 2
+
+    class _Empty(_FakeKRX):
+        def get_stock_ohlcv(self, date, market="KOSPI"):
+            self.calls.append((date, market))
+            return pd.DataFrame()
+
+    e = _Empty()
+    assert get_market_snapshot("20260411", e).is_empty
+    get_market_snapshot("20260411", e)
+    assert len(e.calls) == 4  # 빈 스냅샷은 메모하지 않음
+    ms.clear_market_snapshots()
+    print("  [OK] LRU: 클라이언트별 메모, 빈 스냅샷 재시도")
+
+
+def main():
+    print("=" * 60)
+    print("MarketSnapshot 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_rows_match_legacy,
+        test_immutable,
+        test_theme_sector_members_match_loop,
+        test_run_all_shares_snapshot,
+        test_snapshot_lru_per_client,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
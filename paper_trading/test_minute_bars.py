@@ -0,0 +1,394 @@
+"""
+분봉 컨테이너 + 경로 엔진 (minute_bars) 단위 테스트.
+
+검증 항목 (무작위 분봉 경로, 기존 종목별 루프를 축약 복제한 참조 구현과 비교):
+1. MinuteBars — 시각 파싱(HH:MM / HH:MM:SS / 빈 값), 불변, 원본 시각 문자열 유지
+2. analyze_profit_loss / analyze_multi_scenario — 최초 도달 시각·가격, 최대수익/손실 동일
+3. TradingSimulator._find_trailing_exit_from_bars — 매도 시각·가격·최대수익 동일
+4. BNFSimulator.find_entry_points / find_exit_points / simulate_trade — 진입·청산 내역 동일
+5. exit_grid — 익절 × 손절 × 트레일링 그리드 == 그리드 점별 분봉 루프 (손절 > 익절 > 트레일링)
+
+격리: 분봉은 IntradayCollector.get_minute_data 교체로 주입 (네트워크 미사용).
+
+실행:
+    python -m paper_trading.test_minute_bars
+"""
+
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.utils.exit_engine import EXIT_TYPES, trailing_exit_pct
+from paper_trading.utils.minute_bars import (
+    MinuteBars, as_minute_bars, exit_grid, parse_minute, tp_sl_path,
+)
+from paper_trading.simulator import TradingSimulator
+from paper_trading.bnf.simulator import BNFSimulator
+from intraday_collector import IntradayCollector
+
+
+def _random_day(seed, n=385, vol=0.006):
+    """08:58 부터 1분봉 무작위 경로 (정수 가격, HH:MM:SS)"""
+    rng = np.random.default_rng(seed)
+    drift = rng.uniform(-0.0008, 0.0012)
+    price = float(rng.integers(5_000, 120_000))
+    bars = []
+    for k in range(n):
+        minute = 8 * 60 + 58 + k
+        o = price
+        c = max(o * (1 + drift + rng.normal(0, vol)), 100)
+        h = max(o, c) * (1 + abs(rng.normal(0, vol / 2)))
+        l = min(o, c) * (1 - abs(rng.normal(0, vol / 2)))
+        bars.append({
+            'time': f"{minute // 60:02d}:{minute % 60:02d}:00",
+            'open': int(o), 'high': int(h), 'low': int(l), 'close': int(c),
+            'volume': int(rng.integers(100, 50_000)),
+        })
+        price = c
+    return bars
+
+
+# ── 참조 구현 (기존 루프 축약) ─────────────────────────────
+
+def _legacy_profit_loss(bars, entry, entry_time, profit_px, loss_px):
+    out = {'first_hit': None, 'first_hit_time': None, 'first_hit_price': None,
+           'profit_hit_time': None, 'loss_hit_time': None,
+           'max_profit_percent': 0, 'max_loss_percent': 0}
+    ph = lh = False
+    for c in bars:
+        if c['time'] < entry_time:
+            continue
+        hp = (c['high'] - entry) / entry * 100
+        lp = (c['low'] - entry) / entry * 100
+        if hp > out['max_profit_percent']:
+            out['max_profit_percent'] = hp
+        if lp < out['max_loss_percent']:
+            out['max_loss_percent'] = lp
+        if not ph and c['high'] >= profit_px:
+            ph = True
+            out['profit_hit_time'] = c['time']
+            if out['first_hit'] is None:
+                out.update(first_hit='profit', first_hit_time=c['time'], first_hit_price=int(profit_px))
+        if not lh and c['low'] <= loss_px:
+            lh = True
+            out['loss_hit_time'] = c['time']
+            if out['first_hit'] is None:
+                out.update(first_hit='loss', first_hit_time=c['time'], first_hit_price=int(loss_px))
+        if ph and lh:
+            break
+    if out['first_hit'] is None:
+        out['first_hit'] = 'none'
+    return out
+
+
+def _legacy_multi(bars, entry, entry_time, profit_px, loss_px):
+    first = first_time = None
+    mp = ml = 0
+    for c in bars:
+        if c['time'] < entry_time:
+            continue
+        hp = (c['high'] - entry) / entry * 100
+        lp = (c['low'] - entry) / entry * 100
+        mp = hp if hp > mp else mp
+        ml = lp if lp < ml else ml
+        if first is None and c['high'] >= profit_px:
+            first, first_time = 'profit', c['time']
+        if first is None and c['low'] <= loss_px:
+            first, first_time = 'loss', c['time']
+    return first or 'none', first_time, round(mp, 4), round(ml, 4)
+
+
+def _legacy_trailing(sim, bars, entry, entry_time):
+    run_max = 0.0
+    for c in bars:
+        t = c.get('time', '')
+        if t < entry_time or not (c['high'] and c['low'] and c['close']):
+            continue
+        for m in (run_max, None):
+            if m is None:
+                run_max = max(run_max, (c['high'] - entry) / entry * 100)
+                m = run_max
+            thr = sim._calc_trailing_exit_pct(m)
+            if thr is not None and c['low'] <= entry * (1 + thr / 100) + 1e-9:
+                return {'exit_time': t, 'exit_price': int(entry * (1 + thr / 100)), 'final_max_pct': m}
+    return None
+
+
+def _legacy_grid_point(bars, entry, entry_time, profit, loss, ladder, slip):
+    """그리드 점 1개 — IntradayBacktest 분봉 루프 (손절 > 익절 > 트레일링, 미도달 시 종가)"""
+    profit_px = entry * (1 + profit / 100)
+    loss_px = entry * (1 + loss / 100)
+    run_max = 0.0
+    last = None
+    for c in bars:
+        if c['time'] < entry_time:
+            continue
+        last = c
+        if c['low'] <= loss_px:
+            return 'loss', c['time'], int(loss_px * slip)
+        if c['high'] >= profit_px:
+            return 'profit', c['time'], int(profit_px * slip)
+        for m in ((run_max, None) if ladder else ()):
+            if m is None:
+                run_max = max(run_max, (c['high'] - entry) / entry * 100)
+                m = run_max
+            thr = float(trailing_exit_pct(m, ladder))
+            if not np.isnan(thr) and c['low'] <= entry * (1 + thr / 100) + 1e-9:
+                return 'trailing', c['time'], int(entry * (1 + thr / 100) * slip)
+    return 'close', last['time'], last['close']
+
+
+def _legacy_bnf_entries(sim, bars, amount):
+    """(entry_num, time, price, quantity, reason)"""
+    out = []
+    w = sim.ENTRY_WEIGHTS
+    p1 = i1 = None
+    for i in range(1, len(bars)):
+        c, prev = bars[i], bars[i - 1]
+        if c['time'] < '09:00:00':
+            continue
+        if c['close'] > c['open'] and prev['close'] < prev['open'] and int(amount * w[0]) // c['close'] > 0:
+            p1, i1 = c['close'], i
+            out.append((1, c['time'], p1, int(amount * w[0]) // p1, "첫 반등 신호 (양봉 전환)"))
+            break
+    if p1 is None:
+        return out
+    high2, i2 = p1, None
+    for i in range(i1 + 1, len(bars)):
+        c = bars[i]
+        high2 = max(high2, c['high'])
+        g = (c['close'] - p1) / p1 * 100
+        if g >= sim.CONTINUATION_PCT and int(amount * w[1]) // c['close'] > 0:
+            i2 = i
+            out.append((2, c['time'], c['close'], int(amount * w[1]) // c['close'], f"상승 확인 (+{g:.2f}%)"))
+            break
+    if i2 is None:
+        return out
+    rh = high2
+    for i in range(i2 + 1, len(bars)):
+        c = bars[i]
+        rh = max(rh, c['high'])
+        pb = (c['close'] - rh) / rh * 100
+        if pb <= sim.PULLBACK_PCT and int(amount * w[2]) // c['close'] > 0:
+            out.append((3, c['time'], c['close'], int(amount * w[2]) // c['close'],
+                        f"풀백 진입 ({pb:.2f}% from high)"))
+            break
+    return out
+
+
+def _legacy_bnf_exits(sim, entries, bars):
+    """(exit_num, time, price, quantity, reason)"""
+    tq = sum(e.quantity for e in entries)
+    avg = sum(e.price * e.quantity for e in entries) / tq
+    start = next(i for i, c in enumerate(bars) if c['time'] == entries[-1].time)
+    out, stage, remain, high = [], 1, tq, avg
+    for c in bars[start:]:
+        high = c['high'] if c['high'] > high else high
+        pct = (c['close'] - avg) / avg * 100
+        ts = sim.calculate_trailing_stop(int(avg), high, pct)
+        if stage == 1 and pct >= sim.EXIT_TARGETS[0]:
+            q = int(tq * sim.EXIT_WEIGHTS[0])
+            out.append((1, c['time'], int(avg * (1 + sim.EXIT_TARGETS[0] / 100)), q))
+            stage, remain = 2, remain - q
+            continue
+        if stage == 2:
+            q = int(tq * sim.EXIT_WEIGHTS[1])
+            if pct >= sim.EXIT_TARGETS[1]:
+                out.append((2, c['time'], int(avg * (1 + sim.EXIT_TARGETS[1] / 100)), q))
+                stage, remain = 3, remain - q
+                continue
+            if c['low'] <= ts:
+                out.append((2, c['time'], ts, q))
+                stage, remain = 3, remain - q
+                continue
+        if stage == 3:
+            if c['low'] <= ts:
+                out.append((3, c['time'], ts, remain))
+                return out
+            if c['time'][:5] >= sim.EXIT_DEADLINE:
+                out.append((3, c['time'], c['close'], remain))
+                return out
+    if remain > 0:
+        out.append((3, bars[-1]['time'], bars[-1]['close'], remain))
+    return out
+
+
+# ── 테스트 ────────────────────────────────────────────────
+
+def test_container():
+    """시각 파싱, read-only, 원본 시각 문자열 유지."""
+    assert parse_minute("09:05:00") == parse_minute("09:05") == 545
+    assert parse_minute("") == parse_minute(None) == -1
+    raw = [{'time': '09:00:00', 'open': 100, 'high': 110, 'low': 95, 'close': 105, 'volume': 7},
+           {'time': '09:01', 'open': 105, 'high': None, 'low': 101, 'close': 103}]
+    bars = MinuteBars.from_dicts(raw)
+    assert len(bars) == 2 and bars.labels == ('09:00:00', '09:01')
+    assert bars.high.tolist() == [110, 0] and bars.volume.tolist() == [7, 0]
+    assert bars.since('09:01:00').tolist() == [False, True] and bars.index_of('09:01') == 1
+    assert as_minute_bars(bars) is bars and len(as_minute_bars([])) == 0
+    try:
+        bars.close[0] = 1
+        raise AssertionError("분봉 배열 쓰기 허용됨")
+    except ValueError:
+        pass
+    print(f"  [OK] {bars!r}")
+
+
+def test_collector_paths_match_legacy():
+    """analyze_profit_loss / analyze_multi_scenario == 기존 루프."""
+    import config
+    collector = IntradayCollector(minute_store=None)
+    hits = {}
+    for seed in range(120):
+        bars = _random_day(seed, vol=0.0004 if seed % 4 == 0 else 0.006)
+        collector.get_minute_data = lambda *a, _b=bars, **k: _b
+        res = collector.analyze_profit_loss('005930', '20260410', 3.0, -2.0)
+        vr = res['actual_result'] or res['virtual_result']
+        entry, t0 = vr['entry_price'], vr['entry_time'] or '09:00:00'
+        ref = _legacy_profit_loss(bars, entry, t0, entry * 1.03, entry * (1 + -2.0 / 100))
+        for key, val in ref.items():
+            assert vr[key] == val and type(vr[key]) is type(val), (seed, key, vr[key], val)
+        hits[ref['first_hit']] = hits.get(ref['first_hit'], 0) + 1
+
+        multi = collector.analyze_multi_scenario('005930', '20260410')
+        for sc in config.MULTI_SCENARIOS:
+            got = multi['scenarios'][sc['name']]
+            ref = _legacy_multi(bars, entry, multi['entry_time'],
+                                entry * (1 + sc['profit'] / 100), entry * (1 + sc['loss'] / 100))
+            assert (got['result'], got['hit_time'], got['max_profit_percent'],
+                    got['max_loss_percent']) == ref, (seed, sc['name'])
+    assert len(hits) == 3, hits
+    print(f"  [OK] 120일 경로 동일 (first_hit 분포 {hits})")
+
+
+def test_simulator_trailing_matches_legacy():
+    """_find_trailing_exit_from_bars == 기존 루프 (진입 시각 이전·가격 0 봉 제외)."""
+    sim = TradingSimulator(capital=1_000_000)
+    found = 0
+    for seed in range(150):
+        bars = _random_day(seed, vol=0.01)
+        bars[40]['low'] = 0
+        entry = bars[7]['open']
+        for t0 in ('09:00:00', '09:05:00'):
+            got = sim._find_trailing_exit_from_bars(bars, entry, t0)
+            assert got == _legacy_trailing(sim, bars, entry, t0), (seed, t0, got)
+            found += got is not None
+    assert found > 50
+    print(f"  [OK] 300건 트레일링 판정 동일 (발동 {found}건)")
+
+
+def test_bnf_matches_legacy():
+    """BNF 분할 진입/청산 == 기존 루프, simulate_trade 최대수익/손실 동일."""
+    sim = BNFSimulator(capital=3_000_000)
+    stages = {}
+    for seed in range(150):
+        bars = _random_day(seed, vol=0.008)
+        entries = sim.find_entry_points(bars, 3_000_000)
+        got = [(e.entry_num, e.time, e.price, e.quantity, e.reason) for e in entries]
+        assert got == _legacy_bnf_entries(sim, bars, 3_000_000), seed
+        if not entries:
+            continue
+        exits = sim.find_exit_points(entries, bars)
+        got = [(x.exit_num, x.time, x.price, x.quantity) for x in exits]
+        assert got == _legacy_bnf_exits(sim, entries, bars), (seed, got)
+        key = (len(entries), len(exits))
+        stages[key] = stages.get(key, 0) + 1
+
+        result = sim.simulate_trade('005930', 'T', '20260410', bars, 3_000_000)
+        avg = result.avg_entry_price
+        start = next(i for i, c in enumerate(bars) if c['time'] == entries[-1].time)
+        tq = sum(e.quantity for e in entries)
+        avg_raw = sum(e.price * e.quantity for e in entries) / tq
+        mp = max([0] + [(c['high'] - avg_raw) / avg_raw * 100 for c in bars[start:]])
+        ml = min([0] + [(c['low'] - avg_raw) / avg_raw * 100 for c in bars[start:]])
+        assert (result.max_profit_pct, result.max_loss_pct) == (round(mp, 2), round(ml, 2)), seed
+        assert result.current_high == max([avg_raw] + [c['high'] for c in bars[start:]])
+        assert asdict(result)['exits'] == [asdict(x) for x in exits] and avg == round(avg_raw, 2)
+    assert any(n == 3 for n, _ in stages) and any(m == 3 for _, m in stages), stages
+    print(f"  [OK] BNF 진입/청산 동일 ((진입수, 청산수) 분포 {dict(sorted(stages.items()))})")
+
+
+def test_exit_grid_matches_loop():
+    """exit_grid (5 × 4 × 3) == 그리드 점별 분봉 루프 — 유형·시각·청산가·수익률."""
+    profits = [1.0, 2.0, 3.5, 5.0, 8.0]
+    losses = [-1.0, -2.0, -3.0, -5.0]
+    ladders = [None, [(5, 2), (3, 1.5)], [(2, 1)]]
+    kinds = {}
+    for seed in range(40):
+        bars = _random_day(seed, n=60, vol=0.0002) if seed % 5 == 0 else _random_day(seed)
+        mb = MinuteBars.from_dicts(bars)
+        entry = bars[2]['open']
+        grid = exit_grid(mb, entry, profits, losses, ladders,
+                         mask=mb.since('09:00:00'), slippage_pct=0.05)
+        assert grid.shape == (5, 4, 3)
+        for p, pv in enumerate(profits):
+            for l, lv in enumerate(losses):
+                for t, ladder in enumerate(ladders):
+                    kind, when, price = _legacy_grid_point(bars, entry, '09:00:00', pv, lv,
+                                                           ladder, 1 - 0.05 / 100)
+                    got = grid.point(p, l, t)
+                    assert (got['type'], got['time'], got['price']) == (kind, when, price), \
+                        (seed, pv, lv, t, got, kind, when, price)
+                    assert abs(got['return_pct'] - (price - entry) / entry * 100) < 1e-12
+                    kinds[kind] = kinds.get(kind, 0) + 1
+    assert set(kinds) == {EXIT_TYPES[c] for c in (0, 1, 2, 3)}, kinds
+    print(f"  [OK] 40일 × 60점 그리드 판정 동일 {kinds}")
+
+
+def test_path_speed():
+    """시나리오 4개 × 385봉 경로 1회 계산 (배열 변환 포함) 1ms 수준."""
+    bars_raw = _random_day(7)
+    t0 = time.perf_counter()
+    for _ in range(200):
+        bars = MinuteBars.from_dicts(bars_raw)
+        tp_sl_path(bars, 10_000, [10_300, 10_300, 10_500, 10_500], [9_800, 9_700, 9_800, 9_700],
+                   mask=bars.since('09:05:00'))
+    per_call = (time.perf_counter() - t0) / 200 * 1000
+    assert per_call < 20, f"{per_call:.2f}ms"
+    print(f"  [OK] 경로 계산 {per_call:.3f}ms/종목")
+
+
+def main():
+    print("=" * 60)
+    print("분봉 경로 엔진 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_container,
+        test_collector_paths_match_legacy,
+        test_simulator_trailing_matches_legacy,
+        test_bnf_matches_legacy,
+        test_exit_grid_matches_loop,
+        test_path_speed,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+분봉 공용 저장소 (minute_store) 단위 테스트.
+
+검증 항목:
+1. get_or_load — 같은 (code, date) 는 1회만 로드, 빈 결과도 기억, 동시 miss 1회 로드
+2. 디스크 계층 — persist=True 만 저장, 새 인스턴스에서 디스크 hit, clear 후에도 디스크 유지
+3. IntradayCollector — 완결 분봉만 persist (당일 장중/부분 분봉 제외)
+4. TradingSimulator confirm_0930 + 트레일링 — 2팀이 같은 종목을 시뮬레이션해도 fetch 1회
+5. MinuteBarPrefetcher — 소스별 동시 실행 상한 준수, 병렬 소요 ≈ 가장 느린 소스, 이후 저장소 hit
+
+격리: tempfile.TemporaryDirectory (실제 data/intraday 미사용).
+
+실행:
+    python -m paper_trading.test_minute_store
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.utils.minute_store import MinuteBarStore
+from paper_trading.utils.minute_prefetch import MinuteBarPrefetcher
+from paper_trading.simulator import TradingSimulator
+from paper_trading.selector import StockCandidate
+from intraday_collector import IntradayCollector
+
+
+def _session_bars(open_price=10000):
+    """09:00 ~ 15:20 1분봉 — 09:30 까지 +1% 상승, 10:00 +6% 고점 후 되밀림."""
+    bars = []
+    price = open_price
+    for h in range(9, 16):
+        for m in range(60):
+            t = f"{h:02d}:{m:02d}:00"
+            if t > "15:20:00":
+                break
+            if t <= "10:00:00":
+                price = open_price * (1 + 0.06 * (h * 60 + m - 540) / 60)
+            else:
+                price = max(open_price * 1.0, price - open_price * 0.001)
+            p = int(price)
+            bars.append({"time": t, "open": p, "high": p + 10, "low": p - 10,
+                         "close": p, "volume": 1000})
+    return bars
+
+
+def test_get_or_load_once():
+    """같은 키는 1회 로드, 빈 결과도 메모리에 기억."""
+    with tempfile.TemporaryDirectory() as td:
+        store = MinuteBarStore(disk_dir=Path(td))
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return [{"time": "09:00:00", "close": 1}], False
+
+        a = store.get_or_load("005930", "20260410", loader)
+        b = store.get_or_load("005930", "20260410", loader)
+        assert a is b and len(calls) == 1
+
+        empty_calls = []
+        for _ in range(3):
+            store.get_or_load("000660", "20260410", lambda: (empty_calls.append(1) or [], False))
+        assert len(empty_calls) == 1
+
+        # 동시 miss — 로드 1회
+        slow_calls = []
+
+        def slow():
+            slow_calls.append(1)
+            time.sleep(0.05)
+            return [{"time": "09:00:00"}], False
+
+        threads = [threading.Thread(target=store.get_or_load, args=("035420", "20260410", slow))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(slow_calls) == 1, slow_calls
+        st = store.stats()
+        assert st["misses"] == 3 and st["hits"] >= 2
+        print(f"  [OK] 키당 1회 로드 (빈 결과 기억, 동시 8스레드 1회) — {st}")
+
+
+def test_disk_tier():
+    """persist=True 만 디스크 저장, 새 인스턴스 디스크 hit, clear 는 메모리만."""
+    with tempfile.TemporaryDirectory() as td:
+        store = MinuteBarStore(disk_dir=Path(td))
+        bars = _session_bars()
+        store.get_or_load("005930", "20260410", lambda: (bars, True))
+        store.get_or_load("000660", "20260410", lambda: (bars, False))
+        assert (Path(td) / "20260410" / "005930.json").exists()
+        assert not (Path(td) / "20260410" / "000660.json").exists()
+
+        store.clear()
+        fresh = MinuteBarStore(disk_dir=Path(td))
+        for s in (store, fresh):
+            got = s.get_or_load("005930", "20260410",
+                                lambda: (_ for _ in ()).throw(AssertionError("재 fetch")))
+            assert got == bars
+            assert s.stats()["disk_hits"] == 1
+        leftovers = [p for p in (Path(td) / "20260410").iterdir() if ".tmp." in p.name]
+        assert leftovers == []
+        print("  [OK] 디스크 계층: persist 분기, 재시작/clear 후 디스크 hit")
+
+
+def test_collector_persists_only_final_bars():
+    """지난 날짜 완결 분봉만 디스크, 부분 분봉·sise_time 과거일은 메모리만."""
+    with tempfile.TemporaryDirectory() as td:
+        store = MinuteBarStore(disk_dir=Path(td))
+        collector = IntradayCollector(minute_store=store)
+        full = _session_bars()
+        partial = full[:60]
+        sources = {"000001": (full, "kis"), "000002": (partial, "kis"),
+                   "000003": (full, "naver_sise")}
+        collector._fetch_minute_data = lambda code, date, freq='1', gate=None: sources[code]
+
+        for code in sources:
+            assert collector.get_minute_data(code, "20200106") == sources[code][0]
+        saved = sorted(p.stem for p in (Path(td) / "20200106").iterdir())
+        assert saved == ["000001"], saved
+        assert collector._is_final_minute_data(full, "29991231", "kis") is False
+        print("  [OK] 완결 분봉만 디스크 저장 (부분/sise_time 과거일 제외)")
+
+
+def test_simulator_teams_share_fetch():
+    """confirm_0930 + 트레일링 — 2팀 × 같은 종목 → 분봉 fetch 1회."""
+    with tempfile.TemporaryDirectory() as td:
+        store = MinuteBarStore(disk_dir=Path(td))
+        bars = _session_bars()
+        fetches = []
+
+        def fake_fetch(code, date, freq='1', gate=None):
+            fetches.append((code, date))
+            return bars, "naver_ohlc"
+
+        cand = StockCandidate(code="005930", name="삼성전자", price=10000, change_pct=1.0,
+                              trading_value=0, market_cap=0, volume=0)
+        results = []
+        for _ in range(2):  # 같은 종목을 보유한 2팀
+            sim = TradingSimulator(capital=1_000_000, entry_mode="confirm_0930")
+            sim.intraday = IntradayCollector(minute_store=store)
+            sim.intraday._fetch_minute_data = fake_fetch
+            sim.trade_date = "20200106"
+            results.append(sim._simulate_trade_intraday(cand, 1_000_000))
+
+        assert fetches == [("005930", "20200106")], fetches
+        assert results[0] is not None and results[0].exit_type == "trailing"
+        assert results[0].to_dict() == results[1].to_dict()
+        print(f"  [OK] 2팀 시뮬레이션 분봉 fetch 1회 (저장소 {store.stats()})")
+
+
+class _FakeCollector:
+    """폴백 체인 흉내: 짝수 종목 KIS 성공, 홀수 종목 KIS 빈 응답 → 네이버 OHLC"""
+    active = {}
+    peak = {}
+    lock = threading.Lock()
+    calls = []
+
+    def __init__(self, store):
+        self.store = store
+
+    def _call(self, gate, source, delay):
+        with gate(source):
+            with _FakeCollector.lock:
+                n = _FakeCollector.active.get(source, 0) + 1
+                _FakeCollector.active[source] = n
+                _FakeCollector.peak[source] = max(_FakeCollector.peak.get(source, 0), n)
+            time.sleep(delay)
+            with _FakeCollector.lock:
+                _FakeCollector.active[source] -= 1
+
+    def fetch_minute_data(self, code, date, freq='1', gate=None):
+        with _FakeCollector.lock:
+            _FakeCollector.calls.append(code)
+        self._call(gate, 'kis', 0.05)
+        if int(code) % 2 == 1:
+            self._call(gate, 'naver_ohlc', 0.1)
+        return _session_bars(), False
+
+
+def test_prefetcher_bounded_parallel():
+    """12종목 × (KIS 0.05s [+ 네이버 0.1s]) — 소스별로 동시 실행하되 상한 준수."""
+    _FakeCollector.active, _FakeCollector.peak, _FakeCollector.calls = {}, {}, []
+    with tempfile.TemporaryDirectory() as td:
+        store = MinuteBarStore(disk_dir=Path(td))
+        codes = [f"{i:06d}" for i in range(12)]
+        pf = MinuteBarPrefetcher(store=store, limits={'kis': 3, 'naver_ohlc': 2},
+                                 collector_factory=_FakeCollector)
+        result = pf.prefetch([(c, "20200106") for c in codes + codes[:4]])  # 중복 포함
+
+        assert len(result) == 12 and all(result.values())
+        assert sorted(_FakeCollector.calls) == codes
+        assert 1 < _FakeCollector.peak['kis'] <= 3, _FakeCollector.peak
+        assert 1 < _FakeCollector.peak['naver_ohlc'] <= 2, _FakeCollector.peak
+
+        # 이후 조회는 저장소 hit (fetch 없음)
+        again = pf.prefetch([(c, "20200106") for c in codes])
+        assert again == result and len(_FakeCollector.calls) == 12
+        print(f"  [OK] 12종목 fetch {len(_FakeCollector.calls)}회, "
+              f"동시 최대 kis={_FakeCollector.peak['kis']} naver={_FakeCollector.peak['naver_ohlc']}")
+
+
+def main():
+    print("=" * 60)
+    print("분봉 공용 저장소 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_get_or_load_once,
+        test_disk_tier,
+        test_collector_persists_only_final_bars,
+        test_simulator_teams_share_fetch,
+        test_prefetcher_bounded_parallel,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+네이버 공용 HTTP 계층 (naver_http) + NaverMarketData 병렬 페이지 수집 단위 테스트.
+
+검증 항목:
+1. get_ticker_list / get_ohlcv_by_ticker — 순차 루프와 같은 종목·순서, 1페이지 후 나머지 동시 요청
+2. 마지막 페이지 표시(pgRR) 없음 → 빈 페이지 앞까지, 429 → 백오프 재시도 후 성공
+3. get_ohlcv — 날짜 범위 필터, start_date 이전 페이지에서 중단, 최근 페이지가 전부 end_date 이후여도 수집
+
+격리: NaverHttp session 을 가짜 네이버 페이지로 교체 (네트워크 미사용).
+
+실행:
+    python -m paper_trading.test_naver_http
+"""
+
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from naver_http import NaverHttp, last_page
+from naver_market import SISE_DAY_ROWS, NaverMarketData
+
+ROWS_PER_PAGE = 5               # sise_market_sum (sise_day 는 SISE_DAY_ROWS)
+
+
+def _pg_rr(last):
+    if not last:
+        return ""
+    return (f"<table><tr><td class=\"pgRR\"><a href=\"/sise/x.naver?sosok=0&amp;page={last}\">"
+            f"맨뒤</a></td></tr></table>")
+
+
+def _market_sum_html(stocks, last):
+    rows = "".join(
+        f"<tr><td>{i}</td><td><a href='/item/main.naver?code={s['code']}'>{s['name']}</a></td>"
+        f"<td>{s['price']:,}</td><td>100</td><td>{s['pct']:+.2f}%</td><td>{s['volume']:,}</td>"
+        f"<td>{s['value']:,}</td><td>0</td><td>0</td><td>0</td></tr>"
+        for i, s in enumerate(stocks))
+    return f"<html><table class='type_2'><tr><th>N</th></tr>{rows}</table>{_pg_rr(last)}</html>"
+
+
+def _sise_day_html(days, last):
+    rows = "".join(
+        f"<tr><td>{d['날짜']:%Y.%m.%d}</td><td>{d['종가']:,}</td><td>0</td><td>{d['시가']:,}</td>"
+        f"<td>{d['고가']:,}</td><td>{d['저가']:,}</td><td>{d['거래량']:,}</td></tr>"
+        for d in days)
+    return f"<html><table class='type2'><tr><th>날짜</th></tr>{rows}</table>{_pg_rr(last)}</html>"
+
+
+class _FakeResponse:
+    def __init__(self, text='', status_code=200):
+        self.text = text
+        self.status_code = status_code
+        self.encoding = None
+
+
+class _FakeNaver:
+    """sise_market_sum / sise_day 페이지 응답, 동시 실행 수·호출 기록"""
+
+    def __init__(self, stocks=(), days=(), latency=0.0, pg_rr=True, fail_once=()):
+        self.stocks = list(stocks)
+        self.days = list(days)          # 최근 날짜부터
+        self.latency = latency
+        self.pg_rr = pg_rr
+        self.fail_once = set(fail_once)
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, timeout=None):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            page = int(url.split('page=')[-1])
+            with self._lock:
+                self.calls.append(page)
+                if page in self.fail_once:
+                    self.fail_once.discard(page)
+                    return _FakeResponse(status_code=429)
+            items = self.stocks or self.days
+            size = ROWS_PER_PAGE if self.stocks else SISE_DAY_ROWS
+            chunk = items[(page - 1) * size:page * size]
+            last = -(-len(items) // size) if self.pg_rr else None
+            if self.stocks:
+                return _FakeResponse(_market_sum_html(chunk, last))
+            return _FakeResponse(_sise_day_html(chunk, last))
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _stocks(n):
+    return [{'code': f"{i:06d}", 'name': f"종목{i}", 'price': 1000 + i * 10,
+             'pct': ((i * 7) % 11 - 5) * 0.41, 'volume': 10000 + i, 'value': 100 + i}
+            for i in range(1, n + 1)]
+
+
+def _days(n, end=None):
+    """평일 n 일 (최근 날짜부터)"""
+    dt = (end or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    days = []
+    while len(days) < n:
+        if dt.weekday() < 5:
+            k = len(days)
+            days.append({'날짜': dt, '시가': 5000 + k, '고가': 5100 + k, '저가': 4900 + k,
+                         '종가': 5050 + k, '거래량': 1000 + k})
+        dt -= timedelta(days=1)
+    return days
+
+
+def _market(fake, **kwargs):
+    return NaverMarketData(http=NaverHttp(session=fake, min_interval=0.0, **kwargs))
+
+
+def test_market_sum_parallel():
+    """종목 목록/OHLCV 가 순차 결과와 같고, 1페이지 이후 페이지는 동시에 요청."""
+    stocks = _stocks(7 * ROWS_PER_PAGE)
+    assert last_page(_market_sum_html(stocks[:5], 7)) == 7 and last_page("<html></html>") is None
+
+    fake = _FakeNaver(stocks=stocks, latency=0.05)
+    market = _market(fake, max_per_host=4)
+    tickers = market.get_ticker_list('KOSPI')
+    assert tickers == [s['code'] for s in stocks]
+    assert sorted(fake.calls) == list(range(1, 8)) and fake.calls[0] == 1
+    assert 1 < fake.peak <= 4, fake.peak                    # 2페이지 이후 동시, 호스트 한도 이내
+    assert market.get_ticker_name('000003') == '종목3'
+
+    df = market.get_ohlcv_by_ticker('20260410')
+    assert df.index.tolist() == tickers
+    row = df.loc['000004']
+    assert row['종가'] == 1040 and row['거래량'] == 10004 and row['거래대금'] == 104 * 1_000_000
+    assert abs(row['등락률'] - stocks[3]['pct']) < 1e-9
+    print(f"  [OK] 7페이지 요청 {len(fake.calls)}회, 동시 {fake.peak}")
+
+
+def test_truncation_and_backoff():
+    """pgRR 없음 → 빈 페이지 앞까지, 429 는 백오프 재시도 후 같은 결과."""
+    stocks = _stocks(3 * ROWS_PER_PAGE)
+    fake = _FakeNaver(stocks=stocks, pg_rr=False, fail_once={2})
+    http = NaverHttp(session=fake, min_interval=0.0, max_per_host=4)
+    market = NaverMarketData(http=http)
+    tickers = market.get_ticker_list('KOSDAQ')
+    assert tickers == [s['code'] for s in stocks]
+    assert fake.calls.count(2) == 2                         # 429 후 재시도
+    assert max(fake.calls) <= 1 + 4                         # 첫 창 (4페이지) 안에서 종료
+    state = http._host('https://finance.naver.com/')
+    assert 0 < state.interval < 0.25                        # 백오프 후 성공 응답마다 점차 복귀
+
+    # 재시도 횟수 초과 → 해당 페이지 앞까지
+    fake = _FakeNaver(stocks=stocks, fail_once={2})
+    market = _market(fake, retries=0)
+    assert market.get_ticker_list('KOSPI') == [s['code'] for s in stocks[:ROWS_PER_PAGE]]
+    print(f"  [OK] 빈 페이지/429 재시도 ({len(tickers)}종목), 재시도 초과 시 절단")
+
+
+def test_ohlcv_range():
+    """get_ohlcv — 범위 필터 동일, start_date 이전 페이지 이후는 쓰지 않음."""
+    days = _days(120)
+    fake = _FakeNaver(days=days, latency=0.01)
+    market = _market(fake)
+
+    start, end = days[34]['날짜'], days[12]['날짜']
+    df = market.get_ohlcv('000001', start.strftime('%Y%m%d'), end.strftime('%Y%m%d'))
+    expected = sorted((d for d in days if start <= d['날짜'] <= end), key=lambda d: d['날짜'])
+    assert df.index.tolist() == [d['날짜'] for d in expected]
+    assert df['종가'].tolist() == [d['종가'] for d in expected]
+    assert df['거래량'].tolist() == [d['거래량'] for d in expected]
+    # 최근 1페이지는 전부 end_date 이후 — 순차 루프는 여기서 멈췄다
+    assert len(df) == 23
+    assert max(fake.calls) < len(days) // SISE_DAY_ROWS
+    pages = max(fake.calls)
+
+    fake.calls.clear()
+    recent = market.get_ohlcv('000001', days[3]['날짜'].strftime('%Y%m%d'))
+    assert len(recent) == 4 and fake.calls == [1]
+    print(f"  [OK] {len(df)}거래일 일치, 요청 페이지 최대 {pages}")
+
+
+def main():
+    print("=" * 60)
+    print("네이버 공용 HTTP 계층 / 병렬 페이지 수집 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_market_sum_parallel,
+        test_truncation_and_backoff,
+        test_ohlcv_range,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
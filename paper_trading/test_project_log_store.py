@@ -0,0 +1,239 @@
+"""
+프로젝트 로그 SQLite 저장소 (project_logger.ProjectLogStore) 단위 테스트.
+
+검증 항목:
+1. logs/*.json 이관 — 조회 결과가 JSON 전체 로드 + 선형 필터와 동일, 재실행 시 재이관 없음,
+   close 시 내보내기가 원본과 바이트 단위 동일
+2. 기록마다 JSON 내보내기, JSON 이 밖에서 바뀌면 DB 재구성 + 내보내기 안 된 기록 병합,
+   중복 id 는 새 id 로 이관 (IntegrityError 없음)
+3. 기록 — 같은 날짜 매매/같은 이름 규칙은 덮어쓰기 (순서·생성 시각 유지), id 증가, 세션 활동
+4. ContextLoader.load_context — 필요한 구간만 조회해도 기존 결과와 동일, 조회 조건은 인덱스 사용
+5. WAL 모드, close 시 체크포인트 (WAL 파일 비움), JSON 만으로 재로드 (커밋 상황)
+
+격리: logs 폴더는 임시 폴더 (실제 logs/*.json 은 복사본만 사용).
+
+실행:
+    python -m paper_trading.test_project_log_store
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from project_logger import JSON_LOG_FILES as LEGACY_FILES
+from project_logger import LOGS_DIR, LOG_DB_NAME, ContextLoader, ProjectLogger
+
+
+def _copy_legacy(tmp):
+    logs = Path(tmp) / 'logs'
+    logs.mkdir()
+    for name in LEGACY_FILES:
+        if (LOGS_DIR / name).exists():
+            shutil.copy(LOGS_DIR / name, logs / name)
+    return logs
+
+
+def _load(logs, name):
+    with open(logs / name, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _by_ts(items):
+    return sorted(items, key=lambda x: x.get("timestamp", ""), reverse=True)
+
+
+def test_migration_parity():
+    """이관 후 조회 = 기존 JSON 로직, 내보내기 = 원본, 두 번째 실행은 이관하지 않음."""
+    with tempfile.TemporaryDirectory() as tmp:
+        logs = _copy_legacy(tmp)
+        decisions = _load(logs, "decisions.json")["decisions"]
+        changes = _load(logs, "strategy_changes.json")["changes"]
+        trades = _load(logs, "daily_trades.json")["trades"]
+        qa = _load(logs, "qa_history.json")["qa_list"]
+        rules = _load(logs, "rules.json")
+
+        with ProjectLogger(logs) as pl:
+            assert pl.get_decisions() == _by_ts(decisions)
+            cat = decisions[0]["category"]
+            assert pl.get_decisions(category=cat) == _by_ts([d for d in decisions if d["category"] == cat])
+            assert pl.get_strategy_history() == _by_ts(changes)
+            assert pl.get_trades() == sorted(trades, key=lambda t: t["date"], reverse=True)
+            mid = sorted(t["date"] for t in trades)[1]
+            assert pl.get_trades(start_date=mid) == [t for t in pl.get_trades() if t["date"] >= mid]
+            assert pl.get_qa(importance="high") == _by_ts([q for q in qa if q["importance"] == "high"])
+            assert pl.get_rules() == [r for r in rules["rules"] if r["status"] == "active"]
+            assert pl.get_rules(rule_type="exit") == [
+                r for r in rules["rules"] if r["status"] == "active" and r["rule_type"] == "exit"]
+            assert pl.get_constraints() == rules["constraints"]
+
+        for name in LEGACY_FILES:                               # close 시 내보내기 = 원본
+            if (LOGS_DIR / name).exists():
+                assert (logs / name).read_bytes() == (LOGS_DIR / name).read_bytes(), name
+
+        # 두 번째 실행: JSON 그대로면 재이관 없음
+        with ProjectLogger(logs) as pl:
+            assert pl.store.migrate_json(logs) == {}
+            assert len(pl.get_decisions()) == len(decisions)
+    print(f"  [OK] 의사결정 {len(decisions)} / Q&A {len(qa)} / 규칙 {len(rules['rules'])} / "
+          f"매매 {len(trades)}일 이관, 내보내기 원본 동일, 재실행 중복 0")
+
+
+def test_external_json_change():
+    """기록마다 JSON 내보내기, JSON 외부 변경 (git pull) 시 재구성 + 내보내기 안 된 기록 병합, 중복 id 는 새 id."""
+    with tempfile.TemporaryDirectory() as tmp:
+        logs = _copy_legacy(tmp)
+        decisions = _load(logs, "decisions.json")["decisions"]
+        pl = ProjectLogger(logs)
+        pl.log_decision("로컬", "d", "r")
+        assert _load(logs, "decisions.json")["decisions"][-1]["title"] == "로컬"     # close 전에도 반영
+
+        # 내보내기 전에 중단된 기록 (DB 커밋 후 프로세스 종료)
+        with pl.store.conn:
+            pl.store.record("qa", {"id": 1, "timestamp": "2026-05-01T09:00:00", "question": "미반영",
+                                   "answer": "a", "importance": "high"})
+        pl.store.close()
+
+        # 그 사이 JSON 이 밖에서 바뀜 — 중복 id 가 섞인 병합 결과
+        pulled = decisions * 2
+        (logs / "decisions.json").write_text(json.dumps({"decisions": pulled}), encoding='utf-8')
+        with ProjectLogger(logs) as pl:
+            saved = pl.get_decisions()
+            assert len(saved) == len(pulled) and len({d["id"] for d in saved}) == len(saved)
+            qa = pl.get_qa()
+            assert qa[0]["question"] == "미반영" and len({q["id"] for q in qa}) == len(qa)
+            assert pl.store.pending_files() == []
+        assert "미반영" in [q["question"] for q in _load(logs, "qa_history.json")["qa_list"]]
+    print(f"  [OK] 기록 즉시 내보내기, 외부 변경 시 재구성 + 미반영 기록 병합, 중복 id {len(decisions)}건 새 id")
+
+
+def test_writes():
+    """매매 날짜·규칙 이름 덮어쓰기, id 증가, 세션 활동/종료."""
+    with tempfile.TemporaryDirectory() as tmp:
+        logs = Path(tmp) / 'logs'
+        with ProjectLogger(logs) as pl:
+            assert pl.get_decisions() == [] and pl.get_trades() == []
+            ids = [pl.log_decision(f"결정{i}", "내용", "사유", category="strategy")["id"] for i in range(3)]
+            assert ids == [1, 2, 3]
+            assert pl.log_qa("질문", "답변", importance="critical")["id"] == 1
+
+            pl.log_daily_trade("2026-04-01", [{"code": "005930"}], [{"return_pct": 1.5}], "s1")
+            pl.log_daily_trade("2026-04-02", [], [], "s1")
+            pl.log_daily_trade("2026-04-01", [{"code": "000660"}], [{"return_pct": -1.0}, {"return_pct": 2.0}], "s2")
+            trades = pl.get_trades()
+            assert [t["date"] for t in trades] == ["2026-04-02", "2026-04-01"]
+            assert trades[1]["strategy_used"] == "s2" and trades[1]["summary"]["total_trades"] == 2
+
+            first = pl.log_rule("r1", "entry", "설명", {}, "사유")
+            pl.log_rule("r2", "exit", "설명", {}, "사유")
+            updated = pl.log_rule("r1", "entry", "바뀐 설명", {"x": 1}, "사유", status="testing")
+            assert updated["created_at"] == first["created_at"]
+            assert [r["rule_name"] for r in pl.get_rules()] == ["r2"]
+            assert [r["rule_name"] for r in pl.get_rules(status=None)] == ["r1", "r2"]
+            pl.log_constraint("max_stocks", 5, "분산")
+            pl.log_constraint("max_stocks", 3, "축소")
+            assert [c["value"] for c in pl.get_constraints()] == [3]
+
+            pl.log_activity("세션 없음")                        # 열린 세션 없으면 무시
+            session = pl.start_session()
+            pl.log_activity("백테스트", {"n": 1})
+            pl.log_activity("리뷰")
+            pl.end_session("완료")
+            pl.log_activity("종료 후")                          # 닫힌 세션에는 기록 안 함
+            saved = pl.get_sessions()
+            assert len(saved) == 1 and saved[0]["session_id"] == session["session_id"]
+            assert [a["activity"] for a in saved[0]["activities"]] == ["백테스트", "리뷰"]
+            assert saved[0]["summary"] == "완료" and saved[0]["end_time"]
+            assert pl.start_session()["session_id"] == 2
+    print("  [OK] 덮어쓰기/순서 유지, id 1..n, 세션 활동 2건")
+
+
+def test_context_slices():
+    """load_context 가 LIMIT 조회로도 기존 (전체 로드 후 자르기) 결과와 같고 인덱스를 쓴다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        logs = _copy_legacy(tmp)
+        with ProjectLogger(logs) as pl:
+            for i in range(40):
+                pl.log_daily_trade(f"2025-{1 + i // 28:02d}-{1 + i % 28:02d}", [], [{"return_pct": i % 5 - 2}], "s")
+                pl.log_decision(f"결정{i}", "d", "r", category=("system", "strategy")[i % 2])
+                pl.log_qa(f"q{i}", "a", importance=("high", "normal", "critical", "low")[i % 4])
+            ctx = ContextLoader(pl).load_context()
+            assert ctx["recent_trades"] == pl.get_trades()[:7]
+            assert ctx["recent_decisions"] == pl.get_decisions()[:5]
+            assert ctx["strategy_history"] == pl.get_strategy_history()[:5]
+            assert ctx["important_qa"] == [q for q in pl.get_qa() if q["importance"] == "critical"] + \
+                [q for q in pl.get_qa() if q["importance"] == "high"]
+
+            def plan(sql, params):
+                return " ".join(row[-1] for row in pl.store.conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+            assert "idx_qa_importance" in plan("SELECT data FROM qa WHERE importance = ? "
+                                               "ORDER BY timestamp DESC, id", ("high",))
+            assert "idx_decisions_category" in plan("SELECT data FROM decisions WHERE category = ? "
+                                                    "ORDER BY timestamp DESC, id", ("strategy",))
+            assert "USING INDEX" in plan("SELECT data FROM daily_trades WHERE date >= ? ORDER BY date DESC",
+                                         ("2025-02-01",))
+    print(f"  [OK] 최근 매매 {len(ctx['recent_trades'])}일 / 중요 Q&A {len(ctx['important_qa'])}건, 인덱스 조회")
+
+
+def test_wal_checkpoint():
+    """WAL 모드로 열고, close 후 WAL 비움, 커밋되는 JSON 만으로 재로드 가능."""
+    with tempfile.TemporaryDirectory() as tmp:
+        logs = Path(tmp) / 'logs'
+        pl = ProjectLogger(logs)
+        assert pl.store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        pl.log_decision("WAL", "d", "r")
+        pl.close()
+        wal = logs / (LOG_DB_NAME + "-wal")
+        assert not wal.exists() or wal.stat().st_size == 0
+
+        copy = Path(tmp) / 'copy'
+        copy.mkdir()
+        for name in LEGACY_FILES:                               # JSON 만 (커밋 상황, .db 는 gitignore)
+            if (logs / name).exists():
+                shutil.copy(logs / name, copy / name)
+        with ProjectLogger(copy) as pl:
+            assert [d["title"] for d in pl.get_decisions()] == ["WAL"]
+    print("  [OK] journal_mode=wal, close 후 WAL 비움, JSON 만으로 재로드")
+
+
+def main():
+    print("=" * 60)
+    print("프로젝트 로그 SQLite 저장소 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_migration_parity,
+        test_external_json_change,
+        test_writes,
+        test_context_slices,
+        test_wal_checkpoint,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
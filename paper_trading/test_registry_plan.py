@@ -0,0 +1,158 @@
+"""
+전략 레지스트리 의존성 실행 계획 (execution_plan / sub_results) 단위 테스트.
+
+검증 항목:
+1. execution_plan — 서브 전략이 조합 전략보다 먼저, 풀 크기 = max(top_n, 선언 풀)
+2. run_all — momentum/theme_policy 각 1회 실행 (top_n=SUB_TOP_N), 하이브리드는 재실행 없이 풀 공유,
+   결과는 전략 단독 실행과 동일 (서브 전략 자기 결과는 top_n 으로 절단)
+3. 서브 전략 실패 — 하이브리드는 빈 풀로 진행 (재실행 안 함)
+
+격리: test_market_snapshot 의 가짜 KRX (네트워크 미사용).
+
+실행:
+    python -m paper_trading.test_registry_plan
+"""
+
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.strategies import StrategyRegistry
+from paper_trading.strategies import (
+    momentum, largecap_contrarian, theme_policy, hybrid_alpha_delta,
+)
+from paper_trading.test_market_snapshot import DATE, _FakeKRX, _patched_env
+from paper_trading.utils import market_snapshot as ms
+
+Hybrid = hybrid_alpha_delta.HybridAlphaDeltaStrategy
+SUBSET = [Hybrid, largecap_contrarian.LargecapContrarianStrategy,
+          momentum.MomentumStrategy, theme_policy.ThemePolicyStrategy]
+
+
+@contextmanager
+def _registry(classes, krx):
+    """레지스트리를 classes 로 교체 + select_stocks 호출 기록 (top_n)"""
+    saved = StrategyRegistry._strategies
+    restore = _patched_env(krx)
+    calls = []
+    originals = {}
+    for cls in classes:
+        if cls is Hybrid:
+            continue
+        orig = cls.select_stocks
+        originals[cls] = orig
+
+        def spy(self, date=None, top_n=5, context=None, _orig=orig, _cls=cls):
+            calls.append((_cls.STRATEGY_ID, top_n))
+            return _orig(self, date=date, top_n=top_n, context=context)
+        cls.select_stocks = spy
+    StrategyRegistry._strategies = {c.STRATEGY_ID: c for c in classes}
+    try:
+        yield calls
+    finally:
+        StrategyRegistry._strategies = saved
+        for cls, orig in originals.items():
+            cls.select_stocks = orig
+        restore()
+
+
+def test_execution_plan_order():
+    """하이브리드가 먼저 등록돼도 서브 전략 먼저, 서브 전략만 풀 크기 확장."""
+    with _registry(SUBSET, _FakeKRX()):
+        plan = StrategyRegistry.execution_plan(top_n=5)
+    ids = [sid for sid, _ in plan]
+    width = dict(plan)
+    assert sorted(ids) == sorted(c.STRATEGY_ID for c in SUBSET) and len(ids) == 4
+    assert ids.index("momentum") < ids.index(Hybrid.STRATEGY_ID)
+    assert ids.index("theme_policy") < ids.index(Hybrid.STRATEGY_ID)
+    assert width == {"momentum": Hybrid.SUB_TOP_N, "theme_policy": Hybrid.SUB_TOP_N,
+                     Hybrid.STRATEGY_ID: 5, "largecap_contrarian": 5}
+    print(f"  [OK] 실행 계획: {plan}")
+
+
+def test_run_all_reuses_sub_pools():
+    """서브 전략 1회 실행 (넓은 풀), 결과는 단독 실행과 동일."""
+    krx = _FakeKRX()
+    with _registry(SUBSET, krx) as calls:
+        results = StrategyRegistry.run_all(date=DATE, top_n=5)
+        run_calls = list(calls)
+        solo = {}
+        for cls in SUBSET:
+            ms.clear_market_snapshots()
+            strat = cls()
+            strat.select_stocks(date=DATE, top_n=5)
+            solo[cls.STRATEGY_ID] = strat.get_result()
+
+    assert sorted(run_calls) == sorted([("momentum", Hybrid.SUB_TOP_N),
+                                        ("theme_policy", Hybrid.SUB_TOP_N),
+                                        ("largecap_contrarian", 5)]), run_calls
+    assert list(results) == [c.STRATEGY_ID for c in SUBSET]  # 등록 순서 유지
+    for sid, res in results.items():
+        got = [(c.code, c.score, c.rank) for c in res.candidates]
+        assert got == [(c.code, c.score, c.rank) for c in solo[sid].candidates], sid
+        assert len(got) <= 5
+    hybrid = results[Hybrid.STRATEGY_ID].candidates
+    assert hybrid and any("delta" in c.score_detail["source"] for c in hybrid)
+    print(f"  [OK] 서브 전략 호출 {run_calls} — 하이브리드 {len(hybrid)}건 단독 실행과 동일")
+
+
+def test_failed_sub_not_rerun():
+    """서브 전략 예외 → 하이브리드는 빈 풀로 진행, 재실행 없음."""
+    krx = _FakeKRX()
+    with _registry([Hybrid, momentum.MomentumStrategy, theme_policy.ThemePolicyStrategy],
+                   krx) as calls:
+        saved = theme_policy.ThemePolicyStrategy._detect_active_themes
+
+        def boom(self, *a, **k):
+            raise RuntimeError("테마 감지 실패 (테스트)")
+        theme_policy.ThemePolicyStrategy._detect_active_themes = boom
+        try:
+            results = StrategyRegistry.run_all(date=DATE, top_n=3)
+        finally:
+            theme_policy.ThemePolicyStrategy._detect_active_themes = saved
+
+    assert [sid for sid, _ in calls].count("theme_policy") == 1, calls
+    assert "theme_policy" not in results
+    hybrid = results[Hybrid.STRATEGY_ID].candidates
+    assert hybrid and all(c.score_detail["source"] == ["alpha"] for c in hybrid)
+    print(f"  [OK] 실패한 서브 전략 재실행 없음 — 하이브리드 alpha 단독 {len(hybrid)}건")
+
+
+def main():
+    print("=" * 60)
+    print("레지스트리 의존성 실행 계획 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_execution_plan_order,
+        test_run_all_reuses_sub_pools,
+        test_failed_sub_not_rerun,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
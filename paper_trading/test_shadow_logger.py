@@ -10,6 +10,9 @@ P3-3c: ShadowLogger 단위 테스트.
 6. 변형별 디렉토리 격리 — kospi_v6 / kosdaq_v5 충돌 없음
 7. atomic write — temp 파일 잔존 없음
 8. SHADOW_DRY_RUN — import 시 True 강제
+9. append_signals/append_trades — 일괄 멱등, 검증 위반 시 전체 미기록
+10. 키 인덱스 — 사이드카 복원 후 꼬리만 파싱, 타 인스턴스 append 반영, 손상 시 재구축
+11. 끊긴 꼬리 라인 — 이후 append 는 새 줄에서 시작 (첫 레코드 유실 없음)
 
 격리: tempfile.TemporaryDirectory 로 매 테스트마다 신규 dir.
 실제 data/paper_trading_shadow/ 는 건드리지 않음.
@@ -29,6 +32,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from paper_trading.shadow import (
     ShadowLogger, ShadowLogError, VARIANT_WHITELIST, SHADOW_DRY_RUN
 )
+from paper_trading.shadow import logger as shadow_logger_mod
 
 
 # ============================================================
@@ -376,6 +380,110 @@ def test_intraday_snapshot_minimal():
         print("  [OK] intraday snapshot: 1건 기록, position_id 누락 거부")
 
 
+def _week_signals(n_days=5, codes=("005930", "000660", "035420")):
+    sigs = []
+    for d in range(n_days):
+        day = 11 + d
+        for c in codes:
+            sigs.append(_sig(code=c, signal_date=f"202605{day:02d}",
+                             entry=f"202605{day + 1:02d}", exit_=f"202605{day + 6:02d}"))
+    return sigs
+
+
+def test_bulk_append_idempotent():
+    """일괄 append: 배치 내/기존 중복 제외, 검증 위반 1건이면 전체 미기록."""
+    with tempfile.TemporaryDirectory() as td:
+        lg = ShadowLogger("squeeze_play_kospi_v6", log_root=Path(td))
+        sigs = _week_signals()
+        assert lg.append_signals(sigs + sigs[:3]) == 15
+        assert lg.append_signals(sigs) == 0
+        assert lg.append_signal(sigs[0]) is False
+        assert len(lg.list_signals()) == 15
+
+        bad = _sig(code="999999")
+        del bad["score"]
+        size = lg.signals_path.stat().st_size
+        try:
+            lg.append_signals([_sig(code="111111"), bad])
+            raise AssertionError("검증 위반 배치가 통과됨")
+        except ShadowLogError:
+            pass
+        assert lg.signals_path.stat().st_size == size, "위반 배치 일부 기록됨"
+
+        trades = [_trade(code=c) for c in ("005930", "000660")]
+        assert lg.append_trades(trades + trades) == 2
+        assert lg.append_trade(trades[1]) is False
+        assert len(lg.list_trades()) == 2
+        print("  [OK] 일괄 append: 시그널 15건/거래 2건, 중복·위반 배치 미기록")
+
+
+def test_key_index_incremental():
+    """사이드카 복원 → 꼬리만 파싱, 타 인스턴스 append 반영, 손상/절단 시 재구축."""
+    with tempfile.TemporaryDirectory() as td:
+        lg = ShadowLogger("squeeze_play_kospi_v6", log_root=Path(td))
+        sigs = _week_signals()
+        lg.append_signals(sigs[:12])
+        assert lg.index_path.exists()
+        indexed = lg.signals_path.stat().st_size
+
+        reads = []
+        orig = shadow_logger_mod._read_jsonl_from
+
+        def spy(path, offset):
+            reads.append((path.name, offset))
+            return orig(path, offset)
+
+        shadow_logger_mod._read_jsonl_from = spy
+        try:
+            # 다른 인스턴스가 단건 append (사이드카 미갱신) → 새 인스턴스는 꼬리만 파싱
+            other = ShadowLogger("squeeze_play_kospi_v6", log_root=Path(td))
+            assert other.append_signal(sigs[12]) is True
+            reads.clear()
+            fresh = ShadowLogger("squeeze_play_kospi_v6", log_root=Path(td))
+            assert fresh.append_signal(sigs[12]) is False
+            assert reads == [("shadow_signals.jsonl", indexed)], reads
+
+            # 이미 로드된 lg 도 타 인스턴스 append 를 인지 (stat → 꼬리 파싱)
+            assert lg.append_signal(sigs[12]) is False
+            # 단건 반복 append — 전체 재파싱 없음
+            reads.clear()
+            for s in sigs[13:]:
+                assert lg.append_signal(s) is True
+            assert all(off > 0 for _, off in reads), reads
+        finally:
+            shadow_logger_mod._read_jsonl_from = orig
+
+        # 쓰는 중 잘린 꼬리 라인은 건너뛰고, 완결되면 반영
+        with open(lg.signals_path, "a", encoding="utf-8") as f:
+            f.write('{"signal_date": "20260601", "code": "0')
+        assert ("20260601", "000001") not in lg._existing_signal_keys()
+
+        # 손상된 사이드카 → 전체 재구축
+        lg.index_path.write_text("{broken", encoding="utf-8")
+        rebuilt = ShadowLogger("squeeze_play_kospi_v6", log_root=Path(td))
+        assert len(rebuilt._existing_signal_keys()) == 15
+        assert rebuilt.append_signals(sigs) == 0
+        print("  [OK] 키 인덱스: 사이드카+꼬리 파싱, 교차 인스턴스 멱등, 손상 시 재구축")
+
+
+def test_append_after_torn_tail():
+    """쓰다 끊긴 라인 뒤 append — 끊긴 조각만 버리고 새 레코드는 모두 읽힘."""
+    with tempfile.TemporaryDirectory() as td:
+        lg = ShadowLogger("squeeze_play_kospi_v6", log_root=Path(td))
+        sigs = _week_signals()
+        lg.append_signals(sigs[:5])
+        with open(lg.signals_path, "a", encoding="utf-8") as f:
+            f.write('{"signal_date": "20260601", "code": "0')   # 프로세스 중단
+
+        assert lg.append_signals(sigs[5:8]) == 3
+        assert lg.append_signal(sigs[8]) is True
+        assert len(lg.list_signals()) == 9
+        fresh = ShadowLogger("squeeze_play_kospi_v6", log_root=Path(td))
+        assert len(fresh._existing_signal_keys()) == 9
+        assert fresh.append_signals(sigs[:9]) == 0
+        print("  [OK] 끊긴 꼬리 뒤 append: 새 줄에서 시작, 9건 모두 읽힘")
+
+
 def main():
     print("=" * 60)
     print("P3-3c: ShadowLogger 단위 테스트")
@@ -394,6 +502,9 @@ def main():
         test_variant_dir_isolation,
         test_atomic_write_no_temp_leftover,
         test_intraday_snapshot_minimal,
+        test_bulk_append_idempotent,
+        test_key_index_incremental,
+        test_append_after_torn_tail,
     ]
     passed = 0
     failed = []
@@ -0,0 +1,261 @@
+"""
+Telegram 발송 키 인덱스 / 발송 큐 (telegram_notifier.TelegramNotifier) 단위 테스트.
+
+검증 항목:
+1. 발송 키 인덱스 — 기존 jsonl (codes 없음) 정규식 전체 스캔과 동일, 사이드카 재로드 후 앞부분 재스캔 없음,
+   앞부분이 바뀌면 (rebase 로 중간에 줄 삽입 / 같은 길이 재작성) 사이드카 무시하고 재구성
+2. send_sell_signals_batch 중복 방지 — 발송분 제외, 다른 프로세스 기록 반영, 2000자 절단 뒤 종목도 인덱스
+3. 발송 큐 — 유형별 병합 (4096자 이내, 순서 유지), 발송 간격 제한, 429 retry_after 후 재시도
+
+격리: LOG_DIR 은 임시 폴더, requests.post 는 가짜 응답 (실제 발송 없음),
+      발송 간격은 가짜 시계로 검증 (실제 대기 없음).
+
+실행:
+    python -m paper_trading.test_telegram_sent_index
+"""
+
+import json
+import re
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import telegram_notifier
+from telegram_notifier import KST, MAX_MESSAGE_LEN, TelegramNotifier
+
+
+class _FakeResponse:
+    def __init__(self, status_code=200, payload=None):
+        self.status_code = status_code
+        self._payload = payload or {"ok": status_code == 200}
+        self.text = json.dumps(self._payload)
+
+    def json(self):
+        return self._payload
+
+
+class _FakeClock:
+    """가짜 시계 — sleep 은 대기 없이 시각만 전진"""
+
+    def __init__(self, now=1_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class _FakePost:
+    """requests.post 대역 — 호출 시각 (가짜 시계) /본문 기록, statuses 순서대로 응답"""
+
+    def __init__(self, statuses=(), clock=None):
+        self.calls = []
+        self.statuses = list(statuses)
+        self.clock = clock or _FakeClock()
+
+    def __call__(self, url, json=None, timeout=None):
+        self.calls.append((self.clock.time(), json["text"]))
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status == 429:
+            return _FakeResponse(429, {"ok": False, "parameters": {"retry_after": 0.2}})
+        return _FakeResponse(status)
+
+    def __enter__(self):
+        self._orig = telegram_notifier.requests.post
+        telegram_notifier.requests.post = self
+        return self
+
+    def __exit__(self, *exc):
+        telegram_notifier.requests.post = self._orig
+
+
+def _notifier(log_dir, clock=None, **kwargs):
+    n = TelegramNotifier(bot_token="test-token", chat_id="1", **kwargs)
+    n.LOG_DIR = str(log_dir)
+    if clock is not None:
+        n._clock, n._sleep = clock.time, clock.sleep
+    return n
+
+
+def _today():
+    return datetime.now(KST).strftime("%Y-%m-%d")
+
+
+def _legacy_codes(log_file):
+    """기존 _get_today_sent_codes — 하루 jsonl 전체 정규식 스캔"""
+    sent = set()
+    with open(log_file, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry.get('type') in ('sell_profit', 'sell_loss', 'sell_batch') and entry.get('success'):
+                sent.update(re.findall(r'\((\d{6})\)', entry.get('message', '')))
+    return sent
+
+
+def _signal(code, kind='profit'):
+    return {'name': f"종목{code}", 'code': code, 'price': 12_300,
+            'signal_type': kind, 'pnl_pct': 3.1 if kind == 'profit' else -2.4}
+
+
+def test_index_matches_legacy_scan():
+    """codes 없는 기존 기록 → 정규식 구성 결과 동일, 사이드카 재로드는 앞부분 sha1 확인 후 offset 뒤만 읽음."""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / f"{_today()}.jsonl"
+        types = ['sell_profit', 'sell_loss', 'sell_batch', 'arena_report', 'healthcheck']
+        with open(log_file, 'w', encoding='utf-8') as f:
+            for i in range(300):
+                f.write(json.dumps({
+                    'type': types[i % len(types)], 'success': i % 7 != 0,
+                    'message': f"• 종목({i:06d}) 1,000원 / 참고({(i * 13) % 1000:06d})",
+                }, ensure_ascii=False) + "\n")
+        expected = _legacy_codes(log_file)
+
+        n = _notifier(tmp)
+        assert n._get_today_sent_codes() == expected
+        sidecar = Path(tmp) / f"{_today()}.sent.json"
+        saved = json.loads(sidecar.read_text(encoding='utf-8'))
+        assert saved['offset'] == log_file.stat().st_size
+        keys = n.get_sent_keys()
+        assert {code for _, code in keys} == expected
+        assert all(t in ('sell_profit', 'sell_loss', 'sell_batch') for t, _ in keys)
+
+        # 그대로 재로드 → 줄 파싱 0회
+        parsed = []
+        original = TelegramNotifier._entry_keys
+        TelegramNotifier._entry_keys = staticmethod(lambda line: parsed.append(line) or original(line))
+        try:
+            assert _notifier(tmp)._get_today_sent_codes() == expected and parsed == []
+        finally:
+            TelegramNotifier._entry_keys = staticmethod(original)
+
+        # rebase 병합처럼 앞부분에 다른 줄이 끼면 (offset 이 줄 중간) → 사이드카 무시, 재구성
+        raw = log_file.read_bytes()
+        lines = raw.splitlines(keepends=True)
+        remote = json.dumps({'type': 'sell_profit', 'success': True, 'message': "• 원격(999999)"},
+                            ensure_ascii=False).encode('utf-8') + b"\n"
+        log_file.write_bytes(b"".join(lines[:10]) + remote + b"".join(lines[10:]))
+        assert _notifier(tmp)._get_today_sent_codes() == _legacy_codes(log_file) == expected | {'999999'}
+
+        # 같은 길이로 앞부분 재작성 (크기 그대로) → 재구성
+        raw = log_file.read_bytes()
+        assert b"(000001)" in raw[:200]
+        log_file.write_bytes(raw.replace(b"(000001)", b"(888888)", 1))
+        rebuilt = _notifier(tmp)._get_today_sent_codes()
+        assert rebuilt == _legacy_codes(log_file) and '888888' in rebuilt
+
+        # jsonl 이 줄면 (재작성) 처음부터 다시 구성
+        log_file.write_text("", encoding='utf-8')
+        assert _notifier(tmp)._get_today_sent_codes() == set()
+    print(f"  [OK] 300줄 기록 → 종목 {len(expected)}개 일치, 사이드카 재로드 재스캔 없음, 앞부분 변경 시 재구성")
+
+
+def test_batch_dedup():
+    """발송분 제외, 다른 인스턴스 기록도 반영, 2000자 넘는 취합 메시지의 뒤쪽 종목도 인덱스."""
+    with tempfile.TemporaryDirectory() as tmp, _FakePost() as post:
+        n = _notifier(tmp, min_interval=0)
+        assert n.send_sell_signals_batch([_signal('000001'), _signal('000002', 'loss')])
+        assert n._get_today_sent_codes() == {'000001', '000002'}
+
+        assert n.send_sell_signals_batch([_signal('000001'), _signal('000003')])
+        assert '000001' not in post.calls[-1][1] and '(000003)' in post.calls[-1][1]
+        assert not n.send_sell_signals_batch([_signal('000002', 'loss'), _signal('000003')])
+        assert len(post.calls) == 2
+
+        # 다른 프로세스 (별도 인스턴스) 가 보낸 종목 → 덧붙은 줄만 읽어 반영
+        other = _notifier(tmp, min_interval=0)
+        other.send_sell_signal("종목", "000004", 1000, "profit", 2.0)
+        assert not n.send_sell_signals_batch([_signal('000004')])
+
+        # 취합 메시지 jsonl 기록은 2000자에서 잘림 → entry.codes 로 전 종목 기록
+        many = [_signal(f"{100 + i:06d}") for i in range(60)]
+        assert n.send_sell_signals_batch(many)
+        last = json.loads((Path(tmp) / f"{_today()}.jsonl").read_text(encoding='utf-8').splitlines()[-1])
+        assert len(last['message']) == 2000 and len(last['codes']) == 60
+        assert {s['code'] for s in many} <= _notifier(tmp)._get_today_sent_codes()
+        assert not n.send_sell_signals_batch(many[-5:])
+        assert ('sell_profit', '000004') in n.get_sent_keys()
+    print(f"  [OK] 발송 {len(post.calls)}건, 중복 차단 3회, 60종목 취합 인덱스 (2000자 절단 무관)")
+
+
+def test_queue_merge_and_rate_limit():
+    """유형별 병합 (4096자 이내, 순서), 발송 슬롯 간격 = min_interval, 429 후 retry_after 만큼 미룬 슬롯."""
+    interval = 1.0
+    clock = _FakeClock()
+    with tempfile.TemporaryDirectory() as tmp, _FakePost(clock=clock) as post:
+        n = _notifier(tmp, clock=clock, min_interval=interval)
+        texts = {'custom': [], 'healthcheck': []}  # 첫 등장 순서 (i=0 → custom)
+        for i in range(40):
+            msg_type = 'healthcheck' if i % 3 else 'custom'
+            text = f"<b>알림 {i}</b>\n" + "내용 " * 60
+            texts[msg_type].append(text.strip())
+            n.enqueue(text, msg_type=msg_type)
+        assert n.pending() == 40 and post.calls == []
+
+        stats = n.flush()
+        assert n.pending() == 0 and stats['queued'] == 40 and stats['failed'] == 0
+        bodies = [text for _, text in post.calls]
+        assert stats['sent'] == len(bodies) < 10
+        assert all(len(b) <= MAX_MESSAGE_LEN for b in bodies)
+        assert "\n\n".join(bodies) == "\n\n".join(texts['custom'] + texts['healthcheck'])
+        # 첫 발송은 즉시, 이후는 직전 슬롯 + interval (가짜 시계라 정확히 일치)
+        slots = [t - post.calls[0][0] for t, _ in post.calls]
+        assert slots == [i * interval for i in range(len(post.calls))], slots
+        assert clock.sleeps == [interval] * (len(post.calls) - 1)
+        assert n.flush() == {"queued": 0, "sent": 0, "failed": 0}
+
+    clock = _FakeClock()
+    with tempfile.TemporaryDirectory() as tmp, _FakePost(statuses=[429], clock=clock) as post:
+        n = _notifier(tmp, clock=clock, min_interval=0.05, max_retry_after=1.0)
+        assert n.send_message("재시도", msg_type="custom")
+        assert len(post.calls) == 2 and abs(post.calls[1][0] - post.calls[0][0] - 0.2) < 1e-9   # retry_after
+        log = [json.loads(line) for line in
+               (Path(tmp) / f"{_today()}.jsonl").read_text(encoding='utf-8').splitlines()]
+        assert [e['success'] for e in log] == [True]
+    print(f"  [OK] 40건 → {stats['sent']}건 병합 발송, 슬롯 간격 {interval}s, 429 재시도")
+
+
+def main():
+    print("=" * 60)
+    print("Telegram 발송 키 인덱스 / 발송 큐 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_index_matches_legacy_scan,
+        test_batch_dedup,
+        test_queue_merge_and_rate_limit,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
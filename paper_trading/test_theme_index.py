@@ -0,0 +1,286 @@
+"""
+종목 ↔ 테마 정수 코드 인덱스 (theme_index) + 증분 테마 동기화 단위 테스트.
+
+검증 항목:
+1. StockThemeIndex — 기존 _stock_to_themes.json 변환 후 항목/테마 순서 동일, npz 저장/재로드
+2. apply_theme_cap / registry._enrich_themes — 기존 JSON dict 로직과 결과 동일
+3. build_stock_to_themes_index — 중복 소속 1개로, 테마 → 종목 조회
+4. sync_theme_index — 첫 실행 전체 수집, 재실행은 목록 페이지만, 종목수 바뀐 테마만 재수집,
+   기간 경과 시 조건부 요청 (304 → 변경 없음, 인덱스 유지)
+5. load_theme_index — JSON 이 npz 기록과 다르면 재생성, 내용이 같으면 (mtime 만 변경) npz 그대로
+
+격리: 크롤러 HTTP 계층 session 을 가짜 네이버 테마 페이지로 교체 (네트워크 미사용), 캐시는 임시 폴더.
+
+실행:
+    python -m paper_trading.test_theme_index
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from naver_http import NaverHttp
+from paper_trading.utils import theme_cap
+from paper_trading.utils.naver_theme import NaverThemeCrawler
+from paper_trading.utils.theme_index import (
+    LEGACY_JSON_PATH, StockThemeIndex, invalidate_theme_index, load_theme_index,
+)
+
+THEMES = {f"{100 + i}": f"테마{i}" for i in range(12)}
+
+
+def _members(seed=0):
+    """테마별 종목 — 종목이 여러 테마에 겹치도록"""
+    rnd = random.Random(seed)
+    stocks = [f"{i:06d}" for i in range(1, 41)]
+    return {code: sorted(rnd.sample(stocks, rnd.randint(4, 10))) for code in THEMES}
+
+
+def _list_html(members):
+    rows = "".join(
+        f"<tr><td><a href='/sise/sise_group_detail.naver?type=theme&no={code}'>{name}</a></td>"
+        f"<td>+1.00%</td><td><span>+{i * 0.5:.2f}%</span></td>"
+        f"<td>{len(members[code]) - 1}</td><td>1</td><td>0</td><td>x</td><td>y</td></tr>"
+        for i, (code, name) in enumerate(THEMES.items()))
+    return f"<html><table class='type_1'><tr><th>테마명</th></tr>{rows}</table></html>"
+
+
+def _detail_html(codes):
+    rows = "".join(
+        f"<tr><td><a href='/item/main.naver?code={c}'>종목{c}</a></td><td></td>"
+        f"<td>{10000 + int(c):,}</td><td>상승 100</td><td>+1.23%</td></tr>"
+        for c in codes)
+    return f"<html><table class='type_5'><tr><th>종목명</th></tr>{rows}</table></html>"
+
+
+class _FakeResponse:
+    def __init__(self, text='', status_code=200, headers=None):
+        self.text = text
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.encoding = None
+
+
+class _FakeNaverTheme:
+    """테마 목록 (1페이지만) / 상세 페이지, 상세는 ETag 조건부 응답"""
+
+    def __init__(self, members):
+        self.members = members
+        self.calls = []
+
+    def get(self, url, headers=None, timeout=None):
+        if 'theme.naver' in url:
+            page = int(url.split('page=')[-1])
+            self.calls.append(('list', page))
+            return _FakeResponse(_list_html(self.members) if page == 1 else "<html></html>")
+        code = url.split('no=')[-1]
+        codes = self.members[code]
+        etag = f'"{code}-{len(codes)}-{hash(tuple(codes)) & 0xffff}"'
+        if (headers or {}).get('If-None-Match') == etag:
+            self.calls.append(('detail-304', code))
+            return _FakeResponse(status_code=304)
+        self.calls.append(('detail', code))
+        return _FakeResponse(_detail_html(codes), headers={'ETag': etag})
+
+    def count(self, kind):
+        return sum(1 for k, _ in self.calls if k == kind)
+
+
+def _crawler(fake, tmp):
+    return NaverThemeCrawler(cache_dir=Path(tmp), http=NaverHttp(session=fake, min_interval=0.0))
+
+
+def test_legacy_roundtrip():
+    """기존 JSON 인덱스 → 정수 코드 인덱스 → JSON 형식 왕복 동일, npz 재로드 동일."""
+    with open(LEGACY_JSON_PATH, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+    index = StockThemeIndex.from_legacy(raw)
+    assert index.to_legacy() == raw
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / '_stock_to_themes.npz'
+        index.save(path)
+        reloaded = StockThemeIndex.load(path)
+    code = next(k for k in raw if k != '_meta')
+    assert reloaded.entries(code) == raw[code]['themes'] and reloaded.stock_name(code) == raw[code]['name']
+    assert reloaded.get('999999') is None and reloaded.themes_of('999999') == []
+    theme = raw[code]['themes'][0]['code']
+    assert code in reloaded.stocks_of(theme)
+    assert all(theme in reloaded.themes_of(c) for c in reloaded.stocks_of(theme))
+    print(f"  [OK] {len(index)}종목 왕복 일치, 테마 {len(index.theme_codes)}개")
+
+
+def test_readers_match_legacy():
+    """apply_theme_cap / _enrich_themes 결과가 기존 JSON dict 로직과 같다."""
+    from paper_trading.strategies.registry import _enrich_themes
+
+    with open(LEGACY_JSON_PATH, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+    legacy = {c: [t['code'] for t in v['themes']] for c, v in raw.items() if c != '_meta'}
+
+    def legacy_cap(items, top_n, cap):
+        selected, count = [], {}
+        for code in items:
+            if len(selected) >= top_n:
+                break
+            themes = legacy.get(code, [])
+            if themes and any(count.get(t, 0) >= cap for t in themes):
+                continue
+            selected.append(code)
+            for t in themes:
+                count[t] = count.get(t, 0) + 1
+        return selected
+
+    rnd = random.Random(7)
+    pool = list(legacy) + ['999999', '888888']
+    for trial in range(50):
+        items = rnd.sample(pool, 40)
+        cap = 1 + trial % 3
+        got = theme_cap.apply_theme_cap(items, lambda c: c, top_n=10, max_per_theme=cap)
+        assert got == legacy_cap(items, 10, cap), trial
+
+    for code in rnd.sample(list(legacy), 30) + ['999999']:
+        c = {'code': code}
+        _enrich_themes(c)
+        assert c.get('themes') == (raw[code]['themes'] if code in raw else None)
+    print("  [OK] 캡 50회·테마 주입 30건 일치")
+
+
+def test_build_index():
+    """테마 캐시 → 인덱스: 중복 소속 1개, 종목별 테마는 theme_list 순서, JSON/npz 동시 저장."""
+    members = _members()
+    members['100'] = members['100'] + members['100'][:2]          # 페이지 중복 행
+    fake = _FakeNaverTheme(members)
+    with tempfile.TemporaryDirectory() as tmp:
+        crawler = _crawler(fake, tmp)
+        result = crawler.build_stock_to_themes_index(refresh_missing=True)
+        assert fake.count('detail') == len(THEMES)
+        index = load_theme_index(Path(tmp) / '_stock_to_themes.npz')
+        with open(Path(tmp) / '_stock_to_themes.json', encoding='utf-8') as f:
+            assert json.load(f) == result
+    assert result['_meta']['themes_with_stocks'] == len(THEMES)
+    for theme, codes in members.items():
+        assert index.stocks_of(theme) == sorted(set(codes))
+    order = list(THEMES)
+    for code in index.stock_codes.tolist():
+        themes = index.themes_of(code)
+        assert themes == sorted(themes, key=order.index) and len(themes) == len(set(themes))
+        assert result[code]['themes'] == index.entries(code)
+    print(f"  [OK] 테마 {len(THEMES)}개 → {len(index)}종목, 중복 제거")
+
+
+def test_incremental_sync():
+    """첫 동기화 전체 → 재실행 목록만 → 바뀐 테마만 → 기간 경과 시 304."""
+    members = _members()
+    fake = _FakeNaverTheme(members)
+    with tempfile.TemporaryDirectory() as tmp:
+        first = _crawler(fake, tmp).sync_theme_index()
+        assert first['checked'] == len(THEMES) and first['changed'] == len(THEMES) and first['rebuilt']
+        assert fake.count('detail') == len(THEMES)
+
+        # 새 프로세스: 종목수 그대로 → 상세 요청 0, 인덱스 유지
+        fake.calls.clear()
+        crawler = _crawler(fake, tmp)
+        again = crawler.sync_theme_index()
+        assert again['checked'] == 0 and not again['rebuilt']
+        assert fake.count('detail') == 0 and fake.count('list') == 5
+
+        # 테마 1개 구성 변경 → 그 테마만
+        members['103'] = members['103'] + ['000099']
+        fake.calls.clear()
+        changed = crawler.sync_theme_index()
+        assert changed['checked'] == 1 and changed['changed'] == 1 and changed['rebuilt']
+        assert [c for k, c in fake.calls if k == 'detail'] == ['103']
+        index = load_theme_index(Path(tmp) / '_stock_to_themes.npz')
+        assert '103' in index.themes_of('000099')
+
+        # 보관 기간 경과 → 전체 조건부 요청, 모두 304 → 재생성 없음
+        fake.calls.clear()
+        stale = crawler.sync_theme_index(max_age_days=0)
+        assert stale['checked'] == len(THEMES) and stale['changed'] == 0 and not stale['rebuilt']
+        assert fake.count('detail-304') == len(THEMES) and fake.count('detail') == 0
+
+        # ThemePolicy 경로: 인덱스가 최신이면 테마 페이지 요청 없음
+        fake.calls.clear()
+        theme = next(t for t in crawler.get_theme_list() if t['code'] == '105')
+        assert crawler.get_theme_members(theme) == members['105']
+        assert fake.count('detail') == 0
+    print(f"  [OK] 전체 {len(THEMES)} → 0 → 1 (변경) → 304×{len(THEMES)}")
+
+
+def test_stale_npz_rebuilt():
+    """JSON 이 바뀌면 (git pull 등) npz 재생성, mtime 만 바뀌면 sha1 일치로 npz 사용."""
+    with open(LEGACY_JSON_PATH, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+    codes = [k for k in raw if k != '_meta'][:20]
+    small = {'_meta': raw['_meta'], **{c: raw[c] for c in codes}}
+
+    conversions = []
+    original = StockThemeIndex.from_legacy
+    StockThemeIndex.from_legacy = classmethod(lambda cls, r: conversions.append(1) or original(r))
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            npz, legacy = Path(tmp) / '_stock_to_themes.npz', Path(tmp) / '_stock_to_themes.json'
+            legacy.write_text(json.dumps(small, ensure_ascii=False), encoding='utf-8')
+            assert len(load_theme_index(npz)) == 20 and npz.exists() and len(conversions) == 1
+
+            invalidate_theme_index([npz])
+            st = legacy.stat()
+            os.utime(legacy, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))   # checkout 처럼 mtime 만
+            assert len(load_theme_index(npz)) == 20 and len(conversions) == 1
+
+            del small[codes[0]]
+            legacy.write_text(json.dumps(small, ensure_ascii=False), encoding='utf-8')
+            invalidate_theme_index([npz])
+            index = load_theme_index(npz)
+            assert len(index) == 19 and codes[0] not in index and len(conversions) == 2
+            invalidate_theme_index([npz])
+            assert len(load_theme_index(npz)) == 19 and len(conversions) == 2   # 재생성본 기록 일치
+            invalidate_theme_index([npz])
+    finally:
+        StockThemeIndex.from_legacy = original
+    print("  [OK] JSON 변경 시 재생성, mtime 만 바뀌면 변환 0회")
+
+
+def main():
+    print("=" * 60)
+    print("종목↔테마 인덱스 / 증분 테마 동기화 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_legacy_roundtrip,
+        test_readers_match_legacy,
+        test_build_index,
+        test_incremental_sync,
+        test_stale_npz_rebuilt,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+KRX 거래일 캘린더 인덱스 (trading_calendar) 단위 테스트.
+
+검증 항목:
+1. trading_days — 평일마다 KRX 지수 조회하던 기존 get_trading_days 와 같은 결과, KRX 조회 0회
+2. prev/next_trading_day(n), last_trading_day — 거래일 목록 직접 탐색과 동일, 범위 밖 자동 확장
+3. 저장/재로드 — 같은 날 재생성 없이 로드, 재구축은 올해 이후만 규칙 재계산 (지난 연도 고정),
+   observe 로 기록한 휴장 확정은 재구축 후에도 유지
+4. settled_trading_days — 규칙이 틀려도 (오프라인 폴백 설 연휴 누락) 확정 날짜만, 미확정은 probe 1회,
+   probe 조회 실패 (None / non-200 / 예외) 는 휴장으로 기록하지 않음, 이전 형식 휴장 확정은 버림
+5. _prev_business_day (arena) — 캘린더 인덱스 사용, 주말/공휴일/연말 휴장일 건너뜀
+
+격리: 인덱스 파일/KRX 캐시/패널 폴더는 임시 폴더, 프로세스 공용 캘린더는 테스트 동안 교체.
+
+실행:
+    python -m paper_trading.test_trading_calendar
+"""
+
+import json
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_trading.utils import trading_calendar as tc
+from paper_trading.utils.trading_calendar import TradingCalendar, rule_trading_days
+
+
+def _calendar(tmp, **kwargs):
+    tmp = Path(tmp)
+    return TradingCalendar(path=tmp / '_trading_calendar.npz', cache_dir=tmp / 'krx_cache',
+                           panel_dir=tmp / 'krx_panel', **kwargs)
+
+
+def _weekdays(start, end):
+    cur = datetime.strptime(start, '%Y%m%d')
+    end_dt = datetime.strptime(end, '%Y%m%d')
+    while cur <= end_dt:
+        if cur.weekday() < 5:
+            yield cur.strftime('%Y%m%d')
+        cur += timedelta(days=1)
+
+
+class _FakeIndexKRX:
+    """실제 거래일에만 지수 행이 있는 KRX (조회 횟수 기록)"""
+
+    def __init__(self, open_days):
+        self.open_days = set(open_days)
+        self.calls = 0
+
+    def get_index_ohlcv(self, date, market='KOSPI'):
+        self.calls += 1
+        return [{'지수명': '코스피'}] if date in self.open_days else []
+
+    def has_trading_data(self, date, market='KOSPI', kind='index'):
+        return bool(self.get_index_ohlcv(date, market))
+
+
+class _FakeResponse:
+    def __init__(self, status_code, rows=None):
+        self.status_code = status_code
+        self.text = ''
+        self._rows = rows
+
+    def json(self):
+        return {'OutBlock_1': self._rows or []}
+
+
+def _legacy_trading_days(krx, start, end):
+    """기존 get_trading_days — 평일마다 지수 조회"""
+    return [d for d in _weekdays(start, end) if krx.get_index_ohlcv(d, 'KOSPI')]
+
+
+def test_parity_with_index_probe():
+    """규칙 + KRX 캐시 확정으로 만든 거래일 = 평일 지수 조회 결과."""
+    start, end = '20250101', '20251231'
+    truth = {d.strftime('%Y%m%d') for d in rule_trading_days(2025)}
+    extra_open = '20250606'                # 규칙상 휴장 (현충일) — KRX 캐시에 데이터가 있으면 개장
+    assert extra_open not in truth
+    truth.add(extra_open)
+    krx = _FakeIndexKRX(truth)
+    legacy = _legacy_trading_days(krx, start, end)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = Path(tmp) / 'krx_cache'
+        cache.mkdir()
+        for d in sorted(truth)[-40:] + [extra_open]:
+            (cache / f"index_KOSPI_{d}.json").write_text('[{"IDX_NM": "코스피"}]', encoding='utf-8')
+        (cache / "base_KOSPI_20250503.json").write_text('[{}]', encoding='utf-8')   # 기본정보는 확정 아님
+        panel = Path(tmp) / 'krx_panel' / 'KOSPI'
+        panel.mkdir(parents=True)
+        (panel / 'meta.json').write_text(json.dumps({'dates': sorted(truth)[:5], 'codes': []}))
+
+        cal = _calendar(tmp)
+        calls = krx.calls
+        days = cal.trading_days(start, end)
+    assert days == legacy, (len(days), len(legacy))
+    assert krx.calls == calls
+    assert cal.is_trading_day(extra_open) and cal.is_confirmed(extra_open)
+    assert not cal.is_trading_day('20250503') and not cal.is_confirmed(sorted(truth)[100])
+    assert cal.is_confirmed(sorted(truth)[0])
+    assert not cal.is_trading_day('20251231') and not cal.is_trading_day('20250501')
+    print(f"  [OK] {len(days)}거래일 일치 (기존 지수 조회 {calls}회 → 0회)")
+
+
+def test_prev_next_lookup():
+    """prev/next(n)·last·구간 조회가 거래일 목록 직접 탐색과 같다, 범위 밖은 확장."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cal = _calendar(tmp, first_year=2024, last_year=2026)
+        days = cal.trading_days('20240101', '20261231')
+        rnd = random.Random(3)
+        for _ in range(300):
+            d = (datetime(2024, 3, 1) + timedelta(days=rnd.randint(0, 900))).strftime('%Y%m%d')
+            n = rnd.randint(1, 30)
+            before = [x for x in days if x < d]
+            after = [x for x in days if x > d]
+            assert cal.prev_trading_day(d, n) == before[-n], (d, n)
+            if len(after) >= n:
+                assert cal.next_trading_day(d, n) == after[n - 1], (d, n)
+            assert cal.last_trading_day(d) == (d if d in days else before[-1])
+            e = (datetime.strptime(d, '%Y%m%d') + timedelta(days=rnd.randint(0, 60))).strftime('%Y%m%d')
+            assert cal.trading_days(d, e) == [x for x in days if d <= x <= e]
+        assert cal.trading_days('20250110', '20250101') == []
+
+        # 범위 앞쪽으로 확장: 2024-01-02 이전 3번째 거래일 = 2023 년 말 (12-29 연말 휴장)
+        assert cal.prev_trading_day('20240102', 3) == '20231226'
+        assert cal.trading_days('20231225', '20240103') == ['20231226', '20231227', '20231228', '20240102', '20240103']
+        assert cal.next_trading_day('20261230', 1) == cal.trading_days('20270101', '20270131')[0]
+    print("  [OK] 300회 무작위 조회 일치, 범위 확장 (2023 / 2027)")
+
+
+def test_persist_and_observe():
+    """같은 날 재생성 없이 로드, 휴장 확정은 재구축 후에도 유지, 당일 빈 응답은 무시."""
+    holidays_calls = []
+    original = tc._get_holidays
+    tc._get_holidays = lambda year: holidays_calls.append(year) or original(year)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cal = _calendar(tmp, first_year=2025, last_year=2026)
+            assert holidays_calls == [2025, 2026]
+            target = '20250715'
+            assert cal.is_trading_day(target)
+            cal.observe(target, False)
+            assert not cal.is_trading_day(target) and target not in cal.trading_days('20250714', '20250716')
+            today = tc.get_kst_now().strftime('%Y%m%d')
+            cal.observe(today, False)                      # 업로드 전일 수 있음 → 기록 안 함
+
+            holidays_calls.clear()
+            reloaded = _calendar(tmp, first_year=2025, last_year=2026)
+            assert holidays_calls == []                    # 오늘 구축본 로드
+            assert not reloaded.is_trading_day(target)
+            assert reloaded.trading_days('20250101', '20261231') == cal.trading_days('20250101', '20261231')
+
+            reloaded.refresh()                             # 다음 날 재구축과 같은 경로 — 지난 연도는 고정
+            this_year = tc.get_kst_now().year
+            assert holidays_calls == [y for y in (2025, 2026) if y >= this_year], holidays_calls
+            assert not reloaded.is_trading_day(target)
+            reloaded.observe(target, True)
+            assert reloaded.is_trading_day(target) and reloaded.is_confirmed(target)
+            assert _calendar(tmp, first_year=2025, last_year=2026).is_trading_day(target)
+    finally:
+        tc._get_holidays = original
+    print("  [OK] 재로드 시 공휴일 조회 0회, 재구축은 올해 이후만, 휴장/개장 확정 유지")
+
+
+def test_settled_requires_confirmation():
+    """오프라인 폴백 (2020 설 연휴 없음) 규칙이어도 백테스트 거래일은 확정/probe 결과만."""
+    original = tc._get_holidays
+    tc._get_holidays = lambda year: {'01-01', '03-01', '05-05', '06-06', '08-15', '10-03', '10-09', '12-25'}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = Path(tmp) / 'krx_cache'
+            cache.mkdir()
+            for d in ('20200120', '20200121'):
+                (cache / f"index_KOSPI_{d}.json").write_text('[{"IDX_NM": "코스피"}]', encoding='utf-8')
+            cal = _calendar(tmp, first_year=2020, last_year=2020)
+            start, end = '20200120', '20200131'
+            assert {'20200124', '20200127'} <= set(cal.trading_days(start, end))   # 규칙 오류 재현
+
+            assert cal.settled_trading_days(start, end) == ['20200120', '20200121']   # probe 없음 → 확정만
+
+            truth = [d for d in _weekdays(start, end) if d not in ('20200124', '20200127')]
+            krx = _FakeIndexKRX(truth)
+            # 조회 실패 (KRXClient.has_trading_data → None) 는 휴장으로 기록하지 않고 제외만
+            assert cal.settled_trading_days(start, end, probe=lambda d: None) == ['20200120', '20200121']
+            assert not cal.is_confirmed('20200122')
+            probe = krx.has_trading_data
+            assert cal.settled_trading_days(start, end, probe=probe) == truth
+            assert krx.calls == 8                                                   # 미확정 평일만
+            assert cal.settled_trading_days(start, end, probe=probe) == truth and krx.calls == 8
+            assert not cal.is_trading_day('20200124')
+
+            def failing(d):
+                raise ConnectionError("offline")
+            assert cal.settled_trading_days('20200203', '20200207', probe=failing) == []
+            assert not cal.is_confirmed('20200203')                                 # 실패는 기록 안 함
+            assert _calendar(tmp, first_year=2020, last_year=2020).settled_trading_days(start, end) == truth
+    finally:
+        tc._get_holidays = original
+    print("  [OK] 규칙 오류 날짜 (2020-01-24/27) 제외, probe 8회 후 재조회 0회, 실패 날짜 제외")
+
+
+def test_probe_failure_not_closed():
+    """KRXClient.has_trading_data — 200 빈 응답만 False, non-200/예외는 None. 이전 형식 휴장 확정은 버림."""
+    from paper_trading.utils.krx_api import KRXClient
+
+    client = KRXClient(api_key='test', use_cache=False)
+    client.RATE_LIMIT_SLEEP = 0
+    responses = {'20200122': _FakeResponse(200, [{'IDX_NM': '코스피'}]),
+                 '20200123': _FakeResponse(200, []),
+                 '20200124': _FakeResponse(503)}
+
+    def fake_get(url, params=None, timeout=None):
+        if params['basDd'] not in responses:
+            raise TimeoutError("timeout")
+        return responses[params['basDd']]
+    client.session.get = fake_get
+    assert [client.has_trading_data(d) for d in ('20200122', '20200123', '20200124', '20200128')] == \
+        [True, False, None, None]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cal = _calendar(tmp, first_year=2020, last_year=2020)
+        got = cal.settled_trading_days('20200122', '20200128', probe=client.has_trading_data)
+        assert got == ['20200122'], got
+        assert '20200123' in cal._confirmed_closed and not cal.is_trading_day('20200123')
+        assert not {'20200124', '20200128'} & (cal._confirmed_open | cal._confirmed_closed)   # 실패 → 다음에 다시 확인
+
+        # 이전 형식 (closed_verified 없음) 파일 — 실패가 휴장으로 기록됐을 수 있으므로 휴장 확정 버림
+        cal.observe('20200715', False)
+        with tc.np.load(cal.path) as npz:
+            legacy = {k: npz[k] for k in npz.files if k != 'closed_verified'}
+        with open(cal.path, 'wb') as f:
+            tc.np.savez(f, **legacy)
+        reloaded = _calendar(tmp, first_year=2020, last_year=2020)
+        assert reloaded.is_trading_day('20200715') and not reloaded._confirmed_closed
+        assert reloaded.is_confirmed('20200122')
+    print("  [OK] 200 빈 응답만 휴장 확정, 503/timeout 은 미확정 유지, 이전 형식 휴장 확정 폐기")
+
+
+def test_arena_prev_business_day():
+    """_prev_business_day 가 공용 캘린더로 주말·공휴일·연말 휴장일을 건너뛴다."""
+    from paper_trading.arena.arena_manager import _prev_business_day
+
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = tc._calendar
+        tc._calendar = _calendar(tmp, first_year=2025, last_year=2026)
+        try:
+            assert _prev_business_day('20260525') == '20260522'     # 월 (대체공휴일) → 금
+            assert _prev_business_day('20260526') == '20260522'     # 부처님오신날 대체공휴일 건너뜀
+            assert _prev_business_day('20260102') == '20251230'     # 신정 + 연말 휴장일
+            assert _prev_business_day('20260504') == '20260430'     # 근로자의 날
+        finally:
+            tc._calendar = saved
+    print("  [OK] 주말/공휴일/연말/근로자의 날 건너뜀")
+
+
+def main():
+    print("=" * 60)
+    print("KRX 거래일 캘린더 인덱스 단위 테스트")
+    print("=" * 60)
+
+    tests = [
+        test_parity_with_index_probe,
+        test_prev_next_lookup,
+        test_persist_and_observe,
+        test_settled_requires_confirmation,
+        test_probe_failure_not_closed,
+        test_arena_prev_business_day,
+    ]
+    passed = 0
+    failed = []
+    for t in tests:
+        try:
+            print(f"\n[테스트] {t.__name__}")
+            t()
+            passed += 1
+        except AssertionError as e:
+            print(f"  [FAIL] {e}")
+            failed.append((t.__name__, str(e)))
+        except Exception as e:
+            print(f"  [ERROR] {type(e).__name__}: {e}")
+            failed.append((t.__name__, f"{type(e).__name__}: {e}"))
+
+    print(f"\n{'=' * 60}")
+    print(f"결과: {passed}/{len(tests)} 통과")
+    if failed:
+        print("실패:")
+        for name, msg in failed:
+            print(f"  - {name}: {msg}")
+        sys.exit(1)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+원자적 파일 저장 / JSON 읽기 공용 유틸
+
+저장은 같은 폴더의 tempfile ({파일명}.tmp.XXXX) 에 쓴 뒤 os.replace 로 교체한다.
+쓰는 도중 프로세스가 죽거나 다른 프로세스가 동시에 읽어도 이전 파일 또는 새 파일 전체만 보인다.
+실패하면 임시 파일을 지우고 예외를 그대로 올린다 (로그/무시는 호출측 판단).
+
+사용:
+    write_json_atomic(path, data, separators=(',', ':'))
+    with atomic_open(path, 'wb') as f:
+        np.savez(f, ...)
+    data = read_json(path)          # 없거나 깨졌으면 None
+"""
+
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, IO, Iterator, Union
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+
+@contextmanager
+def atomic_open(path: PathLike, mode: str = 'w') -> Iterator[IO]:
+    """원자 저장용 파일 핸들 — with 블록이 정상 종료되면 path 로 교체, 예외면 임시 파일 삭제
+
+    Args:
+        mode: 'w' (텍스트, utf-8) 또는 'wb'
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=path.name + ".tmp.")
+    try:
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else 'utf-8') as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def write_json_atomic(path: PathLike, data: Any, **dump_kwargs) -> None:
+    """JSON 원자 저장. dump_kwargs 는 json.dump 인자 (ensure_ascii 기본 False)"""
+    dump_kwargs.setdefault('ensure_ascii', False)
+    with atomic_open(path) as f:
+        json.dump(data, f, **dump_kwargs)
+
+
+def read_json(path: PathLike, default: Any = None) -> Any:
+    """JSON 읽기 — 파일이 없거나 깨졌으면 default (깨진 경우 debug 로그)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except Exception as e:
+        logger.debug(f"JSON 로드 실패 {path}: {e}")
+        return default
+
+
+__all__ = [
+    'atomic_open',
+    'write_json_atomic',
+    'read_json',
+]
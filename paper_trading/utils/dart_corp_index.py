@@ -0,0 +1,170 @@
+"""
+DART 고유번호 인덱스 (종목코드 → corp_code)
+
+- DART corpCode.xml (zip, 전체 법인 약 10만 건) 을 한 번 내려받아 상장사만 추려
+  data/dart_cache/corp_codes.json 으로 보관
+- 로드 후 조회는 dict 1회 (회사별 API 호출 없음)
+- 보관 기간(기본 30일)이 지나면 다음 ensure() 에서 다시 내려받음
+  (신규 상장사는 그 사이 조회되지 않음 → 호출부는 None 처리)
+
+사용 예:
+    index = get_corp_index()
+    index.ensure(api_key)
+    index.corp_code('005930')     # '00126380'
+"""
+
+import io
+import json
+import logging
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from .atomic_io import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+CORP_INDEX_PATH = Path(__file__).parent.parent.parent / "data" / "dart_cache" / "corp_codes.json"
+CORP_CODE_URL = "https://opendart.fss.or.kr/api/corpCode.xml"
+
+# 인덱스 보관 기간 (일)
+MAX_AGE_DAYS = 30
+
+
+def parse_corp_codes(payload: bytes) -> Dict[str, Tuple[str, str]]:
+    """corpCode.xml 응답 (zip 또는 XML 원문) → {종목코드: (corp_code, corp_name)}
+
+    stock_code 가 비어 있는 비상장 법인은 제외.
+    """
+    if payload[:2] == b'PK':
+        with zipfile.ZipFile(io.BytesIO(payload)) as zf:
+            name = next(n for n in zf.namelist() if n.lower().endswith('.xml'))
+            payload = zf.read(name)
+
+    codes: Dict[str, Tuple[str, str]] = {}
+    for _, elem in ET.iterparse(io.BytesIO(payload)):
+        if elem.tag != 'list':
+            continue
+        stock_code = (elem.findtext('stock_code') or '').strip()
+        if stock_code:
+            codes[stock_code] = ((elem.findtext('corp_code') or '').strip(),
+                                 (elem.findtext('corp_name') or '').strip())
+        elem.clear()
+    return codes
+
+
+class DartCorpIndex:
+    """상장사 종목코드 ↔ DART 고유번호 인덱스 (디스크 보관)"""
+
+    def __init__(self, path: Optional[Path] = None, max_age_days: int = MAX_AGE_DAYS):
+        self.path = Path(path or CORP_INDEX_PATH)
+        self.max_age_days = max_age_days
+        self.updated: Optional[str] = None      # YYYYMMDD
+        self._lock = threading.Lock()
+        self._by_stock: Dict[str, Tuple[str, str]] = {}
+        self._by_corp: Dict[str, str] = {}
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._by_stock)
+
+    # ─────────────────────────────────────
+    # 조회
+    # ─────────────────────────────────────
+
+    def corp_code(self, stock_code: str) -> Optional[str]:
+        entry = self._by_stock.get(stock_code.replace('A', ''))
+        return entry[0] if entry else None
+
+    def corp_name(self, stock_code: str) -> Optional[str]:
+        entry = self._by_stock.get(stock_code.replace('A', ''))
+        return entry[1] if entry else None
+
+    def stock_code(self, corp_code: str) -> Optional[str]:
+        return self._by_corp.get(corp_code)
+
+    def is_stale(self, today: Optional[str] = None) -> bool:
+        if not self._by_stock or not self.updated:
+            return True
+        today_dt = datetime.strptime(today, '%Y%m%d') if today else datetime.now()
+        return today_dt - datetime.strptime(self.updated, '%Y%m%d') > timedelta(days=self.max_age_days)
+
+    # ─────────────────────────────────────
+    # 갱신
+    # ─────────────────────────────────────
+
+    def ensure(self, api_key: str) -> bool:
+        """비어 있거나 오래됐으면 갱신. 갱신 실패 시 기존 인덱스 유지. 사용 가능 여부 반환"""
+        if self.is_stale() and api_key:
+            with self._lock:
+                if self.is_stale():
+                    try:
+                        self.refresh(api_key)
+                    except Exception as e:
+                        logger.warning(f"DART 고유번호 인덱스 갱신 실패: {e}")
+        return bool(self._by_stock)
+
+    def refresh(self, api_key: str, timeout: int = 60) -> int:
+        """corpCode.xml 다운로드 → 인덱스 교체 + 저장. 상장사 수 반환"""
+        response = requests.get(CORP_CODE_URL, params={'crtfc_key': api_key}, timeout=timeout)
+        response.raise_for_status()
+        codes = parse_corp_codes(response.content)
+        if not codes:
+            # 키 오류 등은 zip 대신 status XML 이 온다
+            raise ValueError(f"corpCode.xml 파싱 결과 없음: {response.content[:200]!r}")
+        self.update(codes)
+        return len(codes)
+
+    def update(self, codes: Dict[str, Tuple[str, str]], updated: Optional[str] = None) -> None:
+        self._by_stock = dict(codes)
+        self._by_corp = {corp: stock for stock, (corp, _) in self._by_stock.items()}
+        self.updated = updated or datetime.now().strftime('%Y%m%d')
+        self._save()
+
+    # ─────────────────────────────────────
+    # 내부: 디스크 I/O
+    # ─────────────────────────────────────
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            by_stock = {s: (c, n) for s, (c, n) in data['codes'].items()}
+        except Exception as e:
+            logger.warning(f"DART 고유번호 인덱스 로드 실패, 재구성: {e}")
+            return
+        self._by_stock = by_stock
+        self._by_corp = {corp: stock for stock, (corp, _) in by_stock.items()}
+        self.updated = data.get('updated')
+
+    def _save(self) -> None:
+        write_json_atomic(self.path, {'updated': self.updated,
+                                      'codes': {s: list(v) for s, v in self._by_stock.items()}})
+
+
+_corp_index: Optional[DartCorpIndex] = None
+_corp_index_lock = threading.Lock()
+
+
+def get_corp_index() -> DartCorpIndex:
+    """프로세스 공용 DartCorpIndex"""
+    global _corp_index
+    with _corp_index_lock:
+        if _corp_index is None:
+            _corp_index = DartCorpIndex()
+        return _corp_index
+
+
+__all__ = [
+    'DartCorpIndex',
+    'get_corp_index',
+    'parse_corp_codes',
+    'CORP_INDEX_PATH',
+]
@@ -3,6 +3,9 @@ DART API 유틸리티 모듈
 - 공시 정보 수집 및 필터링
 - 재무 건전성 체크
 - 전략 통합용 인터페이스
+- 일괄 모드: 기간 전체 공시를 페이지 단위로 한 번 수집 → 날짜별 캐시 + 종목코드 인덱스
+  (후보 리스트 부정 공시 체크에 회사별 요청 없음)
+- 완결된 날짜 공시는 DisclosureStore (접수일 파티션) 에 보관 → 프로세스/백테스트 간 재사용
 """
 
 import os
@@ -16,6 +19,14 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
 import re
 
+from .dart_corp_index import get_corp_index
+from .disclosure_store import DisclosureStore, get_disclosure_store
+
+# list.json 페이지당 최대 건수 (DART 제한)
+PAGE_COUNT = 100
+# 회사 미지정 list.json 조회 가능 기간 (DART 제한 3개월)
+MAX_RANGE_DAYS = 90
+
 
 @dataclass
 class DisclosureInfo:
@@ -127,15 +138,18 @@ class DartFilter:
     # rcept_dt가 어제(전일)면 1.5x — 시초가 매수 가능 시간대
     FRESHNESS_BONUS_MULT = 1.5
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, store: DisclosureStore = None):
         """
         Args:
             api_key: DART API 키. 없으면 환경변수에서 가져옴
+            store: 공시 이력 저장소. 없으면 프로세스 공용 저장소
         """
         self.api_key = api_key or os.environ.get('DART_API_KEY', '')
         self.base_url = 'https://opendart.fss.or.kr/api'
-        self._cache = {}  # 공시 캐시
-        self._corp_code_cache = {}  # 회사코드 캐시
+        self._cache = {}  # 공시 캐시 (disc_<날짜> = 그날 전체 공시)
+        self._stock_index = {}  # {날짜: {종목코드: [공시, ...]}}
+        self._corp_index = None  # 회사코드 인덱스 (지연 로드)
+        self._store = store or get_disclosure_store()
 
         if not self.api_key:
             print("  [DART] 경고: DART_API_KEY가 설정되지 않았습니다.")
@@ -185,33 +199,117 @@ class DartFilter:
         return positive
 
     def _fetch_disclosures(self, date: str) -> List[Dict]:
-        """특정 날짜의 공시 가져오기"""
+        """특정 날짜의 공시 가져오기 (전체 페이지)"""
+        if not self._load_day(date):
+            self._fetch_range(date, date)
+        return self._cache.get(f"disc_{date}", [])
+
+    def _load_day(self, date: str) -> bool:
+        """메모리 캐시 → 저장소 순으로 그날 전체 공시 확보 (없으면 False, fetch 안 함)"""
         cache_key = f"disc_{date}"
         if cache_key in self._cache:
-            return self._cache[cache_key]
+            return True
+        items = self._store.get(date)
+        if items is None:
+            return False
+        self._cache[cache_key] = items
+        return True
 
+    def _fetch_list(self, params: Dict) -> Optional[List[Dict]]:
+        """list.json 전체 페이지 조회. 실패 시 None (부분 결과는 캐시하지 않도록)"""
         url = f"{self.base_url}/list.json"
-        params = {
-            'crtfc_key': self.api_key,
-            'bgn_de': date,
-            'end_de': date,
-            'page_count': 100
-        }
-
-        try:
-            response = requests.get(url, params=params, timeout=10)
+        items = []
+        page_no = 1
+        while True:
+            response = requests.get(url, params={**params, 'crtfc_key': self.api_key,
+                                                 'page_no': page_no,
+                                                 'page_count': PAGE_COUNT}, timeout=10)
             data = response.json()
-
-            if data.get('status') == '000':
-                result = data.get('list', [])
-                self._cache[cache_key] = result
-                return result
+            status = data.get('status')
+            if status == '013':  # 조회된 데이터 없음
+                return items
+            if status != '000':
+                print(f"  [DART] 공시 목록 오류 ({status}): {data.get('message', '')}")
+                return None
+            items.extend(data.get('list', []))
+            if page_no >= int(data.get('total_page') or 1):
+                return items
+            page_no += 1
+
+    def _fetch_range(self, start_date: str, end_date: str) -> bool:
+        """기간 전체 공시를 한 번에 페이지 수집 → 날짜별 캐시 채움 (공시 없는 날은 빈 리스트)
+
+        완결된 날짜(오늘 이전)는 저장소에도 기록.
+        """
+        start_dt = datetime.strptime(start_date, '%Y%m%d')
+        end_dt = datetime.strptime(end_date, '%Y%m%d')
+        while start_dt <= end_dt:
+            chunk_end = min(end_dt, start_dt + timedelta(days=MAX_RANGE_DAYS - 1))
+            bgn, end = start_dt.strftime('%Y%m%d'), chunk_end.strftime('%Y%m%d')
+            try:
+                items = self._fetch_list({'bgn_de': bgn, 'end_de': end})
+            except Exception as e:
+                print(f"  [DART] 공시 조회 실패 ({bgn}~{end}): {e}")
+                items = None
+            if items is None:
+                return False
+
+            by_date = {d: [] for d in _date_range(bgn, end)}
+            for disc in items:
+                by_date.setdefault(disc.get('rcept_dt', ''), []).append(disc)
+            for date, day_items in by_date.items():
+                if date:
+                    self._cache[f"disc_{date}"] = day_items
+                    self._stock_index.pop(date, None)
+                    self._store.put(date, day_items)
+            start_dt = chunk_end + timedelta(days=1)
+        return True
+
+    def disclosures_by_stock(self, start_date: str, end_date: str) -> Dict[str, List[Dict]]:
+        """기간 공시의 종목코드 인덱스 {종목코드: [공시, ...]}
+
+        캐시에 없는 날짜 구간만 한 번에 일괄 수집 (회사별 요청 없음).
+        """
+        dates = _date_range(start_date, end_date)
+        missing = [d for d in dates if not self._load_day(d)]
+        if missing and self.is_available():
+            self._fetch_range(missing[0], missing[-1])
+
+        index: Dict[str, List[Dict]] = {}
+        for date in dates:
+            if f"disc_{date}" not in self._cache:
+                continue
+            day_index = self._stock_index.get(date)
+            if day_index is None:
+                day_index = self._store.by_stock(date)
+            if day_index is None:
+                day_index = {}
+                for disc in self._cache[f"disc_{date}"]:
+                    code = disc.get('stock_code', '').replace('A', '')
+                    if code:
+                        day_index.setdefault(code, []).append(disc)
+            self._stock_index[date] = day_index
+            for code, items in day_index.items():
+                index.setdefault(code, []).extend(items)
+        return index
+
+    def sync_disclosures(self, start_date: str, end_date: str) -> int:
+        """저장소에 없는 완결된 날짜만 연속 구간별로 일괄 수집 (증분 동기화). 수집한 날짜 수 반환
+
+        백테스트 시작 전 한 번 호출하면 기간 내 select_stocks 는 로컬 조회만 한다.
+        """
+        if not self.is_available():
+            return 0
+        today = datetime.now().strftime('%Y%m%d')
+        missing = self._store.missing_dates(
+            d for d in _date_range(start_date, min(end_date, today)) if d < today)
+        runs: List[List[str]] = []
+        for date in missing:
+            if runs and _next_day(runs[-1][-1]) == date:
+                runs[-1].append(date)
             else:
-                return []
-
-        except Exception as e:
-            print(f"  [DART] 공시 조회 실패 ({date}): {e}")
-            return []
+                runs.append([date])
+        return sum(len(run) for run in runs if self._fetch_range(run[0], run[-1]))
 
     def _filter_by_time(self, disclosures: List[Dict], target_date: str = None) -> List[Dict]:
         """
@@ -347,32 +445,54 @@ class DartFilter:
             print(f"  [DART] 금액 추출 오류: {e}")
             return 0
 
-    def check_negative_disclosure(self, stock_code: str, days_back: int = 7) -> bool:
+    def _is_negative(self, report_nm: str) -> bool:
+        return any(neg in report_nm for neg in self.NEGATIVE_KEYWORDS)
+
+    def _check_window(self, days_back: int, target_date: str = None) -> Tuple[str, str]:
+        end_dt = datetime.strptime(target_date, '%Y%m%d') if target_date else datetime.now()
+        return (end_dt - timedelta(days=days_back)).strftime('%Y%m%d'), end_dt.strftime('%Y%m%d')
+
+    def check_negative_disclosure(self, stock_code: str, days_back: int = 7,
+                                  target_date: str = None) -> bool:
         """
         부정적 공시 여부 체크
 
         Args:
             stock_code: 종목코드 (6자리)
             days_back: 며칠 전까지 체크할지
+            target_date: 기준일 (YYYYMMDD). None이면 오늘.
 
         Returns:
             부정적 공시가 있으면 True
+
+        기간 공시가 이미 일괄 수집돼 있으면 캐시에서 판정, 아니면 회사별 조회.
+        여러 종목은 check_negative_disclosures 사용.
         """
         if not self.is_available():
             return False
 
-        # 최근 공시 가져오기
-        end_date = datetime.now().strftime('%Y%m%d')
-        start_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y%m%d')
+        start_date, end_date = self._check_window(days_back, target_date)
+        if all(self._load_day(d) for d in _date_range(start_date, end_date)):
+            disclosures = self.disclosures_by_stock(start_date, end_date).get(
+                stock_code.replace('A', ''), [])
+        else:
+            disclosures = self._fetch_company_disclosures(stock_code, start_date, end_date)
 
-        disclosures = self._fetch_company_disclosures(stock_code, start_date, end_date)
+        return any(self._is_negative(disc.get('report_nm', '')) for disc in disclosures)
 
-        for disc in disclosures:
-            report_nm = disc.get('report_nm', '')
-            if any(neg in report_nm for neg in self.NEGATIVE_KEYWORDS):
-                return True
+    def check_negative_disclosures(self, stock_codes: List[str], days_back: int = 7,
+                                   target_date: str = None) -> set:
+        """후보 리스트 일괄 부정 공시 체크 — 기간 공시 1회 수집, 부정 공시 종목코드 집합 반환"""
+        if not self.is_available():
+            return set()
 
-        return False
+        index = self.disclosures_by_stock(*self._check_window(days_back, target_date))
+        negative = set()
+        for code in stock_codes:
+            items = index.get(code.replace('A', ''), [])
+            if any(self._is_negative(disc.get('report_nm', '')) for disc in items):
+                negative.add(code)
+        return negative
 
     def _fetch_company_disclosures(self, stock_code: str, start_date: str, end_date: str) -> List[Dict]:
         """특정 회사의 공시 가져오기"""
@@ -381,32 +501,21 @@ class DartFilter:
         if not corp_code:
             return []
 
-        url = f"{self.base_url}/list.json"
-        params = {
-            'crtfc_key': self.api_key,
-            'corp_code': corp_code,
-            'bgn_de': start_date,
-            'end_de': end_date,
-            'page_count': 100
-        }
-
         try:
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
-
-            if data.get('status') == '000':
-                return data.get('list', [])
-            return []
-
+            return self._fetch_list({'corp_code': corp_code,
+                                     'bgn_de': start_date, 'end_de': end_date}) or []
         except Exception as e:
             print(f"  [DART] 회사 공시 조회 실패 ({stock_code}): {e}")
             return []
 
     def _get_corp_code(self, stock_code: str) -> Optional[str]:
-        """종목코드로 회사코드 조회"""
-        # TODO: corpCode.xml 파일에서 매핑 필요
-        # 현재는 공시 리스트에서 매칭
-        return None
+        """종목코드로 회사코드 조회 (corpCode.xml 로컬 인덱스)"""
+        if self._corp_index is None:
+            index = get_corp_index()
+            self._corp_index = index if index.ensure(self.api_key) else False
+        if not self._corp_index:
+            return None
+        return self._corp_index.corp_code(stock_code)
 
     def calculate_score(self, stock_code: str, disclosures: List[DisclosureInfo] = None,
                        market_cap: int = 0) -> DartScore:
@@ -480,11 +589,12 @@ class DartFilter:
             return stock_codes
 
         disclosures = self.get_recent_disclosures()
+        # 부정적 공시 일괄 체크 (기간 공시 1회 수집)
+        negative = self.check_negative_disclosures(stock_codes) if exclude_negative else set()
         filtered = []
 
         for code in stock_codes:
-            # 부정적 공시 체크
-            if exclude_negative and self.check_negative_disclosure(code):
+            if code in negative:
                 continue
 
             # 점수 체크
@@ -551,6 +661,17 @@ class DartFilter:
         return results
 
 
+def _date_range(start_date: str, end_date: str) -> List[str]:
+    """YYYYMMDD 달력 날짜 리스트 (양 끝 포함)"""
+    start_dt = datetime.strptime(start_date, '%Y%m%d')
+    days = (datetime.strptime(end_date, '%Y%m%d') - start_dt).days
+    return [(start_dt + timedelta(days=i)).strftime('%Y%m%d') for i in range(days + 1)]
+
+
+def _next_day(date: str) -> str:
+    return (datetime.strptime(date, '%Y%m%d') + timedelta(days=1)).strftime('%Y%m%d')
+
+
 # 싱글톤 인스턴스
 _dart_filter_instance = None
 
@@ -0,0 +1,171 @@
+"""
+DART 공시 이력 저장소 — 접수일(rcept_dt) 파티션 + (접수일, 종목코드) 인덱스
+
+배경:
+  DartFilter 는 공시 목록을 인스턴스 dict 에만 캐시해서, 백테스트 하루마다 /
+  프로세스마다 list.json 을 다시 받았다. 이 저장소는 완결된 날짜(오늘 이전)의
+  전체 공시를 날짜별 파일 1개로 한 번만 기록하고, 이후에는 로컬에서 읽는다.
+
+구조:
+  data/dart_cache/disclosures/{YYYY}/{YYYYMMDD}.json
+    {"rcept_dt": 날짜, "items": [list.json 원본 항목...], "by_stock": {종목코드: [items 위치...]}}
+  - append-only: 이미 있는 날짜 파티션은 덮어쓰지 않음 (공시 없는 날은 빈 파티션)
+  - 당일 이후 날짜는 공시가 더 들어오므로 저장하지 않음
+  - 신규 날짜만 증분 동기화 (missing_dates → 연속 구간별 일괄 수집은 DartFilter.sync_disclosures)
+
+사용:
+    store = get_disclosure_store()
+    store.missing_dates(['20260409', '20260410'])
+    store.lookup('20260410', '005930')
+"""
+
+import json
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .atomic_io import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+DISCLOSURE_DIR = Path(__file__).parent.parent.parent / "data" / "dart_cache" / "disclosures"
+
+Items = List[Dict]
+
+
+def _stock_code(item: Dict) -> str:
+    return item.get('stock_code', '').replace('A', '')
+
+
+class DisclosureStore:
+    """접수일 파티션 공시 저장소
+
+    - 스레드 안전: 파티션 기록/메모리 로드는 lock 보호
+    - 반환 리스트는 공유 객체 — 호출부는 수정하지 않는다
+    """
+
+    def __init__(self, store_dir: Optional[Path] = None):
+        self.dir = Path(store_dir) if store_dir else DISCLOSURE_DIR
+        self._lock = threading.Lock()
+        self._items: Dict[str, Items] = {}
+        self._index: Dict[str, Dict[str, List[int]]] = {}
+        self._dates = {p.stem for p in self.dir.glob('*/*.json')} if self.dir.exists() else set()
+
+    def _path(self, date: str) -> Path:
+        return self.dir / date[:4] / f"{date}.json"
+
+    # ─────────────────────────────────────
+    # 조회
+    # ─────────────────────────────────────
+
+    def dates(self) -> List[str]:
+        return sorted(self._dates)
+
+    def has_date(self, date: str) -> bool:
+        return date in self._dates
+
+    def missing_dates(self, dates: Iterable[str]) -> List[str]:
+        return [d for d in dates if d not in self._dates]
+
+    def get(self, date: str) -> Optional[Items]:
+        """그날 전체 공시 (저장 안 된 날짜면 None)"""
+        return self._snapshot(date)[0]
+
+    def by_stock(self, date: str) -> Optional[Dict[str, Items]]:
+        """그날 {종목코드: [공시, ...]} (저장 안 된 날짜면 None)"""
+        items, index = self._snapshot(date)
+        if items is None:
+            return None
+        return {code: [items[i] for i in pos] for code, pos in index.items()}
+
+    def lookup(self, date: str, stock_code: str) -> Items:
+        """(접수일, 종목코드) 공시 — 인덱스 위치만 따라감"""
+        items, index = self._snapshot(date)
+        if items is None:
+            return []
+        return [items[i] for i in index.get(stock_code.replace('A', ''), [])]
+
+    def _snapshot(self, date: str) -> Tuple[Optional[Items], Dict[str, List[int]]]:
+        """(공시, 종목 인덱스) 를 같은 lock 안에서 — 사이에 clear/로드 실패가 끼어도 짝이 맞음"""
+        if date not in self._dates:
+            return None, {}
+        with self._lock:
+            if date not in self._items:
+                self._load(date)
+            return self._items.get(date), self._index.get(date, {})
+
+    # ─────────────────────────────────────
+    # 기록
+    # ─────────────────────────────────────
+
+    def put(self, date: str, items: Items, today: Optional[str] = None) -> bool:
+        """완결된 날짜 파티션 기록 (append-only). 기록했으면 True"""
+        today = today or datetime.now().strftime('%Y%m%d')
+        if date >= today or date in self._dates:
+            return False
+        index: Dict[str, List[int]] = {}
+        for i, item in enumerate(items):
+            code = _stock_code(item)
+            if code:
+                index.setdefault(code, []).append(i)
+        try:
+            self._write(date, {'rcept_dt': date, 'items': items, 'by_stock': index})
+        except Exception as e:
+            logger.debug(f"공시 파티션 저장 실패 ({date}): {e}")
+            return False
+        with self._lock:
+            self._items[date] = items
+            self._index[date] = index
+            self._dates.add(date)
+        return True
+
+    def clear(self) -> None:
+        """메모리 계층 비움 — 디스크 파티션은 유지"""
+        with self._lock:
+            self._items.clear()
+            self._index.clear()
+
+    # ─────────────────────────────────────
+    # 내부: 디스크 I/O
+    # ─────────────────────────────────────
+
+    def _load(self, date: str) -> None:
+        try:
+            with open(self._path(date), encoding='utf-8') as f:
+                payload = json.load(f)
+            self._items[date] = payload['items']
+            self._index[date] = payload['by_stock']
+        except Exception as e:
+            # 깨진 파티션은 미동기화로 취급 → 다음 동기화에서 다시 받음
+            logger.debug(f"공시 파티션 로드 실패 ({date}): {e}")
+            self._dates.discard(date)
+            try:
+                self._path(date).unlink()
+            except OSError:
+                pass
+
+    def _write(self, date: str, payload: Dict) -> None:
+        write_json_atomic(self._path(date), payload)
+
+
+# 프로세스 공용 (DartFilter 인스턴스 간 공유)
+_store: Optional[DisclosureStore] = None
+_store_lock = threading.Lock()
+
+
+def get_disclosure_store() -> DisclosureStore:
+    """프로세스 공용 DisclosureStore (lazy singleton)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DisclosureStore()
+        return _store
+
+
+__all__ = [
+    'DisclosureStore',
+    'get_disclosure_store',
+    'DISCLOSURE_DIR',
+]
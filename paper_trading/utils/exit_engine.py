@@ -0,0 +1,197 @@
+"""
+일봉 청산 엔진 — (시가, 고가, 저가, 종가) 배열로 익절/손절/트레일링 청산을 일괄 판정
+
+배경:
+  "손절 우선 → 익절 → 종가 청산" 일봉 룰이 백테스트 래퍼(simulate_day),
+  scripts/run_backtest, TradingSimulator._determine_exit_daily,
+  ProbabilisticBacktest 에 각각 종목별 루프로 구현돼 있었다. 이 모듈은 같은 룰을
+  배열 연산 한 번으로 계산하고, 기존 호출부는 모두 이 엔진을 사용한다.
+
+판정 규칙 (기존 구현과 동일):
+  - 익절가 = 시가 × (1 + profit_pct/100), 손절가 = 시가 × (1 + loss_pct/100)
+  - 기본 모드: 트레일링 발동 > 손절(저가 ≤ 손절가) > 익절(고가 ≥ 익절가) > 종가
+    · 트레일링: 장중 최대수익 (고가-시가)/시가 가 trailing_levels 트리거 이상이면
+      (최대수익 - drawback)% 에 매도 (levels 앞쪽 항목 우선)
+    · 룰 청산가는 × (1 - slippage_pct/100) 후 원 단위 절사, 종가 청산은 그대로
+  - probabilistic 모드: 익절만 → 익절, 손절만 → 손절, 둘 다 미도달 → 종가,
+    둘 다 도달 → 추세 기반 익절 선도달 확률(high_first_probability)로 기대값
+
+브로드캐스팅:
+  모든 입력은 numpy 브로드캐스팅 — 가격 (N,) × 익절 그리드 (G, 1) 처럼
+  파라미터 그리드 전체를 한 번에 평가할 수 있다.
+
+사용 예:
+    ex = daily_exits(opens, highs, lows, closes, profit_pct=5.0, loss_pct=-3.0)
+    ex.exit_type(0), int(ex.exit_price[0]), ex.return_pct[0]
+
+    grid = daily_exits(opens, highs, lows, closes,
+                       profit_pct=np.array([[3.0], [5.0], [7.0]]), loss_pct=-3.0)
+    grid.return_pct.mean(axis=1)   # 익절 목표별 평균 수익률
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# 청산 유형 코드 (exit_code)
+EXIT_INVALID = -1      # 시가 0 등 판정 불가 (호출부에서 제외)
+EXIT_CLOSE = 0
+EXIT_PROFIT = 1
+EXIT_LOSS = 2
+EXIT_TRAILING = 3
+EXIT_PROBABILISTIC = 4
+
+EXIT_TYPES = {
+    EXIT_INVALID: 'invalid',
+    EXIT_CLOSE: 'close',
+    EXIT_PROFIT: 'profit',
+    EXIT_LOSS: 'loss',
+    EXIT_TRAILING: 'trailing',
+    EXIT_PROBABILISTIC: 'probabilistic',
+}
+
+
+@dataclass
+class DailyExits:
+    """daily_exits 결과 (모든 배열은 브로드캐스트된 같은 shape)
+
+    exit_price: 청산가 (룰 청산은 원 단위 절사된 값, probabilistic 은 확률 가중 기대가격)
+    return_pct: 기본 모드 = (청산가 - 시가) / 시가 × 100,
+                probabilistic 모드 = 모델 총수익률 (익절/손절 목표 % 또는 확률 가중)
+    profit_probability: 익절 선도달 확률 (probabilistic 모드의 둘 다 도달 행만, 나머지 NaN)
+    """
+    exit_code: np.ndarray
+    exit_price: np.ndarray
+    return_pct: np.ndarray
+    hit_profit: np.ndarray
+    hit_loss: np.ndarray
+    profit_probability: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.exit_code)
+
+    @property
+    def valid(self) -> np.ndarray:
+        return self.exit_code != EXIT_INVALID
+
+    def exit_type(self, i) -> str:
+        return EXIT_TYPES[int(self.exit_code[i])]
+
+    def exit_types(self) -> List[str]:
+        """1차원 결과의 청산 유형 문자열 리스트"""
+        return [EXIT_TYPES[int(c)] for c in np.ravel(self.exit_code)]
+
+
+def high_first_probability(open_, high, low, close, k_trend: float = 0.8) -> np.ndarray:
+    """일봉 O/H/L/C 로 "고가가 저가보다 먼저 도달했을 확률" 추정 (배열)
+
+    p = 0.5 + k × (추세 / 변동폭), [0.05, 0.95] 로 clip.
+    시가 ≤ 0, 고가 == 저가, 변동폭 < 1e-6 이면 0.5.
+    """
+    o, h, l, c = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64)
+                                       for x in (open_, high, low, close)))
+    ok = (o > 0) & (h != l)
+    safe_o = np.where(ok, o, 1.0)
+    trend = (c - o) / safe_o
+    range_ratio = (h - l) / safe_o
+    ok &= range_ratio >= 1e-6
+    rel = trend / np.where(ok, range_ratio, 1.0)
+    p = np.clip(0.5 + k_trend * rel, 0.05, 0.95)
+    return np.where(ok, p, 0.5)
+
+
+def trailing_exit_pct(max_profit_pct,
+                      levels: Sequence[Tuple[float, float]]) -> np.ndarray:
+    """트레일링 매도 % (미발동 NaN) — levels 앞쪽 항목이 우선
+
+    TradingSimulator._calc_trailing_exit_pct 의 배열판 (분봉 경로 엔진도 사용).
+    """
+    max_profit_pct = np.asarray(max_profit_pct, dtype=np.float64)
+    out = np.full(max_profit_pct.shape, np.nan)
+    for trigger, drawback in reversed(list(levels)):
+        hit = max_profit_pct >= trigger
+        out[hit] = max_profit_pct[hit] - drawback
+    return out
+
+
+def daily_exits(open_, high, low, close, profit_pct, loss_pct, *,
+                trailing_levels: Optional[Sequence[Tuple[float, float]]] = None,
+                slippage_pct=0.0,
+                probabilistic: bool = False,
+                k_trend: float = 0.8) -> DailyExits:
+    """일봉 청산 일괄 판정
+
+    Args:
+        open_, high, low, close: 가격 배열 (브로드캐스트 가능)
+        profit_pct, loss_pct: 익절/손절 목표 % (스칼라 또는 행별/그리드 배열, loss 는 음수)
+        trailing_levels: [(트리거%, drawback%), ...] — None 이면 트레일링 미사용
+        slippage_pct: 룰 청산(익절/손절/트레일링) 매도 슬리피지 %
+        probabilistic: 둘 다 도달한 행을 확률 가중 기대값으로 판정 (트레일링/슬리피지 미적용)
+        k_trend: high_first_probability 계수
+    """
+    o, h, l, c, pp, lp, slip_pct = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64)
+          for x in (open_, high, low, close, profit_pct, loss_pct, slippage_pct)))
+    valid = o > 0
+    safe_o = np.where(valid, o, 1.0)
+
+    profit_px = o * (1 + pp / 100)
+    loss_px = o * (1 + lp / 100)
+    hit_profit = valid & (h >= profit_px)
+    hit_loss = valid & (l <= loss_px)
+
+    code = np.where(valid, EXIT_CLOSE, EXIT_INVALID).astype(np.int8)
+    price = np.where(valid, c, 0.0)
+    prob = np.full(o.shape, np.nan)
+
+    if probabilistic:
+        both = hit_profit & hit_loss
+        only_p = hit_profit & ~hit_loss
+        only_l = hit_loss & ~hit_profit
+        p = high_first_probability(o, h, l, c, k_trend=k_trend)
+        code[only_p] = EXIT_PROFIT
+        code[only_l] = EXIT_LOSS
+        code[both] = EXIT_PROBABILISTIC
+        price = np.where(only_p, np.floor(profit_px), price)
+        price = np.where(only_l, np.floor(loss_px), price)
+        price = np.where(both, p * profit_px + (1 - p) * loss_px, price)
+        prob = np.where(both, p, np.nan)
+        ret = np.where(valid, (c - o) / safe_o * 100, 0.0)
+        ret = np.where(only_p, pp, ret)
+        ret = np.where(only_l, lp, ret)
+        ret = np.where(both, p * pp + (1 - p) * lp, ret)
+        return DailyExits(code, price, ret, hit_profit, hit_loss, prob)
+
+    slip = 1 - slip_pct / 100
+    # 손절 우선 (보수적) — 익절은 손절 미도달 행만
+    code[hit_profit & ~hit_loss] = EXIT_PROFIT
+    code[hit_loss] = EXIT_LOSS
+    price = np.where(code == EXIT_PROFIT, np.floor(profit_px * slip), price)
+    price = np.where(code == EXIT_LOSS, np.floor(loss_px * slip), price)
+
+    if trailing_levels:
+        max_profit_pct = (h - o) / safe_o * 100
+        trail = np.where(valid, trailing_exit_pct(max_profit_pct, trailing_levels), np.nan)
+        trailing = ~np.isnan(trail)
+        code[trailing] = EXIT_TRAILING
+        price = np.where(trailing, np.floor(o * (1 + np.nan_to_num(trail) / 100) * slip), price)
+
+    ret = np.where(valid, (price - o) / safe_o * 100, 0.0)
+    return DailyExits(code, price, ret, hit_profit, hit_loss, prob)
+
+
+__all__ = [
+    'DailyExits',
+    'daily_exits',
+    'high_first_probability',
+    'trailing_exit_pct',
+    'EXIT_INVALID',
+    'EXIT_CLOSE',
+    'EXIT_PROFIT',
+    'EXIT_LOSS',
+    'EXIT_TRAILING',
+    'EXIT_PROBABILISTIC',
+    'EXIT_TYPES',
+]
@@ -0,0 +1,278 @@
+"""
+유니버스 일괄 지표 엔진 — (날짜 × 종목) 행렬 한 번으로 전종목 MA/BB/RSI/거래량 계산
+
+배경:
+  스퀴즈 플레이 / 볼린저 스윙 / 모멘텀 선정이 종목마다 히스토리를 따로 받아
+  작은 numpy 배열로 MA·BB·RSI를 반복 계산했다. 이 모듈은 종목 축을 벡터화해
+  유니버스 전체를 한 번에 계산하고, 기존 단일 종목 함수(compute_indicators,
+  calculate_bollinger_bands, calculate_rsi)는 1열 행렬로 이 엔진을 호출한다.
+
+시계열 규칙 (기존 종목별 계산과 동일):
+  - 각 종목은 "자기 관측치"만으로 계산 (거래정지·미상장 날짜는 건너뜀)
+  - right_align 으로 종목별 유효값을 아래쪽(최신)으로 모은 뒤 마지막 행 = 최근 관측치
+  - 모든 지표는 최근 관측치 시점(as-of) 값
+
+사용 예:
+    dates, mats = krx.get_history_matrix(codes, start, end, markets=('KOSPI',))
+    aligned = right_align(mats)
+    ind = compute_universe(aligned['종가'], aligned['거래량'], bb_period=20)
+    ind.value('percent_b', j)
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# ============================================================
+# 행렬 정렬
+# ============================================================
+
+def right_align(fields: Dict[str, np.ndarray], ref: str = '종가') -> Dict[str, np.ndarray]:
+    """종목(열)별 유효 관측치를 아래쪽으로 모음 (위쪽은 NaN 패딩)
+
+    Args:
+        fields: {필드명: (T × C) 행렬} — 날짜 정렬, 결측 NaN
+        ref: 유효 행 판정 기준 필드 (기본 종가)
+
+    Returns:
+        같은 키의 (T × C) 행렬. 열 j 의 마지막 n_obs[j] 행이 해당 종목 관측치(시간순).
+    """
+    ref_mat = np.asarray(fields[ref], dtype=np.float64)
+    if ref_mat.size == 0:
+        return {k: np.asarray(v, dtype=np.float64) for k, v in fields.items()}
+    valid = ~np.isnan(ref_mat)
+    # False(결측) 먼저, True(유효) 나중 — stable 이라 유효값 시간 순서 유지
+    order = np.argsort(valid, axis=0, kind='stable')
+    valid_sorted = np.take_along_axis(valid, order, axis=0)
+    aligned = {}
+    for name, mat in fields.items():
+        m = np.take_along_axis(np.asarray(mat, dtype=np.float64), order, axis=0)
+        m[~valid_sorted] = np.nan
+        aligned[name] = m
+    return aligned
+
+
+def fill_column(aligned: Dict[str, np.ndarray], j: int,
+                series: Dict[str, Sequence[float]]) -> None:
+    """right_align 결과의 열 j 를 외부 시계열(pykrx 폴백 등)로 채움 (최근 T개)"""
+    for name, mat in aligned.items():
+        values = series.get(name)
+        mat[:, j] = np.nan
+        if values is None:
+            continue
+        arr = np.asarray(values, dtype=np.float64)[-mat.shape[0]:]
+        if len(arr):
+            mat[-len(arr):, j] = arr
+
+
+def n_observations(mat: np.ndarray) -> np.ndarray:
+    """열별 유효 관측치 수"""
+    if mat.size == 0:
+        return np.zeros(mat.shape[1] if mat.ndim == 2 else 0, dtype=np.int64)
+    return (~np.isnan(mat)).sum(axis=0)
+
+
+# ============================================================
+# 결과 컨테이너
+# ============================================================
+
+@dataclass
+class UniverseIndicators:
+    """compute_universe 결과 — 지표명 → (C,) 배열
+
+    주요 키:
+        n_obs, close, volume,
+        ma{p}, ma{p}_prev (어제까지 p일), ma{p}_lag (trend_shift일 전 p일),
+        bb_middle, bb_std, bb_upper, bb_lower, percent_b, spread_pct,
+        rsi, vol_avg_prev, vol_ratio
+    데이터 부족 지표는 NaN.
+    """
+    values: Dict[str, np.ndarray] = field(default_factory=dict)
+    codes: Optional[List[str]] = None
+
+    def __post_init__(self):
+        self._pos = {c: j for j, c in enumerate(self.codes)} if self.codes else {}
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.values[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.values
+
+    def index_of(self, code: str) -> Optional[int]:
+        return self._pos.get(code)
+
+    def value(self, key: str, j: int) -> Optional[float]:
+        """열 j 의 지표값 (NaN → None)"""
+        v = self.values[key][j]
+        return None if np.isnan(v) else float(v)
+
+    def row(self, j: int) -> Dict[str, Optional[float]]:
+        return {k: self.value(k, j) for k in self.values}
+
+
+# ============================================================
+# 계산
+# ============================================================
+
+def _last_window_mean(mat: np.ndarray, n_obs: np.ndarray, period: int,
+                      lag: int = 0) -> np.ndarray:
+    """최근 관측치 기준 lag 만큼 이전에서 끝나는 period 창 평균"""
+    T, C = mat.shape
+    need = period + lag
+    if T < need or period <= 0:
+        return np.full(C, np.nan)
+    window = mat[T - need:T - lag] if lag else mat[T - period:]
+    out = np.mean(window, axis=0)
+    out[n_obs < need] = np.nan
+    return out
+
+
+def _wilder_rsi(closes: np.ndarray, n_obs: np.ndarray, period: int) -> np.ndarray:
+    """Wilder 평활 RSI — 종목별 첫 period 개 변화량 평균으로 시작, 이후 재귀
+
+    행(시간) 루프 1회 × 종목 벡터 연산. 종목마다 시작 행이 달라도
+    유효 변화량 개수(count)로 시드 시점을 맞춘다.
+    """
+    T, C = closes.shape
+    out = np.full(C, np.nan)
+    if T < 2:
+        return out
+    deltas = np.diff(closes, axis=0)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    valid = ~np.isnan(deltas)
+
+    count = np.zeros(C, dtype=np.int64)
+    sum_gain = np.zeros(C)
+    sum_loss = np.zeros(C)
+    avg_gain = np.zeros(C)
+    avg_loss = np.zeros(C)
+    for r in range(T - 1):
+        v = valid[r]
+        if not v.any():
+            continue
+        count = count + v
+        seeding = v & (count <= period)
+        sum_gain = np.where(seeding, sum_gain + gains[r], sum_gain)
+        sum_loss = np.where(seeding, sum_loss + losses[r], sum_loss)
+        seeded = v & (count == period)
+        avg_gain = np.where(seeded, sum_gain / period, avg_gain)
+        avg_loss = np.where(seeded, sum_loss / period, avg_loss)
+        smooth = v & (count > period)
+        avg_gain = np.where(smooth, (avg_gain * (period - 1) + gains[r]) / period, avg_gain)
+        avg_loss = np.where(smooth, (avg_loss * (period - 1) + losses[r]) / period, avg_loss)
+
+    ready = n_obs >= period + 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    rsi = np.where(avg_loss == 0, 100.0, rsi)
+    out[ready] = rsi[ready]
+    return out
+
+
+def compute_universe(
+    closes: np.ndarray,
+    volumes: Optional[np.ndarray] = None,
+    codes: Optional[List[str]] = None,
+    *,
+    bb_period: int = 20,
+    bb_std_mult: float = 2.0,
+    rsi_period: Optional[int] = 14,
+    ma_periods: Sequence[int] = (5, 20, 200),
+    trend_shift: int = 5,
+    vol_period: int = 5,
+) -> UniverseIndicators:
+    """유니버스 전체 지표를 한 번에 계산
+
+    Args:
+        closes: right_align 된 (T × C) 종가 행렬
+        volumes: right_align 된 (T × C) 거래량 행렬 (None 이면 거래량 지표 생략)
+        codes: 열 순서 종목코드 (index_of 조회용, 선택)
+        bb_period / bb_std_mult: 볼린저밴드 (표본표준편차 ddof=1)
+        rsi_period: Wilder RSI 기간 (None 이면 생략)
+        ma_periods: 이동평균 기간들 (ma{p}, ma{p}_prev, ma{p}_lag)
+        trend_shift: ma{p}_lag 의 시점 이동 (MA200 우상향 판정용)
+        vol_period: 거래량 평균 기간 (당일 제외)
+
+    Returns:
+        UniverseIndicators
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    if closes.ndim == 1:
+        closes = closes[:, None]
+    T, C = closes.shape
+    n_obs = n_observations(closes)
+    last = closes[-1] if T else np.full(C, np.nan)
+
+    values: Dict[str, np.ndarray] = {
+        'n_obs': n_obs.astype(np.float64),
+        'close': last.copy(),
+    }
+
+    for p in ma_periods:
+        values[f'ma{p}'] = _last_window_mean(closes, n_obs, p)
+        values[f'ma{p}_prev'] = _last_window_mean(closes, n_obs, p, lag=1)
+        values[f'ma{p}_lag'] = _last_window_mean(closes, n_obs, p, lag=trend_shift)
+
+    # 볼린저밴드
+    if T >= bb_period and bb_period > 1:
+        window = closes[T - bb_period:]
+        middle = np.mean(window, axis=0)
+        std = np.std(window, axis=0, ddof=1)
+        short = n_obs < bb_period
+        middle[short] = np.nan
+        std[short] = np.nan
+    else:
+        middle = np.full(C, np.nan)
+        std = np.full(C, np.nan)
+    upper = middle + bb_std_mult * std
+    lower = middle - bb_std_mult * std
+    width = upper - lower
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent_b = np.where(width != 0, (last - lower) / width, np.nan)
+    values.update({
+        'bb_middle': middle,
+        'bb_std': std,
+        'bb_upper': upper,
+        'bb_lower': lower,
+        'percent_b': percent_b,
+    })
+
+    # 20MA(=BB 중심선)·200MA 간격 (스퀴즈)
+    longest = max(ma_periods) if ma_periods else None
+    if longest:
+        ma_long = values[f'ma{longest}']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            spread = np.where(ma_long > 0, np.abs(middle - ma_long) / ma_long * 100, np.nan)
+        values['spread_pct'] = spread
+
+    if rsi_period:
+        values['rsi'] = _wilder_rsi(closes, n_obs, rsi_period)
+
+    if volumes is not None:
+        volumes = np.asarray(volumes, dtype=np.float64)
+        if volumes.ndim == 1:
+            volumes = volumes[:, None]
+        vol_last = volumes[-1] if T else np.full(C, np.nan)
+        vol_avg = _last_window_mean(volumes, n_observations(volumes), vol_period, lag=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vol_ratio = np.where(vol_avg > 0, vol_last / vol_avg, np.nan)
+        values.update({
+            'volume': vol_last.copy(),
+            'vol_avg_prev': vol_avg,
+            'vol_ratio': vol_ratio,
+        })
+
+    return UniverseIndicators(values=values, codes=list(codes) if codes else None)
+
+
+__all__ = [
+    'right_align',
+    'fill_column',
+    'n_observations',
+    'UniverseIndicators',
+    'compute_universe',
+]
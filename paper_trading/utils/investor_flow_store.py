@@ -0,0 +1,192 @@
+"""
+종목별 외국인/기관 수급 이력 저장소 (컬럼형)
+
+배경:
+  NaverInvestorClient 는 (종목, 당일) JSON 캐시를 써서 날마다 전체를 다시 받았다.
+  지난 날짜 수급은 바뀌지 않으므로, 종목별 이력을 날짜 오름차순 구조화 배열
+  (date, close, change_pct, volume, inst_net, foreign_net) 로 누적하고 새 행만 병합한다.
+
+구조:
+  data/naver_investor/flows/{code}.npz — rows (구조화 배열) + checked (마지막 조회일 KST)
+  - 같은 날짜 행은 새로 받은 값으로 교체 (장중 조회한 당일 행 갱신)
+  - 누적 순매수/랭킹은 배열 합산 (cumulative)
+
+사용:
+    store = get_flow_store()
+    store.merge('005930', rows, checked='20260410')
+    store.rows('005930', limit=5)                     # 최근 날짜부터
+    store.cumulative(['005930', '000660'], days=5)    # {'foreign': (N,), ...}
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .atomic_io import atomic_open
+
+logger = logging.getLogger(__name__)
+
+FLOW_DIR = Path(__file__).parent.parent.parent / "data" / "naver_investor" / "flows"
+
+FLOW_DTYPE = np.dtype([
+    ('date', np.int32),          # YYYYMMDD
+    ('close', np.int64),
+    ('change_pct', np.float64),
+    ('volume', np.int64),
+    ('inst_net', np.int64),
+    ('foreign_net', np.int64),
+])
+_EMPTY = np.zeros(0, dtype=FLOW_DTYPE)
+
+
+def to_flow_array(rows: Iterable[Dict]) -> np.ndarray:
+    """수급 dict 리스트 → 날짜 오름차순 구조화 배열 (같은 날짜는 마지막 값)"""
+    arr = np.array([(int(r['date']), r['close'], r['change_pct'], r['volume'],
+                     r['inst_net'], r['foreign_net']) for r in rows], dtype=FLOW_DTYPE)
+    if len(arr) == 0:
+        return _EMPTY
+    # 뒤쪽(나중) 값 우선으로 날짜 중복 제거
+    rev = arr[::-1]
+    _, first = np.unique(rev['date'], return_index=True)
+    return rev[first]
+
+
+class InvestorFlowStore:
+    """종목별 수급 이력 (메모리 + 선택적 디스크)
+
+    - 스레드 안전: 병합/로드는 lock 보호, 반환 배열은 읽기 전용
+    """
+
+    def __init__(self, store_dir: Optional[Path] = None, persist: bool = True):
+        self.dir = Path(store_dir) if store_dir else FLOW_DIR
+        self.persist = persist
+        self._lock = threading.Lock()
+        self._rows: Dict[str, np.ndarray] = {}
+        self._checked: Dict[str, Optional[str]] = {}
+
+    def _path(self, code: str) -> Path:
+        return self.dir / f"{code}.npz"
+
+    # ─────────────────────────────────────
+    # 조회
+    # ─────────────────────────────────────
+
+    def get(self, code: str) -> np.ndarray:
+        """날짜 오름차순 이력 (없으면 빈 배열)"""
+        with self._lock:
+            if code not in self._rows:
+                self._load(code)
+            return self._rows[code]
+
+    def checked(self, code: str) -> Optional[str]:
+        """마지막 조회일 (YYYYMMDD)"""
+        self.get(code)
+        return self._checked.get(code)
+
+    def rows(self, code: str, limit: int = 30, as_of: Optional[str] = None) -> List[Dict]:
+        """최근 날짜부터 최대 limit 행 (as_of 이후 날짜 제외) — dict 리스트"""
+        arr = self._window(self.get(code), limit, as_of)[::-1]
+        return [{'date': str(r['date']), 'close': int(r['close']),
+                 'change_pct': float(r['change_pct']), 'volume': int(r['volume']),
+                 'inst_net': int(r['inst_net']), 'foreign_net': int(r['foreign_net'])}
+                for r in arr]
+
+    def cumulative(self, codes: List[str], days: int = 5,
+                   as_of: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """종목별 최근 days 거래일 누적 순매수 — {'foreign','institution','days_used'} (N,) 배열"""
+        foreign = np.zeros(len(codes), dtype=np.int64)
+        inst = np.zeros(len(codes), dtype=np.int64)
+        used = np.zeros(len(codes), dtype=np.int64)
+        for i, code in enumerate(codes):
+            window = self._window(self.get(code), days, as_of)
+            foreign[i] = window['foreign_net'].sum()
+            inst[i] = window['inst_net'].sum()
+            used[i] = len(window)
+        return {'foreign': foreign, 'institution': inst, 'days_used': used}
+
+    @staticmethod
+    def _window(arr: np.ndarray, n: int, as_of: Optional[str]) -> np.ndarray:
+        end = len(arr) if as_of is None else int(np.searchsorted(arr['date'], int(as_of), side='right'))
+        return arr[max(end - n, 0):end]
+
+    # ─────────────────────────────────────
+    # 병합
+    # ─────────────────────────────────────
+
+    def merge(self, code: str, rows: Iterable[Dict], checked: Optional[str] = None) -> np.ndarray:
+        """새 행 병합 (같은 날짜는 새 값) + 조회일 기록. 병합 결과 반환"""
+        new = to_flow_array(rows)
+        with self._lock:
+            if code not in self._rows:
+                self._load(code)
+            old = self._rows[code]
+            if len(new):
+                keep = old[~np.isin(old['date'], new['date'])]
+                merged = np.concatenate([keep, new])
+                merged = merged[np.argsort(merged['date'], kind='stable')]
+            else:
+                merged = old
+            merged.flags.writeable = False
+            self._rows[code] = merged
+            if checked:
+                self._checked[code] = checked
+            if self.persist:
+                try:
+                    self._save(code, merged, self._checked.get(code))
+                except Exception as e:
+                    logger.debug(f"수급 이력 저장 실패 ({code}): {e}")
+            return merged
+
+    def clear(self) -> None:
+        """메모리 계층 비움 — 디스크는 유지"""
+        with self._lock:
+            self._rows.clear()
+            self._checked.clear()
+
+    # ─────────────────────────────────────
+    # 내부: 디스크 I/O
+    # ─────────────────────────────────────
+
+    def _load(self, code: str) -> None:
+        rows, checked = _EMPTY, None
+        path = self._path(code)
+        if self.persist and path.exists():
+            try:
+                with np.load(path) as npz:
+                    rows = npz['rows'].astype(FLOW_DTYPE)
+                    checked = str(npz['checked']) or None
+            except Exception as e:
+                logger.debug(f"수급 이력 로드 실패 ({path}): {e}")
+                rows, checked = _EMPTY, None
+        rows.flags.writeable = False
+        self._rows[code] = rows
+        self._checked[code] = checked
+
+    def _save(self, code: str, rows: np.ndarray, checked: Optional[str]) -> None:
+        with atomic_open(self._path(code), 'wb') as f:
+            np.savez(f, rows=rows, checked=np.array(checked or ''))
+
+
+# 프로세스 공용
+_store: Optional[InvestorFlowStore] = None
+_store_lock = threading.Lock()
+
+
+def get_flow_store() -> InvestorFlowStore:
+    """프로세스 공용 InvestorFlowStore (lazy singleton)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = InvestorFlowStore()
+        return _store
+
+
+__all__ = [
+    'FLOW_DTYPE',
+    'InvestorFlowStore',
+    'get_flow_store',
+    'to_flow_array',
+]
@@ -2,9 +2,10 @@
 KIS (한국투자증권) OpenAPI 클라이언트
 
 - 모의투자 (KIS_MOCK=true) / 실전 분기 자동
-- access_token 24시간 캐시 (메모리, class attr)
+- access_token 24시간 캐시 (메모리 class attr + 디스크, 스레드 안전 갱신)
 - 분봉 historical (30일) + 일봉 historical (3개월~1년)
-- Rate limit: 초당 20건 (50ms sleep), 일 50,000건 카운터
+- Rate limit: 프로세스 공용 토큰 버킷 (실전 초당 20건 / 모의 1건), 일 50,000건 카운터
+- 클라이언트 풀: get_kis_client() — 프로세스 공용 인스턴스 (스레드별 HTTP 세션)
 - 디스크 캐시: data/kis_cache/
 
 도입 동기 (2026-05-09):
@@ -21,6 +22,7 @@ import os
 import json
 import time
 import logging
+import threading
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
@@ -37,6 +39,65 @@ CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "kis_cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
+class TokenBucket:
+    """토큰 버킷 rate limiter (스레드 안전)
+
+    - rate: 초당 토큰 충전량 (= 허용 요청 수/초)
+    - capacity: 최대 누적 토큰 (순간 burst 허용량)
+    - penalize(): 초과 응답(EGW00201) 시 모든 호출자를 함께 일정 시간 정지
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """토큰 1개 획득 (부족하면 대기). 대기한 시간(초) 반환"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def penalize(self, seconds: float) -> None:
+        """seconds 동안 모든 acquire 정지 + 누적 토큰 소진"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+# 모의/실전별 프로세스 공용 limiter (KIS 한도는 앱키 단위 — 인스턴스 수와 무관)
+_limiters: Dict[bool, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(mock: bool) -> TokenBucket:
+    """모의(mock=True)/실전 공용 TokenBucket. KIS_RATE_PER_SEC 로 override 가능"""
+    with _limiters_lock:
+        limiter = _limiters.get(mock)
+        if limiter is None:
+            default = 1 / (KISClient.RATE_LIMIT_SLEEP_MOCK if mock
+                           else KISClient.RATE_LIMIT_SLEEP_LIVE)
+            rate = float(os.getenv("KIS_RATE_PER_SEC", default))
+            limiter = TokenBucket(rate, capacity=1.0)
+            _limiters[mock] = limiter
+        return limiter
+
+
 class KISClient:
     """KIS OpenAPI REST 클라이언트
 
@@ -62,8 +123,13 @@ class KISClient:
     TR_MINUTE = "FHKST03010200"  # 당일 분봉
     # 30일 분봉 historical: 일자별로 inquire-time-itemchartprice 반복 호출
 
-    # 메모리 토큰 캐시 (class attr — 인스턴스 간 공유)
+    # 메모리 토큰 캐시 (class attr — 인스턴스 간 공유), 갱신은 _token_lock 하에서 1회
     _token_cache: Dict[str, Any] = {"access_token": None, "expires_at": 0.0}
+    _token_lock = threading.Lock()
+
+    # 일 호출 카운터 (class attr — 인스턴스 간 공유)
+    _daily_count = 0
+    _count_lock = threading.Lock()
 
     # 디스크 토큰 캐시 (프로세스 간 공유 — KIS 1분당 1회 발급 제한 회피)
     TOKEN_CACHE_PATH = CACHE_DIR / "token.json"
@@ -100,13 +166,21 @@ class KISClient:
             self.RATE_LIMIT_SLEEP_MOCK if self.mock else self.RATE_LIMIT_SLEEP_LIVE
         )
         self.use_cache = use_cache
-        self.session = requests.Session()
-        self._last_call_at = 0.0
-        self._daily_count = 0
+        self._local = threading.local()
+        self._limiter = get_rate_limiter(self.mock)
 
         # 토큰 발급 (캐시된 게 만료됐으면 자동 갱신)
         self._refresh_token_if_needed()
 
+    @property
+    def session(self) -> requests.Session:
+        """스레드별 HTTP 세션 (공용 인스턴스를 여러 스레드가 동시에 사용)"""
+        sess = getattr(self._local, "session", None)
+        if sess is None:
+            sess = requests.Session()
+            self._local.session = sess
+        return sess
+
     @staticmethod
     def _load_env():
         """프로젝트 루트의 .env 자동 로드 (있을 때만)"""
@@ -128,14 +202,32 @@ class KISClient:
     # 토큰 관리 (24h 유효, 만료 5분 전 자동 갱신)
     # ─────────────────────────────────────
 
-    def _refresh_token_if_needed(self):
-        now = time.time()
-        # 1) 메모리 캐시 유효 시 그대로
-        if (
+    def _token_valid(self, now: float) -> bool:
+        return (
             self._token_cache.get("access_token") is not None
             and now < self._token_cache.get("expires_at", 0) - 300  # 5분 전 갱신
-        ):
+        )
+
+    def _refresh_token_if_needed(self):
+        # 1) 메모리 캐시 유효 시 그대로 (lock 없이 빠른 경로)
+        if self._token_valid(time.time()):
             return
+        with self._token_lock:
+            # 대기 중 다른 스레드가 갱신했을 수 있음
+            now = time.time()
+            if self._token_valid(now):
+                return
+            self._load_or_issue_token(now)
+
+    def _renew_token(self, stale_token: Optional[str]):
+        """401 응답 시 재발급 — 다른 스레드가 이미 교체했으면 재사용"""
+        with self._token_lock:
+            if self._token_cache.get("access_token") != stale_token:
+                return
+            self._store_token(self._fetch_token())
+
+    def _load_or_issue_token(self, now: float):
+        """_token_lock 보유 상태에서 호출 — 디스크 캐시 → 신규 발급 순"""
         # 2) 디스크 캐시 시도 (프로세스 간 공유)
         if self.TOKEN_CACHE_PATH.exists():
             try:
@@ -148,7 +240,10 @@ class KISClient:
             except Exception as e:
                 logger.debug(f"토큰 디스크 캐시 로드 실패: {e}")
         # 3) 신규 발급 + 디스크 저장 (1분당 1회 제한 주의)
-        new_token = self._fetch_token()
+        self._store_token(self._fetch_token())
+
+    def _store_token(self, new_token: Dict[str, Any]):
+        """메모리 + 디스크 토큰 캐시 갱신"""
         type(self)._token_cache.update(new_token)
         try:
             with open(self.TOKEN_CACHE_PATH, "w", encoding="utf-8") as f:
@@ -204,51 +299,43 @@ class KISClient:
         """
         self._refresh_token_if_needed()
 
-        # Rate limit (mock: 1.0s, live: 0.05s)
-        now = time.time()
-        elapsed = now - self._last_call_at
-        if elapsed < self.rate_limit_sleep:
-            time.sleep(self.rate_limit_sleep - elapsed)
-
         url = f"{self.base_url}{path}"
+        token = self._token_cache['access_token']
         headers = {
             "Content-Type": "application/json",
-            "Authorization": f"Bearer {self._token_cache['access_token']}",
+            "Authorization": f"Bearer {token}",
             "appkey": self.app_key,
             "appsecret": self.app_secret,
             "tr_id": tr_id,
             "custtype": "P",  # 개인
         }
-        try:
+
+        def send():
+            # 모든 HTTP 호출(재시도 포함)은 공용 limiter 토큰 1개 소비
+            self._limiter.acquire()
+            with self._count_lock:
+                type(self)._daily_count += 1
             if method.upper() == "GET":
-                r = self.session.get(url, params=params, headers=headers, timeout=self.TIMEOUT)
-            else:
-                r = self.session.post(url, json=params, headers=headers, timeout=self.TIMEOUT)
-            self._last_call_at = time.time()
-            self._daily_count += 1
+                return self.session.get(url, params=params, headers=headers, timeout=self.TIMEOUT)
+            return self.session.post(url, json=params, headers=headers, timeout=self.TIMEOUT)
+
+        try:
+            r = send()
 
-            # 401 → 토큰 재발급 후 1회 retry
+            # 401 → 토큰 재발급(다른 스레드와 1회 공유) 후 1회 retry
             if r.status_code == 401:
                 logger.warning("KIS 401 — 토큰 재발급 후 재시도")
-                new_token = self._fetch_token()
-                type(self)._token_cache.update(new_token)
+                self._renew_token(token)
                 headers["Authorization"] = f"Bearer {self._token_cache['access_token']}"
-                if method.upper() == "GET":
-                    r = self.session.get(url, params=params, headers=headers, timeout=self.TIMEOUT)
-                else:
-                    r = self.session.post(url, json=params, headers=headers, timeout=self.TIMEOUT)
+                r = send()
 
-            # 500 + EGW00201 (초당 거래건수 초과) → backoff retry
+            # 500 + EGW00201 (초당 거래건수 초과) → 공용 limiter 정지 후 retry
             if r.status_code != 200:
                 txt = r.text or ""
                 if "EGW00201" in txt:
                     for retry in range(self.EGW00201_MAX_RETRY):
-                        time.sleep(self.EGW00201_BACKOFF * (retry + 1))
-                        if method.upper() == "GET":
-                            r = self.session.get(url, params=params, headers=headers, timeout=self.TIMEOUT)
-                        else:
-                            r = self.session.post(url, json=params, headers=headers, timeout=self.TIMEOUT)
-                        self._last_call_at = time.time()
+                        self._limiter.penalize(self.EGW00201_BACKOFF * (retry + 1))
+                        r = send()
                         if r.status_code == 200:
                             break
                         if "EGW00201" not in (r.text or ""):
@@ -438,13 +525,53 @@ class KISClient:
         return rows
 
 
-# 전역 싱글톤 (선택)
-_default_client: Optional[KISClient] = None
+# ─────────────────────────────────────
+# 클라이언트 풀 (프로세스 공용)
+# ─────────────────────────────────────
+
+# (app_key, mock) → KISClient. 키 미설정 ValueError 만 기억해 재시도 없이 재발생
+# (토큰 발급/네트워크 RuntimeError 등 일시 오류는 저장하지 않아 다음 호출이 다시 시도)
+_pool: Dict[tuple, Any] = {}
+_pool_lock = threading.Lock()
+_env_loaded = False
+
+
+def get_kis_client(mock: Optional[bool] = None) -> KISClient:
+    """프로세스 공용 KISClient (스레드 안전)
+
+    같은 앱키·모드는 한 인스턴스를 공유 — .env 로드/토큰 확인은 최초 1회,
+    rate limiter·토큰 캐시·일 카운터는 모든 호출자가 공유한다.
+
+    Raises:
+        ValueError: KIS_APP_KEY / KIS_APP_SECRET 미설정 (KISClient 와 동일, 기억됨)
+        RuntimeError 등: 토큰 발급 실패 — 풀에 남기지 않음
+    """
+    global _env_loaded
+    if not _env_loaded:
+        KISClient._load_env()
+        _env_loaded = True
+    if mock is None:
+        mock = os.getenv("KIS_MOCK", "true").lower() in ("true", "1", "yes")
+    key = (os.getenv("KIS_APP_KEY"), mock)
+    with _pool_lock:
+        client = _pool.get(key)
+        if client is None:
+            try:
+                client = KISClient(mock=mock)
+            except ValueError as e:
+                client = e
+            _pool[key] = client
+    if isinstance(client, Exception):
+        raise client
+    return client
+
+
+def reset_kis_pool() -> None:
+    """풀 초기화 (테스트/키 변경 시)"""
+    with _pool_lock:
+        _pool.clear()
 
 
 def get_default_client() -> KISClient:
-    """기본 KISClient 인스턴스 (싱글톤)"""
-    global _default_client
-    if _default_client is None:
-        _default_client = KISClient()
-    return _default_client
+    """기본 KISClient 인스턴스 (풀 공유)"""
+    return get_kis_client()
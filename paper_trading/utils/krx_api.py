@@ -9,16 +9,19 @@ KRX OpenAPI 클라이언트
 - KOSPI/KOSDAQ 지수 일별
 - 종목 기본정보 (상장일, 업종 등)
 
-캐시: 날짜별 디스크 캐시 (data/krx_cache/)
+캐시: 날짜별 디스크 캐시 (data/krx_cache/) + 파싱된 DataFrame 메모리 LRU (FrameCache)
+기간 조회: 종목×날짜 일봉 패널 (data/krx_panel/, krx_panel.py)
 """
 
 import os
 import json
 import time
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict, Tuple
 
 import requests
 import pandas as pd
@@ -28,6 +31,160 @@ logger = logging.getLogger(__name__)
 CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "krx_cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# 응답이 비어 있던 (market, date) — 휴장일 재조회 방지 (프로세스 단위)
+_EMPTY_DATES: set = set()
+
+
+def parse_stock_rows(rows: List[Dict]) -> pd.DataFrame:
+    """KRX 전종목 일별 응답(OutBlock_1) → 표준 컬럼 DataFrame
+
+    get_stock_ohlcv 와 KRXPanel(캐시 폴더 일괄 구축)이 공유한다.
+    """
+    if not rows:
+        return pd.DataFrame()
+    df = pd.DataFrame(rows)
+    # 표준 컬럼명으로 변환
+    df = df.rename(columns={
+        'ISU_CD': 'isu_cd',
+        'ISU_NM': '종목명',
+        'TDD_OPNPRC': '시가',
+        'TDD_HGPRC': '고가',
+        'TDD_LWPRC': '저가',
+        'TDD_CLSPRC': '종가',
+        'CMPPREVDD_PRC': '전일대비',
+        'FLUC_RT': '등락률',
+        'ACC_TRDVOL': '거래량',
+        'ACC_TRDVAL': '거래대금',
+        'MKTCAP': '시가총액',
+        'LIST_SHRS': '상장주식수',
+    })
+    # 종목코드: ISIN(KR700...)에서 단축코드 추출
+    # ISU_SRT_CD가 없으므로 ISU_CD 마지막 6자리에서 1자 빼기 (실제로 ISU_CD = KR700XXXXXXX)
+    # 더 간단: KRX 응답에서 ISU_CD가 12자리 ISIN, 단축코드는 7~12 슬라이스 후 마지막 1자 제거
+    # 가장 안전: 별도 종목정보 매핑 불필요시, ISU_CD를 그대로 인덱스로 사용
+    df['종목코드'] = df['isu_cd'].str[3:9]  # KR700095570 -> 700095 (X) — 다른 방법 필요
+    # 실제 응답 분석: ISU_CD가 짧은 형태일 수도. 일단 양쪽 다 호환되게.
+    if df['isu_cd'].iloc[0].startswith('KR'):
+        df['종목코드'] = df['isu_cd'].str[3:9]
+    else:
+        df['종목코드'] = df['isu_cd']
+    df = df.set_index('종목코드')
+    # 숫자 컬럼 변환
+    num_cols = ['시가', '고가', '저가', '종가', '전일대비', '등락률',
+                '거래량', '거래대금', '시가총액', '상장주식수']
+    for c in num_cols:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0)
+    return df
+
+
+def parse_index_rows(rows: List[Dict]) -> pd.DataFrame:
+    """KRX 지수 일별 응답(OutBlock_1) → 표준 컬럼 DataFrame"""
+    if not rows:
+        return pd.DataFrame()
+    df = pd.DataFrame(rows)
+    df = df.rename(columns={
+        'IDX_NM': '지수명',
+        'IDX_CLSS': '지수분류',
+        'OPNPRC_IDX': '시가',
+        'HGPRC_IDX': '고가',
+        'LWPRC_IDX': '저가',
+        'CLSPRC_IDX': '종가',
+        'CMPPREVDD_IDX': '전일대비',
+        'FLUC_RT': '등락률',
+    })
+    num_cols = ['시가', '고가', '저가', '종가', '전일대비', '등락률']
+    for c in num_cols:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0)
+    return df
+
+
+class FrameCache:
+    """파싱 완료 DataFrame LRU 캐시 — 키: (kind, market, date)
+
+    - 크기 제한 (maxsize 초과 시 가장 오래 안 쓴 항목 제거)
+    - 스레드 안전: 같은 키 동시 miss 시 로드는 1회만 (나머지는 대기 후 hit)
+    - hits / misses 카운터
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Tuple[str, str, str], pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+
+    def get_or_load(self, key: Tuple[str, str, str],
+                    loader: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """캐시 hit 이면 반환, 아니면 loader() 결과를 저장 후 반환 (빈 DataFrame은 저장 안 함)"""
+        df = self._get(key)
+        if df is not None:
+            return df
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # 대기 중 다른 스레드가 채웠을 수 있음
+            df = self._get(key)
+            if df is not None:
+                return df
+            with self._lock:
+                self.misses += 1
+            try:
+                df = loader()
+                with self._lock:
+                    if not df.empty:
+                        self._data[key] = df
+                        self._data.move_to_end(key)
+                        while len(self._data) > self.maxsize:
+                            self._data.popitem(last=False)
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+            return df
+
+    def _get(self, key) -> Optional[pd.DataFrame]:
+        with self._lock:
+            df = self._data.get(key)
+            if df is None:
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return df
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+            }
+
+
+# 프로세스 공용 (KRXClient 인스턴스가 여러 개여도 공유)
+FRAME_CACHE_SIZE = int(os.getenv('KRX_FRAME_CACHE_SIZE', '64'))
+_frame_cache = FrameCache(FRAME_CACHE_SIZE)
+
+
+def get_frame_cache_stats() -> Dict:
+    """get_stock_ohlcv / get_index_ohlcv 메모리 캐시 통계"""
+    return _frame_cache.stats()
+
+
+def clear_frame_cache() -> None:
+    _frame_cache.clear()
+
 
 class KRXClient:
     """KRX OpenAPI REST 클라이언트
@@ -94,43 +251,7 @@ class KRXClient:
             DataFrame: index=종목코드, columns=[종목명, 시가, 고가, 저가, 종가,
                        전일대비, 등락률, 거래량, 거래대금, 시가총액, 상장주식수]
         """
-        rows = self._fetch('stock', market, date)
-        if not rows:
-            return pd.DataFrame()
-        df = pd.DataFrame(rows)
-        # 표준 컬럼명으로 변환
-        df = df.rename(columns={
-            'ISU_CD': 'isu_cd',
-            'ISU_NM': '종목명',
-            'TDD_OPNPRC': '시가',
-            'TDD_HGPRC': '고가',
-            'TDD_LWPRC': '저가',
-            'TDD_CLSPRC': '종가',
-            'CMPPREVDD_PRC': '전일대비',
-            'FLUC_RT': '등락률',
-            'ACC_TRDVOL': '거래량',
-            'ACC_TRDVAL': '거래대금',
-            'MKTCAP': '시가총액',
-            'LIST_SHRS': '상장주식수',
-        })
-        # 종목코드: ISIN(KR700...)에서 단축코드 추출
-        # ISU_SRT_CD가 없으므로 ISU_CD 마지막 6자리에서 1자 빼기 (실제로 ISU_CD = KR700XXXXXXX)
-        # 더 간단: KRX 응답에서 ISU_CD가 12자리 ISIN, 단축코드는 7~12 슬라이스 후 마지막 1자 제거
-        # 가장 안전: 별도 종목정보 매핑 불필요시, ISU_CD를 그대로 인덱스로 사용
-        df['종목코드'] = df['isu_cd'].str[3:9]  # KR700095570 -> 700095 (X) — 다른 방법 필요
-        # 실제 응답 분석: ISU_CD가 짧은 형태일 수도. 일단 양쪽 다 호환되게.
-        if df['isu_cd'].iloc[0].startswith('KR'):
-            df['종목코드'] = df['isu_cd'].str[3:9]
-        else:
-            df['종목코드'] = df['isu_cd']
-        df = df.set_index('종목코드')
-        # 숫자 컬럼 변환
-        num_cols = ['시가', '고가', '저가', '종가', '전일대비', '등락률',
-                    '거래량', '거래대금', '시가총액', '상장주식수']
-        for c in num_cols:
-            if c in df.columns:
-                df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0)
-        return df
+        return self._get_frame('stock', market, date, parse_stock_rows)
 
     def get_index_ohlcv(self, date: str, market: str = 'KOSPI') -> pd.DataFrame:
         """지수 일별 OHLCV
@@ -143,25 +264,20 @@ class KRXClient:
             DataFrame: 지수별 1행 (KOSPI 종합지수, KOSPI 200, etc.)
                        columns=[지수명, 시가, 고가, 저가, 종가, 등락률, ...]
         """
-        rows = self._fetch('index', market, date)
-        if not rows:
-            return pd.DataFrame()
-        df = pd.DataFrame(rows)
-        df = df.rename(columns={
-            'IDX_NM': '지수명',
-            'IDX_CLSS': '지수분류',
-            'OPNPRC_IDX': '시가',
-            'HGPRC_IDX': '고가',
-            'LWPRC_IDX': '저가',
-            'CLSPRC_IDX': '종가',
-            'CMPPREVDD_IDX': '전일대비',
-            'FLUC_RT': '등락률',
-        })
-        num_cols = ['시가', '고가', '저가', '종가', '전일대비', '등락률']
-        for c in num_cols:
-            if c in df.columns:
-                df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0)
-        return df
+        return self._get_frame('index', market, date, parse_index_rows)
+
+    def has_trading_data(self, date: str, market: str = 'KOSPI', kind: str = 'index') -> Optional[bool]:
+        """개장 여부 확인용 데이터 유무 — 거래일 캘린더 확정 기록에 사용
+
+        Returns:
+            True = 데이터 있음, False = 정상 응답 (200) 이 비어 있음,
+            None = 조회 실패 (non-200 / timeout / 예외) — 휴장으로 판단할 수 없음
+        """
+        try:
+            return bool(self._fetch(kind, market, date, strict=True))
+        except Exception as e:
+            logger.debug(f"KRX 데이터 유무 확인 실패 ({kind}/{market}, {date}): {e}")
+            return None
 
     def get_kospi_change(self, date: str) -> Optional[float]:
         """KOSPI 종합지수 일일 등락률 (편의 함수)
@@ -185,7 +301,10 @@ class KRXClient:
 
     def get_history(self, code: str, start: str, end: str,
                     market: str = 'KOSPI') -> pd.DataFrame:
-        """특정 종목의 기간 OHLCV (날짜 루프 fetch)
+        """특정 종목의 기간 OHLCV (일봉 패널 슬라이스)
+
+        패널(data/krx_panel/)에 없는 날짜만 get_stock_ohlcv로 채운 뒤 잘라서 반환.
+        use_cache=False 이면 기존 날짜 루프 방식.
 
         Args:
             code: 종목코드 6자리
@@ -194,8 +313,102 @@ class KRXClient:
             market: 'KOSPI' or 'KOSDAQ'
 
         Returns:
-            DataFrame: index=날짜, columns=[시가/고가/저가/종가/거래량/시가총액]
+            DataFrame: index=날짜, columns=[시가/고가/저가/종가/거래량/시가총액 ...]
+        """
+        if not self.use_cache:
+            return self._get_history_by_day(code, start, end, market)
+        panel = self._ensure_panel(market, start, end)
+        return panel.history(code, start, end)
+
+    def get_history_batch(self, codes: List[str], start: str, end: str,
+                          markets=('KOSPI', 'KOSDAQ')) -> Dict[str, pd.DataFrame]:
+        """여러 종목의 기간 OHLCV를 패널에서 한 번에 추출
+
+        Returns:
+            {code: DataFrame} — 어느 시장에도 없는 종목은 빈 DataFrame
         """
+        result: Dict[str, pd.DataFrame] = {}
+        remaining = list(dict.fromkeys(codes))
+        for market in markets:
+            if not remaining:
+                break
+            panel = self._ensure_panel(market, start, end)
+            found = panel.history_batch(remaining, start, end)
+            result.update(found)
+            remaining = [c for c in remaining if c not in found]
+        for code in remaining:
+            result[code] = pd.DataFrame()
+        return result
+
+    def get_history_matrix(self, codes: List[str], start: str, end: str,
+                           markets=('KOSPI', 'KOSDAQ'), fields=None):
+        """여러 종목 기간 OHLCV를 (날짜 × 종목) 행렬로 반환 (지표 엔진 입력)
+
+        Returns:
+            (dates, {field: ndarray(len(dates) × len(codes))}) — 결측 NaN
+        """
+        import numpy as np
+
+        per_market = []
+        for market in markets:
+            panel = self._ensure_panel(market, start, end)
+            per_market.append(panel.matrix(codes, start, end, fields))
+        if len(per_market) == 1:
+            return per_market[0]
+
+        dates = sorted(set().union(*(d for d, _ in per_market)))
+        pos = {d: i for i, d in enumerate(dates)}
+        names = list(per_market[0][1].keys())
+        out = {f: np.full((len(dates), len(codes)), np.nan) for f in names}
+        for m_dates, mats in per_market:
+            if not m_dates:
+                continue
+            rows = np.array([pos[d] for d in m_dates], dtype=np.int64)
+            has = ~np.isnan(mats['종가']).all(axis=0) if '종가' in mats else \
+                ~np.isnan(mats[names[0]]).all(axis=0)
+            for f in names:
+                out[f][np.ix_(rows, np.flatnonzero(has))] = mats[f][:, has]
+        return dates, out
+
+    def _ensure_panel(self, market: str, start: str, end: str):
+        """기간 내 평일 중 패널에 없는 날짜를 캐시/API에서 채움"""
+        from .krx_panel import get_panel
+
+        panel = get_panel(market)
+        today = datetime.now().strftime('%Y%m%d')
+        start_dt = datetime.strptime(start, '%Y%m%d')
+        end_dt = datetime.strptime(end, '%Y%m%d')
+
+        weekdays = []
+        cur = start_dt
+        while cur <= end_dt:
+            if cur.weekday() < 5:
+                weekdays.append(cur.strftime('%Y%m%d'))
+            cur += timedelta(days=1)
+
+        added = False
+        for date_str in panel.missing_dates(weekdays):
+            if (market, date_str) in _EMPTY_DATES:
+                continue
+            try:
+                df = self.get_stock_ohlcv(date_str, market=market)
+            except Exception as e:
+                logger.debug(f"{date_str} {market} fetch 실패: {e}")
+                continue
+            if df.empty:
+                # 휴장일 — 지난 날짜만 기억 (당일/미래는 장 마감 후 다시 조회)
+                if date_str < today:
+                    _EMPTY_DATES.add((market, date_str))
+                continue
+            panel.add(date_str, df)
+            added = True
+        if added:
+            panel.flush()
+        return panel
+
+    def _get_history_by_day(self, code: str, start: str, end: str,
+                            market: str = 'KOSPI') -> pd.DataFrame:
+        """날짜 루프 fetch (캐시 미사용 모드)"""
         start_dt = datetime.strptime(start, '%Y%m%d')
         end_dt = datetime.strptime(end, '%Y%m%d')
 
@@ -226,8 +439,25 @@ class KRXClient:
     # 내부: HTTP fetch + 캐시
     # ─────────────────────────────────────
 
-    def _fetch(self, kind: str, market: str, date: str) -> List[Dict]:
-        """엔드포인트 호출 + 캐시 + rate limit"""
+    def _get_frame(self, kind: str, market: str, date: str,
+                   parser: Callable[[List[Dict]], pd.DataFrame]) -> pd.DataFrame:
+        """_fetch + 파싱, 결과 DataFrame은 메모리 LRU에 보관
+
+        반환값은 캐시 원본의 얕은 복사 — 컬럼 추가/삭제는 캐시에 영향 없음.
+        """
+        if not self.use_cache:
+            return parser(self._fetch(kind, market, date))
+        df = _frame_cache.get_or_load(
+            (kind, market, date),
+            lambda: parser(self._fetch(kind, market, date)),
+        )
+        return df.copy(deep=False)
+
+    def _fetch(self, kind: str, market: str, date: str, strict: bool = False) -> List[Dict]:
+        """엔드포인트 호출 + 캐시 + rate limit
+
+        strict=False 면 실패 시 [] (빈 응답과 구분 안 됨), True 면 실패를 예외로 올린다.
+        """
         cache_key = f"{kind}_{market}_{date}.json"
         cache_path = CACHE_DIR / cache_key
 
@@ -262,6 +492,8 @@ class KRXClient:
                 )
             if r.status_code != 200:
                 logger.warning(f"KRX API {r.status_code}: {r.text[:200]}")
+                if strict:
+                    raise RuntimeError(f"KRX API {r.status_code}")
                 return []
             data = r.json()
             rows = data.get('OutBlock_1', [])
@@ -275,6 +507,8 @@ class KRXClient:
             return rows
         except Exception as e:
             logger.error(f"KRX API 호출 실패: {e}")
+            if strict:
+                raise
             return []
 
 
@@ -0,0 +1,395 @@
+"""
+KRX 일봉 패널 저장소 (code × date × field)
+
+- data/krx_cache/stock_<market>_<date>.json (일자별 전종목 응답)을 한 번만 파싱해서
+  시장별 2차원 배열(행=날짜, 열=종목코드)로 누적
+- 월별 청크 디렉터리(<YYYYMM>/필드.npy) + meta.json 으로 디스크에 보관, 로드 시 memory-map
+- 신규 날짜는 증분 추가 — 해당 월 청크만 다시 쓰고 나머지 월은 그대로
+
+사용 예:
+    panel = KRXPanel('KOSPI')
+    panel.sync()                                  # 캐시 폴더 전체 반영
+    df = panel.history('005930', '20250101', '20260410')
+
+KRXClient.get_history / get_history_batch 가 내부적으로 사용한다.
+"""
+
+import json
+import bisect
+import itertools
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .atomic_io import atomic_open, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+PANEL_DIR = Path(__file__).parent.parent.parent / "data" / "krx_panel"
+
+# 패널 필드 (get_stock_ohlcv 숫자 컬럼과 동일) → 파일명
+PANEL_FIELDS = {
+    '시가': 'open',
+    '고가': 'high',
+    '저가': 'low',
+    '종가': 'close',
+    '전일대비': 'change',
+    '등락률': 'change_pct',
+    '거래량': 'volume',
+    '거래대금': 'trading_value',
+    '시가총액': 'market_cap',
+    '상장주식수': 'listed_shares',
+}
+# 정수로 되돌리지 않는 필드 (get_stock_ohlcv 결과와 dtype 맞춤)
+FLOAT_FIELDS = {'등락률'}
+
+
+def _month(date: str) -> str:
+    """청크 키 (YYYYMM)"""
+    return date[:6]
+
+
+class _Chunk(NamedTuple):
+    """월 청크 — flush 시 통째로 교체 (조회는 스냅샷 참조)"""
+    start: int                      # 전체 날짜 목록에서 이 월 첫 날짜의 위치
+    n_codes: int                    # 열 수 (전체 종목 목록의 앞 n_codes 개)
+    arrays: Dict[str, np.ndarray]   # 필드 → (월 날짜 수 × n_codes)
+
+    @property
+    def rows(self) -> int:
+        return len(next(iter(self.arrays.values())))
+
+
+class KRXPanel:
+    """시장 하나의 일봉 패널
+
+    - 결측(해당일 미상장/거래정지로 응답에 없음)은 NaN
+    - 행 존재 판정은 종가 NaN 여부
+    - 종목 목록은 추가만 됨 → 월 청크는 그 시점 종목 목록의 앞부분만 열로 가짐
+    - 스레드 안전: 추가/flush 는 lock 보호, 조회는 스냅샷 참조
+    """
+
+    def __init__(self, market: str, panel_dir: Optional[Path] = None):
+        self.market = market
+        self.dir = Path(panel_dir or PANEL_DIR) / market
+        self._lock = threading.RLock()
+        self._dates: List[str] = []
+        self._codes: List[str] = []
+        self._date_pos: Dict[str, int] = {}
+        self._code_pos: Dict[str, int] = {}
+        self._chunks: Dict[str, _Chunk] = {}
+        # flush 전 추가분: {date: DataFrame(index=종목코드)}
+        self._pending: Dict[str, pd.DataFrame] = {}
+        self._load()
+
+    # ─────────────────────────────────────
+    # 조회
+    # ─────────────────────────────────────
+
+    @property
+    def dates(self) -> List[str]:
+        return list(self._dates)
+
+    def has_date(self, date: str) -> bool:
+        return date in self._date_pos or date in self._pending
+
+    def missing_dates(self, dates: Iterable[str]) -> List[str]:
+        """패널에 없는 날짜만 반환"""
+        return [d for d in dates if not self.has_date(d)]
+
+    def history(self, code: str, start: str, end: str) -> pd.DataFrame:
+        """단일 종목 기간 OHLCV
+
+        Returns:
+            DataFrame: index=날짜(YYYYMMDD), columns=PANEL_FIELDS 키
+                       (KRXClient.get_history 와 동일 형태)
+        """
+        return self.history_batch([code], start, end).get(code, pd.DataFrame())
+
+    def history_batch(self, codes: Iterable[str], start: str,
+                      end: str) -> Dict[str, pd.DataFrame]:
+        """여러 종목 기간 OHLCV — 날짜 범위 슬라이스 1회 후 종목별 열 추출
+
+        패널에 없는 종목은 결과에서 빠진다. 종가가 있는 행 중 다른 필드가
+        비어 있으면 그 필드는 float(NaN 유지)로 둔다.
+        """
+        codes = list(codes)
+        dates, cols, block = self._slice(codes, start, end, PANEL_FIELDS)
+        result: Dict[str, pd.DataFrame] = {}
+        if not dates:
+            return result
+
+        date_index = pd.Index(dates, name='날짜')
+        for k, code in enumerate(codes):
+            if cols[k] < 0:
+                continue
+            mask = ~np.isnan(block['종가'][:, k])
+            if not mask.any():
+                continue
+            data = {}
+            for field in PANEL_FIELDS:
+                col = block[field][mask, k]
+                if field not in FLOAT_FIELDS and not np.isnan(col).any():
+                    col = col.astype(np.int64)
+                data[field] = col
+            result[code] = pd.DataFrame(data, index=date_index[mask])
+        return result
+
+    def matrix(self, codes: List[str], start: str, end: str,
+               fields: Optional[Iterable[str]] = None):
+        """기간 × 종목 행렬 (지표 엔진 입력용, DataFrame 생성 없음)
+
+        Returns:
+            (dates, {field: ndarray(len(dates) × len(codes))}) — 패널에 없는 종목/날짜는 NaN
+        """
+        dates, _, out = self._slice(list(codes), start, end, list(fields or PANEL_FIELDS))
+        return dates, out
+
+    def _slice(self, codes: List[str], start: str, end: str,
+               fields: Iterable[str]) -> Tuple[List[str], np.ndarray, Dict[str, np.ndarray]]:
+        """[start, end] × codes 블록 — 걸치는 월 청크만 읽음
+
+        Returns:
+            (dates, 종목별 열 위치 (없으면 -1), {field: ndarray(len(dates) × len(codes))})
+        """
+        with self._lock:
+            if self._pending:
+                self.flush()
+            dates = self._dates
+            chunks = self._chunks
+            code_pos = self._code_pos
+
+        lo = bisect.bisect_left(dates, start)
+        hi = bisect.bisect_right(dates, end)
+        n = max(hi - lo, 0)
+        cols = np.array([code_pos.get(c, -1) for c in codes], dtype=np.int64)
+        out = {field: np.full((n, len(codes)), np.nan) for field in fields}
+
+        i = lo
+        while i < hi:
+            chunk = chunks[_month(dates[i])]
+            r0 = i - chunk.start
+            r1 = min(hi - chunk.start, chunk.rows)
+            sel = (cols >= 0) & (cols < chunk.n_codes)
+            if sel.any():
+                for field, mat in out.items():
+                    mat[i - lo:i - lo + r1 - r0, sel] = chunk.arrays[field][r0:r1][:, cols[sel]]
+            i += r1 - r0
+        return dates[lo:hi], cols, out
+
+    # ─────────────────────────────────────
+    # 증분 추가
+    # ─────────────────────────────────────
+
+    def add(self, date: str, df: pd.DataFrame) -> None:
+        """하루치 전종목 DataFrame(get_stock_ohlcv 결과) 추가 (flush 전까지 메모리)"""
+        if df is None or df.empty:
+            return
+        with self._lock:
+            if date in self._date_pos:
+                return
+            self._pending[date] = df
+
+    def sync(self, cache_dir: Optional[Path] = None) -> int:
+        """캐시 폴더에서 패널에 없는 날짜를 모두 읽어 반영
+
+        Returns:
+            int: 새로 추가된 날짜 수
+        """
+        from .krx_api import CACHE_DIR, parse_stock_rows
+
+        cache_dir = Path(cache_dir or CACHE_DIR)
+        prefix = f"stock_{self.market}_"
+        added = 0
+        for path in sorted(cache_dir.glob(f"{prefix}*.json")):
+            date = path.stem[len(prefix):]
+            if len(date) != 8 or not date.isdigit() or self.has_date(date):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    rows = json.load(f)
+            except Exception as e:
+                logger.debug(f"패널 sync 캐시 읽기 실패 {path.name}: {e}")
+                continue
+            df = parse_stock_rows(rows)
+            if not df.empty:
+                self.add(date, df)
+                added += 1
+        if added:
+            self.flush()
+        return added
+
+    def flush(self) -> None:
+        """pending 날짜를 해당 월 청크에 병합하고 그 청크만 디스크에 기록"""
+        with self._lock:
+            if not self._pending:
+                return
+            pending = self._pending
+            self._pending = {}
+
+            new_dates = sorted(set(self._dates) | set(pending))
+            new_codes = list(self._codes)
+            code_pos = dict(self._code_pos)
+            for df in pending.values():
+                for code in df.index:
+                    if code not in code_pos:
+                        code_pos[code] = len(new_codes)
+                        new_codes.append(code)
+
+            touched = {_month(d) for d in pending}
+            chunks: Dict[str, _Chunk] = {}
+            start = 0
+            for month, group in itertools.groupby(new_dates, key=_month):
+                month_dates = list(group)
+                old = self._chunks.get(month)
+                if month not in touched:
+                    chunks[month] = old._replace(start=start)
+                else:
+                    chunks[month] = self._merge_chunk(start, month_dates, old, pending,
+                                                      code_pos, len(new_codes))
+                start += len(month_dates)
+
+            self._dates = new_dates
+            self._codes = new_codes
+            self._date_pos = {d: i for i, d in enumerate(new_dates)}
+            self._code_pos = code_pos
+            self._chunks = chunks
+
+            try:
+                self._save(sorted(touched))
+            except Exception as e:
+                logger.warning(f"KRX 패널 저장 실패 ({self.market}): {e}")
+
+    def _merge_chunk(self, start: int, month_dates: List[str], old: Optional[_Chunk],
+                     pending: Dict[str, pd.DataFrame], code_pos: Dict[str, int],
+                     n_codes: int) -> _Chunk:
+        """기존 월 청크 + pending 날짜 → 새 월 청크 (월 크기만큼만 복사)"""
+        row_pos = {d: i for i, d in enumerate(month_dates)}
+        shape = (len(month_dates), n_codes)
+        arrays: Dict[str, np.ndarray] = {}
+        for field in PANEL_FIELDS:
+            arr = np.full(shape, np.nan, dtype=np.float64)
+            if old is not None:
+                old_rows = [row_pos[d] for d in self._dates[old.start:old.start + old.rows]]
+                arr[old_rows, :old.n_codes] = old.arrays[field]
+            arrays[field] = arr
+
+        for date in month_dates:
+            df = pending.get(date)
+            if df is None:
+                continue
+            i = row_pos[date]
+            cols = np.array([code_pos[c] for c in df.index], dtype=np.int64)
+            for field in PANEL_FIELDS:
+                if field in df.columns:
+                    arrays[field][i, cols] = df[field].to_numpy(dtype=np.float64)
+        return _Chunk(start, n_codes, arrays)
+
+    # ─────────────────────────────────────
+    # 내부: 디스크 I/O
+    # ─────────────────────────────────────
+
+    def _load(self) -> None:
+        meta_path = self.dir / 'meta.json'
+        if not meta_path.exists():
+            return
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            dates = meta['dates']
+            codes = meta['codes']
+            if 'chunks' not in meta:
+                chunks = self._load_legacy(dates, len(codes))
+            else:
+                chunks = {}
+                start = 0
+                for month, group in itertools.groupby(dates, key=_month):
+                    rows = len(list(group))
+                    n_codes = meta['chunks'][month]
+                    arrays = {}
+                    for field, name in PANEL_FIELDS.items():
+                        arr = np.load(self.dir / month / f"{name}.npy", mmap_mode='r')
+                        if arr.shape != (rows, n_codes):
+                            raise ValueError(f"{month}/{name}.npy shape {arr.shape} "
+                                             f"!= {(rows, n_codes)}")
+                        arrays[field] = arr
+                    chunks[month] = _Chunk(start, n_codes, arrays)
+                    start += rows
+        except Exception as e:
+            # 다른 프로세스가 쓰는 중이거나 깨진 경우 — 비우고 다시 채움
+            logger.warning(f"KRX 패널 로드 실패 ({self.market}), 재구성: {e}")
+            return
+        legacy = 'chunks' not in meta
+        self._dates = dates
+        self._codes = codes
+        self._date_pos = {d: i for i, d in enumerate(dates)}
+        self._code_pos = {c: j for j, c in enumerate(codes)}
+        self._chunks = chunks
+        if legacy:
+            try:
+                self._save(sorted(chunks))
+                for name in PANEL_FIELDS.values():
+                    (self.dir / f"{name}.npy").unlink(missing_ok=True)
+            except Exception as e:
+                logger.warning(f"KRX 패널 청크 변환 실패 ({self.market}): {e}")
+
+    def _load_legacy(self, dates: List[str], n_codes: int) -> Dict[str, _Chunk]:
+        """이전 형식 (전체 기간 필드.npy 1개씩) → 월 청크 (메모리 복사)"""
+        full = {}
+        for field, name in PANEL_FIELDS.items():
+            arr = np.load(self.dir / f"{name}.npy", mmap_mode='r')
+            if arr.shape != (len(dates), n_codes):
+                raise ValueError(f"{name}.npy shape {arr.shape} != {(len(dates), n_codes)}")
+            full[field] = arr
+        chunks = {}
+        start = 0
+        for month, group in itertools.groupby(dates, key=_month):
+            rows = len(list(group))
+            arrays = {f: np.array(a[start:start + rows]) for f, a in full.items()}
+            chunks[month] = _Chunk(start, n_codes, arrays)
+            start += rows
+        return chunks
+
+    def _save(self, months: Iterable[str]) -> None:
+        """바뀐 월 청크 → meta 순서로 tempfile + rename (meta가 마지막 커밋 역할)"""
+        for month in months:
+            chunk_dir = self.dir / month
+            chunk_dir.mkdir(parents=True, exist_ok=True)
+            arrays = self._chunks[month].arrays
+            for field, name in PANEL_FIELDS.items():
+                with atomic_open(chunk_dir / f"{name}.npy", 'wb') as f:
+                    np.save(f, arrays[field])
+        self.dir.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(self.dir / 'meta.json', {
+            'dates': self._dates,
+            'codes': self._codes,
+            'chunks': {m: c.n_codes for m, c in self._chunks.items()},
+        }, ensure_ascii=True)
+
+
+# 시장별 프로세스 공용 인스턴스 (KRXClient가 여러 개 생성돼도 패널은 하나)
+_panels: Dict[str, KRXPanel] = {}
+_panels_lock = threading.Lock()
+
+
+def get_panel(market: str) -> KRXPanel:
+    """시장별 KRXPanel 싱글톤"""
+    with _panels_lock:
+        panel = _panels.get(market)
+        if panel is None:
+            panel = KRXPanel(market)
+            _panels[market] = panel
+        return panel
+
+
+if __name__ == '__main__':
+    # 캐시 폴더 → 패널 일괄 구축
+    logging.basicConfig(level=logging.INFO)
+    for mkt in ('KOSPI', 'KOSDAQ'):
+        p = KRXPanel(mkt)
+        n = p.sync()
+        print(f"{mkt}: +{n}일 (총 {len(p.dates)}일)")
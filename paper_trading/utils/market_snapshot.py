@@ -0,0 +1,309 @@
+"""
+일자별 시장 스냅샷 (MarketSnapshot) — 전략 공용 유니버스
+
+배경:
+  StrategyRegistry.run_all 의 각 전략(momentum / largecap_contrarian / frontier_gap /
+  theme_policy / hybrid 의 서브 전략)이 같은 날짜의 KOSPI+KOSDAQ 전종목을
+  get_stock_ohlcv 로 각자 받아 df.loc[code] 로 행마다 dict 를 만들었다.
+  스냅샷은 그 날짜의 유니버스를 컬럼 배열로 1회 구성해 모든 전략이 공유한다.
+
+불변:
+  - 컬럼 배열은 read-only (setflags(write=False)), 속성 재할당 불가
+  - rows()/row() 는 매번 새 dict — 전략이 dict 에 필드를 추가해도 스냅샷은 그대로
+  - 지수/과거 행렬은 첫 접근 때 KRXClient 로 로드 후 메모 (lazy accessor)
+
+사용:
+    snap = get_market_snapshot('20260410')
+    for r in snap.rows():          # {'code','name','market','open',...,'market_cap'}
+        ...
+    snap.kospi_change()
+    dates, mats = snap.history_matrix(codes, '20260320', '20260410', fields=('종가',))
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MARKETS = ('KOSPI', 'KOSDAQ')
+
+# 스냅샷 컬럼 ← KRX 표준 컬럼 (parse_stock_rows)
+STOCK_FIELDS = {
+    'open': '시가',
+    'high': '고가',
+    'low': '저가',
+    'close': '종가',
+    'prev_change': '전일대비',
+    'change_pct': '등락률',
+    'volume': '거래량',
+    'trading_value': '거래대금',
+    'market_cap': '시가총액',
+}
+FLOAT_FIELDS = ('change_pct',)
+
+SNAPSHOT_CACHE_SIZE = 8
+
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    arr.setflags(write=False)
+    return arr
+
+
+class MarketSnapshot:
+    """한 날짜의 KOSPI+KOSDAQ 전종목 컬럼 배열 (불변)"""
+
+    def __init__(self, date: str, codes: Iterable[str], names: Iterable[str],
+                 markets: Iterable[str], columns: Dict[str, np.ndarray], krx=None):
+        codes = tuple(codes)
+        set_ = object.__setattr__
+        set_(self, 'date', date)
+        set_(self, 'codes', codes)
+        set_(self, 'names', tuple(names))
+        set_(self, 'markets', tuple(markets))
+        set_(self, '_columns', {k: _readonly(np.asarray(v)) for k, v in columns.items()})
+        set_(self, '_pos', {c: i for i, c in enumerate(codes)})
+        set_(self, '_krx', krx)
+        set_(self, '_memo', {})
+        set_(self, '_memo_lock', threading.Lock())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MarketSnapshot 은 불변입니다")
+
+    # ─────────────────────────────────────
+    # 생성
+    # ─────────────────────────────────────
+
+    @classmethod
+    def from_frames(cls, date: str, frames: Dict[str, pd.DataFrame], krx=None) -> 'MarketSnapshot':
+        """시장별 get_stock_ohlcv DataFrame → 스냅샷 (종가 0 종목 제외)"""
+        codes: List[str] = []
+        names: List[str] = []
+        markets: List[str] = []
+        parts: Dict[str, List[np.ndarray]] = {k: [] for k in STOCK_FIELDS}
+        for market in MARKETS:
+            df = frames.get(market)
+            if df is None or df.empty:
+                continue
+            close = df['종가'].to_numpy(dtype=float) if '종가' in df.columns else np.zeros(len(df))
+            keep = close != 0
+            sub = df[keep]
+            codes.extend(str(c) for c in sub.index)
+            if '종목명' in sub.columns:
+                names.extend(str(n) for n in sub['종목명'].tolist())
+            else:
+                names.extend(str(c) for c in sub.index)
+            markets.extend([market] * len(sub))
+            for field, col in STOCK_FIELDS.items():
+                if col in sub.columns:
+                    vals = pd.to_numeric(sub[col], errors='coerce').fillna(0).to_numpy(dtype=float)
+                else:
+                    vals = np.zeros(len(sub))
+                parts[field].append(vals)
+
+        columns = {}
+        for field, chunks in parts.items():
+            arr = np.concatenate(chunks) if chunks else np.zeros(0)
+            columns[field] = arr if field in FLOAT_FIELDS else arr.astype(np.int64)
+        return cls(date, codes, names, markets, columns, krx=krx)
+
+    @classmethod
+    def load(cls, date: str, krx=None) -> 'MarketSnapshot':
+        """KRXClient 로 시장별 전종목을 받아 구성 (실패 시장은 빈 채로)"""
+        if krx is None:
+            krx = _default_krx()
+        frames = {}
+        if krx is not None:
+            for market in MARKETS:
+                try:
+                    frames[market] = krx.get_stock_ohlcv(date, market=market)
+                except Exception as e:
+                    logger.warning(f"스냅샷 {market} {date} fetch 실패: {e}")
+        return cls.from_frames(date, frames, krx=krx)
+
+    # ─────────────────────────────────────
+    # 조회
+    # ─────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code) -> bool:
+        return code in self._pos
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.codes
+
+    def column(self, field: str) -> np.ndarray:
+        """컬럼 배열 (read-only). field: STOCK_FIELDS 키"""
+        return self._columns[field]
+
+    def position(self, code: str) -> Optional[int]:
+        return self._pos.get(code)
+
+    def row(self, code: str) -> Optional[Dict]:
+        """종목 1개 dict (없으면 None)"""
+        i = self._pos.get(code)
+        if i is None:
+            return None
+        out = {'code': code, 'name': self.names[i], 'market': self.markets[i]}
+        for field in STOCK_FIELDS:
+            v = self._columns[field][i]
+            out[field] = float(v) if field in FLOAT_FIELDS else int(v)
+        return out
+
+    def rows(self, codes: Optional[Iterable[str]] = None) -> List[Dict]:
+        """종목별 dict 리스트 — 키: code, name, market + STOCK_FIELDS (매번 새 dict)
+
+        codes 지정 시 그 순서대로, 스냅샷에 없는 코드는 생략.
+        """
+        if codes is None:
+            idx = range(len(self.codes))
+        else:
+            idx = [i for i in (self._pos.get(c) for c in codes) if i is not None]
+        idx = list(idx)
+        cols = {f: self._columns[f][idx].tolist() for f in STOCK_FIELDS}
+        out = []
+        for n, i in enumerate(idx):
+            r = {'code': self.codes[i], 'name': self.names[i], 'market': self.markets[i]}
+            for f in STOCK_FIELDS:
+                r[f] = cols[f][n]
+            out.append(r)
+        return out
+
+    def stock_dicts(self, codes: Optional[Iterable[str]] = None) -> List[Dict]:
+        """전략 공통 종목 dict (기존 df.loc 루프와 동일한 키/타입)
+
+        키: code, name, price(종가), change_pct, volume, trading_value, market_cap, market
+        """
+        return [{
+            'code': r['code'],
+            'name': r['name'],
+            'price': r['close'],
+            'change_pct': r['change_pct'],
+            'volume': r['volume'],
+            'trading_value': r['trading_value'],
+            'market_cap': r['market_cap'],
+            'market': r['market'],
+        } for r in self.rows(codes)]
+
+    # ─────────────────────────────────────
+    # lazy accessor (KRX)
+    # ─────────────────────────────────────
+
+    def _memoized(self, key, loader):
+        with self._memo_lock:
+            if key in self._memo:
+                return self._memo[key]
+        value = loader()
+        with self._memo_lock:
+            return self._memo.setdefault(key, value)
+
+    def index_ohlcv(self, market: str = 'KOSPI') -> pd.DataFrame:
+        """지수 일별 DataFrame (없으면 빈 DataFrame)"""
+        def load():
+            if self._krx is None:
+                return pd.DataFrame()
+            try:
+                return self._krx.get_index_ohlcv(self.date, market=market)
+            except Exception as e:
+                logger.debug(f"지수 {market} {self.date} 조회 실패: {e}")
+                return pd.DataFrame()
+        return self._memoized(('index', market), load)
+
+    def kospi_change(self) -> Optional[float]:
+        """KOSPI 종합지수 등락률 (실패 시 None)"""
+        if self._krx is None:
+            return None
+        return self._memoized(('kospi_change',), lambda: self._krx.get_kospi_change(self.date))
+
+    def history_matrix(self, codes: List[str], start: str, end: str,
+                       fields: Tuple[str, ...] = ('종가',)):
+        """KRXClient.get_history_matrix 메모 — 시장은 스냅샷의 소속 시장으로 자동 지정"""
+        if self._krx is None:
+            raise RuntimeError("KRX 클라이언트 없음 — 과거 행렬 조회 불가")
+        codes = list(codes)
+        markets = tuple(dict.fromkeys(
+            self.markets[self._pos[c]] for c in codes if c in self._pos)) or ('KOSPI',)
+        key = ('history', tuple(codes), start, end, tuple(fields))
+        return self._memoized(key, lambda: self._krx.get_history_matrix(
+            codes, start, end, markets=markets, fields=tuple(fields)))
+
+    def __repr__(self):
+        return f"<MarketSnapshot {self.date} {len(self)}종목>"
+
+
+# ─────────────────────────────────────
+# 프로세스 공용 LRU
+# ─────────────────────────────────────
+
+_snapshots: 'OrderedDict[str, MarketSnapshot]' = OrderedDict()
+_snapshots_lock = threading.Lock()
+_build_locks: Dict[str, threading.Lock] = {}
+_default_client = None
+
+
+def _default_krx():
+    """KRXClient lazy 싱글톤 (실패 시 None)"""
+    global _default_client
+    if _default_client is None:
+        try:
+            from .krx_api import KRXClient
+            _default_client = KRXClient()
+        except Exception as e:
+            logger.warning(f"KRX 초기화 실패: {e}")
+            _default_client = False
+    return _default_client if _default_client else None
+
+
+def _cached(date: str, krx) -> Optional[MarketSnapshot]:
+    """메모된 스냅샷 — krx 를 지정했는데 다른 클라이언트로 만든 것이면 miss"""
+    snap = _snapshots.get(date)
+    if snap is None or (krx is not None and snap._krx is not krx):
+        return None
+    _snapshots.move_to_end(date)
+    return snap
+
+
+def get_market_snapshot(date: str, krx=None) -> MarketSnapshot:
+    """날짜별 스냅샷 (LRU 메모, 같은 날짜 동시 요청은 1회 구성)
+
+    빈 스냅샷(휴장/장 마감 전/KRX 실패)은 메모하지 않는다 — 다음 호출 때 재시도.
+    """
+    with _snapshots_lock:
+        snap = _cached(date, krx)
+        if snap is not None:
+            return snap
+        lock = _build_locks.setdefault(date, threading.Lock())
+
+    with lock:
+        with _snapshots_lock:
+            snap = _cached(date, krx)
+        if snap is not None:
+            return snap
+        snap = MarketSnapshot.load(date, krx=krx)
+        with _snapshots_lock:
+            _build_locks.pop(date, None)
+            if not snap.is_empty:
+                _snapshots[date] = snap
+                while len(_snapshots) > SNAPSHOT_CACHE_SIZE:
+                    _snapshots.popitem(last=False)
+        return snap
+
+
+def clear_market_snapshots() -> None:
+    with _snapshots_lock:
+        _snapshots.clear()
+
+
+__all__ = [
+    'MarketSnapshot',
+    'STOCK_FIELDS',
+    'get_market_snapshot',
+    'clear_market_snapshots',
+]
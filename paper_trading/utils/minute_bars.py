@@ -0,0 +1,365 @@
+"""
+분봉 컨테이너 (MinuteBars) + 경로 엔진 — 장중 익절/손절/트레일링 최초 도달 일괄 계산
+
+배경:
+  분봉은 {'time': 'HH:MM:SS', 'open', 'high', 'low', 'close', 'volume'} dict 리스트로
+  전달되고, IntradayCollector.analyze_profit_loss / analyze_multi_scenario,
+  TradingSimulator._find_trailing_exit_from_bars, IntradayBacktest._simulate_single_trade,
+  BNFSimulator.find_entry_points / find_exit_points 가 각자 봉마다 문자열 시각을
+  비교하며 순회했다. 이 모듈은 분봉을 구조화 배열 1개로 바꾸고, 누적 최대/최소와
+  최초 도달 인덱스를 배열 연산으로 계산한다. 호출부의 반환 형태는 그대로다.
+
+컨테이너:
+  - data: BAR_DTYPE 구조화 배열 (read-only) — minute = 자정 기준 분 (09:05 → 545,
+    파싱 불가 시각은 -1), 가격/거래량은 원 단위 정수
+  - labels: 원본 시각 문자열 (결과 dict 의 *_time 필드는 원본 그대로 돌려준다)
+  1분봉이므로 초 단위는 무시한다 ('09:05:00' 과 '09:05' 는 같은 분).
+
+경로 엔진:
+  - first_index(mask)          : 최초 True 인덱스 (없으면 -1, 마지막 축 기준)
+  - tp_sl_path(...)            : 익절가/손절가 최초 도달 인덱스 + 구간 최대수익/최대손실
+                                 (익절/손절가 배열이면 시나리오 전체를 한 번에)
+  - trailing_path(...)         : 누적 최대수익 기반 트레일링 매도선 최초 터치
+  - exit_grid(...)             : (익절 × 손절 × 트레일링 ladder) 그리드 전체의 청산 유형/시각/가격
+                                 — 누적 최대/최소 위 searchsorted 로 목표가마다 O(log N)
+
+사용:
+    bars = as_minute_bars(minute_data)
+    path = tp_sl_path(bars, entry, profit_px=[10300, 10500], loss_px=[9800, 9700],
+                      mask=bars.since('09:05:00'))
+    path.profit_idx      # 시나리오별 최초 익절 분봉 인덱스 (-1 = 미도달)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .exit_engine import (
+    EXIT_CLOSE, EXIT_INVALID, EXIT_LOSS, EXIT_PROFIT, EXIT_TRAILING, EXIT_TYPES,
+    trailing_exit_pct,
+)
+
+
+BAR_DTYPE = np.dtype([
+    ('minute', np.int16),
+    ('open', np.int64),
+    ('high', np.int64),
+    ('low', np.int64),
+    ('close', np.int64),
+    ('volume', np.int64),
+])
+PRICE_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def parse_minute(t) -> int:
+    """'HH:MM[:SS]' → 자정 기준 분 (파싱 불가 -1)"""
+    if isinstance(t, (int, np.integer)):
+        return int(t)
+    try:
+        return int(t[:2]) * 60 + int(t[3:5])
+    except (TypeError, ValueError):
+        return -1
+
+
+class MinuteBars:
+    """하루치 분봉 구조화 배열 (불변)"""
+
+    __slots__ = ('data', 'labels')
+
+    def __init__(self, data: np.ndarray, labels: Sequence[str]):
+        data.setflags(write=False)
+        self.data = data
+        self.labels = tuple(labels)
+
+    @classmethod
+    def from_dicts(cls, bars: Iterable[Dict]) -> 'MinuteBars':
+        """분봉 dict 리스트 → 컨테이너 (누락/None 가격은 0)"""
+        bars = list(bars or ())
+        data = np.zeros(len(bars), dtype=BAR_DTYPE)
+        labels = [b.get('time', '') or '' for b in bars]
+        data['minute'] = [parse_minute(t) for t in labels]
+        for f in PRICE_FIELDS:
+            data[f] = [b.get(f) or 0 for b in bars]
+        return cls(data, labels)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def minute(self) -> np.ndarray:
+        return self.data['minute']
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.data['open']
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.data['high']
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.data['low']
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.data['close']
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.data['volume']
+
+    def since(self, time_str) -> np.ndarray:
+        """time_str 이후(포함) 분봉 마스크 — 기존 `candle['time'] < t: continue` 의 반대"""
+        return self.minute >= parse_minute(time_str)
+
+    def index_of(self, time_str) -> int:
+        """시각이 일치하는 첫 분봉 인덱스 (없으면 -1)"""
+        return first_index(self.minute == parse_minute(time_str))
+
+    def __repr__(self):
+        span = f"{self.labels[0]}~{self.labels[-1]}" if self.labels else "empty"
+        return f"<MinuteBars {len(self)}봉 {span}>"
+
+
+def as_minute_bars(bars: Union[MinuteBars, Iterable[Dict], None]) -> MinuteBars:
+    """dict 리스트 또는 MinuteBars → MinuteBars"""
+    if isinstance(bars, MinuteBars):
+        return bars
+    return MinuteBars.from_dicts(bars)
+
+
+def first_index(mask) -> Union[int, np.ndarray]:
+    """마지막 축 기준 최초 True 인덱스 (없으면 -1). 1차원이면 int"""
+    mask = np.asarray(mask, dtype=bool)
+    if mask.shape[-1] == 0:
+        out = np.full(mask.shape[:-1], -1, dtype=np.int64)
+    else:
+        out = np.where(mask.any(axis=-1), mask.argmax(axis=-1), -1)
+    return int(out) if out.ndim == 0 else out
+
+
+def _pct(prices: np.ndarray, entry_price: float) -> np.ndarray:
+    """(가격 - 진입가) / 진입가 × 100 — 기존 루프와 같은 연산 순서"""
+    if entry_price <= 0:
+        return np.zeros(len(prices))
+    return (prices - entry_price) / entry_price * 100
+
+
+@dataclass
+class TouchPath:
+    """tp_sl_path 결과 — 시나리오 축 (S,) 배열
+
+    profit_idx / loss_idx: 최초 익절/손절 도달 분봉 인덱스 (-1 = 미도달)
+    max_profit_pct / max_loss_pct: 분석 구간 (고가/저가 기준) 최대수익/최대손실, 0 에서 시작
+    """
+    profit_idx: np.ndarray
+    loss_idx: np.ndarray
+    max_profit_pct: np.ndarray
+    max_loss_pct: np.ndarray
+
+    def first_hit(self, s: int = 0) -> Tuple[Optional[str], int]:
+        """시나리오 s 의 먼저 도달한 쪽 ('profit'/'loss'/None, 인덱스) — 같은 봉이면 익절"""
+        p, l = int(self.profit_idx[s]), int(self.loss_idx[s])
+        if p >= 0 and (l < 0 or p <= l):
+            return 'profit', p
+        if l >= 0:
+            return 'loss', l
+        return None, -1
+
+
+def tp_sl_path(bars: MinuteBars, entry_price: float, profit_px, loss_px,
+               mask: Optional[np.ndarray] = None,
+               stop_when_both: bool = False) -> TouchPath:
+    """익절가(고가 ≥)/손절가(저가 ≤) 최초 도달 + 구간 최대수익/최대손실
+
+    Args:
+        profit_px, loss_px: 스칼라 또는 시나리오별 (S,) 배열
+        mask: 분석 대상 분봉 (None = 전체)
+        stop_when_both: True 면 익절·손절 둘 다 도달한 봉까지만 최대수익/손실 집계
+                        (analyze_profit_loss 의 break 와 동일)
+    """
+    n = len(bars)
+    mask = np.ones(n, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+    pp = np.atleast_1d(np.asarray(profit_px, dtype=np.float64))[:, None]
+    lp = np.atleast_1d(np.asarray(loss_px, dtype=np.float64))[:, None]
+    profit_idx = np.atleast_1d(first_index(mask & (bars.high >= pp)))
+    loss_idx = np.atleast_1d(first_index(mask & (bars.low <= lp)))
+
+    stop = np.full(profit_idx.shape, n - 1)
+    if stop_when_both:
+        both = (profit_idx >= 0) & (loss_idx >= 0)
+        stop = np.where(both, np.maximum(profit_idx, loss_idx), stop)
+
+    if n == 0:
+        zeros = np.zeros(profit_idx.shape)
+        return TouchPath(profit_idx, loss_idx, zeros, zeros.copy())
+    run_max = np.maximum.accumulate(np.where(mask, _pct(bars.high, entry_price), 0.0))
+    run_min = np.minimum.accumulate(np.where(mask, _pct(bars.low, entry_price), 0.0))
+    max_profit = np.maximum(run_max[stop], 0.0)
+    max_loss = np.minimum(run_min[stop], 0.0)
+    return TouchPath(profit_idx, loss_idx, max_profit, max_loss)
+
+
+def trailing_path(bars: MinuteBars, entry_price: float,
+                  levels: Sequence[Tuple[float, float]],
+                  mask: Optional[np.ndarray] = None,
+                  eps: float = 1e-9) -> Optional[Tuple[int, float, float]]:
+    """누적 최대수익 트레일링 매도선을 저가가 처음 깨는 분봉
+
+    봉마다 (1) 직전까지의 최대수익 기준 매도선, (2) 이번 봉 고가로 갱신한 최대수익 기준
+    매도선 순으로 저가 ≤ 매도선 + eps 를 검사한다 (TradingSimulator 기존 루프와 동일).
+
+    Returns:
+        (분봉 인덱스, 매도선 가격 (절사 전), 그 시점 최대수익 %) 또는 None
+    """
+    n = len(bars)
+    if n == 0 or entry_price <= 0:
+        return None
+    mask = np.ones(n, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+    high_pct = np.where(mask, _pct(bars.high, entry_price), 0.0)
+    post_max = np.maximum.accumulate(np.maximum(high_pct, 0.0))
+    prev_max = np.concatenate(([0.0], post_max[:-1]))
+
+    def touched(run_max):
+        thr = trailing_exit_pct(run_max, levels)
+        price = entry_price * (1 + thr / 100)
+        return mask & ~np.isnan(thr) & (bars.low <= price + eps), price
+
+    hit_prev, px_prev = touched(prev_max)
+    hit_post, px_post = touched(post_max)
+    i = first_index(hit_prev | hit_post)
+    if i < 0:
+        return None
+    if hit_prev[i]:
+        return i, float(px_prev[i]), float(prev_max[i])
+    return i, float(px_post[i]), float(post_max[i])
+
+
+@dataclass
+class ExitGrid:
+    """exit_grid 결과 — 모든 배열 shape (P, L, T) = (익절 목표, 손절 목표, 트레일링 ladder)
+
+    exit_code: exit_engine 코드 (EXIT_PROFIT / LOSS / TRAILING / CLOSE, 판정 불가 EXIT_INVALID)
+    exit_idx: 청산 분봉 인덱스 (종가 청산 = 분석 구간 마지막 분봉, 판정 불가 -1)
+    exit_price: 청산가 (룰 청산은 슬리피지 반영 후 원 단위 절사, 종가 청산은 종가)
+    return_pct: (청산가 - 진입가) / 진입가 × 100
+    """
+    profit_targets: np.ndarray
+    loss_targets: np.ndarray
+    trailing_ladders: tuple
+    exit_code: np.ndarray
+    exit_idx: np.ndarray
+    exit_price: np.ndarray
+    return_pct: np.ndarray
+    labels: tuple
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.exit_code.shape
+
+    def point(self, p: int, l: int, t: int = 0) -> Dict:
+        """그리드 한 점 → {'type', 'time', 'price', 'return_pct'}"""
+        i = int(self.exit_idx[p, l, t])
+        return {
+            'type': EXIT_TYPES[int(self.exit_code[p, l, t])],
+            'time': self.labels[i] if i >= 0 else None,
+            'price': int(self.exit_price[p, l, t]),
+            'return_pct': float(self.return_pct[p, l, t]),
+        }
+
+
+# 같은 분봉에서 여러 룰이 동시에 도달했을 때 우선순위 (앞쪽 우선, 보수적)
+SAME_BAR_PRIORITY = ('loss', 'profit', 'trailing')
+
+
+def exit_grid(bars, entry_price: float, profit_targets, loss_targets,
+              trailing_ladders: Optional[Sequence[Optional[Sequence[Tuple[float, float]]]]] = None,
+              mask: Optional[np.ndarray] = None,
+              slippage_pct: float = 0.0,
+              same_bar: Sequence[str] = SAME_BAR_PRIORITY) -> ExitGrid:
+    """분봉 1개 경로로 (익절 × 손절 × 트레일링 ladder) 그리드 전체를 판정
+
+    누적 최대 고가/최소 저가는 단조이므로 목표가별 최초 도달 인덱스는
+    searchsorted 한 번으로 구한다. 트레일링은 ladder 마다 trailing_path 1회.
+    그리드 점마다 가장 먼저 도달한 룰로 청산하고, 아무 룰도 도달하지 않으면
+    분석 구간 마지막 분봉 종가로 청산한다.
+
+    Args:
+        profit_targets: 익절 목표 % 리스트 (P,)
+        loss_targets: 손절 목표 % 리스트 (L,), 음수
+        trailing_ladders: [(트리거%, drawback%), ...] ladder 리스트 (T,) — None 항목 = 트레일링 없음.
+                          미지정 시 [None]
+        mask: 분석 대상 분봉 (진입 시각 이후 등)
+        slippage_pct: 룰 청산가 슬리피지 %
+        same_bar: 같은 분봉 동시 도달 시 우선순위
+    """
+    bars = as_minute_bars(bars)
+    n = len(bars)
+    pt = np.atleast_1d(np.asarray(profit_targets, dtype=np.float64))
+    lt = np.atleast_1d(np.asarray(loss_targets, dtype=np.float64))
+    ladders = tuple(trailing_ladders) if trailing_ladders else (None,)
+    shape = (len(pt), len(lt), len(ladders))
+    mask = np.ones(n, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+    valid = np.flatnonzero(mask)
+
+    if entry_price <= 0 or valid.size == 0:
+        return ExitGrid(pt, lt, ladders, np.full(shape, EXIT_INVALID, dtype=np.int8),
+                        np.full(shape, -1), np.zeros(shape), np.zeros(shape), bars.labels)
+
+    slip = 1 - slippage_pct / 100
+    # 누적 최대 고가 / 최소 저가 — 마스크 밖 분봉은 영향 없음, 둘 다 단조
+    prefix_max = np.maximum.accumulate(np.where(mask, bars.high, -np.inf))
+    prefix_min = np.minimum.accumulate(np.where(mask, bars.low, np.inf))
+    profit_px = entry_price * (1 + pt / 100)
+    loss_px = entry_price * (1 + lt / 100)
+    first = {
+        'profit': np.searchsorted(prefix_max, profit_px, side='left')[:, None, None],
+        'loss': np.searchsorted(-prefix_min, -loss_px, side='left')[None, :, None],
+    }
+    rule_price = {
+        'profit': np.floor(profit_px * slip)[:, None, None],
+        'loss': np.floor(loss_px * slip)[None, :, None],
+    }
+    trail_idx = np.full(len(ladders), n)
+    trail_price = np.zeros(len(ladders))
+    for t, ladder in enumerate(ladders):
+        hit = trailing_path(bars, entry_price, ladder, mask=mask) if ladder else None
+        if hit is not None:
+            trail_idx[t] = hit[0]
+            trail_price[t] = np.floor(hit[1] * slip)
+    first['trailing'] = trail_idx[None, None, :]
+    rule_price['trailing'] = trail_price[None, None, :]
+    codes = {'profit': EXIT_PROFIT, 'loss': EXIT_LOSS, 'trailing': EXIT_TRAILING}
+
+    # 룰별 최초 도달 인덱스를 우선순위 순으로 쌓고 최소값 — argmin 은 동률이면 앞쪽 룰
+    order = list(same_bar)
+    stacked = np.stack([np.broadcast_to(first[r], shape) for r in order])
+    which = stacked.argmin(axis=0)
+    exit_idx = stacked.min(axis=0)
+
+    exit_code = np.full(shape, EXIT_CLOSE, dtype=np.int8)
+    exit_price = np.full(shape, float(bars.close[valid[-1]]))
+    for k, rule in enumerate(order):
+        sel = (which == k) & (exit_idx < n)
+        exit_code[sel] = codes[rule]
+        exit_price = np.where(sel, np.broadcast_to(rule_price[rule], shape), exit_price)
+    exit_idx = np.where(exit_idx < n, exit_idx, valid[-1])
+    return_pct = (exit_price - entry_price) / entry_price * 100
+    return ExitGrid(pt, lt, ladders, exit_code, exit_idx, exit_price, return_pct, bars.labels)
+
+
+__all__ = [
+    'BAR_DTYPE',
+    'MinuteBars',
+    'as_minute_bars',
+    'parse_minute',
+    'first_index',
+    'TouchPath',
+    'tp_sl_path',
+    'trailing_path',
+    'ExitGrid',
+    'exit_grid',
+    'SAME_BAR_PRIORITY',
+]
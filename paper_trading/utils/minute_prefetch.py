@@ -0,0 +1,125 @@
+"""
+분봉 선수집기 — 시뮬레이션 전 (code, date) 분봉을 병렬로 받아 분봉 저장소를 채움
+
+배경:
+  아레나 / IntradayCollector.collect_intraday_data 는 종목을 하나씩 직렬로
+  KIS → 네이버 OHLC → 네이버 sise_time 폴백 체인에 태웠다 (요청 시간의 합).
+  이 모듈은 전체 팀 후보의 합집합을 스레드 풀로 동시에 처리하되,
+  소스별 동시 실행 수를 세마포어로 제한해 총 소요를 가장 느린 소스 수준으로 줄인다.
+
+동시성 제한:
+  - 소스별 세마포어 (SOURCE_LIMITS) — 폴백 단계마다 해당 소스 슬롯을 잡고 호출
+  - KIS 초당 한도는 kis_api 공용 TokenBucket 이 별도로 보장
+  - 같은 (code, date) 중복 요청은 MinuteBarStore 가 1회로 합침
+
+사용:
+    MinuteBarPrefetcher().prefetch([(code, date), ...])
+    # 이후 IntradayCollector.get_minute_data(code, date) 는 저장소 hit
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from .minute_store import MinuteBarStore, get_minute_store
+
+logger = logging.getLogger(__name__)
+
+# 소스별 동시 실행 상한
+SOURCE_LIMITS: Dict[str, int] = {
+    'kis': 4,         # 초당 한도는 TokenBucket 이 관리 — 응답 대기만 겹침
+    'naver_ohlc': 4,  # api.stock.naver.com 단건 JSON
+    'naver_sise': 2,  # sise_time 페이지 크롤링 (페이지당 0.2s sleep)
+}
+
+
+def _default_collector(store: MinuteBarStore):
+    from intraday_collector import IntradayCollector
+    return IntradayCollector(minute_store=store)
+
+
+class MinuteBarPrefetcher:
+    """(code, date) 목록을 소스별 동시 제한 하에 병렬 수집해 MinuteBarStore 에 적재"""
+
+    def __init__(self, store: Optional[MinuteBarStore] = None,
+                 limits: Optional[Dict[str, int]] = None,
+                 max_workers: Optional[int] = None,
+                 collector_factory: Optional[Callable] = None):
+        self.store = store or get_minute_store()
+        self.limits = {**SOURCE_LIMITS, **(limits or {})}
+        self.max_workers = max_workers or sum(self.limits.values())
+        self._gates = {src: threading.BoundedSemaphore(n) for src, n in self.limits.items()}
+        self._collector_factory = collector_factory or _default_collector
+        # IntradayCollector 는 requests.Session 을 가짐 → 워커 스레드별 1개
+        self._local = threading.local()
+
+    def _gate(self, source: str):
+        return self._gates.get(source) or nullcontext()
+
+    def _collector(self):
+        collector = getattr(self._local, 'collector', None)
+        if collector is None:
+            collector = self._collector_factory(self.store)
+            self._local.collector = collector
+        return collector
+
+    def _load(self, code: str, date: str) -> int:
+        collector = self._collector()
+        return len(self.store.get_or_load(
+            code, date, lambda: collector.fetch_minute_data(code, date, gate=self._gate)))
+
+    def prefetch(self, pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+        """분봉 선수집
+
+        Args:
+            pairs: [(code, date), ...] — 중복/빈 값 허용
+
+        Returns:
+            {(code, date): 분봉 수} (이미 저장소에 있던 항목 포함)
+        """
+        keys = list(dict.fromkeys((str(c), str(d)) for c, d in pairs if c and d))
+        results: Dict[Tuple[str, str], int] = {}
+        pending = []
+        for key in keys:
+            bars = self.store.get(*key)
+            if bars is None:
+                pending.append(key)
+            else:
+                results[key] = len(bars)
+
+        if not pending:
+            return results
+
+        t0 = time.time()
+        workers = min(self.max_workers, len(pending))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = {ex.submit(self._load, code, date): (code, date) for code, date in pending}
+            for fut in as_completed(futures):
+                key = futures[fut]
+                try:
+                    results[key] = fut.result()
+                except Exception as e:
+                    logger.debug(f"분봉 선수집 실패 {key}: {e}")
+                    results[key] = 0
+
+        filled = sum(1 for k in pending if results.get(k))
+        print(f"  [분봉 선수집] {len(pending)}건 fetch ({filled}건 수신, "
+              f"캐시 {len(keys) - len(pending)}건) — {time.time() - t0:.1f}s, 동시 {workers}")
+        return results
+
+
+def prefetch_minute_bars(pairs: Iterable[Tuple[str, str]],
+                         store: Optional[MinuteBarStore] = None,
+                         **kwargs) -> Dict[Tuple[str, str], int]:
+    """MinuteBarPrefetcher(store, **kwargs).prefetch(pairs) 축약"""
+    return MinuteBarPrefetcher(store=store, **kwargs).prefetch(pairs)
+
+
+__all__ = [
+    'SOURCE_LIMITS',
+    'MinuteBarPrefetcher',
+    'prefetch_minute_bars',
+]
@@ -0,0 +1,167 @@
+"""
+분봉 공용 저장소 — (종목코드, 날짜) 단위 실행 범위 캐시 + 디스크 계층
+
+배경:
+  TradingSimulator._simulate_trade_intraday 한 건이 같은 종목·날짜 분봉을
+  analyze_profit_loss / _check_0930_trend / 트레일링 재스캔에서 최대 3번 받고,
+  ArenaManager.run_daily 는 같은 종목을 보유한 팀마다 이를 반복했다.
+  이 저장소는 IntradayCollector.get_minute_data 뒤에 놓여 (code, date) 당
+  fetch 를 실행(run)마다 최대 1회로 만든다.
+
+계층:
+  1) 메모리 — 프로세스 공용, 빈 결과도 기억 (같은 실행 내 재시도 방지)
+  2) 디스크 — data/intraday/minute/{date}/{code}.json
+     완결된 분봉(지난 날짜 또는 장 마감 후 당일)만 호출부가 persist=True 로 저장
+
+사용:
+    store = get_minute_store()
+    bars = store.get_or_load(code, date, lambda: (fetch(code, date), persist))
+    store.clear()   # 실행(run) 경계 — 메모리 계층만 비움
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .atomic_io import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+MINUTE_DIR = Path(__file__).parent.parent.parent / "data" / "intraday" / "minute"
+
+Bars = List[Dict]
+
+
+class MinuteBarStore:
+    """(code, date) → 1분봉 리스트 캐시
+
+    - 스레드 안전: 같은 키 동시 miss 시 로드는 1회만 (나머지는 대기 후 hit)
+    - hits / disk_hits / misses 카운터
+    - 반환 리스트는 공유 객체 — 호출부는 수정하지 않는다
+    """
+
+    def __init__(self, disk_dir: Optional[Path] = None, use_disk: bool = True):
+        self.disk_dir = Path(disk_dir) if disk_dir else MINUTE_DIR
+        self.use_disk = use_disk
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._data: Dict[Tuple[str, str], Bars] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+    def _path(self, code: str, date: str) -> Path:
+        return self.disk_dir / date / f"{code}.json"
+
+    def get(self, code: str, date: str) -> Optional[Bars]:
+        """메모리 → 디스크 순 조회 (없으면 None, fetch 안 함)"""
+        key = (code, date)
+        with self._lock:
+            bars = self._data.get(key)
+            if bars is not None:
+                self.hits += 1
+                return bars
+        bars = self._load_disk(code, date)
+        if bars is not None:
+            with self._lock:
+                self._data[key] = bars
+                self.disk_hits += 1
+        return bars
+
+    def get_or_load(self, code: str, date: str,
+                    loader: Callable[[], Tuple[Bars, bool]]) -> Bars:
+        """캐시 hit 이면 반환, 아니면 loader() → (bars, persist) 결과를 저장 후 반환
+
+        persist=True 이고 bars 가 비어있지 않을 때만 디스크에 기록한다.
+        """
+        bars = self.get(code, date)
+        if bars is not None:
+            return bars
+
+        key = (code, date)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # 대기 중 다른 스레드가 채웠을 수 있음
+            with self._lock:
+                bars = self._data.get(key)
+                if bars is not None:
+                    self.hits += 1
+                    return bars
+                self.misses += 1
+            try:
+                bars, persist = loader()
+                bars = bars or []
+                self.put(code, date, bars, persist=persist)
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+            return bars
+
+    def put(self, code: str, date: str, bars: Bars, persist: bool = False) -> None:
+        """외부에서 받은 분봉 등록 (persist=True 면 디스크에도 저장)"""
+        with self._lock:
+            self._data[(code, date)] = bars
+        if persist and bars and self.use_disk:
+            try:
+                write_json_atomic(self._path(code, date),
+                                  {"code": code, "date": date, "bars": bars})
+            except Exception as e:
+                logger.debug(f"분봉 디스크 저장 실패 ({code}, {date}): {e}")
+
+    def _load_disk(self, code: str, date: str) -> Optional[Bars]:
+        if not self.use_disk:
+            return None
+        path = self._path(code, date)
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                bars = json.load(f).get("bars")
+            return bars if bars else None
+        except Exception as e:
+            logger.debug(f"분봉 디스크 로드 실패 ({path}): {e}")
+            return None
+
+    def clear(self) -> None:
+        """메모리 계층 초기화 (실행 경계) — 디스크는 유지"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.disk_hits) / total, 3) if total else 0.0,
+                'size': len(self._data),
+            }
+
+
+# 프로세스 공용 (IntradayCollector / TradingSimulator / ArenaManager 공유)
+_store: Optional[MinuteBarStore] = None
+_store_lock = threading.Lock()
+
+
+def get_minute_store() -> MinuteBarStore:
+    """프로세스 공용 MinuteBarStore (lazy singleton)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MinuteBarStore(use_disk=os.getenv("MINUTE_STORE_DISK", "1") != "0")
+        return _store
+
+
+__all__ = [
+    'MINUTE_DIR',
+    'MinuteBarStore',
+    'get_minute_store',
+]
@@ -10,28 +10,74 @@ Phase 2.5b: KIS OpenAPI 대안 (KIS 가입 없이 수급 데이터 확보)
 
 제공 메서드:
 - get_investor_flow(code, limit=30): 단일 종목 일별 수급
-- get_multi_investor_flow(codes, limit=10): 여러 종목 bulk fetch (순차)
+- get_multi_investor_flow(codes, limit=10): 여러 종목 bulk fetch (스레드 풀)
 - get_cumulative_net(code, days=5): N일 누적 외국인+기관 순매수 (수급 점수용)
+- rank_by_inflow(codes, days=5): 누적 수급 랭킹 (이력 배열 합산)
 
-캐시: data/naver_investor_cache/{code}_{date}.json (당일 1회 재사용)
+저장: InvestorFlowStore (data/naver_investor/flows/{code}.npz) — 종목별 이력 누적
+- 종목당 하루 1회 조회, 저장된 마지막 날짜와 겹치는 페이지까지만 받아 새 행만 병합
+- 요청 시작 간격은 프로세스 전체에서 RATE_LIMIT_SLEEP 유지 (스레드 수와 무관)
 """
 
-import json
 import time
 import logging
 import re
-from pathlib import Path
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Optional
 
+import numpy as np
 import requests
 from bs4 import BeautifulSoup
 
+from .investor_flow_store import InvestorFlowStore, get_flow_store
+
 logger = logging.getLogger(__name__)
 
 KST = timezone(timedelta(hours=9))
-CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "naver_investor_cache"
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def parse_flow_rows(html: str) -> List[Dict]:
+    """frgn.naver 페이지 → [{'date','close','change_pct','volume','inst_net','foreign_net'}, ...]
+
+    최근 날짜부터 과거 순 (페이지 표시 순서).
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    tables = soup.find_all('table', class_='type2')
+
+    # type2 테이블 중 "날짜" 헤더가 있는 것 (2번째)
+    target_table = None
+    for t in tables:
+        first_row = t.find('tr')
+        if first_row and '날짜' in first_row.get_text():
+            target_table = t
+            break
+
+    if not target_table:
+        return []
+
+    data = []
+    for row in target_table.find_all('tr'):
+        cells = [c.get_text(strip=True) for c in row.find_all('td')]
+        if len(cells) < 7:
+            continue
+        # 첫 셀이 "YYYY.MM.DD" 형식
+        if not re.match(r'\d{4}\.\d{2}\.\d{2}', cells[0]):
+            continue
+        try:
+            data.append({
+                'date': cells[0].replace('.', ''),
+                'close': int(cells[1].replace(',', '')),
+                'change_pct': float(cells[3].replace('%', '').replace('+', '')),
+                'volume': int(cells[4].replace(',', '')),
+                'inst_net': int(cells[5].replace(',', '')),
+                'foreign_net': int(cells[6].replace(',', '')),
+            })
+        except (ValueError, IndexError) as e:
+            logger.debug(f"naver frgn 파싱 실패: {e}")
+            continue
+    return data
 
 
 class NaverInvestorClient:
@@ -48,23 +94,37 @@ class NaverInvestorClient:
 
     BASE_URL = 'https://finance.naver.com/item/frgn.naver'
     TIMEOUT = 10
-    RATE_LIMIT_SLEEP = 0.15  # 150ms (naver 친화적)
+    RATE_LIMIT_SLEEP = 0.15  # 150ms (naver 친화적) — 프로세스 전체 요청 시작 간격
+    MAX_WORKERS = 6          # get_multi_investor_flow 동시 실행 수
+    MAX_PAGES = 5            # 종목당 1회 갱신에서 받는 최대 페이지
 
-    def __init__(self, use_cache: bool = True):
+    # 전역 rate limiter (인스턴스/스레드 공용)
+    _rate_lock = threading.Lock()
+    _last_call_at = 0.0
+
+    def __init__(self, use_cache: bool = True, store: Optional[InvestorFlowStore] = None):
+        """
+        Args:
+            use_cache: True 면 공용 이력 저장소 사용 (종목당 하루 1회 갱신).
+                       False 면 메모리 전용 저장소 + 호출마다 갱신
+            store: 이력 저장소 주입 (테스트 등)
+        """
         self.use_cache = use_cache
+        self.store = store or (get_flow_store() if use_cache else InvestorFlowStore(persist=False))
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
             'Referer': 'https://finance.naver.com/',
         })
-        self._last_call_at = 0.0
 
-    def get_investor_flow(self, code: str, limit: int = 30) -> List[Dict]:
+    def get_investor_flow(self, code: str, limit: int = 30,
+                          as_of: Optional[str] = None) -> List[Dict]:
         """단일 종목 일별 수급 조회
 
         Args:
             code: 종목코드 6자리
             limit: 최대 반환 일수
+            as_of: 기준일 (YYYYMMDD) — 이후 날짜 제외 (저장된 이력 범위 내)
 
         Returns:
             [{'date','close','change_pct','volume','inst_net','foreign_net'}, ...]
@@ -72,157 +132,161 @@ class NaverInvestorClient:
         """
         if not code or len(code) != 6:
             return []
+        self.refresh(code, min_rows=limit)
+        return self.store.rows(code, limit=limit, as_of=as_of)
+
+    def refresh(self, code: str, min_rows: int = 30) -> int:
+        """이력 갱신 — 오늘 이미 조회했으면 생략. 새로 병합한 행 수 반환
 
-        # 캐시 확인 (당일 기준)
+        1페이지부터 받아 저장된 마지막 날짜와 겹치면 중단 (빠진 날짜만).
+        이력이 min_rows 보다 짧으면 더 과거 페이지까지 (MAX_PAGES 한도).
+        """
         today = datetime.now(KST).strftime('%Y%m%d')
-        cache_path = CACHE_DIR / f"{code}_{today}.json"
-        if self.use_cache and cache_path.exists():
-            try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    cached = json.load(f)
-                return cached[:limit]
-            except Exception:
-                pass
-
-        # Rate limit
-        now = time.time()
-        elapsed = now - self._last_call_at
-        if elapsed < self.RATE_LIMIT_SLEEP:
-            time.sleep(self.RATE_LIMIT_SLEEP - elapsed)
-
-        url = f'{self.BASE_URL}?code={code}'
+        if self.use_cache and self.store.checked(code) == today:
+            return 0
+
+        stored = self.store.get(code)
+        last = int(stored['date'][-1]) if len(stored) else 0
+        rows: List[Dict] = []
+        for page in range(1, self.MAX_PAGES + 1):
+            page_rows = self._fetch_page(code, page)
+            if page_rows is None:
+                if page == 1:
+                    return 0   # 요청 실패 — 조회일 기록 안 함 (다음 호출에서 재시도)
+                break
+            if not page_rows:
+                break
+            rows.extend(page_rows)
+            # 저장된 이력과 이어졌고 (또는 처음 받는 종목) 행 수가 충분하면 중단
+            overlap = int(page_rows[-1]['date']) <= last
+            if (overlap or not last) and len(stored) + len(rows) >= min_rows:
+                break
+
+        new = sum(1 for r in rows if int(r['date']) > last)
+        self.store.merge(code, rows, checked=today)
+        return new
+
+    def _fetch_page(self, code: str, page: int) -> Optional[List[Dict]]:
+        """frgn.naver 한 페이지 (실패 시 None)"""
+        self._rate_limit()
+        url = f'{self.BASE_URL}?code={code}' + (f'&page={page}' if page > 1 else '')
         try:
             r = self.session.get(url, timeout=self.TIMEOUT)
-            self._last_call_at = time.time()
             r.encoding = 'euc-kr'
             if r.status_code != 200:
                 logger.warning(f"naver frgn {code}: HTTP {r.status_code}")
-                return []
+                return None
         except Exception as e:
             logger.warning(f"naver frgn {code} 요청 실패: {e}")
-            return []
+            return None
 
-        soup = BeautifulSoup(r.text, 'html.parser')
-        tables = soup.find_all('table', class_='type2')
-
-        # type2 테이블 중 "날짜" 헤더가 있는 것 (2번째)
-        target_table = None
-        for t in tables:
-            first_row = t.find('tr')
-            if first_row and '날짜' in first_row.get_text():
-                target_table = t
-                break
-
-        if not target_table:
+        rows = parse_flow_rows(r.text)
+        if not rows and page == 1:
             logger.debug(f"naver frgn {code}: 테이블 못 찾음")
-            return []
-
-        rows = target_table.find_all('tr')
-        data = []
-        for row in rows:
-            cells = [c.get_text(strip=True) for c in row.find_all('td')]
-            if len(cells) < 7:
-                continue
-            # 첫 셀이 "YYYY.MM.DD" 형식
-            if not re.match(r'\d{4}\.\d{2}\.\d{2}', cells[0]):
-                continue
-            try:
-                data.append({
-                    'date': cells[0].replace('.', ''),
-                    'close': int(cells[1].replace(',', '')),
-                    'change_pct': float(cells[3].replace('%', '').replace('+', '')),
-                    'volume': int(cells[4].replace(',', '')),
-                    'inst_net': int(cells[5].replace(',', '')),
-                    'foreign_net': int(cells[6].replace(',', '')),
-                })
-            except (ValueError, IndexError) as e:
-                logger.debug(f"naver frgn {code} 파싱 실패: {e}")
-                continue
-
-        # 캐시 저장
-        if self.use_cache and data:
-            try:
-                with open(cache_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False)
-            except Exception:
-                pass
-
-        return data[:limit]
+        return rows
+
+    @classmethod
+    def _rate_limit(cls) -> None:
+        # 다음 호출 슬롯을 lock 안에서 예약하고, 대기는 lock 밖에서 (스레드 간 간격 보장)
+        with cls._rate_lock:
+            now = time.time()
+            slot = max(now, cls._last_call_at + cls.RATE_LIMIT_SLEEP)
+            cls._last_call_at = slot
+        if slot > now:
+            time.sleep(slot - now)
 
     def get_multi_investor_flow(self, codes: List[str], limit: int = 10,
-                                 progress_every: int = 50) -> Dict[str, List[Dict]]:
-        """여러 종목 bulk fetch (순차 + 진행률 로그)
+                                 progress_every: int = 50,
+                                 max_workers: Optional[int] = None) -> Dict[str, List[Dict]]:
+        """여러 종목 bulk fetch (스레드 풀 + 진행률 로그)
 
         Args:
             codes: 종목코드 리스트
             limit: 종목당 최대 일수
             progress_every: N개마다 로그
+            max_workers: 동시 실행 수 (기본 MAX_WORKERS) — 요청 간격은 전역 rate limit
 
         Returns:
-            {code: [data, ...], ...} — 실패한 종목은 빈 리스트
+            {code: [data, ...], ...} — 입력 순서, 실패한 종목은 빈 리스트
         """
-        result = {}
         total = len(codes)
+        if total == 0:
+            return {}
+        result: Dict[str, List[Dict]] = {}
         t_start = time.time()
-        for i, code in enumerate(codes, 1):
-            try:
-                data = self.get_investor_flow(code, limit=limit)
-                result[code] = data
-            except Exception as e:
-                logger.debug(f"{code}: {e}")
-                result[code] = []
-            if i % progress_every == 0 or i == total:
-                elapsed = time.time() - t_start
-                logger.info(f"  naver_investor progress: {i}/{total} ({elapsed:.1f}s)")
-        return result
-
-    def get_cumulative_net(self, code: str, days: int = 5) -> Dict[str, int]:
+        workers = min(max_workers or self.MAX_WORKERS, total)
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = {ex.submit(self.get_investor_flow, code, limit): code for code in codes}
+            for i, fut in enumerate(as_completed(futures), 1):
+                code = futures[fut]
+                try:
+                    result[code] = fut.result()
+                except Exception as e:
+                    logger.debug(f"{code}: {e}")
+                    result[code] = []
+                if i % progress_every == 0 or i == total:
+                    elapsed = time.time() - t_start
+                    logger.info(f"  naver_investor progress: {i}/{total} ({elapsed:.1f}s)")
+        return {code: result.get(code, []) for code in codes}
+
+    def get_cumulative_net(self, code: str, days: int = 5,
+                           as_of: Optional[str] = None) -> Dict[str, int]:
         """N일 누적 외국인/기관 순매수 (수급 점수용)
 
         Args:
             code: 종목코드
             days: 누적 기간 (거래일 기준)
+            as_of: 기준일 (YYYYMMDD) — 이후 날짜 제외
 
         Returns:
             {'foreign': 누적외국인, 'institution': 누적기관,
              'combined': 합계, 'days_used': 실제 사용 일수}
         """
-        data = self.get_investor_flow(code, limit=days)
-        if not data:
+        if not code or len(code) != 6:
             return {'foreign': 0, 'institution': 0, 'combined': 0, 'days_used': 0}
-        f = sum(d.get('foreign_net', 0) for d in data)
-        i = sum(d.get('inst_net', 0) for d in data)
+        self.refresh(code, min_rows=days)
+        cum = self.store.cumulative([code], days=days, as_of=as_of)
+        f, i = int(cum['foreign'][0]), int(cum['institution'][0])
         return {
             'foreign': f,
             'institution': i,
             'combined': f + i,
-            'days_used': len(data),
+            'days_used': int(cum['days_used'][0]),
         }
 
     def rank_by_inflow(self, codes: List[str], days: int = 5,
-                       require_both_positive: bool = True) -> List[Dict]:
+                       require_both_positive: bool = True,
+                       as_of: Optional[str] = None) -> List[Dict]:
         """N일 누적 수급 기준 종목 랭킹
 
         Args:
             codes: 종목코드 리스트
             days: 누적 기간
             require_both_positive: True면 외국인+기관 둘 다 양수인 종목만
+            as_of: 기준일 (YYYYMMDD) — 이후 날짜 제외
 
         Returns:
             정렬된 리스트: [{'code','foreign','institution','combined'}, ...]
             combined 내림차순
         """
-        results = []
-        for code in codes:
-            flow = self.get_cumulative_net(code, days=days)
-            if flow['days_used'] == 0:
-                continue
-            if require_both_positive and (flow['foreign'] <= 0 or flow['institution'] <= 0):
-                continue
-            flow['code'] = code
-            results.append(flow)
-        results.sort(key=lambda x: x['combined'], reverse=True)
-        return results
+        codes = [c for c in codes if c and len(c) == 6]
+        self.get_multi_investor_flow(codes, limit=days)
+        cum = self.store.cumulative(codes, days=days, as_of=as_of)
+        foreign, inst, used = cum['foreign'], cum['institution'], cum['days_used']
+        combined = foreign + inst
+
+        keep = used > 0
+        if require_both_positive:
+            keep &= (foreign > 0) & (inst > 0)
+        idx = np.flatnonzero(keep)
+        idx = idx[np.argsort(-combined[idx], kind='stable')]
+        return [{
+            'foreign': int(foreign[k]),
+            'institution': int(inst[k]),
+            'combined': int(combined[k]),
+            'days_used': int(used[k]),
+            'code': codes[k],
+        } for k in idx]
 
 
 # 전역 싱글톤
@@ -2,21 +2,32 @@
 네이버 금융 테마 크롤러
 - 테마 목록 및 테마별 종목 수집
 - 캐싱으로 API 부하 최소화
+- 요청은 공용 HTTP 계층 (naver_http): 연결 풀, 호스트별 제한, 429/5xx 백오프
+- 증분 동기화 (sync_theme_index): 바뀌었거나 오래된 테마만 병렬 수집 → 종목↔테마 인덱스 재생성
 """
 
-import requests
 from bs4 import BeautifulSoup
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
-import time
+from typing import List, Dict, Optional, Tuple
+
+from naver_http import NaverHttp, get_http
+from .atomic_io import write_json_atomic
+from .theme_index import (
+    StockThemeIndex, invalidate_theme_index, load_theme_index, write_legacy_json,
+)
 
 # 캐시 디렉토리
 CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "theme_cache"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# 테마별 동기화 상태 {테마코드: {list_count, etag, last_modified}}
+SYNC_STATE_PATH = CACHE_DIR / "_theme_sync.json"
+
 # 요청 헤더 (차단 우회)
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -26,6 +37,64 @@ HEADERS = {
 }
 
 
+def parse_theme_stocks(html: str, theme_name: str) -> List[Dict]:
+    """테마 상세 페이지 → [{'code','name','price','change_pct','theme'}, ...]"""
+    stocks = []
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.find('table', {'class': 'type_5'})
+
+    if not table:
+        return stocks
+
+    rows = table.find_all('tr')
+
+    for row in rows:
+        cols = row.find_all('td')
+        if len(cols) < 5:
+            continue
+
+        # 종목 링크 (첫번째 컬럼)
+        link = cols[0].find('a')
+        if not link:
+            continue
+
+        href = link.get('href', '')
+        if 'code=' not in href:
+            continue
+
+        stock_code = href.split('code=')[-1].split('&')[0]
+        stock_name = link.get_text(strip=True)
+
+        # 현재가 (3번째 컬럼, index 2)
+        price_text = cols[2].get_text(strip=True).replace(',', '')
+        try:
+            price = int(price_text)
+        except:
+            price = 0
+
+        # 등락률 (5번째 컬럼, index 4)
+        change_text = cols[4].get_text(strip=True).replace('%', '').replace(',', '').replace('+', '')
+        try:
+            change_pct = float(change_text)
+        except:
+            change_pct = 0.0
+
+        # 하락 여부 확인 (전일대비 컬럼의 class 또는 텍스트로 판별)
+        change_col = cols[3]
+        if '하락' in change_col.get_text() or 'nv01' in str(change_col):
+            change_pct = -abs(change_pct)
+
+        stocks.append({
+            'code': stock_code,
+            'name': stock_name,
+            'price': price,
+            'change_pct': change_pct,
+            'theme': theme_name
+        })
+
+    return stocks
+
+
 class NaverThemeCrawler:
     """네이버 금융 테마 크롤러"""
 
@@ -33,14 +102,22 @@ class NaverThemeCrawler:
     THEME_LIST_URL = f"{BASE_URL}/sise/theme.naver"
     THEME_DETAIL_URL = f"{BASE_URL}/sise/sise_group_detail.naver"
 
-    def __init__(self, cache_hours: int = 6):
+    MAX_WORKERS = 4             # 증분 동기화 동시 실행 수 (요청 간격/동시성은 naver_http 호스트 제한)
+    SYNC_MAX_AGE_DAYS = 7       # 종목 수가 그대로여도 이 기간 지나면 다시 수집
+
+    def __init__(self, cache_hours: int = 6, cache_dir: Optional[Path] = None,
+                 http: Optional[NaverHttp] = None):
         """
         Args:
             cache_hours: 캐시 유효 시간 (기본 6시간)
+            cache_dir: 캐시 디렉토리 (기본 data/theme_cache)
+            http: 공용 HTTP 계층 (기본 프로세스 공용 get_http())
         """
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        self.http = http or get_http()
         self.cache_hours = cache_hours
+        self.cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR
+        self._state_lock = threading.Lock()
+        self._sync_state: Optional[Dict[str, Dict]] = None
 
     def get_theme_list(self, force_refresh: bool = False) -> List[Dict]:
         """
@@ -49,7 +126,7 @@ class NaverThemeCrawler:
         Returns:
             [{'name': '테마명', 'code': '테마코드', 'change_pct': 등락률, 'stock_count': 종목수}, ...]
         """
-        cache_file = CACHE_DIR / "theme_list.json"
+        cache_file = self.cache_dir / "theme_list.json"
 
         # 캐시 확인
         if not force_refresh and self._is_cache_valid(cache_file):
@@ -58,10 +135,12 @@ class NaverThemeCrawler:
         themes = []
 
         try:
-            # 페이지 1~5 크롤링 (대부분의 테마 포함)
-            for page in range(1, 6):
-                url = f"{self.THEME_LIST_URL}?page={page}"
-                response = self.session.get(url, timeout=10)
+            # 페이지 1~5 동시 크롤링 (대부분의 테마 포함)
+            urls = [f"{self.THEME_LIST_URL}?page={page}" for page in range(1, 6)]
+            responses = self.http.get_many(urls, headers=HEADERS, timeout=10)
+            for page, response in enumerate(responses, 1):
+                if response is None:
+                    raise RuntimeError(f"테마 목록 {page}페이지 요청 실패")
                 response.encoding = 'euc-kr'
 
                 soup = BeautifulSoup(response.text, 'html.parser')
@@ -100,13 +179,20 @@ class NaverThemeCrawler:
                     if 'nv01' in str(cols[2]):  # 하락
                         change_pct = -abs(change_pct)
 
-                    themes.append({
+                    theme = {
                         'name': theme_name,
                         'code': theme_code,
                         'change_pct': change_pct,
-                    })
+                    }
 
-                time.sleep(0.3)  # 요청 간격
+                    # 종목수 = 등락현황 (상승/보합/하락) 합 — 증분 동기화의 변경 감지용
+                    try:
+                        theme['stock_count'] = sum(
+                            int(c.get_text(strip=True).replace(',', '')) for c in cols[3:6])
+                    except ValueError:
+                        pass
+
+                    themes.append(theme)
 
             # 중복 제거
             seen = set()
@@ -140,81 +226,74 @@ class NaverThemeCrawler:
         Returns:
             [{'code': '종목코드', 'name': '종목명', 'price': 현재가, 'change_pct': 등락률}, ...]
         """
-        cache_file = CACHE_DIR / f"theme_{theme_code}.json"
+        cache_file = self._theme_cache_file(theme_code)
 
         # 캐시 확인
         if self._is_cache_valid(cache_file):
             return self._load_cache(cache_file)
 
-        stocks = []
+        stocks, _ = self._fetch_theme_stocks(theme_code, theme_name)
+        return stocks
 
-        try:
-            url = f"{self.THEME_DETAIL_URL}?type=theme&no={theme_code}"
-            response = self.session.get(url, timeout=10)
-            response.encoding = 'euc-kr'
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            table = soup.find('table', {'class': 'type_5'})
-
-            if not table:
-                return stocks
+    def get_theme_members(self, theme: Dict, max_age_days: int = None) -> List[str]:
+        """
+        테마 소속 종목코드 — 인덱스가 최신이면 인덱스에서, 아니면 테마 페이지 수집
 
-            rows = table.find_all('tr')
+        Args:
+            theme: get_theme_list / get_hot_themes 항목 ({'code','name',...})
+            max_age_days: 인덱스 신뢰 기간 (기본 SYNC_MAX_AGE_DAYS)
+        """
+        index = load_theme_index(self.cache_dir / "_stock_to_themes.npz")
+        if index.has_theme(theme['code']) and not self._theme_needs_sync(theme, max_age_days):
+            return index.stocks_of(theme['code'])
+        return [s['code'] for s in self.get_theme_stocks(theme['code'], theme['name'])]
 
-            for row in rows:
-                cols = row.find_all('td')
-                if len(cols) < 5:
-                    continue
+    def _fetch_theme_stocks(self, theme_code: str, theme_name: str = None,
+                            list_count: Optional[int] = None) -> Tuple[List[Dict], bool]:
+        """
+        테마 페이지 조건부 요청 (ETag / Last-Modified) → (종목 리스트, 구성 변경 여부)
 
-                # 종목 링크 (첫번째 컬럼)
-                link = cols[0].find('a')
-                if not link:
-                    continue
+        304 또는 종목 구성이 같으면 변경 없음. 실패 시 기존 캐시 반환.
+        """
+        cache_file = self._theme_cache_file(theme_code)
+        state = self._state().get(theme_code, {})
+        headers = dict(HEADERS)
+        if cache_file.exists():
+            if state.get('etag'):
+                headers['If-None-Match'] = state['etag']
+            if state.get('last_modified'):
+                headers['If-Modified-Since'] = state['last_modified']
 
-                href = link.get('href', '')
-                if 'code=' not in href:
-                    continue
+        try:
+            url = f"{self.THEME_DETAIL_URL}?type=theme&no={theme_code}"
+            response = self.http.get(url, headers=headers, timeout=10)
 
-                stock_code = href.split('code=')[-1].split('&')[0]
-                stock_name = link.get_text(strip=True)
+            if response.status_code == 304:
+                os.utime(cache_file)
+                self._update_state(theme_code, list_count)
+                return self._load_cache(cache_file), False
 
-                # 현재가 (3번째 컬럼, index 2)
-                price_text = cols[2].get_text(strip=True).replace(',', '')
-                try:
-                    price = int(price_text)
-                except:
-                    price = 0
+            response.encoding = 'euc-kr'
+            stocks = parse_theme_stocks(response.text, theme_name or theme_code)
+            if not stocks:
+                return stocks, False
 
-                # 등락률 (5번째 컬럼, index 4)
-                change_text = cols[4].get_text(strip=True).replace('%', '').replace(',', '').replace('+', '')
-                try:
-                    change_pct = float(change_text)
-                except:
-                    change_pct = 0.0
-
-                # 하락 여부 확인 (전일대비 컬럼의 class 또는 텍스트로 판별)
-                change_col = cols[3]
-                if '하락' in change_col.get_text() or 'nv01' in str(change_col):
-                    change_pct = -abs(change_pct)
-
-                stocks.append({
-                    'code': stock_code,
-                    'name': stock_name,
-                    'price': price,
-                    'change_pct': change_pct,
-                    'theme': theme_name or theme_code
-                })
+            previous = self._load_cache(cache_file) if cache_file.exists() else []
+            changed = {s['code'] for s in previous} != {s['code'] for s in stocks}
 
             # 캐시 저장
             self._save_cache(cache_file, stocks)
+            self._update_state(theme_code, list_count,
+                               etag=response.headers.get('ETag'),
+                               last_modified=response.headers.get('Last-Modified'))
 
-            return stocks
+            return stocks, changed
 
         except Exception as e:
             print(f"[NaverTheme] 테마 종목 수집 오류 ({theme_code}): {e}")
             if cache_file.exists():
-                return self._load_cache(cache_file)
-            return []
+                return self._load_cache(cache_file), False
+            return [], False
 
     def get_hot_themes(self, top_n: int = 20, min_change: float = 1.0) -> List[Dict]:
         """
@@ -258,13 +337,49 @@ class NaverThemeCrawler:
         result = {}
 
         for code, name in theme_codes:
-            stocks = self.get_theme_stocks(code, name)
+            stocks = self.get_theme_stocks(code, name)   # 요청 간격은 naver_http 호스트 제한
             if stocks:
                 result[name] = [s['code'] for s in stocks]
-            time.sleep(0.2)  # 요청 간격
 
         return result
 
+    def sync_themes(self, max_age_days: int = None, max_workers: int = None,
+                    force: bool = False) -> Dict:
+        """
+        증분 테마 동기화 — 바뀌었거나 오래된 테마만 병렬 수집.
+
+        대상: 캐시 없음 / 테마 목록의 종목수가 지난 수집 때와 다름 / max_age_days 경과.
+        요청은 조건부 (ETag·Last-Modified) — 304 면 캐시 유지.
+
+        Returns:
+            {'themes', 'checked', 'changed', 'failed'}
+        """
+        themes = self.get_theme_list(force_refresh=True)
+        targets = [t for t in themes if force or self._theme_needs_sync(t, max_age_days)]
+        changed, failed = self._crawl_themes(targets, max_workers)
+        self._save_sync_state()
+        summary = {'themes': len(themes), 'checked': len(targets),
+                   'changed': changed, 'failed': failed}
+        print(f"[NaverTheme] 증분 동기화: 테마 {len(themes)}개 중 {len(targets)}개 확인, "
+              f"{changed}개 변경, {failed}개 실패")
+        return summary
+
+    def sync_theme_index(self, max_age_days: int = None, max_workers: int = None,
+                         save_path: Optional[Path] = None) -> Dict:
+        """
+        증분 동기화 후 변경이 있을 때만 종목 → 테마 인덱스 재생성.
+
+        Returns:
+            sync_themes 요약 + 'rebuilt' (인덱스 재생성 여부)
+        """
+        summary = self.sync_themes(max_age_days=max_age_days, max_workers=max_workers)
+        out_path = Path(save_path) if save_path else self.cache_dir / "_stock_to_themes.json"
+        rebuilt = bool(summary['changed']) or not out_path.with_suffix('.npz').exists()
+        if rebuilt:
+            self.build_stock_to_themes_index(save_path=out_path)
+        summary['rebuilt'] = rebuilt
+        return summary
+
     def build_stock_to_themes_index(
         self,
         refresh_missing: bool = False,
@@ -275,12 +390,15 @@ class NaverThemeCrawler:
 
         theme_<code>.json (theme→stocks) 들을 읽어 stock→themes 역방향으로 뒤집는다.
         BNF/Bollinger 등 다른 전략의 "동일 테마 중복 회피" 필터에 쓰인다.
+        조회용 정수 코드 인덱스 (_stock_to_themes.npz, theme_index 모듈) 와
+        사람이 읽는 JSON 을 함께 저장한다.
 
         Args:
             refresh_missing: True면 theme_list.json 에는 있지만 theme_<code>.json
-                             캐시가 없는 테마를 fetch (200개 풀 커버시 ~60s).
+                             캐시가 없는 테마를 병렬 fetch.
                              False면 기존 캐시만 뒤집음 (cost 0).
             save_path: 출력 경로. None이면 CACHE_DIR / "_stock_to_themes.json"
+                       (npz 는 같은 이름 .npz)
 
         Returns:
             {
@@ -290,61 +408,115 @@ class NaverThemeCrawler:
             }
         """
         themes = self.get_theme_list()
-        theme_name_by_code = {t['code']: t['name'] for t in themes}
 
         if refresh_missing:
-            for t in themes:
-                cache_file = CACHE_DIR / f"theme_{t['code']}.json"
-                if not cache_file.exists():
-                    self.get_theme_stocks(t['code'], t['name'])
-                    time.sleep(0.2)
+            missing = [t for t in themes if not self._theme_cache_file(t['code']).exists()]
+            self._crawl_themes(missing)
+            self._save_sync_state()
 
-        index: Dict[str, Dict] = {}
-        themes_with_stocks: List[str] = []
+        members: Dict[str, List[Dict]] = {}
+        themes_with_stocks: List[Dict] = []
         themes_missing: List[Dict] = []
 
         for t in themes:
             code = t['code']
             name = t['name']
-            cache_file = CACHE_DIR / f"theme_{code}.json"
-            if not cache_file.exists():
-                themes_missing.append({'code': code, 'name': name})
-                continue
-            stocks = self._load_cache(cache_file)
+            cache_file = self._theme_cache_file(code)
+            stocks = self._load_cache(cache_file) if cache_file.exists() else []
             if not stocks:
                 themes_missing.append({'code': code, 'name': name})
                 continue
-            themes_with_stocks.append(code)
-            for s in stocks:
-                stock_code = s.get('code')
-                if not stock_code:
-                    continue
-                entry = index.setdefault(stock_code, {
-                    'name': s.get('name', ''),
-                    'themes': [],
-                })
-                if not any(th['code'] == code for th in entry['themes']):
-                    entry['themes'].append({'code': code, 'name': name})
-
-        result = {
-            '_meta': {
-                'generated_at': datetime.now().isoformat(timespec='seconds'),
-                'themes_total_known': len(themes),
-                'themes_with_stocks': len(themes_with_stocks),
-                'themes_missing_count': len(themes_missing),
-                'themes_missing': themes_missing,
-                'stocks_total': len(index),
-                'coverage_pct': round(100.0 * len(themes_with_stocks) / len(themes), 2) if themes else 0.0,
-                'source_cache_dir': str(CACHE_DIR),
-            },
-            **index,
+            themes_with_stocks.append(t)
+            members[code] = stocks
+
+        index = StockThemeIndex.build(themes_with_stocks, members)
+        index.meta = {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'themes_total_known': len(themes),
+            'themes_with_stocks': len(themes_with_stocks),
+            'themes_missing_count': len(themes_missing),
+            'themes_missing': themes_missing,
+            'stocks_total': len(index),
+            'coverage_pct': round(100.0 * len(themes_with_stocks) / len(themes), 2) if themes else 0.0,
+            'source_cache_dir': str(self.cache_dir),
         }
 
-        out_path = save_path or (CACHE_DIR / "_stock_to_themes.json")
-        with open(out_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
-
-        return result
+        out_path = Path(save_path) if save_path else self.cache_dir / "_stock_to_themes.json"
+        npz_path = out_path.with_suffix('.npz')
+        write_legacy_json(index, out_path)
+        index.save(npz_path, source=out_path)      # 방금 쓴 JSON 서명 기록 (재로드 시 변환 생략)
+        invalidate_theme_index([npz_path])
+
+        return index.to_legacy()
+
+    # ─────────────────────────────────────
+    # 내부: 증분 동기화
+    # ─────────────────────────────────────
+
+    def _crawl_themes(self, themes: List[Dict], max_workers: int = None) -> Tuple[int, int]:
+        """테마 페이지 병렬 수집 (요청 간격은 naver_http 호스트 제한) → (변경 수, 실패 수)"""
+        if not themes:
+            return 0, 0
+        changed = failed = 0
+        workers = min(max_workers or self.MAX_WORKERS, len(themes))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = {ex.submit(self._fetch_theme_stocks, t['code'], t['name'], t.get('stock_count')): t
+                       for t in themes}
+            for fut in as_completed(futures):
+                try:
+                    stocks, is_changed = fut.result()
+                except Exception:
+                    stocks, is_changed = [], False
+                if not stocks:
+                    failed += 1
+                changed += int(is_changed)
+        return changed, failed
+
+    def _theme_needs_sync(self, theme: Dict, max_age_days: int = None) -> bool:
+        """캐시 없음 / 종목수 변경 / 보관 기간 경과"""
+        cache_file = self._theme_cache_file(theme['code'])
+        if not cache_file.exists():
+            return True
+        max_age = self.SYNC_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        mtime = datetime.fromtimestamp(cache_file.stat().st_mtime)
+        if datetime.now() - mtime >= timedelta(days=max_age):
+            return True
+        list_count = theme.get('stock_count')
+        known = self._state().get(theme['code'], {}).get('list_count')
+        return list_count is not None and known is not None and list_count != known
+
+    def _theme_cache_file(self, theme_code: str) -> Path:
+        return self.cache_dir / f"theme_{theme_code}.json"
+
+    def _state(self) -> Dict[str, Dict]:
+        with self._state_lock:
+            if self._sync_state is None:
+                path = self.cache_dir / SYNC_STATE_PATH.name
+                self._sync_state = self._load_cache(path) if path.exists() else {}
+                if not isinstance(self._sync_state, dict):
+                    self._sync_state = {}
+            return self._sync_state
+
+    def _update_state(self, theme_code: str, list_count: Optional[int],
+                      etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        state = self._state()
+        with self._state_lock:
+            entry = state.setdefault(theme_code, {})
+            if list_count is not None:
+                entry['list_count'] = list_count
+            if etag:
+                entry['etag'] = etag
+            if last_modified:
+                entry['last_modified'] = last_modified
+
+    def _save_sync_state(self) -> None:
+        state = self._state()
+        with self._state_lock:
+            path = self.cache_dir / SYNC_STATE_PATH.name
+            try:
+                write_json_atomic(path, state, separators=(',', ':'))
+            except Exception as e:
+                print(f"[NaverTheme] 동기화 상태 저장 오류: {e}")
 
     def _is_cache_valid(self, cache_file: Path) -> bool:
         """캐시 유효성 확인"""
@@ -7,61 +7,32 @@
   다른 전략에도 적용한다.
 
 데이터 소스:
-  data/theme_cache/_stock_to_themes.json (scripts.build_stock_theme_index 로 생성)
+  data/theme_cache/_stock_to_themes.npz (정수 코드 인덱스, theme_index 모듈)
+  - scripts.build_stock_theme_index 로 생성 (npz 없으면 같은 이름 .json 을 변환)
   - 시점 무관 정적 스냅샷 (테마 정의 변동 시 재생성 필요)
   - backtest 시 lookahead bias 가능성 — 단기 backtest 에서 실용적 trade-off
 """
 
-import json
 import logging
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, TypeVar
+from typing import Callable, List, Optional, TypeVar
 
-logger = logging.getLogger(__name__)
+import numpy as np
 
-T = TypeVar('T')
+from .theme_index import INDEX_PATH, StockThemeIndex, load_theme_index
 
-INDEX_PATH = Path(__file__).parent.parent.parent / "data" / "theme_cache" / "_stock_to_themes.json"
+logger = logging.getLogger(__name__)
 
-_index_cache: Optional[Dict[str, List[str]]] = None
-_index_path_loaded: Optional[Path] = None
+T = TypeVar('T')
 
 
-def load_stock_themes(path: Path = INDEX_PATH, force_reload: bool = False) -> Dict[str, List[str]]:
+def load_stock_themes(path: Path = INDEX_PATH, force_reload: bool = False) -> StockThemeIndex:
     """
-    {stock_code: [theme_code, ...]} 매핑 반환.
+    종목 → 테마 인덱스 반환 (.get(stock_code, default) 로 [theme_code, ...] 조회).
 
-    파일이 없거나 깨졌으면 빈 dict — 호출부는 캡 비활성으로 처리.
+    파일이 없거나 깨졌으면 빈 인덱스 — 호출부는 캡 비활성으로 처리.
     """
-    global _index_cache, _index_path_loaded
-    if _index_cache is not None and _index_path_loaded == path and not force_reload:
-        return _index_cache
-
-    if not path.exists():
-        logger.warning(f"[theme_cap] 역인덱스 없음: {path} — 캡 비활성")
-        _index_cache = {}
-        _index_path_loaded = path
-        return _index_cache
-
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            raw = json.load(f)
-    except Exception as e:
-        logger.warning(f"[theme_cap] 역인덱스 로드 실패: {e} — 캡 비활성")
-        _index_cache = {}
-        _index_path_loaded = path
-        return _index_cache
-
-    mapping: Dict[str, List[str]] = {}
-    for code, info in raw.items():
-        if code == '_meta' or not isinstance(info, dict):
-            continue
-        themes = info.get('themes') or []
-        mapping[code] = [t['code'] for t in themes if isinstance(t, dict) and t.get('code')]
-
-    _index_cache = mapping
-    _index_path_loaded = path
-    return _index_cache
+    return load_theme_index(path, force_reload=force_reload)
 
 
 def apply_theme_cap(
@@ -94,11 +65,11 @@ def apply_theme_cap(
         return items[:top_n]
 
     stock_themes = load_stock_themes()
-    if not stock_themes:
+    if not len(stock_themes):
         return items[:top_n]
 
     selected: List[T] = []
-    theme_count: Dict[str, int] = {}
+    theme_count = np.zeros(len(stock_themes.theme_codes), dtype=np.int32)   # 테마 id 별 선정 수
     skipped: List[str] = []
 
     for item in items:
@@ -106,25 +77,21 @@ def apply_theme_cap(
             break
 
         code = get_code(item)
-        themes = stock_themes.get(code, [])
+        themes = stock_themes.theme_ids_of(code)
 
         # 테마 정보 없는 종목 = 캡 미적용 통과
-        if not themes:
+        if not len(themes):
             selected.append(item)
             continue
 
-        # 어느 테마든 캡 도달 시 스킵
-        blocking = next(
-            (t for t in themes if theme_count.get(t, 0) >= max_per_theme),
-            None,
-        )
-        if blocking is not None:
-            skipped.append(f"{code}(theme:{blocking})")
+        # 어느 테마든 캡 도달 시 스킵 (소속 테마 순서상 첫 번째를 로그)
+        full = np.flatnonzero(theme_count[themes] >= max_per_theme)
+        if len(full):
+            skipped.append(f"{code}(theme:{stock_themes.theme_codes[themes[full[0]]]})")
             continue
 
         selected.append(item)
-        for t in themes:
-            theme_count[t] = theme_count.get(t, 0) + 1
+        theme_count[themes] += 1
 
     if skipped:
         prefix = f"[{log_prefix}] " if log_prefix else ""
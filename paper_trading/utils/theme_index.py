@@ -0,0 +1,327 @@
+"""
+종목 ↔ 테마 역인덱스 (정수 코드 + CSR)
+
+배경:
+  _stock_to_themes.json (indent=2, 약 600KB) 을 apply_theme_cap / registry._enrich_themes 가
+  프로세스마다 통째로 파싱했다. 이 인덱스는 종목/테마를 정수 id 로 코딩하고
+  소속 관계를 CSR 배열 2개 (indptr, theme_ids) 로 담아 npz 하나로 보관한다.
+
+구조:
+  data/theme_cache/_stock_to_themes.npz
+    stock_codes (S,) 정렬, stock_names (S,)
+    theme_codes (T,) theme_list 순서, theme_names (T,)
+    indptr (S+1,), theme_ids (nnz,)  — 종목 i 의 테마 = theme_ids[indptr[i]:indptr[i+1]]
+    meta — JSON 문자열 (_meta 와 동일 필드)
+    source — 변환 원본 _stock_to_themes.json 의 {size, mtime_ns, sha1} (JSON 문자열)
+  - npz 는 JSON 에서 파생된 로컬 캐시 (git 미추적). JSON 이 기록과 다르면 (크기·mtime 이 다르고
+    sha1 도 다름) 로드 시 JSON 에서 다시 만든다
+  - 조회: 종목코드/테마코드 → 행 번호 dict (O(1)) + 배열 슬라이스
+  - 테마 → 종목 방향은 처음 쓸 때 theme_ids 정렬로 1회 구성
+  - npz 가 없으면 기존 _stock_to_themes.json 을 한 번 변환해 저장
+
+사용:
+    index = load_theme_index()
+    index.themes_of('005930')      # ['27', '123', ...] (테마 코드)
+    index.entries('005930')        # [{'code','name'}, ...]
+    index.stocks_of('178')         # ['024840', ...]
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .atomic_io import atomic_open, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+THEME_CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "theme_cache"
+INDEX_PATH = THEME_CACHE_DIR / "_stock_to_themes.npz"
+LEGACY_JSON_PATH = THEME_CACHE_DIR / "_stock_to_themes.json"
+
+
+class StockThemeIndex:
+    """종목 ↔ 테마 정수 코드 인덱스 (읽기 전용)"""
+
+    def __init__(self, stock_codes: np.ndarray, stock_names: np.ndarray,
+                 theme_codes: np.ndarray, theme_names: np.ndarray,
+                 indptr: np.ndarray, theme_ids: np.ndarray, meta: Optional[Dict] = None):
+        self.stock_codes = stock_codes
+        self.stock_names = stock_names
+        self.theme_codes = theme_codes
+        self.theme_names = theme_names
+        self.indptr = indptr
+        self.theme_ids = theme_ids
+        self.meta = meta or {}
+        self.source: Dict = {}      # 변환 원본 JSON 서명 (load/save 시 채움)
+        self._stock_row = {c: i for i, c in enumerate(stock_codes.tolist())}
+        self._theme_row = {c: i for i, c in enumerate(theme_codes.tolist())}
+        self._theme_ptr: Optional[np.ndarray] = None
+        self._stock_ids: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.stock_codes)
+
+    def __contains__(self, stock_code: str) -> bool:
+        return stock_code in self._stock_row
+
+    # ─────────────────────────────────────
+    # 종목 → 테마
+    # ─────────────────────────────────────
+
+    def theme_ids_of(self, stock_code: str) -> np.ndarray:
+        """소속 테마 id 배열 (없으면 빈 배열)"""
+        row = self._stock_row.get(stock_code)
+        if row is None:
+            return self.theme_ids[:0]
+        return self.theme_ids[self.indptr[row]:self.indptr[row + 1]]
+
+    def themes_of(self, stock_code: str) -> List[str]:
+        """소속 테마 코드 리스트 (theme_list 순서)"""
+        return self.theme_codes[self.theme_ids_of(stock_code)].tolist()
+
+    def get(self, stock_code: str, default=None) -> Optional[List[str]]:
+        """dict 호환 조회 — {stock_code: [theme_code, ...]}"""
+        if stock_code not in self._stock_row:
+            return default
+        return self.themes_of(stock_code)
+
+    def entries(self, stock_code: str) -> List[Dict[str, str]]:
+        """[{'code': 테마코드, 'name': 테마명}, ...] — 기존 JSON 인덱스 항목 형식"""
+        ids = self.theme_ids_of(stock_code)
+        return [{'code': c, 'name': n}
+                for c, n in zip(self.theme_codes[ids].tolist(), self.theme_names[ids].tolist())]
+
+    def stock_name(self, stock_code: str) -> Optional[str]:
+        row = self._stock_row.get(stock_code)
+        return None if row is None else str(self.stock_names[row])
+
+    # ─────────────────────────────────────
+    # 테마 → 종목
+    # ─────────────────────────────────────
+
+    def has_theme(self, theme_code: str) -> bool:
+        return theme_code in self._theme_row
+
+    def theme_name(self, theme_code: str) -> Optional[str]:
+        row = self._theme_row.get(theme_code)
+        return None if row is None else str(self.theme_names[row])
+
+    def stocks_of(self, theme_code: str) -> List[str]:
+        """테마 소속 종목코드 (정렬)"""
+        row = self._theme_row.get(theme_code)
+        if row is None:
+            return []
+        if self._theme_ptr is None:
+            self._build_reverse()
+        ids = self._stock_ids[self._theme_ptr[row]:self._theme_ptr[row + 1]]
+        return self.stock_codes[ids].tolist()
+
+    def _build_reverse(self) -> None:
+        owner = np.repeat(np.arange(len(self.stock_codes)), np.diff(self.indptr))
+        order = np.argsort(self.theme_ids, kind='stable')
+        counts = np.bincount(self.theme_ids, minlength=len(self.theme_codes))
+        self._stock_ids = owner[order]
+        self._theme_ptr = np.concatenate([[0], np.cumsum(counts)])
+
+    # ─────────────────────────────────────
+    # 생성 / 변환
+    # ─────────────────────────────────────
+
+    @classmethod
+    def build(cls, themes: List[Dict], members: Dict[str, List[Dict]],
+              meta: Optional[Dict] = None) -> 'StockThemeIndex':
+        """theme_list 순서의 테마 + {테마코드: [종목 dict, ...]} → 인덱스
+
+        종목별 테마는 theme_list 순서, 종목명은 처음 나온 테마의 값.
+        """
+        pairs = [(s.get('code'), s.get('name', ''), t['code'])
+                 for t in themes for s in members.get(t['code']) or []]
+        return cls._from_pairs(themes, pairs, meta)
+
+    @classmethod
+    def from_legacy(cls, raw: Dict) -> 'StockThemeIndex':
+        """기존 JSON 인덱스 {stock: {name, themes:[{code,name}]}, _meta} → 인덱스 (테마 순서 보존)"""
+        themes: Dict[str, str] = {}
+        pairs = []
+        for stock_code, info in raw.items():
+            if stock_code == '_meta' or not isinstance(info, dict):
+                continue
+            for t in info.get('themes') or []:
+                if not isinstance(t, dict) or not t.get('code'):
+                    continue
+                themes.setdefault(t['code'], t.get('name', ''))
+                pairs.append((stock_code, info.get('name', ''), t['code']))
+        theme_list = [{'code': c, 'name': n} for c, n in themes.items()]
+        return cls._from_pairs(theme_list, pairs, raw.get('_meta'))
+
+    @classmethod
+    def _from_pairs(cls, themes: List[Dict], pairs: List[tuple],
+                    meta: Optional[Dict]) -> 'StockThemeIndex':
+        """(종목코드, 종목명, 테마코드) 나열 순서 그대로 CSR 구성 — 같은 (종목, 테마) 는 첫 번째만"""
+        theme_codes = [t['code'] for t in themes]
+        theme_row = {c: i for i, c in enumerate(theme_codes)}
+        names: Dict[str, str] = {}
+        for stock_code, name, _ in pairs:
+            if stock_code:
+                names.setdefault(stock_code, name)
+        pairs = [p for p in pairs if p[0] and p[2] in theme_row]
+
+        stock_codes = np.array(sorted(names), dtype=str)
+        n_themes = max(len(theme_codes), 1)
+        if pairs:
+            sid = np.searchsorted(stock_codes, np.array([p[0] for p in pairs], dtype=str)).astype(np.int64)
+            tid = np.array([theme_row[p[2]] for p in pairs], dtype=np.int64)
+            _, first = np.unique(sid * n_themes + tid, return_index=True)
+            first.sort()
+            sid, tid = sid[first], tid[first]
+            order = np.argsort(sid, kind='stable')
+            sid, tid = sid[order], tid[order]
+        else:
+            sid = tid = np.zeros(0, dtype=np.int64)
+        counts = np.bincount(sid, minlength=len(stock_codes))
+        return cls(
+            stock_codes=stock_codes,
+            stock_names=np.array([names[c] for c in stock_codes.tolist()], dtype=str),
+            theme_codes=np.array(theme_codes, dtype=str),
+            theme_names=np.array([t['name'] for t in themes], dtype=str),
+            indptr=np.concatenate([[0], np.cumsum(counts)]).astype(np.int32),
+            theme_ids=tid.astype(np.int32),
+            meta=meta,
+        )
+
+    def to_legacy(self) -> Dict:
+        """기존 JSON 인덱스 형식 ({'_meta': ..., stock: {name, themes}})"""
+        result: Dict = {'_meta': dict(self.meta)}
+        for stock_code in self.stock_codes.tolist():
+            result[stock_code] = {'name': self.stock_name(stock_code), 'themes': self.entries(stock_code)}
+        return result
+
+    # ─────────────────────────────────────
+    # 디스크 I/O
+    # ─────────────────────────────────────
+
+    def save(self, path: Path = INDEX_PATH, source: Optional[Path] = None) -> None:
+        """npz 저장. source (원본 JSON) 를 주면 그 서명을 함께 기록"""
+        path = Path(path)
+        if source is not None:
+            self.source = _file_signature(Path(source))
+        with atomic_open(path, 'wb') as f:
+            np.savez(f, stock_codes=self.stock_codes, stock_names=self.stock_names,
+                     theme_codes=self.theme_codes, theme_names=self.theme_names,
+                     indptr=self.indptr, theme_ids=self.theme_ids,
+                     meta=np.array(json.dumps(self.meta, ensure_ascii=False)),
+                     source=np.array(json.dumps(self.source)))
+
+    @classmethod
+    def load(cls, path: Path = INDEX_PATH) -> 'StockThemeIndex':
+        with np.load(path) as npz:
+            index = cls(stock_codes=npz['stock_codes'], stock_names=npz['stock_names'],
+                        theme_codes=npz['theme_codes'], theme_names=npz['theme_names'],
+                        indptr=npz['indptr'], theme_ids=npz['theme_ids'],
+                        meta=json.loads(str(npz['meta'])))
+            if 'source' in npz.files:
+                index.source = json.loads(str(npz['source']))
+        return index
+
+    @classmethod
+    def empty(cls) -> 'StockThemeIndex':
+        return cls.build([], {})
+
+
+def _file_signature(path: Path) -> Dict:
+    """파일 서명 {size, mtime_ns, sha1} (없으면 빈 dict)"""
+    try:
+        st = path.stat()
+        return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns,
+                'sha1': hashlib.sha1(path.read_bytes()).hexdigest()}
+    except OSError:
+        return {}
+
+
+def _matches_source(index: StockThemeIndex, legacy: Path) -> bool:
+    """npz 가 현재 JSON 에서 만들어졌는지 — 크기·mtime 이 같으면 바로, 아니면 sha1 비교"""
+    recorded = index.source
+    if not recorded:
+        return False
+    try:
+        st = legacy.stat()
+        if recorded.get('size') == st.st_size and recorded.get('mtime_ns') == st.st_mtime_ns:
+            return True
+        return recorded.get('sha1') == hashlib.sha1(legacy.read_bytes()).hexdigest()
+    except OSError:
+        return False
+
+
+def write_legacy_json(index: StockThemeIndex, path: Path = LEGACY_JSON_PATH) -> None:
+    """사람이 읽는 JSON 내보내기 (들여쓰기 없이, 원자적 교체)"""
+    write_json_atomic(path, index.to_legacy(), separators=(',', ':'))
+
+
+# 경로별 프로세스 공용
+_indexes: Dict[Path, StockThemeIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def load_theme_index(path: Path = INDEX_PATH, force_reload: bool = False) -> StockThemeIndex:
+    """npz 인덱스 로드 (경로별 lazy 캐시)
+
+    npz 가 없거나 깨졌거나 같은 이름의 .json 과 다르면 (JSON 갱신/git pull) JSON 을 변환해 npz 로 저장.
+    둘 다 없으면 빈 인덱스 — 호출부는 테마 정보 없음으로 처리.
+    """
+    path = Path(path)
+    with _indexes_lock:
+        if path in _indexes and not force_reload:
+            return _indexes[path]
+
+        index = None
+        if path.exists():
+            try:
+                index = StockThemeIndex.load(path)
+            except Exception as e:
+                logger.warning(f"[theme_index] 인덱스 로드 실패: {e} — JSON 에서 재구성")
+
+        legacy = path.with_suffix('.json')
+        if index is not None and legacy.exists() and not _matches_source(index, legacy):
+            logger.info(f"[theme_index] {legacy.name} 변경 — npz 재생성")
+            index = None
+        if index is None and legacy.exists():
+            try:
+                with open(legacy, 'r', encoding='utf-8') as f:
+                    index = StockThemeIndex.from_legacy(json.load(f))
+                try:
+                    index.save(path, source=legacy)
+                except Exception as e:
+                    logger.debug(f"[theme_index] npz 저장 실패: {e}")
+            except Exception as e:
+                logger.warning(f"[theme_index] JSON 인덱스 로드 실패: {e}")
+
+        if index is None:
+            logger.warning(f"[theme_index] 역인덱스 없음: {path}")
+            index = StockThemeIndex.empty()
+        _indexes[path] = index
+        return index
+
+
+def invalidate_theme_index(paths: Optional[Iterable[Path]] = None) -> None:
+    """캐시된 인덱스 폐기 (재생성 후 다음 load 에서 다시 읽음)"""
+    with _indexes_lock:
+        if paths is None:
+            _indexes.clear()
+        else:
+            for p in paths:
+                _indexes.pop(Path(p), None)
+
+
+__all__ = [
+    'StockThemeIndex',
+    'load_theme_index',
+    'invalidate_theme_index',
+    'write_legacy_json',
+    'INDEX_PATH',
+    'LEGACY_JSON_PATH',
+]
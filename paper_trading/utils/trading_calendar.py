@@ -0,0 +1,402 @@
+"""
+KRX 거래일 캘린더 인덱스
+
+배경:
+  get_trading_days / previous_trading_day / resolve_trading_date 류가 평일마다
+  KRX 지수·전종목 조회로 거래일 여부를 확인했다 (1년 백테스트 시작에 ~250회 조회).
+  거래일은 공휴일 규칙으로 거의 정해지고, KRX 캐시에 데이터가 있는 날은 이미 확정이므로
+  한 번 만든 인덱스로 조회한다.
+
+구성:
+  - 규칙: 평일 - 공휴일 (utils._get_holidays) - 근로자의 날 (05-01) - 연말 휴장일 (마지막 영업일)
+  - 확정: KRX 캐시 (data/krx_cache/{stock,index}_*_YYYYMMDD.json) / 일봉 패널 날짜 = 개장,
+          observe(date, False) 로 기록한 지난 날짜 = 휴장 (정상 응답이 빈 경우만 — 조회 실패는 기록 안 함).
+          확정이 규칙보다 우선
+  - 저장: data/krx_cache/_trading_calendar.npz — 일 단위 개장 비트맵 + 확정 날짜 + 구축일 (KST)
+          구축일이 오늘이 아니면 캐시를 다시 읽고 올해·내년 규칙만 재계산 (공휴일 원격 데이터 1일 캐시와 같은 주기).
+          지난 연도는 한 번 구축하면 고정 — 연도마다 원격 공휴일 조회 (5초 timeout) 를 반복하지 않음
+  - 조회: 개장 비트맵 + 누적 개수 → is_trading_day / prev·next_trading_day(n) / trading_days(start, end)
+          모두 날짜 → 위치 계산만 (API/파일 접근 없음)
+  - 백테스트: settled_trading_days 는 KRX 개장 확정 날짜만 사용. 규칙은 오프라인 폴백에서 공휴일이
+          빠질 수 있으므로 (폴백 변동 공휴일은 2025~2027 만) 미확정 평일은 probe 로 확인하거나 제외
+
+사용:
+    cal = get_trading_calendar()
+    cal.is_trading_day('20260410')
+    cal.prev_trading_day('20260410', n=5)
+    cal.trading_days('20250101', '20251231')
+"""
+
+import json
+import logging
+import threading
+from datetime import date as _date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from utils import _get_holidays, get_kst_now
+
+from .atomic_io import atomic_open
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_PATH = Path(__file__).parent.parent.parent / "data" / "krx_cache" / "_trading_calendar.npz"
+
+# 인덱스 기본 범위 시작 연도 (범위 밖 조회는 자동 확장)
+FIRST_YEAR = 2015
+
+# 정부 공휴일이 아니어도 KRX 가 쉬는 날 (MM-DD)
+KRX_CLOSED_DAYS = frozenset({'05-01'})   # 근로자의 날
+
+# 개장 확정으로 보는 KRX 캐시 종류 (빈 응답은 캐시에 저장되지 않음)
+_CONFIRM_KINDS = ('stock', 'index')
+
+
+def rule_trading_days(year: int) -> List[_date]:
+    """규칙 거래일: 평일 - 공휴일 - KRX 자체 휴장 (근로자의 날, 연말 휴장일)"""
+    closed = set(_get_holidays(year)) | KRX_CLOSED_DAYS
+    days = []
+    cur = _date(year, 1, 1)
+    while cur.year == year:
+        if cur.weekday() < 5 and cur.strftime('%m-%d') not in closed:
+            days.append(cur)
+        cur += timedelta(days=1)
+    # 연말 휴장일: 그해 마지막 영업일
+    return days[:-1]
+
+
+def scan_krx_dates(cache_dir: Optional[Path] = None, panel_dir: Optional[Path] = None) -> Set[str]:
+    """KRX 캐시 파일 / 일봉 패널에 데이터가 있는 날짜 (개장 확정)"""
+    if cache_dir is None:
+        from .krx_api import CACHE_DIR as cache_dir
+    if panel_dir is None:
+        from .krx_panel import PANEL_DIR as panel_dir
+
+    dates = set()
+    for path in Path(cache_dir).glob('*_*_*.json'):
+        parts = path.stem.split('_')
+        if len(parts) == 3 and parts[0] in _CONFIRM_KINDS and len(parts[2]) == 8 and parts[2].isdigit():
+            dates.add(parts[2])
+    for market in ('KOSPI', 'KOSDAQ'):
+        meta_path = Path(panel_dir) / market / 'meta.json'
+        if not meta_path.exists():
+            continue
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                dates.update(json.load(f)['dates'])
+        except Exception as e:
+            logger.debug(f"패널 날짜 읽기 실패 ({meta_path}): {e}")
+    return dates
+
+
+class _Index(NamedTuple):
+    """조회 스냅샷 — 재구축 시 통째로 교체"""
+    base: int                   # first_year 1월 1일 ordinal
+    first_year: int
+    last_year: int
+    open: np.ndarray            # (일수,) bool 개장 여부
+    cum: np.ndarray             # (일수 + 1,) 해당 일 이전 거래일 수
+    days: List[str]             # 거래일 YYYYMMDD 오름차순
+
+
+class TradingCalendar:
+    """KRX 거래일 인덱스 (날짜는 YYYYMMDD 문자열)
+
+    - 스레드 안전: 재구축/확정 기록은 lock 보호, 조회는 _Index 스냅샷 하나만 참조
+    - 범위 밖 날짜는 해당 연도까지 규칙으로 확장
+    """
+
+    def __init__(self, path: Optional[Path] = None, first_year: int = FIRST_YEAR,
+                 last_year: Optional[int] = None, persist: bool = True,
+                 cache_dir: Optional[Path] = None, panel_dir: Optional[Path] = None):
+        """
+        Args:
+            path: 인덱스 파일 (기본 data/krx_cache/_trading_calendar.npz)
+            first_year / last_year: 기본 범위 (last_year 기본 = 올해 + 1)
+            persist: False 면 디스크 읽기/쓰기 없음
+            cache_dir / panel_dir: 개장 확정 날짜를 읽을 KRX 캐시 / 패널 폴더
+        """
+        self.path = Path(path) if path else CALENDAR_PATH
+        self.persist = persist
+        self.cache_dir = cache_dir
+        self.panel_dir = panel_dir
+        self._lock = threading.RLock()
+        self._confirmed_open: Set[str] = set()
+        self._confirmed_closed: Set[str] = set()
+        self._built = ''
+        self._frozen_through = 0      # 이 연도까지는 재구축 시 규칙 재계산 없이 기존 비트맵 사용
+        last_year = last_year or get_kst_now().year + 1
+        if self.persist and self._load():
+            index = self._index
+            first_year, last_year = min(first_year, index.first_year), max(last_year, index.last_year)
+            if (self._built == get_kst_now().strftime('%Y%m%d')
+                    and (first_year, last_year) == (index.first_year, index.last_year)):
+                return
+        self.refresh(first_year, last_year)
+
+    # ─────────────────────────────────────
+    # 조회
+    # ─────────────────────────────────────
+
+    def is_trading_day(self, date: str) -> bool:
+        i, index = self._locate(date)
+        return bool(index.open[i])
+
+    def is_confirmed(self, date: str) -> bool:
+        """KRX 데이터로 개장이 확인된 날짜인지"""
+        return date in self._confirmed_open
+
+    def prev_trading_day(self, date: str, n: int = 1) -> Optional[str]:
+        """date 이전 n 번째 거래일 (date 제외)"""
+        while True:
+            i, index = self._locate(date)
+            k = int(index.cum[i]) - n
+            if k >= 0:
+                return index.days[k]
+            if not self._extend(index.first_year - (-k // 250 + 1)):
+                return None
+
+    def next_trading_day(self, date: str, n: int = 1) -> Optional[str]:
+        """date 이후 n 번째 거래일 (date 제외)"""
+        while True:
+            i, index = self._locate(date)
+            k = int(index.cum[i + 1]) + n - 1
+            if k < len(index.days):
+                return index.days[k]
+            if not self._extend(index.last_year + (k - len(index.days)) // 250 + 1):
+                return None
+
+    def last_trading_day(self, date: str) -> Optional[str]:
+        """date 가 거래일이면 date, 아니면 직전 거래일"""
+        return date if self.is_trading_day(date) else self.prev_trading_day(date)
+
+    def trading_days(self, start: str, end: str) -> List[str]:
+        """start ~ end (양끝 포함) 거래일 목록"""
+        if start > end:
+            return []
+        self._locate(end)                   # 범위 확장 (뒤쪽)
+        i, index = self._locate(start)      # 범위 확장 (앞쪽) 후 스냅샷 하나에서 양끝 위치
+        j = self._ordinal(end) - index.base
+        return index.days[int(index.cum[i]):int(index.cum[j + 1])]
+
+    def settled_trading_days(self, start: str, end: str,
+                             probe: Optional[Callable[[str], Optional[bool]]] = None) -> List[str]:
+        """KRX 개장이 확정된 거래일만 (백테스트 기간용, 미래 제외)
+
+        규칙 거래일은 쓰지 않는다 — 확정 안 된 평일 (휴장 확정 제외) 은 probe(date) 로
+        데이터 유무를 확인해 기록하고, probe 가 없거나 조회에 실패하면 제외한다.
+        probe 는 True (데이터 있음) / False (정상 응답이 빈 경우만) / None (조회 실패 — 기록 안 함)
+        — KRXClient.has_trading_data 형식.
+        """
+        today = get_kst_now().strftime('%Y%m%d')
+        end = min(end, today)
+        if start > end:
+            return []
+        self._locate(end)
+        self._locate(start)
+        cur, last = datetime.strptime(start, '%Y%m%d'), datetime.strptime(end, '%Y%m%d')
+        weekdays = []
+        while cur <= last:
+            if cur.weekday() < 5:
+                weekdays.append(cur.strftime('%Y%m%d'))
+            cur += timedelta(days=1)
+
+        unknown = [d for d in weekdays
+                   if d not in self._confirmed_open and d not in self._confirmed_closed]
+        if unknown and probe is not None:
+            with self._lock:
+                changed = False
+                for d in unknown:
+                    try:
+                        has_data = probe(d)
+                    except Exception as e:
+                        logger.debug(f"거래일 확인 실패 ({d}): {e}")
+                        continue
+                    if has_data is None:
+                        continue
+                    changed |= self._record(d, bool(has_data))
+                if changed:
+                    self._save()
+        unresolved = [d for d in unknown if d != today and self.is_trading_day(d)
+                      and d not in self._confirmed_open and d not in self._confirmed_closed]
+        if unresolved:
+            logger.warning(f"KRX 개장 미확정 평일 {len(unresolved)}일 제외 ({unresolved[0]}~{unresolved[-1]})")
+        return [d for d in weekdays if d in self._confirmed_open]
+
+    # ─────────────────────────────────────
+    # 갱신
+    # ─────────────────────────────────────
+
+    def observe(self, date: str, has_data: bool) -> None:
+        """KRX 조회 결과 기록 — 데이터 있음 = 개장 확정, 지난 날짜 빈 응답 = 휴장 확정
+
+        has_data=False 는 서버가 정상 응답 (200) 으로 비어 있다고 확인한 경우만 넘긴다
+        (KRXClient.has_trading_data 가 None 이면 호출하지 않음).
+        당일/미래의 빈 응답은 업로드 전일 수 있어 기록하지 않는다.
+        """
+        with self._lock:
+            if self._record(date, has_data):
+                self._save()
+
+    def _record(self, date: str, has_data: bool) -> bool:
+        """확정 기록 + 비트맵 반영 (저장 없음). 바뀌었으면 True"""
+        if not has_data and date >= get_kst_now().strftime('%Y%m%d'):
+            return False
+        with self._lock:
+            target = self._confirmed_open if has_data else self._confirmed_closed
+            other = self._confirmed_closed if has_data else self._confirmed_open
+            if date in target:
+                return False
+            target.add(date)
+            other.discard(date)
+            i, index = self._locate(date)
+            if bool(index.open[i]) != has_data:
+                is_open = index.open.copy()
+                is_open[i] = has_data
+                self._set(index.first_year, index.last_year, is_open)
+            return True
+
+    def refresh(self, first_year: Optional[int] = None, last_year: Optional[int] = None) -> None:
+        """KRX 캐시/패널 재스캔 + 고정 안 된 연도 (올해 이후, 새 범위) 규칙 재계산 후 저장"""
+        with self._lock:
+            first_year = first_year or self._index.first_year
+            last_year = last_year or self._index.last_year
+            try:
+                self._confirmed_open |= scan_krx_dates(self.cache_dir, self.panel_dir)
+            except Exception as e:
+                logger.debug(f"KRX 캐시 날짜 스캔 실패: {e}")
+            self._confirmed_closed -= self._confirmed_open
+            self._build(first_year, last_year)
+            now = get_kst_now()
+            self._built = now.strftime('%Y%m%d')
+            self._frozen_through = max(self._frozen_through, now.year - 1)
+            self._save()
+
+    def _build(self, first_year: int, last_year: int) -> None:
+        base = _date(first_year, 1, 1).toordinal()
+        is_open = np.zeros(_date(last_year, 12, 31).toordinal() - base + 1, dtype=bool)
+        prev = getattr(self, '_index', None)
+        for year in range(first_year, last_year + 1):
+            if prev is not None and year <= self._frozen_through and prev.first_year <= year <= prev.last_year:
+                lo, hi = _date(year, 1, 1).toordinal(), _date(year, 12, 31).toordinal() + 1
+                is_open[lo - base:hi - base] = prev.open[lo - prev.base:hi - prev.base]
+                continue
+            for day in rule_trading_days(year):
+                is_open[day.toordinal() - base] = True
+        for dates, flag in ((self._confirmed_open, True), (self._confirmed_closed, False)):
+            for d in dates:
+                i = self._ordinal(d) - base
+                if 0 <= i < len(is_open):
+                    is_open[i] = flag
+        self._set(first_year, last_year, is_open)
+
+    def _set(self, first_year: int, last_year: int, is_open: np.ndarray) -> None:
+        """조회용 스냅샷 교체 (개장 비트맵, 누적 개수, 거래일 목록)"""
+        start = np.datetime64(f"{first_year}-01-01", 'D')
+        cum = np.zeros(len(is_open) + 1, dtype=np.int32)
+        np.cumsum(is_open, out=cum[1:])
+        days = np.datetime_as_string(start + np.flatnonzero(is_open), unit='D')
+        self._index = _Index(
+            base=_date(first_year, 1, 1).toordinal(), first_year=first_year, last_year=last_year,
+            open=is_open, cum=cum, days=[d.replace('-', '') for d in days.tolist()])
+
+    def _extend(self, year: int) -> bool:
+        """year 까지 범위 확장. 확장할 수 없으면 False"""
+        year = min(max(year, 1990), get_kst_now().year + 10)
+        with self._lock:
+            index = self._index
+            if index.first_year <= year <= index.last_year:
+                return False
+            self._build(min(year, index.first_year), max(year, index.last_year))
+            self._save()
+            return True
+
+    # ─────────────────────────────────────
+    # 내부: 날짜 위치
+    # ─────────────────────────────────────
+
+    @staticmethod
+    def _ordinal(date: str) -> int:
+        return datetime.strptime(date, '%Y%m%d').toordinal()
+
+    def _locate(self, date: str) -> Tuple[int, '_Index']:
+        """(스냅샷 안 위치, 스냅샷) — 범위 밖이면 확장"""
+        ordinal = self._ordinal(date)
+        index = self._index
+        if not 0 <= ordinal - index.base < len(index.open):
+            self._extend(int(date[:4]))
+            index = self._index
+            if not 0 <= ordinal - index.base < len(index.open):
+                raise ValueError(f"거래일 캘린더 범위 밖 날짜: {date}")
+        return ordinal - index.base, index
+
+    # ─────────────────────────────────────
+    # 내부: 디스크 I/O
+    # ─────────────────────────────────────
+
+    def _load(self) -> bool:
+        """저장된 인덱스 로드 (구축일 무관 — 오래됐으면 호출측이 refresh 로 고정 안 된 연도만 재계산)"""
+        if not self.path.exists():
+            return False
+        try:
+            with np.load(self.path) as npz:
+                is_open = npz['open'].astype(bool)
+                saved_first, saved_last = (int(y) for y in npz['years'])
+                self._confirmed_open = set(npz['confirmed_open'].astype(str).tolist())
+                self._confirmed_closed = set(npz['confirmed_closed'].astype(str).tolist())
+                built = str(npz['built'])
+                frozen = int(npz['frozen']) if 'frozen' in npz.files else 0
+                verified = 'closed_verified' in npz.files
+        except Exception as e:
+            logger.debug(f"거래일 캘린더 로드 실패 ({self.path}): {e}")
+            return False
+        if not verified:
+            # 이전 형식은 조회 실패도 휴장으로 기록했을 수 있음 → 휴장 확정 버리고 전 연도 규칙 재계산
+            self._confirmed_closed = set()
+            built, frozen = '', 0
+        self._built = built
+        self._frozen_through = frozen
+        self._set(saved_first, saved_last, is_open)
+        return True
+
+    def _save(self) -> None:
+        if not self.persist:
+            return
+        index = self._index
+        try:
+            with atomic_open(self.path, 'wb') as f:
+                np.savez(f, open=index.open,
+                         years=np.array([index.first_year, index.last_year], dtype=np.int32),
+                         confirmed_open=np.array(sorted(self._confirmed_open), dtype='U8'),
+                         confirmed_closed=np.array(sorted(self._confirmed_closed), dtype='U8'),
+                         built=np.array(self._built),
+                         frozen=np.array(self._frozen_through, dtype=np.int32),
+                         closed_verified=np.array(True))
+        except Exception as e:
+            logger.debug(f"거래일 캘린더 저장 실패 ({self.path}): {e}")
+
+
+# 프로세스 공용
+_calendar: Optional[TradingCalendar] = None
+_calendar_lock = threading.Lock()
+
+
+def get_trading_calendar() -> TradingCalendar:
+    """프로세스 공용 TradingCalendar (lazy singleton, 날짜가 바뀌면 재구축)"""
+    global _calendar
+    with _calendar_lock:
+        if _calendar is None:
+            _calendar = TradingCalendar()
+        elif _calendar._built != get_kst_now().strftime('%Y%m%d'):
+            _calendar.refresh()
+        return _calendar
+
+
+__all__ = [
+    'TradingCalendar',
+    'get_trading_calendar',
+    'rule_trading_days',
+    'scan_krx_dates',
+]
@@ -3,10 +3,21 @@
 - 의사결정, 전략 변경, 매매 기록, Q&A 자동 저장
 - 대화 컨텍스트 로드 기능
 - 자동 리포트 생성
+
+저장소: logs/project_logs.db (SQLite, WAL) — 로컬 인덱스, git 미추적
+- 날짜/카테고리/중요도 인덱스 — 기록/조회가 파일 전체 로드·재작성 없이 인덱스 조회
+- 레코드 본문은 JSON 텍스트, 조회 조건 컬럼만 분리
+- logs/*.json 이 커밋되는 원본: 기록할 때마다 바뀐 종류의 JSON 만 내보내기 (기존 형식 그대로)
+- 내보내기 전 기록은 pending 저널에 남김 — 내보내기 실패/중단 시 다음 기록·실행 때 다시 내보냄
+- 열 때 JSON 이 마지막 내보내기/이관 이후 바뀌었으면 (git pull 등) JSON 에서 DB 재구성 후
+  pending 기록을 다시 적용 (병합, 버리지 않음)
 """
 
+import hashlib
 import json
 import os
+import sqlite3
+import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -22,48 +33,389 @@ LOGS_DIR.mkdir(exist_ok=True)
 DOCS_DIR.mkdir(exist_ok=True)
 DATA_DIR.mkdir(exist_ok=True)
 
+LOG_DB_NAME = "project_logs.db"
 
-class ProjectLogger:
-    """프로젝트 전체 로깅을 담당하는 클래스"""
+# 커밋되는 JSON 로그 (DB 이관 원본 / 내보내기 대상)
+JSON_LOG_FILES = ["decisions.json", "strategy_changes.json", "daily_trades.json",
+                  "qa_history.json", "rules.json", "session_logs.json"]
 
-    def __init__(self):
-        self.decisions_file = LOGS_DIR / "decisions.json"
-        self.strategy_changes_file = LOGS_DIR / "strategy_changes.json"
-        self.daily_trades_file = LOGS_DIR / "daily_trades.json"
-        self.qa_history_file = LOGS_DIR / "qa_history.json"
-        self.session_log_file = LOGS_DIR / "session_logs.json"
-        self.rules_file = LOGS_DIR / "rules.json"
-
-        # 파일 초기화
-        self._init_files()
-
-    def _init_files(self):
-        """로그 파일 초기화"""
-        default_files = {
-            self.decisions_file: {"decisions": []},
-            self.strategy_changes_file: {"changes": []},
-            self.daily_trades_file: {"trades": []},
-            self.qa_history_file: {"qa_list": []},
-            self.session_log_file: {"sessions": []},
-            self.rules_file: {"rules": [], "constraints": []},
-        }
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+
+CREATE TABLE IF NOT EXISTS decisions (
+    id INTEGER PRIMARY KEY, timestamp TEXT, date TEXT, category TEXT, data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_decisions_ts ON decisions(timestamp);
+CREATE INDEX IF NOT EXISTS idx_decisions_category ON decisions(category, timestamp);
+CREATE INDEX IF NOT EXISTS idx_decisions_date ON decisions(date);
+
+CREATE TABLE IF NOT EXISTS strategy_changes (
+    id INTEGER PRIMARY KEY, timestamp TEXT, date TEXT, strategy_name TEXT, data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_changes_ts ON strategy_changes(timestamp);
+CREATE INDEX IF NOT EXISTS idx_changes_strategy ON strategy_changes(strategy_name, timestamp);
 
-        for file_path, default_content in default_files.items():
-            if not file_path.exists():
-                self._save_json(file_path, default_content)
+CREATE TABLE IF NOT EXISTS daily_trades (
+    date TEXT PRIMARY KEY, timestamp TEXT, data TEXT NOT NULL);
 
-    def _load_json(self, file_path: Path) -> dict:
-        """JSON 파일 로드"""
+CREATE TABLE IF NOT EXISTS qa (
+    id INTEGER PRIMARY KEY, timestamp TEXT, date TEXT, category TEXT, importance TEXT,
+    data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_qa_ts ON qa(timestamp);
+CREATE INDEX IF NOT EXISTS idx_qa_category ON qa(category, timestamp);
+CREATE INDEX IF NOT EXISTS idx_qa_importance ON qa(importance, timestamp);
+CREATE INDEX IF NOT EXISTS idx_qa_date ON qa(date);
+
+CREATE TABLE IF NOT EXISTS rules (
+    seq INTEGER PRIMARY KEY, rule_name TEXT UNIQUE, rule_type TEXT, status TEXT,
+    data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_rules_status ON rules(status, rule_type);
+
+CREATE TABLE IF NOT EXISTS rule_constraints (
+    seq INTEGER PRIMARY KEY, constraint_name TEXT UNIQUE, data TEXT NOT NULL);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id INTEGER PRIMARY KEY, start_time TEXT, end_time TEXT, data TEXT NOT NULL);
+
+CREATE TABLE IF NOT EXISTS activities (
+    id INTEGER PRIMARY KEY, session_id INTEGER NOT NULL, data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_activities_session ON activities(session_id, id);
+
+CREATE TABLE IF NOT EXISTS pending (seq INTEGER PRIMARY KEY, op TEXT NOT NULL, data TEXT NOT NULL);
+"""
+
+# pending 저널 op → 내보낼 JSON 파일
+_OP_FILES = {
+    "decision": "decisions.json", "change": "strategy_changes.json", "trade": "daily_trades.json",
+    "qa": "qa_history.json", "rule": "rules.json", "constraint": "rules.json",
+    "session": "session_logs.json", "activity": "session_logs.json", "session_end": "session_logs.json",
+}
+
+
+def _dumps(record: dict) -> str:
+    return json.dumps(record, ensure_ascii=False, default=str)
+
+
+def _json_signature(logs_dir: Path) -> str:
+    """JSON 로그 파일 전체의 sha1 (없는 파일은 빈 내용)"""
+    h = hashlib.sha1()
+    for name in JSON_LOG_FILES:
+        h.update(name.encode())
+        try:
+            h.update((Path(logs_dir) / name).read_bytes())
+        except FileNotFoundError:
+            pass
+    return h.hexdigest()
+
+
+def _write_text_atomic(path: Path, text: str):
+    """같은 폴더 임시 파일에 쓰고 교체 (내용이 같으면 건너뜀)"""
+    try:
+        if path.read_text(encoding='utf-8') == text:
+            return
+    except FileNotFoundError:
+        pass
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=path.name + ".tmp.")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class ProjectLogStore:
+    """프로젝트 로그 SQLite 저장소 (WAL)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        """WAL 을 본 파일에 반영하고 닫기 (-wal/-shm 이 남지 않게)"""
+        if self.conn is None:
+            return
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            self.conn.close()
+            self.conn = None
+
+    def query(self, sql: str, params: tuple = ()) -> List[dict]:
+        """data 컬럼(JSON) 목록 조회"""
+        return [json.loads(row[0]) for row in self.conn.execute(sql, params)]
+
+    def query_one(self, sql: str, params: tuple = ()) -> Optional[dict]:
+        row = self.conn.execute(sql, params).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def next_id(self, table: str, column: str = "id") -> int:
+        return self.conn.execute(f"SELECT COALESCE(MAX({column}), 0) + 1 FROM {table}").fetchone()[0]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # ─────────────────────────────────────
+    # 레코드 쓰기 (호출자가 with store.conn: 트랜잭션)
+    # ─────────────────────────────────────
+
+    def insert_decision(self, d: dict):
+        self.conn.execute(
+            "INSERT INTO decisions (id, timestamp, date, category, data) VALUES (?, ?, ?, ?, ?)",
+            (d.get("id"), d.get("timestamp"), d.get("date"), d.get("category"), _dumps(d)))
+
+    def insert_strategy_change(self, c: dict):
+        self.conn.execute(
+            "INSERT INTO strategy_changes (id, timestamp, date, strategy_name, data) VALUES (?, ?, ?, ?, ?)",
+            (c.get("id"), c.get("timestamp"), c.get("date"), c.get("strategy_name"), _dumps(c)))
+
+    def upsert_trade(self, t: dict):
+        self.conn.execute(
+            "INSERT INTO daily_trades (date, timestamp, data) VALUES (?, ?, ?) "
+            "ON CONFLICT(date) DO UPDATE SET timestamp = excluded.timestamp, data = excluded.data",
+            (t.get("date"), t.get("timestamp"), _dumps(t)))
+
+    def insert_qa(self, q: dict):
+        self.conn.execute(
+            "INSERT INTO qa (id, timestamp, date, category, importance, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (q.get("id"), q.get("timestamp"), q.get("date"), q.get("category"),
+             q.get("importance"), _dumps(q)))
+
+    def upsert_rule(self, r: dict):
+        self.conn.execute(
+            "INSERT INTO rules (rule_name, rule_type, status, data) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(rule_name) DO UPDATE SET rule_type = excluded.rule_type, "
+            "status = excluded.status, data = excluded.data",
+            (r.get("rule_name"), r.get("rule_type"), r.get("status"), _dumps(r)))
+
+    def upsert_constraint(self, c: dict):
+        self.conn.execute(
+            "INSERT INTO rule_constraints (constraint_name, data) VALUES (?, ?) "
+            "ON CONFLICT(constraint_name) DO UPDATE SET data = excluded.data",
+            (c.get("constraint_name"), _dumps(c)))
+
+    def insert_session(self, s: dict):
+        """세션 (activities 는 별도 테이블)"""
+        activities = s.get("activities") or []
+        body = {k: v for k, v in s.items() if k != "activities"}
+        self.conn.execute(
+            "INSERT INTO sessions (session_id, start_time, end_time, data) VALUES (?, ?, ?, ?)",
+            (s.get("session_id"), s.get("start_time"), s.get("end_time"), _dumps(body)))
+        for activity in activities:
+            self.insert_activity(s.get("session_id"), activity)
+
+    def insert_activity(self, session_id: int, activity: dict):
+        self.conn.execute("INSERT INTO activities (session_id, data) VALUES (?, ?)",
+                          (session_id, _dumps(activity)))
+
+    # ─────────────────────────────────────
+    # JSON 이관 / 내보내기
+    # ─────────────────────────────────────
+
+    def _insert_with_id(self, insert, record: dict, table: str, column: str = "id") -> dict:
+        """원본 id 로 넣고, 중복이면 새 id 로 (손상/병합된 JSON). 실제로 넣은 레코드 반환"""
+        try:
+            insert(record)          # 실패한 INSERT 문만 취소 (바깥 트랜잭션 유지)
+        except sqlite3.IntegrityError:
+            record = {**record, column: self.next_id(table, column)}
+            insert(record)
+        return record
+
+    def _apply(self, op: str, data: dict, remap: Dict[int, int]) -> dict:
+        """pending op 1건 적용. remap: 재적용 중 바뀐 session_id (원래 → 새)"""
+        if op == "decision":
+            return self._insert_with_id(self.insert_decision, data, "decisions")
+        if op == "change":
+            return self._insert_with_id(self.insert_strategy_change, data, "strategy_changes")
+        if op == "qa":
+            return self._insert_with_id(self.insert_qa, data, "qa")
+        if op == "trade":
+            self.upsert_trade(data)
+        elif op == "rule":
+            self.upsert_rule(data)
+        elif op == "constraint":
+            self.upsert_constraint(data)
+        elif op == "session":
+            saved = self._insert_with_id(self.insert_session, data, "sessions", "session_id")
+            remap[data["session_id"]] = saved["session_id"]
+            return saved
+        elif op == "activity":
+            self.insert_activity(remap.get(data["session_id"], data["session_id"]), data["activity"])
+        elif op == "session_end":
+            session_id = remap.get(data["session_id"], data["session_id"])
+            session = {**data["session"], "session_id": session_id}
+            self.conn.execute("UPDATE sessions SET end_time = ?, data = ? WHERE session_id = ?",
+                              (session.get("end_time"), _dumps(session), session_id))
+        else:
+            raise ValueError(f"알 수 없는 로그 op: {op}")
+        return data
+
+    def record(self, op: str, data: dict) -> dict:
+        """기록 적용 + pending 저널 (호출자 트랜잭션 안에서). 실제로 넣은 레코드 반환"""
+        saved = self._apply(op, data, {})
+        self.conn.execute("INSERT INTO pending (op, data) VALUES (?, ?)", (op, _dumps(data)))
+        return saved
+
+    def pending_files(self) -> List[str]:
+        """내보내기 안 된 기록이 있는 JSON 파일"""
+        ops = [row[0] for row in self.conn.execute("SELECT DISTINCT op FROM pending")]
+        return sorted({_OP_FILES[op] for op in ops})
+
+    def migrate_json(self, logs_dir: Path) -> Dict[str, int]:
+        """logs/*.json → DB. 원본 순서/id 유지 (중복 id 는 새 id)
+
+        JSON 이 마지막 이관/내보내기 때와 같으면 건너뛰고, 바뀌었으면 DB 를 JSON 으로 다시 채운 뒤
+        내보내기 안 된 pending 기록을 다시 적용한다 (id 가 겹치면 새 id).
+        (json_sig 없이 migrated_json 만 있는 이전 DB 는 DB 를 원본으로 보고 건너뜀 — 호출측이 내보냄)
+
+        Returns:
+            {종류: 이관 건수, 'pending': 다시 적용한 기록 수} — 이관하지 않았으면 빈 dict
+        """
+        sig = _json_signature(logs_dir)
+        stored = self.get_meta("json_sig")
+        if stored == sig or (stored is None and self.get_meta("migrated_json")):
             return {}
 
-    def _save_json(self, file_path: Path, data: dict):
-        """JSON 파일 저장"""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+        def load(name):
+            try:
+                with open(Path(logs_dir) / name, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                return {}
+
+        counts = {}
+        with self.conn:
+            pending = [(op, json.loads(data)) for op, data in
+                       self.conn.execute("SELECT op, data FROM pending ORDER BY seq").fetchall()]
+            for table in ("decisions", "strategy_changes", "daily_trades", "qa", "rules",
+                          "rule_constraints", "sessions", "activities", "pending"):
+                self.conn.execute(f"DELETE FROM {table}")
+            decisions = load("decisions.json").get("decisions", [])
+            for d in decisions:
+                self._insert_with_id(self.insert_decision, d, "decisions")
+            changes = load("strategy_changes.json").get("changes", [])
+            for c in changes:
+                self._insert_with_id(self.insert_strategy_change, c, "strategy_changes")
+            trades = load("daily_trades.json").get("trades", [])
+            for t in trades:
+                self.upsert_trade(t)
+            qa_list = load("qa_history.json").get("qa_list", [])
+            for q in qa_list:
+                self._insert_with_id(self.insert_qa, q, "qa")
+            rules_data = load("rules.json")
+            for r in rules_data.get("rules", []):
+                self.upsert_rule(r)
+            for c in rules_data.get("constraints", []):
+                self.upsert_constraint(c)
+            sessions = load("session_logs.json").get("sessions", [])
+            for s in sessions:
+                self._insert_with_id(self.insert_session, s, "sessions", "session_id")
+            remap: Dict[int, int] = {}
+            for op, data in pending:
+                saved = self._apply(op, data, remap)
+                self.conn.execute("INSERT INTO pending (op, data) VALUES (?, ?)", (op, _dumps(saved)))
+            self.set_meta("migrated_json", datetime.now().isoformat())
+            self.set_meta("json_sig", sig)
+
+        counts.update({
+            "decisions": len(decisions), "changes": len(changes), "trades": len(trades),
+            "qa": len(qa_list), "rules": len(rules_data.get("rules", [])),
+            "constraints": len(rules_data.get("constraints", [])), "sessions": len(sessions),
+            "pending": len(pending),
+        })
+        return counts
+
+    def export_json(self, logs_dir: Path, names: Optional[List[str]] = None):
+        """DB → logs/*.json (기존 형식/순서, 바뀐 파일만 원자 저장) 후 해당 pending 비우고 json_sig 갱신
+
+        Args:
+            names: 내보낼 파일 (기본 전체)
+        """
+        logs_dir = Path(logs_dir)
+        names = list(JSON_LOG_FILES) if names is None else names
+        builders = {
+            "decisions.json": lambda: {"decisions": self.query("SELECT data FROM decisions ORDER BY id")},
+            "strategy_changes.json": lambda: {
+                "changes": self.query("SELECT data FROM strategy_changes ORDER BY id")},
+            "daily_trades.json": lambda: {"trades": self.query("SELECT data FROM daily_trades ORDER BY rowid")},
+            "qa_history.json": lambda: {"qa_list": self.query("SELECT data FROM qa ORDER BY id")},
+            "rules.json": lambda: {"rules": self.query("SELECT data FROM rules ORDER BY seq"),
+                                   "constraints": self.query("SELECT data FROM rule_constraints ORDER BY seq")},
+            "session_logs.json": lambda: {"sessions": self._export_sessions()},
+        }
+        logs_dir.mkdir(parents=True, exist_ok=True)
+        for name in names:
+            _write_text_atomic(logs_dir / name,
+                               json.dumps(builders[name](), ensure_ascii=False, indent=2, default=str))
+        ops = [op for op, name in _OP_FILES.items() if name in names]
+        with self.conn:
+            self.conn.execute(f"DELETE FROM pending WHERE op IN ({','.join('?' * len(ops))})", ops)
+            self.set_meta("json_sig", _json_signature(logs_dir))
+
+    def _export_sessions(self) -> List[dict]:
+        sessions = []
+        for session_id, data in self.conn.execute(
+                "SELECT session_id, data FROM sessions ORDER BY session_id").fetchall():
+            session = json.loads(data)
+            session["activities"] = self.query(
+                "SELECT data FROM activities WHERE session_id = ? ORDER BY id", (session_id,))
+            sessions.append(session)
+        return sessions
+
+
+class ProjectLogger:
+    """프로젝트 전체 로깅을 담당하는 클래스"""
+
+    def __init__(self, logs_dir: Optional[Path] = None):
+        logs_dir = Path(logs_dir) if logs_dir else LOGS_DIR
+        self.logs_dir = logs_dir
+        # JSON 로그 (커밋 원본 — 기록마다 내보내기)
+        self.decisions_file = logs_dir / "decisions.json"
+        self.strategy_changes_file = logs_dir / "strategy_changes.json"
+        self.daily_trades_file = logs_dir / "daily_trades.json"
+        self.qa_history_file = logs_dir / "qa_history.json"
+        self.session_log_file = logs_dir / "session_logs.json"
+        self.rules_file = logs_dir / "rules.json"
+
+        self.store = ProjectLogStore(logs_dir / LOG_DB_NAME)
+        counts = self.store.migrate_json(logs_dir)
+        if any(counts.values()):
+            print(f"[LOG] JSON 로그 이관: {counts}")
+        if counts.get("pending"):
+            print(f"[LOG] 내보내기 안 된 기록 {counts['pending']}건을 JSON 변경분에 병합")
+        # 이전 DB (JSON 미갱신) 는 전체, 아니면 남은 pending 만 내보내기
+        self._flush(None if self.store.get_meta("json_sig") is None else self.store.pending_files())
+
+    def _flush(self, names: Optional[List[str]] = None):
+        """pending 기록을 JSON 으로 내보내기 (names=None 이면 전체). 실패해도 pending 은 남아 다음에 재시도"""
+        if names == []:
+            return
+        try:
+            self.store.export_json(self.logs_dir, names)
+        except Exception as e:
+            print(f"[LOG] ⚠️ JSON 로그 내보내기 실패 (다음 기록 때 재시도): {e}")
+
+    def close(self):
+        """남은 pending 내보내기 후 저장소 닫기 (WAL 체크포인트)"""
+        if self.store.conn is None:
+            return
+        try:
+            self._flush(self.store.pending_files())
+        finally:
+            self.store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
     # ==========================================
     # 1. 의사결정 기록
@@ -87,41 +439,34 @@ class ProjectLogger:
             impact: 예상 영향
             category: 카테고리 (strategy, parameter, system, rule)
         """
-        data = self._load_json(self.decisions_file)
-
-        decision = {
-            "id": len(data.get("decisions", [])) + 1,
-            "timestamp": datetime.now().isoformat(),
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "title": title,
-            "description": description,
-            "reason": reason,
-            "alternatives": alternatives or [],
-            "impact": impact,
-            "category": category,
-            "status": "active"  # active, superseded, reverted
-        }
-
-        data.setdefault("decisions", []).append(decision)
-        self._save_json(self.decisions_file, data)
+        with self.store.conn:
+            decision = {
+                "id": self.store.next_id("decisions"),
+                "timestamp": datetime.now().isoformat(),
+                "date": datetime.now().strftime("%Y-%m-%d"),
+                "title": title,
+                "description": description,
+                "reason": reason,
+                "alternatives": alternatives or [],
+                "impact": impact,
+                "category": category,
+                "status": "active"  # active, superseded, reverted
+            }
+            decision = self.store.record("decision", decision)
+        self._flush(["decisions.json"])
 
         print(f"[LOG] 의사결정 기록됨: {title}")
         return decision
 
     def get_decisions(self, category: str = None, limit: int = None) -> List[dict]:
-        """의사결정 조회"""
-        data = self._load_json(self.decisions_file)
-        decisions = data.get("decisions", [])
-
+        """의사결정 조회 (최근 순)"""
+        sql, params = "SELECT data FROM decisions", ()
         if category:
-            decisions = [d for d in decisions if d.get("category") == category]
-
-        decisions = sorted(decisions, key=lambda x: x.get("timestamp", ""), reverse=True)
-
+            sql, params = sql + " WHERE category = ?", (category,)
+        sql += " ORDER BY timestamp DESC, id"
         if limit:
-            decisions = decisions[:limit]
-
-        return decisions
+            sql, params = sql + " LIMIT ?", params + (limit,)
+        return self.store.query(sql, params)
 
     # ==========================================
     # 2. 전략 변경 기록
@@ -145,35 +490,33 @@ class ProjectLogger:
             reason: 변경 사유
             backtest_result: 백테스트 결과
         """
-        data = self._load_json(self.strategy_changes_file)
-
-        change = {
-            "id": len(data.get("changes", [])) + 1,
-            "timestamp": datetime.now().isoformat(),
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "strategy_name": strategy_name,
-            "change_type": change_type,
-            "before": before,
-            "after": after,
-            "reason": reason,
-            "backtest_result": backtest_result
-        }
-
-        data.setdefault("changes", []).append(change)
-        self._save_json(self.strategy_changes_file, data)
+        with self.store.conn:
+            change = {
+                "id": self.store.next_id("strategy_changes"),
+                "timestamp": datetime.now().isoformat(),
+                "date": datetime.now().strftime("%Y-%m-%d"),
+                "strategy_name": strategy_name,
+                "change_type": change_type,
+                "before": before,
+                "after": after,
+                "reason": reason,
+                "backtest_result": backtest_result
+            }
+            change = self.store.record("change", change)
+        self._flush(["strategy_changes.json"])
 
         print(f"[LOG] 전략 변경 기록됨: {strategy_name} ({change_type})")
         return change
 
-    def get_strategy_history(self, strategy_name: str = None) -> List[dict]:
-        """전략 변경 이력 조회"""
-        data = self._load_json(self.strategy_changes_file)
-        changes = data.get("changes", [])
-
+    def get_strategy_history(self, strategy_name: str = None, limit: int = None) -> List[dict]:
+        """전략 변경 이력 조회 (최근 순)"""
+        sql, params = "SELECT data FROM strategy_changes", ()
         if strategy_name:
-            changes = [c for c in changes if c.get("strategy_name") == strategy_name]
-
-        return sorted(changes, key=lambda x: x.get("timestamp", ""), reverse=True)
+            sql, params = sql + " WHERE strategy_name = ?", (strategy_name,)
+        sql += " ORDER BY timestamp DESC, id"
+        if limit:
+            sql, params = sql + " LIMIT ?", params + (limit,)
+        return self.store.query(sql, params)
 
     # ==========================================
     # 3. 일일 매매 기록
@@ -186,7 +529,7 @@ class ProjectLogger:
                         strategy_used: str,
                         market_condition: dict = None):
         """
-        일일 매매 기록
+        일일 매매 기록 (같은 날짜는 덮어씀)
 
         Args:
             date: 거래일 (YYYY-MM-DD)
@@ -195,11 +538,6 @@ class ProjectLogger:
             strategy_used: 사용 전략
             market_condition: 시장 상황 (코스피 등락률 등)
         """
-        data = self._load_json(self.daily_trades_file)
-
-        # 해당 날짜 기존 기록 확인
-        existing = next((t for t in data.get("trades", []) if t.get("date") == date), None)
-
         trade_record = {
             "date": date,
             "timestamp": datetime.now().isoformat(),
@@ -210,14 +548,9 @@ class ProjectLogger:
             "summary": self._calculate_daily_summary(results)
         }
 
-        if existing:
-            # 기존 기록 업데이트
-            idx = data["trades"].index(existing)
-            data["trades"][idx] = trade_record
-        else:
-            data.setdefault("trades", []).append(trade_record)
-
-        self._save_json(self.daily_trades_file, data)
+        with self.store.conn:
+            self.store.record("trade", trade_record)
+        self._flush(["daily_trades.json"])
 
         print(f"[LOG] 일일 매매 기록됨: {date} ({len(selections)}종목)")
         return trade_record
@@ -241,17 +574,22 @@ class ProjectLogger:
             "worst_trade": min(returns) if returns else 0,
         }
 
-    def get_trades(self, start_date: str = None, end_date: str = None) -> List[dict]:
-        """매매 기록 조회"""
-        data = self._load_json(self.daily_trades_file)
-        trades = data.get("trades", [])
-
+    def get_trades(self, start_date: str = None, end_date: str = None,
+                   limit: int = None) -> List[dict]:
+        """매매 기록 조회 (최근 날짜 순, date 인덱스 구간 조회)"""
+        sql, where, params = "SELECT data FROM daily_trades", [], ()
         if start_date:
-            trades = [t for t in trades if t.get("date", "") >= start_date]
+            where.append("date >= ?")
+            params += (start_date,)
         if end_date:
-            trades = [t for t in trades if t.get("date", "") <= end_date]
-
-        return sorted(trades, key=lambda x: x.get("date", ""), reverse=True)
+            where.append("date <= ?")
+            params += (end_date,)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY date DESC"
+        if limit:
+            sql, params = sql + " LIMIT ?", params + (limit,)
+        return self.store.query(sql, params)
 
     # ==========================================
     # 4. Q&A 기록
@@ -273,36 +611,39 @@ class ProjectLogger:
             importance: 중요도 (critical, high, normal, low)
             tags: 태그 목록
         """
-        data = self._load_json(self.qa_history_file)
-
-        qa = {
-            "id": len(data.get("qa_list", [])) + 1,
-            "timestamp": datetime.now().isoformat(),
-            "date": datetime.now().strftime("%Y-%m-%d"),
-            "question": question,
-            "answer": answer,
-            "category": category,
-            "importance": importance,
-            "tags": tags or []
-        }
-
-        data.setdefault("qa_list", []).append(qa)
-        self._save_json(self.qa_history_file, data)
+        with self.store.conn:
+            qa = {
+                "id": self.store.next_id("qa"),
+                "timestamp": datetime.now().isoformat(),
+                "date": datetime.now().strftime("%Y-%m-%d"),
+                "question": question,
+                "answer": answer,
+                "category": category,
+                "importance": importance,
+                "tags": tags or []
+            }
+            qa = self.store.record("qa", qa)
+        self._flush(["qa_history.json"])
 
         print(f"[LOG] Q&A 기록됨: {question[:30]}...")
         return qa
 
-    def get_qa(self, category: str = None, importance: str = None) -> List[dict]:
-        """Q&A 조회"""
-        data = self._load_json(self.qa_history_file)
-        qa_list = data.get("qa_list", [])
-
+    def get_qa(self, category: str = None, importance: str = None,
+               limit: int = None) -> List[dict]:
+        """Q&A 조회 (최근 순)"""
+        sql, where, params = "SELECT data FROM qa", [], ()
         if category:
-            qa_list = [q for q in qa_list if q.get("category") == category]
+            where.append("category = ?")
+            params += (category,)
         if importance:
-            qa_list = [q for q in qa_list if q.get("importance") == importance]
-
-        return sorted(qa_list, key=lambda x: x.get("timestamp", ""), reverse=True)
+            where.append("importance = ?")
+            params += (importance,)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp DESC, id"
+        if limit:
+            sql, params = sql + " LIMIT ?", params + (limit,)
+        return self.store.query(sql, params)
 
     # ==========================================
     # 5. 규칙/제약 기록
@@ -316,7 +657,7 @@ class ProjectLogger:
                  reason: str,
                  status: str = "active"):
         """
-        규칙 기록
+        규칙 기록 (같은 이름이면 업데이트, 순서·생성 시각 유지)
 
         Args:
             rule_name: 규칙명
@@ -326,29 +667,20 @@ class ProjectLogger:
             reason: 규칙 설정 사유
             status: 상태 (active, inactive, testing)
         """
-        data = self._load_json(self.rules_file)
-
-        # 기존 규칙 확인 (같은 이름이면 업데이트)
-        existing = next((r for r in data.get("rules", []) if r.get("rule_name") == rule_name), None)
-
-        rule = {
-            "rule_name": rule_name,
-            "rule_type": rule_type,
-            "description": description,
-            "conditions": conditions,
-            "reason": reason,
-            "status": status,
-            "created_at": existing.get("created_at") if existing else datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
-
-        if existing:
-            idx = data["rules"].index(existing)
-            data["rules"][idx] = rule
-        else:
-            data.setdefault("rules", []).append(rule)
-
-        self._save_json(self.rules_file, data)
+        with self.store.conn:
+            existing = self.store.query_one("SELECT data FROM rules WHERE rule_name = ?", (rule_name,))
+            rule = {
+                "rule_name": rule_name,
+                "rule_type": rule_type,
+                "description": description,
+                "conditions": conditions,
+                "reason": reason,
+                "status": status,
+                "created_at": existing.get("created_at") if existing else datetime.now().isoformat(),
+                "updated_at": datetime.now().isoformat()
+            }
+            self.store.record("rule", rule)
+        self._flush(["rules.json"])
 
         print(f"[LOG] 규칙 기록됨: {rule_name}")
         return rule
@@ -365,11 +697,6 @@ class ProjectLogger:
             value: 값
             reason: 설정 사유
         """
-        data = self._load_json(self.rules_file)
-
-        existing = next((c for c in data.get("constraints", [])
-                        if c.get("constraint_name") == constraint_name), None)
-
         constraint = {
             "constraint_name": constraint_name,
             "value": value,
@@ -377,33 +704,29 @@ class ProjectLogger:
             "updated_at": datetime.now().isoformat()
         }
 
-        if existing:
-            idx = data["constraints"].index(existing)
-            data["constraints"][idx] = constraint
-        else:
-            data.setdefault("constraints", []).append(constraint)
-
-        self._save_json(self.rules_file, data)
+        with self.store.conn:
+            self.store.record("constraint", constraint)
+        self._flush(["rules.json"])
 
         print(f"[LOG] 제약조건 기록됨: {constraint_name} = {value}")
         return constraint
 
     def get_rules(self, rule_type: str = None, status: str = "active") -> List[dict]:
-        """규칙 조회"""
-        data = self._load_json(self.rules_file)
-        rules = data.get("rules", [])
-
-        if rule_type:
-            rules = [r for r in rules if r.get("rule_type") == rule_type]
+        """규칙 조회 (등록 순)"""
+        sql, where, params = "SELECT data FROM rules", [], ()
         if status:
-            rules = [r for r in rules if r.get("status") == status]
-
-        return rules
+            where.append("status = ?")
+            params += (status,)
+        if rule_type:
+            where.append("rule_type = ?")
+            params += (rule_type,)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self.store.query(sql + " ORDER BY seq", params)
 
     def get_constraints(self) -> List[dict]:
         """제약조건 조회"""
-        data = self._load_json(self.rules_file)
-        return data.get("constraints", [])
+        return self.store.query("SELECT data FROM rule_constraints ORDER BY seq")
 
     # ==========================================
     # 6. 세션 로그
@@ -411,68 +734,87 @@ class ProjectLogger:
 
     def start_session(self, session_type: str = "development"):
         """세션 시작 로그"""
-        data = self._load_json(self.session_log_file)
-
-        session = {
-            "session_id": len(data.get("sessions", [])) + 1,
-            "start_time": datetime.now().isoformat(),
-            "session_type": session_type,
-            "activities": [],
-            "end_time": None,
-            "summary": None
-        }
-
-        data.setdefault("sessions", []).append(session)
-        self._save_json(self.session_log_file, data)
+        with self.store.conn:
+            session = {
+                "session_id": self.store.next_id("sessions", "session_id"),
+                "start_time": datetime.now().isoformat(),
+                "session_type": session_type,
+                "activities": [],
+                "end_time": None,
+                "summary": None
+            }
+            session = self.store.record("session", session)
+        self._flush(["session_logs.json"])
 
         print(f"[LOG] 세션 시작: #{session['session_id']}")
         return session
 
+    def _open_session(self) -> Optional[tuple]:
+        """마지막 세션이 열려 있으면 (session_id, 본문)"""
+        row = self.store.conn.execute(
+            "SELECT session_id, end_time, data FROM sessions ORDER BY session_id DESC LIMIT 1").fetchone()
+        if row is None or row[1]:
+            return None
+        return row[0], json.loads(row[2])
+
     def log_activity(self, activity: str, details: dict = None):
         """세션 내 활동 로그"""
-        data = self._load_json(self.session_log_file)
-
-        if data.get("sessions"):
-            current_session = data["sessions"][-1]
-            if not current_session.get("end_time"):
-                current_session.setdefault("activities", []).append({
-                    "timestamp": datetime.now().isoformat(),
-                    "activity": activity,
-                    "details": details
-                })
-                self._save_json(self.session_log_file, data)
+        with self.store.conn:
+            current = self._open_session()
+            if not current:
+                return
+            self.store.record("activity", {"session_id": current[0], "activity": {
+                "timestamp": datetime.now().isoformat(),
+                "activity": activity,
+                "details": details
+            }})
+        self._flush(["session_logs.json"])
 
     def end_session(self, summary: str = None):
         """세션 종료 로그"""
-        data = self._load_json(self.session_log_file)
-
-        if data.get("sessions"):
-            current_session = data["sessions"][-1]
-            if not current_session.get("end_time"):
-                current_session["end_time"] = datetime.now().isoformat()
-                current_session["summary"] = summary
-                self._save_json(self.session_log_file, data)
-                print(f"[LOG] 세션 종료: #{current_session['session_id']}")
+        with self.store.conn:
+            current = self._open_session()
+            if not current:
+                return
+            session_id, session = current
+            session["end_time"] = datetime.now().isoformat()
+            session["summary"] = summary
+            self.store.record("session_end", {"session_id": session_id, "session": session})
+        self._flush(["session_logs.json"])
+        print(f"[LOG] 세션 종료: #{session_id}")
+
+    def get_sessions(self, limit: int = None) -> List[dict]:
+        """세션 조회 (최근 순, activities 포함)"""
+        sql, params = "SELECT session_id, data FROM sessions ORDER BY session_id DESC", ()
+        if limit:
+            sql, params = sql + " LIMIT ?", (limit,)
+        sessions = []
+        for session_id, data in self.store.conn.execute(sql, params).fetchall():
+            session = json.loads(data)
+            session["activities"] = self.store.query(
+                "SELECT data FROM activities WHERE session_id = ? ORDER BY id", (session_id,))
+            sessions.append(session)
+        return sessions
 
 
 class ContextLoader:
     """대화 시작 시 컨텍스트 로드"""
 
-    def __init__(self):
-        self.logger = ProjectLogger()
+    def __init__(self, logger: Optional[ProjectLogger] = None):
+        self.logger = logger or ProjectLogger()
         self.knowledge_base_file = DOCS_DIR / "PROJECT_KNOWLEDGE_BASE.md"
 
     def load_context(self) -> dict:
-        """전체 컨텍스트 로드"""
+        """전체 컨텍스트 로드 (필요한 구간만 인덱스 조회)"""
         return {
             "knowledge_base": self._load_knowledge_base(),
             "recent_decisions": self.logger.get_decisions(limit=5),
             "active_rules": self.logger.get_rules(status="active"),
             "constraints": self.logger.get_constraints(),
-            "recent_trades": self.logger.get_trades()[:7],  # 최근 7일
+            "recent_trades": self.logger.get_trades(limit=7),  # 최근 7일
             "important_qa": self.logger.get_qa(importance="critical") +
                           self.logger.get_qa(importance="high"),
-            "strategy_history": self.logger.get_strategy_history()[:5],
+            "strategy_history": self.logger.get_strategy_history(limit=5),
         }
 
     def _load_knowledge_base(self) -> str:
@@ -728,11 +1070,12 @@ def main():
     command = sys.argv[1]
 
     if command == "init":
-        initialize_project_logs()
+        initialize_project_logs().close()
 
     elif command == "context":
         loader = ContextLoader()
         loader.print_context()
+        loader.logger.close()
 
     elif command == "summary":
         loader = ContextLoader()
@@ -745,6 +1088,7 @@ def main():
         print(f"전략 변경: {len(loader.logger.get_strategy_history())}건")
         print(f"Q&A 기록: {len(loader.logger.get_qa())}건")
         print(f"매매 기록: {len(loader.logger.get_trades())}일")
+        loader.logger.close()
 
 
 if __name__ == "__main__":
@@ -2,11 +2,12 @@
 종목 → 테마 역인덱스 생성 (Phase 1)
 
 기존 data/theme_cache/theme_<code>.json 들을 뒤집어
-data/theme_cache/_stock_to_themes.json 생성.
+data/theme_cache/_stock_to_themes.npz (조회용 정수 코드 인덱스) + .json 생성.
 
 용법:
     python -m scripts.build_stock_theme_index            # 기존 캐시만 사용
-    python -m scripts.build_stock_theme_index --refresh  # 누락 테마 fetch (~60s)
+    python -m scripts.build_stock_theme_index --refresh  # 누락 테마 fetch
+    python -m scripts.build_stock_theme_index --sync     # 바뀌었거나 오래된 테마만 재수집 후 필요 시 재생성
 """
 
 import argparse
@@ -23,9 +24,18 @@ def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument('--refresh', action='store_true',
                     help='theme_list.json 에는 있지만 캐시 없는 테마 fetch')
+    ap.add_argument('--sync', action='store_true',
+                    help='증분 동기화 (종목수 변경/보관 기간 경과 테마만 재수집)')
+    ap.add_argument('--max-age-days', type=int, default=None,
+                    help='--sync 시 재수집 기준 기간 (기본 NaverThemeCrawler.SYNC_MAX_AGE_DAYS)')
     args = ap.parse_args()
 
     crawler = NaverThemeCrawler()
+    if args.sync:
+        summary = crawler.sync_theme_index(max_age_days=args.max_age_days)
+        print(f"[stock_to_themes] 동기화: {summary['checked']}/{summary['themes']} 테마 확인, "
+              f"{summary['changed']}개 변경, 인덱스 {'재생성' if summary['rebuilt'] else '유지'}")
+        return 0
     result = crawler.build_stock_to_themes_index(refresh_missing=args.refresh)
 
     meta = result['_meta']
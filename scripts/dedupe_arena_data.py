@@ -5,7 +5,8 @@ Arena 데이터 중복 누적 1회성 정정 스크립트
 
 처리 방식:
 1) leaderboard.daily_history 를 date 로 dedupe (마지막 entry 유지)
-2) 팀별 portfolio.json 을 daily/<date>/trades.json 시계열로 재구성
+2) 팀별 portfolio.json 을 원장 (data/arena/ledger.jsonl, 1회 스캔) 시계열로 재구성
+   — 원장이 없으면 daily/<date>/trades.json 을 모두 읽음
 3) leaderboard.teams[].{elo, rank counts, best/worst_day_return} 를 deduped history 로 재계산
 4) 원본은 .backup_YYYYMMDD_HHMMSS 로 보존
 
@@ -40,6 +41,26 @@ def discover_teams() -> list[str]:
     )
 
 
+def load_ledger_trades() -> dict[str, dict[str, dict]] | None:
+    """ledger.jsonl 한 번 스캔 → {team_id: {date: 매매 결과}} (키별 마지막 행). 원장 없으면 None"""
+    path = ARENA_DIR / "ledger.jsonl"
+    if not path.exists():
+        return None
+    rows: dict[tuple[str, str], dict] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+                rows[(row["team_id"], row["date"])] = row
+            except (json.JSONDecodeError, KeyError):
+                continue
+    out: dict[str, dict[str, dict]] = {}
+    for (tid, date), row in rows.items():
+        if row.get("status") == "success":
+            out.setdefault(tid, {})[date] = row
+    return out
+
+
 def load_trades_per_date(team_id: str) -> dict[str, dict]:
     """team 의 daily/<date>/trades.json 을 모두 읽음 → {date: trades_data}"""
     daily_dir = ARENA_DIR / team_id / "daily"
@@ -233,6 +254,8 @@ def main():
 
     # ===== Phase 1: 팀별 portfolio 재구성 =====
     print("\n[2/3] 팀별 portfolio.json 재구성")
+    ledger = load_ledger_trades()
+    print(f"  원천: {'ledger.jsonl' if ledger is not None else 'daily/<date>/trades.json'}")
     portfolio_changes = {}
     for tid in teams:
         pf_path = ARENA_DIR / tid / "portfolio.json"
@@ -241,7 +264,7 @@ def main():
             continue
         with open(pf_path, encoding="utf-8") as f:
             existing = json.load(f)
-        trades_by_date = load_trades_per_date(tid)
+        trades_by_date = ledger.get(tid, {}) if ledger is not None else load_trades_per_date(tid)
         if not trades_by_date:
             print(f"  - {tid}: daily trades 없음 (skip)")
             continue
@@ -264,9 +287,14 @@ def main():
     print("\n[3/3] leaderboard.json 재계산")
     lb_path = ARENA_DIR / "leaderboard.json"
     lb_change = None
+    lb = None
     if lb_path.exists():
         with open(lb_path, encoding="utf-8") as f:
             lb = json.load(f)
+    if lb is not None and "history_months" in lb:
+        # 월별 분리 이후: 같은 날짜는 Leaderboard.update_daily 가 교체하므로 중복이 생기지 않음
+        print("  - 월별 히스토리 형식 (leaderboard_history/) — 재계산 대상 아님 (skip)")
+    elif lb is not None:
         old_history = lb.get("daily_history", [])
         new_history = dedupe_daily_history(old_history, exclude_dates=exclude_dates)
         team_meta = lb.get("teams", {})
@@ -324,6 +352,7 @@ def main():
         print(f"  ✓ leaderboard.json 갱신 (backup: {bak.name if bak else '-'})")
 
     print("\n완료. 검증: python -m paper_trading.audit.verify_facts")
+    print("      대시보드 번들 갱신: python -m paper_trading.arena.dashboard")
     return 0
 
 
@@ -14,7 +14,6 @@ import sys
 import json
 import logging
 from pathlib import Path
-from datetime import datetime, timedelta
 from typing import List, Dict
 
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -27,6 +26,9 @@ logging.basicConfig(level=logging.WARNING, format='%(message)s')
 logger = logging.getLogger(__name__)
 
 from paper_trading.utils.krx_api import KRXClient
+from paper_trading.utils.exit_engine import daily_exits
+from paper_trading.utils.market_snapshot import get_market_snapshot
+from paper_trading.utils.trading_calendar import get_trading_calendar
 from paper_trading.strategies import (
     MomentumStrategy, LargecapContrarianStrategy,
     DartDisclosureStrategy, ThemePolicyStrategy, FrontierGapStrategy
@@ -50,22 +52,10 @@ TEAMS = [
 
 
 def get_trading_days(start: str, end: str) -> List[str]:
-    """KRX 지수 데이터로 거래일 필터 (가장 정확)"""
+    """거래일 캘린더 인덱스로 거래일 목록 (KRX 개장 미확정 평일만 지수 데이터로 확인)"""
     krx = KRXClient()
-    days = []
-    cur = datetime.strptime(start, '%Y%m%d')
-    end_dt = datetime.strptime(end, '%Y%m%d')
-    while cur <= end_dt:
-        if cur.weekday() < 5:  # 월~금
-            d = cur.strftime('%Y%m%d')
-            try:
-                idx = krx.get_index_ohlcv(d, 'KOSPI')
-                if not idx.empty:
-                    days.append(d)
-            except Exception:
-                pass
-        cur += timedelta(days=1)
-    return days
+    return get_trading_calendar().settled_trading_days(
+        start, end, probe=krx.has_trading_data)
 
 
 def simulate_day(date: str, candidates: List, krx: KRXClient) -> Dict:
@@ -78,66 +68,42 @@ def simulate_day(date: str, candidates: List, krx: KRXClient) -> Dict:
         return {'trades': [], 'total_return': 0, 'wins': 0,
                 'total_trades': 0, 'total_return_amount': 0, 'win_rate': 0}
 
-    trades = []
     capital_per_trade = INITIAL_CAPITAL / max(len(candidates), 1)
 
-    # 그날의 OHLCV 한 번에 fetch (캐시 사용)
-    market_data = {}
-    for market in ['KOSPI', 'KOSDAQ']:
-        df = krx.get_stock_ohlcv(date, market=market)
-        if not df.empty:
-            for code in df.index:
-                market_data[code] = df.loc[code]
+    # 그날의 OHLCV 한 번에 fetch (캐시 사용) — 날짜별 공용 스냅샷
+    snapshot = get_market_snapshot(date, krx)
 
+    picked = []  # (code, name, 스냅샷 위치)
     for cand in candidates:
         code = cand.code if hasattr(cand, 'code') else cand['code']
         name = cand.name if hasattr(cand, 'name') else cand['name']
-        row = market_data.get(code)
-        if row is None:
-            continue
-        try:
-            open_p = int(row.get('시가', 0))
-            high_p = int(row.get('고가', 0))
-            low_p = int(row.get('저가', 0))
-            close_p = int(row.get('종가', 0))
-            if open_p == 0:
-                continue
+        pos = snapshot.position(code)
+        if pos is not None:
+            picked.append((code, name, pos))
+
+    idx = [pos for *_, pos in picked]
+    opens = snapshot.column('open')[idx]
+    # 일봉 기반 체결 판정: 손절 우선 (저가가 손절선 도달) → 익절 (고가가 익절선 도달) → 종가 청산
+    exits = daily_exits(opens, snapshot.column('high')[idx], snapshot.column('low')[idx],
+                        snapshot.column('close')[idx], PROFIT_TARGET, LOSS_TARGET)
 
-            # 익절/손절 가격
-            profit_px = open_p * (1 + PROFIT_TARGET / 100)
-            loss_px = open_p * (1 + LOSS_TARGET / 100)
-
-            # 일봉 기반 체결 판정
-            if low_p <= loss_px:
-                # 손절 우선 (저가가 손절선 도달)
-                exit_px = int(loss_px)
-                exit_type = 'loss'
-            elif high_p >= profit_px:
-                # 익절 (고가가 익절선 도달)
-                exit_px = int(profit_px)
-                exit_type = 'profit'
-            else:
-                # 종가 청산
-                exit_px = close_p
-                exit_type = 'close'
-
-            return_pct = (exit_px - open_p) / open_p * 100
-            qty = int(capital_per_trade / open_p)
-            return_amt = (exit_px - open_p) * qty
-
-            trades.append({
-                'code': code,
-                'name': name,
-                'entry_price': open_p,
-                'exit_price': exit_px,
-                'exit_type': exit_type,
-                'return_pct': round(return_pct, 2),
-                'return_amount': return_amt,
-                'qty': qty,
-            })
-        except Exception as e:
-            logger.debug(f"{code} 시뮬 실패: {e}")
+    trades = []
+    for k, (code, name, _) in enumerate(picked):
+        if not exits.valid[k]:
             continue
+        open_p = int(opens[k])
+        exit_px = int(exits.exit_price[k])
+        qty = int(capital_per_trade / open_p)
+        trades.append({
+            'code': code,
+            'name': name,
+            'entry_price': open_p,
+            'exit_price': exit_px,
+            'exit_type': exits.exit_type(k),
+            'return_pct': round(float(exits.return_pct[k]), 2),
+            'return_amount': (exit_px - open_p) * qty,
+            'qty': qty,
+        })
 
     if not trades:
         return {'trades': [], 'total_return': 0, 'wins': 0,
@@ -23,6 +23,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 warnings.filterwarnings("ignore")
 
 from paper_trading.utils.krx_api import KRXClient
+from paper_trading.utils.trading_calendar import get_trading_calendar
 
 DATA_DIR = PROJECT_ROOT / "data" / "bnf"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -116,17 +117,24 @@ def get_admin_issue_codes(krx, date_str: str) -> set:
 
 
 def resolve_trading_date(date_str: str) -> str:
-    """주어진 날짜가 비거래일이면 가장 최근 거래일로 거슬러 올라감 (pykrx 사용)"""
-    dt = datetime.strptime(date_str, "%Y%m%d")
-    for _ in range(10):
-        d = dt.strftime("%Y%m%d")
+    """주어진 날짜가 비거래일이면 가장 최근 거래일로 거슬러 올라감 (pykrx 사용)
+
+    후보는 거래일 캘린더 인덱스에서 고르고, KRX 개장 확정 날짜는 pykrx 조회 생략.
+    """
+    cal = get_trading_calendar()
+    floor = (datetime.strptime(date_str, "%Y%m%d") - timedelta(days=9)).strftime("%Y%m%d")
+    d = cal.last_trading_day(date_str)
+    while d and d >= floor:
+        if cal.is_confirmed(d):
+            return d
         try:
             df = pykrx_stock.get_market_ohlcv_by_date(d, d, "005930")
             if not df.empty and float(df.iloc[0]["종가"]) > 0:
+                cal.observe(d, True)
                 return d
         except Exception:
             pass
-        dt -= timedelta(days=1)
+        d = cal.prev_trading_day(d)
     return date_str
 
 
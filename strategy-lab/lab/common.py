@@ -3,7 +3,7 @@
 
 모든 신규 전략이 공유하는 헬퍼:
 - KRX 클라이언트 lazy 초기화
-- 전 영업일 계산
+- 전 영업일 계산 (거래일 캘린더 인덱스)
 - KOSPI+KOSDAQ 통합 fetch
 - 표준 필터 (우선주/스팩/리츠 제외)
 - DataFrame → List[Dict] 변환
@@ -48,27 +48,44 @@ def get_krx() -> Optional["KRXClient"]:  # type: ignore  # noqa
 # 영업일 계산
 # ============================================================
 
+def get_calendar() -> Optional["TradingCalendar"]:  # type: ignore  # noqa
+    """거래일 캘린더 인덱스 (news-trading-bot 공용). 실패 시 None."""
+    if not NTB_AVAILABLE:
+        return None
+    try:
+        from paper_trading.utils.trading_calendar import get_trading_calendar
+        return get_trading_calendar()
+    except Exception as e:
+        logger.warning(f"거래일 캘린더 초기화 실패: {e}")
+        return None
+
+
 def previous_trading_day(date: str, max_lookback: int = 7) -> Optional[str]:
     """
     주어진 날짜의 직전 영업일.
     KRX OpenAPI에 데이터가 있는 첫 날짜를 반환.
+
+    후보는 거래일 캘린더에서 고르고, KRX 개장 확정 날짜면 조회 없이 반환.
     """
     krx = get_krx()
-    if not krx:
+    cal = get_calendar()
+    if not krx or not cal:
         return None
 
-    d = datetime.strptime(date, "%Y%m%d")
-    for delta in range(1, max_lookback + 1):
-        candidate = (d - timedelta(days=delta))
-        if candidate.weekday() >= 5:  # 토일 skip
-            continue
-        date_str = candidate.strftime("%Y%m%d")
+    floor = (datetime.strptime(date, "%Y%m%d") - timedelta(days=max_lookback)).strftime("%Y%m%d")
+    candidate = cal.prev_trading_day(date)
+    while candidate and candidate >= floor:
+        if cal.is_confirmed(candidate):
+            return candidate
         try:
-            df = krx.get_stock_ohlcv(date_str, market="KOSPI")
-            if not df.empty:
-                return date_str
+            has_data = krx.has_trading_data(candidate, market="KOSPI", kind="stock")
+            if has_data is not None:  # 조회 실패 (None) 는 휴장으로 기록하지 않음
+                cal.observe(candidate, has_data)
+            if has_data:
+                return candidate
         except Exception:
-            continue
+            pass
+        candidate = cal.prev_trading_day(candidate)
     return None
 
 
@@ -76,7 +93,7 @@ def previous_trading_day(date: str, max_lookback: int = 7) -> Optional[str]:
 # 통합 시장 데이터 fetch
 # ============================================================
 
-def fetch_all_markets(date: str) -> List[Dict]:
+def fetch_all_markets(date: str, snapshot=None) -> List[Dict]:
     """
     KOSPI + KOSDAQ 전종목 OHLCV를 List[Dict] 형태로 반환.
 
@@ -86,50 +103,32 @@ def fetch_all_markets(date: str) -> List[Dict]:
         trading_value, market_cap
 
     기존 5팀의 _fetch_market_data 패턴과 동일.
+    날짜별 MarketSnapshot(프로세스 공용 LRU)에서 구성 — 같은 날짜를 여러 전략이
+    조회해도 KRX 파싱은 1회. snapshot 을 넘기면 그대로 사용.
     """
-    krx = get_krx()
-    if not krx:
-        return []
+    if snapshot is None:
+        krx = get_krx()
+        if not krx:
+            return []
+        from paper_trading.utils.market_snapshot import get_market_snapshot
+        snapshot = get_market_snapshot(date, krx)
 
     stocks: List[Dict] = []
-
-    for market in ("KOSPI", "KOSDAQ"):
-        try:
-            df = krx.get_stock_ohlcv(date, market=market)
-        except Exception as e:
-            logger.warning(f"KRX {market} {date} fetch 실패: {e}")
-            continue
-
-        if df is None or df.empty:
-            continue
-
-        for code, row in df.iterrows():
-            try:
-                close = int(row.get("종가", 0) or 0)
-                if close == 0:
-                    continue
-                open_p = int(row.get("시가", 0) or 0)
-                high = int(row.get("고가", 0) or 0)
-                low = int(row.get("저가", 0) or 0)
-                prev_change = int(row.get("전일대비", 0) or 0)
-                prev_close = close - prev_change
-                stocks.append({
-                    "code": str(code),
-                    "name": str(row.get("종목명", "") or ""),
-                    "market": market,
-                    "open": open_p,
-                    "high": high,
-                    "low": low,
-                    "close": close,
-                    "prev_close": prev_close,
-                    "change_pct": float(row.get("등락률", 0) or 0),
-                    "volume": int(row.get("거래량", 0) or 0),
-                    "trading_value": int(row.get("거래대금", 0) or 0),
-                    "market_cap": int(row.get("시가총액", 0) or 0),
-                })
-            except Exception:
-                continue
-
+    for row in snapshot.rows():
+        stocks.append({
+            "code": row["code"],
+            "name": row["name"],
+            "market": row["market"],
+            "open": row["open"],
+            "high": row["high"],
+            "low": row["low"],
+            "close": row["close"],
+            "prev_close": row["close"] - row["prev_change"],
+            "change_pct": row["change_pct"],
+            "volume": row["volume"],
+            "trading_value": row["trading_value"],
+            "market_cap": row["market_cap"],
+        })
     return stocks
 
 
@@ -208,7 +207,8 @@ def safe_get_history(code: str, start: str, end: str, market: str = "KOSPI"):
 # ============================================================
 
 import pandas as pd
-from datetime import datetime as _dt, timedelta as _td
+
+HISTORY_COLUMNS = ["시가", "고가", "저가", "종가", "거래량", "거래대금", "시가총액"]
 
 
 def batch_get_history(
@@ -216,11 +216,11 @@ def batch_get_history(
     start: str,
     end: str,
 ) -> Dict[str, pd.DataFrame]:
-    """여러 종목의 기간 OHLCV를 캐시된 전종목 일별 데이터에서 추출.
+    """여러 종목의 기간 OHLCV를 KRX 일봉 패널에서 한 번에 추출.
 
-    krx.get_history()는 종목 1개당 날짜 루프를 돌아 API를 N번 호출하지만,
-    이 함수는 날짜별 전종목 OHLCV(캐시 hit)를 읽어 한번에 추출한다.
-    150종목 × 10일 = get_history 기준 1,500 API → 여기선 20 캐시 read.
+    krx.get_history()를 종목마다 부르는 대신 KRXClient.get_history_batch로
+    패널(data/krx_panel/)의 날짜 범위를 한 번 슬라이스해서 종목별 열만 꺼낸다.
+    패널에 없는 날짜만 일별 캐시/API로 채우므로 반복 호출 시 JSON 파싱 없음.
 
     Returns:
         {code: DataFrame(index=날짜str, columns=[시가,고가,저가,종가,거래량,거래대금,시가총액])}
@@ -229,57 +229,22 @@ def batch_get_history(
     if not krx:
         return {}
 
-    start_dt = _dt.strptime(start, "%Y%m%d")
-    end_dt = _dt.strptime(end, "%Y%m%d")
+    history = krx.get_history_batch(codes, start, end)
 
-    code_set = set(codes)
-    # {code: [{날짜, 시가, ...}, ...]}
-    result_rows: Dict[str, List[Dict]] = {c: [] for c in code_set}
-
-    cur = start_dt
-    while cur <= end_dt:
-        if cur.weekday() >= 5:
-            cur += _td(days=1)
-            continue
-        date_str = cur.strftime("%Y%m%d")
-        # 전종목 OHLCV (캐시 hit: ~15ms)
-        for market in ("KOSPI", "KOSDAQ"):
-            try:
-                df = krx.get_stock_ohlcv(date_str, market=market)
-            except Exception:
-                continue
-            if df is None or df.empty:
-                continue
-            # 해당 종목만 추출
-            matched = code_set & set(df.index)
-            for code in matched:
-                row = df.loc[code]
-                result_rows[code].append({
-                    "날짜": date_str,
-                    "시가": row.get("시가", 0),
-                    "고가": row.get("고가", 0),
-                    "저가": row.get("저가", 0),
-                    "종가": row.get("종가", 0),
-                    "거래량": row.get("거래량", 0),
-                    "거래대금": row.get("거래대금", 0),
-                    "시가총액": row.get("시가총액", 0),
-                })
-        cur += _td(days=1)
-
-    # DataFrame 변환
     result: Dict[str, pd.DataFrame] = {}
-    for code, rows in result_rows.items():
-        if not rows:
+    for code in set(codes):
+        df = history.get(code)
+        if df is None or df.empty:
             result[code] = pd.DataFrame()
         else:
-            df = pd.DataFrame(rows).set_index("날짜").sort_index()
-            result[code] = df
+            result[code] = df[HISTORY_COLUMNS]
 
     return result
 
 
 __all__ = [
     "get_krx",
+    "get_calendar",
     "previous_trading_day",
     "fetch_all_markets",
     "fetch_for_date_pair",
@@ -9,5 +9,6 @@ Realistic Simulation Package
 
 공통:
 - transaction_costs: 수수료/거래세 반영
+- vi_model: VI 발동 근사 (분봉 판정 skip)
 - benchmark: KODEX 200 alpha
 """
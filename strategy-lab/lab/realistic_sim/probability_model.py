@@ -28,6 +28,9 @@
 
   → clip to [0.05, 0.95] to avoid over-confidence
 
+계산은 paper_trading.utils.exit_engine (일봉 청산 공용 엔진의 probabilistic 모드).
+여러 종목은 probabilistic_exits 로 한 번에 판정.
+
 사용:
     from lab.realistic_sim.probability_model import probabilistic_exit
 
@@ -41,7 +44,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 
 
 @dataclass
@@ -74,23 +77,9 @@ def estimate_high_first_probability(
     Returns:
         p_high_first ∈ [0.05, 0.95]
     """
-    if open_p <= 0 or high_p == low_p:
-        return 0.5
-
-    trend = (close_p - open_p) / open_p
-    range_ratio = (high_p - low_p) / open_p
-
-    if range_ratio < 1e-6:
-        return 0.5
-
-    # 상대 추세 강도
-    relative_trend = trend / range_ratio
-
-    # 확률 공식
-    p = 0.5 + k_trend * relative_trend
+    from paper_trading.utils.exit_engine import high_first_probability
 
-    # clip [0.05, 0.95] — 완전 확실은 피함
-    return max(0.05, min(0.95, p))
+    return float(high_first_probability(open_p, high_p, low_p, close_p, k_trend=k_trend))
 
 
 def probabilistic_exit(
@@ -111,84 +100,104 @@ def probabilistic_exit(
     3. 둘 다 미도달 → 종가 청산 (확률 100%)
     4. 둘 다 도달 → 확률 가중 기대값
     """
-    if open_p <= 0:
-        return ProbabilisticExitResult(
-            exit_type="close",
-            gross_return_pct=0.0,
-            confidence=1.0,
-            scenario="invalid",
-        )
-
-    profit_px = open_p * (1 + profit_pct / 100)
-    loss_px = open_p * (1 + loss_pct / 100)
-
-    high_hit = high_p >= profit_px
-    low_hit = low_p <= loss_px
-
-    # 시나리오 1: high만
-    if high_hit and not low_hit:
-        return ProbabilisticExitResult(
-            exit_type="profit",
-            gross_return_pct=profit_pct,
-            confidence=1.0,
-            profit_probability=1.0,
-            loss_probability=0.0,
-            scenario="high_only",
-        )
-
-    # 시나리오 2: low만
-    if low_hit and not high_hit:
-        return ProbabilisticExitResult(
-            exit_type="loss",
-            gross_return_pct=loss_pct,
-            confidence=1.0,
-            profit_probability=0.0,
-            loss_probability=1.0,
-            scenario="low_only",
-        )
-
-    # 시나리오 3: 둘 다 미도달 → 종가
-    if not high_hit and not low_hit:
-        close_return = (close_p - open_p) / open_p * 100
-        return ProbabilisticExitResult(
-            exit_type="close",
-            gross_return_pct=close_return,
-            confidence=1.0,
-            scenario="neither",
-        )
-
-    # 시나리오 4: 둘 다 도달 → 확률 가중
-    p_high_first = estimate_high_first_probability(
-        open_p, high_p, low_p, close_p, k_trend=k_trend
-    )
+    return probabilistic_exits(
+        [open_p], [high_p], [low_p], [close_p],
+        profit_pct=profit_pct, loss_pct=loss_pct, k_trend=k_trend,
+    )[0]
+
+
+def probabilistic_exits(
+    opens,
+    highs,
+    lows,
+    closes,
+    profit_pct=5.0,
+    loss_pct=-3.0,
+    k_trend: float = 0.8,
+) -> List[ProbabilisticExitResult]:
+    """
+    여러 종목 일봉 OHLC 를 한 번에 확률적 exit 판정 (probabilistic_exit 의 배열판).
 
-    expected_return = (
-        p_high_first * profit_pct + (1 - p_high_first) * loss_pct
+    profit_pct / loss_pct 는 스칼라 또는 종목별 배열.
+    """
+    import numpy as np
+    from paper_trading.utils.exit_engine import (
+        EXIT_CLOSE, EXIT_INVALID, EXIT_LOSS, EXIT_PROFIT, daily_exits,
     )
 
-    # confidence: 0.5에서 멀수록 높음
-    confidence = abs(p_high_first - 0.5) * 2
-
-    # 시나리오 분류
-    if p_high_first > 0.7:
-        scenario = "both_trend_up"
-    elif p_high_first < 0.3:
-        scenario = "both_trend_down"
-    else:
-        scenario = "both_neutral"
-
-    return ProbabilisticExitResult(
-        exit_type="probabilistic",
-        gross_return_pct=round(expected_return, 4),
-        confidence=round(confidence, 4),
-        profit_probability=round(p_high_first, 4),
-        loss_probability=round(1 - p_high_first, 4),
-        scenario=scenario,
-    )
+    ex = daily_exits(opens, highs, lows, closes, profit_pct, loss_pct,
+                     probabilistic=True, k_trend=k_trend)
+    profits = np.broadcast_to(np.asarray(profit_pct, dtype=float), ex.exit_code.shape)
+    losses = np.broadcast_to(np.asarray(loss_pct, dtype=float), ex.exit_code.shape)
+
+    results: List[ProbabilisticExitResult] = []
+    for i, code in enumerate(ex.exit_code.tolist()):
+        pp, lp = float(profits[i]), float(losses[i])
+        if code == EXIT_INVALID:
+            results.append(ProbabilisticExitResult(
+                exit_type="close",
+                gross_return_pct=0.0,
+                confidence=1.0,
+                scenario="invalid",
+            ))
+        elif code == EXIT_PROFIT:
+            # 시나리오 1: high만
+            results.append(ProbabilisticExitResult(
+                exit_type="profit",
+                gross_return_pct=pp,
+                confidence=1.0,
+                profit_probability=1.0,
+                loss_probability=0.0,
+                scenario="high_only",
+            ))
+        elif code == EXIT_LOSS:
+            # 시나리오 2: low만
+            results.append(ProbabilisticExitResult(
+                exit_type="loss",
+                gross_return_pct=lp,
+                confidence=1.0,
+                profit_probability=0.0,
+                loss_probability=1.0,
+                scenario="low_only",
+            ))
+        elif code == EXIT_CLOSE:
+            # 시나리오 3: 둘 다 미도달 → 종가
+            results.append(ProbabilisticExitResult(
+                exit_type="close",
+                gross_return_pct=float(ex.return_pct[i]),
+                confidence=1.0,
+                scenario="neither",
+            ))
+        else:
+            # 시나리오 4: 둘 다 도달 → 확률 가중
+            p_high_first = float(ex.profit_probability[i])
+            expected_return = p_high_first * pp + (1 - p_high_first) * lp
+
+            # confidence: 0.5에서 멀수록 높음
+            confidence = abs(p_high_first - 0.5) * 2
+
+            # 시나리오 분류
+            if p_high_first > 0.7:
+                scenario = "both_trend_up"
+            elif p_high_first < 0.3:
+                scenario = "both_trend_down"
+            else:
+                scenario = "both_neutral"
+
+            results.append(ProbabilisticExitResult(
+                exit_type="probabilistic",
+                gross_return_pct=round(expected_return, 4),
+                confidence=round(confidence, 4),
+                profit_probability=round(p_high_first, 4),
+                loss_probability=round(1 - p_high_first, 4),
+                scenario=scenario,
+            ))
+    return results
 
 
 __all__ = [
     "ProbabilisticExitResult",
     "estimate_high_first_probability",
     "probabilistic_exit",
+    "probabilistic_exits",
 ]
@@ -0,0 +1,43 @@
+"""
+VI (변동성완화장치) 근사 모델
+=============================
+분봉 종가가 직전 2분 대비 ±10% 이상 급변하면 VI 발동으로 보고,
+그 분봉은 익절/손절 판정에서 제외한다 (단일가 매매 구간이라 체결 불가).
+
+runner.intraday_backtest (거래별 루프) 와 runner.exit_grid (청산 그리드) 가
+같은 마스크를 쓰도록 여기 한 곳에 둔다.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+
+# VI 발동 감지 임계값 (2분간 ±10% 급변)
+VI_THRESHOLD_PCT = 10.0
+VI_WINDOW_MINUTES = 2
+
+
+def vi_flags(close: np.ndarray, entry_idx: int) -> Tuple[np.ndarray, np.ndarray]:
+    """VI 발동 분봉, 판정 skip 분봉 (둘 다 bool 배열)
+
+    진입 후 VI_WINDOW_MINUTES 부터 보고, 마지막 2봉은 skip 하지 않는다 (종가 청산 구간).
+    """
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    idx = np.arange(n)
+    ref_price = np.ones(n)
+    ref_price[VI_WINDOW_MINUTES:] = close[:n - VI_WINDOW_MINUTES]
+    ref_price[ref_price == 0] = 1
+    vi = (idx >= entry_idx + VI_WINDOW_MINUTES) & (
+        np.abs(close - ref_price) / ref_price * 100 >= VI_THRESHOLD_PCT)
+    return vi, vi & (idx + 2 < n)
+
+
+__all__ = [
+    "VI_THRESHOLD_PCT",
+    "VI_WINDOW_MINUTES",
+    "vi_flags",
+]
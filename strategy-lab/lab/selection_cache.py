@@ -0,0 +1,599 @@
+"""
+종목 선정 메모이제이션 (Selection Cache)
+=========================================
+MatrixRunner 는 같은 전략을 겹치는 기간(1w ⊂ 1m ⊂ 3m ⊂ 1y)으로 돌리므로
+공유 날짜마다 select_stocks(date) 를 반복 계산한다. 이 모듈은 선정 결과를
+내용 주소(content-addressed) 키로 디스크에 저장해 기간 간/재실행 간 재사용한다.
+
+키 = sha1(strategy_id, 파라미터 해시, date, top_n, 데이터 스냅샷 버전)
+- 파라미터 해시: 전략 모듈과 그 모듈이 (함수 안 지연 import 포함) 가져오는 저장소 내 모듈
+  전체의 소스 (_squeeze_common, indicator_engine, lab/common, paper_trading.utils 등)
+  + 클래스 상수(대문자 속성, variant override 포함) + get_params() + 인스턴스 공개 속성
+  → 전략이 쓰는 공용 코드/파라미터가 바뀌어도 자동 무효화
+- 데이터 스냅샷 버전: DATA_VERSION + 전략이 읽는 입력 데이터 폴더 (INPUT_SOURCES: 폴더를 읽는
+  모듈이 전략의 import 그래프에 있을 때만) 에서 파일명 날짜가 선정일 이하인 항목과 날짜 없는
+  항목의 내용 해시 → lookback 창/DART/테마/수급 입력이 바뀌어도 무효화, 수정 시각만 바뀐
+  파일 (새 체크아웃/재수집) 은 그대로. 토큰/동기화 상태 같은 비입력 파일과 생성 시각 메타 키는
+  서명하지 않고, 수급 이력 npz 는 행 날짜 단위로 서명 (새 날짜 행 추가는 과거 선정일 서명 불변).
+  선정일 KRX 캐시 파일이 없으면 (네트워크 조회) 메모하지 않음
+
+기본은 꺼져 있다 — MatrixRunner(use_selection_cache=True) / --selection-cache 로 켠다.
+
+저장: data/selection_cache/<strategy_id>/<date>_<key16>.json (키당 1파일, tempfile+rename)
+→ 프로세스 풀 워커가 동시에 써도 안전.
+
+메모하지 않는 경우:
+- 오늘 이후 날짜 (장중/미확정 데이터)
+- select_stocks 예외 (다음 실행에서 재시도)
+- 직렬화 불가 후보 (dataclass 가 아니거나 JSON 변환 실패)
+
+사용:
+    from lab.selection_cache import SelectionCache
+
+    cache = SelectionCache()
+    cands, hit = cache.get_or_compute(strategy, "20260410", 5,
+                                      lambda: strategy.select_stocks(date="20260410", top_n=5))
+"""
+
+from __future__ import annotations
+
+import ast
+import bisect
+import dataclasses
+import hashlib
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import weakref
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+REPO_ROOT = PROJECT_ROOT.parent
+DEFAULT_CACHE_DIR = PROJECT_ROOT / "data" / "selection_cache"
+
+# 전략 선정 입력 데이터 폴더 (데이터 스냅샷 서명 대상) → 그 폴더를 읽는 모듈 파일 (REPO_ROOT 기준)
+# 전략의 import 그래프 (_dependency_files) 에 읽는 모듈이 있는 폴더만 그 전략의 서명에 넣는다
+INPUT_SOURCES: Dict[Path, Tuple[str, ...]] = {
+    REPO_ROOT / "data" / "krx_cache": ("paper_trading/utils/krx_api.py",),
+    REPO_ROOT / "data" / "kis_cache": ("paper_trading/utils/kis_api.py",),
+    REPO_ROOT / "data" / "dart_cache": ("paper_trading/utils/dart_utils.py",
+                                        "paper_trading/utils/disclosure_store.py",
+                                        "paper_trading/utils/dart_corp_index.py"),
+    REPO_ROOT / "data" / "naver_investor": ("paper_trading/utils/naver_investor.py",
+                                            "paper_trading/utils/investor_flow_store.py"),
+    REPO_ROOT / "data" / "theme_cache": ("paper_trading/utils/naver_theme.py",
+                                         "paper_trading/utils/theme_index.py",
+                                         "paper_trading/utils/theme_cap.py"),
+    REPO_ROOT / "data" / "intraday": ("paper_trading/utils/minute_store.py", "intraday_collector.py"),
+    REPO_ROOT / "data" / "holidays_cache": ("utils.py",),
+    PROJECT_ROOT / "data" / "minute_cache": ("strategy-lab/lab/yahoo_minute.py",),
+}
+
+# 서명 제외: 파생 인덱스 (krx_cache 일자 파일 / 같은 이름 JSON 에서 만듦), 비입력 (토큰, 테마 동기화 상태)
+_SKIP_FILES = {"_trading_calendar.npz", "_stock_to_themes.npz", "token.json", "_theme_sync.json"}
+
+# 행 단위 날짜 서명 폴더 — 종목별 수급 이력 npz (rows: date 필드, checked: 마지막 조회일은 제외)
+_ROW_DATED_DIRS = {REPO_ROOT / "data" / "naver_investor" / "flows"}
+
+# 날짜 없는 JSON 에서 빼는 최상위 메타 키 (생성/갱신 시각 — 내용이 같아도 매번 바뀜)
+_VOLATILE_KEYS = {"_meta", "updated", "generated_at"}
+
+# 파일 내용 해시 메모 (경로 → [크기:수정 시각, 해시]) — 해시 재계산 생략용, 서명에는 안 들어감
+_DIGEST_MEMO_PATH = DEFAULT_CACHE_DIR / "_input_digests.json"
+
+_DATE_RE = re.compile(r"(?<!\d)(20\d{6})(?!\d)")
+
+# 캐시 형식/데이터 해석이 바뀌면 증분 (환경변수 SELECTION_CACHE_DATA_VERSION 로 추가 구분 가능)
+DATA_VERSION = 2
+
+
+# ============================================================
+# 키 구성 요소
+# ============================================================
+
+def _jsonable(value: Any) -> Any:
+    """numpy 스칼라 등 → 파이썬 기본형."""
+    if hasattr(value, "item") and callable(value.item):
+        try:
+            return value.item()
+        except (ValueError, TypeError):
+            pass
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    return repr(value)
+
+
+_PLAIN = (str, int, float, bool, type(None))
+
+
+def _is_plain(value: Any, depth: int = 0) -> bool:
+    """JSON 기본형(+중첩 list/tuple/dict)인지 — 클라이언트 객체 등 repr 이 실행마다 달라지는 값 배제."""
+    if isinstance(value, _PLAIN):
+        return True
+    if depth > 4:
+        return False
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(v, depth + 1) for v in value)
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _is_plain(v, depth + 1) for k, v in value.items())
+    return False
+
+
+_deps_lock = threading.Lock()
+_module_deps: Dict[str, Tuple[Optional[str], Tuple[str, ...]]] = {}   # 모듈 → (파일, import 모듈)
+_file_digests: Dict[str, str] = {}
+
+
+def _in_repo(path: Optional[str]) -> bool:
+    if not path or "site-packages" in path:
+        return False
+    try:
+        Path(path).resolve().relative_to(REPO_ROOT)
+    except ValueError:
+        return False
+    return True
+
+
+def _find_module_file(name: str) -> Optional[str]:
+    """모듈 이름 → 저장소 안 소스 파일 (저장소 밖/없음이면 None, 외부 패키지는 import 하지 않음)."""
+    if name == "__main__":   # 스크립트로 실행한 모듈 (테스트/CLI)
+        path = getattr(sys.modules.get("__main__"), "__file__", None)
+        return path if _in_repo(path) and path.endswith(".py") else None
+    try:
+        top = importlib.util.find_spec(name.split(".")[0])
+        if top is None:
+            return None
+        location = top.origin or next(iter(top.submodule_search_locations or []), None)
+        if not _in_repo(location):
+            return None
+        spec = top if "." not in name else importlib.util.find_spec(name)
+    except (ImportError, ValueError, AttributeError):
+        return None
+    origin = spec.origin if spec else None
+    return origin if _in_repo(origin) and origin.endswith(".py") else None
+
+
+def _imports_of(name: str, path: str) -> Tuple[str, ...]:
+    """소스의 import 문 (함수 안 포함) → 후보 모듈 이름."""
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+    package = name if path.endswith("__init__.py") else name.rpartition(".")[0]
+    found = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                parts = alias.name.split(".")
+                found.update(".".join(parts[:i]) for i in range(1, len(parts) + 1))
+        elif isinstance(node, ast.ImportFrom):
+            try:
+                base = importlib.util.resolve_name("." * node.level + (node.module or ""), package) \
+                    if node.level else node.module
+            except (ImportError, ValueError):
+                continue
+            if not base:
+                continue
+            parts = base.split(".")
+            found.update(".".join(parts[:i]) for i in range(1, len(parts) + 1))
+            found.update(f"{base}.{alias.name}" for alias in node.names if alias.name != "*")
+    return tuple(sorted(found))
+
+
+def _dependency_files(root_modules: List[str]) -> List[str]:
+    """루트 모듈에서 import 로 닿는 저장소 내 모듈 파일 전체 (정렬)."""
+    files, seen, queue = set(), set(), list(root_modules)
+    while queue:
+        name = queue.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        with _deps_lock:
+            cached = _module_deps.get(name)
+        if cached is None:
+            path = _find_module_file(name)
+            deps: Tuple[str, ...] = ()
+            if path:
+                try:
+                    deps = _imports_of(name, path)
+                except (OSError, SyntaxError, ValueError) as e:
+                    logger.debug(f"import 분석 실패 {path}: {e}")
+            cached = (path, deps)
+            with _deps_lock:
+                _module_deps[name] = cached
+        path, deps = cached
+        if path:
+            files.add(path)
+            queue.extend(d for d in deps if d not in seen)
+    return sorted(files)
+
+
+def _file_digest(path: str) -> str:
+    with _deps_lock:
+        digest = _file_digests.get(path)
+    if digest is None:
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        with _deps_lock:
+            _file_digests[path] = digest
+    return digest
+
+
+def _source_digest(cls: type) -> str:
+    """클래스 (MRO 포함) 모듈과 그 모듈들이 import 하는 저장소 내 모듈 전체의 소스 해시."""
+    roots = sorted({klass.__module__ for klass in cls.__mro__
+                    if klass is not object and klass.__module__ != "builtins"})
+    h = hashlib.sha1()
+    for path in _dependency_files(roots):
+        rel = os.path.relpath(path, REPO_ROOT)
+        h.update(f"{rel}:{_file_digest(path)}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def strategy_fingerprint(strategy) -> str:
+    """전략 코드 + 파라미터 해시 (JSON 기본형 값만 반영)."""
+    cls = type(strategy)
+    consts: Dict[str, Any] = {}
+    for klass in reversed(cls.__mro__):
+        if klass is object:
+            continue
+        for name, value in vars(klass).items():
+            if name.isupper() and _is_plain(value):
+                consts[name] = value
+    try:
+        params = strategy.get_params() if hasattr(strategy, "get_params") else {}
+    except Exception:
+        params = {}
+    attrs = {k: v for k, v in vars(strategy).items()
+             if not k.startswith("_") and k not in ("candidates", "selection_date")
+             and _is_plain(v)}
+    payload = {
+        "class": f"{cls.__module__}.{cls.__qualname__}",
+        "source": _source_digest(cls),
+        "consts": consts,
+        "params": params,
+        "attrs": attrs,
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=_jsonable)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path: Path, blob: str) -> None:
+    """tempfile + rename (동시 쓰기 안전)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=path.name + ".tmp.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(blob)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _content_digest(path: str, undated_json: bool) -> str:
+    """파일 내용 해시 — 날짜 없는 JSON 은 메타 키 (_VOLATILE_KEYS) 를 뺀 정규화 내용."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if undated_json:
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            data = {k: v for k, v in data.items() if k not in _VOLATILE_KEYS}
+            raw = json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+class _InputIndex:
+    """입력 데이터 폴더 서명 — 날짜순 누적 내용 해시 (선정일 이하 항목 + 날짜 없는 항목).
+
+    memo: {상대 경로: [크기:수정 시각, 해시]} — 같은 파일은 다시 읽지 않음 (갱신 시 dirty)
+    """
+
+    def __init__(self, dirs: List[Path], memo: Optional[Dict[str, List[str]]] = None):
+        self.memo = {} if memo is None else memo
+        self.dirty = False
+        undated = hashlib.sha1()
+        dated: List[Tuple[str, str]] = []
+        for root in dirs:
+            if not root.is_dir():
+                continue
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames.sort()
+                if Path(dirpath) in _ROW_DATED_DIRS:
+                    dated.extend(self._row_entries(dirpath, sorted(filenames)))
+                    continue
+                for fname in sorted(filenames):
+                    if fname.startswith(".") or ".tmp" in fname or fname in _SKIP_FILES:
+                        continue
+                    path = os.path.join(dirpath, fname)
+                    rel = os.path.relpath(path, REPO_ROOT)
+                    dates = _DATE_RE.findall(rel)
+                    digest = self._digest(path, rel, not dates and fname.endswith(".json"))
+                    if digest is None:
+                        continue
+                    if dates:   # daily_<code>_<start>_<end> 같은 구간 파일은 끝 날짜부터
+                        dated.append((max(dates), f"{rel}:{digest}"))
+                    else:
+                        undated.update(f"{rel}:{digest}\n".encode("utf-8"))
+        dated.sort()
+        self.dates: List[str] = []
+        self.digests: List[str] = []
+        h = undated.copy()
+        self.base = h.hexdigest()
+        for date, sig in dated:
+            h.update(sig.encode("utf-8") + b"\n")
+            if self.dates and self.dates[-1] == date:
+                self.digests[-1] = h.hexdigest()
+            else:
+                self.dates.append(date)
+                self.digests.append(h.hexdigest())
+
+    def _digest(self, path: str, rel: str, undated_json: bool) -> Optional[str]:
+        try:
+            st = os.stat(path)
+            stamp = f"{st.st_size}:{st.st_mtime_ns}"
+            cached = self.memo.get(rel)
+            if cached and cached[0] == stamp:
+                return cached[1]
+            digest = _content_digest(path, undated_json)
+        except OSError:
+            return None
+        self.memo[rel] = [stamp, digest]
+        self.dirty = True
+        return digest
+
+    @staticmethod
+    def _row_entries(dirpath: str, filenames: List[str]) -> List[Tuple[str, str]]:
+        """종목별 수급 이력 npz → 날짜별 (모든 종목의 그날 행) 해시 항목."""
+        import numpy as np
+
+        by_date: Dict[str, Any] = {}
+        for fname in filenames:
+            if not fname.endswith(".npz") or ".tmp" in fname:
+                continue
+            path = os.path.join(dirpath, fname)
+            try:
+                with np.load(path) as npz:
+                    rows = npz["rows"]
+            except (OSError, ValueError, KeyError) as e:
+                logger.debug(f"수급 이력 서명 생략 {path}: {e}")
+                continue
+            for row in rows:
+                date = str(int(row["date"]))
+                h = by_date.get(date)
+                if h is None:
+                    h = by_date[date] = hashlib.sha1()
+                h.update(fname.encode("utf-8") + row.tobytes())
+        rel = os.path.relpath(dirpath, REPO_ROOT)
+        return [(date, f"{rel}@{date}:{h.hexdigest()}") for date, h in by_date.items()]
+
+    def signature(self, date: str) -> str:
+        i = bisect.bisect_right(self.dates, date)
+        return self.digests[i - 1] if i else self.base
+
+
+_input_indexes: Dict[Path, _InputIndex] = {}
+_input_lock = threading.Lock()
+
+
+def _load_digest_memo() -> Dict[str, List[str]]:
+    try:
+        with open(_DIGEST_MEMO_PATH, "r", encoding="utf-8") as f:
+            memo = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return memo if isinstance(memo, dict) else {}
+
+
+def _get_input_index(root: Path) -> _InputIndex:
+    """입력 폴더당 프로세스 1회 스캔 (실행 중 데이터는 바뀌지 않는다고 본다)."""
+    with _input_lock:
+        index = _input_indexes.get(root)
+        if index is None:
+            index = _input_indexes[root] = _InputIndex([root], _load_digest_memo())
+            if index.dirty:
+                memo = {**_load_digest_memo(), **index.memo}
+                try:
+                    _write_atomic(_DIGEST_MEMO_PATH, json.dumps(memo, separators=(",", ":")))
+                except OSError as e:
+                    logger.debug(f"입력 해시 메모 저장 실패: {e}")
+        return index
+
+
+def reset_input_index() -> None:
+    """입력 폴더 서명 다시 스캔 (데이터 재수집 후/테스트)."""
+    with _input_lock:
+        _input_indexes.clear()
+
+
+def strategy_input_dirs(cls: type) -> Tuple[Path, ...]:
+    """전략 클래스 (MRO 포함) 의 import 그래프에 읽는 모듈이 있는 입력 폴더."""
+    roots = sorted({klass.__module__ for klass in cls.__mro__
+                    if klass is not object and klass.__module__ != "builtins"})
+    deps = {os.path.relpath(path, REPO_ROOT).replace(os.sep, "/") for path in _dependency_files(roots)}
+    return tuple(root for root, readers in INPUT_SOURCES.items() if deps.intersection(readers))
+
+
+def data_snapshot_version(date: str, dirs: Optional[Tuple[Path, ...]] = None) -> Optional[str]:
+    """선정일 입력 데이터 서명 — 선정일 KRX 캐시가 없으면 None (메모 대상 아님).
+
+    dirs: 서명할 입력 폴더 (기본 INPUT_SOURCES 전체)
+    """
+    try:
+        from paper_trading.utils.krx_api import CACHE_DIR
+    except ImportError:
+        return None
+    if not any((CACHE_DIR / f"stock_{market}_{date}.json").exists() for market in ("KOSPI", "KOSDAQ")):
+        return None
+    h = hashlib.sha1()
+    for root in (tuple(INPUT_SOURCES) if dirs is None else dirs):
+        rel = os.path.relpath(root, REPO_ROOT)
+        h.update(f"{rel}:{_get_input_index(root).signature(date)}\n".encode("utf-8"))
+    return "|".join([str(DATA_VERSION), os.getenv("SELECTION_CACHE_DATA_VERSION", ""), h.hexdigest()])
+
+
+# ============================================================
+# 후보 직렬화
+# ============================================================
+
+def _encode_candidates(cands: List) -> Optional[List[Dict]]:
+    out = []
+    for c in cands:
+        if not dataclasses.is_dataclass(c) or isinstance(c, type):
+            return None
+        cls = type(c)
+        out.append({
+            "type": f"{cls.__module__}:{cls.__qualname__}",
+            "data": dataclasses.asdict(c),
+        })
+    return out
+
+
+def _decode_candidates(items: List[Dict]) -> List:
+    out = []
+    for item in items:
+        module, _, qualname = item["type"].partition(":")
+        obj: Any = importlib.import_module(module)
+        for part in qualname.split("."):
+            obj = getattr(obj, part)
+        out.append(obj(**item["data"]))
+    return out
+
+
+# ============================================================
+# SelectionCache
+# ============================================================
+
+class SelectionCache:
+    """select_stocks 결과 디스크 메모 (메모리 계층 포함)."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, enabled: bool = True):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.enabled = enabled
+        self._memory: Dict[str, List[Dict]] = {}
+        self._fingerprints: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # pickle (프로세스 워커 전달) — 경로/설정만
+    def __getstate__(self):
+        return {"cache_dir": self.cache_dir, "enabled": self.enabled}
+
+    def __setstate__(self, state):
+        self.__init__(state["cache_dir"], state["enabled"])
+
+    def key(self, strategy, date: str, top_n: int) -> Optional[str]:
+        """메모 키 (메모 대상이 아니면 None)."""
+        if not self.enabled or date >= datetime.now().strftime("%Y%m%d"):
+            return None
+        try:
+            with self._lock:
+                cached = self._fingerprints.get(strategy)
+        except TypeError:  # weakref/hash 불가 객체
+            cached = None
+        if cached is None:
+            cached = (strategy_fingerprint(strategy), strategy_input_dirs(type(strategy)))
+            try:
+                with self._lock:
+                    self._fingerprints[strategy] = cached
+            except TypeError:
+                pass
+        fp, dirs = cached
+        snapshot = data_snapshot_version(date, dirs)
+        if snapshot is None:
+            return None
+        raw = "\x1f".join([strategy.STRATEGY_ID, fp, date, str(top_n), snapshot])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, strategy_id: str, date: str, key: str) -> Path:
+        return self.cache_dir / strategy_id / f"{date}_{key[:16]}.json"
+
+    def get_or_compute(self, strategy, date: str, top_n: int,
+                       compute: Callable[[], List]) -> Tuple[List, bool]:
+        """메모된 선정 결과 반환, 없으면 compute() 후 저장. 반환: (후보, 캐시 hit 여부)."""
+        key = self.key(strategy, date, top_n)
+        if key is None:
+            return compute(), False
+
+        items = self._load(strategy.STRATEGY_ID, date, key)
+        if items is not None:
+            try:
+                cands = _decode_candidates(items)
+                with self._lock:
+                    self.hits += 1
+                return cands, True
+            except Exception as e:
+                logger.debug(f"선정 캐시 복원 실패 {strategy.STRATEGY_ID}/{date}: {e}")
+
+        with self._lock:
+            self.misses += 1
+        cands = compute()
+        encoded = _encode_candidates(cands)
+        if encoded is not None:
+            self._store(strategy.STRATEGY_ID, date, key, encoded)
+        return cands, False
+
+    def _load(self, strategy_id: str, date: str, key: str) -> Optional[List[Dict]]:
+        with self._lock:
+            items = self._memory.get(key)
+        if items is not None:
+            return items
+        path = self._path(strategy_id, date, key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if data.get("key") != key:
+            return None
+        items = data.get("candidates", [])
+        with self._lock:
+            self._memory[key] = items
+        return items
+
+    def _store(self, strategy_id: str, date: str, key: str, items: List[Dict]) -> None:
+        data = {"key": key, "strategy_id": strategy_id, "date": date, "candidates": items}
+        path = self._path(strategy_id, date, key)
+        try:
+            blob = json.dumps(data, ensure_ascii=False, default=_jsonable)
+            _write_atomic(path, blob)
+        except Exception as e:
+            logger.debug(f"선정 캐시 저장 실패 {strategy_id}/{date}: {e}")
+            return
+        with self._lock:
+            self._memory[key] = json.loads(blob)["candidates"]
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+__all__ = [
+    "SelectionCache",
+    "strategy_fingerprint",
+    "data_snapshot_version",
+    "reset_input_index",
+    "strategy_input_dirs",
+    "DEFAULT_CACHE_DIR",
+    "INPUT_SOURCES",
+    "DATA_VERSION",
+]
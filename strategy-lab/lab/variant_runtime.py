@@ -21,7 +21,7 @@ from lab.parameter_tuner import VariantSpec
 
 
 # 힌트 플래그 — 실제 실행에 영향 없고 기록만 됨
-_HINT_FLAGS = {"ENTRY_RELAXATION_HINT"}
+HINT_FLAGS = frozenset({"ENTRY_RELAXATION_HINT"})
 
 
 def apply_strategy_overrides(
@@ -38,7 +38,7 @@ def apply_strategy_overrides(
 
     attrs: Dict[str, Any] = {}
     for key, value in overrides.items():
-        if key in _HINT_FLAGS:
+        if key in HINT_FLAGS:
             attrs[key] = value
             continue
         existing = getattr(base_cls, key, None)
@@ -67,7 +67,7 @@ def resolve_exit_rules(
 def describe_variant_effects(spec: VariantSpec) -> Dict[str, Any]:
     """variant가 실제로 어떤 실행 효과를 갖는지 요약."""
     strat = dict(spec.strategy_param_overrides or {})
-    runtime_hints = {k: strat.pop(k) for k in list(strat) if k in _HINT_FLAGS}
+    runtime_hints = {k: strat.pop(k) for k in list(strat) if k in HINT_FLAGS}
     return {
         "variant_id": spec.variant_id,
         "real_strategy_overrides": strat,
@@ -78,6 +78,7 @@ def describe_variant_effects(spec: VariantSpec) -> Dict[str, Any]:
 
 
 __all__ = [
+    "HINT_FLAGS",
     "apply_strategy_overrides",
     "resolve_exit_rules",
     "describe_variant_effects",
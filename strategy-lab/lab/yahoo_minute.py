@@ -8,7 +8,8 @@ Yahoo Finance 1분봉 크롤러 (yfinance 기반)
 - 한국 종목 suffix: KOSPI → .KS, KOSDAQ → .KQ
 - 최근 5~7일 1분봉 (Yahoo 제한)
 - 디스크 캐시 (data/minute_cache/)
-- Rate limit 보수적 (2s between fetches)
+- Rate limit 보수적 (2s between fetches, 스레드 간 공유)
+- prefetch: 캐시 조회·응답 대기를 스레드 풀로 겹침 (요청 시작 간격은 rate limit 유지)
 
 반환 형식:
     {
@@ -31,8 +32,10 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
 import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -58,10 +61,12 @@ class YahooMinuteClient:
 
     RATE_LIMIT_SLEEP = 2.0   # 종목 간 최소 간격
     CACHE_TTL_SECONDS = 2 * 3600   # 2시간 캐시
+    PREFETCH_WORKERS = 4     # prefetch 동시 실행 수
 
     def __init__(self, use_cache: bool = True):
         self.use_cache = use_cache
         self._last_call_at = 0.0
+        self._rate_lock = threading.Lock()
 
     # ─────────────────────────────────────────────────────────
     # Public API
@@ -115,35 +120,55 @@ class YahooMinuteClient:
         codes_markets: List[tuple],
         days: int = 5,
         progress_callback=None,
+        max_workers: Optional[int] = None,
     ) -> Dict[str, Dict[str, List[Dict]]]:
         """
-        여러 종목을 한 번에 prefetch (병렬 없음 — rate limit 회피).
+        여러 종목을 한 번에 prefetch (스레드 풀, 요청 시작 간격은 RATE_LIMIT_SLEEP 유지).
+
+        캐시 hit 종목은 대기 없이 즉시 반환되고, miss 종목은 rate limit 슬롯을
+        차례로 받아 yfinance 응답 대기 시간이 서로 겹친다.
 
         Args:
             codes_markets: [(code, market), ...]
-            progress_callback: (i, total, code) 콜백
+            progress_callback: (i, total, code) 콜백 (완료 순서)
+            max_workers: 동시 실행 수 (기본 PREFETCH_WORKERS)
 
         Returns:
-            {code: {date: [bars]}}
+            {code: {date: [bars]}} — 입력 순서
         """
-        results = {}
         total = len(codes_markets)
-        for i, (code, market) in enumerate(codes_markets, 1):
-            if progress_callback:
-                progress_callback(i, total, code)
-            bars = self.get_minute_bars(code, market=market, days=days)
-            results[code] = bars
-        return results
+        if total == 0:
+            return {}
+        workers = min(max_workers or self.PREFETCH_WORKERS, total)
+        fetched: Dict[str, Dict[str, List[Dict]]] = {}
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = {
+                ex.submit(self.get_minute_bars, code, market=market, days=days): code
+                for code, market in codes_markets
+            }
+            for i, fut in enumerate(as_completed(futures), 1):
+                code = futures[fut]
+                try:
+                    fetched[code] = fut.result()
+                except Exception as e:
+                    logger.warning(f"[{code}] prefetch 실패: {e}")
+                    fetched[code] = {}
+                if progress_callback:
+                    progress_callback(i, total, code)
+        return {code: fetched.get(code, {}) for code, _ in codes_markets}
 
     # ─────────────────────────────────────────────────────────
     # Internal
     # ─────────────────────────────────────────────────────────
 
     def _rate_limit(self) -> None:
-        elapsed = time.time() - self._last_call_at
-        if elapsed < self.RATE_LIMIT_SLEEP:
-            time.sleep(self.RATE_LIMIT_SLEEP - elapsed)
-        self._last_call_at = time.time()
+        # 다음 호출 슬롯을 lock 안에서 예약하고, 대기는 lock 밖에서 (스레드 간 간격 보장)
+        with self._rate_lock:
+            now = time.time()
+            slot = max(now, self._last_call_at + self.RATE_LIMIT_SLEEP)
+            self._last_call_at = slot
+        if slot > now:
+            time.sleep(slot - now)
 
     def _code_to_ticker(self, code: str, market: str) -> str:
         suffix = ".KS" if market.upper() == "KOSPI" else ".KQ"
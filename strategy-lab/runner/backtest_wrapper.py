@@ -7,6 +7,9 @@ news-trading-bot의 simulate_day 로직을 재사용하여
 특징:
 - 단일 전략 + 임의 기간 백테스트
 - ThreadPoolExecutor로 일자별 병렬 처리 (KRX 캐시 활용)
+- executor="process" — ProcessPoolExecutor 모드 (선정 로직이 순수 Python/pandas 라
+  스레드는 GIL 에 묶임). 워커마다 KRX 캐시 1회 warm, 전략 출력은 워커 자체에서 캡처,
+  일자 결과는 끝나는 대로 스트리밍
 - 진행률 콜백 지원
 - 일자별 실패가 전체 실행 중단시키지 않음
 - 결과는 BacktestResult dataclass로 반환
@@ -18,15 +21,25 @@ news-trading-bot의 simulate_day 로직을 재사용하여
     bt = SingleStrategyBacktest(VolatilityBreakoutLW())
     result = bt.run("20260323", "20260410", parallel_workers=4)
     print(result.summary())
+
+    # 코어 수만큼 프로세스
+    result = bt.run("20260323", "20260410", parallel_workers=None, executor="process")
 """
 
 from __future__ import annotations
 
+import contextlib
+import gc
+import io
 import logging
+import multiprocessing as mp
+import os
+import pickle
 import sys
+import threading
 import time
 import traceback
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -34,7 +47,8 @@ from typing import Callable, Dict, List, Optional
 
 # news-trading-bot 경로 (lab/__init__이 처리)
 from lab import BaseStrategy, NTB_AVAILABLE, assert_ntb_available
-from lab.common import get_krx
+from lab.common import get_calendar, get_krx
+from lab.selection_cache import SelectionCache
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +62,7 @@ PROFIT_TARGET = 5.0    # +5%
 LOSS_TARGET = -3.0     # -3%
 DEFAULT_TOP_N = 5
 DEFAULT_WORKERS = 4    # KRX rate limit (200ms) 고려
+EXECUTORS = ("thread", "process")
 
 
 # ============================================================
@@ -66,6 +81,7 @@ class DayResult:
     daily_return_amount: int = 0
     capital_after: int = 0
     selection_failed: bool = False
+    selection_cached: bool = False
     error: Optional[str] = None
     trade_details: List[Dict] = field(default_factory=list)
 
@@ -131,7 +147,8 @@ def simulate_day(
     일봉 기반 매매 시뮬:
     시초가 매수 → 익절(+5%)/손절(-3%) 판정 → 종가 청산.
 
-    news-trading-bot/scripts/run_backtest.py의 simulate_day와 동일한 로직.
+    news-trading-bot/scripts/run_backtest.py의 simulate_day와 동일한 로직
+    (청산 판정은 공용 paper_trading.utils.exit_engine.daily_exits).
 
     Args:
         profit_target: None이면 글로벌 PROFIT_TARGET 사용 (variant override용)
@@ -148,81 +165,57 @@ def simulate_day(
             "total_return_amount": 0,
         }
 
-    # 그날 OHLCV (KRX 캐시 hit 시 빠름)
-    market_data = {}
-    for market in ("KOSPI", "KOSDAQ"):
-        try:
-            df = krx.get_stock_ohlcv(date, market=market)
-        except Exception:
-            continue
-        if df is None or df.empty:
-            continue
-        for code in df.index:
-            market_data[code] = df.loc[code]
+    # 그날 OHLCV (KRX 캐시 hit 시 빠름) — 날짜별 공용 스냅샷 컬럼에서 후보 행만 추출
+    from paper_trading.utils.exit_engine import daily_exits
+    from paper_trading.utils.market_snapshot import get_market_snapshot
 
+    snapshot = get_market_snapshot(date, krx)
     capital_per_trade = capital_per_run / max(len(candidates), 1)
-    trades = []
 
+    picked = []  # (code, name, selection, 스냅샷 위치)
     for cand in candidates:
         code = cand.code if hasattr(cand, "code") else cand["code"]
         name = cand.name if hasattr(cand, "name") else cand["name"]
-        row = market_data.get(code)
-
+        pos = snapshot.position(code)
+        if pos is None:
+            # 선정됐지만 시장 데이터 없음 — 집계 제외 (기존 동작 유지)
+            continue
         # 선정 정보 (백테스트 후에도 보존)
         selection = {
             "rank": int(cand.rank if hasattr(cand, "rank") else 0),
             "score": float(cand.score if hasattr(cand, "score") else 0),
             "score_detail": dict(cand.score_detail) if hasattr(cand, "score_detail") and cand.score_detail else {},
         }
+        picked.append((code, name, selection, pos))
 
-        if row is None:
-            # 선정됐지만 시장 데이터 없음 — 집계 제외 (기존 동작 유지)
-            continue
-        try:
-            open_p = int(row.get("시가", 0) or 0)
-            high_p = int(row.get("고가", 0) or 0)
-            low_p = int(row.get("저가", 0) or 0)
-            close_p = int(row.get("종가", 0) or 0)
-            if open_p == 0:
-                continue
-
-            profit_px = open_p * (1 + _profit / 100)
-            loss_px = open_p * (1 + _loss / 100)
-
-            # 손절 우선 (보수적)
-            if low_p <= loss_px:
-                exit_px = int(loss_px)
-                exit_type = "loss"
-            elif high_p >= profit_px:
-                exit_px = int(profit_px)
-                exit_type = "profit"
-            else:
-                exit_px = close_p
-                exit_type = "close"
-
-            return_pct = (exit_px - open_p) / open_p * 100
-            qty = int(capital_per_trade / open_p)
-            return_amt = (exit_px - open_p) * qty
-
-            trades.append({
-                "code": code,
-                "name": name,
-                "entry_price": open_p,
-                "exit_price": exit_px,
-                "exit_type": exit_type,
-                "return_pct": round(return_pct, 2),
-                "return_amount": return_amt,
-                "qty": qty,
-                # 일봉 레퍼런스 (검증용)
-                "high": high_p,
-                "low": low_p,
-                "close": close_p,
-                # 선정 단계 정보
-                "selection": selection,
-            })
-        except Exception as e:
-            logger.debug(f"{code} 시뮬 실패: {e}")
+    idx = [pos for *_, pos in picked]
+    opens, highs, lows, closes = (snapshot.column(f)[idx] for f in ("open", "high", "low", "close"))
+    # 손절 우선 (보수적) → 익절 → 종가 청산
+    exits = daily_exits(opens, highs, lows, closes, _profit, _loss)
+
+    trades = []
+    for k, (code, name, selection, _) in enumerate(picked):
+        if not exits.valid[k]:
             continue
+        open_p = int(opens[k])
+        exit_px = int(exits.exit_price[k])
+        qty = int(capital_per_trade / open_p)
+        trades.append({
+            "code": code,
+            "name": name,
+            "entry_price": open_p,
+            "exit_price": exit_px,
+            "exit_type": exits.exit_type(k),
+            "return_pct": round(float(exits.return_pct[k]), 2),
+            "return_amount": (exit_px - open_p) * qty,
+            "qty": qty,
+            # 일봉 레퍼런스 (검증용)
+            "high": int(highs[k]),
+            "low": int(lows[k]),
+            "close": int(closes[k]),
+            # 선정 단계 정보
+            "selection": selection,
+        })
 
     if not trades:
         return {
@@ -251,24 +244,139 @@ def simulate_day(
 # ============================================================
 
 def get_trading_days(start: str, end: str) -> List[str]:
-    """KRX 지수 데이터로 실제 거래일 추출."""
+    """거래일 캘린더 인덱스로 실제 거래일 추출.
+
+    KRX 개장 확정 날짜는 조회 없이 사용, 미확정 평일만 KRX 지수 데이터로 확인 (결과는 캘린더에 기록).
+    """
+    cal = get_calendar()
+    if not cal:
+        return []
+    krx = get_krx()
+    return cal.settled_trading_days(start, end, probe=krx.has_trading_data if krx else None)
+
+
+# ============================================================
+# 전략 출력 캡처 (스레드별)
+# ============================================================
+
+class _ThreadStdout(io.TextIOBase):
+    """sys.stdout 대리 — 캡처 중인 스레드의 출력만 그 스레드 버퍼로, 나머지는 원래 stdout.
+
+    contextlib.redirect_stdout 은 전역 sys.stdout 을 교체하므로 스레드 풀에서
+    서로의 출력을 삼키거나, 종료 순서가 꼬이면 남의 버퍼를 sys.stdout 으로 복원한다.
+    """
+
+    def __init__(self, target):
+        self.target = target
+        self.local = threading.local()
+
+    def _out(self):
+        return getattr(self.local, "buf", None) or self.target
+
+    def write(self, s):
+        return self._out().write(s)
+
+    def flush(self):
+        self._out().flush()
+
+    @property
+    def encoding(self):
+        return getattr(self.target, "encoding", "utf-8")
+
+
+_capture_lock = threading.Lock()
+_capture_router: Optional[_ThreadStdout] = None
+_capture_depth = 0
+
+
+@contextlib.contextmanager
+def capture_stdout():
+    """현재 스레드의 print() 출력만 StringIO 로 캡처 (다른 스레드는 그대로 출력)."""
+    global _capture_router, _capture_depth
+    with _capture_lock:
+        if _capture_depth == 0 or sys.stdout is not _capture_router:
+            _capture_router = _ThreadStdout(sys.stdout)
+            sys.stdout = _capture_router
+        _capture_depth += 1
+        router = _capture_router
+    buf = io.StringIO()
+    prev = getattr(router.local, "buf", None)
+    router.local.buf = buf
+    try:
+        yield buf
+    finally:
+        router.local.buf = prev
+        with _capture_lock:
+            _capture_depth -= 1
+            if _capture_depth == 0 and sys.stdout is router:
+                sys.stdout = router.target
+
+
+# ============================================================
+# 프로세스 풀 워커
+# ============================================================
+
+_WORKER: Dict[str, object] = {}
+
+
+def warm_daily_cache() -> None:
+    """KRX 클라이언트 + 시장별 일별 패널을 미리 로드 (워커 프로세스당 1회)."""
     krx = get_krx()
     if not krx:
-        return []
-    days = []
-    cur = datetime.strptime(start, "%Y%m%d")
-    end_dt = datetime.strptime(end, "%Y%m%d")
-    while cur <= end_dt:
-        if cur.weekday() < 5:  # 월~금
-            d = cur.strftime("%Y%m%d")
+        return
+    try:
+        from paper_trading.utils.krx_panel import get_panel
+        for market in ("KOSPI", "KOSDAQ"):
+            get_panel(market)
+    except Exception as e:
+        logger.debug(f"패널 warm 실패: {e}")
+
+
+def _drop_inherited_connections() -> None:
+    """fork 로 상속된 requests 커넥션 풀 폐기 — 여러 워커가 같은 소켓을 쓰지 않도록."""
+    try:
+        import requests
+    except ImportError:
+        return
+    for obj in gc.get_objects():
+        if isinstance(obj, requests.Session):
             try:
-                idx = krx.get_index_ohlcv(d, "KOSPI")
-                if idx is not None and not idx.empty:
-                    days.append(d)
+                obj.close()
             except Exception:
                 pass
-        cur += timedelta(days=1)
-    return days
+
+
+def _init_worker(payload: Optional[bytes] = None) -> None:
+    """ProcessPoolExecutor initializer — 상속 커넥션 정리, 캐시 warm, 백테스트 복원."""
+    _drop_inherited_connections()
+    warm_daily_cache()
+    if payload is not None:
+        _WORKER["bt"] = pickle.loads(payload)
+
+
+def _process_day_in_worker(date: str) -> "DayResult":
+    return _WORKER["bt"]._process_one_day(date)
+
+
+def process_pool(max_workers: int, payload: Optional[bytes] = None) -> ProcessPoolExecutor:
+    """워커 초기화가 붙은 ProcessPoolExecutor (POSIX 는 fork — 부모의 패널/캐시 COW 공유)."""
+    methods = mp.get_all_start_methods()
+    ctx = mp.get_context("fork" if "fork" in methods else "spawn")
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(payload,),
+    )
+
+
+def resolve_workers(workers: Optional[int], executor: str) -> int:
+    """workers=None → process 는 CPU 코어 수, thread 는 DEFAULT_WORKERS. 0 이하는 기존대로 순차 (1)."""
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor={executor!r} (허용: {EXECUTORS})")
+    if workers is None:
+        return (os.cpu_count() or 1) if executor == "process" else DEFAULT_WORKERS
+    return max(workers, 1)
 
 
 # ============================================================
@@ -286,6 +394,7 @@ class SingleStrategyBacktest:
         suppress_strategy_print: bool = True,
         profit_target: Optional[float] = None,
         loss_target: Optional[float] = None,
+        selection_cache: Optional[SelectionCache] = None,
     ):
         assert_ntb_available()
         self.strategy = strategy
@@ -294,28 +403,32 @@ class SingleStrategyBacktest:
         self.suppress_strategy_print = suppress_strategy_print
         self.profit_target = profit_target
         self.loss_target = loss_target
+        self.selection_cache = selection_cache
 
-    def _select_quietly(self, date: str) -> List:
+    def _select(self, date: str) -> List:
         """전략의 print() 출력을 숨기고 종목 선정."""
         if not self.suppress_strategy_print:
             return self.strategy.select_stocks(date=date, top_n=self.top_n)
 
-        # stdout 임시 캡처
-        import io
-        import contextlib
-        buf = io.StringIO()
-        with contextlib.redirect_stdout(buf):
-            try:
-                cands = self.strategy.select_stocks(date=date, top_n=self.top_n)
-            except Exception as e:
-                raise
-        return cands
+        # 현재 스레드 출력만 캡처 (스레드 풀 안전, 프로세스 워커는 자체 stdout)
+        with capture_stdout():
+            return self.strategy.select_stocks(date=date, top_n=self.top_n)
+
+    def _select_quietly(self, date: str) -> List:
+        """종목 선정 (selection_cache 가 있으면 메모 재사용). 반환: 후보 리스트."""
+        return self._select_memoized(date)[0]
+
+    def _select_memoized(self, date: str):
+        if self.selection_cache is None:
+            return self._select(date), False
+        return self.selection_cache.get_or_compute(
+            self.strategy, date, self.top_n, lambda: self._select(date))
 
     def _process_one_day(self, date: str) -> DayResult:
         """단일 일자 처리 (병렬 실행 단위)."""
         krx = get_krx()
         try:
-            cands = self._select_quietly(date)
+            cands, cached = self._select_memoized(date)
         except Exception as e:
             return DayResult(
                 date=date,
@@ -342,6 +455,7 @@ class SingleStrategyBacktest:
         return DayResult(
             date=date,
             candidates=len(cands),
+            selection_cached=cached,
             trades=sim["total_trades"],
             wins=sim["wins"],
             losses=sim["total_trades"] - sim["wins"],
@@ -354,8 +468,9 @@ class SingleStrategyBacktest:
         self,
         start_date: str,
         end_date: str,
-        parallel_workers: int = DEFAULT_WORKERS,
+        parallel_workers: Optional[int] = DEFAULT_WORKERS,
         progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        executor: str = "thread",
     ) -> BacktestResult:
         """
         백테스트 실행.
@@ -363,12 +478,14 @@ class SingleStrategyBacktest:
         Args:
             start_date: YYYYMMDD
             end_date: YYYYMMDD
-            parallel_workers: 일자별 병렬 워커 수 (1 = 순차, 4 = thread pool)
-            progress_callback: (current, total, date) 콜백
+            parallel_workers: 일자별 병렬 워커 수 (0/1 = 순차, 4 = pool, None = 자동)
+            progress_callback: (current, total, date) 콜백 — 일자 완료 순서대로 호출
+            executor: "thread" | "process" (전략을 pickle 할 수 없으면 thread 로 폴백)
 
         Returns:
             BacktestResult
         """
+        parallel_workers = resolve_workers(parallel_workers, executor)
         start_time = time.time()
         trading_days = get_trading_days(start_date, end_date)
         if not trading_days:
@@ -395,12 +512,33 @@ class SingleStrategyBacktest:
             parallel_workers=parallel_workers,
         )
 
+        # 기간 데이터 사전 동기화 (전략이 prepare_period 를 제공하면 — 예: DART 공시 저장소)
+        prepare = getattr(self.strategy, "prepare_period", None)
+        if callable(prepare):
+            try:
+                prepare(trading_days[0], trading_days[-1])
+            except Exception as e:
+                logger.warning(f"{self.strategy.STRATEGY_ID} 기간 준비 실패: {e}")
+
         day_results: Dict[str, DayResult] = {}
 
+        payload = None
+        if executor == "process" and parallel_workers > 1:
+            try:
+                payload = pickle.dumps(self)
+            except Exception as e:
+                logger.warning(f"{self.strategy.STRATEGY_ID} pickle 불가 — thread 모드로 실행: {e}")
+
         # 병렬 또는 순차
         if parallel_workers > 1:
-            with ThreadPoolExecutor(max_workers=parallel_workers) as ex:
-                futures = {ex.submit(self._process_one_day, d): d for d in trading_days}
+            if payload is not None:
+                pool = process_pool(min(parallel_workers, len(trading_days)), payload)
+                submit = lambda ex, d: ex.submit(_process_day_in_worker, d)  # noqa: E731
+            else:
+                pool = ThreadPoolExecutor(max_workers=parallel_workers)
+                submit = lambda ex, d: ex.submit(self._process_one_day, d)  # noqa: E731
+            with pool as ex:
+                futures = {submit(ex, d): d for d in trading_days}
                 completed = 0
                 for fut in as_completed(futures):
                     date = futures[fut]
@@ -491,6 +629,10 @@ __all__ = [
     "StandardPeriods",
     "simulate_day",
     "get_trading_days",
+    "capture_stdout",
+    "warm_daily_cache",
+    "process_pool",
+    "EXECUTORS",
     "INITIAL_CAPITAL",
     "PROFIT_TARGET",
     "LOSS_TARGET",
@@ -108,6 +108,41 @@ def make_real_runner(suppress_print: bool = True):
         metrics = calculate_metrics(result)
         return _metrics_to_dict(metrics)
 
+    runner.sim_model = "daily_bar"
+    return runner
+
+
+def make_intraday_runner(suppress_print: bool = True):
+    """분봉 (IntradayBacktest) 기반 runner_fn — ExitGridSweep 과 같은 모델로 채점.
+
+    선정·진입은 IntradayBacktest, 청산·집계는 그 거래의 1점 청산 그리드
+    → 그리드로 답한 exit variant 와 재백테스트한 variant 를 한 비교에서 나란히 볼 수 있다.
+    """
+    from runner.exit_grid import SIM_MODEL, ExitGridSweep
+    from runner.intraday_backtest import LOSS_TARGET, PROFIT_TARGET, IntradayBacktest
+
+    def runner(
+        strategy_id: str,
+        start_date: str,
+        end_date: str,
+        strategy_param_overrides: Optional[Dict[str, Any]] = None,
+        exit_rule_overrides: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        assert_ntb_available()
+        base_cls = _find_strategy_class(strategy_id)
+        instance = apply_strategy_overrides(base_cls, strategy_param_overrides or {})()
+
+        exit_rules = exit_rule_overrides or {}
+        profit = exit_rules.get("profit_target", PROFIT_TARGET)
+        loss = exit_rules.get("loss_target", LOSS_TARGET)
+        ladder = exit_rules.get("trailing_levels")
+        bt = IntradayBacktest(instance, profit_target_pct=profit, loss_target_pct=loss)
+        result = bt.run(start_date, end_date, verbose=not suppress_print)
+        sweep = ExitGridSweep.from_intraday(result, bt.minute_cache, profit_targets=[profit],
+                                            loss_targets=[loss], trailing_ladders=[ladder])
+        return sweep.metrics(profit, loss, ladder)
+
+    runner.sim_model = SIM_MODEL
     return runner
 
 
@@ -0,0 +1,330 @@
+"""
+Exit Grid Sweep
+================
+청산 룰 그리드 (익절 × 손절 × 트레일링 ladder) 를 거래별 분봉 경로 1회로 일괄 평가.
+
+배경:
+    ParameterTuner 가 만든 exit-rule variant 를 VariantComparator 로 비교하면
+    variant 마다 백테스트 전체(종목 선정 + 시뮬)를 다시 돌렸다. 종목 선정과 진입은
+    청산 룰과 무관하므로, 거래 목록(종목·날짜·진입가·분봉)을 한 번 모은 뒤
+    paper_trading.utils.minute_bars.exit_grid 로 그리드 전체를 평가한다.
+    20 × 20 그리드 × 한 달치 거래가 수 초 안에 끝난다.
+
+판정 (IntradayBacktest 와 동일):
+    - 같은 분봉 동시 도달: 손절 > 익절 > 트레일링 (보수적)
+    - VI 발동 근사 분봉은 판정에서 skip (lab.realistic_sim.vi_model)
+    - 미도달 시 마지막 분봉 종가 청산
+    - 순수익률: calculate_net_return 과 같은 식 (룰 청산 슬리피지 0.05%, 종가 청산 0%)
+    - 일별 수익률 = 그날 거래 순수익률 평균 (종목당 동일 금액)
+
+VariantComparator 한 번의 비교는 한 모델로 채점한다 — 그리드로 답할 수 없는 variant
+(전략 파라미터 변경, 그리드 밖 청산 룰) 를 넘길 fallback 도 같은 모델 (SIM_MODEL,
+compare_variants.make_intraday_runner) 이어야 한다. 일봉 runner (make_real_runner) 는 거부.
+
+사용:
+    sweep = ExitGridSweep(trades,
+                          profit_targets=np.arange(1.0, 11.0, 0.5),
+                          loss_targets=-np.arange(0.5, 10.5, 0.5),
+                          strategy_id="momentum")      # 거래를 낸 전략 (runner_fn 대조용)
+    sweep.table()[:5]                                  # 총수익률 상위 그리드 점
+    sweep.metrics(profit_target=5.0, loss_target=-3.0)
+
+    # VariantComparator — exit-rule 전용 variant 는 그리드에서 바로 응답, 나머지는 분봉 runner
+    comparator = VariantComparator(runner_fn=sweep.runner_fn(fallback=make_intraday_runner()))
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from lab.realistic_sim.vi_model import vi_flags
+from lab.realistic_sim.transaction_costs import (
+    COMMISSION_BUY_PCT,
+    COMMISSION_SELL_PCT,
+    SLIPPAGE_MARKET_CLOSE,
+    SLIPPAGE_MARKET_OPEN,
+    TRADE_TAX_KOSDAQ_PCT,
+    TRADE_TAX_KOSPI_PCT,
+)
+from lab.variant_runtime import HINT_FLAGS
+from runner.backtest_wrapper import INITIAL_CAPITAL, LOSS_TARGET, PROFIT_TARGET
+from runner.metrics import calculate_metrics
+
+
+# 룰 청산(익절/손절/트레일링) 슬리피지 — IntradayBacktest 와 동일
+RULE_EXIT_SLIPPAGE_PCT = 0.05
+
+# 채점 모델 이름 — runner_fn fallback 은 같은 값의 sim_model 속성이 있어야 함
+SIM_MODEL = "intraday_grid"
+
+Ladder = Optional[Sequence[Tuple[float, float]]]
+
+
+@dataclass
+class GridTrade:
+    """그리드 평가 대상 거래 (진입은 고정, 청산만 그리드로 변경)."""
+    code: str
+    date: str
+    entry_price: float
+    bars: Any                    # 분봉 dict 리스트 또는 MinuteBars
+    entry_time: str = "09:00"
+    market: str = "KOSPI"
+
+
+def _ladder_key(ladder: Ladder) -> Optional[Tuple[Tuple[float, float], ...]]:
+    if not ladder:
+        return None
+    return tuple((float(a), float(b)) for a, b in ladder)
+
+
+def _net_returns(entry: np.ndarray, exit_price: np.ndarray, is_close: np.ndarray,
+                 tax_pct: np.ndarray) -> np.ndarray:
+    """calculate_net_return 배열판 (반올림 없음)"""
+    adj_entry = entry * (1 + SLIPPAGE_MARKET_OPEN / 100)
+    exit_slip = np.where(is_close, SLIPPAGE_MARKET_CLOSE, RULE_EXIT_SLIPPAGE_PCT)
+    adj_exit = exit_price * (1 - exit_slip / 100)
+    gross = (exit_price - entry) / entry * 100
+    slippage_impact = ((adj_exit - adj_entry) / adj_entry - (exit_price - entry) / entry) * 100
+    total_cost = COMMISSION_BUY_PCT + COMMISSION_SELL_PCT + tax_pct - slippage_impact
+    return gross - total_cost
+
+
+class ExitGridSweep:
+    """거래 목록 × 청산 룰 그리드 → 그리드 점별 거래 수익률 / 메트릭."""
+
+    def __init__(
+        self,
+        trades: Sequence[GridTrade],
+        profit_targets: Sequence[float],
+        loss_targets: Sequence[float],
+        trailing_ladders: Optional[Sequence[Ladder]] = None,
+        initial_capital: int = INITIAL_CAPITAL,
+        strategy_id: Optional[str] = None,
+    ):
+        """strategy_id: 거래를 낸 전략 — runner_fn 은 이 전략 요청만 그리드에서 응답"""
+        from paper_trading.utils.exit_engine import EXIT_CLOSE, EXIT_INVALID
+        from paper_trading.utils.minute_bars import as_minute_bars, exit_grid, first_index
+
+        self.profit_targets = np.atleast_1d(np.asarray(profit_targets, dtype=float))
+        self.loss_targets = np.atleast_1d(np.asarray(loss_targets, dtype=float))
+        self.trailing_ladders = tuple(trailing_ladders) if trailing_ladders else (None,)
+        self.initial_capital = initial_capital
+        self.strategy_id = strategy_id
+
+        shape = (len(self.profit_targets), len(self.loss_targets), len(self.trailing_ladders))
+        kept: List[GridTrade] = []
+        codes, gross, prices = [], [], []
+        for trade in trades:
+            bars = as_minute_bars(trade.bars)
+            mask = bars.since(trade.entry_time)
+            _, skipped = vi_flags(bars.close, max(first_index(mask), 0))
+            grid = exit_grid(bars, trade.entry_price, self.profit_targets, self.loss_targets,
+                             self.trailing_ladders, mask=mask & ~skipped)
+            if (grid.exit_code == EXIT_INVALID).all():
+                continue
+            kept.append(trade)
+            codes.append(grid.exit_code)
+            gross.append(grid.return_pct)
+            prices.append(grid.exit_price)
+
+        self.trades = kept
+        self.dates = np.array([t.date for t in kept], dtype=object)
+        if kept:
+            self.exit_code = np.stack(codes)
+            self.gross_pct = np.stack(gross)
+            entry = np.array([t.entry_price for t in kept], dtype=float).reshape(-1, 1, 1, 1)
+            tax = np.array([TRADE_TAX_KOSPI_PCT if t.market.upper() == "KOSPI" else TRADE_TAX_KOSDAQ_PCT
+                            for t in kept]).reshape(-1, 1, 1, 1)
+            self.net_pct = _net_returns(entry, np.stack(prices), self.exit_code == EXIT_CLOSE, tax)
+        else:
+            self.exit_code = np.zeros((0,) + shape, dtype=np.int8)
+            self.gross_pct = np.zeros((0,) + shape)
+            self.net_pct = np.zeros((0,) + shape)
+
+    # --------------------------------------------------------
+    # 생성 보조
+    # --------------------------------------------------------
+
+    @classmethod
+    def from_intraday(cls, result, minute_cache: Dict[str, Dict[str, List[dict]]],
+                      **kwargs) -> "ExitGridSweep":
+        """IntradayBacktestResult + IntradayBacktest.minute_cache → 같은 진입의 그리드 평가."""
+        from lab.yahoo_minute import guess_market
+
+        trades = []
+        for day in result.daily_history:
+            for t in day.trades:
+                bars = minute_cache.get(t.code, {}).get(t.date or day.date)
+                if bars:
+                    trades.append(GridTrade(code=t.code, date=t.date or day.date,
+                                            entry_price=t.entry_price, bars=bars,
+                                            entry_time=t.entry_time, market=guess_market(t.code)))
+        kwargs.setdefault("strategy_id", result.strategy_id)
+        return cls(trades, **kwargs)
+
+    # --------------------------------------------------------
+    # 조회
+    # --------------------------------------------------------
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.gross_pct.shape[1:]
+
+    def index(self, profit_target: float, loss_target: float,
+              trailing_levels: Ladder = None) -> Tuple[int, int, int]:
+        """그리드 좌표 (없는 값이면 KeyError)"""
+        p = np.flatnonzero(np.isclose(self.profit_targets, profit_target))
+        l = np.flatnonzero(np.isclose(self.loss_targets, loss_target))
+        keys = [_ladder_key(x) for x in self.trailing_ladders]
+        key = _ladder_key(trailing_levels)
+        if not p.size or not l.size or key not in keys:
+            raise KeyError(f"그리드에 없는 청산 룰: {profit_target}/{loss_target}/{trailing_levels}")
+        return int(p[0]), int(l[0]), keys.index(key)
+
+    def backtest_result(self, p: int, l: int, t: int = 0,
+                        start_date: Optional[str] = None,
+                        end_date: Optional[str] = None) -> Dict[str, Any]:
+        """그리드 점 하나의 calculate_metrics 입력 dict (일별 동일 비중 평균, 복리)."""
+        sel = np.ones(len(self.trades), dtype=bool)
+        if start_date:
+            sel &= self.dates >= start_date
+        if end_date:
+            sel &= self.dates <= end_date
+        net = self.net_pct[sel, p, l, t]
+        dates = self.dates[sel]
+
+        capital = float(self.initial_capital)
+        history = []
+        wins = losses = 0
+        for date in sorted(set(dates)):
+            day = net[dates == date]
+            day_ret = float(day.mean())
+            capital *= 1 + day_ret / 100
+            day_wins = int((day > 0).sum())
+            wins += day_wins
+            losses += len(day) - day_wins
+            history.append({
+                "date": date,
+                "daily_return_pct": day_ret,
+                "capital_after": capital,
+                "trades": len(day),
+                "wins": day_wins,
+                "trade_details": [{"return_pct": float(r)} for r in day],
+            })
+        return {
+            "daily_history": history,
+            "initial_capital": self.initial_capital,
+            "final_capital": capital,
+            "total_trades": int(len(net)),
+            "total_wins": wins,
+            "total_losses": losses,
+            "trading_days": len(history),
+        }
+
+    def metrics(self, profit_target: float, loss_target: float,
+                trailing_levels: Ladder = None,
+                start_date: Optional[str] = None,
+                end_date: Optional[str] = None) -> Dict[str, Any]:
+        """VariantComparator 가 기대하는 메트릭 dict."""
+        p, l, t = self.index(profit_target, loss_target, trailing_levels)
+        return self._metrics_at(p, l, t, start_date, end_date)
+
+    def _metrics_at(self, p, l, t, start_date=None, end_date=None) -> Dict[str, Any]:
+        m = calculate_metrics(self.backtest_result(p, l, t, start_date, end_date))
+        return {
+            "total_return_pct": m.total_return_pct,
+            "sharpe_ratio": m.sharpe_ratio,
+            "max_drawdown_pct": m.max_drawdown_pct,
+            "win_rate": m.win_rate,
+            "num_trades": m.num_trades,
+            "profit_factor": m.profit_factor,
+        }
+
+    def exit_mix(self, p: int, l: int, t: int = 0) -> Dict[str, int]:
+        """그리드 점의 청산 유형 분포"""
+        from paper_trading.utils.exit_engine import EXIT_TYPES
+
+        codes, counts = np.unique(self.exit_code[:, p, l, t], return_counts=True)
+        return {EXIT_TYPES[int(c)]: int(n) for c, n in zip(codes, counts)}
+
+    def table(self, sort_by: str = "total_return_pct") -> List[Dict[str, Any]]:
+        """그리드 전체 메트릭 (sort_by 내림차순)."""
+        rows = []
+        for p, pt in enumerate(self.profit_targets):
+            for l, lt in enumerate(self.loss_targets):
+                for t, ladder in enumerate(self.trailing_ladders):
+                    rows.append({
+                        "profit_target": float(pt),
+                        "loss_target": float(lt),
+                        "trailing_levels": _ladder_key(ladder),
+                        **self._metrics_at(p, l, t),
+                        "exit_mix": self.exit_mix(p, l, t),
+                    })
+        rows.sort(key=lambda r: r.get(sort_by, 0), reverse=True)
+        return rows
+
+    # --------------------------------------------------------
+    # VariantComparator 연동
+    # --------------------------------------------------------
+
+    def runner_fn(self, fallback: Optional[Callable[..., Dict[str, Any]]] = None
+                  ) -> Callable[..., Dict[str, Any]]:
+        """VariantComparator runner_fn — exit-rule 전용 변경은 그리드에서 응답.
+
+        다른 전략 (sweep.strategy_id 와 다르거나 sweep 전략 미지정), 전략 파라미터 변경
+        (힌트 플래그 제외), 그리드에 없는 청산 룰은 fallback
+        (compare_variants.make_intraday_runner()) 으로 넘긴다. fallback 이 없으면 ValueError.
+        baseline (exit_rule_overrides 없음) 은 PROFIT_TARGET / LOSS_TARGET.
+
+        Raises:
+            ValueError: fallback 의 sim_model 이 SIM_MODEL 이 아님 (한 비교에 두 모델 혼용)
+        """
+        model = getattr(fallback, "sim_model", None)
+        if fallback is not None and model != SIM_MODEL:
+            raise ValueError(f"fallback 채점 모델 ({model}) 이 청산 그리드 ({SIM_MODEL}) 와 다름 — "
+                             f"compare_variants.make_intraday_runner() 사용")
+
+        def runner(
+            strategy_id: str,
+            start_date: str,
+            end_date: str,
+            strategy_param_overrides: Optional[Dict[str, Any]] = None,
+            exit_rule_overrides: Optional[Dict[str, float]] = None,
+        ) -> Dict[str, Any]:
+            real = {k: v for k, v in (strategy_param_overrides or {}).items() if k not in HINT_FLAGS}
+            rules = exit_rule_overrides or {}
+            try:
+                if strategy_id != self.strategy_id:
+                    raise KeyError(f"그리드 거래의 전략 ({self.strategy_id}) 과 다른 전략: {strategy_id}")
+                if real:
+                    raise KeyError("전략 파라미터 변경은 재선정 필요")
+                p, l, t = self.index(
+                    rules.get("profit_target", PROFIT_TARGET),
+                    rules.get("loss_target", LOSS_TARGET),
+                    rules.get("trailing_levels"),
+                )
+            except KeyError as e:
+                if fallback is None:
+                    raise ValueError(f"그리드로 평가 불가: {e}") from e
+                return fallback(
+                    strategy_id=strategy_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    strategy_param_overrides=strategy_param_overrides,
+                    exit_rule_overrides=exit_rule_overrides,
+                )
+            return self._metrics_at(p, l, t, start_date, end_date)
+
+        runner.sim_model = SIM_MODEL
+        return runner
+
+
+__all__ = [
+    "ExitGridSweep",
+    "GridTrade",
+    "RULE_EXIT_SLIPPAGE_PCT",
+    "SIM_MODEL",
+]
@@ -29,6 +29,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
 
+import numpy as np
+
 from lab import BaseStrategy, assert_ntb_available
 from lab.common import get_krx
 from lab.yahoo_minute import YahooMinuteClient, guess_market
@@ -37,6 +39,7 @@ from lab.realistic_sim.transaction_costs import (
     SLIPPAGE_MARKET_OPEN,
     SLIPPAGE_MARKET_CLOSE,
 )
+from lab.realistic_sim.vi_model import vi_flags
 
 logger = logging.getLogger(__name__)
 
@@ -47,11 +50,6 @@ PROFIT_TARGET = 5.0    # +5%
 LOSS_TARGET = -3.0     # -3%
 DEFAULT_TOP_N = 5
 
-# VI 발동 감지 임계값 (2분간 ±10% 급변)
-VI_THRESHOLD_PCT = 10.0
-VI_WINDOW_MINUTES = 2
-
-
 # ============================================================
 # Data classes
 # ============================================================
@@ -173,6 +171,7 @@ class IntradayBacktest:
         self.profit_target = profit_target_pct
         self.loss_target = loss_target_pct
         self.yahoo_client = yahoo_client or YahooMinuteClient()
+        self.minute_cache: Dict[str, Dict[str, List[dict]]] = {}
 
     # --------------------------------------------------------
     # Bar-level simulation
@@ -189,7 +188,7 @@ class IntradayBacktest:
 
         규칙:
         - 09:00 분봉 open = 시초가 (예약 매수 가정, 슬리피지 0)
-        - 순차 진행하면서 익절/손절 체크
+        - 익절/손절 최초 도달 분봉에서 청산 (분봉 배열 일괄 계산, 같은 봉이면 손절 우선)
         - 둘 다 미도달 시 마지막 분봉 close = 종가 청산
         - VI 발동 (2분간 ±10% 급변) 감지 시 해당 구간 skip (실제론 거래 정지)
         """
@@ -200,15 +199,13 @@ class IntradayBacktest:
         name = cand_info.get("name", "")
         date = bars[0].get("date") or cand_info.get("date", "")
 
-        # 09:00 분봉 찾기 (진입)
-        entry_bar = None
-        for b in bars:
-            if b["time"] == "09:00":
-                entry_bar = b
-                break
-        if entry_bar is None:
-            # 09:00 분봉 없음 → 첫 번째 bar 사용
-            entry_bar = bars[0]
+        from paper_trading.utils.minute_bars import MinuteBars, first_index
+
+        arr = MinuteBars.from_dicts(bars)
+
+        # 09:00 분봉 찾기 (진입) — 없으면 첫 번째 bar 사용
+        entry_idx = max(arr.index_of("09:00"), 0)
+        entry_bar = bars[entry_idx]
 
         entry_price = entry_bar["open"]
         if entry_price <= 0:
@@ -217,47 +214,37 @@ class IntradayBacktest:
         profit_px = entry_price * (1 + self.profit_target / 100)
         loss_px = entry_price * (1 + self.loss_target / 100)
 
-        # 순차 진행 (진입 분봉 포함)
-        entry_idx = bars.index(entry_bar)
-
-        exit_price = None
-        exit_type = None
-        exit_time = None
-        bars_traversed = 0
-        vi_detected = False
-
-        for i in range(entry_idx, len(bars)):
-            bar = bars[i]
-            bars_traversed += 1
-
-            # VI 발동 체크 (간단 근사: 직전 2분 대비 ±10% 급변)
-            if i >= entry_idx + VI_WINDOW_MINUTES:
-                ref_bar = bars[i - VI_WINDOW_MINUTES]
-                ref_price = ref_bar["close"] or 1
-                change_pct = abs(bar["close"] - ref_price) / ref_price * 100
-                if change_pct >= VI_THRESHOLD_PCT:
-                    vi_detected = True
-                    # 2분 점프 (실제론 거래 정지 2분)
-                    if i + 2 < len(bars):
-                        continue
-
-            # 손절/익절 체크 (분봉 내 high/low 기반)
-            if bar["low"] <= loss_px:
+        # 순차 진행 (진입 분봉 포함) — 분봉 배열로 최초 도달 인덱스 계산
+        n = len(bars)
+        idx = np.arange(n)
+        close = arr.close
+
+        # VI 발동 체크 (간단 근사: 직전 2분 대비 ±10% 급변) — 마지막 2봉 이전이면 그 봉은 skip
+        vi, skipped = vi_flags(close, entry_idx)
+
+        # 손절/익절 체크 (분봉 내 high/low 기반, 같은 봉이면 손절 우선)
+        hit_loss = arr.low <= loss_px
+        hit = (idx >= entry_idx) & ~skipped & (hit_loss | (arr.high >= profit_px))
+        exit_idx = first_index(hit)
+
+        if exit_idx >= 0:
+            if hit_loss[exit_idx]:
                 exit_price = int(loss_px)
                 exit_type = "loss"
-                exit_time = bar["time"]
-                break
-            if bar["high"] >= profit_px:
+            else:
                 exit_price = int(profit_px)
                 exit_type = "profit"
-                exit_time = bar["time"]
-                break
+            exit_time = bars[exit_idx]["time"]
+            last_idx = exit_idx
         else:
-            # 루프 완주 = 익절/손절 미도달
+            # 익절/손절 미도달 → 마지막 분봉 close = 종가 청산
             last_bar = bars[-1]
             exit_price = last_bar["close"]
             exit_type = "close"
             exit_time = last_bar["time"]
+            last_idx = n - 1
+        bars_traversed = last_idx - entry_idx + 1
+        vi_detected = bool(vi[entry_idx:last_idx + 1].any())
 
         # 거래비용 반영
         cost_result = calculate_net_return(
@@ -432,6 +419,8 @@ class IntradayBacktest:
             print(f"기간: {start_date} ~ {end_date} ({len(trading_days)}일)")
 
         minute_cache: Dict[str, Dict[str, List[dict]]] = {}
+        # 실행 후에도 보관 — 같은 거래로 청산 룰 그리드를 재평가할 때 재사용 (runner.exit_grid)
+        self.minute_cache = minute_cache
         current_capital = self.initial_capital
         total_gross = 0.0
         total_net = 0.0
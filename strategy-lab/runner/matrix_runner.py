@@ -5,6 +5,8 @@ N개 전략 × M개 기간 매트릭스를 일괄 실행하고 결과를 누적
 
 특징:
 - 전략 단위 ThreadPoolExecutor 병렬 (KRX 캐시 활용)
+- executor="process" — cell 단위 ProcessPoolExecutor (전 코어 활용, 워커별 캐시 warm)
+- 선정 메모 (lab.selection_cache, 선택: use_selection_cache=True / --selection-cache) — 겹치는 기간/재실행은 저장된 select_stocks 결과 재사용
 - 진행률 실시간 표시
 - 결과를 ExperimentLogger에 자동 저장
 - 리더보드 JSON 출력 (성과 순)
@@ -19,6 +21,7 @@ N개 전략 × M개 기간 매트릭스를 일괄 실행하고 결과를 누적
     runner.add_all_strategies()
     runner.add_periods({"1w": StandardPeriods.one_week()})
     runner.run(parallel_strategies=4)
+    # runner.run(parallel_strategies=None, executor="process")  # 코어 수만큼 프로세스
 
     print(runner.leaderboard())
 """
@@ -28,6 +31,7 @@ from __future__ import annotations
 import importlib
 import json
 import logging
+import pickle
 import sys
 import time
 import traceback
@@ -39,12 +43,15 @@ from typing import Dict, List, Optional, Tuple
 
 from lab import BaseStrategy, NTB_AVAILABLE, assert_ntb_available
 from lab.experiments import ExperimentLogger, ExperimentResult
+from lab.selection_cache import SelectionCache
 from runner.backtest_wrapper import (
     SingleStrategyBacktest,
     StandardPeriods,
     BacktestResult,
     INITIAL_CAPITAL,
     DEFAULT_WORKERS,
+    process_pool,
+    resolve_workers,
 )
 from runner.metrics import calculate_metrics, MetricsResult
 
@@ -95,6 +102,16 @@ class MatrixCell:
         return self.status in ("completed", "failed")
 
 
+def _backtest_cell(strategy: BaseStrategy, start_date: str, end_date: str,
+                   selection_cache: Optional[SelectionCache] = None):
+    """cell 1개 백테스트 + 지표 (프로세스 워커에서도 실행되는 순수 계산 단위)."""
+    bt = SingleStrategyBacktest(strategy, suppress_strategy_print=True,
+                                selection_cache=selection_cache)
+    # 일자 단위는 순차로 (전략 단위 병렬과 충돌 방지)
+    result = bt.run(start_date, end_date, parallel_workers=1)
+    return result, calculate_metrics(result)
+
+
 # ============================================================
 # Matrix Runner
 # ============================================================
@@ -106,6 +123,8 @@ class MatrixRunner:
         self,
         results_dir: Path = RESULTS_DIR,
         log_to_experiments: bool = True,
+        selection_cache: Optional[SelectionCache] = None,
+        use_selection_cache: bool = False,
     ):
         assert_ntb_available()
         self.results_dir = Path(results_dir)
@@ -117,6 +136,9 @@ class MatrixRunner:
 
         self.log_to_experiments = log_to_experiments
         self._exp_logger = ExperimentLogger() if log_to_experiments else None
+        if selection_cache is None and use_selection_cache:
+            selection_cache = SelectionCache()
+        self.selection_cache = selection_cache
 
     # --------------------------------------------------------
     # Setup
@@ -181,76 +203,108 @@ class MatrixRunner:
         strat = self.strategies[cell.strategy_id]
 
         try:
-            bt = SingleStrategyBacktest(strat, suppress_strategy_print=True)
-            # 일자 단위는 순차로 (전략 단위 병렬과 충돌 방지)
-            result = bt.run(
-                cell.start_date,
-                cell.end_date,
-                parallel_workers=1,
-            )
-            cell.backtest_result = result.to_dict()
-            metrics = calculate_metrics(result)
-            cell.metrics = metrics.to_dict()
-            cell.status = "completed"
-
-            # ExperimentLogger 저장
-            if self._exp_logger:
-                exp = ExperimentResult(
-                    strategy_id=cell.strategy_id,
-                    strategy_name=cell.strategy_name,
-                    start_date=cell.start_date,
-                    end_date=cell.end_date,
-                    trading_days=result.trading_days,
-                    initial_capital=result.initial_capital,
-                    final_balance=result.final_capital,
-                    total_return_pct=metrics.total_return_pct,
-                    max_drawdown_pct=metrics.max_drawdown_pct,
-                    sharpe_ratio=metrics.sharpe_ratio,
-                    win_rate=metrics.win_rate,
-                    profit_factor=metrics.profit_factor if metrics.profit_factor != float("inf") else 999.0,
-                    total_trades=result.total_trades,
-                    winning_trades=result.total_wins,
-                    losing_trades=result.total_losses,
-                    avg_holding_days=1.0,
-                    avg_win_pct=metrics.avg_win_pct,
-                    avg_loss_pct=metrics.avg_loss_pct,
-                    max_consecutive_losses=metrics.max_consecutive_losses,
-                    max_consecutive_wins=metrics.max_consecutive_wins,
-                    volatility_pct=metrics.volatility_pct,
-                    duration_seconds=time.time() - t0,
-                    notes=f"period={cell.period_label}",
-                )
-                self._exp_logger.save(exp)
-
+            result, metrics = _backtest_cell(strat, cell.start_date, cell.end_date,
+                                             self.selection_cache)
+            self._record_cell(cell, result, metrics, time.time() - t0)
         except Exception as e:
-            cell.error = f"{e}\n{traceback.format_exc()}"
-            cell.status = "failed"
-            logger.error(f"cell 실패: {cell.strategy_id}/{cell.period_label}: {e}")
+            self._fail_cell(cell, e)
 
         cell.duration_seconds = round(time.time() - t0, 2)
         return cell
 
+    def _record_cell(self, cell: MatrixCell, result: BacktestResult,
+                     metrics: MetricsResult, duration: float) -> None:
+        """cell 결과 반영 + ExperimentLogger 저장 (항상 부모 프로세스에서)."""
+        cell.backtest_result = result.to_dict()
+        cell.metrics = metrics.to_dict()
+        cell.status = "completed"
+
+        # ExperimentLogger 저장
+        if self._exp_logger:
+            exp = ExperimentResult(
+                strategy_id=cell.strategy_id,
+                strategy_name=cell.strategy_name,
+                start_date=cell.start_date,
+                end_date=cell.end_date,
+                trading_days=result.trading_days,
+                initial_capital=result.initial_capital,
+                final_balance=result.final_capital,
+                total_return_pct=metrics.total_return_pct,
+                max_drawdown_pct=metrics.max_drawdown_pct,
+                sharpe_ratio=metrics.sharpe_ratio,
+                win_rate=metrics.win_rate,
+                profit_factor=metrics.profit_factor if metrics.profit_factor != float("inf") else 999.0,
+                total_trades=result.total_trades,
+                winning_trades=result.total_wins,
+                losing_trades=result.total_losses,
+                avg_holding_days=1.0,
+                avg_win_pct=metrics.avg_win_pct,
+                avg_loss_pct=metrics.avg_loss_pct,
+                max_consecutive_losses=metrics.max_consecutive_losses,
+                max_consecutive_wins=metrics.max_consecutive_wins,
+                volatility_pct=metrics.volatility_pct,
+                duration_seconds=duration,
+                notes=f"period={cell.period_label}",
+            )
+            self._exp_logger.save(exp)
+
+    def _fail_cell(self, cell: MatrixCell, e: BaseException) -> None:
+        # 프로세스 워커 예외는 원격 traceback 을 __cause__ 로 가져옴
+        tb = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+        cell.error = f"{e}\n{tb}"
+        cell.status = "failed"
+        logger.error(f"cell 실패: {cell.strategy_id}/{cell.period_label}: {e}")
+
     def run(
         self,
-        parallel_strategies: int = DEFAULT_WORKERS,
+        parallel_strategies: Optional[int] = DEFAULT_WORKERS,
         verbose: bool = True,
+        executor: str = "thread",
     ) -> List[MatrixCell]:
-        """매트릭스 전체 실행."""
+        """매트릭스 전체 실행.
+
+        Args:
+            parallel_strategies: 동시 실행 cell 수 (0/1 = 순차, None = 자동 — process 는 CPU 코어 수)
+            executor: "thread" | "process" (전략 pickle 불가 시 thread 로 폴백)
+        """
         if not self.strategies or not self.periods:
             raise ValueError("전략 또는 기간이 비어있습니다. add_* 호출 필요.")
 
+        parallel_strategies = resolve_workers(parallel_strategies, executor)
+        if executor == "process" and not self._strategies_picklable():
+            executor = "thread"
+
         self._build_cells()
         total = len(self.cells)
         if verbose:
             print(f"\n{'=' * 60}")
             print(f"Matrix Runner: {len(self.strategies)}개 전략 × {len(self.periods)}개 기간 = {total} cells")
-            print(f"병렬 워커: {parallel_strategies}")
+            print(f"병렬 워커: {parallel_strategies} ({executor})")
             print(f"{'=' * 60}\n")
 
         t0 = time.time()
         completed = 0
 
-        if parallel_strategies > 1:
+        if executor == "process" and parallel_strategies > 1:
+            with process_pool(min(parallel_strategies, total)) as ex:
+                futures = {}
+                for c in self.cells:
+                    c.status = "running"
+                    fut = ex.submit(_backtest_cell, self.strategies[c.strategy_id],
+                                    c.start_date, c.end_date, self.selection_cache)
+                    futures[fut] = c
+                for fut in as_completed(futures):
+                    cell = futures[fut]
+                    try:
+                        result, metrics = fut.result()
+                        self._record_cell(cell, result, metrics, result.duration_seconds)
+                        cell.duration_seconds = result.duration_seconds
+                    except Exception as e:
+                        self._fail_cell(cell, e)
+                    completed += 1
+                    if verbose:
+                        self._print_cell_result(cell, completed, total)
+        elif parallel_strategies > 1:
             with ThreadPoolExecutor(max_workers=parallel_strategies) as ex:
                 futures = {ex.submit(self._run_one_cell, c): c for c in self.cells}
                 for fut in as_completed(futures):
@@ -272,10 +326,31 @@ class MatrixRunner:
             print(f"\n{'=' * 60}")
             print(f"완료: {done}/{total} (실패 {failed})")
             print(f"소요: {elapsed:.1f}s ({elapsed / max(total, 1):.2f}s/cell 평균)")
+            if self.selection_cache is not None:
+                days, cached = self._selection_cache_counts()
+                print(f"선정 캐시: {cached}/{days}일 재사용")
             print(f"{'=' * 60}\n")
 
         return self.cells
 
+    def _selection_cache_counts(self) -> Tuple[int, int]:
+        """(전체 일자 수, 메모 재사용 일자 수) — 프로세스 워커 결과 포함."""
+        days = cached = 0
+        for c in self.cells:
+            for dr in (c.backtest_result or {}).get("daily_history") or []:
+                days += 1
+                cached += bool(dr.get("selection_cached"))
+        return days, cached
+
+    def _strategies_picklable(self) -> bool:
+        for sid, strat in self.strategies.items():
+            try:
+                pickle.dumps(strat)
+            except Exception as e:
+                logger.warning(f"{sid} pickle 불가 — thread 모드로 실행: {e}")
+                return False
+        return True
+
     def _print_cell_result(self, cell: MatrixCell, current: int, total: int) -> None:
         if cell.status == "completed":
             m = cell.metrics or {}
@@ -440,8 +515,16 @@ def _cli() -> int:
         help="기준 종료일 YYYYMMDD (default: 오늘)",
     )
     parser.add_argument(
-        "--workers", type=int, default=4,
-        help="병렬 워커 수 (default: 4)",
+        "--workers", type=lambda v: None if v == "auto" else int(v), default=4,
+        help="병렬 워커 수 (default: 4, 0/1 = 순차, auto = 자동)",
+    )
+    parser.add_argument(
+        "--executor", choices=["thread", "process"], default="thread",
+        help="병렬 방식 (process = 전 코어 활용, default: thread)",
+    )
+    parser.add_argument(
+        "--selection-cache", action="store_true",
+        help="선정 메모(data/selection_cache) 사용 — 겹치는 기간/재실행의 select_stocks 재사용",
     )
     parser.add_argument(
         "--save", action="store_true",
@@ -453,7 +536,7 @@ def _cli() -> int:
     )
     args = parser.parse_args()
 
-    runner = MatrixRunner()
+    runner = MatrixRunner(use_selection_cache=args.selection_cache)
 
     # 전략 추가
     if args.strategies == "all":
@@ -482,7 +565,7 @@ def _cli() -> int:
         else:
             print(f"알 수 없는 기간: {label}")
 
-    runner.run(parallel_strategies=args.workers)
+    runner.run(parallel_strategies=args.workers, executor=args.executor)
     runner.print_leaderboard(top_n=args.top)
 
     if args.save:
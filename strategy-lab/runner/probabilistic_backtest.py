@@ -35,7 +35,7 @@ from typing import Dict, List, Optional
 
 from lab import BaseStrategy, assert_ntb_available
 from lab.common import get_krx
-from lab.realistic_sim.probability_model import probabilistic_exit
+from lab.realistic_sim.probability_model import probabilistic_exits
 from lab.realistic_sim.transaction_costs import (
     calculate_net_return,
     SLIPPAGE_MARKET_OPEN,
@@ -171,19 +171,25 @@ class ProbabilisticBacktest:
         if not krx:
             return result
 
-        # 당일 OHLCV fetch
-        market_data = {}
-        for market in ("KOSPI", "KOSDAQ"):
-            try:
-                df = krx.get_stock_ohlcv(date, market=market)
-                if df is not None and not df.empty:
-                    for code in df.index:
-                        market_data[code] = {
-                            "row": df.loc[code],
-                            "market": market,
-                        }
-            except Exception:
-                continue
+        # 당일 OHLCV — 날짜별 공용 스냅샷 컬럼에서 후보 행만 추출
+        from paper_trading.utils.market_snapshot import get_market_snapshot
+
+        snapshot = get_market_snapshot(date, krx)
+        picked = []  # (cand, 스냅샷 위치)
+        for cand in candidates:
+            code = cand.code if hasattr(cand, "code") else cand["code"]
+            pos = snapshot.position(code)
+            if pos is not None and snapshot.column("open")[pos] != 0:
+                picked.append((cand, pos))
+
+        # 확률적 exit 일괄 계산 (공용 일봉 청산 엔진)
+        idx = [pos for _, pos in picked]
+        exits = probabilistic_exits(
+            *(snapshot.column(f)[idx] for f in ("open", "high", "low", "close")),
+            profit_pct=self.profit_pct,
+            loss_pct=self.loss_pct,
+            k_trend=self.k_trend,
+        )
 
         capital_per_trade = current_capital / max(len(candidates), 1)
         total_gross = 0.0
@@ -191,37 +197,16 @@ class ProbabilisticBacktest:
         total_confidence = 0.0
         total_amount = 0
 
-        for cand in candidates:
+        for (cand, pos), exit_result in zip(picked, exits):
             code = cand.code if hasattr(cand, "code") else cand["code"]
             name = cand.name if hasattr(cand, "name") else cand.get("name", "")
             rank = cand.rank if hasattr(cand, "rank") else 0
             score = cand.score if hasattr(cand, "score") else 0
-
-            info = market_data.get(code)
-            if info is None:
-                continue
-
-            row = info["row"]
-            market = info["market"]
+            market = snapshot.markets[pos]
 
             try:
-                open_p = int(row.get("시가", 0) or 0)
-                high_p = int(row.get("고가", 0) or 0)
-                low_p = int(row.get("저가", 0) or 0)
-                close_p = int(row.get("종가", 0) or 0)
-                if open_p == 0:
-                    continue
-
-                # 확률적 exit 계산
-                exit_result = probabilistic_exit(
-                    open_p=open_p,
-                    high_p=high_p,
-                    low_p=low_p,
-                    close_p=close_p,
-                    profit_pct=self.profit_pct,
-                    loss_pct=self.loss_pct,
-                    k_trend=self.k_trend,
-                )
+                open_p = int(snapshot.column("open")[pos])
+                close_p = int(snapshot.column("close")[pos])
 
                 # 진입/청산 가격 결정
                 entry_price = open_p
@@ -182,11 +182,12 @@ class ForeignFlowMomentumStrategy(BaseStrategy):
             scored = self._fallback_score(pool)
         else:
             scored_stocks = []
-            for i, s in enumerate(pool, 1):
-                if i % 20 == 0:
-                    print(f"    수급 fetch 진행: {i}/{len(pool)}")
+            # 풀 전체 병렬 조회 (진행률은 클라이언트 로그)
+            flows = client.get_multi_investor_flow(
+                [s["code"] for s in pool], limit=self.LOOKBACK_DAYS + 2, progress_every=20)
+            for s in pool:
                 try:
-                    flow = client.get_investor_flow(s["code"], limit=self.LOOKBACK_DAYS + 2)
+                    flow = flows.get(s["code"])
                     if not flow:
                         continue
                     foreign_nets = [int(d.get("foreign_net", 0) or 0) for d in flow[:self.LOOKBACK_DAYS]]
@@ -31,7 +31,7 @@ Strategy: Multi-Signal Hybrid
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
 from lab import BaseStrategy, Candidate
@@ -134,6 +134,13 @@ class MultiSignalHybridStrategy(BaseStrategy):
                 self._investor_client = False
         return self._investor_client if self._investor_client else None
 
+    def prepare_period(self, start_date: str, end_date: str) -> None:
+        """백테스트 기간 DART 공시 증분 동기화 (전일 공시 포함)."""
+        dart = self._get_dart_filter()
+        if dart and dart.is_available():
+            prev = (datetime.strptime(start_date, "%Y%m%d") - timedelta(days=1)).strftime("%Y%m%d")
+            dart.sync_disclosures(prev, end_date)
+
     def select_stocks(self, date: Optional[str] = None, top_n: int = 5) -> List[Candidate]:
         if date is None:
             date = datetime.now().strftime("%Y%m%d")
@@ -189,9 +196,11 @@ class MultiSignalHybridStrategy(BaseStrategy):
         client = self._get_investor_client()
         signal_passed = []
         if client:
+            flows = client.get_multi_investor_flow(
+                [s["code"] for s in vol_passed], limit=self.LOOKBACK_DAYS + 1)
             for s in vol_passed:
                 try:
-                    flow = client.get_investor_flow(s["code"], limit=self.LOOKBACK_DAYS + 1)
+                    flow = flows.get(s["code"])
                     if not flow:
                         continue
                     foreign_total = sum(int(d.get("foreign_net", 0) or 0) for d in flow[:self.LOOKBACK_DAYS])
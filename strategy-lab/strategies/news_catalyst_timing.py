@@ -31,7 +31,7 @@ Strategy: News Catalyst Timing
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
 from lab import BaseStrategy, Candidate
@@ -129,6 +129,13 @@ class NewsCatalystTimingStrategy(BaseStrategy):
                 self._dart_filter = False
         return self._dart_filter if self._dart_filter else None
 
+    def prepare_period(self, start_date: str, end_date: str) -> None:
+        """백테스트 기간 DART 공시 증분 동기화 (전일 공시 포함)."""
+        dart = self._get_dart_filter()
+        if dart and dart.is_available():
+            prev = (datetime.strptime(start_date, "%Y%m%d") - timedelta(days=1)).strftime("%Y%m%d")
+            dart.sync_disclosures(prev, end_date)
+
     def select_stocks(self, date: Optional[str] = None, top_n: int = 5) -> List[Candidate]:
         if date is None:
             date = datetime.now().strftime("%Y%m%d")
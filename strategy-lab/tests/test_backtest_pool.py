@@ -0,0 +1,208 @@
+"""
+백테스트 병렬 실행 — 스레드별 출력 캡처 / 프로세스 풀 모드 테스트
+==================================================================
+capture_stdout 가 스레드 간 출력을 섞지 않는지, executor="process" 결과가
+순차/스레드 실행과 동일한지 (SingleStrategyBacktest, MatrixRunner) 검증한다.
+KRX 는 가짜 클라이언트로 대체 (네트워크 미사용, fork 워커에 상속).
+
+실행:
+    python tests/test_backtest_pool.py
+"""
+
+from __future__ import annotations
+
+import io
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from runner import backtest_wrapper as bw  # noqa: E402
+from runner import matrix_runner as mr  # noqa: E402
+
+DAYS = ["20260406", "20260407", "20260408", "20260409", "20260410"]
+CODES = [f"{i:06d}" for i in range(1, 9)]
+
+
+class _FakeKRX:
+    """일자·종목별 결정적 OHLCV."""
+
+    def get_stock_ohlcv(self, date, market="KOSPI"):
+        if market != "KOSPI":
+            return pd.DataFrame()
+        seed = int(date[-2:])
+        rows = {}
+        for i, code in enumerate(CODES):
+            o = 10_000 + 100 * i
+            rows[code] = {"시가": o, "고가": o * (1 + (seed + i) % 7 / 100),
+                          "저가": o * (1 - (seed * i) % 5 / 100), "종가": o + 10 * (seed - i)}
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+
+class _Cand:
+    def __init__(self, code, rank):
+        self.code, self.name, self.rank = code, f"종목{code}", rank
+        self.score, self.score_detail = 100 - rank, {}
+
+
+class _PrintyStrategy:
+    """print 를 많이 하는 결정적 전략 (pickle 가능)."""
+    STRATEGY_ID = "printy"
+    STRATEGY_NAME = "출력 많은 전략"
+
+    def __init__(self, offset=0):
+        self.offset = offset
+
+    def select_stocks(self, date, top_n=5):
+        print(f"[printy] {date} 스캔 시작")
+        picks = sorted(CODES, key=lambda c: (int(c) * 7 + int(date[-2:]) + self.offset) % 11)
+        for c in picks:
+            print(f"  {c} 점수 계산")
+        return [_Cand(c, r) for r, c in enumerate(picks[:top_n], 1)]
+
+
+class _OtherStrategy(_PrintyStrategy):
+    STRATEGY_ID = "other"
+    STRATEGY_NAME = "다른 전략"
+
+    def __init__(self):
+        super().__init__(offset=3)
+
+
+@contextmanager
+def _fake_env():
+    saved = (bw.get_krx, bw.get_trading_days, bw.warm_daily_cache)
+    krx = _FakeKRX()
+    bw.get_krx = lambda: krx
+    bw.get_trading_days = lambda s, e: [d for d in DAYS if s <= d <= e]
+    bw.warm_daily_cache = lambda: None
+    try:
+        yield
+    finally:
+        bw.get_krx, bw.get_trading_days, bw.warm_daily_cache = saved
+
+
+def _history(result):
+    return [(d.date, d.trades, d.daily_return_amount, d.capital_after,
+             [t["code"] for t in d.trade_details]) for d in result.daily_history]
+
+
+def test_capture_stdout_per_thread():
+    """8스레드 동시 캡처 — 각 버퍼엔 자기 출력만, 종료 후 sys.stdout 복원."""
+    original = sys.stdout
+    bufs = {}
+    barrier = threading.Barrier(8)
+
+    def worker(i):
+        with bw.capture_stdout() as buf:
+            barrier.wait()
+            for _ in range(200):
+                print(f"T{i}")
+        bufs[i] = buf.getvalue()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sys.stdout is original
+    for i, text in bufs.items():
+        assert set(text.split()) == {f"T{i}"}, f"스레드 {i} 출력 섞임"
+        assert text.count("\n") == 200
+
+
+def test_process_mode_matches_sequential():
+    """executor=process 결과 == 순차 결과, 진행 콜백 일자별 1회, 전략 출력 미노출."""
+    with _fake_env():
+        seq = bw.SingleStrategyBacktest(_PrintyStrategy()).run(DAYS[0], DAYS[-1], parallel_workers=1)
+        progress = []
+        out = io.StringIO()
+        with redirect_stdout(out):
+            proc = bw.SingleStrategyBacktest(_PrintyStrategy()).run(
+                DAYS[0], DAYS[-1], parallel_workers=3, executor="process",
+                progress_callback=lambda cur, tot, d: progress.append((cur, tot, d)),
+            )
+    assert not proc.has_errors, proc.error_messages
+    assert _history(proc) == _history(seq)
+    assert proc.final_capital == seq.final_capital and proc.total_trades == seq.total_trades > 0
+    assert [p[0] for p in progress] == [1, 2, 3, 4, 5]
+    assert sorted(p[2] for p in progress) == DAYS
+    assert "스캔 시작" not in out.getvalue()
+
+
+def test_thread_mode_output_isolated():
+    """thread 모드 — 전략 출력 캡처 후 sys.stdout 원복, 결과 동일."""
+    original = sys.stdout
+    with _fake_env():
+        seq = bw.SingleStrategyBacktest(_PrintyStrategy()).run(DAYS[0], DAYS[-1], parallel_workers=1)
+        thr = bw.SingleStrategyBacktest(_PrintyStrategy()).run(DAYS[0], DAYS[-1], parallel_workers=4)
+    assert sys.stdout is original
+    assert _history(thr) == _history(seq)
+
+
+def test_resolve_workers():
+    """0 은 기존대로 순차, None 만 자동 (process = CPU 코어 수)."""
+    import os
+    assert bw.resolve_workers(0, "thread") == 1
+    assert bw.resolve_workers(0, "process") == 1
+    assert bw.resolve_workers(3, "process") == 3
+    assert bw.resolve_workers(None, "thread") == bw.DEFAULT_WORKERS
+    assert bw.resolve_workers(None, "process") == (os.cpu_count() or 1)
+
+
+def test_matrix_process_mode():
+    """MatrixRunner executor=process — 2전략 × 2기간 thread 결과와 동일."""
+    with _fake_env(), tempfile.TemporaryDirectory() as td:
+        def build():
+            runner = mr.MatrixRunner(results_dir=Path(td), log_to_experiments=False,
+                                     use_selection_cache=False)
+            runner.add_strategy(_PrintyStrategy())
+            runner.add_strategy(_OtherStrategy())
+            runner.add_periods({"a": (DAYS[0], DAYS[2]), "b": (DAYS[1], DAYS[-1])})
+            return runner
+
+        thread_cells = build().run(parallel_strategies=2, verbose=False)
+        proc_cells = build().run(parallel_strategies=2, verbose=False, executor="process")
+
+    key = lambda c: (c.strategy_id, c.period_label)  # noqa: E731
+    assert all(c.status == "completed" for c in proc_cells), [c.error for c in proc_cells]
+    t_map = {key(c): c.metrics for c in thread_cells}
+    p_map = {key(c): c.metrics for c in proc_cells}
+    assert t_map == p_map and len(p_map) == 4
+
+
+TESTS = [
+    test_capture_stdout_per_thread,
+    test_process_mode_matches_sequential,
+    test_thread_mode_output_isolated,
+    test_resolve_workers,
+    test_matrix_process_mode,
+]
+
+
+def main() -> int:
+    failed = 0
+    for t in TESTS:
+        try:
+            t()
+            print(f"  PASS  {t.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FAIL  {t.__name__}: {e}")
+        except Exception as e:
+            failed += 1
+            print(f"  ERROR {t.__name__}: {type(e).__name__}: {e}")
+
+    print(f"\n{len(TESTS) - failed}/{len(TESTS)} passed")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,250 @@
+"""
+청산 룰 그리드 일괄 평가 (runner.exit_grid) 테스트
+===================================================
+거래 목록 × (익절 × 손절 × 트레일링) 그리드를 분봉 경로 1회로 평가한 결과가
+그리드 점별 calculate_net_return 과 같은지 (VI 구간 skip 포함), VariantComparator 가
+exit-rule variant 를 재백테스트 없이 그리드로 비교하고 다른 모델 fallback 은 거부하는지,
+20 × 20 그리드 × 한 달치 거래가 수 초 안에 끝나는지 검증한다.
+분봉은 결정적 무작위 경로 (네트워크 미사용).
+
+실행:
+    python tests/test_exit_grid.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from lab.parameter_tuner import VariantSpec  # noqa: E402
+from lab.realistic_sim.transaction_costs import calculate_net_return  # noqa: E402
+from lab.variant_comparator import AdoptionCriteria, VariantComparator  # noqa: E402
+from runner.exit_grid import SIM_MODEL, ExitGridSweep, GridTrade, RULE_EXIT_SLIPPAGE_PCT  # noqa: E402
+from lab.realistic_sim.vi_model import VI_THRESHOLD_PCT, VI_WINDOW_MINUTES  # noqa: E402
+from runner.metrics import calculate_metrics  # noqa: E402
+
+DAYS = [f"202604{d:02d}" for d in (1, 2, 3, 6, 7, 8, 9, 10, 13, 14, 15, 16, 17, 20, 21,
+                                    22, 23, 24, 27, 28)]
+
+
+def _bars(seed, n=385, vol=0.006):
+    """09:00 부터 1분봉 무작위 경로 (정수 가격)"""
+    rng = np.random.default_rng(seed)
+    drift = rng.uniform(-0.0008, 0.0010)
+    price = float(rng.integers(5_000, 120_000))
+    bars = []
+    for k in range(n):
+        minute = 9 * 60 + k
+        o = price
+        c = max(o * (1 + drift + rng.normal(0, vol)), 100)
+        h = max(o, c) * (1 + abs(rng.normal(0, vol / 2)))
+        l = min(o, c) * (1 - abs(rng.normal(0, vol / 2)))
+        bars.append({"time": f"{minute // 60:02d}:{minute % 60:02d}", "open": int(o),
+                     "high": int(h), "low": int(l), "close": int(c), "volume": 1_000})
+        price = c
+    return bars
+
+
+def _trades(per_day=5, days=DAYS):
+    trades = []
+    for d, date in enumerate(days):
+        for k in range(per_day):
+            seed = d * 100 + k
+            bars = _bars(seed, vol=0.0003 if seed % 7 == 0 else 0.006)
+            trades.append(GridTrade(code=f"{k:06d}", date=date, entry_price=bars[0]["open"],
+                                    bars=bars, market="KOSPI" if k % 2 else "KOSDAQ"))
+    return trades
+
+
+def _ref_exit(bars, entry, profit, loss):
+    """IntradayBacktest 분봉 루프 (손절 우선, VI 분봉 skip, 미도달 시 종가 — 슬리피지는 비용 계산에서)"""
+    profit_px = entry * (1 + profit / 100)
+    loss_px = entry * (1 + loss / 100)
+    n = len(bars)
+    for k, bar in enumerate(bars):
+        if VI_WINDOW_MINUTES <= k < n - 2:
+            ref = bars[k - VI_WINDOW_MINUTES]["close"] or 1
+            if abs(bar["close"] - ref) / ref * 100 >= VI_THRESHOLD_PCT:
+                continue
+        if bar["low"] <= loss_px:
+            return int(loss_px), "loss"
+        if bar["high"] >= profit_px:
+            return int(profit_px), "profit"
+    return bars[-1]["close"], "close"
+
+
+def _vi_trade():
+    """30분에 +12% 급등 (VI) 후 되돌림 — VI 분봉의 고가는 익절로 치지 않음"""
+    bars = _bars(999, n=60, vol=0.0003)
+    spike = dict(bars[30], high=int(bars[29]["close"] * 1.13), close=int(bars[29]["close"] * 1.12))
+    bars[30] = spike
+    return GridTrade(code="999999", date=DAYS[0], entry_price=bars[0]["open"], bars=bars)
+
+
+def test_grid_matches_per_trade_costs():
+    trades = _trades(per_day=3, days=DAYS[:5]) + [_vi_trade()]
+    profits, losses = [2.0, 5.0, 8.0], [-1.5, -3.0]
+    sweep = ExitGridSweep(trades, profits, losses)
+    assert sweep.shape == (3, 2, 1)
+    kinds = set()
+    for p, pv in enumerate(profits):
+        for l, lv in enumerate(losses):
+            for k, t in enumerate(trades):
+                px, kind = _ref_exit(t.bars, t.entry_price, pv, lv)
+                ref = calculate_net_return(
+                    t.entry_price, px, market=t.market,
+                    exit_slippage_pct=0 if kind == "close" else RULE_EXIT_SLIPPAGE_PCT,
+                )
+                assert round(float(sweep.net_pct[k, p, l, 0]), 4) == ref.net_return_pct, (k, pv, lv)
+                assert round(float(sweep.gross_pct[k, p, l, 0]), 4) == ref.gross_return_pct
+                kinds.add(kind)
+    assert kinds == {"profit", "loss", "close"}, kinds
+    vi = ExitGridSweep([_vi_trade()], [8.0], [-5.0])
+    assert vi.exit_mix(0, 0) == {"close": 1}, vi.exit_mix(0, 0)
+
+
+def test_metrics_compound_daily_means():
+    trades = _trades(per_day=4, days=DAYS[:6])
+    sweep = ExitGridSweep(trades, [5.0], [-3.0], initial_capital=1_000_000)
+    bt = sweep.backtest_result(0, 0)
+    assert bt["trading_days"] == 6 and bt["total_trades"] == 24
+    capital = 1_000_000.0
+    for k, day in enumerate(bt["daily_history"]):
+        net = sweep.net_pct[k * 4:(k + 1) * 4, 0, 0, 0]
+        assert abs(day["daily_return_pct"] - net.mean()) < 1e-12
+        capital *= 1 + net.mean() / 100
+        assert abs(day["capital_after"] - capital) < 1e-6
+    m = sweep.metrics(5.0, -3.0)
+    assert m["num_trades"] == 24
+    assert m["total_return_pct"] == calculate_metrics(bt).total_return_pct
+    # 기간 필터
+    assert sweep.metrics(5.0, -3.0, start_date=DAYS[2], end_date=DAYS[3])["num_trades"] == 8
+    assert sum(sweep.exit_mix(0, 0).values()) == 24
+
+
+def test_trailing_ladder_axis():
+    trades = _trades(per_day=2, days=DAYS[:5])
+    ladder = [(3.0, 1.0), (1.5, 0.5)]
+    sweep = ExitGridSweep(trades, [10.0], [-5.0], trailing_ladders=[None, ladder])
+    assert sweep.shape == (1, 1, 2)
+    assert "trailing" not in sweep.exit_mix(0, 0, 0)
+    assert sweep.exit_mix(0, 0, 1).get("trailing", 0) > 0
+    assert sweep.index(10.0, -5.0, ladder) == (0, 0, 1)
+    assert sweep.index(10.0, -5.0, [(3, 1), (1.5, 0.5)]) == (0, 0, 1)
+    try:
+        sweep.index(7.0, -5.0)
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("그리드에 없는 익절 목표가 KeyError 아님")
+
+
+def test_runner_fn_with_comparator():
+    trades = _trades(per_day=5, days=DAYS[:10])
+    sweep = ExitGridSweep(trades, [3.0, 5.0, 8.0], [-2.0, -3.0, -5.0], strategy_id="t")
+    calls = []
+
+    def fallback(**kwargs):
+        calls.append(kwargs)
+        return {"total_return_pct": 0.0, "sharpe_ratio": 0.0, "max_drawdown_pct": 0.0,
+                "win_rate": 0.0, "num_trades": 50, "profit_factor": 0.0}
+    fallback.sim_model = SIM_MODEL
+
+    variants = [
+        VariantSpec(variant_id=f"t_v0.2_{c}", parent_strategy_id="t", version="0.2.0",
+                    label=c, exit_rule_overrides=exit_, strategy_param_overrides=strat)
+        for c, exit_, strat in (
+            ("a", {"profit_target": 8.0, "loss_target": -5.0}, {}),
+            ("b", {"profit_target": 3.0}, {"ENTRY_RELAXATION_HINT": True}),
+            ("c", {"profit_target": 5.0}, {"min_volume": 10}),     # 재선정 필요
+            ("d", {"profit_target": 6.0}, {}),                     # 그리드 밖
+        )
+    ]
+    criteria = AdoptionCriteria(min_trades=10)
+    d = VariantComparator(sweep.runner_fn(fallback), criteria).compare("t", variants, DAYS[0], DAYS[-1])
+    by_label = {r.label: r for r in d.results}
+    baseline = next(r for r in d.results if r.is_baseline)
+    assert baseline.metrics == sweep.metrics(5.0, -3.0)
+    assert by_label["t_v0.2_a"].metrics == sweep.metrics(8.0, -5.0)
+    assert by_label["t_v0.2_b"].metrics == sweep.metrics(3.0, -3.0)
+    assert [c["exit_rule_overrides"] for c in calls] == [{"profit_target": 5.0},
+                                                          {"profit_target": 6.0}]
+    # fallback 없으면 그리드 밖 variant 는 오류로 기록
+    d = VariantComparator(sweep.runner_fn(), criteria).compare("t", variants[3:], DAYS[0], DAYS[-1])
+    assert d.results[-1].error and "그리드" in d.results[-1].error
+
+    # 다른 모델 (일봉 runner) fallback 은 거부 — 한 비교에 두 모델 혼용 방지
+    def daily(**kwargs):
+        return fallback(**kwargs)
+    for model in (None, "daily_bar"):
+        if model:
+            daily.sim_model = model
+        try:
+            sweep.runner_fn(daily)
+        except ValueError as e:
+            assert "모델" in str(e)
+        else:
+            raise AssertionError(f"{model} fallback 허용됨")
+
+    # 다른 전략 요청은 그리드 값 대신 fallback / 오류 (전략 미지정 sweep 도 동일)
+    calls.clear()
+    runner = sweep.runner_fn(fallback)
+    assert runner("other", DAYS[0], DAYS[-1]) == fallback() and calls[0]["strategy_id"] == "other"
+    for fn, sid in ((sweep.runner_fn(), "other"),
+                    (ExitGridSweep(trades, [5.0], [-3.0]).runner_fn(), "t")):
+        try:
+            fn(sid, DAYS[0], DAYS[-1])
+        except ValueError as e:
+            assert "전략" in str(e)
+        else:
+            raise AssertionError("다른 전략 요청이 그리드 값으로 응답됨")
+
+
+def test_grid_speed():
+    trades = _trades(per_day=5)     # 20 거래일 × 5 종목
+    profits = np.arange(1.0, 11.0, 0.5)
+    losses = -np.arange(0.5, 10.5, 0.5)
+    t0 = time.perf_counter()
+    sweep = ExitGridSweep(trades, profits, losses)
+    rows = sweep.table()
+    elapsed = time.perf_counter() - t0
+    assert sweep.net_pct.shape == (100, 20, 20, 1) and len(rows) == 400
+    assert rows[0]["total_return_pct"] >= rows[-1]["total_return_pct"]
+    assert elapsed < 10.0, f"{elapsed:.2f}s"
+    print(f"    20 × 20 그리드 × 100 거래: {elapsed:.2f}s")
+
+
+TESTS = [
+    test_grid_matches_per_trade_costs,
+    test_metrics_compound_daily_means,
+    test_trailing_ladder_axis,
+    test_runner_fn_with_comparator,
+    test_grid_speed,
+]
+
+
+def main():
+    failed = 0
+    for t in TESTS:
+        try:
+            t()
+            print(f"  PASS  {t.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FAIL  {t.__name__}: {e}")
+        except Exception as e:
+            failed += 1
+            print(f"  ERROR {t.__name__}: {type(e).__name__}: {e}")
+    print(f"\n{len(TESTS) - failed}/{len(TESTS)} passed")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
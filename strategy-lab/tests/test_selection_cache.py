@@ -0,0 +1,251 @@
+"""
+선정 메모이제이션 (SelectionCache) 테스트
+==========================================
+겹치는 기간/재실행에서 select_stocks 재계산이 없는지, 파라미터·데이터 스냅샷이
+바뀌면 키가 달라지는지, 메모 결과로 돌린 백테스트가 원래 결과와 같은지 검증한다.
+공용 의존 모듈 소스/선정일 이하 입력 파일 내용이 바뀌어도 무효화되는지 (수정 시각/토큰/
+메타 키/이후 날짜 수급 행은 무관), 전략이 읽는 입력 폴더만 서명하는지, 기본은 꺼져 있는지도 본다.
+KRX 는 test_backtest_pool 의 가짜 클라이언트 재사용 (네트워크 미사용).
+
+실행:
+    python tests/test_selection_cache.py
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from lab import Candidate  # noqa: E402
+from lab import selection_cache as sc  # noqa: E402
+from lab.variant_runtime import apply_strategy_overrides  # noqa: E402
+from runner import matrix_runner as mr  # noqa: E402
+from tests.test_backtest_pool import CODES, DAYS, _fake_env  # noqa: E402
+
+
+class _CountingStrategy:
+    """선정 호출 횟수를 세는 결정적 전략 (Candidate dataclass 반환)."""
+    STRATEGY_ID = "counting"
+    STRATEGY_NAME = "카운팅 전략"
+    OFFSET = 0
+    calls = []
+
+    def select_stocks(self, date, top_n=5):
+        _CountingStrategy.calls.append(date)
+        picks = sorted(CODES, key=lambda c: (int(c) * 5 + int(date[-2:]) + self.OFFSET) % 13)
+        return [Candidate(code=c, name=f"종목{c}", price=10_000, change_pct=1.0,
+                          score=90.0 - r, rank=r, score_detail={"r": r})
+                for r, c in enumerate(picks[:top_n], 1)]
+
+
+@contextmanager
+def _snapshot(version="v1"):
+    saved = sc.data_snapshot_version
+    sc.data_snapshot_version = lambda date, dirs=None: version
+    try:
+        yield
+    finally:
+        sc.data_snapshot_version = saved
+
+
+def _run(cache, strategy=None):
+    runner = mr.MatrixRunner(results_dir=Path(cache.cache_dir), log_to_experiments=False,
+                             selection_cache=cache, use_selection_cache=cache is not None)
+    runner.add_strategy(strategy or _CountingStrategy())
+    runner.add_periods({"short": (DAYS[0], DAYS[2]), "long": (DAYS[0], DAYS[-1])})
+    runner.run(parallel_strategies=1, verbose=False)
+    return runner
+
+
+def _metrics(runner):
+    return {c.period_label: c.metrics for c in runner.cells}
+
+
+def test_overlapping_periods_select_once():
+    """short ⊂ long — 공유 3일은 1회만 선정, 재실행은 선정 0회, 결과 동일."""
+    with _fake_env(), _snapshot(), tempfile.TemporaryDirectory() as td:
+        _CountingStrategy.calls = []
+        cache = sc.SelectionCache(cache_dir=Path(td))
+        first = _run(cache)
+        assert sorted(_CountingStrategy.calls) == DAYS, _CountingStrategy.calls
+
+        _CountingStrategy.calls = []
+        rerun = _run(sc.SelectionCache(cache_dir=Path(td)))
+        assert _CountingStrategy.calls == []
+        assert rerun._selection_cache_counts() == (8, 8)
+
+        plain = _run(sc.SelectionCache(cache_dir=Path(td), enabled=False))
+        assert _metrics(first) == _metrics(rerun) == _metrics(plain)
+        for c in rerun.cells:
+            for d in c.backtest_result["daily_history"]:
+                assert d["trade_details"], d["date"]
+
+
+def test_key_invalidation():
+    """파라미터(variant override)·데이터 스냅샷 변경 → 재계산, 오늘 날짜는 메모 안 함."""
+    with _fake_env(), tempfile.TemporaryDirectory() as td:
+        cache = sc.SelectionCache(cache_dir=Path(td))
+        base = _CountingStrategy()
+        variant = apply_strategy_overrides(_CountingStrategy, {"OFFSET": 4})()
+        with _snapshot("v1"):
+            k_base = cache.key(base, DAYS[0], 5)
+            assert k_base and k_base == cache.key(_CountingStrategy(), DAYS[0], 5)
+            assert cache.key(variant, DAYS[0], 5) != k_base
+            assert cache.key(base, DAYS[0], 3) != k_base
+            assert cache.key(base, datetime.now().strftime("%Y%m%d"), 5) is None
+        with _snapshot("v2"):
+            assert cache.key(base, DAYS[0], 5) != k_base
+        with _snapshot(None):
+            assert cache.key(base, DAYS[0], 5) is None
+
+        # 재실행: 같은 키는 hit, 바뀐 스냅샷은 miss
+        with _snapshot("v1"):
+            _CountingStrategy.calls = []
+            cands, hit = cache.get_or_compute(base, DAYS[0], 5, lambda: base.select_stocks(DAYS[0]))
+            again, hit2 = cache.get_or_compute(base, DAYS[0], 5, lambda: base.select_stocks(DAYS[0]))
+            assert (hit, hit2) == (False, True) and len(_CountingStrategy.calls) == 1
+            assert [c.to_dict() for c in again] == [c.to_dict() for c in cands]
+            assert isinstance(again[0], Candidate)
+
+
+def test_shared_module_change_invalidates():
+    """전략이 import 하는 공용 모듈 (lab/common.py) 소스가 바뀌면 지문이 달라짐."""
+    deps = sc._dependency_files([_CountingStrategy.__module__])
+    common = str(REPO_ROOT / "lab" / "common.py")
+    assert common in deps, deps
+    before = sc.strategy_fingerprint(_CountingStrategy())
+    saved = sc._file_digest(common)
+    sc._file_digests[common] = "edited"
+    try:
+        assert sc.strategy_fingerprint(_CountingStrategy()) != before
+    finally:
+        sc._file_digests[common] = saved
+    assert sc.strategy_fingerprint(_CountingStrategy()) == before
+
+
+def test_input_files_signature():
+    """선정일 이하 날짜 파일/날짜 없는 파일 내용 변경 → 서명 변경, 이후 날짜 추가·수정 시각·비입력 → 그대로."""
+    with tempfile.TemporaryDirectory() as td:
+        root = Path(td)
+        (root / "krx").mkdir()
+        (root / "dart").mkdir()
+        for d in ("20260401", "20260402", "20260403"):
+            (root / "krx" / f"stock_KOSPI_{d}.json").write_text("[1]")
+        (root / "dart" / "corp_index.json").write_text('{"updated": "20260401", "codes": {}}')
+
+        def sig(date):
+            return sc._InputIndex([root / "krx", root / "dart"]).signature(date)
+
+        base = {d: sig(d) for d in ("20260401", "20260402", "20260403")}
+        assert len(set(base.values())) == 3
+
+        (root / "krx" / "stock_KOSPI_20260404.json").write_text("[1]")     # 이후 날짜 추가
+        assert sig("20260403") == base["20260403"]
+
+        for path in (root / "krx").iterdir():                             # 새 체크아웃 (수정 시각만)
+            st = path.stat()
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+        (root / "dart" / "token.json").write_text('{"access_token": "x"}')  # 비입력 파일
+        (root / "dart" / "corp_index.json").write_text('{"codes": {}, "updated": "20260417"}')
+        assert sig("20260403") == base["20260403"]
+
+        lookback = root / "krx" / "stock_KOSPI_20260401.json"            # lookback 창 재수집
+        lookback.write_text("[1, 2]")
+        assert sig("20260402") != base["20260402"] and sig("20260403") != base["20260403"]
+        after = sig("20260403")
+
+        undated = root / "dart" / "corp_index.json"                       # 날짜 없는 입력 내용
+        undated.write_text('{"codes": {"005930": 1}}')
+        assert sig("20260403") != after
+
+
+def test_flow_rows_signature():
+    """수급 이력 npz: 이후 날짜 행 추가/조회일 갱신 → 과거 서명 그대로, 과거 행 변경 → 바뀜."""
+    import numpy as np
+    from paper_trading.utils.investor_flow_store import FLOW_DTYPE
+
+    def rows(*dates, close=100):
+        return np.array([(int(d), close, 0.0, 1, 0, 0) for d in dates], dtype=FLOW_DTYPE)
+
+    with tempfile.TemporaryDirectory() as td:
+        flows = Path(td) / "flows"
+        flows.mkdir()
+        saved = set(sc._ROW_DATED_DIRS)
+        sc._ROW_DATED_DIRS.add(flows)
+        try:
+            np.savez(flows / "005930.npz", rows=rows("20260401", "20260402"), checked=np.array("20260402"))
+
+            def sig(date):
+                return sc._InputIndex([flows]).signature(date)
+
+            before = sig("20260402")
+            np.savez(flows / "005930.npz", rows=rows("20260401", "20260402", "20260403"),
+                     checked=np.array("20260403"))
+            assert sig("20260402") == before and sig("20260403") != before
+
+            np.savez(flows / "005930.npz", rows=rows("20260401", "20260402", close=90),
+                     checked=np.array("20260403"))
+            assert sig("20260402") != before
+        finally:
+            sc._ROW_DATED_DIRS.clear()
+            sc._ROW_DATED_DIRS.update(saved)
+
+
+def test_strategy_input_dirs():
+    """전략이 읽는 모듈이 import 그래프에 있는 입력 폴더만 서명 대상 (수급 폴더는 수급 전략만)."""
+    from strategies.bollinger_reversal import BollingerReversalStrategy
+    from strategies.foreign_flow_momentum import ForeignFlowMomentumStrategy
+
+    bollinger = {d.name for d in sc.strategy_input_dirs(BollingerReversalStrategy)}
+    flow = {d.name for d in sc.strategy_input_dirs(ForeignFlowMomentumStrategy)}
+    assert "krx_cache" in bollinger and "naver_investor" not in bollinger, bollinger
+    assert "naver_investor" in flow, flow
+
+
+def test_cache_opt_in():
+    """MatrixRunner 기본값은 선정 메모 미사용."""
+    with _fake_env(), tempfile.TemporaryDirectory() as td:
+        runner = mr.MatrixRunner(results_dir=Path(td), log_to_experiments=False)
+        assert runner.selection_cache is None
+        assert mr.MatrixRunner(results_dir=Path(td), log_to_experiments=False,
+                               use_selection_cache=True).selection_cache is not None
+
+
+TESTS = [
+    test_overlapping_periods_select_once,
+    test_key_invalidation,
+    test_shared_module_change_invalidates,
+    test_input_files_signature,
+    test_flow_rows_signature,
+    test_strategy_input_dirs,
+    test_cache_opt_in,
+]
+
+
+def main() -> int:
+    failed = 0
+    for t in TESTS:
+        try:
+            t()
+            print(f"  PASS  {t.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FAIL  {t.__name__}: {e}")
+        except Exception as e:
+            failed += 1
+            print(f"  ERROR {t.__name__}: {type(e).__name__}: {e}")
+
+    print(f"\n{len(TESTS) - failed}/{len(TESTS)} passed")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
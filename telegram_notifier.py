@@ -2,13 +2,33 @@
 Telegram 알림 모듈
 - 매매 신호, 익절/손절 알림 전송
 - GitHub Actions에서 사용
+- 발송 키 인덱스: 일별 (msg_type, 종목코드) 발송 키를 메모리 + 사이드카
+  (logs/telegram/YYYY-MM-DD.sent.json) 로 유지 — 중복 방지가 jsonl 전체를 다시 읽지 않음.
+  사이드카는 반영한 jsonl 앞부분의 sha1 을 함께 저장, 로드 시 불일치 (git rebase 병합 등) 면 재구성
+- 발송 큐: enqueue 로 모은 메시지를 flush 때 유형별로 합쳐 (4096자 이내) 간격 제한 발송
 """
 
 import os
+import re
 import json
+import hashlib
+import tempfile
+import threading
+import time
 import requests
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set, Tuple
+
+KST = timezone(timedelta(hours=9))
+
+# 중복 방지 대상 유형 (익절/손절 발송)
+SELL_TYPES = ("sell_profit", "sell_loss", "sell_batch")
+
+# 메시지 본문의 종목코드 (괄호 안 6자리 숫자)
+_CODE_RE = re.compile(r'\((\d{6})\)')
+
+# Telegram sendMessage 본문 최대 길이
+MAX_MESSAGE_LEN = 4096
 
 
 class TelegramNotifier:
@@ -16,6 +36,10 @@ class TelegramNotifier:
 
     LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "telegram")
 
+    # 발송 슬롯 시계 / 대기 (테스트에서 가짜 시계로 교체)
+    _clock = staticmethod(time.time)
+    _sleep = staticmethod(time.sleep)
+
     # msg_type별 표시 정보
     TYPE_LABELS = {
         "arena_report": {"emoji": "📊", "label": "Arena 일일 결과"},
@@ -30,21 +54,39 @@ class TelegramNotifier:
         "custom": {"emoji": "📢", "label": "커스텀 알림"},
     }
 
-    def __init__(self, bot_token: Optional[str] = None, chat_id: Optional[str] = None):
+    def __init__(self, bot_token: Optional[str] = None, chat_id: Optional[str] = None,
+                 min_interval: float = 1.0, max_retry_after: float = 30.0):
+        """
+        Args:
+            bot_token, chat_id: 없으면 환경변수 TELEGRAM_BOT_TOKEN / TELEGRAM_CHAT_ID
+            min_interval: 발송 시작 최소 간격 (초, 같은 채팅 초당 1건 제한)
+            max_retry_after: 429 응답 retry_after 대기 상한 (초)
+        """
         self.bot_token = bot_token or os.environ.get('TELEGRAM_BOT_TOKEN')
         self.chat_id = chat_id or os.environ.get('TELEGRAM_CHAT_ID')
         self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
+        self.min_interval = min_interval
+        self.max_retry_after = max_retry_after
+        self._lock = threading.Lock()
+        self._slot_lock = threading.Lock()
+        self._next_slot = 0.0
+        # 날짜 → {"offset": 반영한 jsonl 바이트, "keys": {(msg_type, code)}, "hash": 앞부분 sha1}
+        self._sent: Dict[str, dict] = {}
+        self._queue: List[Tuple[str, str, str]] = []    # (msg_type, parse_mode, text)
 
     def is_configured(self) -> bool:
         """설정 여부 확인"""
         return bool(self.bot_token and self.chat_id)
 
     def _log_send(self, success: bool, msg_type: str, preview: str,
-                  full_message: str = "", error: str = ""):
-        """발송 이력을 일별 jsonl 파일에 기록 (logs/telegram/YYYY-MM-DD.jsonl)"""
+                  full_message: str = "", error: str = "",
+                  codes: Optional[List[str]] = None):
+        """발송 이력을 일별 jsonl 파일에 기록 (logs/telegram/YYYY-MM-DD.jsonl)
+
+        익절/손절 발송 성공이면 종목코드를 entry["codes"] 에 남기고 발송 키 인덱스에 반영한다.
+        """
         try:
-            kst = timezone(timedelta(hours=9))
-            now = datetime.now(kst)
+            now = datetime.now(KST)
             date_str = now.strftime("%Y-%m-%d")
             type_info = self.TYPE_LABELS.get(msg_type, {"emoji": "📨", "label": msg_type})
 
@@ -60,17 +102,149 @@ class TelegramNotifier:
             }
             if error:
                 entry["error"] = str(error)[:300]
+            if success and msg_type in SELL_TYPES:
+                # 2000자 절단 전 원문 기준 (긴 취합 메시지의 뒤쪽 종목 누락 방지)
+                entry["codes"] = list(codes) if codes is not None else \
+                    _CODE_RE.findall(full_message or preview)
 
             os.makedirs(self.LOG_DIR, exist_ok=True)
             log_path = os.path.join(self.LOG_DIR, f"{date_str}.jsonl")
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            with self._lock:
+                with open(log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                self._sync_index(date_str)
         except Exception:
             pass  # 로깅 실패가 발송을 막으면 안 됨
 
+    # === 발송 키 인덱스 ===
+
+    def _sidecar_path(self, date_str: str) -> str:
+        return os.path.join(self.LOG_DIR, f"{date_str}.sent.json")
+
+    def _sync_index(self, date_str: str) -> dict:
+        """날짜 인덱스를 jsonl 끝까지 맞춤 (self._lock 안에서 호출)
+
+        메모리에 없으면 사이드카에서 읽고, 사이드카가 없거나 jsonl 앞부분이 사이드카 기록과
+        다르거나 jsonl 이 줄었으면 처음부터 구성.
+        이후로는 반영한 offset 뒤에 덧붙은 줄만 읽는다 (다른 프로세스 기록 포함).
+        """
+        log_path = os.path.join(self.LOG_DIR, f"{date_str}.jsonl")
+        index = self._sent.get(date_str)
+        if index is None:
+            index = self._load_sidecar(date_str, log_path)
+            self._sent[date_str] = index
+        try:
+            size = os.path.getsize(log_path)
+        except OSError:
+            size = 0
+        if size < index["offset"]:
+            index = self._sent[date_str] = self._empty_index()
+        if size == index["offset"]:
+            return index
+
+        with open(log_path, "rb") as f:
+            f.seek(index["offset"])
+            chunk = f.read(size - index["offset"])
+        end = chunk.rfind(b"\n") + 1          # 쓰는 중인 마지막 줄은 다음에
+        for line in chunk[:end].decode("utf-8", errors="replace").splitlines():
+            index["keys"].update(self._entry_keys(line))
+        if end:
+            index["offset"] += end
+            index["hash"].update(chunk[:end])
+            self._save_sidecar(date_str, index)
+        return index
+
+    @staticmethod
+    def _entry_keys(line: str) -> Set[Tuple[str, str]]:
+        """jsonl 한 줄 → {(msg_type, code)} (codes 없는 기존 기록은 메시지 정규식)"""
+        line = line.strip()
+        if not line:
+            return set()
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            return set()
+        msg_type = entry.get('type')
+        if msg_type not in SELL_TYPES or not entry.get('success'):
+            return set()
+        codes = entry.get('codes')
+        if codes is None:
+            codes = _CODE_RE.findall(entry.get('message', ''))
+        return {(msg_type, code) for code in codes}
+
+    @staticmethod
+    def _empty_index() -> dict:
+        return {"offset": 0, "keys": set(), "hash": hashlib.sha1()}
+
+    def _load_sidecar(self, date_str: str, log_path: str) -> dict:
+        """사이드카 로드 — jsonl 앞 offset 바이트의 sha1 이 기록과 같을 때만 사용"""
+        try:
+            with open(self._sidecar_path(date_str), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            offset = int(data["offset"])
+            digest = hashlib.sha1()
+            with open(log_path, "rb") as f:
+                remaining = offset
+                while remaining:
+                    block = f.read(min(remaining, 1 << 20))
+                    if not block:
+                        break
+                    digest.update(block)
+                    remaining -= len(block)
+            if remaining or digest.hexdigest() != data["sha1"]:
+                return self._empty_index()
+            return {"offset": offset, "keys": {(t, c) for t, c in data["keys"]}, "hash": digest}
+        except Exception:
+            return self._empty_index()
+
+    def _save_sidecar(self, date_str: str, index: dict):
+        fd, tmp = tempfile.mkstemp(dir=self.LOG_DIR, prefix=".sent.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"offset": index["offset"], "sha1": index["hash"].hexdigest(),
+                           "keys": sorted(index["keys"])},
+                          f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp, self._sidecar_path(date_str))
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def get_sent_keys(self, date_str: Optional[str] = None) -> Set[Tuple[str, str]]:
+        """날짜 (YYYY-MM-DD, 기본 오늘) 발송 성공한 (msg_type, 종목코드) 키"""
+        date_str = date_str or datetime.now(KST).strftime("%Y-%m-%d")
+        with self._lock:
+            return set(self._sync_index(date_str)["keys"])
+
+    def _wait_slot(self):
+        # 다음 발송 슬롯을 lock 안에서 예약하고, 대기는 lock 밖에서
+        with self._slot_lock:
+            now = self._clock()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            self._sleep(slot - now)
+
+    def _retry_after(self, response) -> Optional[float]:
+        """429 응답이면 retry_after (초, 상한 적용) — 다음 슬롯도 그만큼 미룸"""
+        if response.status_code != 429:
+            return None
+        try:
+            wait = float(response.json().get("parameters", {}).get("retry_after", 1))
+        except Exception:
+            wait = 1.0
+        wait = min(max(wait, self.min_interval), self.max_retry_after)
+        with self._slot_lock:
+            self._next_slot = max(self._next_slot, self._clock() + wait)
+        return wait
+
     def send_message(self, text: str, parse_mode: str = "HTML",
-                     msg_type: str = "custom") -> bool:
-        """메시지 전송"""
+                     msg_type: str = "custom", codes: Optional[List[str]] = None) -> bool:
+        """메시지 전송
+
+        Args:
+            codes: 익절/손절 발송의 종목코드 (없으면 본문에서 추출) — 중복 방지 인덱스용
+        """
         if not self.is_configured():
             print("[Telegram] 설정되지 않음 - TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID 필요")
             self._log_send(False, msg_type, text[:100], text, "not_configured")
@@ -84,13 +258,19 @@ class TelegramNotifier:
                 "parse_mode": parse_mode,
                 "disable_web_page_preview": True
             }
+            self._wait_slot()
             response = requests.post(url, json=payload, timeout=10)
+            if self._retry_after(response) is not None:
+                # 429: retry_after 만큼 미룬 슬롯에서 1회 재시도
+                self._wait_slot()
+                response = requests.post(url, json=payload, timeout=10)
 
             if response.status_code == 200:
                 print("[Telegram] 알림 전송 성공")
-                self._log_send(True, msg_type, text[:100], text)
+                self._log_send(True, msg_type, text[:100], text, codes=codes)
                 return True
             else:
+                self._retry_after(response)
                 print(f"[Telegram] 전송 실패: {response.text}")
                 self._log_send(False, msg_type, text[:100], text, response.text[:300])
                 return False
@@ -100,6 +280,54 @@ class TelegramNotifier:
             self._log_send(False, msg_type, text[:100], text, str(e))
             return False
 
+    # === 발송 큐 ===
+
+    def enqueue(self, text: str, msg_type: str = "custom", parse_mode: str = "HTML"):
+        """메시지를 큐에 넣음 (즉시 반환) — flush 때 유형별로 합쳐 발송"""
+        with self._lock:
+            self._queue.append((msg_type, parse_mode, text))
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._queue)
+
+    def flush(self) -> Dict[str, int]:
+        """큐를 비우며 발송 — 같은 (msg_type, parse_mode) 메시지는 4096자 이내로 합침
+
+        Returns:
+            {"queued": 큐 메시지 수, "sent": 발송 요청 수, "failed": 실패 수}
+        """
+        with self._lock:
+            queue, self._queue = self._queue, []
+        if not queue:
+            return {"queued": 0, "sent": 0, "failed": 0}
+
+        # 유형별 묶음 (첫 등장 순서 유지)
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        for msg_type, parse_mode, text in queue:
+            groups.setdefault((msg_type, parse_mode), []).append(text.strip())
+
+        sent = failed = 0
+        for (msg_type, parse_mode), texts in groups.items():
+            for merged in self._merge_texts(texts):
+                sent += 1
+                if not self.send_message(merged, parse_mode=parse_mode, msg_type=msg_type):
+                    failed += 1
+        return {"queued": len(queue), "sent": sent, "failed": failed}
+
+    @staticmethod
+    def _merge_texts(texts: List[str], limit: int = MAX_MESSAGE_LEN) -> List[str]:
+        """빈 줄로 이어 붙이되 limit 을 넘기 전에 끊음 (한 건이 limit 초과면 그대로 한 건)"""
+        merged, current = [], ""
+        for text in texts:
+            if current and len(current) + 2 + len(text) > limit:
+                merged.append(current)
+                current = ""
+            current = f"{current}\n\n{text}" if current else text
+        if current:
+            merged.append(current)
+        return merged
+
     # === 매매 알림 템플릿 ===
 
     def send_buy_signal(self, stock_name: str, stock_code: str,
@@ -193,33 +421,15 @@ class TelegramNotifier:
 
         msg_type = "sell_batch"
         message = "\n".join(lines)
-        return self.send_message(message, msg_type=msg_type)
+        codes = [s['code'] for s in new_signals if s.get('code')]
+        return self.send_message(message, msg_type=msg_type, codes=codes)
 
     def _get_today_sent_codes(self) -> set:
-        """오늘 이미 익절/손절 발송한 종목코드 set 반환"""
-        kst = timezone(timedelta(hours=9))
-        today = datetime.now(kst).strftime("%Y-%m-%d")
-        log_file = os.path.join(self.LOG_DIR, f"{today}.jsonl")
-
-        sent = set()
-        if not os.path.exists(log_file):
-            return sent
-
+        """오늘 이미 익절/손절 발송한 종목코드 set 반환 (발송 키 인덱스)"""
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    entry = json.loads(line)
-                    if entry.get('type') in ('sell_profit', 'sell_loss', 'sell_batch') and entry.get('success'):
-                        # 메시지에서 종목코드 추출 (괄호 안 6자리 숫자)
-                        import re
-                        codes = re.findall(r'\((\d{6})\)', entry.get('message', ''))
-                        sent.update(codes)
+            return {code for _, code in self.get_sent_keys()}
         except Exception:
-            pass
-        return sent
+            return set()
 
     def send_daily_summary(self, data: Dict[str, Any]) -> bool:
         """일일 요약 알림"""